@@ -2,15 +2,75 @@
 Public facing Memory Client.
 """
 
-from typing import TYPE_CHECKING, Any, Optional
+import copy
+from dataclasses import replace
+from datetime import datetime
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    Union,
+)
 
 if TYPE_CHECKING:
     from agent_memory_hub.config.alloydb_config import AlloyDBConfig
+    from agent_memory_hub.config.emulator_config import EmulatorConfig
+    from agent_memory_hub.config.lmdb_config import LmdbConfig
+    from agent_memory_hub.config.memory_config import MemoryStoreConfig
+    from agent_memory_hub.config.ranking_config import RankingConfig
     from agent_memory_hub.config.redis_config import RedisConfig
+    from agent_memory_hub.config.sqlite_config import SQLiteConfig
+    from agent_memory_hub.config.vector_config import VectorIndexConfig
+    from agent_memory_hub.data_plane.migrating_session_store import (
+        MigratingSessionStore,
+    )
+    from agent_memory_hub.data_plane.sharded_session_store import (
+        ShardedSessionStore,
+    )
+    from agent_memory_hub.indexing.embeddings import Embedder
 
+from agent_memory_hub.client.session import MemorySession, MemoryTransaction
 from agent_memory_hub.config.regions import DEFAULT_REGION
+from agent_memory_hub.control_plane.erasure import DEFAULT_WORKERS, MemoryEraser
 from agent_memory_hub.control_plane.region_guard import RegionGuard
-from agent_memory_hub.models.base import BaseMemory
+from agent_memory_hub.control_plane.transfer import (
+    TRANSFER_BATCH,
+    TRANSFER_WORKERS,
+    MemoryTransfer,
+)
+from agent_memory_hub.data_plane.adk_session_store import VersionConflictError
+from agent_memory_hub.data_plane.patch import MemoryPatch, Number
+from agent_memory_hub.indexing import graph
+from agent_memory_hub.indexing.episode_log import (
+    DEFAULT_TAIL,
+    LogEntry,
+    LogPage,
+    LogQuery,
+)
+from agent_memory_hub.indexing.graph import DEFAULT_MAX_NODES, GraphNode
+from agent_memory_hub.indexing.ownership import Ownership, OwnershipIndex
+from agent_memory_hub.indexing.query import (
+    DEFAULT_LIMIT,
+    MemoryQuery,
+    QueryPage,
+    RankQuery,
+    TriplePattern,
+)
+from agent_memory_hub.indexing.scoped_index import (
+    SEARCH_MODES,
+    ScopedIndex,
+    SearchResult,
+    reciprocal_rank_fusion,
+)
+from agent_memory_hub.models.base import BaseMemory, MemoryScope, Relation
+from agent_memory_hub.models.types import EpisodicMemory
 from agent_memory_hub.routing.memory_router import MemoryRouter
 from agent_memory_hub.utils.telemetry import get_tracer
 
@@ -31,6 +91,21 @@ class MemoryClient:
         alloydb_config: Optional["AlloyDBConfig"] = None,
         redis_config: Optional["RedisConfig"] = None,
         environment: str = "prod",
+        dedup_threshold_bytes: Optional[int] = None,
+        emulator_config: Optional["EmulatorConfig"] = None,
+        memory_config: Optional["MemoryStoreConfig"] = None,
+        sqlite_config: Optional["SQLiteConfig"] = None,
+        lmdb_config: Optional["LmdbConfig"] = None,
+        embedder: Optional["Embedder"] = None,
+        vector_config: Optional["VectorIndexConfig"] = None,
+        keyword_search: Optional[bool] = None,
+        ranking_config: Optional["RankingConfig"] = None,
+        prefetch: Optional[Sequence[str]] = None,
+        user_id: Optional[str] = None,
+        track_ownership: Optional[bool] = None,
+        migrate_from: Optional[str] = None,
+        migration_phase: str = "dual_write",
+        shards: Optional[Mapping[str, Dict[str, Any]]] = None,
     ):
         """
         Initialize the MemoryClient.
@@ -40,11 +115,48 @@ class MemoryClient:
             session_id: Unique identifier for the session.
             region: The cloud region where memory should be stored/retrieved.
             region_restricted: If True, enforces strict region checks.
-            backend: Storage backend ("adk" for GCS, "alloydb" for AlloyDB).
+            backend: Storage backend ("adk" for GCS, "alloydb" for AlloyDB,
+                "redis", "firestore", or "memory"/"sqlite"/"lmdb" for
+                single-node use).
             ttl_seconds: Time-to-live in seconds (None = no expiry).
             alloydb_config: AlloyDB configuration (required if backend="alloydb").
             redis_config: Redis configuration (optional if backend="redis").
             environment: Environment context (e.g., "prod", "dev") for resource naming.
+            dedup_threshold_bytes: Store values of at least this many bytes once
+                by content hash (None = no deduplication).
+            emulator_config: Run the backend against an in-process emulator
+                (for tests and benchmarks without network access).
+            memory_config: In-memory store configuration (optional if
+                backend="memory").
+            sqlite_config: SQLite configuration (optional if backend="sqlite").
+            lmdb_config: LMDB configuration (optional if backend="lmdb").
+            embedder: Embeds episodic and semantic memories written through
+                ``write_model`` for ``search`` (None = search disabled).
+                Requires the ``vector`` extra (NumPy).
+            vector_config: Exact / approximate search configuration.
+            keyword_search: Also index memories for BM25 keyword search,
+                which finds exact identifiers (order numbers, error codes)
+                that embeddings miss (None = only when an embedder is set).
+                Requires the ``vector`` extra (NumPy).
+            ranking_config: Re-rank search results by weighted relevance,
+                recency, importance, confidence and access frequency
+                (None = rank by relevance only). Requires NumPy.
+            prefetch: Keys to fetch with one batched read at construction
+                and then serve ``recall`` from locally (see ``prefetch``).
+            user_id: End user the agent serves in this session.
+            track_ownership: Record the agent (and user) as owner of the
+                session in the ownership index on the first write, so
+                ``MemoryEraser`` can find their memories across sessions
+                (None = only when a user_id is set).
+            migrate_from: Backend being migrated from to ``backend``; writes
+                go to both while reads move over phase by phase (see
+                ``migration``). None = no migration.
+            migration_phase: Initial migration phase ("dual_write",
+                "shadow_read" or "cutover").
+            shards: Spread sessions over several backend instances: shard
+                name to the store arguments differing from the ones above,
+                e.g. ``{"r1": {"redis_config": c1}, "r2": {...}}`` (see
+                ``sharding``). None = one store.
         """
         if not agent_id:
             raise ValueError("agent_id cannot be empty")
@@ -52,12 +164,32 @@ class MemoryClient:
             raise ValueError("session_id cannot be empty")
         self.agent_id = agent_id
         self.session_id = session_id
+        self.user_id = user_id
         self.region = region
         self.region_restricted = region_restricted
         self.backend = backend
         self.ttl_seconds = ttl_seconds
         self.environment = environment
         self._tracer = get_tracer()
+        self._embeddings = None
+        if embedder is not None:
+            from agent_memory_hub.indexing.vector_index import EmbeddingIndex
+
+            self._embeddings = EmbeddingIndex(embedder, vector_config)
+        if keyword_search is None:
+            keyword_search = embedder is not None
+        self._keywords = None
+        if keyword_search:
+            from agent_memory_hub.indexing.inverted_index import KeywordIndex
+
+            self._keywords = KeywordIndex()
+        self._ranking = None
+        if ranking_config is not None:
+            from agent_memory_hub.indexing.ranking import RankingEngine
+
+            self._ranking = RankingEngine(ranking_config)
+        # Times each memory key was returned by search
+        self._access_counts: Dict[str, int] = {}
 
         if region_restricted:
             self._guard = RegionGuard(region)
@@ -68,6 +200,14 @@ class MemoryClient:
                 alloydb_config=alloydb_config,
                 redis_config=redis_config,
                 environment=environment,
+                dedup_threshold_bytes=dedup_threshold_bytes,
+                emulator_config=emulator_config,
+                memory_config=memory_config,
+                sqlite_config=sqlite_config,
+                lmdb_config=lmdb_config,
+                migrate_from=migrate_from,
+                migration_phase=migration_phase,
+                shards=shards,
             )
         else:
             # Fallback or less strict mode not fully implemented in spec, 
@@ -81,15 +221,51 @@ class MemoryClient:
                 alloydb_config=alloydb_config,
                 redis_config=redis_config,
                 environment=environment,
+                dedup_threshold_bytes=dedup_threshold_bytes,
+                emulator_config=emulator_config,
+                memory_config=memory_config,
+                sqlite_config=sqlite_config,
+                lmdb_config=lmdb_config,
+                migrate_from=migrate_from,
+                migration_phase=migration_phase,
+                shards=shards,
             )
 
-    def write(self, value: Any, key: str = "default") -> None:
+        # Values served locally after load_session() / prefetch(); complete
+        # when the whole session was loaded, so other keys are known absent.
+        self._local: Dict[str, Any] = {}
+        self._local_complete = False
+        if track_ownership is None:
+            track_ownership = user_id is not None
+        # Cleared once this client's ownership records have been written
+        self._register_pending = track_ownership
+        if prefetch:
+            self.prefetch(prefetch)
+
+    def write(
+        self, value: Any, key: str = "default", if_version: Optional[str] = None
+    ) -> Optional[str]:
         """
         Write a value to the memory store.
 
+        With ``if_version`` the write is a compare-and-set: it only happens
+        if the key is still at the version returned by
+        ``recall_with_version`` (``MISSING_VERSION``: only if the key does
+        not exist), checked atomically by the backend::
+
+            value, version = client.recall_with_version("counter")
+            client.write((value or 0) + 1, key="counter", if_version=version)
+
         Args:
             value: The data to store.
             key: specific key or context for the memory (e.g., 'episodic', 'semantic').
+            if_version: Expected version token of the key.
+
+        Returns:
+            The new version token for conditional writes, else None.
+
+        Raises:
+            VersionConflictError: If the key is no longer at ``if_version``.
         """
         with self._tracer.start_as_current_span("MemoryClient.write") as span:
             span.set_attribute("agent.id", self.agent_id)
@@ -99,22 +275,199 @@ class MemoryClient:
             
             # Composite key could include agent_id to namespace it
             composite_key = f"{self.agent_id}/{key}"
-            self._router.write(self.session_id, composite_key, value)
+            self._register_owner()
+            version = None
+            if if_version is None:
+                self._router.write(self.session_id, composite_key, value)
+            else:
+                span.set_attribute("memory.if_version", if_version)
+                version = self._router.write_versioned(
+                    self.session_id, composite_key, value, if_version
+                )
+            if self._local_complete or key in self._local:
+                self._local[key] = copy.deepcopy(value)
+            return version
+
+    def write_many(self, items: Dict[str, Any], atomic: bool = False) -> None:
+        """
+        Write several values in one batched backend call (a single
+        transaction, pipeline or batch where the backend has one).
+
+        Args:
+            items: Mapping of key to value.
+            atomic: Commit all-or-nothing; raises NotImplementedError on
+                backends that cannot (GCS).
+        """
+        with self._tracer.start_as_current_span("MemoryClient.write_many") as span:
+            span.set_attribute("agent.id", self.agent_id)
+            span.set_attribute("session.id", self.session_id)
+            span.set_attribute("region", self.region)
+            span.set_attribute("memory.count", len(items))
+            span.set_attribute("memory.atomic", atomic)
+
+            if not items:
+                return
+            composite = {
+                f"{self.agent_id}/{key}": value for key, value in items.items()
+            }
+            self._register_owner()
+            if atomic:
+                self._router.write_atomic(self.session_id, composite)
+            else:
+                self._router.write_many(self.session_id, composite)
+            for key, value in items.items():
+                if self._local_complete or key in self._local:
+                    self._local[key] = copy.deepcopy(value)
+
+    def _register_owner(self) -> None:
+        """Record this agent (and user) as owner of the session on first write."""
+        if self._register_pending:
+            OwnershipIndex(self._router).register(
+                Ownership(self.session_id, self.agent_id, self.user_id)
+            )
+            self._register_pending = False
+
+    def eraser(self, workers: int = DEFAULT_WORKERS) -> "MemoryEraser":
+        """
+        Bulk erasure of a user's or agent's memories across every session
+        of this client's store (see ``MemoryEraser``)::
+
+            report = client.eraser().erase(user_id="user-42")
+            assert not report.remaining
+
+        Args:
+            workers: (session, agent) pairs erased in parallel.
+        """
+        return MemoryEraser(self._router, workers=workers)
+
+    def transfer(
+        self, batch_size: int = TRANSFER_BATCH, workers: int = TRANSFER_WORKERS
+    ) -> "MemoryTransfer":
+        """
+        Streaming export and import of every entry of this client's store
+        (see ``MemoryTransfer``)::
+
+            client.transfer().export_to("backup.ndjson.gz", compression="gzip")
+            other.transfer().import_from("backup.ndjson.gz")
+
+        Args:
+            batch_size: Keys per backend read or write.
+            workers: Batches read or written in parallel.
+        """
+        return MemoryTransfer(self._router, batch_size=batch_size, workers=workers)
 
-    def write_model(self, memory_model: "BaseMemory") -> None:
+    @property
+    def migration(self) -> Optional["MigratingSessionStore"]:
+        """
+        The migrating store when constructed with ``migrate_from``, to
+        change phase, read metrics and run the backfill::
+
+            client.migration.backfill(rate_limit=500).start()
+            client.migration.set_phase("shadow_read")
+            client.migration.metrics.snapshot()["mismatch_rate"]
+
+        None when no migration is configured.
+        """
+        from agent_memory_hub.data_plane.migrating_session_store import (
+            MigratingSessionStore,
+        )
+
+        store = self._router.store
+        return store if isinstance(store, MigratingSessionStore) else None
+
+    @property
+    def sharding(self) -> Optional["ShardedSessionStore"]:
+        """
+        The sharded store when constructed with ``shards`` (also as the
+        target of a migration), to add or remove shards::
+
+            job = client.sharding.add_shard("r3", StoreFactory.get_store(...))
+            job.join()
+
+        None when the store is not sharded.
+        """
+        from agent_memory_hub.data_plane.sharded_session_store import (
+            ShardedSessionStore,
+        )
+
+        store = self._router.store
+        if self.migration is not None:
+            store = self.migration.target
+        return store if isinstance(store, ShardedSessionStore) else None
+
+    def session(self) -> "MemorySession":
+        """
+        Open a unit of work: reads go through a local working set, writes
+        are buffered (repeated writes of a key coalesce) and flushed with
+        one ``write_many`` when the block exits without an exception::
+
+            with client.session() as s:
+                plan = s.recall("plan")
+                s.write({**plan, "step": 2}, key="plan")
+
+        ``async with client.session()`` works the same way, flushing in
+        the event loop's default executor.
+
+        Returns:
+            A ``MemorySession`` bound to this client.
+        """
+        return MemorySession(self)
+
+    def transaction(self, best_effort: bool = False) -> "MemoryTransaction":
+        """
+        Open a transaction: a ``session()`` whose buffered writes commit
+        all-or-nothing in one round trip on exit (``MULTI``/``EXEC`` on
+        Redis, one SQL transaction on AlloyDB and SQLite, one write
+        transaction on LMDB, one batch on Firestore)::
+
+            with client.transaction() as tx:
+                tx.write_model(profile)
+                tx.write_model(EpisodicMemory(agent_id=..., content=...))
+
+        If the block raises, nothing is written.
+
+        Args:
+            best_effort: On backends without multi-key atomicity (GCS),
+                commit with a plain batched write instead of raising; a
+                failure part-way can then leave some keys written.
+
+        Returns:
+            A ``MemoryTransaction`` bound to this client.
+
+        Raises:
+            NotImplementedError: If the backend cannot commit atomically
+                and ``best_effort`` is False.
+        """
+        atomic = self._router.atomic_writes
+        if not atomic and not best_effort:
+            raise NotImplementedError(
+                f"backend {self.backend!r} cannot commit several keys "
+                f"atomically; use transaction(best_effort=True)"
+            )
+        return MemoryTransaction(self, atomic=atomic)
+
+    def write_model(
+        self, memory_model: "BaseMemory", if_version: Optional[str] = None
+    ) -> Optional[str]:
         """
         Write a semantic memory model to the store.
         
         Args:
             memory_model: Pydantic model instance (EpisodicMemory, SemanticMemory, etc.)
+            if_version: Expected version token of the model's key (see
+                ``write``).
+
+        Returns:
+            The new version token for conditional writes, else None.
+
+        Raises:
+            VersionConflictError: If the key is no longer at ``if_version``.
         """
         # Ensure agent_id matches client if not set (though model has default)
         if hasattr(memory_model, "agent_id") and not memory_model.agent_id:
              memory_model.agent_id = self.agent_id
              
-        # Use model ID or content hash as key? 
-        # For now, we use a predictable key scheme: type/id
-        key = f"{memory_model.__class__.__name__.lower()}/{memory_model.id}"
+        key = self._key_of(memory_model)
         
         # Serialize to dict
         value = memory_model.to_dict()
@@ -123,7 +476,146 @@ class MemoryClient:
             span.set_attribute("memory.type", memory_model.__class__.__name__)
             span.set_attribute("memory.id", memory_model.id)
             
-            self.write(value, key=key)
+            version = self.write(value, key=key, if_version=if_version)
+            for index in self._search_indexes().values():
+                index.add(key, value)
+            return version
+
+    def patch(
+        self,
+        memory: Union["BaseMemory", str],
+        set: Optional[Dict[str, Any]] = None,
+        increment: Optional[Dict[str, Number]] = None,
+    ) -> Any:
+        """
+        Update fields of a stored model (or dict value) in the backend,
+        without recalling and rewriting it. Field paths are dotted;
+        increments made concurrently by other clients are all kept::
+
+            client.patch(
+                procedure,
+                increment={"execution_count": 1},
+                set={"success_rate": 0.9},
+            )
+            client.patch("entitymemory/user-1", set={"attributes.plan": "pro"})
+
+        Args:
+            memory: A memory model or its key.
+            set: Field path to new value.
+            increment: Field path to the number added to it (missing
+                fields count as 0).
+
+        Returns:
+            The updated value.
+
+        Raises:
+            KeyError: If the key does not exist.
+            TypeError: If the fields do not fit the stored value.
+        """
+        change = MemoryPatch(set=set or {}, increment=increment or {})
+        key = self._key_of(memory)
+        with self._tracer.start_as_current_span("MemoryClient.patch") as span:
+            span.set_attribute("agent.id", self.agent_id)
+            span.set_attribute("session.id", self.session_id)
+            span.set_attribute("region", self.region)
+            span.set_attribute("memory.key", key)
+
+            value = self._router.patch(
+                self.session_id, f"{self.agent_id}/{key}", change
+            )
+            if self._local_complete or key in self._local:
+                self._local[key] = copy.deepcopy(value)
+            for index in self._search_indexes().values():
+                index.add(key, value)
+            return value
+
+    def increment(
+        self, memory: Union["BaseMemory", str], field: str, by: Number = 1
+    ) -> Number:
+        """
+        Atomically add to a numeric field of a stored model (see ``patch``).
+
+        Args:
+            memory: A memory model or its key.
+            field: Dotted field path, e.g. "execution_count".
+            by: Amount to add.
+
+        Returns:
+            The field's new value.
+        """
+        value = self.patch(memory, increment={field: by})
+        for part in field.split("."):
+            value = value[part]
+        return value
+
+    def delete(self, memory: Union["BaseMemory", str]) -> bool:
+        """
+        Delete a stored model (or key) with its index entries.
+
+        Args:
+            memory: A memory model or its key.
+
+        Returns:
+            True if a live value was deleted.
+        """
+        key = self._key_of(memory)
+        with self._tracer.start_as_current_span("MemoryClient.delete") as span:
+            span.set_attribute("agent.id", self.agent_id)
+            span.set_attribute("session.id", self.session_id)
+            span.set_attribute("region", self.region)
+            span.set_attribute("memory.key", key)
+
+            deleted = self._router.delete(self.session_id, f"{self.agent_id}/{key}")
+            self._local.pop(key, None)
+            for index in self._search_indexes().values():
+                index.remove(key)
+            return deleted
+
+    def delete_session(self) -> int:
+        """
+        Delete the whole session: the keys of every agent in it, their
+        index entries and the session's episode logs, in as few backend
+        calls as the backend allows.
+
+        Returns:
+            Number of live keys deleted.
+        """
+        with self._tracer.start_as_current_span("MemoryClient.delete_session") as span:
+            span.set_attribute("agent.id", self.agent_id)
+            span.set_attribute("session.id", self.session_id)
+            span.set_attribute("region", self.region)
+
+            deleted = self._router.delete_session(self.session_id)
+            self._local = {}
+            for index in self._search_indexes().values():
+                index.clear()
+            span.set_attribute("memory.count", deleted)
+            return deleted
+
+    def iter_keys(self, prefix: str = "") -> Iterator[str]:
+        """
+        Stream this agent's keys in the session, fetched from the backend
+        in batches::
+
+            for key in client.iter_keys("episodicmemory/"):
+                ...
+
+        Args:
+            prefix: Only keys starting with this prefix.
+
+        Yields:
+            Keys as used with ``write`` and ``recall``.
+        """
+        agent_prefix = f"{self.agent_id}/"
+        for key in self._router.iter_keys(self.session_id, agent_prefix + prefix):
+            yield key[len(agent_prefix):]
+
+    @staticmethod
+    def _key_of(memory: Union["BaseMemory", str]) -> str:
+        """Store key of a model (predictable scheme: type/id) or a key as is."""
+        if isinstance(memory, BaseMemory):
+            return f"{memory.__class__.__name__.lower()}/{memory.id}"
+        return memory
 
     def recall(self, key: str = "default") -> Optional[Any]:
         """
@@ -140,7 +632,714 @@ class MemoryClient:
             span.set_attribute("session.id", self.session_id)
             span.set_attribute("region", self.region)
             span.set_attribute("memory.key", key)
-            
+
+            if self._local_complete or key in self._local:
+                span.set_attribute("memory.local", True)
+                return copy.deepcopy(self._local.get(key))
             composite_key = f"{self.agent_id}/{key}"
             return self._router.read(self.session_id, composite_key)
 
+    def recall_with_version(self, key: str = "default") -> Tuple[Optional[Any], str]:
+        """
+        Recall a value from the backend with its version token, for a
+        later ``write(..., if_version=...)``. Loaded sessions are bypassed,
+        as the version must be the backend's current one.
+
+        Args:
+            key: The key used during write.
+
+        Returns:
+            The stored value (None if not found) and its version token
+            (``MISSING_VERSION`` if not found).
+        """
+        with self._tracer.start_as_current_span(
+            "MemoryClient.recall_with_version"
+        ) as span:
+            span.set_attribute("agent.id", self.agent_id)
+            span.set_attribute("session.id", self.session_id)
+            span.set_attribute("region", self.region)
+            span.set_attribute("memory.key", key)
+
+            composite_key = f"{self.agent_id}/{key}"
+            return self._router.read_versioned(self.session_id, composite_key)
+
+    def recall_many(self, keys: Sequence[str]) -> List[Optional[Any]]:
+        """
+        Recall several values in one batched backend call.
+
+        Args:
+            keys: The keys used during write.
+
+        Returns:
+            The stored values, aligned with ``keys`` (None if not found).
+        """
+        with self._tracer.start_as_current_span("MemoryClient.recall_many") as span:
+            span.set_attribute("agent.id", self.agent_id)
+            span.set_attribute("session.id", self.session_id)
+            span.set_attribute("region", self.region)
+            span.set_attribute("memory.count", len(keys))
+
+            missing = [
+                key
+                for key in keys
+                if not self._local_complete and key not in self._local
+            ]
+            fetched = dict(
+                zip(
+                    missing,
+                    self._router.read_many(
+                        self.session_id, [f"{self.agent_id}/{key}" for key in missing]
+                    )
+                    if missing
+                    else [],
+                    strict=True,
+                )
+            )
+            span.set_attribute("memory.local", len(keys) - len(missing))
+            return [
+                fetched[key] if key in fetched else copy.deepcopy(self._local.get(key))
+                for key in keys
+            ]
+
+    def load_session(self) -> Dict[str, Any]:
+        """
+        Fetch all of this agent's keys in the session with one backend read
+        (a single SELECT, document get or SORT, or one listing plus
+        parallel downloads on GCS).
+
+        Until ``unload_session``, ``recall`` and ``recall_many`` are served
+        from the loaded values and this client's own writes, without
+        further round trips; writes by other clients are not seen.
+
+        Returns:
+            Mapping of key to value.
+        """
+        with self._tracer.start_as_current_span("MemoryClient.load_session") as span:
+            span.set_attribute("agent.id", self.agent_id)
+            span.set_attribute("session.id", self.session_id)
+            span.set_attribute("region", self.region)
+
+            prefix = f"{self.agent_id}/"
+            values = self._router.read_session(self.session_id, prefix)
+            self._local = {key[len(prefix):]: value for key, value in values.items()}
+            self._local_complete = True
+            span.set_attribute("memory.count", len(self._local))
+            return copy.deepcopy(self._local)
+
+    def prefetch(self, keys: Sequence[str]) -> None:
+        """
+        Fetch a known set of keys with one batched read and serve later
+        ``recall`` calls for them locally, like ``load_session`` but
+        without reading the rest of the session.
+
+        Args:
+            keys: The keys used during write.
+        """
+        with self._tracer.start_as_current_span("MemoryClient.prefetch") as span:
+            span.set_attribute("agent.id", self.agent_id)
+            span.set_attribute("session.id", self.session_id)
+            span.set_attribute("region", self.region)
+            span.set_attribute("memory.count", len(keys))
+
+            keys = list(dict.fromkeys(keys))
+            values = self._router.read_many(
+                self.session_id, [f"{self.agent_id}/{key}" for key in keys]
+            )
+            self._local.update(zip(keys, values, strict=True))
+
+    def unload_session(self) -> None:
+        """Drop values loaded by ``load_session`` or ``prefetch``."""
+        self._local = {}
+        self._local_complete = False
+
+    def link(
+        self,
+        source: Union["BaseMemory", str],
+        relation: Union[Relation, str],
+        target: Union["BaseMemory", str],
+    ) -> None:
+        """
+        Add a typed edge between two memories. The edge is stored in the
+        source's forward and the target's reverse adjacency list, so it can
+        be followed either way.
+
+        Args:
+            source: Model or key the edge starts at.
+            relation: Edge type, e.g. ``Relation.SUPERSEDES``.
+            target: Model or key the edge points to.
+        """
+        self._update_edge(source, relation, target, graph.with_edge)
+
+    def unlink(
+        self,
+        source: Union["BaseMemory", str],
+        relation: Union[Relation, str],
+        target: Union["BaseMemory", str],
+    ) -> None:
+        """
+        Remove an edge added by ``link``.
+
+        Args:
+            source: Model or key the edge starts at.
+            relation: Edge type.
+            target: Model or key the edge points to.
+        """
+        self._update_edge(source, relation, target, graph.without_edge)
+
+    def _update_edge(self, source, relation, target, update) -> None:
+        source_key, target_key = self._key_of(source), self._key_of(target)
+        relation = Relation(relation).value
+        with self._tracer.start_as_current_span("MemoryClient.link") as span:
+            span.set_attribute("agent.id", self.agent_id)
+            span.set_attribute("session.id", self.session_id)
+            span.set_attribute("memory.relation", relation)
+
+            self._update_adjacency(
+                graph.adjacency_key(source_key, "out"), update, relation, target_key
+            )
+            self._update_adjacency(
+                graph.adjacency_key(target_key, "in"), update, relation, source_key
+            )
+
+    def _update_adjacency(self, key, update, relation, neighbour) -> None:
+        """
+        Compare-and-set one edge list, re-reading it when another client
+        changed it in between, so concurrent links are all kept.
+        """
+        for _ in range(self._router.store.PATCH_ATTEMPTS):
+            adjacency, version = self.recall_with_version(key)
+            try:
+                self.write(
+                    update(adjacency, relation, neighbour), key=key, if_version=version
+                )
+            except VersionConflictError:
+                continue
+            return
+        raise RuntimeError(
+            f"Could not update edges of {key!r}: too much contention"
+        )
+
+    def edges(
+        self, memory: Union["BaseMemory", str], direction: str = "out"
+    ) -> Dict[str, List[str]]:
+        """
+        List a memory's edges.
+
+        Args:
+            memory: Model or key.
+            direction: "out" for edges starting at the memory, "in" for
+                edges pointing to it.
+
+        Returns:
+            Mapping of relation to neighbour keys.
+        """
+        if direction not in ("out", "in"):
+            raise ValueError('direction must be "out" or "in"')
+        return graph.edges_of(
+            self.recall(graph.adjacency_key(self._key_of(memory), direction))
+        )
+
+    def expand(
+        self,
+        start: Union["BaseMemory", str, Sequence[Union["BaseMemory", str]]],
+        depth: int = 1,
+        relations: Optional[Sequence[Union[Relation, str]]] = None,
+        direction: str = "out",
+        max_nodes: int = DEFAULT_MAX_NODES,
+    ) -> List[GraphNode]:
+        """
+        Collect the memories within ``depth`` hops of ``start``, for
+        graph-augmented recall. Each hop is one batched backend read.
+
+        Args:
+            start: Model(s) or key(s) to expand from.
+            depth: Maximum number of hops.
+            relations: Only follow these edge types (None = all).
+            direction: Follow edges "out", "in" (reverse) or "both".
+            max_nodes: Upper bound on memories returned.
+
+        Returns:
+            Reached memories (start memories at depth 0) in breadth-first
+            order, with the edge each was reached by.
+        """
+        if isinstance(start, (BaseMemory, str)):
+            start = [start]
+        with self._tracer.start_as_current_span("MemoryClient.expand") as span:
+            span.set_attribute("agent.id", self.agent_id)
+            span.set_attribute("session.id", self.session_id)
+            span.set_attribute("region", self.region)
+            span.set_attribute("graph.depth", depth)
+
+            nodes = graph.expand(
+                [self._key_of(memory) for memory in start],
+                self.recall_many,
+                depth=depth,
+                relations=(
+                    None
+                    if relations is None
+                    else [Relation(r).value for r in relations]
+                ),
+                direction=direction,
+                max_nodes=max_nodes,
+            )
+            span.set_attribute("graph.nodes", len(nodes))
+            return nodes
+
+    def query(
+        self,
+        memory_type: Union[Type["BaseMemory"], str, None] = None,
+        scope: Union[MemoryScope, str, None] = None,
+        tags: Optional[Sequence[str]] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        limit: int = DEFAULT_LIMIT,
+        cursor: Optional[str] = None,
+        any_tags: Optional[Sequence[str]] = None,
+    ) -> QueryPage:
+        """
+        List this agent's memory models in the session, filtered through the
+        backend's secondary indexes.
+
+        Args:
+            memory_type: Model class (e.g. SemanticMemory) or its name.
+            scope: Memory scope.
+            tags: Tags that must all be present.
+            since: Earliest ``created_at`` (inclusive; naive = UTC).
+            until: Latest ``created_at`` (exclusive; naive = UTC).
+            limit: Maximum results per page (1-1000).
+            cursor: ``next_cursor`` of the previous page.
+            any_tags: Tags of which at least one must be present.
+
+        Returns:
+            A page of model dicts, oldest first, whose ``keys`` can be passed
+            to ``recall``; ``next_cursor`` is None on the last page.
+        """
+        if isinstance(memory_type, type):
+            memory_type = memory_type.__name__
+        if isinstance(scope, MemoryScope):
+            scope = scope.value
+
+        with self._tracer.start_as_current_span("MemoryClient.query") as span:
+            span.set_attribute("agent.id", self.agent_id)
+            span.set_attribute("session.id", self.session_id)
+            span.set_attribute("region", self.region)
+            if memory_type is not None:
+                span.set_attribute("memory.type", memory_type)
+
+            prefix = f"{self.agent_id}/"
+            query = MemoryQuery(
+                memory_type=memory_type,
+                scope=scope,
+                tags=tuple(tags or ()),
+                since=since,
+                until=until,
+                key_prefix=prefix,
+                limit=limit,
+                cursor=cursor,
+                any_tags=tuple(any_tags or ()),
+            )
+            page = self._router.query(self.session_id, query)
+            span.set_attribute("query.results", len(page))
+            return replace(page, keys=[key[len(prefix):] for key in page.keys])
+
+    def match_triples(
+        self,
+        subject: Optional[str] = None,
+        predicate: Optional[str] = None,
+        object: Optional[str] = None,
+        limit: int = DEFAULT_LIMIT,
+        cursor: Optional[str] = None,
+    ) -> QueryPage:
+        """
+        List this agent's SemanticMemory models in the session matching a
+        ``(subject, predicate, object)`` pattern, served by the backend's
+        SPO/POS/OSP indexes.
+
+        Args:
+            subject: Required subject (None = any).
+            predicate: Required predicate (None = any).
+            object: Required object (None = any).
+            limit: Maximum results per page (1-1000).
+            cursor: ``next_cursor`` of the previous page.
+
+        Returns:
+            A page of model dicts, highest ``truth_score`` first, whose
+            ``keys`` can be passed to ``recall``; ``next_cursor`` is None on
+            the last page.
+        """
+        with self._tracer.start_as_current_span("MemoryClient.match_triples") as span:
+            span.set_attribute("agent.id", self.agent_id)
+            span.set_attribute("session.id", self.session_id)
+            span.set_attribute("region", self.region)
+
+            prefix = f"{self.agent_id}/"
+            pattern = TriplePattern(
+                subject=subject,
+                predicate=predicate,
+                object=object,
+                key_prefix=prefix,
+                limit=limit,
+                cursor=cursor,
+            )
+            page = self._router.match_triples(self.session_id, pattern)
+            span.set_attribute("query.results", len(page))
+            return replace(page, keys=[key[len(prefix):] for key in page.keys])
+
+    def rank(
+        self,
+        by: str = "importance",
+        memory_type: Union[Type["BaseMemory"], str, None] = None,
+        scope: Union[MemoryScope, str, None] = None,
+        limit: int = DEFAULT_LIMIT,
+        cursor: Optional[str] = None,
+    ) -> QueryPage:
+        """
+        List this agent's top memory models in the session by importance or
+        recency, served by the backend's ordered indexes instead of a scan.
+
+        Args:
+            by: "importance" (models with a numeric ``importance``) or
+                "recency" (``timestamp`` of episodes, ``updated_at`` of
+                other models).
+            memory_type: Model class (e.g. EpisodicMemory) or its name.
+            scope: Memory scope.
+            limit: Maximum results per page (1-1000).
+            cursor: ``next_cursor`` of the previous page.
+
+        Returns:
+            A page of model dicts, highest value first, whose ``keys`` can be
+            passed to ``recall``; ``next_cursor`` is None on the last page.
+        """
+        if isinstance(memory_type, type):
+            memory_type = memory_type.__name__
+        if isinstance(scope, MemoryScope):
+            scope = scope.value
+
+        with self._tracer.start_as_current_span("MemoryClient.rank") as span:
+            span.set_attribute("agent.id", self.agent_id)
+            span.set_attribute("session.id", self.session_id)
+            span.set_attribute("region", self.region)
+            span.set_attribute("rank.by", by)
+
+            prefix = f"{self.agent_id}/"
+            query = RankQuery(
+                by=by,
+                memory_type=memory_type,
+                scope=scope,
+                key_prefix=prefix,
+                limit=limit,
+                cursor=cursor,
+            )
+            page = self._router.rank(self.session_id, query)
+            span.set_attribute("query.results", len(page))
+            return replace(page, keys=[key[len(prefix):] for key in page.keys])
+
+    def append_episode(
+        self,
+        episode: Union[EpisodicMemory, str],
+        max_len: Optional[int] = None,
+    ) -> LogEntry:
+        """
+        Append an episode to this agent's episode log in the session.
+
+        The log is ordered by append time and kept apart from ``write``'s
+        key-value data, so appending never rewrites earlier entries.
+
+        Args:
+            episode: EpisodicMemory, or its content as a string.
+            max_len: Keep only the newest ``max_len`` episodes (None = all).
+
+        Returns:
+            The appended entry; its ``value`` is the episode dict.
+        """
+        return self.append_episodes([episode], max_len=max_len)[0]
+
+    def append_episodes(
+        self,
+        episodes: Sequence[Union[EpisodicMemory, str]],
+        max_len: Optional[int] = None,
+    ) -> List[LogEntry]:
+        """
+        Append several episodes to this agent's episode log in one backend
+        call.
+
+        Args:
+            episodes: EpisodicMemory models or contents, in order.
+            max_len: Keep only the newest ``max_len`` episodes (None = all).
+
+        Returns:
+            The appended entries, in order.
+        """
+        if max_len is not None and max_len < 1:
+            raise ValueError("max_len must be at least 1")
+        values = [
+            EpisodicMemory(agent_id=self.agent_id, content=episode).to_dict()
+            if isinstance(episode, str)
+            else episode.to_dict()
+            for episode in episodes
+        ]
+        if not values:
+            return []
+
+        with self._tracer.start_as_current_span(
+            "MemoryClient.append_episodes"
+        ) as span:
+            span.set_attribute("agent.id", self.agent_id)
+            span.set_attribute("session.id", self.session_id)
+            span.set_attribute("region", self.region)
+            span.set_attribute("memory.count", len(values))
+
+            self._register_owner()
+            return self._router.append(
+                self.session_id, self.agent_id, values, max_len
+            )
+
+    def tail(self, n: int = DEFAULT_TAIL) -> List[Dict[str, Any]]:
+        """
+        Return this agent's ``n`` most recent episodes, oldest first.
+
+        Args:
+            n: Number of episodes (1-1000).
+
+        Returns:
+            Episode dicts in append order.
+        """
+        page = self.episodes(limit=n, reverse=True)
+        return list(page)[::-1]
+
+    def episodes(
+        self,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        limit: int = DEFAULT_LIMIT,
+        cursor: Optional[str] = None,
+        reverse: bool = False,
+    ) -> LogPage:
+        """
+        Read one page of this agent's episode log.
+
+        Args:
+            since: Earliest append time (inclusive).
+            until: Latest append time (exclusive).
+            limit: Maximum episodes per page (1-1000).
+            cursor: ``next_cursor`` of the previous page.
+            reverse: Newest episodes first.
+
+        Returns:
+            A page of entries (iterating it yields the episode dicts);
+            ``next_cursor`` is None on the last page.
+        """
+        with self._tracer.start_as_current_span("MemoryClient.episodes") as span:
+            span.set_attribute("agent.id", self.agent_id)
+            span.set_attribute("session.id", self.session_id)
+            span.set_attribute("region", self.region)
+
+            query = LogQuery(
+                stream=self.agent_id,
+                since=since,
+                until=until,
+                reverse=reverse,
+                limit=limit,
+                cursor=cursor,
+            )
+            page = self._router.read_log(self.session_id, query)
+            span.set_attribute("query.results", len(page))
+            return page
+
+    def iter_episodes(
+        self,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        reverse: bool = False,
+        batch_size: int = DEFAULT_LIMIT,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Stream this agent's episodes, fetching ``batch_size`` at a time.
+
+        Args:
+            since: Earliest append time (inclusive).
+            until: Latest append time (exclusive).
+            reverse: Newest episodes first.
+            batch_size: Episodes per backend read (1-1000).
+
+        Yields:
+            Episode dicts in read order.
+        """
+        cursor = None
+        while True:
+            page = self.episodes(
+                since=since,
+                until=until,
+                limit=batch_size,
+                cursor=cursor,
+                reverse=reverse,
+            )
+            yield from page
+            cursor = page.next_cursor
+            if cursor is None:
+                return
+
+    def search(
+        self,
+        text: str,
+        k: int = 10,
+        filters: Optional[Dict[str, Any]] = None,
+        mode: Optional[str] = None,
+    ) -> List[SearchResult]:
+        """
+        Find the episodic and semantic memories most relevant to ``text``.
+
+        Requires an ``embedder`` or ``keyword_search``. Memories are indexed
+        as they are written by this client; call ``rebuild_search_index`` to
+        index existing ones.
+
+        Args:
+            text: Query text.
+            k: Maximum number of results.
+            filters: Optional ``memory_type`` (class or name), ``scope``,
+                ``tags`` (all required) and ``any_tags`` (at least one)
+                constraints.
+            mode: "vector" (cosine similarity), "keyword" (BM25) or "hybrid"
+                (both, merged by reciprocal rank fusion). Defaults to
+                "hybrid" when both indexes are enabled.
+
+        Returns:
+            Results with key, score and stored model dict, best first. With
+            a ``ranking_config`` the score is the weighted ranking score.
+        """
+        indexes = self._search_indexes()
+        if not indexes:
+            raise ValueError(
+                "search requires MemoryClient(embedder=...) or keyword_search=True"
+            )
+        if mode is None:
+            mode = "hybrid" if len(indexes) == 2 else next(iter(indexes))
+        if mode not in SEARCH_MODES:
+            raise ValueError(
+                f"Unknown search mode '{mode}'. Use one of {', '.join(SEARCH_MODES)}"
+            )
+        needed = ("vector", "keyword") if mode == "hybrid" else (mode,)
+        missing = [name for name in needed if name not in indexes]
+        if missing:
+            raise ValueError(
+                f"search mode '{mode}' requires the {' and '.join(missing)} index"
+            )
+
+        filters = dict(filters or {})
+        unknown = set(filters) - {"memory_type", "scope", "tags", "any_tags"}
+        if unknown:
+            raise ValueError(f"Unknown search filters: {', '.join(sorted(unknown))}")
+        memory_type = filters.get("memory_type")
+        if isinstance(memory_type, type):
+            memory_type = memory_type.__name__
+        scope = filters.get("scope")
+        if isinstance(scope, MemoryScope):
+            scope = scope.value
+
+        with self._tracer.start_as_current_span("MemoryClient.search") as span:
+            span.set_attribute("agent.id", self.agent_id)
+            span.set_attribute("session.id", self.session_id)
+            span.set_attribute("region", self.region)
+            span.set_attribute("search.k", k)
+            span.set_attribute("search.mode", mode)
+
+            pool = k
+            if self._ranking is not None:
+                pool = max(k, self._ranking.config.candidates)
+            # Fuse deeper candidate lists than requested so that a memory
+            # ranked moderately by both indexes can still surface
+            depth = max(4 * pool, 50) if mode == "hybrid" else pool
+            rankings = [
+                indexes[name].search(
+                    text,
+                    k=depth,
+                    memory_type=memory_type,
+                    scope=scope,
+                    tags=tuple(filters.get("tags") or ()),
+                    any_tags=tuple(filters.get("any_tags") or ()),
+                )
+                for name in needed
+            ]
+            if mode == "hybrid":
+                results = reciprocal_rank_fusion(rankings, k=pool)
+            else:
+                results = rankings[0]
+
+            found = []
+            values = self.recall_many([result.key for result in results])
+            for result, value in zip(results, values, strict=True):
+                result.value = value
+                if value is None:
+                    # Expired or deleted since it was indexed
+                    for index in indexes.values():
+                        index.remove(result.key)
+                else:
+                    found.append(result)
+            if self._ranking is not None:
+                found = self._rerank(found, k)
+            for result in found:
+                self._access_counts[result.key] = (
+                    self._access_counts.get(result.key, 0) + 1
+                )
+            span.set_attribute("search.results", len(found))
+            return found
+
+    def _rerank(self, results: List[SearchResult], k: int) -> List[SearchResult]:
+        from agent_memory_hub.indexing.ranking import Candidates
+
+        candidates = Candidates.from_values(
+            [r.key for r in results],
+            [r.value for r in results],
+            relevance=[r.score for r in results],
+            access_counts=self._access_counts,
+        )
+        by_key = {r.key: r for r in results}
+        ranked = []
+        for key, score in self._ranking.rank(candidates, k):
+            result = by_key[key]
+            result.score = score
+            ranked.append(result)
+        return ranked
+
+    def _search_indexes(self) -> Dict[str, ScopedIndex]:
+        indexes = {}
+        if self._embeddings is not None:
+            indexes["vector"] = self._embeddings
+        if self._keywords is not None:
+            indexes["keyword"] = self._keywords
+        return indexes
+
+    def rebuild_search_index(self, batch_size: int = 256) -> int:
+        """
+        Index this agent's stored episodic and semantic memories, e.g. after
+        a restart. Uses the backend's query index to list them.
+
+        Args:
+            batch_size: Memories listed and indexed per round trip.
+
+        Returns:
+            Number of memories indexed.
+        """
+        indexes = self._search_indexes()
+        if not indexes:
+            raise ValueError(
+                "search requires MemoryClient(embedder=...) or keyword_search=True"
+            )
+        with self._tracer.start_as_current_span(
+            "MemoryClient.rebuild_search_index"
+        ) as span:
+            indexed = 0
+            for memory_type in ("EpisodicMemory", "SemanticMemory"):
+                cursor = None
+                while True:
+                    page = self.query(
+                        memory_type=memory_type, limit=batch_size, cursor=cursor
+                    )
+                    items = list(zip(page.keys, page.items, strict=True))
+                    counts = [index.add_many(items) for index in indexes.values()]
+                    indexed += counts[0]
+                    cursor = page.next_cursor
+                    if cursor is None:
+                        break
+            span.set_attribute("search.indexed", indexed)
+            return indexed
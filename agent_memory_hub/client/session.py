@@ -0,0 +1,178 @@
+"""
+Unit-of-work sessions: a local working set over a MemoryClient whose
+writes are buffered and flushed in one batched backend call, and
+transactions that commit them all-or-nothing.
+"""
+
+import asyncio
+import copy
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence
+
+if TYPE_CHECKING:
+    from agent_memory_hub.client.memory_client import MemoryClient
+    from agent_memory_hub.models.base import BaseMemory
+
+
+class MemorySession:
+    """
+    Working set of one agent's keys, opened with ``MemoryClient.session()``.
+
+    ``recall`` reads a key from the backend once and then serves it from
+    the working set; ``write`` only records the value, so the block sees
+    its own writes and repeated writes of a key send just the last one.
+    ``flush`` sends every pending write with one ``write_many``. Leaving
+    the block flushes, unless it raised, in which case pending writes are
+    discarded and nothing reaches the backend.
+
+    Sessions are not thread-safe; use one per task.
+    """
+
+    def __init__(self, client: "MemoryClient"):
+        self.client = client
+        self._tracer = client._tracer
+        self._values: Dict[str, Any] = {}  # keys read or written so far
+        self._pending: Dict[str, Any] = {}  # keys written since the last flush
+        self._models: Dict[str, Any] = {}  # pending keys written as models
+
+    @property
+    def pending(self) -> List[str]:
+        """Keys written but not yet flushed."""
+        return list(self._pending)
+
+    def write(self, value: Any, key: str = "default") -> None:
+        """
+        Buffer a write, replacing any pending write of the same key.
+
+        Args:
+            value: The data to store.
+            key: The key to store it under.
+        """
+        value = copy.deepcopy(value)
+        self._values[key] = self._pending[key] = value
+        self._models.pop(key, None)
+
+    def write_model(self, memory_model: "BaseMemory") -> None:
+        """
+        Buffer a memory model write (see ``MemoryClient.write_model``).
+
+        Args:
+            memory_model: Pydantic model instance.
+        """
+        if hasattr(memory_model, "agent_id") and not memory_model.agent_id:
+            memory_model.agent_id = self.client.agent_id
+        key = self.client._key_of(memory_model)
+        self.write(memory_model.to_dict(), key=key)
+        self._models[key] = self._pending[key]
+
+    def recall(self, key: str = "default") -> Optional[Any]:
+        """
+        Read a key from the working set, fetching it on first use.
+
+        Args:
+            key: The key used during write.
+
+        Returns:
+            The value (pending writes included) or None if not found.
+        """
+        if key not in self._values:
+            self._values[key] = self.client.recall(key)
+        return copy.deepcopy(self._values[key])
+
+    def recall_many(self, keys: Sequence[str]) -> List[Optional[Any]]:
+        """
+        Read several keys, fetching those not yet in the working set with
+        one batched call.
+
+        Args:
+            keys: The keys used during write.
+
+        Returns:
+            The values, aligned with ``keys`` (None if not found).
+        """
+        missing = [key for key in dict.fromkeys(keys) if key not in self._values]
+        if missing:
+            self._values.update(
+                zip(missing, self.client.recall_many(missing), strict=True)
+            )
+        return [copy.deepcopy(self._values[key]) for key in keys]
+
+    def flush(self) -> int:
+        """
+        Send the pending writes with one batched backend call.
+
+        Returns:
+            Number of keys written.
+        """
+        with self._tracer.start_as_current_span(
+            f"{type(self).__name__}.flush"
+        ) as span:
+            span.set_attribute("agent.id", self.client.agent_id)
+            span.set_attribute("session.id", self.client.session_id)
+            span.set_attribute("memory.count", len(self._pending))
+
+            if not self._pending:
+                return 0
+            pending, models = self._pending, self._models
+            self._send(pending)
+            self._pending, self._models = {}, {}
+            for index in self.client._search_indexes().values():
+                for key, value in models.items():
+                    index.add(key, value)
+            return len(pending)
+
+    def _send(self, items: Dict[str, Any]) -> None:
+        self.client.write_many(items)
+
+    def discard(self) -> None:
+        """Drop pending writes and the working set."""
+        self._values, self._pending, self._models = {}, {}, {}
+
+    def __enter__(self) -> "MemorySession":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.flush()
+        else:
+            self.discard()
+
+    async def __aenter__(self) -> "MemorySession":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            await asyncio.get_running_loop().run_in_executor(None, self.flush)
+        else:
+            self.discard()
+
+
+class MemoryTransaction(MemorySession):
+    """
+    Session whose writes commit all-or-nothing, opened with
+    ``MemoryClient.transaction()``.
+
+    ``commit`` (called on a clean exit) sends the pending writes with one
+    atomic backend write; ``rollback`` (called if the block raises) drops
+    them. When ``atomic`` is False (best-effort mode on GCS) the commit is
+    a plain batched write.
+    """
+
+    def __init__(self, client: "MemoryClient", atomic: bool = True):
+        super().__init__(client)
+        self.atomic = atomic
+
+    def _send(self, items: Dict[str, Any]) -> None:
+        self.client.write_many(items, atomic=self.atomic)
+
+    def commit(self) -> int:
+        """
+        Commit the pending writes.
+
+        Returns:
+            Number of keys written.
+        """
+        return self.flush()
+
+    def rollback(self) -> None:
+        """Drop the pending writes and the working set."""
+        self.discard()
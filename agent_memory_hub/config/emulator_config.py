@@ -0,0 +1,92 @@
+"""
+Configuration for in-process backend emulators.
+"""
+import os
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+
+LATENCY_DISTRIBUTIONS = ("constant", "uniform", "normal", "lognormal", "exponential")
+THROTTLE_MODES = ("delay", "reject")
+
+
+@dataclass
+class EmulatorConfig:
+    """
+    Configuration for running a backend against a deterministic local emulator
+    instead of the real service.
+
+    Attributes:
+        namespace: Emulated "server"; stores created with the same namespace
+            share data, different namespaces are isolated
+        latency_ms: Mean latency injected per emulated API call
+        distribution: Shape of the latency distribution ("constant", "uniform",
+            "normal", "lognormal", "exponential")
+        jitter_ms: Extra uniform jitter in [0, jitter_ms) added to every call
+        sigma: Shape parameter for "normal" (as a fraction of the mean) and
+            "lognormal" distributions
+        operation_latency_ms: Per-operation mean latency overrides,
+            e.g. {"redis.set": 2.0, "gcs.upload": 40.0}
+        error_rate: Probability (0.0 - 1.0) that a call fails with
+            EmulatorUnavailableError
+        throttle_ops_per_second: Token bucket rate limit (None = unlimited)
+        throttle_burst: Token bucket capacity
+        throttle_mode: "delay" waits for a token, "reject" raises
+            EmulatorThrottledError
+        seed: Seed for latency and error sampling (None = non-deterministic)
+        sqlite_path: Database file for the AlloyDB emulator
+            (None = temporary database file per namespace)
+    """
+    namespace: str = "default"
+    latency_ms: float = 0.0
+    distribution: str = "constant"
+    jitter_ms: float = 0.0
+    sigma: float = 0.5
+    operation_latency_ms: Dict[str, float] = field(default_factory=dict)
+    error_rate: float = 0.0
+    throttle_ops_per_second: Optional[float] = None
+    throttle_burst: int = 1
+    throttle_mode: str = "delay"
+    seed: Optional[int] = 0
+    sqlite_path: Optional[str] = None
+
+    def __post_init__(self):
+        if self.distribution not in LATENCY_DISTRIBUTIONS:
+            raise ValueError(
+                f"Unknown latency distribution: {self.distribution}. "
+                f"Supported: {LATENCY_DISTRIBUTIONS}"
+            )
+        if self.throttle_mode not in THROTTLE_MODES:
+            raise ValueError(
+                f"Unknown throttle mode: {self.throttle_mode}. "
+                f"Supported: {THROTTLE_MODES}"
+            )
+        if not 0.0 <= self.error_rate <= 1.0:
+            raise ValueError("error_rate must be between 0 and 1")
+
+    @classmethod
+    def from_env(cls) -> "EmulatorConfig":
+        """
+        Create config from environment variables.
+
+        Expected env vars (all optional):
+        - EMULATOR_NAMESPACE
+        - EMULATOR_LATENCY_MS
+        - EMULATOR_DISTRIBUTION
+        - EMULATOR_JITTER_MS
+        - EMULATOR_ERROR_RATE
+        - EMULATOR_THROTTLE_OPS
+        - EMULATOR_SEED
+        - EMULATOR_SQLITE_PATH
+        """
+        throttle = os.environ.get("EMULATOR_THROTTLE_OPS")
+        seed = os.environ.get("EMULATOR_SEED", "0")
+        return cls(
+            namespace=os.environ.get("EMULATOR_NAMESPACE", "default"),
+            latency_ms=float(os.environ.get("EMULATOR_LATENCY_MS", "0")),
+            distribution=os.environ.get("EMULATOR_DISTRIBUTION", "constant"),
+            jitter_ms=float(os.environ.get("EMULATOR_JITTER_MS", "0")),
+            error_rate=float(os.environ.get("EMULATOR_ERROR_RATE", "0")),
+            throttle_ops_per_second=float(throttle) if throttle else None,
+            seed=int(seed) if seed else None,
+            sqlite_path=os.environ.get("EMULATOR_SQLITE_PATH"),
+        )
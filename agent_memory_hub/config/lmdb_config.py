@@ -0,0 +1,45 @@
+"""
+Configuration for the LMDB backend.
+"""
+import os
+from dataclasses import dataclass
+
+
+@dataclass
+class LmdbConfig:
+    """
+    Configuration for the memory-mapped LMDB session store.
+
+    Attributes:
+        path: Environment directory, shared by every process on the host
+        map_size: Initial size of the memory map in bytes (default: 1 GiB).
+            Grown automatically when full.
+        max_readers: Maximum concurrent read transactions across processes
+        sync: Flush to disk on every commit (False trades durability of the
+            last transactions on power loss for write throughput)
+        readahead: OS readahead on the map; disable for random access to
+            databases larger than RAM
+    """
+    path: str = "agent_memory_hub.lmdb"
+    map_size: int = 1 << 30
+    max_readers: int = 126
+    sync: bool = True
+    readahead: bool = False
+
+    @classmethod
+    def from_env(cls) -> "LmdbConfig":
+        """
+        Create config from environment variables.
+
+        Expected env vars (all optional):
+        - LMDB_PATH
+        - LMDB_MAP_SIZE
+        - LMDB_MAX_READERS
+        - LMDB_SYNC
+        """
+        return cls(
+            path=os.environ.get("LMDB_PATH", "agent_memory_hub.lmdb"),
+            map_size=int(os.environ.get("LMDB_MAP_SIZE", str(1 << 30))),
+            max_readers=int(os.environ.get("LMDB_MAX_READERS", "126")),
+            sync=os.environ.get("LMDB_SYNC", "True").lower() == "true",
+        )
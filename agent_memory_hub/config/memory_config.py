@@ -0,0 +1,45 @@
+"""
+Configuration for the in-process memory backend.
+"""
+import os
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass
+class MemoryStoreConfig:
+    """
+    Configuration for the sharded in-memory session store.
+
+    Attributes:
+        shards: Number of lock-striped shards (default: 16). More shards
+            reduce lock contention between concurrent writers.
+        snapshot_path: File to load on startup and snapshot to (None = purely
+            in-memory, nothing survives a restart)
+        snapshot_interval_seconds: Snapshot periodically in a background
+            thread (None = only on close() / explicit snapshot())
+    """
+    shards: int = 16
+    snapshot_path: Optional[str] = None
+    snapshot_interval_seconds: Optional[float] = None
+
+    def __post_init__(self):
+        if self.shards < 1:
+            raise ValueError("shards must be at least 1")
+
+    @classmethod
+    def from_env(cls) -> "MemoryStoreConfig":
+        """
+        Create config from environment variables.
+
+        Expected env vars (all optional):
+        - MEMORY_SHARDS
+        - MEMORY_SNAPSHOT_PATH
+        - MEMORY_SNAPSHOT_INTERVAL
+        """
+        interval = os.environ.get("MEMORY_SNAPSHOT_INTERVAL")
+        return cls(
+            shards=int(os.environ.get("MEMORY_SHARDS", "16")),
+            snapshot_path=os.environ.get("MEMORY_SNAPSHOT_PATH"),
+            snapshot_interval_seconds=float(interval) if interval else None,
+        )
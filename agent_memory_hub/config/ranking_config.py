@@ -0,0 +1,69 @@
+"""
+Configuration for ranking retrieved memories.
+"""
+import os
+from dataclasses import dataclass
+
+
+@dataclass
+class RankingConfig:
+    """
+    Weights of the memory ranking score (see ``RankingEngine``).
+
+    Each signal is scaled to [0, 1] before weighting, so weights are
+    directly comparable. Give each agent its own config to tune how much it
+    favours fresh, important or often used memories over raw relevance.
+
+    Attributes:
+        relevance: Weight of the search score (normalized to the best
+            candidate)
+        recency: Weight of exponential recency decay since ``updated_at``
+        importance: Weight of the memory's ``importance``
+        confidence: Weight of ``confidence`` (times ``truth_score`` for
+            semantic memories)
+        frequency: Weight of how often the memory was returned before
+        half_life_seconds: Age at which the recency signal halves
+        candidates: Search results re-ranked per query
+    """
+    relevance: float = 1.0
+    recency: float = 0.2
+    importance: float = 0.2
+    confidence: float = 0.1
+    frequency: float = 0.1
+    half_life_seconds: float = 7 * 24 * 3600.0
+    candidates: int = 100
+
+    def __post_init__(self):
+        for name in ("relevance", "recency", "importance", "confidence", "frequency"):
+            if getattr(self, name) < 0:
+                raise ValueError(f"{name} weight must not be negative")
+        if self.half_life_seconds <= 0:
+            raise ValueError("half_life_seconds must be positive")
+        if self.candidates < 1:
+            raise ValueError("candidates must be at least 1")
+
+    @classmethod
+    def from_env(cls) -> "RankingConfig":
+        """
+        Create config from environment variables.
+
+        Expected env vars (all optional):
+        - RANKING_RELEVANCE_WEIGHT
+        - RANKING_RECENCY_WEIGHT
+        - RANKING_IMPORTANCE_WEIGHT
+        - RANKING_CONFIDENCE_WEIGHT
+        - RANKING_FREQUENCY_WEIGHT
+        - RANKING_HALF_LIFE_SECONDS
+        - RANKING_CANDIDATES
+        """
+        return cls(
+            relevance=float(os.environ.get("RANKING_RELEVANCE_WEIGHT", "1.0")),
+            recency=float(os.environ.get("RANKING_RECENCY_WEIGHT", "0.2")),
+            importance=float(os.environ.get("RANKING_IMPORTANCE_WEIGHT", "0.2")),
+            confidence=float(os.environ.get("RANKING_CONFIDENCE_WEIGHT", "0.1")),
+            frequency=float(os.environ.get("RANKING_FREQUENCY_WEIGHT", "0.1")),
+            half_life_seconds=float(
+                os.environ.get("RANKING_HALF_LIFE_SECONDS", str(7 * 24 * 3600))
+            ),
+            candidates=int(os.environ.get("RANKING_CANDIDATES", "100")),
+        )
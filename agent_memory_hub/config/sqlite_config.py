@@ -0,0 +1,49 @@
+"""
+Configuration for the SQLite backend.
+"""
+import os
+from dataclasses import dataclass
+
+SYNCHRONOUS_MODES = ("OFF", "NORMAL", "FULL", "EXTRA")
+
+
+@dataclass
+class SQLiteConfig:
+    """
+    Configuration for the SQLite session store.
+
+    Attributes:
+        path: Database file (":memory:" for a private in-memory database)
+        synchronous: PRAGMA synchronous level (default: "NORMAL", which is
+            durable against application crashes in WAL mode)
+        busy_timeout_ms: How long a writer waits for the database lock
+        cache_size_kib: Page cache size per connection in KiB
+    """
+    path: str = "agent_memory_hub.db"
+    synchronous: str = "NORMAL"
+    busy_timeout_ms: int = 5000
+    cache_size_kib: int = 8192
+
+    def __post_init__(self):
+        self.synchronous = self.synchronous.upper()
+        if self.synchronous not in SYNCHRONOUS_MODES:
+            raise ValueError(
+                f"Unknown synchronous mode: {self.synchronous}. "
+                f"Supported: {SYNCHRONOUS_MODES}"
+            )
+
+    @classmethod
+    def from_env(cls) -> "SQLiteConfig":
+        """
+        Create config from environment variables.
+
+        Expected env vars (all optional):
+        - SQLITE_PATH
+        - SQLITE_SYNCHRONOUS
+        - SQLITE_BUSY_TIMEOUT_MS
+        """
+        return cls(
+            path=os.environ.get("SQLITE_PATH", "agent_memory_hub.db"),
+            synchronous=os.environ.get("SQLITE_SYNCHRONOUS", "NORMAL"),
+            busy_timeout_ms=int(os.environ.get("SQLITE_BUSY_TIMEOUT_MS", "5000")),
+        )
@@ -0,0 +1,57 @@
+"""
+Configuration for embedding-based memory search.
+"""
+import os
+from dataclasses import dataclass
+from typing import Optional
+
+ANN_MODES = ("none", "ivf")
+
+
+@dataclass
+class VectorIndexConfig:
+    """
+    Configuration for the in-process embedding index.
+
+    Attributes:
+        ann: Approximate index for large collections: "none" (always exact
+            brute force) or "ivf" (inverted file over k-means centroids)
+        ann_threshold: Vectors per scope before the IVF index is used;
+            smaller collections are always searched exactly
+        nlist: IVF centroid count (None = about sqrt of the collection size)
+        nprobe: IVF lists scanned per query; higher is slower but more exact
+    """
+    ann: str = "none"
+    ann_threshold: int = 20_000
+    nlist: Optional[int] = None
+    nprobe: int = 8
+
+    def __post_init__(self):
+        self.ann = self.ann.lower()
+        if self.ann not in ANN_MODES:
+            raise ValueError(f"ann must be one of {', '.join(ANN_MODES)}")
+        if self.ann_threshold < 1:
+            raise ValueError("ann_threshold must be at least 1")
+        if self.nlist is not None and self.nlist < 1:
+            raise ValueError("nlist must be at least 1")
+        if self.nprobe < 1:
+            raise ValueError("nprobe must be at least 1")
+
+    @classmethod
+    def from_env(cls) -> "VectorIndexConfig":
+        """
+        Create config from environment variables.
+
+        Expected env vars (all optional):
+        - VECTOR_ANN
+        - VECTOR_ANN_THRESHOLD
+        - VECTOR_NLIST
+        - VECTOR_NPROBE
+        """
+        nlist = os.environ.get("VECTOR_NLIST")
+        return cls(
+            ann=os.environ.get("VECTOR_ANN", "none"),
+            ann_threshold=int(os.environ.get("VECTOR_ANN_THRESHOLD", "20000")),
+            nlist=int(nlist) if nlist else None,
+            nprobe=int(os.environ.get("VECTOR_NPROBE", "8")),
+        )
@@ -0,0 +1,348 @@
+"""
+Bulk erasure (right to be forgotten) of a user's or agent's memories across
+every session of a store, driven by the ownership index.
+"""
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, replace
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple, Type, Union
+
+from agent_memory_hub.indexing.episode_log import LogQuery
+from agent_memory_hub.indexing.ownership import (
+    OWNERS_SESSION,
+    Ownership,
+    OwnershipIndex,
+)
+from agent_memory_hub.indexing.query import MAX_LIMIT, MemoryQuery
+from agent_memory_hub.utils.telemetry import get_tracer
+
+# (session, agent) pairs erased in parallel
+DEFAULT_WORKERS = 8
+
+# ``verify`` mode also checking every session of the store
+FULL_VERIFY = "full"
+
+Unit = Tuple[str, str]
+
+
+@dataclass(frozen=True)
+class ErasureRequest:
+    """
+    What to erase: every memory of a user or agent, optionally narrowed to
+    one memory type and a creation time range.
+
+    Attributes:
+        user_id: Erase the memories of the agents serving this user
+        agent_id: Erase this agent's memories (with ``user_id``: only in
+            the sessions of that user)
+        memory_type: Only memory models of this class name
+        since: Earliest ``created_at`` (inclusive; naive = UTC)
+        until: Latest ``created_at`` (exclusive; naive = UTC)
+    """
+    user_id: Optional[str] = None
+    agent_id: Optional[str] = None
+    memory_type: Optional[str] = None
+    since: Optional[datetime] = None
+    until: Optional[datetime] = None
+
+    def __post_init__(self):
+        if self.user_id is None and self.agent_id is None:
+            raise ValueError("An erasure needs a user_id or an agent_id")
+
+    @property
+    def filtered(self) -> bool:
+        """Whether only some memory models are erased (type or time range)."""
+        return (
+            self.memory_type is not None
+            or self.since is not None
+            or self.until is not None
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "user_id": self.user_id,
+            "agent_id": self.agent_id,
+            "memory_type": self.memory_type,
+            "since": self.since.isoformat() if self.since else None,
+            "until": self.until.isoformat() if self.until else None,
+        }
+
+
+@dataclass
+class ErasureReport:
+    """
+    Outcome of ``MemoryEraser.erase``.
+
+    Attributes:
+        request: What was erased
+        units: (session_id, agent_id) pairs erased, including those
+            completed by earlier runs of the same checkpoint
+        deleted: Number of keys deleted
+        resumed: Pairs skipped because the checkpoint recorded them done
+        remaining: (session_id, key) pairs the verification pass still
+            found (a surviving episode log is reported as key
+            ``"log:{agent_id}"``); empty when the erasure is complete
+    """
+    request: ErasureRequest
+    units: List[Unit] = field(default_factory=list)
+    deleted: int = 0
+    resumed: int = 0
+    remaining: List[Tuple[str, str]] = field(default_factory=list)
+
+
+class MemoryEraser:
+    """
+    Erases memories by user, agent, type or time range across sessions.
+
+    The sessions come from the ownership index that ``MemoryClient``
+    maintains on its first write, so nothing scans every session unless
+    asked to (``verify="full"``). Each
+    (session, agent) pair is erased on a worker thread:
+
+    - Without a type or time filter, the agent's keys go in one set-based
+      ``delete_prefix`` (a single statement or batched call on each
+      backend), its episode log with ``delete_log``, and then its
+      ownership records.
+    - With a filter, the matching memory models are listed from the
+      secondary index (``query`` pages of 1000) and deleted by key; the
+      append-only episode log and the ownership records are kept.
+
+    With a checkpoint file every completed pair is appended to it, so an
+    interrupted erasure resumes where it stopped when run again with the
+    same request and file.
+    """
+
+    def __init__(self, store: Any, workers: int = DEFAULT_WORKERS):
+        """
+        Args:
+            store: MemoryRouter or SessionStore holding the memories
+            workers: (session, agent) pairs erased in parallel
+        """
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        self.store = store
+        self.owners = OwnershipIndex(store)
+        self.workers = workers
+        self._tracer = get_tracer()
+
+    def erase(
+        self,
+        user_id: Optional[str] = None,
+        agent_id: Optional[str] = None,
+        memory_type: Union[Type[Any], str, None] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        checkpoint: Optional[str] = None,
+        verify: Union[bool, str] = True,
+    ) -> ErasureReport:
+        """
+        Erase every memory of a user or agent across all sessions.
+
+        Args:
+            user_id: Erase the memories of the agents serving this user.
+            agent_id: Erase this agent's memories (with ``user_id``: only in
+                that user's sessions).
+            memory_type: Only memory models of this class (or class name).
+            since: Earliest ``created_at`` (inclusive; naive = UTC).
+            until: Latest ``created_at`` (exclusive; naive = UTC).
+            checkpoint: Path of a progress file to resume from and append
+                completed pairs to (None = no checkpointing).
+            verify: Look for what is left in the erased pairs afterwards
+                and report it in ``remaining``; ``"full"`` also checks
+                every session of the store (see ``verify``).
+
+        Returns:
+            The erasure report.
+
+        Raises:
+            ValueError: If neither ``user_id`` nor ``agent_id`` is given,
+                ``verify`` is an unknown mode, or the checkpoint belongs to
+                a different request
+        """
+        if verify not in (True, False, FULL_VERIFY):
+            raise ValueError(
+                f"verify must be True, False or {FULL_VERIFY!r}, not {verify!r}"
+            )
+        if isinstance(memory_type, type):
+            memory_type = memory_type.__name__
+        request = ErasureRequest(user_id, agent_id, memory_type, since, until)
+
+        with self._tracer.start_as_current_span("MemoryEraser.erase") as span:
+            report = ErasureReport(request)
+            done = self._load_checkpoint(checkpoint, request, report)
+
+            pending: Dict[Unit, List[Ownership]] = {}
+            for ownership in self.owners.owned(user_id, agent_id):
+                unit = (ownership.session_id, ownership.agent_id)
+                if unit not in done:
+                    pending.setdefault(unit, []).append(ownership)
+            span.set_attribute("erasure.units", len(pending))
+            span.set_attribute("erasure.resumed", report.resumed)
+
+            lock = threading.Lock()
+            log = open(checkpoint, "a", encoding="utf-8") if checkpoint else None
+            try:
+                if log is not None and log.tell() == 0:
+                    log.write(json.dumps({"request": request.to_dict()}) + "\n")
+                    log.flush()
+
+                def erase_unit(unit: Unit) -> None:
+                    deleted = self._erase_unit(request, unit, pending[unit])
+                    with lock:
+                        report.units.append(unit)
+                        report.deleted += deleted
+                        if log is not None:
+                            session_id, unit_agent = unit
+                            log.write(json.dumps({
+                                "session_id": session_id,
+                                "agent_id": unit_agent,
+                                "deleted": deleted,
+                            }) + "\n")
+                            log.flush()
+
+                self._run(erase_unit, list(pending))
+            finally:
+                if log is not None:
+                    log.close()
+
+            if verify:
+                report.remaining = self.verify(report, full=verify == FULL_VERIFY)
+            span.set_attribute("deleted_count", report.deleted)
+            span.set_attribute("erasure.remaining", len(report.remaining))
+            return report
+
+    def verify(
+        self, report: ErasureReport, full: bool = False
+    ) -> List[Tuple[str, str]]:
+        """
+        Re-list the erased (session, agent) pairs of a report: their keys
+        (or, for filtered requests, the memory models still matching), and
+        their episode logs for unfiltered ones.
+
+        With ``full`` the ownership index is not trusted to be complete:
+        every session of the store (``iter_sessions`` and
+        ``iter_log_sessions``) is checked as well for the erased agents,
+        except pairs whose records show the agent served another user
+        there. This reads every session, so it is opt-in.
+
+        Args:
+            report: Report of a finished erasure.
+            full: Also check the sessions the index does not record.
+
+        Returns:
+            (session_id, key) pairs still present.
+        """
+        with self._tracer.start_as_current_span("MemoryEraser.verify") as span:
+            remaining: List[Tuple[str, str]] = []
+            lock = threading.Lock()
+
+            def verify_unit(unit: Unit) -> None:
+                found = self._remaining(report.request, unit)
+                with lock:
+                    remaining.extend(found)
+
+            units = set(report.units)
+            if full:
+                units.update(self._unindexed(report))
+            span.set_attribute("erasure.verified_units", len(units))
+            self._run(verify_unit, sorted(units))
+            span.set_attribute("erasure.remaining", len(remaining))
+            return sorted(remaining)
+
+    def _unindexed(self, report: ErasureReport) -> Iterator[Unit]:
+        """Pairs of the erased agents in every session, found without the index."""
+        request = report.request
+        if request.agent_id is not None:
+            agents = {request.agent_id}
+        else:
+            agents = {agent_id for _, agent_id in report.units}
+        # Pairs recorded for other users are not part of a user's erasure
+        others: Set[Unit] = set()
+        if request.user_id is not None:
+            for agent_id in agents:
+                others.update(
+                    (ownership.session_id, agent_id)
+                    for ownership in self.owners.owned(agent_id=agent_id)
+                    if ownership.user_id != request.user_id
+                )
+        sessions = set(self.store.iter_sessions())
+        sessions.update(self.store.iter_log_sessions())
+        sessions.discard(OWNERS_SESSION)
+        for session_id in sessions:
+            for agent_id in agents:
+                if (session_id, agent_id) not in others:
+                    yield session_id, agent_id
+
+    def _run(self, fn, units: List[Unit]) -> None:
+        if not units:
+            return
+        with ThreadPoolExecutor(max_workers=min(self.workers, len(units))) as pool:
+            list(pool.map(fn, units))
+
+    def _erase_unit(
+        self, request: ErasureRequest, unit: Unit, owners: List[Ownership]
+    ) -> int:
+        session_id, agent_id = unit
+        if request.filtered:
+            keys = list(self._matching_keys(request, unit))
+            return sum(self.store.delete(session_id, key) for key in keys)
+        deleted = self.store.delete_prefix(session_id, f"{agent_id}/")
+        self.store.delete_log(session_id, agent_id)
+        # Dropped last, so an interrupted erasure still finds the pair
+        for ownership in owners:
+            self.owners.unregister(ownership)
+        return deleted
+
+    def _matching_keys(self, request: ErasureRequest, unit: Unit) -> Iterator[str]:
+        session_id, agent_id = unit
+        query = MemoryQuery(
+            memory_type=request.memory_type,
+            since=request.since,
+            until=request.until,
+            key_prefix=f"{agent_id}/",
+            limit=MAX_LIMIT,
+        )
+        while True:
+            page = self.store.query(session_id, query)
+            yield from page.keys
+            if page.next_cursor is None:
+                return
+            query = replace(query, cursor=page.next_cursor)
+
+    def _remaining(self, request: ErasureRequest, unit: Unit) -> List[Tuple[str, str]]:
+        session_id, agent_id = unit
+        if request.filtered:
+            keys = list(self._matching_keys(request, unit))
+        else:
+            keys = list(self.store.iter_keys(session_id, f"{agent_id}/"))
+            if len(self.store.read_log(session_id, LogQuery(agent_id, limit=1))):
+                keys.append(f"log:{agent_id}")
+        return [(session_id, key) for key in keys]
+
+    @staticmethod
+    def _load_checkpoint(
+        path: Optional[str], request: ErasureRequest, report: ErasureReport
+    ) -> Set[Unit]:
+        """Pairs a previous run of ``request`` completed, added to the report."""
+        done: Set[Unit] = set()
+        if path is None or not os.path.exists(path):
+            return done
+        with open(path, encoding="utf-8") as f:
+            lines = [json.loads(line) for line in f if line.strip()]
+        if not lines:
+            return done
+        if lines[0].get("request") != request.to_dict():
+            raise ValueError(
+                f"Checkpoint {path!r} belongs to a different erasure request"
+            )
+        for line in lines[1:]:
+            unit = (line["session_id"], line["agent_id"])
+            if unit not in done:
+                done.add(unit)
+                report.units.append(unit)
+                report.deleted += line["deleted"]
+        report.resumed = len(done)
+        return done
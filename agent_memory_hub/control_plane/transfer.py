@@ -0,0 +1,445 @@
+"""
+Streaming export and import of a store's entries in a versioned exchange
+format (NDJSON or msgpack frames, optionally gzip-compressed), for backups
+and moves between backends.
+"""
+import gzip
+import itertools
+import json
+import os
+import time
+from collections import deque
+from concurrent.futures import Executor, ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import IO, Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+
+from agent_memory_hub.data_plane.adk_session_store import StoredEntry
+from agent_memory_hub.utils.telemetry import get_tracer
+
+# Header of every export
+FORMAT = "agent-memory-hub"
+FORMAT_VERSION = 1
+ENCODINGS = ("ndjson", "msgpack")
+COMPRESSIONS = (None, "gzip")
+# Keys read or written per backend call
+TRANSFER_BATCH = 500
+# Batches read or written in parallel
+TRANSFER_WORKERS = 4
+
+_GZIP_MAGIC = b"\x1f\x8b"
+
+# (session_id, keys, whether the batch ends the session)
+_Task = Tuple[str, List[str], bool]
+
+
+def _require_msgpack() -> None:
+    if not MSGPACK_AVAILABLE:
+        raise ImportError(
+            "msgpack is required for msgpack exports. "
+            "Install with: pip install 'agent-memory-hub[msgpack]'"
+        )
+
+
+@dataclass
+class TransferReport:
+    """
+    Outcome of ``MemoryTransfer.export_to`` or ``import_from``.
+
+    Attributes:
+        path: The export file
+        sessions: Sessions written (including those of earlier runs of the
+            same checkpoint)
+        records: Entries written
+        expired: Entries skipped because they expired before being written
+        resumed: Whether the run continued from a checkpoint
+    """
+    path: str
+    sessions: int = 0
+    records: int = 0
+    expired: int = 0
+    resumed: bool = False
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "path": self.path,
+            "sessions": self.sessions,
+            "records": self.records,
+            "expired": self.expired,
+        }
+
+
+def _ordered(
+    pool: Executor, fn: Callable[[Any], Any], items: Iterable[Any], window: int
+) -> Iterator[Any]:
+    """
+    ``pool.map`` that consumes ``items`` lazily, with at most ``window``
+    calls in flight, yielding results in order.
+    """
+    pending: deque = deque()
+    for item in items:
+        pending.append(pool.submit(fn, item))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def _load_checkpoint(path: Optional[str]) -> Optional[Dict[str, Any]]:
+    if path is None or not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _save_checkpoint(path: Optional[str], state: Dict[str, Any]) -> None:
+    if path is None:
+        return
+    # Replaced whole, so a crash leaves the previous checkpoint intact
+    partial = f"{path}.tmp"
+    with open(partial, "w", encoding="utf-8") as f:
+        json.dump(state, f)
+    os.replace(partial, path)
+
+
+class _Writer:
+    """Encodes records to frames and appends them as (compressed) chunks."""
+
+    def __init__(self, f: IO[bytes], encoding: str, compression: Optional[str]):
+        self.f = f
+        self.compression = compression
+        if encoding == "msgpack":
+            self._encode = lambda record: msgpack.packb(record, use_bin_type=True)
+        else:
+            self._encode = lambda record: (
+                json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n"
+            ).encode("utf-8")
+
+    def write(self, records: List[Dict[str, Any]]) -> int:
+        """Append one chunk and return the file offset after it."""
+        if records:
+            chunk = b"".join(self._encode(record) for record in records)
+            if self.compression == "gzip":
+                # One gzip member per chunk: any chunk boundary is a valid
+                # end of file to truncate to when resuming
+                chunk = gzip.compress(chunk, mtime=0)
+            self.f.write(chunk)
+            self.f.flush()
+        return self.f.tell()
+
+
+def _read_records(f: IO[bytes]) -> Iterator[Dict[str, Any]]:
+    """Decode the frames of an export, sniffing compression and encoding."""
+    if f.peek(2)[:2] == _GZIP_MAGIC:
+        f = gzip.GzipFile(fileobj=f)
+    if f.peek(1)[:1] == b"{":
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+        return
+    _require_msgpack()
+    yield from msgpack.Unpacker(f, raw=False)
+
+
+class MemoryTransfer:
+    """
+    Streams every entry of a store to an export file and back.
+
+    The export starts with a header record, followed by one record per
+    entry::
+
+        {"format": "agent-memory-hub", "version": 1, "exported_at": "..."}
+        {"session_id": "s1", "key": "a/k", "value": ...,
+         "created_at": 1700000000.0, "expires_at": 1700003600.0}
+
+    ``created_at`` and ``expires_at`` are UTC epoch seconds (``null`` if
+    the backend does not record the write time, or the entry never
+    expires), so an import keeps each entry's TTL envelope whatever the
+    TTL of the target store.
+
+    Memory use is bounded by the batch size and worker count, not by the
+    store: sessions are listed with ``iter_sessions``, their keys with the
+    backend's cursor ``iter_keys``, ``batch_size`` keys at a time, and at
+    most ``2 * workers`` batches are in flight. Each batch is read with one
+    ``read_entries`` (imports: written with one ``write_entries``) on a
+    worker thread, and written out in order.
+
+    Episode logs are not part of the export.
+    """
+
+    def __init__(
+        self,
+        store: Any,
+        batch_size: int = TRANSFER_BATCH,
+        workers: int = TRANSFER_WORKERS,
+    ):
+        """
+        Args:
+            store: MemoryRouter or SessionStore to export from or import to
+            batch_size: Keys per ``read_entries`` or ``write_entries`` call
+            workers: Batches read or written in parallel
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        self.store = store
+        self.batch_size = batch_size
+        self.workers = workers
+        self._tracer = get_tracer()
+
+    def export_to(
+        self,
+        path: str,
+        encoding: str = "ndjson",
+        compression: Optional[str] = None,
+        sessions: Optional[Iterable[str]] = None,
+        checkpoint: Optional[str] = None,
+    ) -> TransferReport:
+        """
+        Export the entries of every session (or of ``sessions``) to a file.
+
+        With a checkpoint file the progress is saved after each session
+        (at most once per ``batch_size`` entries), and a rerun with the
+        same arguments truncates the export to the last saved session and
+        continues after it. Sessions are exported in lexicographic order.
+
+        Args:
+            path: Export file (overwritten unless resuming).
+            encoding: "ndjson" (one JSON object per line) or "msgpack"
+                (concatenated msgpack maps).
+            compression: None or "gzip".
+            sessions: Sessions to export (None = all, from ``iter_sessions``).
+            checkpoint: Path of a progress file (None = no checkpointing).
+
+        Returns:
+            The export report.
+
+        Raises:
+            ValueError: If the encoding or compression is unknown, or the
+                checkpoint belongs to another export
+            ImportError: If msgpack is requested but not installed
+        """
+        if encoding not in ENCODINGS:
+            raise ValueError(f"Unknown encoding {encoding!r}; use one of {ENCODINGS}")
+        if compression not in COMPRESSIONS:
+            raise ValueError(
+                f"Unknown compression {compression!r}; use one of {COMPRESSIONS}"
+            )
+        if encoding == "msgpack":
+            _require_msgpack()
+
+        with self._tracer.start_as_current_span("MemoryTransfer.export_to") as span:
+            span.set_attribute("transfer.encoding", encoding)
+            report = TransferReport(path)
+            settings = {"path": path, "encoding": encoding, "compression": compression}
+            state = _load_checkpoint(checkpoint)
+            if state is not None and state["settings"] != settings:
+                raise ValueError(
+                    f"Checkpoint {checkpoint!r} belongs to a different export"
+                )
+            after = None
+            if state is not None and os.path.exists(path):
+                report.resumed = True
+                report.sessions = state["sessions"]
+                report.records = state["records"]
+                after = state["session"]
+                f = open(path, "r+b")
+                f.truncate(state["offset"])
+                f.seek(state["offset"])
+            else:
+                f = open(path, "wb")
+
+            with f:
+                writer = _Writer(f, encoding, compression)
+                if after is None:
+                    offset = writer.write([{
+                        "format": FORMAT,
+                        "version": FORMAT_VERSION,
+                        "exported_at": datetime.now(timezone.utc).isoformat(),
+                    }])
+                    state = {
+                        "settings": settings, "offset": offset, "session": None,
+                        "sessions": 0, "records": 0,
+                    }
+
+                names = (
+                    sorted(sessions) if sessions is not None
+                    else self.store.iter_sessions()
+                )
+                if after is not None:
+                    names = (name for name in names if name > after)
+                unsaved = 0
+                with ThreadPoolExecutor(max_workers=self.workers) as pool:
+                    for session_id, records, last in _ordered(
+                        pool, self._read_batch, self._tasks(names), 2 * self.workers
+                    ):
+                        offset = writer.write(records)
+                        report.records += len(records)
+                        unsaved += len(records)
+                        if not last:
+                            continue
+                        report.sessions += 1
+                        state.update(
+                            offset=offset, session=session_id,
+                            sessions=report.sessions, records=report.records,
+                        )
+                        if unsaved >= self.batch_size:
+                            _save_checkpoint(checkpoint, state)
+                            unsaved = 0
+                _save_checkpoint(checkpoint, state)
+
+            span.set_attribute("transfer.sessions", report.sessions)
+            span.set_attribute("memory.count", report.records)
+            return report
+
+    def import_from(
+        self, path: str, checkpoint: Optional[str] = None
+    ) -> TransferReport:
+        """
+        Import an export file (either encoding, compressed or not) into the
+        store, keeping each entry's write time and expiry. Entries that
+        expired since the export are skipped.
+
+        With a checkpoint file the number of records imported without gaps
+        is saved as batches complete, and a rerun skips that many records.
+
+        Args:
+            path: Export file.
+            checkpoint: Path of a progress file (None = no checkpointing).
+
+        Returns:
+            The import report.
+
+        Raises:
+            ValueError: If the file is not an export of a supported format
+                version, or the checkpoint belongs to another file
+            ImportError: If the file holds msgpack frames and msgpack is not
+                installed
+        """
+        with self._tracer.start_as_current_span("MemoryTransfer.import_from") as span:
+            report = TransferReport(path)
+            state = _load_checkpoint(checkpoint)
+            if state is not None and state["path"] != path:
+                raise ValueError(
+                    f"Checkpoint {checkpoint!r} belongs to a different import"
+                )
+            done, previous = 0, None
+            if state is not None:
+                report.resumed = True
+                done, previous = state["consumed"], state["session"]
+                report.sessions = state["sessions"]
+                report.records = state["records"]
+                report.expired = state["expired"]
+
+            with open(path, "rb") as f:
+                records = _read_records(f)
+                self._check_header(next(records, None), path)
+                batches = self._batches(
+                    itertools.islice(records, done, None), previous
+                )
+                consumed = done
+                with ThreadPoolExecutor(max_workers=self.workers) as pool:
+                    for session_id, entries, skipped, new_session in _ordered(
+                        pool, self._write_batch, batches, 2 * self.workers
+                    ):
+                        consumed += len(entries) + skipped
+                        report.records += len(entries)
+                        report.expired += skipped
+                        report.sessions += new_session
+                        _save_checkpoint(checkpoint, {
+                            "path": path, "consumed": consumed,
+                            "session": session_id, **report.to_dict(),
+                        })
+
+            span.set_attribute("transfer.sessions", report.sessions)
+            span.set_attribute("memory.count", report.records)
+            return report
+
+    def _tasks(self, sessions: Iterable[str]) -> Iterator[_Task]:
+        """Batches of each session's keys, flagging each session's last one."""
+        for session_id in sessions:
+            keys = iter(self.store.iter_keys(session_id))
+            batch = list(itertools.islice(keys, self.batch_size))
+            while True:
+                following = (
+                    list(itertools.islice(keys, self.batch_size))
+                    if len(batch) == self.batch_size else []
+                )
+                yield session_id, batch, not following
+                if not following:
+                    break
+                batch = following
+
+    def _read_batch(self, task: _Task) -> Tuple[str, List[Dict[str, Any]], bool]:
+        session_id, keys, last = task
+        records = []
+        if keys:
+            for key, entry in zip(
+                keys, self.store.read_entries(session_id, keys), strict=True
+            ):
+                if entry is not None:
+                    records.append({
+                        "session_id": session_id,
+                        "key": key,
+                        "value": entry.value,
+                        "created_at": entry.created_at,
+                        "expires_at": entry.expires_at,
+                    })
+        return session_id, records, last
+
+    def _batches(
+        self, records: Iterator[Dict[str, Any]], previous: Optional[str] = None
+    ) -> Iterator[Tuple[str, Dict[str, StoredEntry], int, bool]]:
+        """
+        Runs of up to ``batch_size`` records of one session, as (session,
+        live entries, expired records skipped, whether the session differs
+        from the one before, starting from ``previous``).
+        """
+        session_id, entries, skipped, count = previous, {}, 0, 0
+        new_session = False
+        for record in records:
+            if record["session_id"] != session_id or count >= self.batch_size:
+                if count:
+                    yield session_id, entries, skipped, new_session
+                new_session = record["session_id"] != session_id
+                session_id, entries, skipped, count = record["session_id"], {}, 0, 0
+            if not count:
+                now = time.time()
+            count += 1
+            entry = StoredEntry(
+                record["value"],
+                created_at=record.get("created_at"),
+                expires_at=record.get("expires_at"),
+            )
+            if entry.expired(now):
+                skipped += 1
+            else:
+                entries[record["key"]] = entry
+        if count:
+            yield session_id, entries, skipped, new_session
+
+    def _write_batch(
+        self, batch: Tuple[str, Dict[str, StoredEntry], int, bool]
+    ) -> Tuple[str, Dict[str, StoredEntry], int, bool]:
+        session_id, entries, _, _ = batch
+        if entries:
+            self.store.write_entries(session_id, entries)
+        return batch
+
+    @staticmethod
+    def _check_header(header: Optional[Dict[str, Any]], path: str) -> None:
+        if not isinstance(header, dict) or header.get("format") != FORMAT:
+            raise ValueError(f"{path!r} is not an {FORMAT} export")
+        version = header.get("version")
+        if not isinstance(version, int) or version > FORMAT_VERSION:
+            raise ValueError(
+                f"{path!r} has export format version {version!r}; "
+                f"this release reads up to version {FORMAT_VERSION}"
+            )
@@ -4,19 +4,130 @@ Google ADK-compatible implementation.
 """
 
 import abc
+import bisect
+import hashlib
 import json
-from datetime import datetime
-from typing import Any, Optional
+import math
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union
 
+from agent_memory_hub.data_plane.patch import MemoryPatch
+from agent_memory_hub.indexing.episode_log import (
+    LogEntry,
+    LogPage,
+    LogQuery,
+    next_log_cursor,
+)
+from agent_memory_hub.indexing.query import (
+    IndexRecord,
+    MemoryQuery,
+    QueryPage,
+    RankQuery,
+    TriplePattern,
+    fetch_page,
+    index_record,
+    paginate,
+    paginate_ranked,
+    paginate_triples,
+)
 from agent_memory_hub.utils.telemetry import get_tracer
 from agent_memory_hub.utils.ttl_manager import (
     get_current_timestamp,
     is_expired,
 )
 
+# Version token of a key that does not exist (or has expired)
+MISSING_VERSION = "0"
+
+
+class VersionConflictError(Exception):
+    """A conditional write found the key at a different version."""
+
+    def __init__(self, key: str, expected: str, actual: Optional[str] = None):
+        self.key = key
+        self.expected = expected
+        self.actual = actual
+        found = f", found {actual!r}" if actual is not None else ""
+        super().__init__(
+            f"Version conflict on {key!r}: expected {expected!r}{found}"
+        )
+
+
+@dataclass(frozen=True)
+class StoredEntry:
+    """
+    A stored value with its TTL envelope, as moved between stores by
+    ``read_entries`` and ``write_entries``.
+
+    Attributes:
+        value: The stored value
+        created_at: Write time as UTC epoch seconds (None where the backend
+            does not record it)
+        expires_at: Expiry as UTC epoch seconds (None = never expires)
+    """
+    value: Any
+    created_at: Optional[float] = None
+    expires_at: Optional[float] = None
+
+    @classmethod
+    def from_wrapper(cls, data: Dict[str, Any]) -> "StoredEntry":
+        """
+        Entry of a ``{"value", "created_at", "ttl_seconds"}`` wrapper, as
+        the document and blob backends store values.
+        """
+        created_at = datetime.fromisoformat(data["created_at"]).timestamp()
+        ttl = data.get("ttl_seconds")
+        return cls(
+            data.get("value"),
+            created_at=created_at,
+            expires_at=created_at + ttl if ttl else None,
+        )
+
+    def to_wrapper(self, now: float) -> Dict[str, Any]:
+        """
+        The entry as a stored wrapper, keeping its write time (``now`` if
+        unknown) and expiry; a TTL envelope rounds up to whole seconds.
+        """
+        created_at = self.created_at if self.created_at is not None else now
+        ttl = None
+        if self.expires_at is not None:
+            ttl = max(1, math.ceil(self.expires_at - created_at))
+        return {
+            "value": self.value,
+            "created_at": datetime.fromtimestamp(created_at, timezone.utc).isoformat(),
+            "ttl_seconds": ttl,
+        }
+
+    def expired(self, now: float) -> bool:
+        """Whether the entry has expired by ``now`` (epoch seconds)."""
+        return self.expires_at is not None and self.expires_at <= now
+
+
+def entry_version(stored: Union[str, bytes, None]) -> str:
+    """
+    Version token of a stored entry: a digest of its serialized form
+    (MISSING_VERSION for None), for backends without native versions.
+    """
+    if stored is None:
+        return MISSING_VERSION
+    if isinstance(stored, str):
+        stored = stored.encode("utf-8")
+    return hashlib.blake2b(stored, digest_size=12).hexdigest()
+
 
 class SessionStore(abc.ABC):
     """Abstract interface for memory storage backends."""
+
+    # Whether write_many commits all-or-nothing (see write_atomic)
+    atomic_writes = False
+    # Read/compare-and-set rounds of the default patch() under contention
+    PATCH_ATTEMPTS = 20
+    # Keys fetched per backend call by iter_keys
+    KEY_BATCH = 500
     
     @abc.abstractmethod
     def write(self, session_id: str, key: str, value: Any) -> None:
@@ -28,22 +139,346 @@ class SessionStore(abc.ABC):
         """Retrieve a value by session and key."""
         pass
 
+    def write_many(self, session_id: str, items: Dict[str, Any]) -> None:
+        """
+        Persist several values of one session. Backends override this with
+        one batched, pipelined or transactional call.
+        """
+        for key, value in items.items():
+            self.write(session_id, key, value)
+
+    def write_atomic(self, session_id: str, items: Dict[str, Any]) -> None:
+        """
+        Persist several values of one session all-or-nothing, in one
+        transaction, ``MULTI``/``EXEC`` pipeline or batch.
+
+        Raises:
+            NotImplementedError: If the backend cannot commit several keys
+                atomically
+        """
+        if not self.atomic_writes:
+            raise NotImplementedError(
+                f"{type(self).__name__} does not support atomic writes"
+            )
+        self.write_many(session_id, items)
+
+    def read_many(self, session_id: str, keys: Sequence[str]) -> List[Optional[Any]]:
+        """
+        Retrieve several values of one session, aligned with ``keys`` (None
+        for missing ones). Backends override this with one batched call.
+        """
+        return [self.read(session_id, key) for key in keys]
+
+    def read_versioned(self, session_id: str, key: str) -> Tuple[Optional[Any], str]:
+        """
+        Retrieve a value with its version token (MISSING_VERSION if the key
+        does not exist), for a later ``write_versioned``.
+
+        Raises:
+            NotImplementedError: If the backend has no conditional writes
+        """
+        raise NotImplementedError(
+            f"{type(self).__name__} does not support versioned writes"
+        )
+
+    def write_versioned(
+        self, session_id: str, key: str, value: Any, if_version: str
+    ) -> str:
+        """
+        Persist a value only if the key is still at ``if_version``
+        (MISSING_VERSION: only if it does not exist), checked and written
+        atomically by the backend.
+
+        Returns:
+            The new version token
+
+        Raises:
+            VersionConflictError: If the key is at another version
+            NotImplementedError: If the backend has no conditional writes
+        """
+        raise NotImplementedError(
+            f"{type(self).__name__} does not support versioned writes"
+        )
+
+    def patch(self, session_id: str, key: str, patch: MemoryPatch) -> Any:
+        """
+        Apply a partial update to a stored dict value, without losing
+        concurrent updates, and return the new value. The patched value is
+        written like any other (re-indexed, TTL restarted).
+
+        Backends with transactions apply the patch inside one; the default
+        repeats ``read_versioned`` and ``write_versioned`` until no other
+        writer changed the key in between.
+
+        Raises:
+            KeyError: If the key does not exist
+            TypeError: If the patch does not fit the stored value
+            NotImplementedError: If the backend has no conditional writes
+        """
+        for _ in range(self.PATCH_ATTEMPTS):
+            value, version = self.read_versioned(session_id, key)
+            if version == MISSING_VERSION:
+                raise KeyError(key)
+            patched = patch.apply(value)
+            try:
+                self.write_versioned(session_id, key, patched, version)
+            except VersionConflictError:
+                continue
+            return patched
+        raise RuntimeError(
+            f"Could not patch {key!r} of session {session_id!r}: "
+            f"too much contention"
+        )
+
+    def read_session(self, session_id: str, prefix: str = "") -> Dict[str, Any]:
+        """
+        Retrieve every live key of a session starting with ``prefix``, as a
+        mapping of key to value, in as few backend calls as possible.
+
+        Raises:
+            NotImplementedError: If the backend cannot enumerate a session
+        """
+        raise NotImplementedError(
+            f"{type(self).__name__} does not support session reads"
+        )
+
+    def delete(self, session_id: str, key: str) -> bool:
+        """
+        Remove a key of a session together with its index entries.
+
+        Returns:
+            Whether a live key was removed
+
+        Raises:
+            NotImplementedError: If the backend cannot delete keys
+        """
+        raise NotImplementedError(
+            f"{type(self).__name__} does not support deletes"
+        )
+
+    def delete_session(self, session_id: str) -> int:
+        """
+        Remove every key, index entry and log stream of a session. Backends
+        override this with one statement or batched call; the default
+        deletes key by key.
+
+        Returns:
+            Number of keys removed
+
+        Raises:
+            NotImplementedError: If the backend cannot enumerate or delete keys
+        """
+        return sum(
+            self.delete(session_id, key) for key in list(self.iter_keys(session_id))
+        )
+
+    def iter_keys(self, session_id: str, prefix: str = "") -> Iterator[str]:
+        """
+        Stream the live keys of a session starting with ``prefix``, fetched
+        from the backend in batches of ``KEY_BATCH`` rather than all at once.
+
+        Raises:
+            NotImplementedError: If the backend cannot enumerate a session
+        """
+        raise NotImplementedError(
+            f"{type(self).__name__} does not support key listing"
+        )
+
+    def iter_sessions(self) -> Iterator[str]:
+        """
+        Stream the ids of the sessions holding keys, in lexicographic order,
+        fetched from the backend in batches rather than all at once.
+
+        Raises:
+            NotImplementedError: If the backend cannot enumerate sessions
+        """
+        raise NotImplementedError(
+            f"{type(self).__name__} does not support session listing"
+        )
+
+    def iter_streams(self, session_id: str) -> Iterator[str]:
+        """
+        Stream the names of the log streams of a session (see ``append``),
+        in lexicographic order.
+
+        Raises:
+            NotImplementedError: If the backend cannot enumerate log streams
+        """
+        raise NotImplementedError(
+            f"{type(self).__name__} does not support stream listing"
+        )
+
+    def iter_log_sessions(self) -> Iterator[str]:
+        """
+        Stream the ids of the sessions holding log streams, in lexicographic
+        order; ``iter_sessions`` lists those holding keys.
+
+        Raises:
+            NotImplementedError: If the backend cannot enumerate log streams
+        """
+        raise NotImplementedError(
+            f"{type(self).__name__} does not support stream listing"
+        )
+
+    def read_entries(
+        self, session_id: str, keys: Sequence[str]
+    ) -> List[Optional[StoredEntry]]:
+        """
+        Retrieve several values of one session with their TTL envelopes,
+        aligned with ``keys`` (None for missing or expired ones), in one
+        batched call.
+
+        Raises:
+            NotImplementedError: If the backend cannot export entries
+        """
+        raise NotImplementedError(
+            f"{type(self).__name__} does not support entry export"
+        )
+
+    def write_entries(self, session_id: str, entries: Dict[str, StoredEntry]) -> None:
+        """
+        Persist several values of one session keeping their TTL envelopes:
+        each expires at its ``expires_at`` rather than after the store's
+        ``ttl_seconds``. Memory models are indexed as by ``write_many``.
+
+        Raises:
+            NotImplementedError: If the backend cannot import entries
+        """
+        raise NotImplementedError(
+            f"{type(self).__name__} does not support entry import"
+        )
+
+    def delete_prefix(self, session_id: str, prefix: str) -> int:
+        """
+        Remove every key of a session starting with ``prefix`` (for example
+        all keys of one agent) together with its index entries. Backends
+        override this with one set-based statement or batched call; the
+        default deletes key by key.
+
+        Returns:
+            Number of keys removed
+
+        Raises:
+            NotImplementedError: If the backend cannot enumerate or delete keys
+        """
+        return sum(
+            self.delete(session_id, key)
+            for key in list(self.iter_keys(session_id, prefix))
+        )
+
+    def delete_log(self, session_id: str, stream: str) -> None:
+        """
+        Remove a log stream of a session with all its entries.
+
+        Raises:
+            NotImplementedError: If the backend cannot delete log streams
+        """
+        raise NotImplementedError(
+            f"{type(self).__name__} does not support log deletes"
+        )
+
+    def query(self, session_id: str, query: MemoryQuery) -> QueryPage:
+        """
+        List the memory models of a session matching ``query``, using the
+        backend's secondary indexes.
+
+        Raises:
+            NotImplementedError: If the backend maintains no index
+        """
+        raise NotImplementedError(
+            f"{type(self).__name__} does not support memory queries"
+        )
+
+    def match_triples(self, session_id: str, pattern: TriplePattern) -> QueryPage:
+        """
+        List the SemanticMemory models of a session matching a
+        ``(subject, predicate, object)`` pattern, highest ``truth_score``
+        first, using the backend's triple index.
+
+        Raises:
+            NotImplementedError: If the backend maintains no triple index
+        """
+        raise NotImplementedError(
+            f"{type(self).__name__} does not support triple queries"
+        )
+
+    def rank(self, session_id: str, query: RankQuery) -> QueryPage:
+        """
+        List the top memory models of a session by importance or recency,
+        highest first, using the backend's ordered indexes.
+
+        Raises:
+            NotImplementedError: If the backend maintains no ordered index
+        """
+        raise NotImplementedError(
+            f"{type(self).__name__} does not support ranked queries"
+        )
+
+    def append(
+        self,
+        session_id: str,
+        stream: str,
+        values: Sequence[Any],
+        max_len: Optional[int] = None,
+    ) -> List[LogEntry]:
+        """
+        Append values to a log stream of the session, keeping only the
+        newest ``max_len`` entries if given.
+
+        Raises:
+            NotImplementedError: If the backend keeps no append log
+        """
+        raise NotImplementedError(
+            f"{type(self).__name__} does not support append logs"
+        )
+
+    def read_log(self, session_id: str, query: LogQuery) -> LogPage:
+        """
+        Read one page of a log stream of the session.
+
+        Raises:
+            NotImplementedError: If the backend keeps no append log
+        """
+        raise NotImplementedError(
+            f"{type(self).__name__} does not support append logs"
+        )
+
 
 class AdkSessionStore(SessionStore):
     """
     Google ADK-compatible session store implementation. 
     Uses Google Cloud Storage as the underlying persistence layer.
+
+    Memory models are also listed in a per-session manifest object,
+    ``indexes/{session_id}.json``, updated with generation preconditions
+    so concurrent writers never lose each other's entries.
+
+    Log streams live under ``logs/{session_id}/{stream}/``: a ``head.json``
+    object (sequence counters, the newest entries and the list of sealed
+    segments) updated with generation preconditions, and immutable segment
+    objects of ``LOG_SEGMENT_SIZE`` entries each.
     """
+
+    MANIFEST_VERSION = 1
+    MANIFEST_ATTEMPTS = 10
+    LOG_SEGMENT_SIZE = 256
+    # Concurrent downloads of read_many / read_session
+    FETCH_WORKERS = 16
     
     def __init__(
-        self, bucket_name: str, region: str, ttl_seconds: Optional[int] = None
+        self,
+        bucket_name: str,
+        region: str,
+        ttl_seconds: Optional[int] = None,
+        client: Optional[Any] = None,
     ):
         self.bucket_name = bucket_name
         self.region = region
         self.ttl_seconds = ttl_seconds
         self._tracer = get_tracer()
-        # Lazy initialization to avoid runtime side effects on import
-        self._client = None
+        # Lazy initialization to avoid runtime side effects on import;
+        # a pre-built client (e.g. an emulator) may be injected instead.
+        self._client = client
         self._bucket = None
 
     def _get_bucket(self):
@@ -63,6 +498,119 @@ class AdkSessionStore(SessionStore):
     def _get_blob_path(self, session_id: str, key: str) -> str:
         return f"sessions/{session_id}/{key}.json"
 
+    def _get_manifest_path(self, session_id: str) -> str:
+        # Outside "sessions/" so it never collides with a key's object
+        return f"indexes/{session_id}.json"
+
+    def _load_manifest(self, session_id: str):
+        """Manifest records and the generation they were read at (0 = none)."""
+        blob = self._get_bucket().get_blob(self._get_manifest_path(session_id))
+        if blob is None:
+            return {}, 0
+        content = blob.download_as_bytes(if_generation_match=blob.generation)
+        return json.loads(content)["records"], blob.generation
+
+    def _update_manifest(
+        self, session_id: str, updates: Dict[str, Optional[IndexRecord]]
+    ) -> None:
+        """Set manifest records; None removes a key's record."""
+        # Import here to avoid import-time side effects (see _get_bucket)
+        from google.api_core.exceptions import PreconditionFailed
+
+        blob = self._get_bucket().blob(self._get_manifest_path(session_id))
+        for _ in range(self.MANIFEST_ATTEMPTS):
+            try:
+                records, generation = self._load_manifest(session_id)
+                changed = False
+                for key, record in updates.items():
+                    if record is not None:
+                        records[key] = record.to_dict()
+                        changed = True
+                    elif records.pop(key, None) is not None:
+                        changed = True
+                if not changed:
+                    return
+                manifest = {"version": self.MANIFEST_VERSION, "records": records}
+                blob.upload_from_string(
+                    json.dumps(manifest),
+                    content_type="application/json",
+                    if_generation_match=generation,
+                )
+                return
+            except PreconditionFailed:
+                continue  # a concurrent writer won; merge into its version
+        raise RuntimeError(
+            f"Could not update index manifest of session {session_id!r}: "
+            f"too much contention"
+        )
+
+    def _get_log_prefix(self, session_id: str, stream: str) -> str:
+        return f"logs/{session_id}/{stream}/"
+
+    def _load_log_head(self, session_id: str, stream: str):
+        """Log head and the generation it was read at (0 = none)."""
+        blob = self._get_bucket().get_blob(
+            self._get_log_prefix(session_id, stream) + "head.json"
+        )
+        if blob is None:
+            head = {
+                "version": self.MANIFEST_VERSION,
+                "first_seq": 1,
+                "next_seq": 1,
+                "last_ts": 0.0,
+                "segments": [],  # [[first_seq, first_ts, object name], ...]
+                "tail": [],  # [[seq, ts, value], ...] not yet sealed
+            }
+            return head, 0
+        content = blob.download_as_bytes(if_generation_match=blob.generation)
+        return json.loads(content), blob.generation
+
+    @staticmethod
+    def _advance_log(head: Dict[str, Any], first_seq: int) -> List[str]:
+        """
+        Move the head's ``first_seq`` forward, dropping tail entries and
+        whole segments below it; returns the names of dropped segments.
+        """
+        head["first_seq"] = first_seq = max(head["first_seq"], first_seq)
+        head["tail"] = [entry for entry in head["tail"] if entry[0] >= first_seq]
+        segments = head["segments"]
+        # A segment ends where the next one (or the tail) starts
+        ends = [segment[0] for segment in segments[1:]]
+        ends.append(head["tail"][0][0] if head["tail"] else head["next_seq"])
+        dead = bisect.bisect_right(ends, first_seq)
+        head["segments"] = segments[dead:]
+        return [segment[2] for segment in segments[:dead]]
+
+    def _delete_blobs(self, names: Sequence[str]) -> None:
+        from google.api_core.exceptions import NotFound
+
+        bucket = self._get_bucket()
+        for name in names:
+            try:
+                bucket.blob(name).delete()
+            except NotFound:
+                continue  # already deleted by a concurrent trim
+
+    def _delete_parallel(self, names: Sequence[str]) -> None:
+        """Delete objects in chunks of ``KEY_BATCH`` on parallel workers."""
+        chunks = [
+            names[i : i + self.KEY_BATCH] for i in range(0, len(names), self.KEY_BATCH)
+        ]
+        if not chunks:
+            return
+        workers = min(self.FETCH_WORKERS, len(chunks))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(self._delete_blobs, chunks))
+
+    def _read_segment(self, name: str) -> List[List[Any]]:
+        from google.api_core.exceptions import NotFound
+
+        try:
+            content = self._get_bucket().blob(name).download_as_bytes()
+        except NotFound:
+            return []  # trimmed since the head was read
+        return json.loads(content)["entries"]
+
     def write(self, session_id: str, key: str, value: Any) -> None:
         with self._tracer.start_as_current_span("AdkSessionStore.write") as span:
             blob_path = self._get_blob_path(session_id, key)
@@ -84,6 +632,73 @@ class AdkSessionStore(SessionStore):
                 content_type="application/json"
             )
 
+            record = index_record(key, value)
+            if record is not None:
+                self._update_manifest(session_id, {key: record})
+
+    def write_many(self, session_id: str, items: Dict[str, Any]) -> None:
+        """
+        Write several keys of one session: the objects are uploaded in
+        parallel, then the index manifest is updated once for every memory
+        model among them.
+
+        Args:
+            session_id: Session identifier
+            items: Mapping of memory key to value
+        """
+        with self._tracer.start_as_current_span("AdkSessionStore.write_many") as span:
+            span.set_attribute("bucket.name", self.bucket_name)
+            span.set_attribute("session.id", session_id)
+            span.set_attribute("memory.count", len(items))
+
+            created_at = get_current_timestamp().isoformat()
+            self._put(session_id, items, {
+                key: {
+                    "value": value,
+                    "created_at": created_at,
+                    "ttl_seconds": self.ttl_seconds,
+                }
+                for key, value in items.items()
+            })
+
+    def _put(
+        self,
+        session_id: str,
+        items: Dict[str, Any],
+        wrappers: Dict[str, Dict[str, Any]],
+    ) -> None:
+        """
+        Upload the wrappers of ``items`` in parallel, then update the index
+        manifest once for every memory model among them.
+        """
+        bucket = self._get_bucket()
+        uploads = [
+            (self._get_blob_path(session_id, key), json.dumps(wrapper))
+            for key, wrapper in wrappers.items()
+        ]
+
+        def upload(item: Tuple[str, str]) -> None:
+            path, content = item
+            bucket.blob(path).upload_from_string(
+                content, content_type="application/json"
+            )
+
+        if len(uploads) <= 1:
+            for item in uploads:
+                upload(item)
+        else:
+            workers = min(self.FETCH_WORKERS, len(uploads))
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                list(pool.map(upload, uploads))
+
+        records = {}
+        for key, value in items.items():
+            record = index_record(key, value)
+            if record is not None:
+                records[key] = record
+        if records:
+            self._update_manifest(session_id, records)
+
     def read(self, session_id: str, key: str) -> Optional[Any]:
         with self._tracer.start_as_current_span("AdkSessionStore.read") as span:
             blob_path = self._get_blob_path(session_id, key)
@@ -96,21 +711,698 @@ class AdkSessionStore(SessionStore):
             if not blob.exists():
                 return None
                 
-            content = blob.download_as_text()
+            return self._unwrap(blob, blob.download_as_text())
+
+    def read_versioned(self, session_id: str, key: str) -> Tuple[Optional[Any], str]:
+        """
+        Read a value with its object generation as the version token.
+
+        Args:
+            session_id: Session identifier
+            key: Memory key
+
+        Returns:
+            The value (None if not found or expired) and its version token
+        """
+        from google.api_core.exceptions import NotFound
+
+        with self._tracer.start_as_current_span(
+            "AdkSessionStore.read_versioned"
+        ) as span:
+            blob_path = self._get_blob_path(session_id, key)
+            span.set_attribute("bucket.name", self.bucket_name)
+            span.set_attribute("object.key", blob_path)
+
+            blob = self._get_bucket().blob(blob_path)
+            try:
+                content = blob.download_as_text()
+            except NotFound:
+                return None, MISSING_VERSION
             data = json.loads(content)
-            
-            # Check for TTL expiry
-            if "created_at" in data and "ttl_seconds" in data:
-                created_at = datetime.fromisoformat(data["created_at"])
-                ttl = data["ttl_seconds"]
-                
-                if ttl is not None and is_expired(created_at, ttl):
-                    # Delete expired blob
-                    blob.delete()
-                    return None
-            
-            return data.get("value")
+            if self._expired(data):
+                blob.delete()
+                return None, MISSING_VERSION
+            return data.get("value"), str(blob.generation)
+
+    def write_versioned(
+        self, session_id: str, key: str, value: Any, if_version: str
+    ) -> str:
+        """
+        Write a value only if its object is still at generation
+        ``if_version`` (``ifGenerationMatch``; "0" = must not exist).
+
+        Args:
+            session_id: Session identifier
+            key: Memory key
+            value: Value to store
+            if_version: Expected version token
+
+        Returns:
+            The new generation as a version token
+
+        Raises:
+            VersionConflictError: If the object is at another generation
+        """
+        from google.api_core.exceptions import PreconditionFailed
+
+        with self._tracer.start_as_current_span(
+            "AdkSessionStore.write_versioned"
+        ) as span:
+            blob_path = self._get_blob_path(session_id, key)
+            span.set_attribute("bucket.name", self.bucket_name)
+            span.set_attribute("object.key", blob_path)
+
+            metadata = {
+                "value": value,
+                "created_at": get_current_timestamp().isoformat(),
+                "ttl_seconds": self.ttl_seconds,
+            }
+            try:
+                generation = int(if_version)
+            except ValueError:
+                raise VersionConflictError(key, if_version) from None
+            blob = self._get_bucket().blob(blob_path)
+            try:
+                blob.upload_from_string(
+                    json.dumps(metadata),
+                    content_type="application/json",
+                    if_generation_match=generation,
+                )
+            except PreconditionFailed:
+                raise VersionConflictError(key, if_version) from None
+
+            record = index_record(key, value)
+            if record is not None:
+                self._update_manifest(session_id, {key: record})
+            return str(blob.generation)
+
+    @staticmethod
+    def _expired(data: Dict[str, Any]) -> bool:
+        """Whether a stored object's TTL has lapsed."""
+        if "created_at" in data and "ttl_seconds" in data:
+            ttl = data["ttl_seconds"]
+            if ttl is not None:
+                return is_expired(datetime.fromisoformat(data["created_at"]), ttl)
+        return False
+
+    @classmethod
+    def _unwrap(cls, blob, content: str) -> Optional[Any]:
+        """Value of a downloaded object, deleting it if expired."""
+        data = json.loads(content)
+        if cls._expired(data):
+            # Delete expired blob
+            blob.delete()
+            return None
+        return data.get("value")
+
+    @classmethod
+    def _unwrap_entry(cls, blob, content: str) -> Optional[StoredEntry]:
+        """Entry of a downloaded object, deleting it if expired."""
+        data = json.loads(content)
+        if cls._expired(data):
+            blob.delete()
+            return None
+        if "created_at" in data:
+            return StoredEntry.from_wrapper(data)
+        return StoredEntry(data.get("value"))
+
+    def _fetch(
+        self, blob_paths: Sequence[str], decode: Optional[Any] = None
+    ) -> List[Optional[Any]]:
+        """
+        Download objects concurrently; None for missing or expired ones.
+        ``decode(blob, content)`` replaces ``_unwrap``.
+        """
+        from google.api_core.exceptions import NotFound
+
+        bucket = self._get_bucket()
+        decode = decode or self._unwrap
+
+        def fetch(path: str) -> Optional[Any]:
+            blob = bucket.blob(path)
+            try:
+                return decode(blob, blob.download_as_text())
+            except NotFound:
+                return None
+
+        if len(blob_paths) <= 1:
+            return [fetch(path) for path in blob_paths]
+        workers = min(self.FETCH_WORKERS, len(blob_paths))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(fetch, blob_paths))
+
+    def read_many(self, session_id: str, keys: Sequence[str]) -> List[Optional[Any]]:
+        """
+        Read several values of one session, downloading the objects in
+        parallel.
+
+        Args:
+            session_id: Session identifier
+            keys: Memory keys
+
+        Returns:
+            Stored values aligned with ``keys`` (None if not found or expired)
+        """
+        with self._tracer.start_as_current_span("AdkSessionStore.read_many") as span:
+            span.set_attribute("bucket.name", self.bucket_name)
+            span.set_attribute("session.id", session_id)
+            span.set_attribute("memory.count", len(keys))
+
+            return self._fetch([self._get_blob_path(session_id, key) for key in keys])
+
+    def read_entries(
+        self, session_id: str, keys: Sequence[str]
+    ) -> List[Optional[StoredEntry]]:
+        """
+        Read several values of one session with their TTL envelopes,
+        downloading the objects in parallel.
+
+        Args:
+            session_id: Session identifier
+            keys: Memory keys
+
+        Returns:
+            Entries aligned with ``keys`` (None if not found or expired)
+        """
+        with self._tracer.start_as_current_span(
+            "AdkSessionStore.read_entries"
+        ) as span:
+            span.set_attribute("bucket.name", self.bucket_name)
+            span.set_attribute("session.id", session_id)
+            span.set_attribute("memory.count", len(keys))
+
+            return self._fetch(
+                [self._get_blob_path(session_id, key) for key in keys],
+                self._unwrap_entry,
+            )
+
+    def write_entries(self, session_id: str, entries: Dict[str, StoredEntry]) -> None:
+        """
+        Write several keys of one session like ``write_many``, each object
+        keeping its entry's write time and expiry.
+
+        Args:
+            session_id: Session identifier
+            entries: Mapping of memory key to entry
+        """
+        with self._tracer.start_as_current_span(
+            "AdkSessionStore.write_entries"
+        ) as span:
+            span.set_attribute("bucket.name", self.bucket_name)
+            span.set_attribute("session.id", session_id)
+            span.set_attribute("memory.count", len(entries))
+
+            now = time.time()
+            self._put(
+                session_id,
+                {key: entry.value for key, entry in entries.items()},
+                {key: entry.to_wrapper(now) for key, entry in entries.items()},
+            )
+
+    def iter_sessions(self) -> Iterator[str]:
+        """
+        List the sessions as the "directories" of ``sessions/``: one
+        delimited listing returning their prefixes, not their objects.
+
+        Yields:
+            Session ids in lexicographic order
+        """
+        blobs = self._get_bucket().list_blobs(prefix="sessions/", delimiter="/")
+        for _ in blobs:
+            pass  # prefixes fill in as the pages are consumed
+        for prefix in sorted(blobs.prefixes):
+            yield prefix[len("sessions/") : -1]
+
+    def read_session(self, session_id: str, prefix: str = "") -> Dict[str, Any]:
+        """
+        Read every key of a session starting with ``prefix``: one listing of
+        the session's objects, then parallel downloads.
+
+        Args:
+            session_id: Session identifier
+            prefix: Key prefix (empty = all keys)
+
+        Returns:
+            Mapping of key to value of the live entries
+        """
+        with self._tracer.start_as_current_span(
+            "AdkSessionStore.read_session"
+        ) as span:
+            span.set_attribute("bucket.name", self.bucket_name)
+            span.set_attribute("session.id", session_id)
+
+            root = self._get_blob_path(session_id, "")[: -len(".json")]
+            names = [
+                blob.name
+                for blob in self._get_bucket().list_blobs(prefix=root + prefix)
+                if blob.name.endswith(".json")
+            ]
+            values = {
+                name[len(root) : -len(".json")]: value
+                for name, value in zip(names, self._fetch(names), strict=True)
+                if value is not None
+            }
+            span.set_attribute("memory.count", len(values))
+            return values
+
+    def delete(self, session_id: str, key: str) -> bool:
+        """
+        Delete a key's object and its record in the index manifest.
+
+        Args:
+            session_id: Session identifier
+            key: Memory key
+
+        Returns:
+            Whether the object existed
+        """
+        from google.api_core.exceptions import NotFound
+
+        with self._tracer.start_as_current_span("AdkSessionStore.delete") as span:
+            blob_path = self._get_blob_path(session_id, key)
+            span.set_attribute("bucket.name", self.bucket_name)
+            span.set_attribute("object.key", blob_path)
+
+            try:
+                self._get_bucket().blob(blob_path).delete()
+                deleted = True
+            except NotFound:
+                deleted = False
+            self._update_manifest(session_id, {key: None})
+            return deleted
+
+    def delete_session(self, session_id: str) -> int:
+        """
+        Delete every object of a session: its keys, index manifest and log
+        streams, listed by prefix and deleted in parallel.
+
+        Args:
+            session_id: Session identifier
+
+        Returns:
+            Number of keys deleted
+        """
+        with self._tracer.start_as_current_span(
+            "AdkSessionStore.delete_session"
+        ) as span:
+            span.set_attribute("bucket.name", self.bucket_name)
+            span.set_attribute("session.id", session_id)
+
+            bucket = self._get_bucket()
+            keys = [
+                blob.name
+                for blob in bucket.list_blobs(prefix=f"sessions/{session_id}/")
+            ]
+            logs = [
+                blob.name for blob in bucket.list_blobs(prefix=f"logs/{session_id}/")
+            ]
+            self._delete_parallel(keys + logs + [self._get_manifest_path(session_id)])
+
+            span.set_attribute("memory.count", len(keys))
+            return len(keys)
+
+    def iter_keys(self, session_id: str, prefix: str = "") -> Iterator[str]:
+        """
+        Stream the keys of a session starting with ``prefix`` from a listing
+        of its objects, without downloading them. Objects whose TTL lapsed
+        are listed until read or cleaned up, since expiry is recorded in
+        the object body.
+
+        Args:
+            session_id: Session identifier
+            prefix: Key prefix (empty = all keys)
+
+        Yields:
+            Keys in lexicographic order
+        """
+        root = self._get_blob_path(session_id, "")[: -len(".json")]
+        for blob in self._get_bucket().list_blobs(prefix=root + prefix):
+            if blob.name.endswith(".json"):
+                yield blob.name[len(root) : -len(".json")]
+
+    def delete_prefix(self, session_id: str, prefix: str) -> int:
+        """
+        Delete every object of a session whose key starts with ``prefix``:
+        listed by prefix, deleted in parallel, and dropped from the index
+        manifest in one update.
+
+        Args:
+            session_id: Session identifier
+            prefix: Key prefix
+
+        Returns:
+            Number of keys deleted
+        """
+        with self._tracer.start_as_current_span(
+            "AdkSessionStore.delete_prefix"
+        ) as span:
+            span.set_attribute("bucket.name", self.bucket_name)
+            span.set_attribute("session.id", session_id)
+
+            keys = list(self.iter_keys(session_id, prefix))
+            self._delete_parallel(
+                [self._get_blob_path(session_id, key) for key in keys]
+            )
+            self._update_manifest(session_id, dict.fromkeys(keys))
+            span.set_attribute("deleted_count", len(keys))
+            return len(keys)
+
+    def delete_log(self, session_id: str, stream: str) -> None:
+        """
+        Delete a log stream: its head and segment objects, listed by prefix
+        and deleted in parallel.
+
+        Args:
+            session_id: Session identifier
+            stream: Stream name
+        """
+        with self._tracer.start_as_current_span("AdkSessionStore.delete_log") as span:
+            span.set_attribute("bucket.name", self.bucket_name)
+            span.set_attribute("session.id", session_id)
+            span.set_attribute("log.stream", stream)
+
+            prefix = self._get_log_prefix(session_id, stream)
+            self._delete_parallel(
+                [blob.name for blob in self._get_bucket().list_blobs(prefix=prefix)]
+            )
+
+    def iter_streams(self, session_id: str) -> Iterator[str]:
+        """
+        List the log streams of a session from the head objects under its
+        log prefix (stream names may contain "/", so no delimited listing).
+
+        Args:
+            session_id: Session identifier
+
+        Yields:
+            Stream names in lexicographic order
+        """
+        prefix = f"logs/{session_id}/"
+        streams = [
+            blob.name[len(prefix) : -len("/head.json")]
+            for blob in self._get_bucket().list_blobs(prefix=prefix)
+            if blob.name.endswith("/head.json")
+        ]
+        yield from sorted(streams)
+
+    def iter_log_sessions(self) -> Iterator[str]:
+        """
+        List the sessions holding log streams as the "directories" of
+        ``logs/``, like ``iter_sessions``.
+
+        Yields:
+            Session ids in lexicographic order
+        """
+        blobs = self._get_bucket().list_blobs(prefix="logs/", delimiter="/")
+        for _ in blobs:
+            pass  # prefixes fill in as the pages are consumed
+        for prefix in sorted(blobs.prefixes):
+            yield prefix[len("logs/") : -1]
+
+    def query(self, session_id: str, query: MemoryQuery) -> QueryPage:
+        """
+        List the memory models of a session matching ``query`` from the
+        session's index manifest.
+
+        Args:
+            session_id: Session identifier
+            query: Filter and pagination
+
+        Returns:
+            One page of matching memories, oldest first
+        """
+        with self._tracer.start_as_current_span("AdkSessionStore.query") as span:
+            span.set_attribute("bucket.name", self.bucket_name)
+            span.set_attribute("session.id", session_id)
+
+            entries: Dict[str, Any] = self._load_manifest(session_id)[0]
+            records: List[IndexRecord] = [
+                IndexRecord.from_dict(key, data) for key, data in entries.items()
+            ]
+            page, cursor = paginate(records, query)
+            result = fetch_page(
+                page,
+                cursor,
+                lambda keys: self.read_many(session_id, keys),
+            )
+            span.set_attribute("query.results", len(result))
+            return result
+
+    def match_triples(self, session_id: str, pattern: TriplePattern) -> QueryPage:
+        """
+        List the SemanticMemory models of a session matching ``pattern``
+        from the session's index manifest (one object read).
+
+        Args:
+            session_id: Session identifier
+            pattern: Triple pattern and pagination
+
+        Returns:
+            One page of matching memories, highest truth_score first
+        """
+        with self._tracer.start_as_current_span(
+            "AdkSessionStore.match_triples"
+        ) as span:
+            span.set_attribute("bucket.name", self.bucket_name)
+            span.set_attribute("session.id", session_id)
+
+            entries: Dict[str, Any] = self._load_manifest(session_id)[0]
+            page, cursor = paginate_triples(
+                (IndexRecord.from_dict(key, data) for key, data in entries.items()),
+                pattern,
+            )
+            result = fetch_page(
+                page,
+                cursor,
+                lambda keys: self.read_many(session_id, keys),
+            )
+            span.set_attribute("query.results", len(result))
+            return result
+
+    def rank(self, session_id: str, query: RankQuery) -> QueryPage:
+        """
+        List the top memory models of a session by importance or recency
+        from the session's index manifest (one object read).
+
+        Args:
+            session_id: Session identifier
+            query: Order, filters and pagination
+
+        Returns:
+            One page of memories, highest value first
+        """
+        with self._tracer.start_as_current_span("AdkSessionStore.rank") as span:
+            span.set_attribute("bucket.name", self.bucket_name)
+            span.set_attribute("session.id", session_id)
+
+            entries: Dict[str, Any] = self._load_manifest(session_id)[0]
+            page, cursor = paginate_ranked(
+                (IndexRecord.from_dict(key, data) for key, data in entries.items()),
+                query,
+            )
+            result = fetch_page(
+                page,
+                cursor,
+                lambda keys: self.read_many(session_id, keys),
+            )
+            span.set_attribute("query.results", len(result))
+            return result
     
+    def append(
+        self,
+        session_id: str,
+        stream: str,
+        values: Sequence[Any],
+        max_len: Optional[int] = None,
+    ) -> List[LogEntry]:
+        """
+        Append values to a log stream of the session.
+
+        New entries go to the tail kept in the head object; every
+        ``LOG_SEGMENT_SIZE`` entries the oldest are sealed into a new segment
+        object, written before the head that references it. A concurrent
+        append makes the head upload fail, and the append is retried from
+        the new head after deleting its unreferenced segments.
+
+        Args:
+            session_id: Session identifier
+            stream: Stream name
+            values: JSON-serializable values to append, in order
+            max_len: Keep only the newest ``max_len`` entries (None = all)
+
+        Returns:
+            The appended entries
+        """
+        # Import here to avoid import-time side effects (see _get_bucket)
+        from google.api_core.exceptions import PreconditionFailed
+
+        with self._tracer.start_as_current_span("AdkSessionStore.append") as span:
+            span.set_attribute("bucket.name", self.bucket_name)
+            span.set_attribute("session.id", session_id)
+            span.set_attribute("log.stream", stream)
+            span.set_attribute("memory.count", len(values))
+
+            bucket = self._get_bucket()
+            prefix = self._get_log_prefix(session_id, stream)
+            for _ in range(self.MANIFEST_ATTEMPTS):
+                head, generation = self._load_log_head(session_id, stream)
+                ts = max(time.time(), head["last_ts"])
+                next_seq = head["next_seq"]
+                entries = [
+                    LogEntry(str(next_seq + i), ts, value)
+                    for i, value in enumerate(values)
+                ]
+                tail = head["tail"] + [[int(e.id), ts, e.value] for e in entries]
+                sealed = []
+                while len(tail) >= self.LOG_SEGMENT_SIZE:
+                    chunk = tail[: self.LOG_SEGMENT_SIZE]
+                    tail = tail[self.LOG_SEGMENT_SIZE :]
+                    # Unique names: a retried append never reuses a segment
+                    name = f"{prefix}{chunk[0][0]:016d}-{uuid.uuid4().hex}.json"
+                    bucket.blob(name).upload_from_string(
+                        json.dumps({"entries": chunk}),
+                        content_type="application/json",
+                        if_generation_match=0,
+                    )
+                    sealed.append(name)
+                    head["segments"].append([chunk[0][0], chunk[0][1], name])
+                head.update(tail=tail, next_seq=next_seq + len(values), last_ts=ts)
+                dropped: List[str] = []
+                if max_len is not None:
+                    dropped = self._advance_log(head, head["next_seq"] - max_len)
+
+                try:
+                    bucket.blob(prefix + "head.json").upload_from_string(
+                        json.dumps(head),
+                        content_type="application/json",
+                        if_generation_match=generation,
+                    )
+                except PreconditionFailed:
+                    self._delete_blobs(sealed)
+                    continue  # a concurrent append won; retry from its head
+                self._delete_blobs(dropped)
+                return entries
+            raise RuntimeError(
+                f"Could not append to log {stream!r} of session {session_id!r}: "
+                f"too much contention"
+            )
+
+    def read_log(self, session_id: str, query: LogQuery) -> LogPage:
+        """
+        Read one page of a log stream of the session.
+
+        The head object locates the first segment to read by sequence
+        number or append time; segments are then downloaded one at a time
+        until the page is full.
+
+        Args:
+            session_id: Session identifier
+            query: Stream, time range, direction and pagination
+
+        Returns:
+            One page of entries, in read order
+        """
+        with self._tracer.start_as_current_span("AdkSessionStore.read_log") as span:
+            span.set_attribute("bucket.name", self.bucket_name)
+            span.set_attribute("session.id", session_id)
+            span.set_attribute("log.stream", query.stream)
+
+            head = self._load_log_head(session_id, query.stream)[0]
+            low, high = query.bounds(self.ttl_seconds, time.time())
+            begin, end = head["first_seq"], head["next_seq"]
+            after = query.after()
+            if after is not None:
+                if query.reverse:
+                    end = min(end, int(after[1]))
+                else:
+                    begin = max(begin, int(after[1]) + 1)
+
+            # Chunks in seq order: sealed segments, then the tail
+            chunks: List[Tuple[int, float, Optional[str]]] = [
+                (segment[0], segment[1], segment[2]) for segment in head["segments"]
+            ]
+            if head["tail"]:
+                chunks.append((head["tail"][0][0], head["tail"][0][1], None))
+            first_seqs = [chunk[0] for chunk in chunks]
+            first_tss = [chunk[1] for chunk in chunks]
+
+            def in_range(seq: int, ts: float) -> bool:
+                return (
+                    begin <= seq < end
+                    and (low is None or ts >= low)
+                    and (high is None or ts < high)
+                )
+
+            if query.reverse:
+                start = bisect.bisect_right(first_seqs, end - 1) - 1
+                if high is not None:
+                    start = min(start, bisect.bisect_left(first_tss, high) - 1)
+                order = range(start, -1, -1)
+            else:
+                start = max(0, bisect.bisect_right(first_seqs, begin) - 1)
+                if low is not None:
+                    start = max(start, bisect.bisect_left(first_tss, low) - 1)
+                order = range(start, len(chunks))
+
+            found: List[LogEntry] = []
+            for index in order:
+                first_seq, first_ts, name = chunks[index]
+                if not query.reverse and (
+                    first_seq >= end or (high is not None and first_ts >= high)
+                ):
+                    break
+                rows = head["tail"] if name is None else self._read_segment(name)
+                if query.reverse:
+                    rows = reversed(rows)
+                found.extend(
+                    LogEntry(str(seq), ts, value)
+                    for seq, ts, value in rows
+                    if in_range(seq, ts)
+                )
+                # Append times never decrease along the stream
+                if len(found) > query.limit or (
+                    query.reverse and low is not None and first_ts < low
+                ):
+                    break
+
+            entries = found[: query.limit]
+            span.set_attribute("query.results", len(entries))
+            return LogPage(
+                entries, next_log_cursor(entries, len(found) > query.limit)
+            )
+
+    def _cleanup_log(self, head_name: str, cutoff: float) -> int:
+        # Best effort: a concurrent append trims the log on its next pass
+        from google.api_core.exceptions import PreconditionFailed
+
+        blob = self._get_bucket().get_blob(head_name)
+        if blob is None:
+            return 0
+        head = json.loads(blob.download_as_bytes(if_generation_match=blob.generation))
+        old_first = head["first_seq"]
+        tail = head["tail"]
+        if head["last_ts"] < cutoff:
+            first_seq = head["next_seq"]
+        elif tail and tail[0][1] < cutoff:
+            first_seq = next(seq for seq, ts, _ in tail if ts >= cutoff)
+        else:
+            # Entries of a segment all precede the next segment's first one
+            starts = [segment[:2] for segment in head["segments"]]
+            starts += [entry[:2] for entry in tail[:1]]
+            live = bisect.bisect_left([ts for _, ts in starts], cutoff) - 1
+            first_seq = starts[live][0] if live >= 0 else old_first
+        dropped = self._advance_log(head, first_seq)
+        try:
+            blob.upload_from_string(
+                json.dumps(head),
+                content_type="application/json",
+                if_generation_match=blob.generation,
+            )
+        except PreconditionFailed:
+            return 0
+        self._delete_blobs(dropped)
+        return head["first_seq"] - old_first
+
     def cleanup_expired(self, session_id: Optional[str] = None) -> int:
         """
         Manually cleanup expired blobs.
@@ -119,7 +1411,7 @@ class AdkSessionStore(SessionStore):
             session_id: Optional session ID to limit cleanup scope
             
         Returns:
-            Number of blobs deleted
+            Number of blobs and log entries deleted
         """
         bucket = self._get_bucket()
         prefix = f"sessions/{session_id}/" if session_id else "sessions/"
@@ -140,6 +1432,13 @@ class AdkSessionStore(SessionStore):
             except Exception:  # noqa: S112  # nosec
                 # Skip blobs that can't be parsed
                 continue
+
+        if self.ttl_seconds is not None:
+            cutoff = time.time() - self.ttl_seconds
+            prefix = f"logs/{session_id}/" if session_id else "logs/"
+            for blob in bucket.list_blobs(prefix=prefix):
+                if blob.name.endswith("/head.json"):
+                    deleted_count += self._cleanup_log(blob.name, cutoff)
         
         return deleted_count
 
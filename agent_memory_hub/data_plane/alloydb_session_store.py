@@ -1,19 +1,202 @@
 """
 AlloyDB (PostgreSQL) session store implementation using SQLAlchemy.
 """
-from typing import Any, Optional
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
 import json
+import time
 from datetime import datetime
 
 from sqlalchemy import create_engine, text, Table, Column, String, MetaData
+from sqlalchemy.engine import Engine
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.exc import SQLAlchemyError
 
 from agent_memory_hub.config.alloydb_config import AlloyDBConfig
-from agent_memory_hub.data_plane.adk_session_store import SessionStore
+from agent_memory_hub.data_plane.adk_session_store import (
+    MISSING_VERSION,
+    SessionStore,
+    StoredEntry,
+    VersionConflictError,
+    entry_version,
+)
+from agent_memory_hub.data_plane.patch import MemoryPatch
+from agent_memory_hub.indexing.episode_log import (
+    LogEntry,
+    LogPage,
+    LogQuery,
+    next_log_cursor,
+)
+from agent_memory_hub.indexing.query import (
+    RANK_ORDERS,
+    IndexRecord,
+    MemoryQuery,
+    QueryPage,
+    RankQuery,
+    TriplePattern,
+    fetch_page,
+    index_record,
+    next_cursor,
+    next_rank_cursor,
+    next_triple_cursor,
+    rank_order,
+    rank_value,
+    ranked_record,
+)
 from agent_memory_hub.utils.telemetry import get_tracer
 from agent_memory_hub.utils.ttl_manager import get_current_timestamp, is_expired
 
+_UPSERT_INDEX_POSTGRES = """
+    INSERT INTO memory_index
+        (session_id, key, memory_type, scope, tags, created_ts)
+    VALUES (:sid, :key, :memory_type, :scope, CAST(:tags AS JSONB), :created_ts)
+    ON CONFLICT (session_id, key) DO UPDATE SET
+        memory_type = excluded.memory_type,
+        scope = excluded.scope,
+        tags = excluded.tags,
+        created_ts = excluded.created_ts;
+"""
+_UPSERT_INDEX_SQLITE = _UPSERT_INDEX_POSTGRES.replace("CAST(:tags AS JSONB)", ":tags")
+# Merges a JSON object of several key wrappers into the session row
+_WRITE_MANY_POSTGRES = """
+    INSERT INTO sessions (session_id, data) VALUES (:sid, CAST(:patch AS JSONB))
+    ON CONFLICT (session_id) DO UPDATE SET data = sessions.data || CAST(:patch AS JSONB)
+"""
+# Creates an empty session row to lock (same syntax on SQLite)
+_ENSURE_SESSION = """
+    INSERT INTO sessions (session_id, data) VALUES (:sid, '{}')
+    ON CONFLICT (session_id) DO NOTHING
+"""
+_READ_MANY_POSTGRES = """
+    SELECT e.key, e.value FROM sessions, jsonb_each(sessions.data) AS e
+    WHERE sessions.session_id = :sid
+    AND e.key IN (SELECT jsonb_array_elements_text(CAST(:keys AS JSONB)))
+"""
+_READ_MANY_SQLITE = """
+    SELECT e.key, e.value FROM sessions, json_each(sessions.data) AS e
+    WHERE sessions.session_id = :sid
+    AND e.key IN (SELECT value FROM json_each(:keys))
+"""
+# Remove one key from the session row; no row is updated if it is absent
+_DELETE_KEY_POSTGRES = """
+    UPDATE sessions SET data = data - :key
+    WHERE session_id = :sid AND jsonb_exists(data, :key)
+"""
+_DELETE_KEY_SQLITE = """
+    UPDATE sessions SET data = json_remove(data, :path)
+    WHERE session_id = :sid AND json_type(data, :path) IS NOT NULL
+"""
+_DELETE_SESSION = "DELETE FROM sessions WHERE session_id = :sid RETURNING data"
+_DELETE_SESSION_ROWS = (
+    "DELETE FROM memory_index WHERE session_id = :sid",
+    "DELETE FROM memory_triples WHERE session_id = :sid",
+    "DELETE FROM memory_ranks WHERE session_id = :sid",
+    "DELETE FROM memory_log WHERE session_id = :sid",
+)
+# Keyset pages of a session's keys with the expiry fields of their wrappers;
+# the first page includes the prefix itself
+_ITER_KEYS_POSTGRES = """
+    SELECT e.key, e.value->>'created_at', e.value->>'ttl_seconds'
+    FROM sessions, jsonb_each(sessions.data) AS e
+    WHERE sessions.session_id = :sid AND e.key COLLATE "C" {} :after
+    AND substr(e.key, 1, :prefix_len) = :prefix
+    ORDER BY e.key COLLATE "C" LIMIT :limit
+"""
+_ITER_KEYS_SQLITE = """
+    SELECT e.key,
+        CASE WHEN e.type = 'object' THEN json_extract(e.value, '$.created_at') END,
+        CASE WHEN e.type = 'object' THEN json_extract(e.value, '$.ttl_seconds') END
+    FROM sessions, json_each(sessions.data) AS e
+    WHERE sessions.session_id = :sid AND e.key {} :after
+    AND substr(e.key, 1, :prefix_len) = :prefix
+    ORDER BY e.key LIMIT :limit
+"""
+# Keyset pages of the session ids
+_ITER_SESSIONS_POSTGRES = """
+    SELECT session_id FROM sessions WHERE session_id COLLATE "C" > :after
+    ORDER BY session_id COLLATE "C" LIMIT :limit
+"""
+_ITER_SESSIONS_SQLITE = """
+    SELECT session_id FROM sessions WHERE session_id > :after
+    ORDER BY session_id LIMIT :limit
+"""
+# Expiry fields of a session's keys starting with a prefix, then one UPDATE
+# rebuilding the row without them
+_PREFIX_EXPIRY_POSTGRES = """
+    SELECT e.value->>'created_at', e.value->>'ttl_seconds'
+    FROM sessions, jsonb_each(sessions.data) AS e
+    WHERE sessions.session_id = :sid AND substr(e.key, 1, :prefix_len) = :prefix
+"""
+_PREFIX_EXPIRY_SQLITE = """
+    SELECT
+        CASE WHEN e.type = 'object' THEN json_extract(e.value, '$.created_at') END,
+        CASE WHEN e.type = 'object' THEN json_extract(e.value, '$.ttl_seconds') END
+    FROM sessions, json_each(sessions.data) AS e
+    WHERE sessions.session_id = :sid AND substr(e.key, 1, :prefix_len) = :prefix
+"""
+_LOCK_SESSION = "SELECT 1 FROM sessions WHERE session_id = :sid FOR UPDATE"
+_SELECT_SESSION_POSTGRES = (
+    "SELECT data FROM sessions WHERE session_id = :sid FOR UPDATE"
+)
+_SELECT_SESSION_SQLITE = "SELECT data FROM sessions WHERE session_id = :sid"
+_DELETE_PREFIX_POSTGRES = """
+    UPDATE sessions SET data = COALESCE((
+        SELECT jsonb_object_agg(e.key, e.value) FROM jsonb_each(sessions.data) AS e
+        WHERE substr(e.key, 1, :prefix_len) <> :prefix
+    ), '{}'::jsonb)
+    WHERE session_id = :sid
+"""
+_DELETE_PREFIX_SQLITE = """
+    UPDATE sessions SET data = (
+        SELECT json_group_object(e.key, e.value) FROM json_each(sessions.data) AS e
+        WHERE substr(e.key, 1, :prefix_len) <> :prefix
+    )
+    WHERE session_id = :sid
+"""
+_DELETE_PREFIX_ROWS = (
+    "DELETE FROM memory_index WHERE session_id = :sid"
+    " AND substr(key, 1, :prefix_len) = :prefix",
+    "DELETE FROM memory_triples WHERE session_id = :sid"
+    " AND substr(key, 1, :prefix_len) = :prefix",
+    "DELETE FROM memory_ranks WHERE session_id = :sid"
+    " AND substr(key, 1, :prefix_len) = :prefix",
+)
+_DELETE_LOG = "DELETE FROM memory_log WHERE session_id = :sid AND stream = :stream"
+_SELECT_STREAMS = """
+    SELECT DISTINCT stream FROM memory_log WHERE session_id = :sid ORDER BY stream
+"""
+_ITER_LOG_SESSIONS_POSTGRES = """
+    SELECT DISTINCT session_id FROM memory_log
+    WHERE session_id COLLATE "C" > :after
+    ORDER BY session_id COLLATE "C" LIMIT :limit
+"""
+_ITER_LOG_SESSIONS_SQLITE = """
+    SELECT DISTINCT session_id FROM memory_log WHERE session_id > :after
+    ORDER BY session_id LIMIT :limit
+"""
+_UNINDEX_TRIPLE = "DELETE FROM memory_triples WHERE session_id = :sid AND key = :key"
+_INDEX_TRIPLE = """
+    INSERT INTO memory_triples
+        (session_id, key, subject, predicate, object, truth_score)
+    VALUES (:sid, :key, :subject, :predicate, :object, :truth_score)
+"""
+_UNINDEX_RANKS = "DELETE FROM memory_ranks WHERE session_id = :sid AND key = :key"
+_INDEX_RANK = """
+    INSERT INTO memory_ranks (session_id, rank_by, key, memory_type, scope, score)
+    VALUES (:sid, :rank_by, :key, :memory_type, :scope, :score)
+"""
+_LOG_HEAD = """
+    SELECT seq, ts FROM memory_log WHERE session_id = :sid AND stream = :stream
+    ORDER BY seq DESC LIMIT 1
+"""
+_LOG_APPEND = """
+    INSERT INTO memory_log (session_id, stream, seq, ts, value)
+    VALUES (:sid, :stream, :seq, :ts, :value)
+"""
+_LOG_TRIM = """
+    DELETE FROM memory_log
+    WHERE session_id = :sid AND stream = :stream AND seq <= :seq
+"""
+
 
 class AlloyDBSessionStore(SessionStore):
     """
@@ -21,10 +204,13 @@ class AlloyDBSessionStore(SessionStore):
     Stores sessions in a 'sessions' table: (session_id TEXT PK, data JSONB).
     """
 
+    atomic_writes = True
+
     def __init__(
         self,
         config: AlloyDBConfig,
         ttl_seconds: Optional[int] = None,
+        engine: Optional[Engine] = None,
     ):
         """
         Initialize AlloyDB session store.
@@ -32,13 +218,17 @@ class AlloyDBSessionStore(SessionStore):
         Args:
             config: AlloyDB connection configuration
             ttl_seconds: Default TTL for entries (None = no expiry)
+            engine: Pre-built SQLAlchemy engine (e.g. a local PostgreSQL or the
+                    SQLite emulator); built from ``config`` if omitted
         """
         self.config = config
         self.ttl_seconds = ttl_seconds
         self._tracer = get_tracer()
 
         # Construct Connection URI or Engine
-        if config.db_url:
+        if engine is not None:
+            self.engine = engine
+        elif config.db_url:
             self.engine = create_engine(
                 config.db_url,
                 pool_size=config.pool_size,
@@ -77,24 +267,212 @@ class AlloyDBSessionStore(SessionStore):
                 pool_pre_ping=True
             )
         
+        # SQLite (emulator) stores the same layout as JSON text
+        self._is_sqlite = self.engine.dialect.name == "sqlite"
+
         # Ensure schema exists using raw SQL
         self._init_schema()
 
+    @staticmethod
+    def _json_path(key: str) -> str:
+        """SQLite JSON path addressing a top-level key literally."""
+        if '"' in key:
+            # SQLite JSON paths cannot escape quotes inside a quoted label
+            raise ValueError(f"Key not supported by the SQLite layout: {key!r}")
+        return f'$."{key}"'
+
     def _init_schema(self):
-        """Create sessions table if not exists."""
-        create_table_sql = """
-        CREATE TABLE IF NOT EXISTS sessions (
-            session_id TEXT PRIMARY KEY,
-            data JSONB NOT NULL DEFAULT '{}'::jsonb
-        );
-        """
+        """Create sessions and memory index tables if not exists."""
+        if self._is_sqlite:
+            statements = [
+                """
+                CREATE TABLE IF NOT EXISTS sessions (
+                    session_id TEXT PRIMARY KEY,
+                    data TEXT NOT NULL DEFAULT '{}'
+                );
+                """,
+                """
+                CREATE TABLE IF NOT EXISTS memory_index (
+                    session_id TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    memory_type TEXT NOT NULL,
+                    scope TEXT,
+                    tags TEXT NOT NULL DEFAULT '[]',
+                    created_ts DOUBLE PRECISION NOT NULL,
+                    PRIMARY KEY (session_id, key)
+                );
+                """,
+            ]
+        else:
+            statements = [
+                """
+                CREATE TABLE IF NOT EXISTS sessions (
+                    session_id TEXT PRIMARY KEY,
+                    data JSONB NOT NULL DEFAULT '{}'::jsonb
+                );
+                """,
+                """
+                CREATE TABLE IF NOT EXISTS memory_index (
+                    session_id TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    memory_type TEXT NOT NULL,
+                    scope TEXT,
+                    tags JSONB NOT NULL DEFAULT '[]'::jsonb,
+                    created_ts DOUBLE PRECISION NOT NULL,
+                    PRIMARY KEY (session_id, key)
+                );
+                """,
+                """
+                CREATE INDEX IF NOT EXISTS idx_memory_index_tags
+                ON memory_index USING GIN (tags);
+                """,
+            ]
+        # Btree indexes serving type/scope/time filters in created order,
+        # SPO/POS/OSP composites serving every triple pattern, and ranked
+        # (negated importance / recency) composites serving top-k reads
+        statements += [
+            """
+            CREATE INDEX IF NOT EXISTS idx_memory_index_created
+            ON memory_index (session_id, created_ts, key);
+            """,
+            """
+            CREATE INDEX IF NOT EXISTS idx_memory_index_type
+            ON memory_index (session_id, memory_type, created_ts, key);
+            """,
+            """
+            CREATE INDEX IF NOT EXISTS idx_memory_index_scope
+            ON memory_index (session_id, scope, created_ts, key);
+            """,
+            """
+            CREATE TABLE IF NOT EXISTS memory_triples (
+                session_id TEXT NOT NULL,
+                key TEXT NOT NULL,
+                subject TEXT NOT NULL,
+                predicate TEXT NOT NULL,
+                object TEXT NOT NULL,
+                truth_score DOUBLE PRECISION NOT NULL,
+                PRIMARY KEY (session_id, key)
+            );
+            """,
+            """
+            CREATE INDEX IF NOT EXISTS idx_memory_triples_spo
+            ON memory_triples (session_id, subject, predicate, object);
+            """,
+            """
+            CREATE INDEX IF NOT EXISTS idx_memory_triples_pos
+            ON memory_triples (session_id, predicate, object, subject);
+            """,
+            """
+            CREATE INDEX IF NOT EXISTS idx_memory_triples_osp
+            ON memory_triples (session_id, object, subject, predicate);
+            """,
+            """
+            CREATE TABLE IF NOT EXISTS memory_ranks (
+                session_id TEXT NOT NULL,
+                rank_by TEXT NOT NULL,
+                key TEXT NOT NULL,
+                memory_type TEXT NOT NULL,
+                scope TEXT,
+                score DOUBLE PRECISION NOT NULL,
+                PRIMARY KEY (session_id, rank_by, key)
+            );
+            """,
+            """
+            CREATE INDEX IF NOT EXISTS idx_memory_ranks_all
+            ON memory_ranks (session_id, rank_by, score, key);
+            """,
+            """
+            CREATE INDEX IF NOT EXISTS idx_memory_ranks_type
+            ON memory_ranks (session_id, rank_by, memory_type, score, key);
+            """,
+            """
+            CREATE INDEX IF NOT EXISTS idx_memory_ranks_scope
+            ON memory_ranks (session_id, rank_by, scope, score, key);
+            """,
+            # Append-only log streams, time-ordered along seq
+            """
+            CREATE TABLE IF NOT EXISTS memory_log (
+                session_id TEXT NOT NULL,
+                stream TEXT NOT NULL,
+                seq BIGINT NOT NULL,
+                ts DOUBLE PRECISION NOT NULL,
+                value TEXT NOT NULL,
+                PRIMARY KEY (session_id, stream, seq)
+            );
+            """,
+            """
+            CREATE INDEX IF NOT EXISTS idx_memory_log_ts
+            ON memory_log (session_id, stream, ts, seq);
+            """,
+        ]
         try:
             with self.engine.begin() as conn:
-                conn.execute(text(create_table_sql))
-        except SQLAlchemyError as e:
+                for statement in statements:
+                    conn.execute(text(statement))
+        except SQLAlchemyError:
             # Fallback or log if this fails (e.g. read-only user)
             pass
 
+    def _index_statements(self, session_id: str, key: str, value: Any):
+        """Statements keeping ``memory_index``, ``memory_triples`` and
+        ``memory_ranks`` in sync with a written value."""
+        record = index_record(key, value)
+        ids = {"sid": session_id, "key": key}
+        statements = [(text(_UNINDEX_TRIPLE), ids), (text(_UNINDEX_RANKS), ids)]
+        if record is None:
+            statements.append((
+                text("DELETE FROM memory_index WHERE session_id = :sid AND key = :key"),
+                ids,
+            ))
+            return statements
+        sql = _UPSERT_INDEX_SQLITE if self._is_sqlite else _UPSERT_INDEX_POSTGRES
+        statements.append((text(sql), {
+            **ids,
+            "memory_type": record.memory_type,
+            "scope": record.scope,
+            "tags": json.dumps(list(record.tags)),
+            "created_ts": record.created_ts,
+        }))
+        if record.is_triple:
+            statements.append((text(_INDEX_TRIPLE), {
+                **ids,
+                "subject": record.subject,
+                "predicate": record.predicate,
+                "object": record.object,
+                "truth_score": record.truth_score,
+            }))
+        for by in RANK_ORDERS:
+            if rank_value(record, by) is not None:
+                statements.append((text(_INDEX_RANK), {
+                    **ids,
+                    "rank_by": by,
+                    "memory_type": record.memory_type,
+                    "scope": record.scope,
+                    "score": rank_order(record, by)[0],
+                }))
+        return statements
+
+    def _upsert_entry(self, session_id: str, key: str, meta_json: str):
+        """Statement setting one key's metadata wrapper in the session row."""
+        if self._is_sqlite:
+            sql = text("""
+                INSERT INTO sessions (session_id, data)
+                VALUES (:sid, json_object(:key, json(:meta)))
+                ON CONFLICT (session_id)
+                DO UPDATE SET data = json_set(sessions.data, :path, json(:meta));
+            """)
+        else:
+            sql = text("""
+                INSERT INTO sessions (session_id, data)
+                VALUES (:sid, jsonb_build_object(:key, :meta::jsonb))
+                ON CONFLICT (session_id) 
+                DO UPDATE SET data = sessions.data || jsonb_build_object(:key, :meta::jsonb);
+            """)
+        params = {"sid": session_id, "key": key, "meta": meta_json}
+        if self._is_sqlite:
+            params["path"] = self._json_path(key)
+        return sql, params
+
     def write(self, session_id: str, key: str, value: Any) -> None:
         """
         Write a value to the session state in DB.
@@ -121,20 +499,84 @@ class AlloyDBSessionStore(SessionStore):
             
             # Prepare metadata JSON string
             meta_json = json.dumps(metadata)
+            sql, params = self._upsert_entry(session_id, key, meta_json)
             
-            sql = text("""
-                INSERT INTO sessions (session_id, data)
-                VALUES (:sid, jsonb_build_object(:key, :meta::jsonb))
-                ON CONFLICT (session_id) 
-                DO UPDATE SET data = sessions.data || jsonb_build_object(:key, :meta::jsonb);
-            """)
-            
+            index_statements = self._index_statements(session_id, key, value)
             try:
                 with self.engine.begin() as conn:
-                    conn.execute(sql, {"sid": session_id, "key": key, "meta": meta_json})
+                    conn.execute(sql, params)
+                    for index_sql, index_params in index_statements:
+                        conn.execute(index_sql, index_params)
             except SQLAlchemyError:
                 raise
 
+    def write_many(self, session_id: str, items: Dict[str, Any]) -> None:
+        """
+        Write several keys of one session in a single transaction: one
+        JSONB merge of all keys into the session row, plus the index
+        statements.
+
+        Args:
+            session_id: Session identifier
+            items: Mapping of memory key to value
+        """
+        with self._tracer.start_as_current_span(
+            "AlloyDBSessionStore.write_many"
+        ) as span:
+            span.set_attribute("session.id", session_id)
+            span.set_attribute("memory.count", len(items))
+            span.set_attribute("database", self.config.database)
+            if not items:
+                return
+
+            created_at = get_current_timestamp().isoformat()
+            self._put(session_id, items, {
+                key: {
+                    "value": value,
+                    "created_at": created_at,
+                    "ttl_seconds": self.ttl_seconds,
+                }
+                for key, value in items.items()
+            })
+
+    def _put(
+        self,
+        session_id: str,
+        items: Dict[str, Any],
+        patch: Dict[str, Dict[str, Any]],
+    ) -> None:
+        """
+        Merge the wrappers in ``patch`` into the session row and index
+        ``items`` in one transaction.
+        """
+        if self._is_sqlite:
+            # json_patch() would merge nested objects; set each path
+            sql = text("""
+                INSERT INTO sessions (session_id, data)
+                VALUES (:sid, json_object(:key, json(:meta)))
+                ON CONFLICT (session_id)
+                DO UPDATE SET data = json_set(sessions.data, :path, json(:meta));
+            """)
+            statements = [
+                (sql, {
+                    "sid": session_id,
+                    "key": key,
+                    "path": self._json_path(key),
+                    "meta": json.dumps(meta),
+                })
+                for key, meta in patch.items()
+            ]
+        else:
+            statements = [(
+                text(_WRITE_MANY_POSTGRES),
+                {"sid": session_id, "patch": json.dumps(patch)},
+            )]
+        for key, value in items.items():
+            statements += self._index_statements(session_id, key, value)
+        with self.engine.begin() as conn:
+            for sql, params in statements:
+                conn.execute(sql, params)
+
     def read(self, session_id: str, key: str) -> Optional[Any]:
         """
         Read a value from DB.
@@ -144,35 +586,885 @@ class AlloyDBSessionStore(SessionStore):
             span.set_attribute("memory.key", key)
             
             # Query specific key path
-            sql = text("""
-                SELECT data->:key FROM sessions WHERE session_id = :sid
-            """)
+            if self._is_sqlite:
+                sql = text("""
+                    SELECT json_extract(data, :key) FROM sessions
+                    WHERE session_id = :sid
+                """)
+                params = {"sid": session_id, "key": self._json_path(key)}
+            else:
+                sql = text("""
+                    SELECT data->:key FROM sessions WHERE session_id = :sid
+                """)
+                params = {"sid": session_id, "key": key}
             
             try:
                 with self.engine.connect() as conn:
-                    result = conn.execute(sql, {"sid": session_id, "key": key}).scalar()
+                    result = conn.execute(sql, params).scalar()
                     
-                if result is None:
-                    return None
+                return self._unwrap(result)
                 
-                # SQLAlchemy/Psycopg2 might return dict for JSONB or str
+            except SQLAlchemyError:
+                return None
+
+    def _select_entry(self, session_id: str, key: str, for_update: bool = False):
+        """Statement selecting one key's metadata wrapper."""
+        if self._is_sqlite:
+            sql = """
+                SELECT json_extract(data, :key) FROM sessions
+                WHERE session_id = :sid
+            """
+            return text(sql), {"sid": session_id, "key": self._json_path(key)}
+        sql = "SELECT data->:key FROM sessions WHERE session_id = :sid"
+        if for_update:
+            sql += " FOR UPDATE"
+        return text(sql), {"sid": session_id, "key": key}
+
+    @staticmethod
+    def _version(result: Any) -> str:
+        """Version token of a stored metadata wrapper (a digest of it)."""
+        if result is None:
+            return MISSING_VERSION
+        metadata = result if isinstance(result, dict) else json.loads(result)
+        if isinstance(metadata, dict) and "created_at" in metadata:
+            ttl = metadata.get("ttl_seconds")
+            created_at = datetime.fromisoformat(metadata["created_at"])
+            if ttl is not None and is_expired(created_at, ttl):
+                return MISSING_VERSION
+        return entry_version(json.dumps(metadata, sort_keys=True))
+
+    def read_versioned(self, session_id: str, key: str) -> Tuple[Optional[Any], str]:
+        """
+        Read a value with its version token (a digest of the key's
+        metadata wrapper in the session row).
+
+        Args:
+            session_id: Session identifier
+            key: Memory key
+
+        Returns:
+            The value (None if not found or expired) and its version token
+        """
+        with self._tracer.start_as_current_span(
+            "AlloyDBSessionStore.read_versioned"
+        ) as span:
+            span.set_attribute("session.id", session_id)
+            span.set_attribute("memory.key", key)
+
+            sql, params = self._select_entry(session_id, key)
+            with self.engine.connect() as conn:
+                result = conn.execute(sql, params).scalar()
+            version = self._version(result)
+            if version == MISSING_VERSION:
+                return None, version
+            return self._unwrap(result), version
+
+    def write_versioned(
+        self, session_id: str, key: str, value: Any, if_version: str
+    ) -> str:
+        """
+        Write a value if the key is still at ``if_version``, in one
+        transaction holding the session row lock (``SELECT ... FOR
+        UPDATE``; the row is created first so concurrent first writes of a
+        session also serialize).
+
+        Args:
+            session_id: Session identifier
+            key: Memory key
+            value: Value to store
+            if_version: Expected version token
+
+        Returns:
+            The new version token
+
+        Raises:
+            VersionConflictError: If the key is at another version
+        """
+        with self._tracer.start_as_current_span(
+            "AlloyDBSessionStore.write_versioned"
+        ) as span:
+            span.set_attribute("session.id", session_id)
+            span.set_attribute("memory.key", key)
+            span.set_attribute("database", self.config.database)
+
+            metadata = {
+                "value": value,
+                "created_at": get_current_timestamp().isoformat(),
+                "ttl_seconds": self.ttl_seconds,
+            }
+            sql, params = self._upsert_entry(session_id, key, json.dumps(metadata))
+            select_sql, select_params = self._select_entry(
+                session_id, key, for_update=True
+            )
+            index_statements = self._index_statements(session_id, key, value)
+            with self.engine.begin() as conn:
+                conn.execute(text(_ENSURE_SESSION), {"sid": session_id})
+                current = self._version(
+                    conn.execute(select_sql, select_params).scalar()
+                )
+                if current != if_version:
+                    raise VersionConflictError(key, if_version, current)
+                conn.execute(sql, params)
+                for index_sql, index_params in index_statements:
+                    conn.execute(index_sql, index_params)
+            return self._version(metadata)
+
+    def patch(self, session_id: str, key: str, patch: MemoryPatch) -> Any:
+        """
+        Apply a partial update to a stored dict value in one transaction
+        holding the session row lock, so concurrent patches and writes of
+        the session serialize instead of overwriting each other.
+
+        Args:
+            session_id: Session identifier
+            key: Memory key
+            patch: Fields to set and increment
+
+        Returns:
+            The patched value
+
+        Raises:
+            KeyError: If the key does not exist
+            TypeError: If the patch does not fit the stored value
+        """
+        with self._tracer.start_as_current_span("AlloyDBSessionStore.patch") as span:
+            span.set_attribute("session.id", session_id)
+            span.set_attribute("memory.key", key)
+            span.set_attribute("database", self.config.database)
+
+            select_sql, select_params = self._select_entry(
+                session_id, key, for_update=True
+            )
+            with self.engine.begin() as conn:
+                # Writing first takes SQLite's write lock, where FOR UPDATE
+                # is unavailable; a missing key rolls the row back out.
+                conn.execute(text(_ENSURE_SESSION), {"sid": session_id})
+                result = conn.execute(select_sql, select_params).scalar()
+                if self._version(result) == MISSING_VERSION:
+                    raise KeyError(key)
+                value = patch.apply(self._unwrap(result))
+                metadata = {
+                    "value": value,
+                    "created_at": get_current_timestamp().isoformat(),
+                    "ttl_seconds": self.ttl_seconds,
+                }
+                conn.execute(
+                    *self._upsert_entry(session_id, key, json.dumps(metadata))
+                )
+                for index_sql, index_params in self._index_statements(
+                    session_id, key, value
+                ):
+                    conn.execute(index_sql, index_params)
+            return value
+
+    @staticmethod
+    def _unwrap(result: Any) -> Optional[Any]:
+        """Value of a stored metadata wrapper, or None if expired."""
+        if result is None:
+            return None
+
+        # SQLAlchemy/Psycopg2 might return dict for JSONB or str
+        metadata = result if isinstance(result, dict) else json.loads(result)
+
+        # Check TTL
+        if isinstance(metadata, dict) and "created_at" in metadata:
+            created_at = datetime.fromisoformat(metadata["created_at"])
+            ttl = metadata.get("ttl_seconds")
+            if ttl is not None and is_expired(created_at, ttl):
+                # Lazy delete? Or just return None.
+                # For read performance, we just return None.
+                # Cleanup job handles real deletion.
+                return None
+            return metadata.get("value")
+
+        return metadata
+
+    def read_many(self, session_id: str, keys: Sequence[str]) -> List[Optional[Any]]:
+        """
+        Read several values of one session with a single SELECT over the
+        session row.
+
+        Args:
+            session_id: Session identifier
+            keys: Memory keys
+
+        Returns:
+            Stored values aligned with ``keys`` (None if not found or expired)
+        """
+        if not keys:
+            return []
+        with self._tracer.start_as_current_span(
+            "AlloyDBSessionStore.read_many"
+        ) as span:
+            span.set_attribute("session.id", session_id)
+            span.set_attribute("memory.count", len(keys))
+
+            sql = _READ_MANY_SQLITE if self._is_sqlite else _READ_MANY_POSTGRES
+            try:
+                with self.engine.connect() as conn:
+                    rows = conn.execute(
+                        text(sql), {"sid": session_id, "keys": json.dumps(list(keys))}
+                    ).fetchall()
+            except SQLAlchemyError:
+                return [None] * len(keys)
+            found = dict(rows)
+            return [self._unwrap(found.get(key)) for key in keys]
+
+    def read_entries(
+        self, session_id: str, keys: Sequence[str]
+    ) -> List[Optional[StoredEntry]]:
+        """
+        Read several values of one session with their TTL envelopes with a
+        single SELECT over the session row.
+
+        Args:
+            session_id: Session identifier
+            keys: Memory keys
+
+        Returns:
+            Entries aligned with ``keys`` (None if not found or expired)
+        """
+        if not keys:
+            return []
+        with self._tracer.start_as_current_span(
+            "AlloyDBSessionStore.read_entries"
+        ) as span:
+            span.set_attribute("session.id", session_id)
+            span.set_attribute("memory.count", len(keys))
+
+            sql = _READ_MANY_SQLITE if self._is_sqlite else _READ_MANY_POSTGRES
+            with self.engine.connect() as conn:
+                rows = conn.execute(
+                    text(sql), {"sid": session_id, "keys": json.dumps(list(keys))}
+                ).fetchall()
+            found = dict(rows)
+            now = time.time()
+            entries: List[Optional[StoredEntry]] = []
+            for key in keys:
+                result = found.get(key)
+                if result is None:
+                    entries.append(None)
+                    continue
                 metadata = result if isinstance(result, dict) else json.loads(result)
-                
-                # Check TTL
                 if isinstance(metadata, dict) and "created_at" in metadata:
-                    created_at = datetime.fromisoformat(metadata["created_at"])
-                    ttl = metadata.get("ttl_seconds")
-                    if ttl is not None and is_expired(created_at, ttl):
-                        # Lazy delete? Or just return None.
-                        # For read performance, we just return None. 
-                        # Cleanup job handles real deletion.
-                        return None
-                    return metadata.get("value")
-                
-                return metadata
-                
+                    entry = StoredEntry.from_wrapper(metadata)
+                    entries.append(None if entry.expired(now) else entry)
+                else:
+                    entries.append(StoredEntry(metadata))
+            return entries
+
+    def write_entries(self, session_id: str, entries: Dict[str, StoredEntry]) -> None:
+        """
+        Write several keys of one session like ``write_many``, each wrapper
+        keeping its entry's write time and expiry.
+
+        Args:
+            session_id: Session identifier
+            entries: Mapping of memory key to entry
+        """
+        with self._tracer.start_as_current_span(
+            "AlloyDBSessionStore.write_entries"
+        ) as span:
+            span.set_attribute("session.id", session_id)
+            span.set_attribute("memory.count", len(entries))
+            span.set_attribute("database", self.config.database)
+            if not entries:
+                return
+
+            now = time.time()
+            self._put(
+                session_id,
+                {key: entry.value for key, entry in entries.items()},
+                {key: entry.to_wrapper(now) for key, entry in entries.items()},
+            )
+
+    def iter_sessions(self) -> Iterator[str]:
+        """
+        Stream the session ids in keyset-paginated SELECTs of the sessions
+        table, ``KEY_BATCH`` ids each.
+
+        Yields:
+            Session ids in byte order
+        """
+        sql = _ITER_SESSIONS_SQLITE if self._is_sqlite else _ITER_SESSIONS_POSTGRES
+        params = {"after": "", "limit": self.KEY_BATCH}
+        while True:
+            with self.engine.connect() as conn:
+                rows = conn.execute(text(sql), params).fetchall()
+            for (session_id,) in rows:
+                yield session_id
+            if len(rows) < self.KEY_BATCH:
+                return
+            params["after"] = rows[-1][0]
+
+    def read_session(self, session_id: str, prefix: str = "") -> Dict[str, Any]:
+        """
+        Read every key of a session starting with ``prefix`` with a single
+        SELECT of the session's JSONB row.
+
+        Args:
+            session_id: Session identifier
+            prefix: Key prefix (empty = all keys)
+
+        Returns:
+            Mapping of key to value of the live entries
+        """
+        with self._tracer.start_as_current_span(
+            "AlloyDBSessionStore.read_session"
+        ) as span:
+            span.set_attribute("session.id", session_id)
+
+            try:
+                with self.engine.connect() as conn:
+                    data = conn.execute(
+                        text("SELECT data FROM sessions WHERE session_id = :sid"),
+                        {"sid": session_id},
+                    ).scalar()
             except SQLAlchemyError:
-                return None
+                return {}
+            if isinstance(data, str):
+                data = json.loads(data)
+            values = {}
+            for key, metadata in (data or {}).items():
+                if not key.startswith(prefix):
+                    continue
+                # Parsed already; entries without a wrapper are kept as is
+                if isinstance(metadata, dict):
+                    metadata = self._unwrap(metadata)
+                if metadata is not None:
+                    values[key] = metadata
+            span.set_attribute("memory.count", len(values))
+            return values
+
+    def delete(self, session_id: str, key: str) -> bool:
+        """
+        Delete a key in one transaction: its wrapper is read (locking the
+        session row), removed from the JSONB row by a single conditional
+        UPDATE, and its index rows are deleted.
+
+        Args:
+            session_id: Session identifier
+            key: Memory key
+
+        Returns:
+            Whether a live key was deleted
+        """
+        with self._tracer.start_as_current_span("AlloyDBSessionStore.delete") as span:
+            span.set_attribute("session.id", session_id)
+            span.set_attribute("memory.key", key)
+            span.set_attribute("database", self.config.database)
+
+            if self._is_sqlite:
+                sql = _DELETE_KEY_SQLITE
+                params = {"sid": session_id, "path": self._json_path(key)}
+            else:
+                sql = _DELETE_KEY_POSTGRES
+                params = {"sid": session_id, "key": key}
+            with self.engine.begin() as conn:
+                current = conn.execute(
+                    *self._select_entry(session_id, key, for_update=True)
+                ).scalar()
+                if conn.execute(text(sql), params).rowcount == 0:
+                    return False
+                for index_sql, index_params in self._index_statements(
+                    session_id, key, None
+                ):
+                    conn.execute(index_sql, index_params)
+            return self._version(current) != MISSING_VERSION
+
+    def delete_session(self, session_id: str) -> int:
+        """
+        Delete a session in one transaction: a single DELETE of its row,
+        plus one DELETE per index and log table.
+
+        Args:
+            session_id: Session identifier
+
+        Returns:
+            Number of live keys deleted
+        """
+        with self._tracer.start_as_current_span(
+            "AlloyDBSessionStore.delete_session"
+        ) as span:
+            span.set_attribute("session.id", session_id)
+            span.set_attribute("database", self.config.database)
+
+            params = {"sid": session_id}
+            with self.engine.begin() as conn:
+                data = conn.execute(text(_DELETE_SESSION), params).scalar()
+                for sql in _DELETE_SESSION_ROWS:
+                    conn.execute(text(sql), params)
+            if isinstance(data, str):
+                data = json.loads(data)
+            deleted = sum(
+                1
+                for metadata in (data or {}).values()
+                if self._version(metadata) != MISSING_VERSION
+            )
+            span.set_attribute("deleted_count", deleted)
+            return deleted
+
+    def delete_prefix(self, session_id: str, prefix: str) -> int:
+        """
+        Delete every key of a session starting with ``prefix`` in one
+        transaction: a single UPDATE rebuilds the JSONB row without them,
+        plus one set-based DELETE per index table.
+
+        Args:
+            session_id: Session identifier
+            prefix: Key prefix
+
+        Returns:
+            Number of live keys deleted
+        """
+        with self._tracer.start_as_current_span(
+            "AlloyDBSessionStore.delete_prefix"
+        ) as span:
+            span.set_attribute("session.id", session_id)
+            span.set_attribute("database", self.config.database)
+
+            params = {"sid": session_id, "prefix_len": len(prefix), "prefix": prefix}
+            if self._is_sqlite:
+                select, update = _PREFIX_EXPIRY_SQLITE, _DELETE_PREFIX_SQLITE
+            else:
+                select, update = _PREFIX_EXPIRY_POSTGRES, _DELETE_PREFIX_POSTGRES
+            with self.engine.begin() as conn:
+                if not self._is_sqlite:
+                    conn.execute(text(_LOCK_SESSION), params)
+                rows = conn.execute(text(select), params).fetchall()
+                if rows:
+                    conn.execute(text(update), params)
+                for sql in _DELETE_PREFIX_ROWS:
+                    conn.execute(text(sql), params)
+            deleted = sum(
+                1
+                for created_at, ttl in rows
+                if created_at is None or ttl is None or not is_expired(
+                    datetime.fromisoformat(created_at), int(ttl)
+                )
+            )
+            span.set_attribute("deleted_count", deleted)
+            return deleted
+
+    def delete_log(self, session_id: str, stream: str) -> None:
+        """
+        Delete a log stream of a session with one DELETE.
+
+        Args:
+            session_id: Session identifier
+            stream: Stream name
+        """
+        with self._tracer.start_as_current_span(
+            "AlloyDBSessionStore.delete_log"
+        ) as span:
+            span.set_attribute("session.id", session_id)
+            span.set_attribute("log.stream", stream)
+            span.set_attribute("database", self.config.database)
+
+            with self.engine.begin() as conn:
+                conn.execute(text(_DELETE_LOG), {"sid": session_id, "stream": stream})
+
+    def iter_streams(self, session_id: str) -> Iterator[str]:
+        """
+        List the log streams of a session with one SELECT over the primary
+        key of ``memory_log``.
+
+        Args:
+            session_id: Session identifier
+
+        Yields:
+            Stream names in lexicographic order
+        """
+        with self.engine.connect() as conn:
+            rows = conn.execute(text(_SELECT_STREAMS), {"sid": session_id}).fetchall()
+        for (stream,) in rows:
+            yield stream
+
+    def iter_log_sessions(self) -> Iterator[str]:
+        """
+        Stream the ids of sessions holding log streams in keyset-paginated
+        SELECTs of ``memory_log``, ``KEY_BATCH`` ids each.
+
+        Yields:
+            Session ids in byte order
+        """
+        sql = (
+            _ITER_LOG_SESSIONS_SQLITE if self._is_sqlite
+            else _ITER_LOG_SESSIONS_POSTGRES
+        )
+        params = {"after": "", "limit": self.KEY_BATCH}
+        while True:
+            with self.engine.connect() as conn:
+                rows = conn.execute(text(sql), params).fetchall()
+            for (session_id,) in rows:
+                yield session_id
+            if len(rows) < self.KEY_BATCH:
+                return
+            params["after"] = rows[-1][0]
+
+    def iter_keys(self, session_id: str, prefix: str = "") -> Iterator[str]:
+        """
+        Stream the live keys of a session starting with ``prefix`` in
+        keyset-paginated SELECTs over the keys of the JSONB row, reading
+        only the expiry fields of each wrapper.
+
+        Args:
+            session_id: Session identifier
+            prefix: Key prefix (empty = all keys)
+
+        Yields:
+            Keys in byte order
+        """
+        sql = _ITER_KEYS_SQLITE if self._is_sqlite else _ITER_KEYS_POSTGRES
+        statement = text(sql.format(">="))
+        params = {
+            "sid": session_id,
+            "after": prefix,
+            "prefix_len": len(prefix),
+            "prefix": prefix,
+            "limit": self.KEY_BATCH,
+        }
+        while True:
+            with self.engine.connect() as conn:
+                rows = conn.execute(statement, params).fetchall()
+            for key, created_at, ttl in rows:
+                if created_at is None or ttl is None or not is_expired(
+                    datetime.fromisoformat(created_at), int(ttl)
+                ):
+                    yield key
+            if len(rows) < self.KEY_BATCH:
+                return
+            statement = text(sql.format(">"))
+            params["after"] = rows[-1][0]
+
+    def query(self, session_id: str, query: MemoryQuery) -> QueryPage:
+        """
+        List the memory models of a session matching ``query`` from the
+        ``memory_index`` table (btree indexes for type/scope/time, GIN for
+        tags) with keyset pagination.
+
+        Args:
+            session_id: Session identifier
+            query: Filter and pagination
+
+        Returns:
+            One page of matching memories, oldest first
+        """
+        with self._tracer.start_as_current_span("AlloyDBSessionStore.query") as span:
+            span.set_attribute("session.id", session_id)
+
+            # Only constant fragments are concatenated; values are bound.
+            sql = [
+                "SELECT key, memory_type, scope, created_ts FROM memory_index",
+                "WHERE session_id = :sid",
+            ]
+            params: Dict[str, Any] = {"sid": session_id, "limit": query.limit + 1}
+            if query.memory_type is not None:
+                sql.append("AND memory_type = :memory_type")
+                params["memory_type"] = query.memory_type
+            if query.scope is not None:
+                sql.append("AND scope = :scope")
+                params["scope"] = query.scope
+            if query.key_prefix:
+                sql.append("AND substr(key, 1, :prefix_len) = :prefix")
+                params["prefix_len"] = len(query.key_prefix)
+                params["prefix"] = query.key_prefix
+            if query.since is not None:
+                sql.append("AND created_ts >= :since")
+                params["since"] = query.since_ts
+            if query.until is not None:
+                sql.append("AND created_ts < :until")
+                params["until"] = query.until_ts
+            after = query.after()
+            if after is not None:
+                sql.append("AND (created_ts, key) > (:after_ts, :after_key)")
+                params["after_ts"], params["after_key"] = after
+            if query.tags:
+                if self._is_sqlite:
+                    sql.append(
+                        "AND (SELECT COUNT(DISTINCT t.value)"
+                        " FROM json_each(memory_index.tags) AS t"
+                        " WHERE t.value IN (SELECT value FROM json_each(:tags)))"
+                        " = :tag_count"
+                    )
+                    params["tag_count"] = len(set(query.tags))
+                else:
+                    sql.append("AND tags @> CAST(:tags AS JSONB)")
+                params["tags"] = json.dumps(list(query.tags))
+            if query.any_tags:
+                if self._is_sqlite:
+                    sql.append(
+                        "AND EXISTS (SELECT 1 FROM json_each(memory_index.tags) AS t"
+                        " WHERE t.value IN (SELECT value FROM json_each(:any_tags)))"
+                    )
+                else:
+                    sql.append(
+                        "AND tags ?| ARRAY(SELECT jsonb_array_elements_text("
+                        "CAST(:any_tags AS JSONB)))"
+                    )
+                params["any_tags"] = json.dumps(list(query.any_tags))
+            sql.append("ORDER BY created_ts, key LIMIT :limit")
+
+            with self.engine.connect() as conn:
+                rows = conn.execute(text(" ".join(sql)), params).fetchall()
+            records = [
+                IndexRecord(key, memory_type, scope, (), float(created_ts))
+                for key, memory_type, scope, created_ts in rows
+            ]
+            page = records[: query.limit]
+            result = fetch_page(
+                page,
+                next_cursor(page, len(records) > query.limit),
+                lambda keys: self.read_many(session_id, keys),
+            )
+            span.set_attribute("query.results", len(result))
+            return result
+
+    def match_triples(self, session_id: str, pattern: TriplePattern) -> QueryPage:
+        """
+        List the SemanticMemory models of a session matching ``pattern``
+        from the ``memory_triples`` table, whose SPO/POS/OSP composite
+        indexes cover the bound terms of any pattern, with keyset pagination.
+
+        Args:
+            session_id: Session identifier
+            pattern: Triple pattern and pagination
+
+        Returns:
+            One page of matching memories, highest truth_score first
+        """
+        with self._tracer.start_as_current_span(
+            "AlloyDBSessionStore.match_triples"
+        ) as span:
+            span.set_attribute("session.id", session_id)
+
+            # Only constant fragments are concatenated; values are bound.
+            sql = [
+                "SELECT key, subject, predicate, object, truth_score",
+                "FROM memory_triples WHERE session_id = :sid",
+            ]
+            params: Dict[str, Any] = {"sid": session_id, "limit": pattern.limit + 1}
+            for fragment, name, term in (
+                ("AND subject = :subject", "subject", pattern.subject),
+                ("AND predicate = :predicate", "predicate", pattern.predicate),
+                ("AND object = :object", "object", pattern.object),
+            ):
+                if term is not None:
+                    sql.append(fragment)
+                    params[name] = term
+            if pattern.key_prefix:
+                sql.append("AND substr(key, 1, :prefix_len) = :prefix")
+                params["prefix_len"] = len(pattern.key_prefix)
+                params["prefix"] = pattern.key_prefix
+            after = pattern.after()
+            if after is not None:
+                sql.append("AND (-truth_score, key) > (:after_score, :after_key)")
+                params["after_score"], params["after_key"] = after
+            sql.append("ORDER BY truth_score DESC, key LIMIT :limit")
+
+            with self.engine.connect() as conn:
+                rows = conn.execute(text(" ".join(sql)), params).fetchall()
+            records = [
+                IndexRecord(
+                    key, "SemanticMemory", None, (), 0.0,
+                    subject, predicate, obj, float(truth_score),
+                )
+                for key, subject, predicate, obj, truth_score in rows
+            ]
+            page = records[: pattern.limit]
+            result = fetch_page(
+                page,
+                next_triple_cursor(page, len(records) > pattern.limit),
+                lambda keys: self.read_many(session_id, keys),
+            )
+            span.set_attribute("query.results", len(result))
+            return result
+
+    def rank(self, session_id: str, query: RankQuery) -> QueryPage:
+        """
+        List the top memory models of a session by importance or recency
+        with one ordered range read of a ``memory_ranks`` btree index.
+
+        Args:
+            session_id: Session identifier
+            query: Order, filters and pagination
+
+        Returns:
+            One page of memories, highest value first
+        """
+        with self._tracer.start_as_current_span("AlloyDBSessionStore.rank") as span:
+            span.set_attribute("session.id", session_id)
+
+            # Only constant fragments are concatenated; values are bound.
+            sql = [
+                "SELECT key, memory_type, scope, score FROM memory_ranks",
+                "WHERE session_id = :sid AND rank_by = :rank_by",
+            ]
+            params: Dict[str, Any] = {
+                "sid": session_id,
+                "rank_by": query.by,
+                "limit": query.limit + 1,
+            }
+            if query.memory_type is not None:
+                sql.append("AND memory_type = :memory_type")
+                params["memory_type"] = query.memory_type
+            if query.scope is not None:
+                sql.append("AND scope = :scope")
+                params["scope"] = query.scope
+            if query.key_prefix:
+                sql.append("AND substr(key, 1, :prefix_len) = :prefix")
+                params["prefix_len"] = len(query.key_prefix)
+                params["prefix"] = query.key_prefix
+            after = query.after()
+            if after is not None:
+                sql.append("AND (score, key) > (:after_score, :after_key)")
+                params["after_score"], params["after_key"] = after
+            sql.append("ORDER BY score, key LIMIT :limit")
+
+            with self.engine.connect() as conn:
+                rows = conn.execute(text(" ".join(sql)), params).fetchall()
+            records = [
+                ranked_record(key, memory_type, scope, query.by, score)
+                for key, memory_type, scope, score in rows
+            ]
+            page = records[: query.limit]
+            result = fetch_page(
+                page,
+                next_rank_cursor(page, len(records) > query.limit, query.by),
+                lambda keys: self.read_many(session_id, keys),
+            )
+            span.set_attribute("query.results", len(result))
+            return result
+
+    def append(
+        self,
+        session_id: str,
+        stream: str,
+        values: Sequence[Any],
+        max_len: Optional[int] = None,
+    ) -> List[LogEntry]:
+        """
+        Append values to a log stream of the session in one transaction.
+        Appends to the same stream are serialized by a transaction-scoped
+        advisory lock.
+
+        Args:
+            session_id: Session identifier
+            stream: Stream name
+            values: JSON-serializable values to append, in order
+            max_len: Keep only the newest ``max_len`` entries (None = all)
+
+        Returns:
+            The appended entries
+        """
+        with self._tracer.start_as_current_span("AlloyDBSessionStore.append") as span:
+            span.set_attribute("session.id", session_id)
+            span.set_attribute("log.stream", stream)
+            span.set_attribute("memory.count", len(values))
+
+            ids = {"sid": session_id, "stream": stream}
+            serialized = [json.dumps(value) for value in values]
+            with self.engine.begin() as conn:
+                if not self._is_sqlite:
+                    conn.execute(
+                        text(
+                            "SELECT pg_advisory_xact_lock("
+                            "hashtext(:sid), hashtext(:stream))"
+                        ),
+                        ids,
+                    )
+                head = conn.execute(text(_LOG_HEAD), ids).fetchone()
+                last_seq, last_ts = head if head is not None else (0, 0.0)
+                ts = max(time.time(), float(last_ts))
+                rows = [
+                    {**ids, "seq": last_seq + i, "ts": ts, "value": data}
+                    for i, data in enumerate(serialized, start=1)
+                ]
+                if rows:
+                    conn.execute(text(_LOG_APPEND), rows)
+                if max_len is not None:
+                    conn.execute(
+                        text(_LOG_TRIM),
+                        {**ids, "seq": last_seq + len(rows) - max_len},
+                    )
+            return [
+                LogEntry(str(row["seq"]), ts, value)
+                for row, value in zip(rows, values, strict=True)
+            ]
+
+    def read_log(self, session_id: str, query: LogQuery) -> LogPage:
+        """
+        Read one page of a log stream of the session with a keyset range
+        read of the ``(ts, seq)`` btree index.
+
+        Args:
+            session_id: Session identifier
+            query: Stream, time range, direction and pagination
+
+        Returns:
+            One page of entries, in read order
+        """
+        with self._tracer.start_as_current_span(
+            "AlloyDBSessionStore.read_log"
+        ) as span:
+            span.set_attribute("session.id", session_id)
+            span.set_attribute("log.stream", query.stream)
+
+            # Only constant fragments are concatenated; values are bound.
+            sql = [
+                "SELECT seq, ts, value FROM memory_log",
+                "WHERE session_id = :sid AND stream = :stream",
+            ]
+            params: Dict[str, Any] = {
+                "sid": session_id,
+                "stream": query.stream,
+                "limit": query.limit + 1,
+            }
+            low, high = query.bounds(self.ttl_seconds, time.time())
+            if low is not None:
+                sql.append("AND ts >= :low")
+                params["low"] = low
+            if high is not None:
+                sql.append("AND ts < :high")
+                params["high"] = high
+            after = query.after()
+            if after is not None:
+                sql.append(
+                    "AND (ts, seq) < (:after_ts, :after_seq)" if query.reverse
+                    else "AND (ts, seq) > (:after_ts, :after_seq)"
+                )
+                params["after_ts"] = after[0]
+                params["after_seq"] = int(after[1])
+            sql.append(
+                "ORDER BY ts DESC, seq DESC LIMIT :limit" if query.reverse
+                else "ORDER BY ts, seq LIMIT :limit"
+            )
+
+            with self.engine.connect() as conn:
+                rows = conn.execute(text(" ".join(sql)), params).fetchall()
+            entries = [
+                LogEntry(str(seq), float(ts), json.loads(value))
+                for seq, ts, value in rows[: query.limit]
+            ]
+            span.set_attribute("query.results", len(entries))
+            return LogPage(
+                entries, next_log_cursor(entries, len(rows) > query.limit)
+            )
+
+    def _cleanup_log(self, session_id: Optional[str]) -> int:
+        """Delete log entries appended more than ``ttl_seconds`` ago."""
+        if self.ttl_seconds is None:
+            return 0
+        sql = "DELETE FROM memory_log WHERE ts < :cutoff"
+        params: Dict[str, Any] = {"cutoff": time.time() - self.ttl_seconds}
+        if session_id:
+            sql += " AND session_id = :sid"
+            params["sid"] = session_id
+        try:
+            with self.engine.begin() as conn:
+                return conn.execute(text(sql), params).rowcount
+        except SQLAlchemyError:
+            return 0
 
     def cleanup_expired(self, session_id: Optional[str] = None) -> int:
         """
@@ -180,7 +1472,7 @@ class AlloyDBSessionStore(SessionStore):
         Since we store data in JSONB, we have to iterate or use complex SQL.
         Hard deletion inside JSONB used here.
         """
-        count = 0
+        count = self._cleanup_log(session_id)
         
         # NOTE: Cleaning up inside JSONB efficiently requires logic.
         # This simple implementation fetches the session, cleans it, and updates it.
@@ -188,14 +1480,16 @@ class AlloyDBSessionStore(SessionStore):
         
         if session_id:
             # Clean single session
-            select_sql = text("SELECT data FROM sessions WHERE session_id = :sid FOR UPDATE")
+            select_sql = text(
+                _SELECT_SESSION_SQLITE if self._is_sqlite else _SELECT_SESSION_POSTGRES
+            )
             update_sql = text("UPDATE sessions SET data = :data WHERE session_id = :sid")
             
             try:
                 with self.engine.begin() as conn:
                     data = conn.execute(select_sql, {"sid": session_id}).scalar()
                     if not data:
-                        return 0
+                        return count
                     
                     if isinstance(data, str):
                         data = json.loads(data)
@@ -213,7 +1507,7 @@ class AlloyDBSessionStore(SessionStore):
                         for k in keys_to_del:
                             del data[k]
                         conn.execute(update_sql, {"sid": session_id, "data": json.dumps(data)})
-                        count = len(keys_to_del)
+                        count += len(keys_to_del)
             except SQLAlchemyError:
                 pass
                 
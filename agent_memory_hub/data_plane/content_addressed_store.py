@@ -0,0 +1,654 @@
+"""
+Content-addressed deduplication layer for large payloads.
+"""
+import hashlib
+import json
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import replace
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from agent_memory_hub.data_plane.adk_session_store import SessionStore, StoredEntry
+from agent_memory_hub.indexing.episode_log import LogEntry, LogPage, LogQuery
+from agent_memory_hub.indexing.query import (
+    MemoryQuery,
+    QueryPage,
+    RankQuery,
+    TriplePattern,
+)
+from agent_memory_hub.utils.telemetry import get_tracer
+from agent_memory_hub.utils.ttl_manager import get_expiry_timestamp
+
+# Reserved session holding blobs, their metadata and reference markers
+BLOB_SESSION = "__cas__"
+# Seconds a new reference is kept by garbage collection before the session
+# key it was written for must hold it (covers the write in flight)
+GC_GRACE_SECONDS = 60.0
+# Marker field of the reference envelope written in place of a large value
+REF_FIELD = "$cas"
+# Memory model attributes copied into references so inner indexes see them
+INDEXED_FIELDS = (
+    "memory_type", "created_at", "scope", "tags",
+    "subject", "predicate", "object", "truth_score",
+    "importance", "timestamp", "updated_at",
+)
+_ENVELOPE_FIELDS = frozenset((REF_FIELD, "size") + INDEXED_FIELDS)
+
+
+def _canonical_bytes(value: Any) -> bytes:
+    """Serialize a value deterministically so equal values hash equally."""
+    return json.dumps(
+        value, sort_keys=True, separators=(",", ":"), default=str
+    ).encode("utf-8")
+
+
+def _ref_digest(value: Any) -> Optional[str]:
+    """Return the digest if value is a blob reference envelope."""
+    if (
+        isinstance(value, dict)
+        and REF_FIELD in value
+        and value.keys() <= _ENVELOPE_FIELDS
+    ):
+        digest = value[REF_FIELD]
+        return digest if isinstance(digest, str) else None
+    return None
+
+
+def _envelope(digest: str, size: int, value: Any) -> Dict[str, Any]:
+    envelope = {REF_FIELD: digest, "size": size}
+    if isinstance(value, dict) and "memory_type" in value:
+        envelope.update((f, value[f]) for f in INDEXED_FIELDS if f in value)
+    return envelope
+
+
+class ContentAddressedStore(SessionStore):
+    """
+    Session store wrapper that stores large values once under their
+    SHA-256 digest and writes small per-session references instead.
+
+    Layout in the blob store (session ``__cas__``):
+        blobs/{digest}       -> the original value
+        meta/{digest}        -> {"size": ..., "blob_expires_at": ...}
+        refs/{digest}/{id}   -> {"session_id": ..., "key": ..., "written_at": ...}
+
+    Every write adds its own reference marker, expiring with the reference,
+    before storing the blob and the session key, so writers never
+    read-modify-write a shared record and concurrent writers in other
+    processes cannot lose each other's references.
+
+    Blob lifetime is owned by ``collect_garbage``, a mark-and-sweep pass over
+    ``blobs/``. It drops markers that have expired or whose session key no
+    longer points at the blob, except those younger than ``grace_seconds``
+    (their session key may not be written yet), and deletes blobs left
+    without markers. A marker written while a blob is being deleted makes
+    the collector put the blob back. The blob store should be created
+    without a TTL and must support ``iter_keys`` and ``delete``.
+
+    References to memory models carry the model's indexed attributes, so
+    ``query`` on the inner store finds deduplicated models too.
+    """
+
+    def __init__(
+        self,
+        inner: SessionStore,
+        blob_store: Optional[SessionStore] = None,
+        threshold_bytes: int = 16 * 1024,
+        cache_size: int = 128,
+        grace_seconds: float = GC_GRACE_SECONDS,
+    ):
+        """
+        Initialize the content-addressed store.
+
+        Args:
+            inner: Store receiving per-session values and references
+            blob_store: Store holding deduplicated blobs (defaults to inner)
+            threshold_bytes: Minimum serialized size for a value to be deduplicated
+            cache_size: Number of decoded blobs kept in the in-process LRU cache
+            grace_seconds: Age below which garbage collection keeps a
+                reference whose session key does not hold it (yet)
+        """
+        self.inner = inner
+        self.blob_store = blob_store or inner
+        self.threshold_bytes = threshold_bytes
+        self.cache_size = cache_size
+        self.grace_seconds = grace_seconds
+        self.ttl_seconds = getattr(inner, "ttl_seconds", None)
+        self._tracer = get_tracer()
+        self._lock = threading.Lock()
+        self._cache: "OrderedDict[str, Any]" = OrderedDict()
+
+    @staticmethod
+    def _blob_key(digest: str) -> str:
+        return f"blobs/{digest}"
+
+    @staticmethod
+    def _meta_key(digest: str) -> str:
+        return f"meta/{digest}"
+
+    @staticmethod
+    def _refs_prefix(digest: str) -> str:
+        return f"refs/{digest}/"
+
+    def write(self, session_id: str, key: str, value: Any) -> None:
+        """
+        Write a value, deduplicating it if it exceeds the size threshold.
+        """
+        with self._tracer.start_as_current_span(
+            "ContentAddressedStore.write"
+        ) as span:
+            span.set_attribute("session.id", session_id)
+            span.set_attribute("memory.key", key)
+
+            stored = self._deduplicate(session_id, key, value, span)
+            self.inner.write(session_id, key, stored)
+            if stored is not value:
+                self._cache_put(_ref_digest(stored), value)
+
+    def _deduplicate(
+        self,
+        session_id: str,
+        key: str,
+        value: Any,
+        span,
+        entry: Optional[StoredEntry] = None,
+    ) -> Any:
+        """
+        Store ``value`` as a shared blob referenced by ``session_id``/``key``
+        if it exceeds the size threshold; returns what the inner store
+        should hold for the key (the value itself or a reference envelope).
+        The reference expires with ``entry`` if given, else after the TTL.
+        """
+        payload = _canonical_bytes(value)
+        span.set_attribute("payload.bytes", len(payload))
+        if len(payload) < self.threshold_bytes:
+            return value
+
+        digest = hashlib.sha256(payload).hexdigest()
+        span.set_attribute("cas.digest", digest)
+        now = time.time()
+        if entry is None:
+            expiry = get_expiry_timestamp(self.ttl_seconds)
+            expires_at = expiry.timestamp() if expiry else None
+        else:
+            expires_at = entry.expires_at
+
+        # The marker goes first: from now on the collector keeps the blob,
+        # or puts it back if it was deleting it (see collect_garbage)
+        marker = {"session_id": session_id, "key": key, "written_at": now}
+        self.blob_store.write_entries(BLOB_SESSION, {
+            f"{self._refs_prefix(digest)}{uuid.uuid4().hex}": StoredEntry(
+                marker, created_at=now, expires_at=expires_at
+            ),
+        })
+        meta = self.blob_store.read(BLOB_SESSION, self._meta_key(digest))
+        span.set_attribute("cas.hit", meta is not None)
+        if meta is None or self._blob_lapses(meta, expires_at):
+            self._store_blob(digest, value, len(payload))
+
+        return _envelope(digest, len(payload), value)
+
+    def write_many(self, session_id: str, items: Dict[str, Any]) -> None:
+        """
+        Write several values, deduplicating large ones, with one inner
+        batch write.
+        """
+        with self._tracer.start_as_current_span(
+            "ContentAddressedStore.write_many"
+        ) as span:
+            span.set_attribute("session.id", session_id)
+            span.set_attribute("memory.count", len(items))
+
+            stored = {
+                key: self._deduplicate(session_id, key, value, span)
+                for key, value in items.items()
+            }
+            self.inner.write_many(session_id, stored)
+            for key, value in items.items():
+                if stored[key] is not value:
+                    self._cache_put(_ref_digest(stored[key]), value)
+
+    @property
+    def atomic_writes(self) -> bool:
+        return self.inner.atomic_writes
+
+    def write_atomic(self, session_id: str, items: Dict[str, Any]) -> None:
+        """
+        Write several values all-or-nothing with one inner atomic write.
+        Blobs of large values are stored first; if the inner write fails
+        they are left unreferenced by it and reclaimed by
+        ``collect_garbage``.
+        """
+        if not self.atomic_writes:
+            raise NotImplementedError(
+                f"{type(self.inner).__name__} does not support atomic writes"
+            )
+        with self._tracer.start_as_current_span(
+            "ContentAddressedStore.write_atomic"
+        ) as span:
+            span.set_attribute("session.id", session_id)
+            span.set_attribute("memory.count", len(items))
+
+            stored = {
+                key: self._deduplicate(session_id, key, value, span)
+                for key, value in items.items()
+            }
+            self.inner.write_atomic(session_id, stored)
+            for key, value in items.items():
+                if stored[key] is not value:
+                    self._cache_put(_ref_digest(stored[key]), value)
+
+    def read_versioned(self, session_id: str, key: str) -> Tuple[Optional[Any], str]:
+        """
+        Read a value with the inner store's version token, resolving blob
+        references transparently.
+        """
+        with self._tracer.start_as_current_span(
+            "ContentAddressedStore.read_versioned"
+        ) as span:
+            span.set_attribute("session.id", session_id)
+            span.set_attribute("memory.key", key)
+
+            value, version = self.inner.read_versioned(session_id, key)
+            digest = _ref_digest(value)
+            if digest is None:
+                return value, version
+            span.set_attribute("cas.digest", digest)
+            return self._load_blob(digest), version
+
+    def write_versioned(
+        self, session_id: str, key: str, value: Any, if_version: str
+    ) -> str:
+        """
+        Write a value if the key is still at ``if_version``, deduplicating
+        it first. The blob of a write that loses the check is left
+        unreferenced and reclaimed by ``collect_garbage``.
+        """
+        with self._tracer.start_as_current_span(
+            "ContentAddressedStore.write_versioned"
+        ) as span:
+            span.set_attribute("session.id", session_id)
+            span.set_attribute("memory.key", key)
+
+            stored = self._deduplicate(session_id, key, value, span)
+            version = self.inner.write_versioned(session_id, key, stored, if_version)
+            if stored is not value:
+                self._cache_put(_ref_digest(stored), value)
+            return version
+
+    def read(self, session_id: str, key: str) -> Optional[Any]:
+        """
+        Read a value, resolving blob references transparently.
+        """
+        with self._tracer.start_as_current_span(
+            "ContentAddressedStore.read"
+        ) as span:
+            span.set_attribute("session.id", session_id)
+            span.set_attribute("memory.key", key)
+
+            value = self.inner.read(session_id, key)
+            digest = _ref_digest(value)
+            if digest is None:
+                return value
+
+            span.set_attribute("cas.digest", digest)
+            return self._load_blob(digest)
+
+    def read_many(self, session_id: str, keys: Sequence[str]) -> List[Optional[Any]]:
+        """
+        Read several values with one inner batch read, resolving blob
+        references transparently.
+        """
+        with self._tracer.start_as_current_span(
+            "ContentAddressedStore.read_many"
+        ) as span:
+            span.set_attribute("session.id", session_id)
+            span.set_attribute("memory.count", len(keys))
+
+            values = self.inner.read_many(session_id, keys)
+            for i, value in enumerate(values):
+                digest = _ref_digest(value)
+                if digest is not None:
+                    values[i] = self._load_blob(digest)
+            return values
+
+    def read_entries(
+        self, session_id: str, keys: Sequence[str]
+    ) -> List[Optional[StoredEntry]]:
+        """
+        Read several entries with one inner batch read, resolving blob
+        references so exports hold the values themselves.
+        """
+        with self._tracer.start_as_current_span(
+            "ContentAddressedStore.read_entries"
+        ) as span:
+            span.set_attribute("session.id", session_id)
+            span.set_attribute("memory.count", len(keys))
+
+            entries = self.inner.read_entries(session_id, keys)
+            for i, entry in enumerate(entries):
+                digest = _ref_digest(entry.value) if entry is not None else None
+                if digest is not None:
+                    value = self._load_blob(digest)
+                    entries[i] = (
+                        None if value is None else replace(entry, value=value)
+                    )
+            return entries
+
+    def write_entries(self, session_id: str, entries: Dict[str, StoredEntry]) -> None:
+        """
+        Write several entries with one inner batch write, deduplicating
+        large values under references that expire with their entries.
+        """
+        with self._tracer.start_as_current_span(
+            "ContentAddressedStore.write_entries"
+        ) as span:
+            span.set_attribute("session.id", session_id)
+            span.set_attribute("memory.count", len(entries))
+
+            stored = {
+                key: replace(entry, value=self._deduplicate(
+                    session_id, key, entry.value, span, entry
+                ))
+                for key, entry in entries.items()
+            }
+            self.inner.write_entries(session_id, stored)
+            for key, entry in entries.items():
+                if stored[key].value is not entry.value:
+                    self._cache_put(_ref_digest(stored[key].value), entry.value)
+
+    def iter_sessions(self) -> Iterator[str]:
+        """Stream the inner store's sessions, except the blob session."""
+        for session_id in self.inner.iter_sessions():
+            if session_id != BLOB_SESSION:
+                yield session_id
+
+    def read_session(self, session_id: str, prefix: str = "") -> Dict[str, Any]:
+        """
+        Read a whole session with one inner session read, resolving blob
+        references transparently.
+        """
+        with self._tracer.start_as_current_span(
+            "ContentAddressedStore.read_session"
+        ) as span:
+            span.set_attribute("session.id", session_id)
+
+            values = self.inner.read_session(session_id, prefix)
+            for key, value in list(values.items()):
+                digest = _ref_digest(value)
+                if digest is None:
+                    continue
+                value = self._load_blob(digest)
+                if value is None:  # blob already collected
+                    del values[key]
+                else:
+                    values[key] = value
+            return values
+
+    def delete(self, session_id: str, key: str) -> bool:
+        """
+        Delete a key (or its reference) from the inner store; a blob left
+        without references is freed by the next ``collect_garbage``.
+        """
+        with self._tracer.start_as_current_span(
+            "ContentAddressedStore.delete"
+        ) as span:
+            span.set_attribute("session.id", session_id)
+            span.set_attribute("memory.key", key)
+
+            return self.inner.delete(session_id, key)
+
+    def delete_session(self, session_id: str) -> int:
+        """
+        Delete a session from the inner store; its blobs are freed by the
+        next ``collect_garbage``.
+        """
+        with self._tracer.start_as_current_span(
+            "ContentAddressedStore.delete_session"
+        ) as span:
+            span.set_attribute("session.id", session_id)
+
+            return self.inner.delete_session(session_id)
+
+    def iter_keys(self, session_id: str, prefix: str = "") -> Iterator[str]:
+        """Stream the inner store's keys; references need no resolving."""
+        return self.inner.iter_keys(session_id, prefix)
+
+    def delete_prefix(self, session_id: str, prefix: str) -> int:
+        """
+        Delete keys under a prefix from the inner store; blobs left without
+        references are freed by the next ``collect_garbage``.
+        """
+        with self._tracer.start_as_current_span(
+            "ContentAddressedStore.delete_prefix"
+        ) as span:
+            span.set_attribute("session.id", session_id)
+
+            return self.inner.delete_prefix(session_id, prefix)
+
+    def delete_log(self, session_id: str, stream: str) -> None:
+        """Delete a log stream of the inner store (logs are not deduplicated)."""
+        self.inner.delete_log(session_id, stream)
+
+    def iter_streams(self, session_id: str) -> Iterator[str]:
+        """List the inner store's log streams."""
+        return self.inner.iter_streams(session_id)
+
+    def iter_log_sessions(self) -> Iterator[str]:
+        """List the inner store's sessions holding log streams."""
+        return self.inner.iter_log_sessions()
+
+    def query(self, session_id: str, query: MemoryQuery) -> QueryPage:
+        """
+        Query the inner store's index, resolving blob references in the
+        results.
+        """
+        with self._tracer.start_as_current_span(
+            "ContentAddressedStore.query"
+        ) as span:
+            span.set_attribute("session.id", session_id)
+
+            return self._resolve_page(self.inner.query(session_id, query))
+
+    def match_triples(self, session_id: str, pattern: TriplePattern) -> QueryPage:
+        """
+        Match triples against the inner store's index, resolving blob
+        references in the results.
+        """
+        with self._tracer.start_as_current_span(
+            "ContentAddressedStore.match_triples"
+        ) as span:
+            span.set_attribute("session.id", session_id)
+
+            return self._resolve_page(self.inner.match_triples(session_id, pattern))
+
+    def rank(self, session_id: str, query: RankQuery) -> QueryPage:
+        """
+        Rank against the inner store's ordered indexes, resolving blob
+        references in the results.
+        """
+        with self._tracer.start_as_current_span("ContentAddressedStore.rank") as span:
+            span.set_attribute("session.id", session_id)
+
+            return self._resolve_page(self.inner.rank(session_id, query))
+
+    def append(
+        self,
+        session_id: str,
+        stream: str,
+        values: Sequence[Any],
+        max_len: Optional[int] = None,
+    ) -> List[LogEntry]:
+        """Append to the inner store's log; entries are never deduplicated."""
+        with self._tracer.start_as_current_span(
+            "ContentAddressedStore.append"
+        ) as span:
+            span.set_attribute("session.id", session_id)
+            span.set_attribute("log.stream", stream)
+
+            return self.inner.append(session_id, stream, values, max_len)
+
+    def read_log(self, session_id: str, query: LogQuery) -> LogPage:
+        """Read the inner store's log."""
+        with self._tracer.start_as_current_span(
+            "ContentAddressedStore.read_log"
+        ) as span:
+            span.set_attribute("session.id", session_id)
+            span.set_attribute("log.stream", query.stream)
+
+            return self.inner.read_log(session_id, query)
+
+    def _resolve_page(self, page: QueryPage) -> QueryPage:
+        resolved = []
+        for key, item in zip(page.keys, page.items, strict=True):
+            digest = _ref_digest(item)
+            if digest is not None:
+                item = self._load_blob(digest)
+            if item is not None:  # blob already collected
+                resolved.append((key, item))
+        return QueryPage(
+            keys=[key for key, _ in resolved],
+            items=[item for _, item in resolved],
+            next_cursor=page.next_cursor,
+        )
+
+    def collect_garbage(self) -> int:
+        """
+        Mark-and-sweep unreferenced blobs.
+
+        A reference is live while its marker has not expired and either the
+        session key still holds a reference to the blob or the marker is
+        younger than ``grace_seconds``. Dead markers are deleted, and of the
+        live markers of one session key only the newest is kept.
+
+        Returns:
+            Number of blobs deleted
+        """
+        with self._tracer.start_as_current_span(
+            "ContentAddressedStore.collect_garbage"
+        ) as span:
+            deleted = 0
+            for blob_key in list(self.blob_store.iter_keys(BLOB_SESSION, "blobs/")):
+                digest = blob_key[len("blobs/"):]
+                if not self._mark(digest):
+                    deleted += self._sweep(digest)
+            span.set_attribute("cas.deleted", deleted)
+            return deleted
+
+    def cleanup_expired(self, session_id: Optional[str] = None) -> int:
+        """
+        Cleanup expired entries in the inner store, then sweep blobs.
+
+        Args:
+            session_id: Optional session ID to limit the inner cleanup scope.
+                        Blobs are only swept for a full (unscoped) cleanup.
+
+        Returns:
+            Number of entries and blobs deleted
+        """
+        count = 0
+        inner_cleanup = getattr(self.inner, "cleanup_expired", None)
+        if inner_cleanup is not None:
+            count += inner_cleanup(session_id)
+        if session_id is None:
+            count += self.collect_garbage()
+        return count
+
+    def _markers(self, digest: str) -> Dict[str, Any]:
+        prefix = self._refs_prefix(digest)
+        keys = list(self.blob_store.iter_keys(BLOB_SESSION, prefix))
+        return dict(
+            zip(keys, self.blob_store.read_many(BLOB_SESSION, keys), strict=True)
+        )
+
+    def _mark(self, digest: str) -> bool:
+        """
+        Delete the dead and superseded reference markers of a blob; return
+        whether any live one is left.
+        """
+        markers = self._markers(digest)
+        by_session: Dict[str, Dict[str, List[Tuple[float, str]]]] = {}
+        for marker_key, marker in markers.items():
+            if marker is not None:  # expired markers read as missing
+                by_session.setdefault(marker["session_id"], {}).setdefault(
+                    marker["key"], []
+                ).append((marker["written_at"], marker_key))
+
+        live = set()
+        young = time.time() - self.grace_seconds
+        for session_id, keys in by_session.items():
+            held = self.inner.read_many(session_id, list(keys))
+            for value, refs in zip(held, keys.values(), strict=True):
+                written_at, newest = max(refs)
+                if _ref_digest(value) == digest or written_at > young:
+                    live.add(newest)
+        for marker_key in markers.keys() - live:
+            self._delete(BLOB_SESSION, marker_key)
+        return bool(live)
+
+    def _sweep(self, digest: str) -> int:
+        """
+        Delete a blob left without references; put it back if a writer added
+        a reference meanwhile (it may have seen the blob before the delete).
+        """
+        value = self.blob_store.read(BLOB_SESSION, self._blob_key(digest))
+        meta = self.blob_store.read(BLOB_SESSION, self._meta_key(digest))
+        self._delete(BLOB_SESSION, self._meta_key(digest))
+        self._delete(BLOB_SESSION, self._blob_key(digest))
+        with self._lock:
+            self._cache.pop(digest, None)
+        if value is not None and any(self._markers(digest).values()):
+            self._store_blob(digest, value, (meta or {}).get("size"))
+            return 0
+        return 1
+
+    def _blob_lapses(self, meta: Dict[str, Any], expires_at: Optional[float]) -> bool:
+        """
+        Whether the blob's own TTL would lapse before a new reference. Only
+        relevant when the blob store enforces a TTL of its own.
+        """
+        if getattr(self.blob_store, "ttl_seconds", None) is None:
+            return False
+        blob_expires_at = meta.get("blob_expires_at")
+        return (
+            blob_expires_at is None
+            or expires_at is None
+            or blob_expires_at < expires_at
+        )
+
+    def _store_blob(self, digest: str, value: Any, size: Optional[int]) -> None:
+        """Write a blob, then its metadata (read by writers to skip it)."""
+        blob_ttl = getattr(self.blob_store, "ttl_seconds", None)
+        self.blob_store.write(BLOB_SESSION, self._blob_key(digest), value)
+        self.blob_store.write(BLOB_SESSION, self._meta_key(digest), {
+            "size": size,
+            "blob_expires_at": time.time() + blob_ttl if blob_ttl else None,
+        })
+
+    def _load_blob(self, digest: str) -> Optional[Any]:
+        with self._lock:
+            if digest in self._cache:
+                self._cache.move_to_end(digest)
+                return self._cache[digest]
+
+        value = self.blob_store.read(BLOB_SESSION, self._blob_key(digest))
+        if value is not None:
+            self._cache_put(digest, value)
+        return value
+
+    def _cache_put(self, digest: str, value: Any) -> None:
+        if self.cache_size <= 0:
+            return
+        with self._lock:
+            self._cache[digest] = value
+            self._cache.move_to_end(digest)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def _delete(self, session_id: str, key: str) -> None:
+        # Tombstone where the blob store cannot delete.
+        try:
+            self.blob_store.delete(session_id, key)
+        except NotImplementedError:
+            self.blob_store.write(session_id, key, None)
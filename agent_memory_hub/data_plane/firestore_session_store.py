@@ -1,30 +1,87 @@
 """
 Firestore session store implementation.
 """
+import hashlib
+import json
+import time
+from collections import namedtuple
 from datetime import datetime
-from typing import Any, Optional
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
 
 try:
     from google.cloud import firestore
     FIRESTORE_AVAILABLE = True
+    DELETE_FIELD = firestore.DELETE_FIELD
+    FieldFilter = firestore.FieldFilter
 except ImportError:
     FIRESTORE_AVAILABLE = False
+    # Stand-ins so emulated clients work without the SDK installed
+    DELETE_FIELD = object()
+    FieldFilter = namedtuple("FieldFilter", ["field_path", "op_string", "value"])
 
-from agent_memory_hub.data_plane.adk_session_store import SessionStore
+from google.api_core.exceptions import Conflict, FailedPrecondition
+
+from agent_memory_hub.data_plane.adk_session_store import (
+    MISSING_VERSION,
+    SessionStore,
+    StoredEntry,
+    VersionConflictError,
+    entry_version,
+)
+from agent_memory_hub.indexing.episode_log import (
+    LogEntry,
+    LogPage,
+    LogQuery,
+    next_log_cursor,
+)
+from agent_memory_hub.indexing.query import (
+    RANK_ORDERS,
+    IndexRecord,
+    MemoryQuery,
+    QueryPage,
+    RankQuery,
+    TriplePattern,
+    fetch_page,
+    index_record,
+    next_cursor,
+    next_rank_cursor,
+    next_triple_cursor,
+    rank_order,
+    rank_value,
+)
 from agent_memory_hub.utils.telemetry import get_tracer
 from agent_memory_hub.utils.ttl_manager import get_current_timestamp, is_expired
 
+# Most values Firestore accepts in one ``array_contains_any`` filter
+_MAX_DISJUNCTION = 30
+# Ascending index fields giving the highest importance / most recent first
+_RANK_FIELDS = {"importance": "neg_importance", "recency": "neg_recency_ts"}
+# Most writes Firestore accepts in one batch
+_MAX_BATCH_WRITES = 500
+
 
 class FirestoreSessionStore(SessionStore):
     """
     Firestore-based session store for serverless, flexible memory.
+
+    Memory models are additionally indexed in the ``{collection}_index``
+    collection (one document per model) for ``query`` and
+    ``match_triples``; see the docs for the composite indexes they need.
+    Log entries are documents of the ``{collection}_log`` collection, one
+    head document per stream holding its sequence counters. Index, log
+    entry and head documents all carry a ``session_id`` field, so
+    ``delete_session`` finds them with one query per collection.
     """
 
+    APPEND_ATTEMPTS = 10
+    atomic_writes = True
+
     def __init__(
         self,
         collection: str = "agent_memory",
         project: Optional[str] = None,
         ttl_seconds: Optional[int] = None,
+        client: Optional[Any] = None,
     ):
         """
         Initialize Firestore session store.
@@ -33,8 +90,10 @@ class FirestoreSessionStore(SessionStore):
             collection: Root collection name for memory
             project: GCP project ID (optional, inferred from env)
             ttl_seconds: Default TTL for entries (None = no expiry)
+            client: Pre-built Firestore client (e.g. an emulator);
+                    created from ``project`` if omitted
         """
-        if not FIRESTORE_AVAILABLE:
+        if client is None and not FIRESTORE_AVAILABLE:
             raise ImportError(
                 "google-cloud-firestore is required for Firestore backend. "
                 "Install with: pip install google-cloud-firestore"
@@ -45,11 +104,33 @@ class FirestoreSessionStore(SessionStore):
         self._tracer = get_tracer()
         
         # Initialize client
-        self._db = firestore.Client(project=project)
+        self._db = client if client is not None else firestore.Client(project=project)
 
     def _get_doc_ref(self, session_id: str):
         return self._db.collection(self.collection_name).document(session_id)
 
+    @property
+    def index_collection_name(self) -> str:
+        return f"{self.collection_name}_index"
+
+    def _get_index_ref(self, session_id: str, key: str):
+        # Keys may contain "/", which is not allowed in document IDs.
+        doc_id = hashlib.sha256(f"{session_id}\0{key}".encode("utf-8")).hexdigest()
+        return self._db.collection(self.index_collection_name).document(doc_id)
+
+    @property
+    def log_collection_name(self) -> str:
+        return f"{self.collection_name}_log"
+
+    def _log_doc_id(self, session_id: str, stream: str) -> str:
+        return hashlib.sha256(f"{session_id}\0{stream}".encode("utf-8")).hexdigest()
+
+    def _get_log_ref(self, doc_id: str, seq: Optional[int] = None):
+        # Head document without ``seq``; zero padding keeps entries sorted
+        if seq is not None:
+            doc_id = f"{doc_id}-{seq:020d}"
+        return self._db.collection(self.log_collection_name).document(doc_id)
+
     def write(self, session_id: str, key: str, value: Any) -> None:
         """
         Write a value to Firestore.
@@ -70,8 +151,122 @@ class FirestoreSessionStore(SessionStore):
                 "ttl_seconds": self.ttl_seconds,
             }
             
-            # Merge into document (create if not exists)
-            doc_ref.set({key: metadata}, merge=True)
+            record = index_record(key, value)
+            if record is None:
+                # Merge into document (create if not exists)
+                doc_ref.set({key: metadata}, merge=True)
+                return
+
+            # Models: value and index entry in one atomic batch. Index entries
+            # of models later overwritten or expired are skipped by query().
+            batch = self._db.batch()
+            batch.set(doc_ref, {key: metadata}, merge=True)
+            batch.set(
+                self._get_index_ref(session_id, key),
+                self._index_entry(session_id, record),
+            )
+            batch.commit()
+
+    @staticmethod
+    def _index_entry(session_id: str, record: IndexRecord) -> dict:
+        """Index document of a memory model."""
+        entry = {"session_id": session_id, "key": record.key, **record.to_dict()}
+        if record.is_triple:
+            # Ascending sort key giving highest truth_score first
+            entry["neg_truth_score"] = -record.truth_score
+        for by in RANK_ORDERS:
+            if rank_value(record, by) is not None:
+                entry[_RANK_FIELDS[by]] = rank_order(record, by)[0]
+        return entry
+
+    def _batch_writes(
+        self,
+        session_id: str,
+        items: Dict[str, Any],
+        fields: Optional[Dict[str, dict]] = None,
+    ) -> List[Tuple[Any, dict, bool]]:
+        """
+        ``(document, data, merge)`` sets writing several keys of a session:
+        one merge into the session document plus model index documents.
+        ``fields`` replaces the wrappers written for the current time.
+        """
+        if fields is None:
+            created_at = get_current_timestamp().isoformat()
+            fields = {
+                key: {
+                    "value": value,
+                    "created_at": created_at,
+                    "ttl_seconds": self.ttl_seconds,
+                }
+                for key, value in items.items()
+            }
+        writes = [(self._get_doc_ref(session_id), fields, True)]
+        for key, value in items.items():
+            record = index_record(key, value)
+            if record is not None:
+                writes.append((
+                    self._get_index_ref(session_id, key),
+                    self._index_entry(session_id, record),
+                    False,
+                ))
+        return writes
+
+    def _commit(self, writes: Sequence[Tuple[Any, dict, bool]]) -> None:
+        batch = self._db.batch()
+        for ref, data, merge in writes:
+            batch.set(ref, data, merge=merge)
+        batch.commit()
+
+    def write_many(self, session_id: str, items: Dict[str, Any]) -> None:
+        """
+        Write several keys of one session: one merge into the session
+        document plus the index documents of memory models, committed as
+        one batch (split at Firestore's batch size limit).
+
+        Args:
+            session_id: Session identifier
+            items: Mapping of memory key to value
+        """
+        with self._tracer.start_as_current_span(
+            "FirestoreSessionStore.write_many"
+        ) as span:
+            span.set_attribute("session.id", session_id)
+            span.set_attribute("memory.count", len(items))
+            if not items:
+                return
+
+            writes = self._batch_writes(session_id, items)
+            for start in range(0, len(writes), _MAX_BATCH_WRITES):
+                self._commit(writes[start : start + _MAX_BATCH_WRITES])
+
+    def write_atomic(self, session_id: str, items: Dict[str, Any]) -> None:
+        """
+        Write several keys of one session in a single batch, which
+        Firestore commits all-or-nothing.
+
+        Args:
+            session_id: Session identifier
+            items: Mapping of memory key to value
+
+        Raises:
+            ValueError: If the batch would exceed Firestore's limit of 500
+                writes (one per memory model plus one for the session)
+        """
+        with self._tracer.start_as_current_span(
+            "FirestoreSessionStore.write_atomic"
+        ) as span:
+            span.set_attribute("session.id", session_id)
+            span.set_attribute("memory.count", len(items))
+            if not items:
+                return
+
+            writes = self._batch_writes(session_id, items)
+            if len(writes) > _MAX_BATCH_WRITES:
+                raise ValueError(
+                    f"Atomic write of {len(writes)} documents exceeds "
+                    f"Firestore's batch limit of {_MAX_BATCH_WRITES}"
+                )
+            self._commit(writes)
 
     def read(self, session_id: str, key: str) -> Optional[Any]:
         """
@@ -104,7 +299,7 @@ class FirestoreSessionStore(SessionStore):
                 
                 if ttl is not None and is_expired(created_at, ttl):
                     # Delete specific field
-                    doc_ref.update({key: firestore.DELETE_FIELD})
+                    doc_ref.update({key: DELETE_FIELD})
                     return None
                 
                 return entry.get("value")
@@ -112,6 +307,746 @@ class FirestoreSessionStore(SessionStore):
             # Fallback
             return entry
 
+    @classmethod
+    def _version(cls, data: Dict[str, Any], key: str) -> str:
+        """Version token of a key: a digest of its live metadata wrapper."""
+        entry = data.get(key)
+        if entry is None or cls._expired(entry):
+            return MISSING_VERSION
+        return entry_version(json.dumps(entry, sort_keys=True, default=str))
+
+    def read_versioned(self, session_id: str, key: str) -> Tuple[Optional[Any], str]:
+        """
+        Read a value with its version token (a digest of the stored entry).
+
+        Args:
+            session_id: Session identifier
+            key: Memory key
+
+        Returns:
+            The value (None if not found or expired) and its version token
+        """
+        with self._tracer.start_as_current_span(
+            "FirestoreSessionStore.read_versioned"
+        ) as span:
+            span.set_attribute("session.id", session_id)
+            span.set_attribute("memory.key", key)
+
+            snapshot = self._get_doc_ref(session_id).get()
+            data = snapshot.to_dict() if snapshot.exists else {}
+            version = self._version(data, key)
+            if version == MISSING_VERSION:
+                return None, version
+            return self._unwrap(data[key]), version
+
+    def write_versioned(
+        self, session_id: str, key: str, value: Any, if_version: str
+    ) -> str:
+        """
+        Write a value if the key is still at ``if_version``.
+
+        The key's version is checked on a snapshot of the session document,
+        and the write is committed with a ``last_update_time`` precondition
+        on that snapshot. A write to another key of the session fails the
+        precondition too, so the check is retried on a fresh snapshot.
+
+        Args:
+            session_id: Session identifier
+            key: Memory key
+            value: JSON-serializable value to store
+            if_version: Expected version token
+
+        Returns:
+            The new version token
+
+        Raises:
+            VersionConflictError: If the key is at another version
+        """
+        with self._tracer.start_as_current_span(
+            "FirestoreSessionStore.write_versioned"
+        ) as span:
+            span.set_attribute("session.id", session_id)
+            span.set_attribute("memory.key", key)
+
+            doc_ref = self._get_doc_ref(session_id)
+            record = index_record(key, value)
+            for _ in range(self.APPEND_ATTEMPTS):
+                snapshot = doc_ref.get()
+                current = self._version(
+                    snapshot.to_dict() if snapshot.exists else {}, key
+                )
+                if current != if_version:
+                    raise VersionConflictError(key, if_version, current)
+
+                metadata = {
+                    "value": value,
+                    "created_at": get_current_timestamp().isoformat(),
+                    "ttl_seconds": self.ttl_seconds,
+                }
+                batch = self._db.batch()
+                if snapshot.exists:
+                    batch.update(
+                        doc_ref,
+                        {key: metadata},
+                        option=self._db.write_option(
+                            last_update_time=snapshot.update_time
+                        ),
+                    )
+                else:
+                    batch.create(doc_ref, {key: metadata})
+                if record is not None:
+                    batch.set(
+                        self._get_index_ref(session_id, key),
+                        self._index_entry(session_id, record),
+                    )
+                try:
+                    batch.commit()
+                except (Conflict, FailedPrecondition):
+                    continue  # the session document changed since the snapshot
+                return self._version({key: metadata}, key)
+            raise RuntimeError(
+                f"Could not write {key!r} of session {session_id!r}: "
+                f"too much contention"
+            )
+
+    def delete(self, session_id: str, key: str) -> bool:
+        """
+        Delete a key's field of the session document and its index
+        document in one batch.
+
+        Args:
+            session_id: Session identifier
+            key: Memory key
+
+        Returns:
+            Whether a live key was deleted
+        """
+        with self._tracer.start_as_current_span("FirestoreSessionStore.delete") as span:
+            span.set_attribute("session.id", session_id)
+            span.set_attribute("memory.key", key)
+
+            doc_ref = self._get_doc_ref(session_id)
+            snapshot = doc_ref.get()
+            data = snapshot.to_dict() if snapshot.exists else {}
+            if key not in data:
+                return False
+            batch = self._db.batch()
+            batch.update(doc_ref, {key: DELETE_FIELD})
+            batch.delete(self._get_index_ref(session_id, key))
+            batch.commit()
+            return not self._expired(data[key])
+
+    def delete_session(self, session_id: str) -> int:
+        """
+        Delete the session document, then its index and log documents,
+        found by ``session_id`` and deleted in batches of 500.
+
+        Args:
+            session_id: Session identifier
+
+        Returns:
+            Number of live keys deleted
+        """
+        with self._tracer.start_as_current_span(
+            "FirestoreSessionStore.delete_session"
+        ) as span:
+            span.set_attribute("session.id", session_id)
+
+            doc_ref = self._get_doc_ref(session_id)
+            snapshot = doc_ref.get()
+            data = snapshot.to_dict() if snapshot.exists else {}
+            doc_ref.delete()
+            for collection in (self.index_collection_name, self.log_collection_name):
+                self._delete_matching(
+                    self._db.collection(collection).where(
+                        filter=FieldFilter("session_id", "==", session_id)
+                    )
+                )
+            deleted = sum(1 for entry in data.values() if not self._expired(entry))
+            span.set_attribute("deleted_count", deleted)
+            return deleted
+
+    def delete_prefix(self, session_id: str, prefix: str) -> int:
+        """
+        Delete every key of a session starting with ``prefix``: the field
+        names come from one document get, and each batch removes up to 499
+        fields with one update plus their index documents.
+
+        Args:
+            session_id: Session identifier
+            prefix: Key prefix
+
+        Returns:
+            Number of live keys deleted
+        """
+        with self._tracer.start_as_current_span(
+            "FirestoreSessionStore.delete_prefix"
+        ) as span:
+            span.set_attribute("session.id", session_id)
+
+            doc_ref = self._get_doc_ref(session_id)
+            snapshot = doc_ref.get()
+            data = snapshot.to_dict() if snapshot.exists else {}
+            keys = sorted(key for key in data if key.startswith(prefix))
+            # One write for the field update, the rest for index documents
+            size = _MAX_BATCH_WRITES - 1
+            for start in range(0, len(keys), size):
+                chunk = keys[start : start + size]
+                batch = self._db.batch()
+                batch.update(doc_ref, dict.fromkeys(chunk, DELETE_FIELD))
+                for key in chunk:
+                    batch.delete(self._get_index_ref(session_id, key))
+                batch.commit()
+            deleted = sum(1 for key in keys if not self._expired(data[key]))
+            span.set_attribute("deleted_count", deleted)
+            return deleted
+
+    def delete_log(self, session_id: str, stream: str) -> None:
+        """
+        Delete a log stream: its head and entry documents, found by
+        ``session_id`` and ``stream`` and deleted in batches of 500.
+
+        Args:
+            session_id: Session identifier
+            stream: Stream name
+        """
+        with self._tracer.start_as_current_span(
+            "FirestoreSessionStore.delete_log"
+        ) as span:
+            span.set_attribute("session.id", session_id)
+            span.set_attribute("log.stream", stream)
+
+            self._delete_matching(
+                self._db.collection(self.log_collection_name)
+                .where(filter=FieldFilter("session_id", "==", session_id))
+                .where(filter=FieldFilter("stream", "==", stream))
+            )
+
+    def iter_streams(self, session_id: str) -> Iterator[str]:
+        """
+        List the log streams of a session with one query for its head
+        documents (the only log documents with ``next_seq``).
+
+        Args:
+            session_id: Session identifier
+
+        Yields:
+            Stream names in lexicographic order
+        """
+        heads = (
+            self._db.collection(self.log_collection_name)
+            .where(filter=FieldFilter("session_id", "==", session_id))
+            .where(filter=FieldFilter("next_seq", ">", 0))
+        )
+        yield from sorted(head.to_dict()["stream"] for head in heads.stream())
+
+    def iter_log_sessions(self) -> Iterator[str]:
+        """
+        List the sessions holding log streams with one query for the head
+        documents of every stream.
+
+        Yields:
+            Session ids in lexicographic order
+        """
+        heads = self._db.collection(self.log_collection_name).where(
+            filter=FieldFilter("next_seq", ">", 0)
+        )
+        yield from sorted({head.to_dict()["session_id"] for head in heads.stream()})
+
+    def iter_keys(self, session_id: str, prefix: str = "") -> Iterator[str]:
+        """
+        Stream the live keys of a session starting with ``prefix``, the
+        field names of a single document get.
+
+        Args:
+            session_id: Session identifier
+            prefix: Key prefix (empty = all keys)
+
+        Yields:
+            Keys in lexicographic order
+        """
+        snapshot = self._get_doc_ref(session_id).get()
+        data = snapshot.to_dict() if snapshot.exists else {}
+        for key in sorted(data):
+            if key.startswith(prefix) and not self._expired(data[key]):
+                yield key
+
+    def query(self, session_id: str, query: MemoryQuery) -> QueryPage:
+        """
+        List the memory models of a session matching ``query``.
+
+        Equality filters, the first tag (``array_contains``, or
+        ``array_contains_any`` for ``any_tags`` alone) and the time range run
+        in Firestore, ordered by ``created_ts, key``; further tags and the key
+        prefix are checked on the returned batches.
+
+        Args:
+            session_id: Session identifier
+            query: Filter and pagination
+
+        Returns:
+            One page of matching memories, oldest first
+        """
+        with self._tracer.start_as_current_span("FirestoreSessionStore.query") as span:
+            span.set_attribute("session.id", session_id)
+
+            base = self._db.collection(self.index_collection_name).where(
+                filter=FieldFilter("session_id", "==", session_id)
+            )
+            if query.memory_type is not None:
+                base = base.where(
+                    filter=FieldFilter("memory_type", "==", query.memory_type)
+                )
+            if query.scope is not None:
+                base = base.where(filter=FieldFilter("scope", "==", query.scope))
+            if query.tags:
+                base = base.where(
+                    filter=FieldFilter("tags", "array_contains", query.tags[0])
+                )
+            elif 0 < len(query.any_tags) <= _MAX_DISJUNCTION:
+                # Firestore allows one array filter per query; the remaining
+                # tag criteria are checked in process
+                base = base.where(
+                    filter=FieldFilter(
+                        "tags", "array_contains_any", list(query.any_tags)
+                    )
+                )
+            if query.since is not None:
+                base = base.where(
+                    filter=FieldFilter("created_ts", ">=", query.since_ts)
+                )
+            if query.until is not None:
+                base = base.where(filter=FieldFilter("created_ts", "<", query.until_ts))
+            base = base.order_by("created_ts").order_by("key")
+
+            batch_size = query.limit + 1
+            after = query.after()
+            records: List[IndexRecord] = []
+            while len(records) <= query.limit:
+                batch_query = base.limit(batch_size)
+                if after is not None:
+                    batch_query = batch_query.start_after(
+                        {"created_ts": after[0], "key": after[1]}
+                    )
+                docs = [doc.to_dict() for doc in batch_query.stream()]
+                records.extend(
+                    record
+                    for record in (IndexRecord.from_dict(d["key"], d) for d in docs)
+                    if query.matches(record)
+                )
+                if len(docs) < batch_size:
+                    break
+                after = (docs[-1]["created_ts"], docs[-1]["key"])
+
+            page = records[: query.limit]
+            result = fetch_page(
+                page,
+                next_cursor(page, len(records) > query.limit),
+                lambda keys: self.read_many(session_id, keys),
+            )
+            span.set_attribute("query.results", len(result))
+            return result
+
+    def match_triples(self, session_id: str, pattern: TriplePattern) -> QueryPage:
+        """
+        List the SemanticMemory models of a session matching ``pattern``.
+
+        Bound terms are equality filters on the index collection, ordered
+        by ``neg_truth_score, key``; the key prefix is checked on the
+        returned batches.
+
+        Args:
+            session_id: Session identifier
+            pattern: Triple pattern and pagination
+
+        Returns:
+            One page of matching memories, highest truth_score first
+        """
+        with self._tracer.start_as_current_span(
+            "FirestoreSessionStore.match_triples"
+        ) as span:
+            span.set_attribute("session.id", session_id)
+
+            base = self._db.collection(self.index_collection_name).where(
+                filter=FieldFilter("session_id", "==", session_id)
+            )
+            for field_path, term in (
+                ("subject", pattern.subject),
+                ("predicate", pattern.predicate),
+                ("object", pattern.object),
+            ):
+                if term is not None:
+                    base = base.where(filter=FieldFilter(field_path, "==", term))
+            base = base.order_by("neg_truth_score").order_by("key")
+
+            batch_size = pattern.limit + 1
+            after = pattern.after()
+            records: List[IndexRecord] = []
+            while len(records) <= pattern.limit:
+                batch_query = base.limit(batch_size)
+                if after is not None:
+                    batch_query = batch_query.start_after(
+                        {"neg_truth_score": after[0], "key": after[1]}
+                    )
+                docs = [doc.to_dict() for doc in batch_query.stream()]
+                records.extend(
+                    record
+                    for record in (IndexRecord.from_dict(d["key"], d) for d in docs)
+                    if pattern.matches(record)
+                )
+                if len(docs) < batch_size:
+                    break
+                after = (docs[-1]["neg_truth_score"], docs[-1]["key"])
+
+            page = records[: pattern.limit]
+            result = fetch_page(
+                page,
+                next_triple_cursor(page, len(records) > pattern.limit),
+                lambda keys: self.read_many(session_id, keys),
+            )
+            span.set_attribute("query.results", len(result))
+            return result
+
+    def rank(self, session_id: str, query: RankQuery) -> QueryPage:
+        """
+        List the top memory models of a session by importance or recency.
+
+        Type and scope are equality filters on the index collection, ordered
+        by the negated value (``neg_importance`` or ``neg_recency_ts``), then
+        key; the key prefix is checked on the returned batches.
+
+        Args:
+            session_id: Session identifier
+            query: Order, filters and pagination
+
+        Returns:
+            One page of memories, highest value first
+        """
+        with self._tracer.start_as_current_span("FirestoreSessionStore.rank") as span:
+            span.set_attribute("session.id", session_id)
+
+            order_field = _RANK_FIELDS[query.by]
+            base = self._db.collection(self.index_collection_name).where(
+                filter=FieldFilter("session_id", "==", session_id)
+            )
+            if query.memory_type is not None:
+                base = base.where(
+                    filter=FieldFilter("memory_type", "==", query.memory_type)
+                )
+            if query.scope is not None:
+                base = base.where(filter=FieldFilter("scope", "==", query.scope))
+            base = base.order_by(order_field).order_by("key")
+
+            batch_size = query.limit + 1
+            after = query.after()
+            records: List[IndexRecord] = []
+            while len(records) <= query.limit:
+                batch_query = base.limit(batch_size)
+                if after is not None:
+                    batch_query = batch_query.start_after(
+                        {order_field: after[0], "key": after[1]}
+                    )
+                docs = [doc.to_dict() for doc in batch_query.stream()]
+                records.extend(
+                    record
+                    for record in (IndexRecord.from_dict(d["key"], d) for d in docs)
+                    if query.matches(record)
+                )
+                if len(docs) < batch_size:
+                    break
+                after = (docs[-1][order_field], docs[-1]["key"])
+
+            page = records[: query.limit]
+            result = fetch_page(
+                page,
+                next_rank_cursor(page, len(records) > query.limit, query.by),
+                lambda keys: self.read_many(session_id, keys),
+            )
+            span.set_attribute("query.results", len(result))
+            return result
+
+    def append(
+        self,
+        session_id: str,
+        stream: str,
+        values: Sequence[Any],
+        max_len: Optional[int] = None,
+    ) -> List[LogEntry]:
+        """
+        Append values to a log stream of the session.
+
+        The entry documents are created in one batch with the updated head
+        document; a concurrent append claiming the same sequence numbers
+        makes the batch fail, and the append is retried from the new head.
+
+        Args:
+            session_id: Session identifier
+            stream: Stream name
+            values: Values to append, in order
+            max_len: Keep only the newest ``max_len`` entries (None = all)
+
+        Returns:
+            The appended entries
+        """
+        with self._tracer.start_as_current_span(
+            "FirestoreSessionStore.append"
+        ) as span:
+            span.set_attribute("session.id", session_id)
+            span.set_attribute("log.stream", stream)
+            span.set_attribute("memory.count", len(values))
+
+            doc_id = self._log_doc_id(session_id, stream)
+            head_ref = self._get_log_ref(doc_id)
+            for _ in range(self.APPEND_ATTEMPTS):
+                snapshot = head_ref.get()
+                head = snapshot.to_dict() if snapshot.exists else {}
+                first_seq = head.get("first_seq", 1)
+                next_seq = head.get("next_seq", 1)
+                ts = max(time.time(), head.get("last_ts", 0.0))
+                entries = [
+                    LogEntry(str(next_seq + i), ts, value)
+                    for i, value in enumerate(values)
+                ]
+                new_first = first_seq
+                if max_len is not None:
+                    new_first = max(first_seq, next_seq + len(values) - max_len)
+
+                batch = self._db.batch()
+                for entry in entries:
+                    seq = int(entry.id)
+                    batch.create(
+                        self._get_log_ref(doc_id, seq),
+                        {
+                            "session_id": session_id,
+                            "stream": stream,
+                            "seq": seq,
+                            "ts": ts,
+                            # Ascending sort keys giving newest first
+                            "neg_seq": -seq,
+                            "neg_ts": -ts,
+                            "value": entry.value,
+                        },
+                    )
+                batch.set(
+                    head_ref,
+                    {
+                        "session_id": session_id,
+                        "stream": stream,
+                        "first_seq": new_first,
+                        "next_seq": next_seq + len(values),
+                        "last_ts": ts,
+                    },
+                )
+                try:
+                    batch.commit()
+                except Conflict:
+                    continue  # a concurrent append took these sequence numbers
+                self._delete_log_entries(doc_id, range(first_seq, new_first))
+                return entries
+            raise RuntimeError(
+                f"Could not append to log {stream!r} of session {session_id!r}: "
+                f"too much contention"
+            )
+
+    def _delete_log_entries(self, doc_id: str, seqs: range) -> None:
+        # Trimmed entries are deleted after the append commits, in batches
+        for start in range(seqs.start, seqs.stop, _MAX_BATCH_WRITES):
+            batch = self._db.batch()
+            for seq in range(start, min(start + _MAX_BATCH_WRITES, seqs.stop)):
+                batch.delete(self._get_log_ref(doc_id, seq))
+            batch.commit()
+
+    def read_log(self, session_id: str, query: LogQuery) -> LogPage:
+        """
+        Read one page of a log stream of the session.
+
+        Forward pages are ordered by ``(ts, seq)`` and reverse pages by
+        ``(neg_ts, neg_seq)``, both ascending; the time range filters the
+        first order field.
+
+        Args:
+            session_id: Session identifier
+            query: Stream, time range, direction and pagination
+
+        Returns:
+            One page of entries, in read order
+        """
+        with self._tracer.start_as_current_span(
+            "FirestoreSessionStore.read_log"
+        ) as span:
+            span.set_attribute("session.id", session_id)
+            span.set_attribute("log.stream", query.stream)
+
+            base = (
+                self._db.collection(self.log_collection_name)
+                .where(filter=FieldFilter("session_id", "==", session_id))
+                .where(filter=FieldFilter("stream", "==", query.stream))
+            )
+            low, high = query.bounds(self.ttl_seconds, time.time())
+            after = query.after()
+            if query.reverse:
+                if low is not None:
+                    base = base.where(filter=FieldFilter("neg_ts", "<=", -low))
+                if high is not None:
+                    base = base.where(filter=FieldFilter("neg_ts", ">", -high))
+                base = base.order_by("neg_ts").order_by("neg_seq")
+                if after is not None:
+                    base = base.start_after(
+                        {"neg_ts": -after[0], "neg_seq": -int(after[1])}
+                    )
+            else:
+                if low is not None:
+                    base = base.where(filter=FieldFilter("ts", ">=", low))
+                if high is not None:
+                    base = base.where(filter=FieldFilter("ts", "<", high))
+                base = base.order_by("ts").order_by("seq")
+                if after is not None:
+                    base = base.start_after({"ts": after[0], "seq": int(after[1])})
+
+            docs = [doc.to_dict() for doc in base.limit(query.limit + 1).stream()]
+            entries = [
+                LogEntry(str(d["seq"]), d["ts"], d["value"])
+                for d in docs[: query.limit]
+            ]
+            span.set_attribute("query.results", len(entries))
+            return LogPage(
+                entries, next_log_cursor(entries, len(docs) > query.limit)
+            )
+
+    def read_many(self, session_id: str, keys: Sequence[str]) -> List[Optional[Any]]:
+        """
+        Read several values of one session with a single document get.
+
+        Args:
+            session_id: Session identifier
+            keys: Memory keys
+
+        Returns:
+            Stored values aligned with ``keys`` (None if not found or expired)
+        """
+        with self._tracer.start_as_current_span(
+            "FirestoreSessionStore.read_many"
+        ) as span:
+            span.set_attribute("session.id", session_id)
+            span.set_attribute("memory.count", len(keys))
+            snapshot = self._get_doc_ref(session_id).get()
+        data = snapshot.to_dict() if snapshot.exists else {}
+        return [self._unwrap(data.get(key)) for key in keys]
+
+    def read_entries(
+        self, session_id: str, keys: Sequence[str]
+    ) -> List[Optional[StoredEntry]]:
+        """
+        Read several values of one session with their TTL envelopes with a
+        single document get.
+
+        Args:
+            session_id: Session identifier
+            keys: Memory keys
+
+        Returns:
+            Entries aligned with ``keys`` (None if not found or expired)
+        """
+        with self._tracer.start_as_current_span(
+            "FirestoreSessionStore.read_entries"
+        ) as span:
+            span.set_attribute("session.id", session_id)
+            span.set_attribute("memory.count", len(keys))
+            snapshot = self._get_doc_ref(session_id).get()
+        data = snapshot.to_dict() if snapshot.exists else {}
+        entries: List[Optional[StoredEntry]] = []
+        for key in keys:
+            entry = data.get(key)
+            if entry is None or self._expired(entry):
+                entries.append(None)
+            elif isinstance(entry, dict) and "created_at" in entry:
+                entries.append(StoredEntry.from_wrapper(entry))
+            else:
+                entries.append(StoredEntry(entry))
+        return entries
+
+    def write_entries(self, session_id: str, entries: Dict[str, StoredEntry]) -> None:
+        """
+        Write several keys of one session like ``write_many``, each wrapper
+        keeping its entry's write time and expiry.
+
+        Args:
+            session_id: Session identifier
+            entries: Mapping of memory key to entry
+        """
+        with self._tracer.start_as_current_span(
+            "FirestoreSessionStore.write_entries"
+        ) as span:
+            span.set_attribute("session.id", session_id)
+            span.set_attribute("memory.count", len(entries))
+            if not entries:
+                return
+
+            now = time.time()
+            writes = self._batch_writes(
+                session_id,
+                {key: entry.value for key, entry in entries.items()},
+                {key: entry.to_wrapper(now) for key, entry in entries.items()},
+            )
+            for start in range(0, len(writes), _MAX_BATCH_WRITES):
+                self._commit(writes[start : start + _MAX_BATCH_WRITES])
+
+    def iter_sessions(self) -> Iterator[str]:
+        """
+        Stream the session ids by listing the document references of the
+        collection in pages of ``KEY_BATCH``, without reading the documents.
+
+        Yields:
+            Session ids in document name order
+        """
+        for reference in self._db.collection(self.collection_name).list_documents(
+            page_size=self.KEY_BATCH
+        ):
+            yield reference.id
+
+    def read_session(self, session_id: str, prefix: str = "") -> Dict[str, Any]:
+        """
+        Read every key of a session starting with ``prefix`` with a single
+        document get.
+
+        Args:
+            session_id: Session identifier
+            prefix: Key prefix (empty = all keys)
+
+        Returns:
+            Mapping of key to value of the live entries
+        """
+        with self._tracer.start_as_current_span(
+            "FirestoreSessionStore.read_session"
+        ) as span:
+            span.set_attribute("session.id", session_id)
+            snapshot = self._get_doc_ref(session_id).get()
+            data = snapshot.to_dict() if snapshot.exists else {}
+            values = {}
+            for key, entry in data.items():
+                if key.startswith(prefix):
+                    value = self._unwrap(entry)
+                    if value is not None:
+                        values[key] = value
+            span.set_attribute("memory.count", len(values))
+            return values
+
+    @staticmethod
+    def _expired(entry: Any) -> bool:
+        """Whether a stored metadata wrapper has outlived its TTL."""
+        if isinstance(entry, dict) and "created_at" in entry:
+            ttl = entry.get("ttl_seconds")
+            created_at = datetime.fromisoformat(entry["created_at"])
+            return ttl is not None and is_expired(created_at, ttl)
+        return False
+
+    @classmethod
+    def _unwrap(cls, entry: Any) -> Optional[Any]:
+        """Value of a stored metadata wrapper, or None if expired."""
+        if isinstance(entry, dict) and "created_at" in entry:
+            return None if cls._expired(entry) else entry.get("value")
+        return entry
+
     def cleanup_expired(self, session_id: Optional[str] = None) -> int:
         """
         Cleanup expired entries.
@@ -120,7 +1055,7 @@ class FirestoreSessionStore(SessionStore):
             session_id: If provided, only cleans that session.
             
         Returns:
-            Number of deleted fields.
+            Number of deleted fields and log entries.
         """
         # Note: Scannning all docs is expensive in Firestore. 
         # This implementation assumes scoped usage.
@@ -148,10 +1083,40 @@ class FirestoreSessionStore(SessionStore):
                     created_at = datetime.fromisoformat(entry["created_at"])
                     ttl = entry["ttl_seconds"]
                     if ttl and is_expired(created_at, ttl):
-                        updates[key] = firestore.DELETE_FIELD
+                        updates[key] = DELETE_FIELD
                         count += 1
             
             if updates:
                 snapshot.reference.update(updates)
                 
+        if self.ttl_seconds is not None:
+            count += self._cleanup_log(session_id)
         return count
+
+    def _cleanup_log(self, session_id: Optional[str]) -> int:
+        # Log entries appended more than ttl_seconds ago, oldest first
+        expired = self._db.collection(self.log_collection_name).where(
+            filter=FieldFilter("ts", "<", time.time() - self.ttl_seconds)
+        )
+        if session_id:
+            expired = expired.where(
+                filter=FieldFilter("session_id", "==", session_id)
+            )
+        return self._delete_matching(expired)
+
+    def _delete_matching(self, query) -> int:
+        """Delete the documents matching a query in batches; returns the count."""
+        count = 0
+        while True:
+            refs = [
+                doc.reference
+                for doc in query.limit(_MAX_BATCH_WRITES).stream()
+            ]
+            if refs:
+                batch = self._db.batch()
+                for ref in refs:
+                    batch.delete(ref)
+                batch.commit()
+                count += len(refs)
+            if len(refs) < _MAX_BATCH_WRITES:
+                return count
@@ -0,0 +1,1459 @@
+"""
+LMDB (memory-mapped) session store implementation.
+"""
+import contextlib
+import hashlib
+import json
+import os
+import struct
+import threading
+import time
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+try:
+    import lmdb
+    LMDB_AVAILABLE = True
+except ImportError:
+    LMDB_AVAILABLE = False
+
+from agent_memory_hub.config.lmdb_config import LmdbConfig
+from agent_memory_hub.data_plane.adk_session_store import (
+    MISSING_VERSION,
+    SessionStore,
+    StoredEntry,
+    VersionConflictError,
+    entry_version,
+)
+from agent_memory_hub.data_plane.patch import MemoryPatch
+from agent_memory_hub.indexing.bitmap import Bitmap
+from agent_memory_hub.indexing.episode_log import (
+    LogEntry,
+    LogPage,
+    LogQuery,
+    next_log_cursor,
+)
+from agent_memory_hub.indexing.query import (
+    RANK_ORDERS,
+    IndexRecord,
+    MemoryQuery,
+    QueryPage,
+    RankQuery,
+    TriplePattern,
+    fetch_page,
+    index_record,
+    next_cursor,
+    next_rank_cursor,
+    next_triple_cursor,
+    paginate,
+    rank_order,
+    rank_value,
+    triple_order,
+)
+from agent_memory_hub.utils.telemetry import get_tracer
+
+# Value layout: little-endian float64 expiry (epoch seconds, 0 = never)
+# followed by the UTF-8 JSON payload.
+_HEADER = struct.Struct("<d")
+# Big-endian float64 sorts bytewise like the (positive) timestamps it encodes
+_INDEX_TS = struct.Struct(">d")
+_KEY_SEPARATOR = b"\x00"
+
+# Named databases: values, secondary index ordered by creation time, the
+# index key of each entry (to unindex on overwrite/expiry), the SPO/POS/OSP
+# triple permutations, the tag bitmaps, the importance/recency orders, and
+# the append-only log streams.
+_ENTRIES_DB = b"entries"
+_INDEX_DB = b"index"
+_INDEX_KEYS_DB = b"index_keys"
+_TRIPLES_DB = b"triples"
+_TAGS_DB = b"tags"
+_RANKS_DB = b"ranks"
+_LOGS_DB = b"logs"
+# Tag database key kinds (after ``session_id\0``): bitmap of a tag hash,
+# ordinal of a key, key of an ordinal, and the session's next ordinal
+_TAG_BITMAP = b"t"
+_ORDINAL_OF = b"k"
+_KEY_OF = b"o"
+_NEXT_ORDINAL = b"n"
+_ORDINAL = struct.Struct(">I")
+# Rank key layout (after ``session_id\0``): order, dimension (all records,
+# one scope or one memory type, the latter two followed by a term hash),
+# sortable score, key
+_RANK_ORDER_BYTES = {"importance": b"i", "recency": b"r"}
+_RANK_ALL, _RANK_SCOPE, _RANK_TYPE = b"a", b"s", b"t"
+_U64 = struct.Struct(">Q")
+_SIGN_BIT = 1 << 63
+# Log key layout (after ``session_id\0`` and the stream's term hash): the
+# stream head (first live seq, next seq, last append time), the stream
+# name, or an entry keyed by append time then seq. Append times never
+# decrease along seq, so entries sort in append order and time ranges are
+# key ranges.
+_LOG_HEAD = b"h"
+_LOG_NAME = b"n"
+_LOG_ENTRY = b"e"
+_LOG_HEAD_VALUE = struct.Struct(">QQd")
+# Triple keys hold fixed-size hashes of the terms: equality is all patterns
+# need, and long objects cannot overflow LMDB's key size limit.
+_TERM_HASH_SIZE = 8
+_PERMUTATIONS = {b"spo": (0, 1, 2), b"pos": (1, 2, 0), b"osp": (2, 0, 1)}
+_TRIPLE_KEY_OVERHEAD = 3 + 3 * _TERM_HASH_SIZE
+
+
+def _term_hash(term: str) -> bytes:
+    return hashlib.blake2b(term.encode("utf-8"), digest_size=_TERM_HASH_SIZE).digest()
+
+
+def _sortable(score: float) -> bytes:
+    """Encode a float so that bytewise order matches numeric order."""
+    (bits,) = _U64.unpack(_INDEX_TS.pack(score))
+    return _U64.pack(bits ^ (2**64 - 1) if bits & _SIGN_BIT else bits | _SIGN_BIT)
+
+
+class LazyValue:
+    """
+    A stored value whose JSON payload is decoded on first access.
+
+    Useful for large values of which callers often only need the size or
+    the raw bytes (e.g. to forward them unchanged).
+    """
+
+    __slots__ = ("_raw", "_value", "_decoded")
+
+    def __init__(self, raw: bytes):
+        self._raw = raw
+        self._value: Any = None
+        self._decoded = False
+
+    @property
+    def raw(self) -> bytes:
+        """The UTF-8 JSON payload."""
+        return self._raw
+
+    @property
+    def value(self) -> Any:
+        """The decoded value (decoded once, then cached)."""
+        if not self._decoded:
+            self._value = json.loads(self._raw)
+            self._decoded = True
+        return self._value
+
+    def __len__(self) -> int:
+        return len(self._raw)
+
+
+class LmdbSessionStore(SessionStore):
+    """
+    Session store on a memory-mapped LMDB environment.
+
+    Reads are served straight from the OS page cache: ``view()`` exposes the
+    stored payload as a zero-copy ``memoryview`` and ``read_lazy()`` defers
+    JSON decoding. Every process on the host opening the same ``config.path``
+    shares one copy of the data in the page cache; LMDB serializes writers
+    across processes while readers never block.
+
+    Keys are ``session_id\\0key``, so a session's entries are contiguous and
+    per-session cleanup is a range scan. Expired entries are skipped on read
+    and deleted by ``cleanup_expired``. Memory models are indexed in a
+    second database keyed by ``session_id\\0created_ts key`` so ``query``
+    is a range scan in creation order. Semantic triples are indexed once per
+    permutation (SPO, POS, OSP) under ``session_id\\0perm term-hashes key``;
+    the bound terms of any pattern are a key prefix of one permutation, so
+    ``match_triples`` is a single range scan. The importance and recency
+    orders are kept the same way, per session, scope and memory type, under
+    ``session_id\\0order dimension score key``, so ``rank`` reads k entries
+    from its cursor. Tagged models get a per-session ordinal, and each tag
+    a compressed bitmap of the ordinals carrying it, so tag-filtered
+    queries intersect bitmaps instead of scanning the session.
+    """
+
+    atomic_writes = True
+
+    def __init__(
+        self,
+        config: Optional[LmdbConfig] = None,
+        ttl_seconds: Optional[int] = None,
+    ):
+        """
+        Initialize the LMDB session store.
+
+        Args:
+            config: Environment configuration (defaults if omitted)
+            ttl_seconds: Default TTL for entries (None = no expiry)
+
+        Raises:
+            ImportError: If lmdb is not installed
+        """
+        if not LMDB_AVAILABLE:
+            raise ImportError(
+                "lmdb is required for LMDB backend. "
+                "Install with: pip install 'agent-memory-hub[lmdb]'"
+            )
+
+        self.config = config or LmdbConfig()
+        self.ttl_seconds = ttl_seconds
+        self._tracer = get_tracer()
+        self._lock = threading.Lock()
+        self._env_handle = None
+        self._dbs: Dict[bytes, Any] = {}
+        self._pid = None
+        self._env()
+
+    def _env(self):
+        # LMDB environments must not be used across fork(); reopen in children.
+        pid = os.getpid()
+        if self._env_handle is None or self._pid != pid:
+            with self._lock:
+                if self._env_handle is None or self._pid != pid:
+                    os.makedirs(self.config.path, exist_ok=True)
+                    self._env_handle = lmdb.open(
+                        self.config.path,
+                        map_size=self.config.map_size,
+                        max_readers=self.config.max_readers,
+                        sync=self.config.sync,
+                        readahead=self.config.readahead,
+                        lock=True,
+                        max_dbs=7,
+                    )
+                    self._dbs = {
+                        name: self._env_handle.open_db(name)
+                        for name in (
+                            _ENTRIES_DB,
+                            _INDEX_DB,
+                            _INDEX_KEYS_DB,
+                            _TRIPLES_DB,
+                            _TAGS_DB,
+                            _RANKS_DB,
+                            _LOGS_DB,
+                        )
+                    }
+                    self._pid = pid
+        return self._env_handle
+
+    def _db(self, name: bytes):
+        self._env()
+        return self._dbs[name]
+
+    def _encode_key(self, session_id: str, key: str) -> bytes:
+        encoded = session_id.encode("utf-8") + _KEY_SEPARATOR + key.encode("utf-8")
+        # Leave room for the timestamp / term hashes of derived index keys
+        max_size = self._env().max_key_size() - _TRIPLE_KEY_OVERHEAD
+        if len(encoded) > max_size:
+            raise ValueError(
+                f"Key too long for LMDB ({len(encoded)} bytes, max {max_size})"
+            )
+        return encoded
+
+    def _encode_value(self, value: Any, expires_at: float) -> bytes:
+        return _HEADER.pack(expires_at) + json.dumps(value).encode("utf-8")
+
+    def _expires_at(self) -> float:
+        if self.ttl_seconds is None:
+            return 0.0
+        return time.time() + self.ttl_seconds
+
+    @staticmethod
+    def _live(buffer, now: float) -> bool:
+        (expires_at,) = _HEADER.unpack_from(buffer)
+        return expires_at == 0.0 or now < expires_at
+
+    def _index_key(self, session_id: str, record: IndexRecord) -> bytes:
+        return (
+            session_id.encode("utf-8")
+            + _KEY_SEPARATOR
+            + _INDEX_TS.pack(record.created_ts)
+            + record.key.encode("utf-8")
+        )
+
+    @staticmethod
+    def _triple_prefix(session_id: str, permutation: bytes, terms: List[str]) -> bytes:
+        return (
+            session_id.encode("utf-8")
+            + _KEY_SEPARATOR
+            + permutation
+            + b"".join(_term_hash(term) for term in terms)
+        )
+
+    def _triple_keys(self, session_id: str, record: IndexRecord) -> List[bytes]:
+        terms = (record.subject, record.predicate, record.object)
+        return [
+            self._triple_prefix(session_id, name, [terms[p] for p in order])
+            + record.key.encode("utf-8")
+            for name, order in _PERMUTATIONS.items()
+        ]
+
+    @staticmethod
+    def _rank_prefix(
+        session_id: str, by: str, dimension: bytes, term: Optional[str] = None
+    ) -> bytes:
+        return (
+            session_id.encode("utf-8")
+            + _KEY_SEPARATOR
+            + _RANK_ORDER_BYTES[by]
+            + dimension
+            + (_term_hash(term) if term is not None else b"")
+        )
+
+    def _rank_keys(self, session_id: str, record: IndexRecord) -> List[bytes]:
+        keys = []
+        for by in RANK_ORDERS:
+            if rank_value(record, by) is None:
+                continue
+            suffix = _sortable(rank_order(record, by)[0]) + record.key.encode("utf-8")
+            keys.append(self._rank_prefix(session_id, by, _RANK_ALL) + suffix)
+            keys.append(
+                self._rank_prefix(session_id, by, _RANK_TYPE, record.memory_type)
+                + suffix
+            )
+            if record.scope is not None:
+                keys.append(
+                    self._rank_prefix(session_id, by, _RANK_SCOPE, record.scope)
+                    + suffix
+                )
+        return keys
+
+    @staticmethod
+    def _tag_key(session_id: str, kind: bytes, suffix: bytes) -> bytes:
+        return session_id.encode("utf-8") + _KEY_SEPARATOR + kind + suffix
+
+    def _tag_bitmap(self, txn, session_id: str, tag: str) -> Bitmap:
+        data = txn.get(
+            self._tag_key(session_id, _TAG_BITMAP, _term_hash(tag)),
+            db=self._db(_TAGS_DB),
+        )
+        return Bitmap.from_bytes(bytes(data)) if data is not None else Bitmap()
+
+    def _retag(
+        self,
+        txn,
+        session_id: str,
+        key: str,
+        old_tags: Sequence[str],
+        new_tags: Sequence[str],
+    ) -> None:
+        # Only the bitmaps of tags that changed are rewritten
+        old, new = set(old_tags), set(new_tags)
+        if old == new:
+            return
+        db = self._db(_TAGS_DB)
+        ordinal_key = self._tag_key(session_id, _ORDINAL_OF, key.encode("utf-8"))
+        data = txn.get(ordinal_key, db=db)
+        if data is not None:
+            packed = bytes(data)
+        else:
+            counter = self._tag_key(session_id, _NEXT_ORDINAL, b"")
+            data = txn.get(counter, db=db)
+            next_ordinal = _ORDINAL.unpack(bytes(data))[0] if data is not None else 0
+            txn.put(counter, _ORDINAL.pack(next_ordinal + 1), db=db)
+            packed = _ORDINAL.pack(next_ordinal)
+            txn.put(ordinal_key, packed, db=db)
+            txn.put(
+                self._tag_key(session_id, _KEY_OF, packed), key.encode("utf-8"), db=db
+            )
+        (ordinal,) = _ORDINAL.unpack(packed)
+
+        for tag in old ^ new:
+            bitmap = self._tag_bitmap(txn, session_id, tag)
+            if tag in new:
+                bitmap.add(ordinal)
+            else:
+                bitmap.discard(ordinal)
+            bitmap_key = self._tag_key(session_id, _TAG_BITMAP, _term_hash(tag))
+            if bitmap:
+                txn.put(bitmap_key, bitmap.to_bytes(), db=db)
+            else:
+                txn.delete(bitmap_key, db=db)
+        if not new:
+            txn.delete(ordinal_key, db=db)
+            txn.delete(self._tag_key(session_id, _KEY_OF, packed), db=db)
+
+    def _unindex(self, txn, entry_key: bytes) -> Optional[IndexRecord]:
+        """Drop the index entries of a key; returns its previous record."""
+        index_key = txn.get(entry_key, db=self._db(_INDEX_KEYS_DB))
+        if index_key is None:
+            return None
+        index_key = bytes(index_key)
+        data = txn.get(index_key, db=self._db(_INDEX_DB))
+        record = None
+        if data is not None:
+            session_id, key = bytes(entry_key).decode("utf-8").split("\0", 1)
+            record = IndexRecord.from_dict(key, json.loads(bytes(data)))
+            if record.is_triple:
+                for triple_key in self._triple_keys(session_id, record):
+                    txn.delete(triple_key, db=self._db(_TRIPLES_DB))
+            for rank_key in self._rank_keys(session_id, record):
+                txn.delete(rank_key, db=self._db(_RANKS_DB))
+        txn.delete(index_key, db=self._db(_INDEX_DB))
+        txn.delete(entry_key, db=self._db(_INDEX_KEYS_DB))
+        return record
+
+    def _encode_items(
+        self,
+        session_id: str,
+        items: Dict[str, Any],
+        expires_at: float,
+        expiries: Optional[Dict[str, float]] = None,
+    ) -> List[Tuple[str, bytes, bytes, Optional[IndexRecord]]]:
+        """
+        ``(key, entry key, stored bytes, index record)`` of each item;
+        ``expiries`` overrides ``expires_at`` per key.
+        """
+        expiries = expiries or {}
+        return [
+            (
+                key,
+                self._encode_key(session_id, key),
+                self._encode_value(value, expiries.get(key, expires_at)),
+                index_record(key, value),
+            )
+            for key, value in items.items()
+        ]
+
+    def _put(
+        self,
+        session_id: str,
+        items: Union[Dict[str, Any], Callable[[Any], Dict[str, Any]]],
+        check: Optional[Callable[[Any], None]] = None,
+        expiries: Optional[Dict[str, float]] = None,
+    ) -> List[bytes]:
+        """
+        Write items in one write transaction. ``check`` runs first inside
+        the transaction and may raise to abort it. ``items`` may be a
+        callable building them from what the transaction reads.
+        ``expiries`` sets the expiry time of keys instead of the TTL.
+
+        Returns:
+            The stored bytes of each item
+        """
+        expires_at = self._expires_at()
+        encoded = None
+        if not callable(items):
+            encoded = self._encode_items(session_id, items, expires_at, expiries)
+        env = self._env()
+        while True:
+            try:
+                with env.begin(write=True) as txn:
+                    if check is not None:
+                        check(txn)
+                    batch = encoded
+                    if batch is None:
+                        batch = self._encode_items(session_id, items(txn), expires_at)
+                    for key, entry_key, value, record in batch:
+                        txn.put(entry_key, value, db=self._db(_ENTRIES_DB))
+                        previous = self._unindex(txn, entry_key)
+                        self._retag(
+                            txn,
+                            session_id,
+                            key,
+                            previous.tags if previous is not None else (),
+                            record.tags if record is not None else (),
+                        )
+                        if record is None:
+                            continue
+                        index_key = self._index_key(session_id, record)
+                        data = json.dumps(record.to_dict()).encode("utf-8")
+                        txn.put(index_key, data, db=self._db(_INDEX_DB))
+                        txn.put(entry_key, index_key, db=self._db(_INDEX_KEYS_DB))
+                        if record.is_triple:
+                            for triple_key in self._triple_keys(session_id, record):
+                                txn.put(triple_key, data, db=self._db(_TRIPLES_DB))
+                        for rank_key in self._rank_keys(session_id, record):
+                            txn.put(rank_key, data, db=self._db(_RANKS_DB))
+                return [value for _, _, value, _ in batch]
+            except lmdb.MapFullError:
+                # Transaction was aborted; grow the map and retry.
+                env.set_mapsize(env.info()["map_size"] * 2)
+
+    def write(self, session_id: str, key: str, value: Any) -> None:
+        """
+        Write a value to LMDB.
+
+        Args:
+            session_id: Session identifier
+            key: Memory key
+            value: JSON-serializable value to store
+        """
+        with self._tracer.start_as_current_span("LmdbSessionStore.write") as span:
+            span.set_attribute("session.id", session_id)
+            span.set_attribute("memory.key", key)
+
+            self._put(session_id, {key: value})
+
+    def write_many(self, session_id: str, items: Dict[str, Any]) -> None:
+        """
+        Write several keys of one session in a single transaction.
+
+        Args:
+            session_id: Session identifier
+            items: Mapping of memory key to value
+        """
+        with self._tracer.start_as_current_span("LmdbSessionStore.write_many") as span:
+            span.set_attribute("session.id", session_id)
+            span.set_attribute("memory.count", len(items))
+
+            if items:
+                self._put(session_id, items)
+
+    @contextlib.contextmanager
+    def view(self, session_id: str, key: str) -> Iterator[Optional[memoryview]]:
+        """
+        Zero-copy access to a stored value's UTF-8 JSON payload.
+
+        The memoryview points into the memory map and is only valid inside
+        the ``with`` block (it is released when the read transaction ends).
+
+        Args:
+            session_id: Session identifier
+            key: Memory key
+
+        Yields:
+            memoryview of the payload, or None if not found or expired
+        """
+        with self._tracer.start_as_current_span("LmdbSessionStore.view") as span:
+            span.set_attribute("session.id", session_id)
+            span.set_attribute("memory.key", key)
+
+            with self._env().begin(buffers=True) as txn:
+                buffer = txn.get(
+                    self._encode_key(session_id, key), db=self._db(_ENTRIES_DB)
+                )
+                if buffer is None or not self._live(buffer, time.time()):
+                    yield None
+                    return
+                payload = buffer[_HEADER.size:]
+                try:
+                    yield payload
+                finally:
+                    payload.release()
+
+    def read_lazy(self, session_id: str, key: str) -> Optional[LazyValue]:
+        """
+        Read a value without decoding it.
+
+        Args:
+            session_id: Session identifier
+            key: Memory key
+
+        Returns:
+            LazyValue wrapping the payload, or None if not found or expired
+        """
+        with self.view(session_id, key) as payload:
+            return LazyValue(payload.tobytes()) if payload is not None else None
+
+    def read(self, session_id: str, key: str) -> Optional[Any]:
+        """
+        Read a value from LMDB.
+
+        Args:
+            session_id: Session identifier
+            key: Memory key
+
+        Returns:
+            Stored value or None if not found or expired
+        """
+        with self._tracer.start_as_current_span("LmdbSessionStore.read") as span:
+            span.set_attribute("session.id", session_id)
+            span.set_attribute("memory.key", key)
+
+            with self._env().begin(buffers=True) as txn:
+                buffer = txn.get(
+                    self._encode_key(session_id, key), db=self._db(_ENTRIES_DB)
+                )
+                if buffer is None or not self._live(buffer, time.time()):
+                    return None
+                # Decode straight from the map; only the decoded object is built.
+                return json.loads(bytes(buffer[_HEADER.size:]))
+
+    def _version(self, txn, entry_key: bytes, now: float) -> str:
+        buffer = txn.get(entry_key, db=self._db(_ENTRIES_DB))
+        if buffer is None or not self._live(buffer, now):
+            return MISSING_VERSION
+        return entry_version(bytes(buffer))
+
+    def read_versioned(self, session_id: str, key: str) -> Tuple[Optional[Any], str]:
+        """
+        Read a value with its version token (a digest of the stored bytes).
+
+        Args:
+            session_id: Session identifier
+            key: Memory key
+
+        Returns:
+            The value (None if not found or expired) and its version token
+        """
+        with self._tracer.start_as_current_span(
+            "LmdbSessionStore.read_versioned"
+        ) as span:
+            span.set_attribute("session.id", session_id)
+            span.set_attribute("memory.key", key)
+
+            entry_key = self._encode_key(session_id, key)
+            with self._env().begin(buffers=True) as txn:
+                version = self._version(txn, entry_key, time.time())
+                if version == MISSING_VERSION:
+                    return None, version
+                buffer = txn.get(entry_key, db=self._db(_ENTRIES_DB))
+                return json.loads(bytes(buffer[_HEADER.size:])), version
+
+    def write_versioned(
+        self, session_id: str, key: str, value: Any, if_version: str
+    ) -> str:
+        """
+        Write a value if the key is still at ``if_version``, checked inside
+        the write transaction.
+
+        Args:
+            session_id: Session identifier
+            key: Memory key
+            value: JSON-serializable value to store
+            if_version: Expected version token
+
+        Returns:
+            The new version token
+
+        Raises:
+            VersionConflictError: If the key is at another version
+        """
+        with self._tracer.start_as_current_span(
+            "LmdbSessionStore.write_versioned"
+        ) as span:
+            span.set_attribute("session.id", session_id)
+            span.set_attribute("memory.key", key)
+
+            entry_key = self._encode_key(session_id, key)
+
+            def check(txn) -> None:
+                current = self._version(txn, entry_key, time.time())
+                if current != if_version:
+                    raise VersionConflictError(key, if_version, current)
+
+            (stored,) = self._put(session_id, {key: value}, check)
+            return entry_version(stored)
+
+    def patch(self, session_id: str, key: str, patch: MemoryPatch) -> Any:
+        """
+        Apply a partial update to a stored dict value inside one write
+        transaction.
+
+        Args:
+            session_id: Session identifier
+            key: Memory key
+            patch: Fields to set and increment
+
+        Returns:
+            The patched value
+
+        Raises:
+            KeyError: If the key does not exist
+            TypeError: If the patch does not fit the stored value
+        """
+        with self._tracer.start_as_current_span("LmdbSessionStore.patch") as span:
+            span.set_attribute("session.id", session_id)
+            span.set_attribute("memory.key", key)
+
+            entry_key = self._encode_key(session_id, key)
+            patched = {}
+
+            def items(txn) -> Dict[str, Any]:
+                stored = txn.get(entry_key, db=self._db(_ENTRIES_DB))
+                if stored is None or not self._live(stored, time.time()):
+                    raise KeyError(key)
+                patched[key] = patch.apply(json.loads(bytes(stored[_HEADER.size:])))
+                return patched
+
+            self._put(session_id, items)
+            return patched[key]
+
+    def read_many(self, session_id: str, keys: Sequence[str]) -> List[Optional[Any]]:
+        """
+        Read several values of one session in a single read transaction.
+
+        Args:
+            session_id: Session identifier
+            keys: Memory keys
+
+        Returns:
+            Stored values aligned with ``keys`` (None if not found or expired)
+        """
+        with self._tracer.start_as_current_span("LmdbSessionStore.read_many") as span:
+            span.set_attribute("session.id", session_id)
+            span.set_attribute("memory.count", len(keys))
+
+            now = time.time()
+            values: List[Optional[Any]] = []
+            with self._env().begin(buffers=True) as txn:
+                for key in keys:
+                    buffer = txn.get(
+                        self._encode_key(session_id, key), db=self._db(_ENTRIES_DB)
+                    )
+                    if buffer is None or not self._live(buffer, now):
+                        values.append(None)
+                    else:
+                        values.append(json.loads(bytes(buffer[_HEADER.size:])))
+            return values
+
+    def read_entries(
+        self, session_id: str, keys: Sequence[str]
+    ) -> List[Optional[StoredEntry]]:
+        """
+        Read several values of one session with their expiry times in a
+        single read transaction.
+
+        Args:
+            session_id: Session identifier
+            keys: Memory keys
+
+        Returns:
+            Entries aligned with ``keys`` (None if not found or expired);
+            the store records no write times
+        """
+        with self._tracer.start_as_current_span(
+            "LmdbSessionStore.read_entries"
+        ) as span:
+            span.set_attribute("session.id", session_id)
+            span.set_attribute("memory.count", len(keys))
+
+            now = time.time()
+            entries: List[Optional[StoredEntry]] = []
+            with self._env().begin(buffers=True) as txn:
+                for key in keys:
+                    buffer = txn.get(
+                        self._encode_key(session_id, key), db=self._db(_ENTRIES_DB)
+                    )
+                    if buffer is None or not self._live(buffer, now):
+                        entries.append(None)
+                        continue
+                    (expires_at,) = _HEADER.unpack_from(buffer)
+                    entries.append(StoredEntry(
+                        json.loads(bytes(buffer[_HEADER.size:])),
+                        expires_at=expires_at or None,
+                    ))
+            return entries
+
+    def write_entries(self, session_id: str, entries: Dict[str, StoredEntry]) -> None:
+        """
+        Write several keys of one session in a single transaction, each
+        with its own expiry time.
+
+        Args:
+            session_id: Session identifier
+            entries: Mapping of memory key to entry
+        """
+        with self._tracer.start_as_current_span(
+            "LmdbSessionStore.write_entries"
+        ) as span:
+            span.set_attribute("session.id", session_id)
+            span.set_attribute("memory.count", len(entries))
+
+            if entries:
+                self._put(
+                    session_id,
+                    {key: entry.value for key, entry in entries.items()},
+                    expiries={
+                        key: entry.expires_at or 0.0
+                        for key, entry in entries.items()
+                    },
+                )
+
+    def iter_sessions(self) -> Iterator[str]:
+        """
+        Stream the ids of sessions holding keys, seeking past each
+        session's key range, ``KEY_BATCH`` sessions per read transaction.
+
+        Yields:
+            Session ids in lexicographic order (of their UTF-8 encoding)
+        """
+        position = b""
+        while True:
+            batch: List[str] = []
+            with self._env().begin(buffers=True) as txn:
+                cursor = txn.cursor(db=self._db(_ENTRIES_DB))
+                while len(batch) < self.KEY_BATCH and cursor.set_range(position):
+                    entry_key = bytes(cursor.key())
+                    session = entry_key[: entry_key.index(_KEY_SEPARATOR)]
+                    batch.append(session.decode("utf-8"))
+                    # The separator sorts first, so this is past the session
+                    position = session + b"\x01"
+            yield from batch
+            if len(batch) < self.KEY_BATCH:
+                return
+
+    def read_session(self, session_id: str, prefix: str = "") -> Dict[str, Any]:
+        """
+        Read every key of a session starting with ``prefix`` with one
+        cursor scan of the entries database in a single read transaction.
+
+        Args:
+            session_id: Session identifier
+            prefix: Key prefix (empty = all keys)
+
+        Returns:
+            Mapping of key to value of the live entries
+        """
+        with self._tracer.start_as_current_span(
+            "LmdbSessionStore.read_session"
+        ) as span:
+            span.set_attribute("session.id", session_id)
+
+            start = session_id.encode("utf-8") + _KEY_SEPARATOR
+            key_offset = len(start)
+            start += prefix.encode("utf-8")
+            now = time.time()
+            values: Dict[str, Any] = {}
+            with self._env().begin(buffers=True) as txn:
+                cursor = txn.cursor(db=self._db(_ENTRIES_DB))
+                cursor.set_range(start)
+                for entry_key, buffer in cursor:
+                    entry_key = bytes(entry_key)
+                    if not entry_key.startswith(start):
+                        break
+                    if self._live(buffer, now):
+                        values[entry_key[key_offset:].decode("utf-8")] = json.loads(
+                            bytes(buffer[_HEADER.size:])
+                        )
+            span.set_attribute("memory.count", len(values))
+            return values
+
+    def delete(self, session_id: str, key: str) -> bool:
+        """
+        Delete a key with its index entries and tag bits in one write
+        transaction.
+
+        Args:
+            session_id: Session identifier
+            key: Memory key
+
+        Returns:
+            Whether a live key was deleted
+        """
+        with self._tracer.start_as_current_span("LmdbSessionStore.delete") as span:
+            span.set_attribute("session.id", session_id)
+            span.set_attribute("memory.key", key)
+
+            entry_key = self._encode_key(session_id, key)
+            with self._env().begin(write=True, buffers=True) as txn:
+                buffer = txn.get(entry_key, db=self._db(_ENTRIES_DB))
+                if buffer is None:
+                    return False
+                live = self._live(buffer, time.time())
+                txn.delete(entry_key, db=self._db(_ENTRIES_DB))
+                record = self._unindex(txn, entry_key)
+                if record is not None:
+                    self._retag(txn, session_id, key, record.tags, ())
+            return live
+
+    def delete_session(self, session_id: str) -> int:
+        """
+        Delete a session's key range from every database (entries, indexes,
+        tags and logs) in one write transaction.
+
+        Args:
+            session_id: Session identifier
+
+        Returns:
+            Number of live keys deleted
+        """
+        with self._tracer.start_as_current_span(
+            "LmdbSessionStore.delete_session"
+        ) as span:
+            span.set_attribute("session.id", session_id)
+
+            prefix = session_id.encode("utf-8") + _KEY_SEPARATOR
+            now = time.time()
+            deleted = 0
+            with self._env().begin(write=True, buffers=True) as txn:
+                for name, db in self._dbs.items():
+                    cursor = txn.cursor(db=db)
+                    if not cursor.set_range(prefix):
+                        continue
+                    while bytes(cursor.key()).startswith(prefix):
+                        if name == _ENTRIES_DB and self._live(cursor.value(), now):
+                            deleted += 1
+                        # delete() moves to the next record
+                        if not cursor.delete() or not cursor.key():
+                            break
+            span.set_attribute("deleted_count", deleted)
+            return deleted
+
+    def delete_prefix(self, session_id: str, prefix: str) -> int:
+        """
+        Delete every key of a session starting with ``prefix`` with its
+        index entries and tag bits in one write transaction.
+
+        Args:
+            session_id: Session identifier
+            prefix: Key prefix
+
+        Returns:
+            Number of live keys deleted
+        """
+        with self._tracer.start_as_current_span(
+            "LmdbSessionStore.delete_prefix"
+        ) as span:
+            span.set_attribute("session.id", session_id)
+
+            start = session_id.encode("utf-8") + _KEY_SEPARATOR
+            key_offset = len(start)
+            start += prefix.encode("utf-8")
+            now = time.time()
+            deleted = 0
+            with self._env().begin(write=True, buffers=True) as txn:
+                entries = self._db(_ENTRIES_DB)
+                cursor = txn.cursor(db=entries)
+                doomed = []
+                found = cursor.set_range(start)
+                while found:
+                    entry_key = bytes(cursor.key())
+                    if not entry_key.startswith(start):
+                        break
+                    doomed.append((entry_key, self._live(cursor.value(), now)))
+                    found = cursor.next()
+                for entry_key, live in doomed:
+                    txn.delete(entry_key, db=entries)
+                    record = self._unindex(txn, entry_key)
+                    if record is not None:
+                        key = entry_key[key_offset:].decode("utf-8")
+                        self._retag(txn, session_id, key, record.tags, ())
+                    deleted += live
+            span.set_attribute("deleted_count", deleted)
+            return deleted
+
+    def delete_log(self, session_id: str, stream: str) -> None:
+        """
+        Delete a log stream's key range (head and entries) in one write
+        transaction.
+
+        Args:
+            session_id: Session identifier
+            stream: Stream name
+        """
+        with self._tracer.start_as_current_span("LmdbSessionStore.delete_log") as span:
+            span.set_attribute("session.id", session_id)
+            span.set_attribute("log.stream", stream)
+
+            prefix = self._log_prefix(session_id, stream)
+            with self._env().begin(write=True) as txn:
+                cursor = txn.cursor(db=self._db(_LOGS_DB))
+                if cursor.set_range(prefix):
+                    while bytes(cursor.key()).startswith(prefix):
+                        # delete() moves to the next record
+                        if not cursor.delete() or not cursor.key():
+                            break
+
+    def iter_streams(self, session_id: str) -> Iterator[str]:
+        """
+        List the log streams of a session from their name records, seeking
+        past each stream's key range in one read transaction.
+
+        Args:
+            session_id: Session identifier
+
+        Yields:
+            Stream names in lexicographic order
+        """
+        session = session_id.encode("utf-8") + _KEY_SEPARATOR
+        streams = []
+        with self._env().begin(buffers=True) as txn:
+            db = self._db(_LOGS_DB)
+            cursor = txn.cursor(db=db)
+            position = session
+            while cursor.set_range(position):
+                log_key = bytes(cursor.key())
+                if not log_key.startswith(session):
+                    break
+                prefix = log_key[: len(session) + _TERM_HASH_SIZE]
+                name = txn.get(prefix + _LOG_NAME, db=db)
+                if name is not None:
+                    streams.append(bytes(name).decode("utf-8"))
+                # Every record kind sorts before 0xff: this is past the stream
+                position = prefix + b"\xff"
+        yield from sorted(streams)
+
+    def iter_log_sessions(self) -> Iterator[str]:
+        """
+        Stream the ids of sessions holding log streams, seeking past each
+        session's range of the logs database, ``KEY_BATCH`` sessions per
+        read transaction.
+
+        Yields:
+            Session ids in lexicographic order (of their UTF-8 encoding)
+        """
+        position = b""
+        while True:
+            batch: List[str] = []
+            with self._env().begin(buffers=True) as txn:
+                cursor = txn.cursor(db=self._db(_LOGS_DB))
+                while len(batch) < self.KEY_BATCH and cursor.set_range(position):
+                    log_key = bytes(cursor.key())
+                    session = log_key[: log_key.index(_KEY_SEPARATOR)]
+                    batch.append(session.decode("utf-8"))
+                    # The separator sorts first, so this is past the session
+                    position = session + b"\x01"
+            yield from batch
+            if len(batch) < self.KEY_BATCH:
+                return
+
+    def iter_keys(self, session_id: str, prefix: str = "") -> Iterator[str]:
+        """
+        Stream the live keys of a session starting with ``prefix``, reading
+        ``KEY_BATCH`` keys per short read transaction so writers can reclaim
+        pages while the caller iterates.
+
+        Args:
+            session_id: Session identifier
+            prefix: Key prefix (empty = all keys)
+
+        Yields:
+            Keys in lexicographic order (of their UTF-8 encoding)
+        """
+        start = session_id.encode("utf-8") + _KEY_SEPARATOR
+        key_offset = len(start)
+        start += prefix.encode("utf-8")
+        position: Optional[bytes] = start
+        while position is not None:
+            batch: List[str] = []
+            now = time.time()
+            with self._env().begin(buffers=True) as txn:
+                cursor = txn.cursor(db=self._db(_ENTRIES_DB))
+                found = cursor.set_range(position)
+                position = None
+                while found:
+                    entry_key = bytes(cursor.key())
+                    if not entry_key.startswith(start):
+                        break
+                    if len(batch) == self.KEY_BATCH:
+                        position = entry_key  # resume here in a new txn
+                        break
+                    if self._live(cursor.value(), now):
+                        batch.append(entry_key[key_offset:].decode("utf-8"))
+                    found = cursor.next()
+            yield from batch
+
+    def query(self, session_id: str, query: MemoryQuery) -> QueryPage:
+        """
+        List the memory models of a session matching ``query`` by scanning
+        the creation-ordered index from ``since`` (or the cursor). Tag
+        filters are resolved on the tag bitmaps first and only the matching
+        records are loaded.
+
+        Args:
+            session_id: Session identifier
+            query: Filter and pagination
+
+        Returns:
+            One page of matching memories, oldest first
+        """
+        with self._tracer.start_as_current_span("LmdbSessionStore.query") as span:
+            span.set_attribute("session.id", session_id)
+
+            if query.filters_tags:
+                page, cursor = paginate(self._tagged(session_id, query), query)
+                result = fetch_page(
+                    page, cursor, lambda keys: self.read_many(session_id, keys)
+                )
+                span.set_attribute("query.results", len(result))
+                return result
+
+            prefix = session_id.encode("utf-8") + _KEY_SEPARATOR
+            after = query.after()
+            start_ts = max(
+                query.since_ts if query.since is not None else 0.0,
+                after[0] if after is not None else 0.0,
+            )
+            until_ts = query.until_ts
+            records = []
+            with self._env().begin() as txn:
+                cursor = txn.cursor(db=self._db(_INDEX_DB))
+                cursor.set_range(prefix + _INDEX_TS.pack(start_ts))
+                for index_key, data in cursor:
+                    if not index_key.startswith(prefix):
+                        break
+                    record = IndexRecord.from_dict(
+                        index_key[len(prefix) + _INDEX_TS.size:].decode("utf-8"),
+                        json.loads(data),
+                    )
+                    if until_ts is not None and record.created_ts >= until_ts:
+                        break
+                    if after is not None and (record.created_ts, record.key) <= after:
+                        continue
+                    if query.matches(record):
+                        records.append(record)
+                        if len(records) > query.limit:
+                            break
+
+            page = records[: query.limit]
+            result = fetch_page(
+                page,
+                next_cursor(page, len(records) > query.limit),
+                lambda keys: self.read_many(session_id, keys),
+            )
+            span.set_attribute("query.results", len(result))
+            return result
+
+    def _tagged(self, session_id: str, query: MemoryQuery) -> List[IndexRecord]:
+        """Index records of the keys the tag bitmaps select for ``query``."""
+        with self._env().begin() as txn:
+            tagged = None
+            if query.tags:
+                tagged = Bitmap.intersection(
+                    [self._tag_bitmap(txn, session_id, t) for t in set(query.tags)]
+                )
+            if query.any_tags and (tagged is None or tagged):
+                union = Bitmap.union(
+                    [self._tag_bitmap(txn, session_id, t) for t in set(query.any_tags)]
+                )
+                tagged = union if tagged is None else tagged & union
+
+            records = []
+            for ordinal in tagged:
+                key = txn.get(
+                    self._tag_key(session_id, _KEY_OF, _ORDINAL.pack(ordinal)),
+                    db=self._db(_TAGS_DB),
+                )
+                if key is None:
+                    continue
+                key = bytes(key).decode("utf-8")
+                index_key = txn.get(
+                    self._encode_key(session_id, key), db=self._db(_INDEX_KEYS_DB)
+                )
+                data = (
+                    txn.get(bytes(index_key), db=self._db(_INDEX_DB))
+                    if index_key is not None
+                    else None
+                )
+                if data is not None:
+                    records.append(IndexRecord.from_dict(key, json.loads(data)))
+            return records
+
+    def match_triples(self, session_id: str, pattern: TriplePattern) -> QueryPage:
+        """
+        List the SemanticMemory models of a session matching ``pattern`` with
+        one range scan of the permutation whose key prefix the bound terms
+        form.
+
+        Args:
+            session_id: Session identifier
+            pattern: Triple pattern and pagination
+
+        Returns:
+            One page of matching memories, highest truth_score first
+        """
+        with self._tracer.start_as_current_span(
+            "LmdbSessionStore.match_triples"
+        ) as span:
+            span.set_attribute("session.id", session_id)
+
+            bound = (pattern.subject, pattern.predicate, pattern.object)
+            count = sum(term is not None for term in bound)
+            for name, order in _PERMUTATIONS.items():
+                terms = [bound[p] for p in order][:count]
+                if None not in terms:
+                    prefix = self._triple_prefix(session_id, name, terms)
+                    break
+            # Unbound terms' hashes sit between the prefix and the memory key
+            key_offset = len(prefix) + (3 - count) * _TERM_HASH_SIZE
+            records = []
+            with self._env().begin() as txn:
+                cursor = txn.cursor(db=self._db(_TRIPLES_DB))
+                cursor.set_range(prefix)
+                for triple_key, data in cursor:
+                    if not triple_key.startswith(prefix):
+                        break
+                    record = IndexRecord.from_dict(
+                        bytes(triple_key[key_offset:]).decode("utf-8"),
+                        json.loads(bytes(data)),
+                    )
+                    # Also rules out (improbable) term hash collisions
+                    if pattern.matches(record):
+                        records.append(record)
+
+            records.sort(key=triple_order)
+            after = pattern.after()
+            if after is not None:
+                records = [r for r in records if triple_order(r) > after]
+            page = records[: pattern.limit]
+            result = fetch_page(
+                page,
+                next_triple_cursor(page, len(records) > pattern.limit),
+                lambda keys: self.read_many(session_id, keys),
+            )
+            span.set_attribute("query.results", len(result))
+            return result
+
+    def rank(self, session_id: str, query: RankQuery) -> QueryPage:
+        """
+        List the top memory models of a session by importance or recency
+        with one range scan of the order of its most selective filter.
+
+        Args:
+            session_id: Session identifier
+            query: Order, filters and pagination
+
+        Returns:
+            One page of memories, highest value first
+        """
+        with self._tracer.start_as_current_span("LmdbSessionStore.rank") as span:
+            span.set_attribute("session.id", session_id)
+
+            if query.memory_type is not None:
+                prefix = self._rank_prefix(
+                    session_id, query.by, _RANK_TYPE, query.memory_type
+                )
+            elif query.scope is not None:
+                prefix = self._rank_prefix(
+                    session_id, query.by, _RANK_SCOPE, query.scope
+                )
+            else:
+                prefix = self._rank_prefix(session_id, query.by, _RANK_ALL)
+            after = query.after()
+            key_offset = len(prefix) + _U64.size
+
+            records: List[IndexRecord] = []
+            with self._env().begin() as txn:
+                cursor = txn.cursor(db=self._db(_RANKS_DB))
+                start = prefix + _sortable(after[0]) if after is not None else prefix
+                cursor.set_range(start)
+                for rank_key, data in cursor:
+                    if not rank_key.startswith(prefix):
+                        break
+                    record = IndexRecord.from_dict(
+                        rank_key[key_offset:].decode("utf-8"), json.loads(data)
+                    )
+                    if after is not None and rank_order(record, query.by) <= after:
+                        continue
+                    if query.matches(record):
+                        records.append(record)
+                        if len(records) > query.limit:
+                            break
+
+            page = records[: query.limit]
+            result = fetch_page(
+                page,
+                next_rank_cursor(page, len(records) > query.limit, query.by),
+                lambda keys: self.read_many(session_id, keys),
+            )
+            span.set_attribute("query.results", len(result))
+            return result
+
+    @staticmethod
+    def _log_prefix(session_id: str, stream: str) -> bytes:
+        return session_id.encode("utf-8") + _KEY_SEPARATOR + _term_hash(stream)
+
+    @staticmethod
+    def _log_key(prefix: bytes, ts: float, seq: int) -> bytes:
+        return prefix + _LOG_ENTRY + _INDEX_TS.pack(ts) + _U64.pack(seq)
+
+    def _log_head(self, txn, prefix: bytes) -> Tuple[int, int, float]:
+        data = txn.get(prefix + _LOG_HEAD, db=self._db(_LOGS_DB))
+        if data is None:
+            return 1, 1, 0.0
+        return _LOG_HEAD_VALUE.unpack(bytes(data))
+
+    def append(
+        self,
+        session_id: str,
+        stream: str,
+        values: Sequence[Any],
+        max_len: Optional[int] = None,
+    ) -> List[LogEntry]:
+        """
+        Append values to a log stream of the session in one write
+        transaction.
+
+        Args:
+            session_id: Session identifier
+            stream: Stream name
+            values: JSON-serializable values to append, in order
+            max_len: Keep only the newest ``max_len`` entries (None = all)
+
+        Returns:
+            The appended entries
+        """
+        with self._tracer.start_as_current_span("LmdbSessionStore.append") as span:
+            span.set_attribute("session.id", session_id)
+            span.set_attribute("log.stream", stream)
+            span.set_attribute("memory.count", len(values))
+
+            prefix = self._log_prefix(session_id, stream)
+            payloads = [json.dumps(value).encode("utf-8") for value in values]
+            env = self._env()
+            while True:
+                try:
+                    with env.begin(write=True) as txn:
+                        db = self._db(_LOGS_DB)
+                        first_seq, next_seq, last_ts = self._log_head(txn, prefix)
+                        ts = max(time.time(), last_ts)
+                        seqs = range(next_seq, next_seq + len(payloads))
+                        for seq, payload in zip(seqs, payloads, strict=True):
+                            txn.put(self._log_key(prefix, ts, seq), payload, db=db)
+                        next_seq += len(payloads)
+                        if max_len is not None and next_seq - first_seq > max_len:
+                            cursor = txn.cursor(db=db)
+                            cursor.set_range(prefix + _LOG_ENTRY)
+                            for _ in range(next_seq - first_seq - max_len):
+                                cursor.delete()
+                            first_seq = next_seq - max_len
+                        txn.put(
+                            prefix + _LOG_HEAD,
+                            _LOG_HEAD_VALUE.pack(first_seq, next_seq, ts),
+                            db=db,
+                        )
+                        txn.put(prefix + _LOG_NAME, stream.encode("utf-8"), db=db)
+                    break
+                except lmdb.MapFullError:
+                    # Transaction was aborted; grow the map and retry.
+                    env.set_mapsize(env.info()["map_size"] * 2)
+            return [
+                LogEntry(str(seq), ts, value)
+                for seq, value in zip(seqs, values, strict=True)
+            ]
+
+    def read_log(self, session_id: str, query: LogQuery) -> LogPage:
+        """
+        Read one page of a log stream of the session with one range scan
+        between the time and cursor bounds.
+
+        Args:
+            session_id: Session identifier
+            query: Stream, time range, direction and pagination
+
+        Returns:
+            One page of entries, in read order
+        """
+        with self._tracer.start_as_current_span("LmdbSessionStore.read_log") as span:
+            span.set_attribute("session.id", session_id)
+            span.set_attribute("log.stream", query.stream)
+
+            entries_prefix = self._log_prefix(session_id, query.stream) + _LOG_ENTRY
+            low, high = query.bounds(self.ttl_seconds, time.time())
+            # Scan keys in [start, end)
+            start = entries_prefix + (_INDEX_TS.pack(low) if low is not None else b"")
+            end = (
+                entries_prefix + _INDEX_TS.pack(high)
+                if high is not None
+                else entries_prefix + b"\xff"
+            )
+            after = query.after()
+            if after is not None:
+                ts, seq = after[0], int(after[1])
+                if query.reverse:
+                    end = min(end, entries_prefix + _INDEX_TS.pack(ts) + _U64.pack(seq))
+                else:
+                    start = max(
+                        start, entries_prefix + _INDEX_TS.pack(ts) + _U64.pack(seq + 1)
+                    )
+
+            raw: List[Tuple[bytes, bytes]] = []
+            with self._env().begin() as txn:
+                cursor = txn.cursor(db=self._db(_LOGS_DB))
+                if query.reverse:
+                    found = cursor.prev() if cursor.set_range(end) else cursor.last()
+                    items = cursor.iterprev() if found else iter(())
+                else:
+                    items = cursor if cursor.set_range(start) else iter(())
+                for log_key, payload in items:
+                    if not start <= log_key < end:
+                        break
+                    raw.append((log_key, payload))
+                    if len(raw) > query.limit:
+                        break
+
+            offset = len(entries_prefix)
+            entries = []
+            for log_key, payload in raw[: query.limit]:
+                (ts,) = _INDEX_TS.unpack_from(log_key, offset)
+                (seq,) = _U64.unpack_from(log_key, offset + _INDEX_TS.size)
+                entries.append(LogEntry(str(seq), ts, json.loads(payload)))
+            span.set_attribute("query.results", len(entries))
+            return LogPage(entries, next_log_cursor(entries, len(raw) > query.limit))
+
+    def _cleanup_logs(self, txn, prefix: bytes, now: float) -> int:
+        """Delete log entries appended more than ``ttl_seconds`` ago."""
+        if self.ttl_seconds is None:
+            return 0
+        cutoff = _INDEX_TS.pack(now - self.ttl_seconds)
+        db = self._db(_LOGS_DB)
+        cursor = txn.cursor(db=db)
+        if not (cursor.set_range(prefix) if prefix else cursor.first()):
+            return 0
+        # Stream prefix -> entries deleted from its front
+        dropped: Dict[bytes, int] = {}
+        while True:
+            log_key = bytes(cursor.key())
+            if not log_key or not log_key.startswith(prefix):
+                break
+            stream_end = log_key.index(_KEY_SEPARATOR) + 1 + _TERM_HASH_SIZE
+            stream_prefix, kind = log_key[:stream_end], log_key[stream_end:][:1]
+            position = log_key[stream_end + 1:][: _INDEX_TS.size]
+            if kind == _LOG_ENTRY and position < cutoff:
+                dropped[stream_prefix] = dropped.get(stream_prefix, 0) + 1
+                if not cursor.delete():
+                    break
+            elif not cursor.next():
+                break
+        for stream_prefix, count in dropped.items():
+            first_seq, next_seq, last_ts = self._log_head(txn, stream_prefix)
+            txn.put(
+                stream_prefix + _LOG_HEAD,
+                _LOG_HEAD_VALUE.pack(first_seq + count, next_seq, last_ts),
+                db=db,
+            )
+        return sum(dropped.values())
+
+    def cleanup_expired(self, session_id: Optional[str] = None) -> int:
+        """
+        Delete expired entries, and log entries appended more than
+        ``ttl_seconds`` ago.
+
+        Args:
+            session_id: Only clean up this session (None = all sessions)
+
+        Returns:
+            Number of entries deleted
+        """
+        with self._tracer.start_as_current_span(
+            "LmdbSessionStore.cleanup_expired"
+        ) as span:
+            prefix = b""
+            if session_id is not None:
+                prefix = session_id.encode("utf-8") + _KEY_SEPARATOR
+
+            now = time.time()
+            with self._env().begin(write=True, buffers=True) as txn:
+                cursor = txn.cursor(db=self._db(_ENTRIES_DB))
+                if prefix:
+                    cursor.set_range(prefix)
+                else:
+                    cursor.first()
+                expired = []
+                for entry_key, value in cursor:
+                    entry_key = bytes(entry_key)
+                    if prefix and not entry_key.startswith(prefix):
+                        break
+                    if not self._live(value, now):
+                        expired.append(entry_key)
+                for entry_key in expired:
+                    txn.delete(entry_key, db=self._db(_ENTRIES_DB))
+                    record = self._unindex(txn, entry_key)
+                    if record is not None:
+                        session, key = entry_key.decode("utf-8").split("\0", 1)
+                        self._retag(txn, session, key, record.tags, ())
+                deleted = len(expired) + self._cleanup_logs(txn, prefix, now)
+            span.set_attribute("deleted_count", deleted)
+            return deleted
+
+    def close(self) -> None:
+        """Close the environment (other processes are unaffected)."""
+        with self._lock:
+            if self._env_handle is not None and self._pid == os.getpid():
+                self._env_handle.close()
+            self._env_handle = None
@@ -0,0 +1,867 @@
+"""
+In-process memory session store for single-node deployments.
+"""
+import contextlib
+import json
+import os
+import tempfile
+import threading
+import time
+from dataclasses import replace
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Set, Tuple
+
+from agent_memory_hub.config.memory_config import MemoryStoreConfig
+from agent_memory_hub.data_plane.adk_session_store import (
+    MISSING_VERSION,
+    SessionStore,
+    StoredEntry,
+    VersionConflictError,
+    entry_version,
+)
+from agent_memory_hub.data_plane.patch import MemoryPatch
+from agent_memory_hub.indexing.episode_log import (
+    EpisodeLog,
+    LogEntry,
+    LogPage,
+    LogQuery,
+    next_log_cursor,
+)
+from agent_memory_hub.indexing.memory_index import SessionIndex
+from agent_memory_hub.indexing.query import (
+    MemoryQuery,
+    QueryPage,
+    RankQuery,
+    TriplePattern,
+    fetch_page,
+    index_record,
+)
+from agent_memory_hub.utils.telemetry import get_tracer
+
+SNAPSHOT_VERSION = 1
+
+# (serialized value, expires_at as epoch seconds or None)
+_Entry = Tuple[str, Optional[float]]
+
+
+class _Shard:
+    __slots__ = ("lock", "entries")
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.entries: Dict[Tuple[str, str], _Entry] = {}
+
+
+class InMemorySessionStore(SessionStore):
+    """
+    Sharded, lock-striped in-memory session store.
+
+    Entries are spread over ``config.shards`` dictionaries by hash of
+    ``(session_id, key)``, each guarded by its own lock, so concurrent
+    operations on different keys rarely contend. Values are kept
+    JSON-serialized, giving the same copy semantics (and the same
+    serializability requirements) as the remote backends. The keys of each
+    session are also kept in a set, so session-wide operations visit only
+    that session's entries.
+
+    Expired entries are dropped lazily on read and by ``cleanup_expired``.
+    With ``config.snapshot_path`` the store is loaded from disk on startup and
+    written back atomically by ``snapshot()``, periodically if
+    ``config.snapshot_interval_seconds`` is set, and on ``close()``.
+    Memory models are indexed in process for ``query``, semantic triples
+    for ``match_triples`` and importance/recency orders for ``rank``. Log
+    streams are ``EpisodeLog`` arrays, included in snapshots.
+    """
+
+    atomic_writes = True
+
+    def __init__(
+        self,
+        config: Optional[MemoryStoreConfig] = None,
+        ttl_seconds: Optional[int] = None,
+    ):
+        """
+        Initialize the in-memory session store.
+
+        Args:
+            config: Sharding and snapshot configuration (defaults if omitted)
+            ttl_seconds: Default TTL for entries (None = no expiry)
+        """
+        self.config = config or MemoryStoreConfig()
+        self.ttl_seconds = ttl_seconds
+        self._tracer = get_tracer()
+        self._shards = [_Shard() for _ in range(self.config.shards)]
+        self._index = SessionIndex()
+        # session_id -> keys held in the shards; taken inside a shard lock
+        self._keys: Dict[str, Set[str]] = {}
+        self._keys_lock = threading.Lock()
+        self._logs: Dict[Tuple[str, str], EpisodeLog] = {}
+        self._logs_lock = threading.Lock()
+        self._snapshot_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._snapshot_thread: Optional[threading.Thread] = None
+
+        if self.config.snapshot_path and os.path.exists(self.config.snapshot_path):
+            self.load_snapshot(self.config.snapshot_path)
+
+        if self.config.snapshot_path and self.config.snapshot_interval_seconds:
+            self._snapshot_thread = threading.Thread(
+                target=self._snapshot_loop,
+                name="InMemorySessionStore-snapshot",
+                daemon=True,
+            )
+            self._snapshot_thread.start()
+
+    def _shard(self, session_id: str, key: str) -> _Shard:
+        return self._shards[hash((session_id, key)) % len(self._shards)]
+
+    def _track(self, session_id: str, key: str) -> None:
+        """Record a stored key; caller holds its shard lock."""
+        with self._keys_lock:
+            self._keys.setdefault(session_id, set()).add(key)
+
+    def _untrack(self, session_id: str, key: str) -> None:
+        """Forget a removed key; caller holds its shard lock."""
+        with self._keys_lock:
+            keys = self._keys.get(session_id)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._keys[session_id]
+
+    def _session_keys(self, session_id: str, prefix: str = "") -> List[str]:
+        """Keys of a session starting with ``prefix``, live or not."""
+        with self._keys_lock:
+            keys = self._keys.get(session_id, ())
+            return [key for key in keys if key.startswith(prefix)]
+
+    def _expires_at(self) -> Optional[float]:
+        if self.ttl_seconds is None:
+            return None
+        return time.time() + self.ttl_seconds
+
+    def write(self, session_id: str, key: str, value: Any) -> None:
+        """
+        Write a value to memory.
+
+        Args:
+            session_id: Session identifier
+            key: Memory key
+            value: JSON-serializable value to store
+        """
+        with self._tracer.start_as_current_span("InMemorySessionStore.write") as span:
+            span.set_attribute("session.id", session_id)
+            span.set_attribute("memory.key", key)
+
+            entry = (json.dumps(value), self._expires_at())
+            shard = self._shard(session_id, key)
+            with shard.lock:
+                shard.entries[(session_id, key)] = entry
+                self._track(session_id, key)
+                self._index.update(session_id, key, index_record(key, value))
+
+    def write_many(self, session_id: str, items: Dict[str, Any]) -> None:
+        """
+        Write several keys of one session atomically: the locks of every
+        shard involved are held (in shard order) while the entries change.
+
+        Args:
+            session_id: Session identifier
+            items: Mapping of memory key to value
+        """
+        with self._tracer.start_as_current_span(
+            "InMemorySessionStore.write_many"
+        ) as span:
+            span.set_attribute("session.id", session_id)
+            span.set_attribute("memory.count", len(items))
+
+            expires_at = self._expires_at()
+            self._put(
+                session_id,
+                {key: (value, expires_at) for key, value in items.items()},
+            )
+
+    def _put(
+        self, session_id: str, items: Dict[str, Tuple[Any, Optional[float]]]
+    ) -> None:
+        """Store ``key: (value, expires_at)`` items with every shard lock held."""
+        # Serialize everything first so a bad value writes nothing.
+        entries = [
+            (key, (json.dumps(value), expires_at), index_record(key, value))
+            for key, (value, expires_at) in items.items()
+        ]
+        slots = sorted({
+            hash((session_id, key)) % len(self._shards) for key in items
+        })
+        with contextlib.ExitStack() as stack:
+            for slot in slots:
+                stack.enter_context(self._shards[slot].lock)
+            for key, entry, record in entries:
+                self._shard(session_id, key).entries[(session_id, key)] = entry
+                self._track(session_id, key)
+                self._index.update(session_id, key, record)
+
+    def read(self, session_id: str, key: str) -> Optional[Any]:
+        """
+        Read a value from memory.
+
+        Args:
+            session_id: Session identifier
+            key: Memory key
+
+        Returns:
+            Stored value or None if not found or expired
+        """
+        with self._tracer.start_as_current_span("InMemorySessionStore.read") as span:
+            span.set_attribute("session.id", session_id)
+            span.set_attribute("memory.key", key)
+
+            shard = self._shard(session_id, key)
+            with shard.lock:
+                entry = shard.entries.get((session_id, key))
+                if entry is None:
+                    return None
+                serialized, expires_at = entry
+                if expires_at is not None and time.time() >= expires_at:
+                    del shard.entries[(session_id, key)]
+                    self._untrack(session_id, key)
+                    self._index.update(session_id, key, None)
+                    span.set_attribute("memory.expired", True)
+                    return None
+            return json.loads(serialized)
+
+    def _live_entry(self, shard: _Shard, session_id: str, key: str) -> Optional[_Entry]:
+        """Entry of a key, dropping it if expired; caller holds the lock."""
+        entry = shard.entries.get((session_id, key))
+        if entry is not None and entry[1] is not None and time.time() >= entry[1]:
+            del shard.entries[(session_id, key)]
+            self._untrack(session_id, key)
+            self._index.update(session_id, key, None)
+            return None
+        return entry
+
+    @staticmethod
+    def _version(entry: Optional[_Entry]) -> str:
+        if entry is None:
+            return MISSING_VERSION
+        return entry_version(f"{entry[1]!r}:{entry[0]}")
+
+    def read_versioned(self, session_id: str, key: str) -> Tuple[Optional[Any], str]:
+        """
+        Read a value with its version token (a digest of the stored entry).
+
+        Args:
+            session_id: Session identifier
+            key: Memory key
+
+        Returns:
+            The value (None if not found or expired) and its version token
+        """
+        with self._tracer.start_as_current_span(
+            "InMemorySessionStore.read_versioned"
+        ) as span:
+            span.set_attribute("session.id", session_id)
+            span.set_attribute("memory.key", key)
+
+            shard = self._shard(session_id, key)
+            with shard.lock:
+                entry = self._live_entry(shard, session_id, key)
+            if entry is None:
+                return None, MISSING_VERSION
+            return json.loads(entry[0]), self._version(entry)
+
+    def write_versioned(
+        self, session_id: str, key: str, value: Any, if_version: str
+    ) -> str:
+        """
+        Write a value if the key is still at ``if_version``, checked under
+        the key's shard lock.
+
+        Args:
+            session_id: Session identifier
+            key: Memory key
+            value: JSON-serializable value to store
+            if_version: Expected version token
+
+        Returns:
+            The new version token
+
+        Raises:
+            VersionConflictError: If the key is at another version
+        """
+        with self._tracer.start_as_current_span(
+            "InMemorySessionStore.write_versioned"
+        ) as span:
+            span.set_attribute("session.id", session_id)
+            span.set_attribute("memory.key", key)
+
+            entry = (json.dumps(value), self._expires_at())
+            shard = self._shard(session_id, key)
+            with shard.lock:
+                current = self._version(self._live_entry(shard, session_id, key))
+                if current != if_version:
+                    raise VersionConflictError(key, if_version, current)
+                shard.entries[(session_id, key)] = entry
+                self._track(session_id, key)
+                self._index.update(session_id, key, index_record(key, value))
+            return self._version(entry)
+
+    def patch(self, session_id: str, key: str, patch: MemoryPatch) -> Any:
+        """
+        Apply a partial update to a stored dict value under the key's shard
+        lock.
+
+        Args:
+            session_id: Session identifier
+            key: Memory key
+            patch: Fields to set and increment
+
+        Returns:
+            The patched value
+
+        Raises:
+            KeyError: If the key does not exist
+            TypeError: If the patch does not fit the stored value
+        """
+        with self._tracer.start_as_current_span("InMemorySessionStore.patch") as span:
+            span.set_attribute("session.id", session_id)
+            span.set_attribute("memory.key", key)
+
+            shard = self._shard(session_id, key)
+            with shard.lock:
+                entry = self._live_entry(shard, session_id, key)
+                if entry is None:
+                    raise KeyError(key)
+                value = patch.apply(json.loads(entry[0]))
+                shard.entries[(session_id, key)] = (
+                    json.dumps(value),
+                    self._expires_at(),
+                )
+                self._index.update(session_id, key, index_record(key, value))
+            return value
+
+    def read_session(self, session_id: str, prefix: str = "") -> Dict[str, Any]:
+        """
+        Read every key of a session starting with ``prefix``, visiting only
+        the session's keys, one shard lock at a time.
+
+        Args:
+            session_id: Session identifier
+            prefix: Key prefix (empty = all keys)
+
+        Returns:
+            Mapping of key to value of the live entries
+        """
+        with self._tracer.start_as_current_span(
+            "InMemorySessionStore.read_session"
+        ) as span:
+            span.set_attribute("session.id", session_id)
+
+            found: Dict[str, str] = {}
+            for key in self._session_keys(session_id, prefix):
+                shard = self._shard(session_id, key)
+                with shard.lock:
+                    entry = self._live_entry(shard, session_id, key)
+                if entry is not None:
+                    found[key] = entry[0]
+            span.set_attribute("memory.count", len(found))
+            return {key: json.loads(serialized) for key, serialized in found.items()}
+
+    def iter_sessions(self) -> Iterator[str]:
+        """
+        Stream the ids of sessions holding keys, sorted, from the
+        per-session key sets.
+
+        Yields:
+            Session ids in lexicographic order
+        """
+        with self._keys_lock:
+            sessions = sorted(self._keys)
+        yield from sessions
+
+    def read_entries(
+        self, session_id: str, keys: Sequence[str]
+    ) -> List[Optional[StoredEntry]]:
+        """
+        Read several values with their expiry times.
+
+        Args:
+            session_id: Session identifier
+            keys: Memory keys
+
+        Returns:
+            Entries aligned with ``keys`` (None if not found or expired);
+            the store records no write times
+        """
+        with self._tracer.start_as_current_span(
+            "InMemorySessionStore.read_entries"
+        ) as span:
+            span.set_attribute("session.id", session_id)
+            span.set_attribute("memory.count", len(keys))
+
+            entries: List[Optional[StoredEntry]] = []
+            for key in keys:
+                shard = self._shard(session_id, key)
+                with shard.lock:
+                    entry = self._live_entry(shard, session_id, key)
+                entries.append(
+                    None
+                    if entry is None
+                    else StoredEntry(json.loads(entry[0]), expires_at=entry[1])
+                )
+            return entries
+
+    def write_entries(self, session_id: str, entries: Dict[str, StoredEntry]) -> None:
+        """
+        Write several keys of one session atomically, each with its own
+        expiry time.
+
+        Args:
+            session_id: Session identifier
+            entries: Mapping of memory key to entry
+        """
+        with self._tracer.start_as_current_span(
+            "InMemorySessionStore.write_entries"
+        ) as span:
+            span.set_attribute("session.id", session_id)
+            span.set_attribute("memory.count", len(entries))
+
+            self._put(
+                session_id,
+                {
+                    key: (entry.value, entry.expires_at)
+                    for key, entry in entries.items()
+                },
+            )
+
+    def delete(self, session_id: str, key: str) -> bool:
+        """
+        Delete a key and its index entries under the key's shard lock.
+
+        Args:
+            session_id: Session identifier
+            key: Memory key
+
+        Returns:
+            Whether a live key was deleted
+        """
+        with self._tracer.start_as_current_span("InMemorySessionStore.delete") as span:
+            span.set_attribute("session.id", session_id)
+            span.set_attribute("memory.key", key)
+
+            shard = self._shard(session_id, key)
+            with shard.lock:
+                if self._live_entry(shard, session_id, key) is None:
+                    return False
+                del shard.entries[(session_id, key)]
+                self._untrack(session_id, key)
+                self._index.update(session_id, key, None)
+            return True
+
+    def delete_session(self, session_id: str) -> int:
+        """
+        Delete every key, index entry and log stream of a session, visiting
+        only the session's keys, one shard lock at a time.
+
+        Args:
+            session_id: Session identifier
+
+        Returns:
+            Number of live keys deleted
+        """
+        with self._tracer.start_as_current_span(
+            "InMemorySessionStore.delete_session"
+        ) as span:
+            span.set_attribute("session.id", session_id)
+
+            deleted = self._drop_keys(session_id, "")
+            with self._logs_lock:
+                for log_key in [k for k in self._logs if k[0] == session_id]:
+                    del self._logs[log_key]
+            span.set_attribute("deleted_count", deleted)
+            return deleted
+
+    def delete_prefix(self, session_id: str, prefix: str) -> int:
+        """
+        Delete every key of a session starting with ``prefix`` and its index
+        entries, visiting only the session's keys, one shard lock at a time.
+
+        Args:
+            session_id: Session identifier
+            prefix: Key prefix
+
+        Returns:
+            Number of live keys deleted
+        """
+        with self._tracer.start_as_current_span(
+            "InMemorySessionStore.delete_prefix"
+        ) as span:
+            span.set_attribute("session.id", session_id)
+
+            deleted = self._drop_keys(session_id, prefix)
+            span.set_attribute("deleted_count", deleted)
+            return deleted
+
+    def _drop_keys(self, session_id: str, prefix: str) -> int:
+        """Remove a session's keys starting with ``prefix``; counts live ones."""
+        now = time.time()
+        deleted = 0
+        for key in self._session_keys(session_id, prefix):
+            shard = self._shard(session_id, key)
+            with shard.lock:
+                entry = shard.entries.pop((session_id, key), None)
+                if entry is None:
+                    continue
+                self._untrack(session_id, key)
+                self._index.update(session_id, key, None)
+            if entry[1] is None or now < entry[1]:
+                deleted += 1
+        return deleted
+
+    def delete_log(self, session_id: str, stream: str) -> None:
+        """
+        Delete a log stream of a session.
+
+        Args:
+            session_id: Session identifier
+            stream: Stream name
+        """
+        with self._logs_lock:
+            self._logs.pop((session_id, stream), None)
+
+    def iter_streams(self, session_id: str) -> Iterator[str]:
+        """
+        Stream the names of the log streams of a session.
+
+        Args:
+            session_id: Session identifier
+
+        Yields:
+            Stream names in lexicographic order
+        """
+        with self._logs_lock:
+            streams = sorted(k[1] for k in self._logs if k[0] == session_id)
+        yield from streams
+
+    def iter_log_sessions(self) -> Iterator[str]:
+        """
+        Stream the ids of sessions holding log streams.
+
+        Yields:
+            Session ids in lexicographic order
+        """
+        with self._logs_lock:
+            sessions = sorted({session_id for session_id, _ in self._logs})
+        yield from sessions
+
+    def iter_keys(self, session_id: str, prefix: str = "") -> Iterator[str]:
+        """
+        Stream the live keys of a session starting with ``prefix``, in
+        lexicographic order. The session's keys are checked one shard lock
+        at a time before the first key is yielded.
+
+        Args:
+            session_id: Session identifier
+            prefix: Key prefix (empty = all keys)
+
+        Yields:
+            Keys in lexicographic order
+        """
+        keys: List[str] = []
+        for key in self._session_keys(session_id, prefix):
+            shard = self._shard(session_id, key)
+            with shard.lock:
+                if self._live_entry(shard, session_id, key) is not None:
+                    keys.append(key)
+        yield from sorted(keys)
+
+    def query(self, session_id: str, query: MemoryQuery) -> QueryPage:
+        """
+        List the memory models of a session matching ``query``.
+
+        Args:
+            session_id: Session identifier
+            query: Filter and pagination
+
+        Returns:
+            One page of matching memories, oldest first
+        """
+        with self._tracer.start_as_current_span("InMemorySessionStore.query") as span:
+            span.set_attribute("session.id", session_id)
+
+            records, cursor = self._index.query(session_id, query)
+            page = fetch_page(
+                records,
+                cursor,
+                lambda keys: [self.read(session_id, key) for key in keys],
+            )
+            span.set_attribute("query.results", len(page))
+            return page
+
+    def match_triples(self, session_id: str, pattern: TriplePattern) -> QueryPage:
+        """
+        List the SemanticMemory models of a session matching ``pattern``
+        using the in-process SPO/POS/OSP indexes.
+
+        Args:
+            session_id: Session identifier
+            pattern: Triple pattern and pagination
+
+        Returns:
+            One page of matching memories, highest truth_score first
+        """
+        with self._tracer.start_as_current_span(
+            "InMemorySessionStore.match_triples"
+        ) as span:
+            span.set_attribute("session.id", session_id)
+
+            records, cursor = self._index.match_triples(session_id, pattern)
+            page = fetch_page(
+                records,
+                cursor,
+                lambda keys: [self.read(session_id, key) for key in keys],
+            )
+            span.set_attribute("query.results", len(page))
+            return page
+
+    def rank(self, session_id: str, query: RankQuery) -> QueryPage:
+        """
+        List the top memory models of a session by importance or recency
+        from the in-process sorted rank lists.
+
+        Args:
+            session_id: Session identifier
+            query: Order, filters and pagination
+
+        Returns:
+            One page of memories, highest value first
+        """
+        with self._tracer.start_as_current_span("InMemorySessionStore.rank") as span:
+            span.set_attribute("session.id", session_id)
+
+            records, cursor = self._index.rank(session_id, query)
+            page = fetch_page(
+                records,
+                cursor,
+                lambda keys: [self.read(session_id, key) for key in keys],
+            )
+            span.set_attribute("query.results", len(page))
+            return page
+
+    def append(
+        self,
+        session_id: str,
+        stream: str,
+        values: Sequence[Any],
+        max_len: Optional[int] = None,
+    ) -> List[LogEntry]:
+        """
+        Append values to a log stream of the session.
+
+        Args:
+            session_id: Session identifier
+            stream: Stream name
+            values: JSON-serializable values to append, in order
+            max_len: Keep only the newest ``max_len`` entries (None = all)
+
+        Returns:
+            The appended entries
+        """
+        with self._tracer.start_as_current_span("InMemorySessionStore.append") as span:
+            span.set_attribute("session.id", session_id)
+            span.set_attribute("log.stream", stream)
+            span.set_attribute("memory.count", len(values))
+
+            serialized = [json.dumps(value) for value in values]
+            with self._logs_lock:
+                log = self._logs.setdefault((session_id, stream), EpisodeLog())
+                entries = log.append(serialized, time.time(), max_len)
+            return [
+                replace(entry, value=value)
+                for entry, value in zip(entries, values, strict=True)
+            ]
+
+    def read_log(self, session_id: str, query: LogQuery) -> LogPage:
+        """
+        Read one page of a log stream of the session.
+
+        Args:
+            session_id: Session identifier
+            query: Stream, time range, direction and pagination
+
+        Returns:
+            One page of entries, in read order
+        """
+        with self._tracer.start_as_current_span(
+            "InMemorySessionStore.read_log"
+        ) as span:
+            span.set_attribute("session.id", session_id)
+            span.set_attribute("log.stream", query.stream)
+
+            with self._logs_lock:
+                log = self._logs.get((session_id, query.stream))
+                entries, has_more = (
+                    log.read(query, self.ttl_seconds, time.time())
+                    if log is not None
+                    else ([], False)
+                )
+            entries = [
+                replace(entry, value=json.loads(entry.value)) for entry in entries
+            ]
+            span.set_attribute("query.results", len(entries))
+            return LogPage(entries, next_log_cursor(entries, has_more))
+
+    def cleanup_expired(self, session_id: Optional[str] = None) -> int:
+        """
+        Delete expired entries.
+
+        Args:
+            session_id: Only clean up this session (None = all sessions)
+
+        Returns:
+            Number of entries deleted
+        """
+        with self._tracer.start_as_current_span(
+            "InMemorySessionStore.cleanup_expired"
+        ) as span:
+            now = time.time()
+            deleted = 0
+            if session_id is not None:
+                for key in self._session_keys(session_id):
+                    shard = self._shard(session_id, key)
+                    with shard.lock:
+                        held = (session_id, key) in shard.entries
+                        if held and self._live_entry(shard, session_id, key) is None:
+                            deleted += 1
+            else:
+                for shard in self._shards:
+                    with shard.lock:
+                        expired = [
+                            entry_key
+                            for entry_key, (_, expires_at) in shard.entries.items()
+                            if expires_at is not None and now >= expires_at
+                        ]
+                        for entry_key in expired:
+                            del shard.entries[entry_key]
+                            self._untrack(*entry_key)
+                            self._index.update(*entry_key, None)
+                    deleted += len(expired)
+            if self.ttl_seconds is not None:
+                with self._logs_lock:
+                    for (log_session, _), log in self._logs.items():
+                        if session_id is None or log_session == session_id:
+                            deleted += log.expire(now - self.ttl_seconds)
+            span.set_attribute("deleted_count", deleted)
+            return deleted
+
+    def snapshot(self, path: Optional[str] = None) -> int:
+        """
+        Atomically write all live entries to disk.
+
+        Shards are copied one at a time, so the snapshot is consistent per
+        key but not across keys written concurrently.
+
+        Args:
+            path: Target file (defaults to ``config.snapshot_path``)
+
+        Returns:
+            Number of entries written
+        """
+        path = path or self.config.snapshot_path
+        if not path:
+            raise ValueError("No snapshot path configured")
+
+        with self._tracer.start_as_current_span(
+            "InMemorySessionStore.snapshot"
+        ) as span:
+            now = time.time()
+            entries: List[list] = []
+            for shard in self._shards:
+                with shard.lock:
+                    items = list(shard.entries.items())
+                entries.extend(
+                    [session_id, key, serialized, expires_at]
+                    for (session_id, key), (serialized, expires_at) in items
+                    if expires_at is None or expires_at > now
+                )
+
+            with self._logs_lock:
+                logs = [
+                    [session_id, stream, *log.dump()]
+                    for (session_id, stream), log in self._logs.items()
+                    if len(log)
+                ]
+
+            directory = os.path.dirname(os.path.abspath(path))
+            with self._snapshot_lock:
+                fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+                try:
+                    with os.fdopen(fd, "w", encoding="utf-8") as f:
+                        json.dump(
+                            {
+                                "version": SNAPSHOT_VERSION,
+                                "entries": entries,
+                                "logs": logs,
+                            },
+                            f,
+                        )
+                        f.flush()
+                        os.fsync(f.fileno())
+                    os.replace(tmp_path, path)
+                except BaseException:
+                    if os.path.exists(tmp_path):
+                        os.remove(tmp_path)
+                    raise
+
+            span.set_attribute("snapshot.entries", len(entries))
+            return len(entries)
+
+    def load_snapshot(self, path: str) -> int:
+        """
+        Load entries from a snapshot file, skipping those already expired,
+        and the log streams it holds.
+
+        Args:
+            path: Snapshot file written by ``snapshot()``
+
+        Returns:
+            Number of entries loaded
+        """
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("version") != SNAPSHOT_VERSION:
+            raise ValueError(f"Unsupported snapshot version: {data.get('version')}")
+
+        now = time.time()
+        loaded = 0
+        for session_id, key, serialized, expires_at in data["entries"]:
+            if expires_at is not None and expires_at <= now:
+                continue
+            shard = self._shard(session_id, key)
+            with shard.lock:
+                shard.entries[(session_id, key)] = (serialized, expires_at)
+                self._track(session_id, key)
+                self._index.update(
+                    session_id, key, index_record(key, json.loads(serialized))
+                )
+            loaded += 1
+        # Snapshots taken before log streams existed have no "logs"
+        with self._logs_lock:
+            for session_id, stream, *log in data.get("logs", ()):
+                self._logs[(session_id, stream)] = EpisodeLog.load(log)
+        return loaded
+
+    def _snapshot_loop(self) -> None:
+        while not self._stop.wait(self.config.snapshot_interval_seconds):
+            self.snapshot()
+
+    def close(self) -> None:
+        """Stop periodic snapshots and write a final snapshot if configured."""
+        self._stop.set()
+        if self._snapshot_thread is not None:
+            self._snapshot_thread.join()
+            self._snapshot_thread = None
+        if self.config.snapshot_path:
+            self.snapshot()
+
+    def __len__(self) -> int:
+        return sum(len(shard.entries) for shard in self._shards)
@@ -0,0 +1,832 @@
+"""
+Online migration between backends: dual writes, shadow reads compared
+against the new store, cutover, and a rate-limited backfill of existing data.
+"""
+import heapq
+import itertools
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, replace
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
+
+from agent_memory_hub.data_plane.adk_session_store import SessionStore, StoredEntry
+from agent_memory_hub.data_plane.patch import MemoryPatch
+from agent_memory_hub.indexing.episode_log import LogEntry, LogPage, LogQuery
+from agent_memory_hub.indexing.query import (
+    MAX_LIMIT,
+    MemoryQuery,
+    QueryPage,
+    RankQuery,
+    TriplePattern,
+)
+from agent_memory_hub.utils.telemetry import get_tracer
+
+# End of a log stream, when comparing two page by page
+_END = object()
+
+# Migration phases, in order
+DUAL_WRITE = "dual_write"
+SHADOW_READ = "shadow_read"
+CUTOVER = "cutover"
+PHASES = (DUAL_WRITE, SHADOW_READ, CUTOVER)
+
+# Latency samples kept per store for percentiles
+LATENCY_SAMPLES = 1024
+# Recent mismatches and secondary write failures kept for inspection
+RECENT_EVENTS = 100
+
+
+def _percentile(samples: Sequence[float], q: float) -> Optional[float]:
+    """Nearest-rank percentile of ``samples`` (None if empty)."""
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class MigrationMetrics:
+    """
+    Thread-safe counters of a migration: shadow reads and their mismatches,
+    read latencies of both stores, and writes the secondary store missed.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.shadow_reads = 0
+        self.mismatches = 0
+        self.shadow_errors = 0
+        self.shadow_dropped = 0
+        self.secondary_errors = 0
+        # (operation, session_id, key) of the latest mismatches
+        self.recent_mismatches: Deque[Tuple[str, str, str]] = deque(
+            maxlen=RECENT_EVENTS
+        )
+        # (operation, session_id, error) of the latest secondary failures
+        self.recent_failures: Deque[Tuple[str, str, str]] = deque(
+            maxlen=RECENT_EVENTS
+        )
+        self._latency: Dict[str, Deque[float]] = {
+            "source": deque(maxlen=LATENCY_SAMPLES),
+            "target": deque(maxlen=LATENCY_SAMPLES),
+        }
+
+    def record_latency(self, store: str, seconds: float) -> None:
+        with self._lock:
+            self._latency[store].append(seconds)
+
+    def record_shadow(
+        self, operation: str, session_id: str, key: str, matched: bool
+    ) -> None:
+        with self._lock:
+            self.shadow_reads += 1
+            if not matched:
+                self.mismatches += 1
+                self.recent_mismatches.append((operation, session_id, key))
+
+    def record_shadow_error(self) -> None:
+        with self._lock:
+            self.shadow_errors += 1
+
+    def record_dropped(self) -> None:
+        with self._lock:
+            self.shadow_dropped += 1
+
+    def record_failure(
+        self, operation: str, session_id: str, error: Exception
+    ) -> None:
+        with self._lock:
+            self.secondary_errors += 1
+            self.recent_failures.append((operation, session_id, repr(error)))
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Current values: counters, the mismatch rate, and p50/p95/p99 read
+        latencies of each store in milliseconds over the recent samples.
+        """
+        with self._lock:
+            latency = {name: list(samples) for name, samples in self._latency.items()}
+            result: Dict[str, Any] = {
+                "shadow_reads": self.shadow_reads,
+                "mismatches": self.mismatches,
+                "mismatch_rate": (
+                    self.mismatches / self.shadow_reads if self.shadow_reads else 0.0
+                ),
+                "shadow_errors": self.shadow_errors,
+                "shadow_dropped": self.shadow_dropped,
+                "secondary_errors": self.secondary_errors,
+                "recent_mismatches": list(self.recent_mismatches),
+                "recent_failures": list(self.recent_failures),
+            }
+        for name, samples in latency.items():
+            for q in (0.5, 0.95, 0.99):
+                value = _percentile(samples, q)
+                result[f"{name}_p{round(q * 100)}_ms"] = (
+                    None if value is None else value * 1000
+                )
+        return result
+
+
+class MigratingSessionStore(SessionStore):
+    """
+    Session store wrapper moving a live deployment from a ``source`` store
+    to a ``target`` store without downtime, in three phases:
+
+    - ``dual_write``: reads are served by the source; every write, delete
+      and log append goes to the source and then to the target.
+    - ``shadow_read``: as ``dual_write``, and a sample of key reads
+      (``read``, ``read_many``, ``read_session``) is repeated against the
+      target on background threads, off the request path, recording
+      mismatches and the latency of both stores in ``metrics``.
+    - ``cutover``: reads are served by the target, and writes go to the
+      target and then to the source, which stays current for a rollback.
+
+    The store serving reads is the primary; its errors propagate. Writes to
+    the other (secondary) store are best effort: a failure is counted in
+    ``metrics`` instead of failing the request, so the old backend keeps
+    its availability. Sessions whose mirrored write to the target failed
+    are remembered, and ``backfill()`` copies data written before the
+    migration started and resynchronizes those sessions.
+
+    Version tokens, query cursors and log entry ids are those of the
+    primary store; log appends are mirrored with the secondary's own ids.
+    """
+
+    def __init__(
+        self,
+        source: SessionStore,
+        target: SessionStore,
+        phase: str = DUAL_WRITE,
+        shadow_sample_rate: float = 1.0,
+        shadow_workers: int = 2,
+        max_pending_shadow: int = 1000,
+    ):
+        """
+        Initialize the migrating store.
+
+        Args:
+            source: Store being migrated from
+            target: Store being migrated to
+            phase: "dual_write", "shadow_read" or "cutover"
+            shadow_sample_rate: Fraction of reads shadowed in ``shadow_read``
+            shadow_workers: Background threads running shadow reads
+            max_pending_shadow: Shadow reads queued at most; further ones
+                are dropped (and counted) rather than queued without bound
+        """
+        if not 0.0 <= shadow_sample_rate <= 1.0:
+            raise ValueError("shadow_sample_rate must be between 0 and 1")
+        self.source = source
+        self.target = target
+        self.phase = DUAL_WRITE
+        self.set_phase(phase)
+        self.shadow_sample_rate = shadow_sample_rate
+        self.max_pending_shadow = max_pending_shadow
+        self.metrics = MigrationMetrics()
+        self.ttl_seconds = getattr(target, "ttl_seconds", None)
+        self._tracer = get_tracer()
+        self._shadow_pool = ThreadPoolExecutor(
+            max_workers=shadow_workers,
+            thread_name_prefix="MigratingSessionStore-shadow",
+        )
+        self._pending: Set[Future] = set()
+        self._pending_lock = threading.Lock()
+        self._unsynced: Set[str] = set()
+        self._unsynced_lock = threading.Lock()
+
+    def set_phase(self, phase: str) -> None:
+        """
+        Switch to another migration phase; takes effect for the next call.
+
+        Raises:
+            ValueError: If the phase is unknown
+        """
+        if phase not in PHASES:
+            raise ValueError(f"Unknown migration phase {phase!r}; use one of {PHASES}")
+        self.phase = phase
+
+    @property
+    def primary(self) -> SessionStore:
+        """Store serving reads in the current phase."""
+        return self.target if self.phase == CUTOVER else self.source
+
+    @property
+    def secondary(self) -> SessionStore:
+        """Store receiving mirrored writes in the current phase."""
+        return self.source if self.phase == CUTOVER else self.target
+
+    @property
+    def atomic_writes(self) -> bool:
+        return self.primary.atomic_writes
+
+    def _mirror(
+        self, operation: str, session_id: str, fn: Callable[[SessionStore], Any]
+    ) -> Any:
+        """Apply a write to the primary, then best effort to the secondary."""
+        secondary = self.secondary
+        result = fn(self.primary)
+        self._secondary(operation, session_id, fn, secondary)
+        return result
+
+    def _secondary(
+        self,
+        operation: str,
+        session_id: str,
+        fn: Callable[[SessionStore], Any],
+        store: Optional[SessionStore] = None,
+    ) -> None:
+        """
+        Apply a write to the secondary, counting rather than raising errors;
+        a session the target missed a write of is marked for the backfill.
+        """
+        store = self.secondary if store is None else store
+        try:
+            fn(store)
+        except Exception as exc:  # the secondary must not fail the request
+            self.metrics.record_failure(operation, session_id, exc)
+            if store is self.target:
+                self._mark_unsynced([session_id])
+
+    def _mark_unsynced(self, session_ids: Iterable[str]) -> None:
+        with self._unsynced_lock:
+            self._unsynced.update(session_ids)
+
+    def take_unsynced(self) -> List[str]:
+        """
+        Sessions whose mirrored write to the target failed since the last
+        call, sorted; the set is cleared.
+        """
+        with self._unsynced_lock:
+            sessions, self._unsynced = sorted(self._unsynced), set()
+        return sessions
+
+    def _read(
+        self,
+        operation: str,
+        session_id: str,
+        label: str,
+        fn: Callable[[SessionStore], Any],
+    ) -> Any:
+        """Read from the primary, shadowing the read on the target if sampled."""
+        if self.phase != SHADOW_READ:
+            return fn(self.primary)
+        start = time.perf_counter()
+        result = fn(self.source)
+        self.metrics.record_latency("source", time.perf_counter() - start)
+        sampled = random.random() < self.shadow_sample_rate  # noqa: S311  # nosec
+        if not sampled:
+            return result
+        with self._pending_lock:
+            if len(self._pending) >= self.max_pending_shadow:
+                self.metrics.record_dropped()
+                return result
+            future = self._shadow_pool.submit(
+                self._shadow, operation, session_id, label, fn, result
+            )
+            self._pending.add(future)
+        future.add_done_callback(self._done)
+        return result
+
+    def _done(self, future: Future) -> None:
+        with self._pending_lock:
+            self._pending.discard(future)
+
+    def _shadow(
+        self,
+        operation: str,
+        session_id: str,
+        label: str,
+        fn: Callable[[SessionStore], Any],
+        expected: Any,
+    ) -> None:
+        try:
+            start = time.perf_counter()
+            actual = fn(self.target)
+            self.metrics.record_latency("target", time.perf_counter() - start)
+        except Exception:  # a failing shadow read is a finding, not an error
+            self.metrics.record_shadow_error()
+            return
+        self.metrics.record_shadow(operation, session_id, label, actual == expected)
+
+    def drain(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait for the shadow reads queued so far to finish.
+
+        Returns:
+            Whether they all finished within ``timeout`` seconds
+        """
+        with self._pending_lock:
+            pending = list(self._pending)
+        return not wait(pending, timeout=timeout).not_done
+
+    def close(self) -> None:
+        """Finish the queued shadow reads and stop their threads."""
+        self._shadow_pool.shutdown(wait=True)
+
+    def backfill(
+        self,
+        rate_limit: Optional[float] = None,
+        batch_size: int = SessionStore.KEY_BATCH,
+    ) -> "MigrationBackfill":
+        """
+        A job copying the source's existing data into the target and
+        resynchronizing the sessions it missed writes of (see
+        ``MigrationBackfill``); call ``start()`` or ``run()`` on it.
+
+        Args:
+            rate_limit: Keys copied per second at most (None = unlimited)
+            batch_size: Keys read and written per backend call
+        """
+        return MigrationBackfill(self, rate_limit=rate_limit, batch_size=batch_size)
+
+    def write(self, session_id: str, key: str, value: Any) -> None:
+        with self._tracer.start_as_current_span("MigratingSessionStore.write") as span:
+            span.set_attribute("session.id", session_id)
+            span.set_attribute("memory.key", key)
+            span.set_attribute("migration.phase", self.phase)
+
+            self._mirror("write", session_id, lambda s: s.write(session_id, key, value))
+
+    def write_many(self, session_id: str, items: Dict[str, Any]) -> None:
+        with self._tracer.start_as_current_span(
+            "MigratingSessionStore.write_many"
+        ) as span:
+            span.set_attribute("session.id", session_id)
+            span.set_attribute("memory.count", len(items))
+            span.set_attribute("migration.phase", self.phase)
+
+            self._mirror(
+                "write_many", session_id, lambda s: s.write_many(session_id, items)
+            )
+
+    def write_atomic(self, session_id: str, items: Dict[str, Any]) -> None:
+        """
+        Write several keys all-or-nothing on the primary, then mirror them
+        with one ``write_many`` on the secondary.
+        """
+        with self._tracer.start_as_current_span(
+            "MigratingSessionStore.write_atomic"
+        ) as span:
+            span.set_attribute("session.id", session_id)
+            span.set_attribute("memory.count", len(items))
+
+            self.primary.write_atomic(session_id, items)
+            self._secondary(
+                "write_atomic", session_id, lambda s: s.write_many(session_id, items)
+            )
+
+    def read(self, session_id: str, key: str) -> Optional[Any]:
+        with self._tracer.start_as_current_span("MigratingSessionStore.read") as span:
+            span.set_attribute("session.id", session_id)
+            span.set_attribute("memory.key", key)
+            span.set_attribute("migration.phase", self.phase)
+
+            return self._read(
+                "read", session_id, key, lambda s: s.read(session_id, key)
+            )
+
+    def read_many(self, session_id: str, keys: Sequence[str]) -> List[Optional[Any]]:
+        with self._tracer.start_as_current_span(
+            "MigratingSessionStore.read_many"
+        ) as span:
+            span.set_attribute("session.id", session_id)
+            span.set_attribute("memory.count", len(keys))
+            span.set_attribute("migration.phase", self.phase)
+
+            keys = list(keys)
+            return self._read(
+                "read_many", session_id, ",".join(keys),
+                lambda s: s.read_many(session_id, keys),
+            )
+
+    def read_session(self, session_id: str, prefix: str = "") -> Dict[str, Any]:
+        with self._tracer.start_as_current_span(
+            "MigratingSessionStore.read_session"
+        ) as span:
+            span.set_attribute("session.id", session_id)
+            span.set_attribute("migration.phase", self.phase)
+
+            return self._read(
+                "read_session", session_id, prefix,
+                lambda s: s.read_session(session_id, prefix),
+            )
+
+    def read_versioned(self, session_id: str, key: str) -> Tuple[Optional[Any], str]:
+        """Read a value with the primary store's version token."""
+        return self.primary.read_versioned(session_id, key)
+
+    def write_versioned(
+        self, session_id: str, key: str, value: Any, if_version: str
+    ) -> str:
+        """
+        Compare-and-set on the primary; a successful write is mirrored to
+        the secondary as a plain write.
+        """
+        version = self.primary.write_versioned(session_id, key, value, if_version)
+        self._secondary(
+            "write_versioned", session_id, lambda s: s.write(session_id, key, value)
+        )
+        return version
+
+    def patch(self, session_id: str, key: str, patch: MemoryPatch) -> Any:
+        """Patch on the primary and mirror the resulting value."""
+        value = self.primary.patch(session_id, key, patch)
+        self._secondary("patch", session_id, lambda s: s.write(session_id, key, value))
+        return value
+
+    def delete(self, session_id: str, key: str) -> bool:
+        with self._tracer.start_as_current_span("MigratingSessionStore.delete") as span:
+            span.set_attribute("session.id", session_id)
+            span.set_attribute("memory.key", key)
+
+            return self._mirror(
+                "delete", session_id, lambda s: s.delete(session_id, key)
+            )
+
+    def delete_session(self, session_id: str) -> int:
+        with self._tracer.start_as_current_span(
+            "MigratingSessionStore.delete_session"
+        ) as span:
+            span.set_attribute("session.id", session_id)
+
+            return self._mirror(
+                "delete_session", session_id, lambda s: s.delete_session(session_id)
+            )
+
+    def delete_prefix(self, session_id: str, prefix: str) -> int:
+        with self._tracer.start_as_current_span(
+            "MigratingSessionStore.delete_prefix"
+        ) as span:
+            span.set_attribute("session.id", session_id)
+
+            return self._mirror(
+                "delete_prefix", session_id,
+                lambda s: s.delete_prefix(session_id, prefix),
+            )
+
+    def delete_log(self, session_id: str, stream: str) -> None:
+        self._mirror(
+            "delete_log", session_id, lambda s: s.delete_log(session_id, stream)
+        )
+
+    def iter_keys(self, session_id: str, prefix: str = "") -> Iterator[str]:
+        return self.primary.iter_keys(session_id, prefix)
+
+    def iter_sessions(self) -> Iterator[str]:
+        return self.primary.iter_sessions()
+
+    def iter_streams(self, session_id: str) -> Iterator[str]:
+        return self.primary.iter_streams(session_id)
+
+    def iter_log_sessions(self) -> Iterator[str]:
+        return self.primary.iter_log_sessions()
+
+    def read_entries(
+        self, session_id: str, keys: Sequence[str]
+    ) -> List[Optional[StoredEntry]]:
+        return self.primary.read_entries(session_id, keys)
+
+    def write_entries(self, session_id: str, entries: Dict[str, StoredEntry]) -> None:
+        self._mirror(
+            "write_entries", session_id, lambda s: s.write_entries(session_id, entries)
+        )
+
+    def query(self, session_id: str, query: MemoryQuery) -> QueryPage:
+        return self.primary.query(session_id, query)
+
+    def match_triples(self, session_id: str, pattern: TriplePattern) -> QueryPage:
+        return self.primary.match_triples(session_id, pattern)
+
+    def rank(self, session_id: str, query: RankQuery) -> QueryPage:
+        return self.primary.rank(session_id, query)
+
+    def append(
+        self,
+        session_id: str,
+        stream: str,
+        values: Sequence[Any],
+        max_len: Optional[int] = None,
+    ) -> List[LogEntry]:
+        with self._tracer.start_as_current_span("MigratingSessionStore.append") as span:
+            span.set_attribute("session.id", session_id)
+            span.set_attribute("log.stream", stream)
+
+            return self._mirror(
+                "append", session_id,
+                lambda s: s.append(session_id, stream, values, max_len),
+            )
+
+    def read_log(self, session_id: str, query: LogQuery) -> LogPage:
+        return self.primary.read_log(session_id, query)
+
+    def cleanup_expired(self, session_id: Optional[str] = None) -> int:
+        """
+        Cleanup expired entries in both stores.
+
+        Returns:
+            Number of entries deleted from the primary
+        """
+        count = 0
+        for store in (self.secondary, self.primary):
+            cleanup = getattr(store, "cleanup_expired", None)
+            if cleanup is not None:
+                count = cleanup(session_id)
+        return count
+
+
+@dataclass
+class BackfillProgress:
+    """
+    Progress of a ``MigrationBackfill``.
+
+    Attributes:
+        sessions: Sessions completed
+        scanned: Source keys examined
+        copied: Keys written to the target: missing there, or holding
+            another value after a failed mirrored write
+        skipped: Keys the target already held with the source's value
+            (dual-written or copied by an earlier run)
+        repaired: Copied keys changed or deleted on the source meanwhile,
+            re-copied or deleted again, and keys or log streams a failed
+            mirrored delete left on the target
+        log_entries: Episode log entries copied to the target. They get
+            the target's ids and append times, so ``since``/``until``
+            reads after cutover see them at the time they were copied
+        done: Whether every session was copied
+        error: What stopped the job early, if anything
+    """
+    sessions: int = 0
+    scanned: int = 0
+    copied: int = 0
+    skipped: int = 0
+    repaired: int = 0
+    log_entries: int = 0
+    done: bool = False
+    error: Optional[BaseException] = None
+
+
+class MigrationBackfill:
+    """
+    Copies the source store's existing entries into the target, session by
+    session in batches, with each entry's TTL envelope
+    (``read_entries``/``write_entries``).
+
+    Keys the target already holds with the source's value are skipped;
+    any other key is copied, since the source serves reads until cutover
+    and a target value that differs comes from a mirrored write that
+    failed. Copied keys are read from the source again after the write,
+    and re-copied (or deleted) if a concurrent write or delete changed
+    them in between.
+
+    Each episode log stream (``iter_log_sessions``/``iter_streams``, so
+    sessions holding only logs as well) is compared with the target's.
+    Logs are append-only, so a stream that differs, typically one holding
+    only the entries appended since dual writes began, is deleted on the
+    target and appended again from the source, oldest first, a
+    ``MAX_LIMIT`` page at a time. The copies get the target's ids and
+    append times, so after cutover time range reads (``since``/``until``)
+    place them at the time they were copied. The copy is compared again,
+    and rebuilt while concurrent appends keep it from matching.
+
+    Last, the sessions whose mirrored writes failed
+    (``MigratingSessionStore.take_unsynced``) are compared in full, which
+    also removes keys and streams a failed mirrored delete left on the
+    target. The job is idempotent, so rerunning it after an interruption,
+    or after further mirrored writes failed, only copies what still
+    differs.
+
+    ``rate_limit`` caps the keys and log entries examined per second,
+    spreading the load on both stores; ``start()`` runs the job on a
+    background thread.
+    """
+
+    def __init__(
+        self,
+        store: MigratingSessionStore,
+        rate_limit: Optional[float] = None,
+        batch_size: int = SessionStore.KEY_BATCH,
+    ):
+        if rate_limit is not None and rate_limit <= 0:
+            raise ValueError("rate_limit must be positive")
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        self.store = store
+        self.rate_limit = rate_limit
+        self.batch_size = batch_size
+        self.progress = BackfillProgress()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._next_at = 0.0
+        self._tracer = get_tracer()
+
+    def start(self) -> "MigrationBackfill":
+        """Run the job on a daemon thread."""
+        self._thread = threading.Thread(
+            target=self._run_quietly, name="MigrationBackfill", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Ask the job to stop after the current batch."""
+        self._stop.set()
+
+    def join(self, timeout: Optional[float] = None) -> BackfillProgress:
+        """Wait for a started job and return its progress."""
+        if self._thread is not None:
+            self._thread.join(timeout)
+        return self.progress
+
+    def _run_quietly(self) -> None:
+        try:
+            self.run()
+        except Exception as exc:  # kept in progress.error for the caller
+            self.progress.error = exc
+
+    def run(self) -> BackfillProgress:
+        """
+        Copy every session of the source, blocking until done or stopped.
+
+        Returns:
+            The job's progress
+        """
+        with self._tracer.start_as_current_span("MigrationBackfill.run") as span:
+            source, target = self.store.source, self.store.target
+            listings = heapq.merge(source.iter_sessions(), source.iter_log_sessions())
+            for session_id, _ in itertools.groupby(listings):
+                if not (
+                    self._batches(session_id, source, self._copy)
+                    and self._copy_logs(session_id)
+                ):
+                    return self.progress
+                self.progress.sessions += 1
+            unsynced = self.store.take_unsynced()
+            for i, session_id in enumerate(unsynced):
+                if not (
+                    self._batches(session_id, target, self._prune)
+                    and self._batches(session_id, source, self._copy)
+                    and self._copy_logs(session_id, prune=True)
+                ):
+                    self.store._mark_unsynced(unsynced[i:])
+                    return self.progress
+            self.progress.done = True
+            span.set_attribute("memory.count", self.progress.copied)
+            return self.progress
+
+    def _batches(
+        self,
+        session_id: str,
+        store: SessionStore,
+        fn: Callable[[str, List[str]], None],
+    ) -> bool:
+        """Apply ``fn`` to batches of a session's keys in ``store``."""
+        keys = iter(store.iter_keys(session_id))
+        while True:
+            batch = list(itertools.islice(keys, self.batch_size))
+            if not batch:
+                return True
+            if not self._throttle(len(batch)):
+                return False
+            fn(session_id, batch)
+
+    def _throttle(self, count: int) -> bool:
+        """Wait until ``count`` more keys fit the rate; False if stopped."""
+        if self._stop.is_set():
+            return False
+        if self.rate_limit is None:
+            return True
+        now = time.monotonic()
+        start = max(self._next_at, now)
+        self._next_at = start + count / self.rate_limit
+        return not self._stop.wait(start - now) if start > now else True
+
+    def _copy(self, session_id: str, keys: List[str]) -> None:
+        source, target = self.store.source, self.store.target
+        entries = source.read_entries(session_id, keys)
+        existing = target.read_entries(session_id, keys)
+        missing = {
+            key: entry
+            for key, entry, held in zip(keys, entries, existing, strict=True)
+            if entry is not None and (held is None or held.value != entry.value)
+        }
+        self.progress.scanned += len(keys)
+        self.progress.skipped += sum(
+            entry is not None and key not in missing
+            for key, entry in zip(keys, entries, strict=True)
+        )
+        if not missing:
+            return
+        target.write_entries(session_id, missing)
+        self.progress.copied += len(missing)
+
+        # A write or delete may have reached both stores between the two
+        # reads above and the copy; re-read and repair those keys
+        fresh = source.read_entries(session_id, list(missing))
+        for key, entry in zip(list(missing), fresh, strict=True):
+            if entry is None:
+                target.delete(session_id, key)
+                self.progress.repaired += 1
+            elif entry.value != missing[key].value:
+                target.write_entries(session_id, {key: entry})
+                self.progress.repaired += 1
+
+    def _prune(self, session_id: str, keys: List[str]) -> None:
+        """Delete target keys the source no longer holds."""
+        source, target = self.store.source, self.store.target
+        stale = [
+            key
+            for key, entry in zip(
+                keys, source.read_entries(session_id, keys), strict=True
+            )
+            if entry is None
+        ]
+        for key in stale:
+            target.delete(session_id, key)
+        self.progress.repaired += len(stale)
+
+        # A write may have reached both stores before the deletes above
+        fresh = source.read_entries(session_id, stale)
+        restored = {
+            key: entry
+            for key, entry in zip(stale, fresh, strict=True)
+            if entry is not None
+        }
+        if restored:
+            target.write_entries(session_id, restored)
+
+    def _copy_logs(self, session_id: str, prune: bool = False) -> bool:
+        """
+        Make the target's log streams of a session match the source's, one
+        ``MAX_LIMIT`` page at a time; ``prune`` also deletes target streams
+        the source lacks. False if the job was stopped.
+
+        Raises:
+            RuntimeError: If concurrent appends keep a stream from matching
+        """
+        source, target = self.store.source, self.store.target
+        streams = list(source.iter_streams(session_id))
+        if prune:
+            for stream in set(target.iter_streams(session_id)) - set(streams):
+                target.delete_log(session_id, stream)
+                self.progress.repaired += 1
+        for stream in streams:
+            for _ in range(SessionStore.PATCH_ATTEMPTS):
+                matched = self._log_matches(session_id, stream)
+                if matched is None:
+                    return False
+                if matched:
+                    break
+                target.delete_log(session_id, stream)
+                for values in self._log_pages(source, session_id, stream):
+                    if not self._throttle(len(values)):
+                        return False
+                    target.append(session_id, stream, values)
+                    self.progress.log_entries += len(values)
+            else:
+                raise RuntimeError(
+                    f"Could not copy log stream {stream!r} of session "
+                    f"{session_id!r}: too much contention"
+                )
+        return True
+
+    def _log_matches(self, session_id: str, stream: str) -> Optional[bool]:
+        """
+        Whether the target's stream holds the source's values in order,
+        compared page by page; None if the job was stopped.
+        """
+        held = itertools.chain.from_iterable(
+            self._log_pages(self.store.target, session_id, stream)
+        )
+        for values in self._log_pages(self.store.source, session_id, stream):
+            if not self._throttle(len(values)):
+                return None
+            if list(itertools.islice(held, len(values))) != values:
+                return False
+        return next(held, _END) is _END
+
+    @staticmethod
+    def _log_pages(
+        store: SessionStore, session_id: str, stream: str
+    ) -> Iterator[List[Any]]:
+        """The values of a stream, oldest first, one page at a time."""
+        query = LogQuery(stream=stream, limit=MAX_LIMIT)
+        while True:
+            page = store.read_log(session_id, query)
+            if page.entries:
+                yield [entry.value for entry in page.entries]
+            if page.next_cursor is None:
+                return
+            query = replace(query, cursor=page.next_cursor)
@@ -0,0 +1,84 @@
+"""
+Partial updates of stored values: field sets and numeric increments
+applied by the store, so counters and single attributes change without
+the caller rewriting the whole value.
+"""
+import copy
+from dataclasses import dataclass, field
+from typing import Any, Dict, Tuple, Union
+
+Number = Union[int, float]
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _split(path: str) -> Tuple[str, ...]:
+    parts = tuple(path.split("."))
+    if not all(parts):
+        raise ValueError(f"Invalid field path: {path!r}")
+    return parts
+
+
+@dataclass(frozen=True)
+class MemoryPatch:
+    """
+    Changes to fields of a stored dict value. Field paths are dotted
+    (``"attributes.plan"``); missing intermediate dicts are created.
+
+    Attributes:
+        set: Field path to new value
+        increment: Field path to the number added to it (a missing field
+            counts as 0)
+    """
+    set: Dict[str, Any] = field(default_factory=dict)
+    increment: Dict[str, Number] = field(default_factory=dict)
+
+    def __post_init__(self):
+        if not self.set and not self.increment:
+            raise ValueError("A patch needs at least one field to set or increment")
+        paths = [_split(path) for path in (*self.set, *self.increment)]
+        for i, path in enumerate(paths):
+            for other in paths[i + 1:]:
+                shorter = min(len(path), len(other))
+                if path[:shorter] == other[:shorter]:
+                    raise ValueError(
+                        f"Overlapping field paths: {'.'.join(path)!r} and "
+                        f"{'.'.join(other)!r}"
+                    )
+        for path, delta in self.increment.items():
+            if not _is_number(delta):
+                raise TypeError(f"Increment of {path!r} is not a number: {delta!r}")
+
+    def apply(self, value: Any) -> Any:
+        """
+        Return a patched copy of ``value``.
+
+        Raises:
+            TypeError: If ``value`` (or a field on a path) is not a dict, or
+                an incremented field is not a number
+        """
+        if not isinstance(value, dict):
+            raise TypeError(f"Only dict values can be patched, not {type(value)}")
+        patched = copy.deepcopy(value)
+        for path, new in self.set.items():
+            parent, name = _parent(patched, path)
+            parent[name] = copy.deepcopy(new)
+        for path, delta in self.increment.items():
+            parent, name = _parent(patched, path)
+            current = parent.get(name, 0)
+            if not _is_number(current):
+                raise TypeError(f"Field {path!r} is not a number: {current!r}")
+            parent[name] = current + delta
+        return patched
+
+
+def _parent(value: Dict[str, Any], path: str) -> Tuple[Dict[str, Any], str]:
+    """Dict holding the last field of ``path``, creating missing levels."""
+    *parents, name = _split(path)
+    for part in parents:
+        value = value.setdefault(part, {})
+        if not isinstance(value, dict):
+            raise TypeError(f"Field {part!r} on path {path!r} is not a dict")
+    return value, name
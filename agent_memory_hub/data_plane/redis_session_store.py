@@ -1,30 +1,97 @@
 """
 Redis session store implementation.
 """
+import itertools
 import json
-from typing import Any, Optional
+import math
+import time
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
 
 try:
     import redis
+    from redis.exceptions import WatchError
     REDIS_AVAILABLE = True
 except ImportError:
     REDIS_AVAILABLE = False
 
+    class WatchError(Exception):
+        """Stand-in for redis.exceptions.WatchError (raised by the emulator)."""
+
 from agent_memory_hub.config.redis_config import RedisConfig
-from agent_memory_hub.data_plane.adk_session_store import SessionStore
+from agent_memory_hub.data_plane.adk_session_store import (
+    MISSING_VERSION,
+    SessionStore,
+    StoredEntry,
+    VersionConflictError,
+    entry_version,
+)
+from agent_memory_hub.indexing.episode_log import (
+    LogEntry,
+    LogPage,
+    LogQuery,
+    next_log_cursor,
+)
+from agent_memory_hub.indexing.query import (
+    RANK_ORDERS,
+    IndexRecord,
+    MemoryQuery,
+    QueryPage,
+    RankQuery,
+    TriplePattern,
+    fetch_page,
+    index_record,
+    next_cursor,
+    next_rank_cursor,
+    next_triple_cursor,
+    paginate,
+    rank_order,
+    rank_value,
+)
 from agent_memory_hub.utils.telemetry import get_tracer
 from agent_memory_hub.utils.ttl_manager import get_current_timestamp
 
+# Candidates fetched per ZRANGEBYSCORE round trip while filtering a query
+_QUERY_BATCH = 256
+
 
 class RedisSessionStore(SessionStore):
     """
     Redis-based session store for low-latency memory.
+
+    Every key of a session is a member of ``idx:{session}:keys`` (SET), so
+    ``read_session`` fetches the whole session with one SORT ... GET.
+    Memory models are indexed per session in:
+        idx:{session}:records         HASH key -> indexed attributes (JSON)
+        idx:{session}:all             ZSET key scored by created_at
+        idx:{session}:type:{type}     ZSET key scored by created_at
+        idx:{session}:scope:{scope}   ZSET key scored by created_at
+        idx:{session}:tag:{tag}       SET of keys
+        idx:{session}:triple:{terms}  ZSET key scored by -truth_score
+        idx:{session}:rank:{by}:all   ZSET key scored by -importance or
+                                      -recency (``by``), plus the same per
+                                      ``type:{type}`` and ``scope:{scope}``
+
+    A semantic triple joins eight triple ZSETs, one per combination of bound
+    terms (``terms`` is the JSON list ``[subject, predicate, object]`` with
+    null wildcards), so every pattern is answered by one ordered ZSET.
+    The records hash is authoritative; set memberships left behind by
+    concurrent writers or expired values are filtered out (and pruned) at
+    query time. With a TTL the index keys expire with the newest entry.
+
+    Log streams are Redis Streams, ``log:{session}:{stream}``, whose
+    millisecond entry ids double as append times, so time ranges and
+    cursors are XRANGE/XREVRANGE bounds and ``max_len`` is XADD MAXLEN.
+    Their names are kept in ``idx:{session}:streams`` (SET) so
+    ``delete_session`` finds them without a keyspace SCAN.
     """
 
+    atomic_writes = True
+
     def __init__(
         self,
         config: RedisConfig,
         ttl_seconds: Optional[int] = None,
+        client: Optional[Any] = None,
     ):
         """
         Initialize Redis session store.
@@ -32,11 +99,13 @@ class RedisSessionStore(SessionStore):
         Args:
             config: Redis connection configuration
             ttl_seconds: Default TTL for entries (None = no expiry)
+            client: Pre-built Redis client (e.g. an emulator); created from
+                    ``config`` if omitted
         
         Raises:
             ImportError: If redis is not installed
         """
-        if not REDIS_AVAILABLE:
+        if client is None and not REDIS_AVAILABLE:
             raise ImportError(
                 "redis is required for Redis backend. "
                 "Install with: pip install redis"
@@ -46,6 +115,10 @@ class RedisSessionStore(SessionStore):
         self.ttl_seconds = ttl_seconds
         self._tracer = get_tracer()
 
+        if client is not None:
+            self._client = client
+            return
+
         self._client = redis.Redis(
             host=config.host,
             port=config.port,
@@ -58,6 +131,138 @@ class RedisSessionStore(SessionStore):
     def _get_redis_key(self, session_id: str, key: str) -> str:
         return f"session:{session_id}:{key}"
 
+    @staticmethod
+    def _index_key(session_id: str, *parts: str) -> str:
+        return ":".join(("idx", session_id, *parts))
+
+    def _index_members(self, session_id: str, record: IndexRecord):
+        """ZSET and SET keys a record belongs to."""
+        zsets = [
+            self._index_key(session_id, "all"),
+            self._index_key(session_id, "type", record.memory_type),
+        ]
+        if record.scope is not None:
+            zsets.append(self._index_key(session_id, "scope", record.scope))
+        tag_sets = [self._index_key(session_id, "tag", t) for t in record.tags]
+        return zsets, tag_sets
+
+    def _triple_zsets(self, session_id: str, record: IndexRecord) -> List[str]:
+        """Triple ZSET keys of a record, one per pattern it matches."""
+        if not record.is_triple:
+            return []
+        return [
+            self._triple_zset(session_id, TriplePattern(*terms))
+            for terms in itertools.product(
+                (record.subject, None), (record.predicate, None), (record.object, None)
+            )
+        ]
+
+    def _triple_zset(self, session_id: str, pattern: TriplePattern) -> str:
+        terms = [pattern.subject, pattern.predicate, pattern.object]
+        return self._index_key(session_id, "triple", json.dumps(terms))
+
+    def _rank_zsets(self, session_id: str, record: IndexRecord) -> Dict[str, float]:
+        """Ranked ZSET keys of a record and its score in each."""
+        zsets = {}
+        for by in RANK_ORDERS:
+            if rank_value(record, by) is None:
+                continue
+            score = rank_order(record, by)[0]
+            zsets[self._index_key(session_id, "rank", by, "all")] = score
+            zsets[
+                self._index_key(session_id, "rank", by, "type", record.memory_type)
+            ] = score
+            if record.scope is not None:
+                zsets[
+                    self._index_key(session_id, "rank", by, "scope", record.scope)
+                ] = score
+        return zsets
+
+    def _write_indexed(
+        self, session_id: str, key: str, serialized: str, record: IndexRecord
+    ) -> None:
+        previous = self._client.hget(self._index_key(session_id, "records"), key)
+        pipe = self._client.pipeline(transaction=True)
+        self._queue_set(pipe, session_id, key, serialized)
+        touched = self._queue_index(pipe, session_id, key, record, previous)
+        self._queue_expire(pipe, touched)
+        pipe.execute()
+
+    def _queue_set(self, pipe, session_id: str, key: str, serialized: str) -> None:
+        redis_key = self._get_redis_key(session_id, key)
+        if self.ttl_seconds:
+            pipe.setex(redis_key, self.ttl_seconds, serialized)
+        else:
+            pipe.set(redis_key, serialized)
+
+    def _queue_index(
+        self,
+        pipe,
+        session_id: str,
+        key: str,
+        record: IndexRecord,
+        previous: Optional[str],
+    ) -> List[str]:
+        """
+        Queue the index updates of a model record replacing ``previous``
+        (its stored record, if any) and return the index keys it touches.
+        """
+        records_key = self._index_key(session_id, "records")
+        if previous is not None:
+            self._queue_unindex(pipe, session_id, key, previous)
+
+        zsets, tag_sets = self._index_members(session_id, record)
+        triple_zsets = self._triple_zsets(session_id, record)
+        rank_zsets = self._rank_zsets(session_id, record)
+        pipe.sadd(self._index_key(session_id, "keys"), key)
+        pipe.hset(records_key, key, json.dumps(record.to_dict()))
+        for name in zsets:
+            pipe.zadd(name, {key: record.created_ts})
+        for name in tag_sets:
+            pipe.sadd(name, key)
+        for name in triple_zsets:
+            pipe.zadd(name, {key: -record.truth_score})
+        for name, score in rank_zsets.items():
+            pipe.zadd(name, {key: score})
+        return [
+            self._index_key(session_id, "keys"),
+            records_key,
+            *zsets,
+            *tag_sets,
+            *triple_zsets,
+            *rank_zsets,
+        ]
+
+    def _record_index_keys(self, session_id: str, record: IndexRecord) -> List[str]:
+        """Every ZSET and SET key a record is a member of."""
+        zsets, tag_sets = self._index_members(session_id, record)
+        return [
+            *zsets,
+            *tag_sets,
+            *self._triple_zsets(session_id, record),
+            *self._rank_zsets(session_id, record),
+        ]
+
+    def _queue_unindex(
+        self, pipe, session_id: str, key: str, previous: str
+    ) -> None:
+        """Queue removing a key from the index sets of its stored record."""
+        old_record = IndexRecord.from_dict(key, json.loads(previous))
+        zsets, tag_sets = self._index_members(session_id, old_record)
+        for name in [
+            *zsets,
+            *self._triple_zsets(session_id, old_record),
+            *self._rank_zsets(session_id, old_record),
+        ]:
+            pipe.zrem(name, key)
+        for name in tag_sets:
+            pipe.srem(name, key)
+
+    def _queue_expire(self, pipe, names: Sequence[str]) -> None:
+        if self.ttl_seconds:
+            for name in dict.fromkeys(names):
+                pipe.expire(name, self.ttl_seconds)
+
     def write(self, session_id: str, key: str, value: Any) -> None:
         """
         Write a value to Redis.
@@ -82,12 +287,109 @@ class RedisSessionStore(SessionStore):
             
             # Serialize
             serialized = json.dumps(data)
+
+            record = index_record(key, value)
+            if record is not None:
+                self._write_indexed(session_id, key, serialized, record)
+                return
             
             # Set in Redis with TTL if configured
             if self.ttl_seconds:
                 self._client.setex(redis_key, self.ttl_seconds, serialized)
             else:
                 self._client.set(redis_key, serialized)
+            # Session key set read by read_session
+            keys_key = self._index_key(session_id, "keys")
+            pipe = self._client.pipeline(transaction=False)
+            pipe.sadd(keys_key, key)
+            if self.ttl_seconds:
+                pipe.expire(keys_key, self.ttl_seconds)
+            pipe.execute()
+
+    def write_many(self, session_id: str, items: Dict[str, Any]) -> None:
+        """
+        Write several keys of one session in two round trips: an HMGET of
+        the previous index records of memory models, then one MULTI/EXEC
+        pipeline setting every value and updating the indexes.
+
+        Args:
+            session_id: Session identifier
+            items: Mapping of memory key to value
+        """
+        with self._tracer.start_as_current_span("RedisSessionStore.write_many") as span:
+            span.set_attribute("session.id", session_id)
+            span.set_attribute("memory.count", len(items))
+            if not items:
+                return
+
+            created_at = get_current_timestamp().isoformat()
+            serialized = {
+                key: json.dumps({
+                    "value": value,
+                    "created_at": created_at,
+                    "ttl_seconds": self.ttl_seconds,
+                })
+                for key, value in items.items()
+            }
+            self._put(session_id, items, serialized)
+
+    def _put(
+        self,
+        session_id: str,
+        items: Dict[str, Any],
+        serialized: Dict[str, str],
+        ttls: Optional[Dict[str, int]] = None,
+    ) -> None:
+        """
+        HMGET the previous index records of the memory models among
+        ``items``, then set every serialized value and update the indexes
+        in one MULTI/EXEC pipeline. With ``ttls`` each key expires after
+        its own seconds (never if absent) instead of the store's TTL, and
+        the session's index keys live as long as its longest-lived entry:
+        they expire only if every entry does.
+        """
+        records = {key: index_record(key, value) for key, value in items.items()}
+        models = [key for key, record in records.items() if record is not None]
+        keys_key = self._index_key(session_id, "keys")
+        if ttls is None:
+            previous = (
+                self._client.hmget(self._index_key(session_id, "records"), models)
+                if models
+                else []
+            )
+        else:
+            # The index's remaining TTL: -1 if an entry never expires
+            read = self._client.pipeline(transaction=False)
+            if models:
+                read.hmget(self._index_key(session_id, "records"), models)
+            read.ttl(keys_key)
+            *found, index_ttl = read.execute()
+            previous = found[0] if models else []
+
+        pipe = self._client.pipeline(transaction=True)
+        touched = [keys_key]
+        for key, data in serialized.items():
+            if ttls is None:
+                self._queue_set(pipe, session_id, key, data)
+            elif key in ttls:
+                pipe.setex(self._get_redis_key(session_id, key), ttls[key], data)
+            else:
+                pipe.set(self._get_redis_key(session_id, key), data)
+        pipe.sadd(keys_key, *serialized)
+        for key, old in zip(models, previous, strict=True):
+            touched.extend(
+                self._queue_index(pipe, session_id, key, records[key], old)
+            )
+        if ttls is None:
+            self._queue_expire(pipe, touched)
+        elif len(ttls) < len(serialized) or index_ttl == -1:
+            for name in dict.fromkeys(touched):
+                pipe.persist(name)
+        else:
+            seconds = max(max(ttls.values()), index_ttl)
+            for name in dict.fromkeys(touched):
+                pipe.expire(name, seconds)
+        pipe.execute()
 
     def read(self, session_id: str, key: str) -> Optional[Any]:
         """
@@ -116,6 +418,787 @@ class RedisSessionStore(SessionStore):
             except json.JSONDecodeError:
                 return None
 
+    def read_versioned(self, session_id: str, key: str) -> Tuple[Optional[Any], str]:
+        """
+        Read a value with its version token (a digest of the stored string).
+
+        Args:
+            session_id: Session identifier
+            key: Memory key
+
+        Returns:
+            The value (None if not found or expired) and its version token
+        """
+        with self._tracer.start_as_current_span(
+            "RedisSessionStore.read_versioned"
+        ) as span:
+            span.set_attribute("session.id", session_id)
+            span.set_attribute("memory.key", key)
+
+            serialized = self._client.get(self._get_redis_key(session_id, key))
+            if serialized is None:
+                return None, MISSING_VERSION
+            return json.loads(serialized).get("value"), entry_version(serialized)
+
+    def write_versioned(
+        self, session_id: str, key: str, value: Any, if_version: str
+    ) -> str:
+        """
+        Write a value if the key is still at ``if_version``: the key is
+        WATCHed while its version is checked, and the write (with any
+        index updates) runs in MULTI/EXEC, which aborts if the key changed
+        in between.
+
+        Args:
+            session_id: Session identifier
+            key: Memory key
+            value: Value to store
+            if_version: Expected version token
+
+        Returns:
+            The new version token
+
+        Raises:
+            VersionConflictError: If the key is at another version
+        """
+        with self._tracer.start_as_current_span(
+            "RedisSessionStore.write_versioned"
+        ) as span:
+            redis_key = self._get_redis_key(session_id, key)
+            span.set_attribute("session.id", session_id)
+            span.set_attribute("memory.key", key)
+
+            serialized = json.dumps({
+                "value": value,
+                "created_at": get_current_timestamp().isoformat(),
+                "ttl_seconds": self.ttl_seconds,
+            })
+            record = index_record(key, value)
+            with self._client.pipeline(transaction=True) as pipe:
+                pipe.watch(redis_key)
+                current = entry_version(pipe.get(redis_key))
+                if current != if_version:
+                    raise VersionConflictError(key, if_version, current)
+                previous = None
+                if record is not None:
+                    previous = pipe.hget(self._index_key(session_id, "records"), key)
+
+                pipe.multi()
+                self._queue_set(pipe, session_id, key, serialized)
+                keys_key = self._index_key(session_id, "keys")
+                touched = [keys_key]
+                pipe.sadd(keys_key, key)
+                if record is not None:
+                    touched.extend(
+                        self._queue_index(pipe, session_id, key, record, previous)
+                    )
+                self._queue_expire(pipe, touched)
+                try:
+                    pipe.execute()
+                except WatchError:
+                    raise VersionConflictError(key, if_version) from None
+            return entry_version(serialized)
+
+    def read_many(self, session_id: str, keys: Sequence[str]) -> List[Optional[Any]]:
+        """
+        Read several values of one session with a single MGET.
+
+        Args:
+            session_id: Session identifier
+            keys: Memory keys
+
+        Returns:
+            Stored values aligned with ``keys`` (None if not found)
+        """
+        if not keys:
+            return []
+        with self._tracer.start_as_current_span("RedisSessionStore.read_many") as span:
+            span.set_attribute("session.id", session_id)
+            span.set_attribute("memory.count", len(keys))
+            raw = self._client.mget(
+                [self._get_redis_key(session_id, k) for k in keys]
+            )
+        values = []
+        for serialized in raw:
+            if not serialized:
+                values.append(None)
+                continue
+            try:
+                values.append(json.loads(serialized).get("value"))
+            except json.JSONDecodeError:
+                values.append(None)
+        return values
+
+    def read_entries(
+        self, session_id: str, keys: Sequence[str]
+    ) -> List[Optional[StoredEntry]]:
+        """
+        Read several values of one session with their TTL envelopes with a
+        single MGET.
+
+        Args:
+            session_id: Session identifier
+            keys: Memory keys
+
+        Returns:
+            Entries aligned with ``keys`` (None if not found or expired)
+        """
+        if not keys:
+            return []
+        with self._tracer.start_as_current_span(
+            "RedisSessionStore.read_entries"
+        ) as span:
+            span.set_attribute("session.id", session_id)
+            span.set_attribute("memory.count", len(keys))
+            raw = self._client.mget(
+                [self._get_redis_key(session_id, k) for k in keys]
+            )
+        entries: List[Optional[StoredEntry]] = []
+        for serialized in raw:
+            try:
+                data = json.loads(serialized) if serialized else None
+            except json.JSONDecodeError:
+                data = None
+            if not isinstance(data, dict):
+                entries.append(None)
+            elif "created_at" in data:
+                entries.append(StoredEntry.from_wrapper(data))
+            else:
+                entries.append(StoredEntry(data.get("value")))
+        return entries
+
+    def write_entries(self, session_id: str, entries: Dict[str, StoredEntry]) -> None:
+        """
+        Write several keys of one session like ``write_many``, each set
+        with SETEX for the time its entry has left (SET if it never
+        expires). Entries that have already expired are skipped.
+
+        Args:
+            session_id: Session identifier
+            entries: Mapping of memory key to entry
+        """
+        with self._tracer.start_as_current_span(
+            "RedisSessionStore.write_entries"
+        ) as span:
+            span.set_attribute("session.id", session_id)
+            span.set_attribute("memory.count", len(entries))
+
+            now = time.time()
+            live = {
+                key: entry for key, entry in entries.items() if not entry.expired(now)
+            }
+            if not live:
+                return
+            self._put(
+                session_id,
+                {key: entry.value for key, entry in live.items()},
+                {key: json.dumps(entry.to_wrapper(now)) for key, entry in live.items()},
+                {
+                    key: max(1, math.ceil(entry.expires_at - now))
+                    for key, entry in live.items()
+                    if entry.expires_at is not None
+                },
+            )
+
+    def read_session(self, session_id: str, prefix: str = "") -> Dict[str, Any]:
+        """
+        Read every key of a session starting with ``prefix`` with a single
+        ``SORT idx:{session}:keys BY nosort GET # GET session:{session}:*``.
+
+        Members whose value has expired are skipped. Session ids that SORT
+        would misread as a pattern fall back to SMEMBERS and MGET.
+
+        Args:
+            session_id: Session identifier
+            prefix: Key prefix (empty = all keys)
+
+        Returns:
+            Mapping of key to value of the live entries
+        """
+        with self._tracer.start_as_current_span(
+            "RedisSessionStore.read_session"
+        ) as span:
+            span.set_attribute("session.id", session_id)
+
+            keys_key = self._index_key(session_id, "keys")
+            if "*" in session_id or "->" in session_id:
+                keys = sorted(self._client.smembers(keys_key))
+                pairs = zip(
+                    keys,
+                    self._client.mget(
+                        [self._get_redis_key(session_id, k) for k in keys]
+                    )
+                    if keys
+                    else [],
+                    strict=True,
+                )
+            else:
+                pairs = self._client.sort(
+                    keys_key,
+                    by="nosort",
+                    get=["#", self._get_redis_key(session_id, "*")],
+                    groups=True,
+                )
+
+            values = {}
+            for key, serialized in pairs:
+                if not serialized or not key.startswith(prefix):
+                    continue
+                try:
+                    values[key] = json.loads(serialized).get("value")
+                except json.JSONDecodeError:
+                    continue
+            span.set_attribute("memory.count", len(values))
+            return values
+
+    def delete(self, session_id: str, key: str) -> bool:
+        """
+        Delete a key in one MULTI/EXEC pipeline: UNLINK of the value, plus
+        removal from the session key set and, for memory models, the
+        index records and sets.
+
+        Args:
+            session_id: Session identifier
+            key: Memory key
+
+        Returns:
+            Whether a live key was deleted
+        """
+        with self._tracer.start_as_current_span("RedisSessionStore.delete") as span:
+            redis_key = self._get_redis_key(session_id, key)
+            span.set_attribute("session.id", session_id)
+            span.set_attribute("memory.key", key)
+            span.set_attribute("redis.key", redis_key)
+
+            records_key = self._index_key(session_id, "records")
+            previous = self._client.hget(records_key, key)
+            pipe = self._client.pipeline(transaction=True)
+            pipe.unlink(redis_key)
+            pipe.srem(self._index_key(session_id, "keys"), key)
+            if previous is not None:
+                pipe.hdel(records_key, key)
+                self._queue_unindex(pipe, session_id, key, previous)
+            return bool(pipe.execute()[0])
+
+    def delete_session(self, session_id: str) -> int:
+        """
+        Delete every key of a session with batched UNLINKs: the values
+        (SSCAN of the session key set), the index keys named by the records
+        hash, and the log streams.
+
+        Args:
+            session_id: Session identifier
+
+        Returns:
+            Number of live keys deleted
+        """
+        with self._tracer.start_as_current_span(
+            "RedisSessionStore.delete_session"
+        ) as span:
+            span.set_attribute("session.id", session_id)
+
+            keys_key = self._index_key(session_id, "keys")
+            records_key = self._index_key(session_id, "records")
+            streams_key = self._index_key(session_id, "streams")
+            deleted = 0
+            for batch in self._batches(
+                self._client.sscan_iter(keys_key, count=self.KEY_BATCH)
+            ):
+                deleted += self._client.unlink(
+                    *(self._get_redis_key(session_id, key) for key in batch)
+                )
+
+            names = {keys_key, records_key, streams_key}
+            for key, stored in self._client.hgetall(records_key).items():
+                record = IndexRecord.from_dict(key, json.loads(stored))
+                names.update(self._record_index_keys(session_id, record))
+            names.update(
+                self._log_key(session_id, stream)
+                for stream in self._client.smembers(streams_key)
+            )
+            for batch in self._batches(sorted(names)):
+                self._client.unlink(*batch)
+            span.set_attribute("deleted_count", deleted)
+            return deleted
+
+    def iter_keys(self, session_id: str, prefix: str = "") -> Iterator[str]:
+        """
+        Stream the live keys of a session starting with ``prefix`` with a
+        cursor SSCAN of the session key set, checking each batch with one
+        pipelined EXISTS per key. Keys come in no particular order.
+
+        Args:
+            session_id: Session identifier
+            prefix: Key prefix (empty = all keys)
+
+        Yields:
+            Keys whose value has not expired
+        """
+        members = self._scan_members(session_id, prefix)
+        for batch in self._batches(members):
+            pipe = self._client.pipeline(transaction=False)
+            for key in batch:
+                pipe.exists(self._get_redis_key(session_id, key))
+            for key, exists in zip(batch, pipe.execute(), strict=True):
+                if exists:
+                    yield key
+
+    def iter_sessions(self) -> Iterator[str]:
+        """
+        List the sessions with a cursor SCAN of the session key sets
+        (``idx:*:keys``). SCAN has no order, so the ids (not their keys)
+        are collected and sorted before they are yielded.
+
+        Yields:
+            Session ids in lexicographic order
+        """
+        sessions = {
+            name[len("idx:"):-len(":keys")]
+            for name in self._client.scan_iter(match="idx:*:keys", count=self.KEY_BATCH)
+        }
+        yield from sorted(sessions)
+
+    def delete_prefix(self, session_id: str, prefix: str) -> int:
+        """
+        Delete every key of a session starting with ``prefix``: the members
+        are listed with a cursor SSCAN, and each batch's records are read
+        with one HMGET and deleted in one MULTI/EXEC pipeline.
+
+        Args:
+            session_id: Session identifier
+            prefix: Key prefix
+
+        Returns:
+            Number of live keys deleted
+        """
+        with self._tracer.start_as_current_span(
+            "RedisSessionStore.delete_prefix"
+        ) as span:
+            span.set_attribute("session.id", session_id)
+
+            keys_key = self._index_key(session_id, "keys")
+            records_key = self._index_key(session_id, "records")
+            members = list(self._scan_members(session_id, prefix))
+            deleted = 0
+            for batch in self._batches(members):
+                records = self._client.hmget(records_key, batch)
+                pipe = self._client.pipeline(transaction=True)
+                pipe.unlink(*(self._get_redis_key(session_id, key) for key in batch))
+                pipe.srem(keys_key, *batch)
+                indexed = [
+                    (key, previous)
+                    for key, previous in zip(batch, records, strict=True)
+                    if previous is not None
+                ]
+                if indexed:
+                    pipe.hdel(records_key, *(key for key, _ in indexed))
+                for key, previous in indexed:
+                    self._queue_unindex(pipe, session_id, key, previous)
+                deleted += pipe.execute()[0]
+            span.set_attribute("deleted_count", deleted)
+            return deleted
+
+    def delete_log(self, session_id: str, stream: str) -> None:
+        """
+        Delete a log stream with one UNLINK of the Redis Stream.
+
+        Args:
+            session_id: Session identifier
+            stream: Stream name
+        """
+        with self._tracer.start_as_current_span("RedisSessionStore.delete_log") as span:
+            span.set_attribute("session.id", session_id)
+            span.set_attribute("log.stream", stream)
+
+            pipe = self._client.pipeline(transaction=True)
+            pipe.unlink(self._log_key(session_id, stream))
+            pipe.srem(self._index_key(session_id, "streams"), stream)
+            pipe.execute()
+
+    def iter_streams(self, session_id: str) -> Iterator[str]:
+        """
+        List the log streams of a session with one SMEMBERS of its stream
+        name set.
+
+        Args:
+            session_id: Session identifier
+
+        Yields:
+            Stream names in lexicographic order
+        """
+        yield from sorted(
+            self._client.smembers(self._index_key(session_id, "streams"))
+        )
+
+    def iter_log_sessions(self) -> Iterator[str]:
+        """
+        List the sessions holding log streams with a cursor SCAN of their
+        stream name sets (``idx:*:streams``), sorted like ``iter_sessions``.
+
+        Yields:
+            Session ids in lexicographic order
+        """
+        sessions = {
+            name[len("idx:"):-len(":streams")]
+            for name in self._client.scan_iter(
+                match="idx:*:streams", count=self.KEY_BATCH
+            )
+        }
+        yield from sorted(sessions)
+
+    def _scan_members(self, session_id: str, prefix: str) -> Iterator[str]:
+        """Cursor SSCAN of the session key set for keys starting with prefix."""
+        # Prefixes with glob metacharacters are filtered client-side only
+        match = None
+        if prefix and not any(c in prefix for c in "*?[]\\"):
+            match = prefix + "*"
+        for key in self._client.sscan_iter(
+            self._index_key(session_id, "keys"), match=match, count=self.KEY_BATCH
+        ):
+            if key.startswith(prefix):
+                yield key
+
+    def _batches(self, names) -> Iterator[List[str]]:
+        """Split an iterable into lists of at most ``KEY_BATCH`` items."""
+        names = iter(names)
+        while True:
+            batch = list(itertools.islice(names, self.KEY_BATCH))
+            if not batch:
+                return
+            yield batch
+
+    def _candidates(self, session_id: str, query: MemoryQuery) -> List[IndexRecord]:
+        """Scan the most selective ZSET in score order, stopping after limit+1."""
+        if query.memory_type is not None:
+            zset = self._index_key(session_id, "type", query.memory_type)
+        elif query.scope is not None:
+            zset = self._index_key(session_id, "scope", query.scope)
+        else:
+            zset = self._index_key(session_id, "all")
+        records_key = self._index_key(session_id, "records")
+
+        after = query.after()
+        low = max(
+            query.since_ts if query.since is not None else float("-inf"),
+            after[0] if after is not None else float("-inf"),
+        )
+        high = f"({query.until_ts}" if query.until is not None else "+inf"
+
+        records: List[IndexRecord] = []
+        stale: List[str] = []
+        offset = 0
+        while len(records) <= query.limit:
+            batch = self._client.zrangebyscore(
+                zset, low, high, start=offset, num=_QUERY_BATCH, withscores=True
+            )
+            if not batch:
+                break
+            offset += len(batch)
+            keys = [member for member, _ in batch]
+            raw_records = self._client.hmget(records_key, keys)
+            for key, raw in zip(keys, raw_records, strict=True):
+                if raw is None:
+                    stale.append(key)
+                    continue
+                record = IndexRecord.from_dict(key, json.loads(raw))
+                if after is not None and (record.created_ts, key) <= after:
+                    continue
+                if query.matches(record):
+                    records.append(record)
+            if len(batch) < _QUERY_BATCH:
+                break
+        if stale:
+            self._client.zrem(zset, *stale)
+        return records
+
+    def _tagged(self, session_id: str, query: MemoryQuery) -> set:
+        """Keys carrying every ``tags`` tag and one of the ``any_tags``."""
+        keys = None
+        if query.tags:
+            keys = self._client.sinter(
+                [self._index_key(session_id, "tag", t) for t in query.tags]
+            )
+        if query.any_tags and (keys is None or keys):
+            union = self._client.sunion(
+                [self._index_key(session_id, "tag", t) for t in query.any_tags]
+            )
+            keys = union if keys is None else keys & union
+        return keys
+
+    def query(self, session_id: str, query: MemoryQuery) -> QueryPage:
+        """
+        List the memory models of a session matching ``query``.
+
+        Type and scope filters walk the matching ZSET in creation order;
+        tag-only filters intersect (``tags``) and union (``any_tags``) the
+        tag SETs server-side. Values are fetched with a single MGET.
+
+        Args:
+            session_id: Session identifier
+            query: Filter and pagination
+
+        Returns:
+            One page of matching memories, oldest first
+        """
+        with self._tracer.start_as_current_span("RedisSessionStore.query") as span:
+            span.set_attribute("session.id", session_id)
+
+            if (
+                query.filters_tags
+                and query.memory_type is None
+                and query.scope is None
+            ):
+                keys = sorted(self._tagged(session_id, query))
+                raw = (
+                    self._client.hmget(self._index_key(session_id, "records"), keys)
+                    if keys
+                    else []
+                )
+                page, cursor = paginate(
+                    (
+                        IndexRecord.from_dict(k, json.loads(r))
+                        for k, r in zip(keys, raw, strict=True)
+                        if r is not None
+                    ),
+                    query,
+                )
+            else:
+                records = self._candidates(session_id, query)
+                page = records[: query.limit]
+                cursor = next_cursor(page, len(records) > query.limit)
+
+            result = fetch_page(
+                page, cursor, lambda keys: self.read_many(session_id, keys)
+            )
+            span.set_attribute("query.results", len(result))
+            return result
+
+    def match_triples(self, session_id: str, pattern: TriplePattern) -> QueryPage:
+        """
+        List the SemanticMemory models of a session matching ``pattern``.
+
+        Walks the triple ZSET of the pattern's bound terms, where equal
+        scores order by key, so pages come straight off the ZSET.
+
+        Args:
+            session_id: Session identifier
+            pattern: Triple pattern and pagination
+
+        Returns:
+            One page of matching memories, highest truth_score first
+        """
+        with self._tracer.start_as_current_span(
+            "RedisSessionStore.match_triples"
+        ) as span:
+            span.set_attribute("session.id", session_id)
+
+            zset = self._triple_zset(session_id, pattern)
+            records_key = self._index_key(session_id, "records")
+            after = pattern.after()
+            low = after[0] if after is not None else "-inf"
+
+            records: List[IndexRecord] = []
+            stale: List[str] = []
+            offset = 0
+            while len(records) <= pattern.limit:
+                batch = self._client.zrangebyscore(
+                    zset, low, "+inf", start=offset, num=_QUERY_BATCH
+                )
+                if not batch:
+                    break
+                offset += len(batch)
+                raw_records = self._client.hmget(records_key, batch)
+                for key, raw in zip(batch, raw_records, strict=True):
+                    record = (
+                        IndexRecord.from_dict(key, json.loads(raw))
+                        if raw is not None
+                        else None
+                    )
+                    if record is None or not record.is_triple:
+                        stale.append(key)
+                        continue
+                    if after is not None and (-record.truth_score, key) <= after:
+                        continue
+                    if pattern.matches(record):
+                        records.append(record)
+                if len(batch) < _QUERY_BATCH:
+                    break
+            if stale:
+                self._client.zrem(zset, *stale)
+
+            page = records[: pattern.limit]
+            result = fetch_page(
+                page,
+                next_triple_cursor(page, len(records) > pattern.limit),
+                lambda keys: self.read_many(session_id, keys),
+            )
+            span.set_attribute("query.results", len(result))
+            return result
+
+    def rank(self, session_id: str, query: RankQuery) -> QueryPage:
+        """
+        List the top memory models of a session by importance or recency,
+        reading the ranked ZSET of the most selective filter from the
+        cursor onwards.
+
+        Args:
+            session_id: Session identifier
+            query: Order, filters and pagination
+
+        Returns:
+            One page of memories, highest value first
+        """
+        with self._tracer.start_as_current_span("RedisSessionStore.rank") as span:
+            span.set_attribute("session.id", session_id)
+
+            if query.memory_type is not None:
+                dimension = ("type", query.memory_type)
+            elif query.scope is not None:
+                dimension = ("scope", query.scope)
+            else:
+                dimension = ("all",)
+            zset = self._index_key(session_id, "rank", query.by, *dimension)
+            records_key = self._index_key(session_id, "records")
+            after = query.after()
+            low = after[0] if after is not None else "-inf"
+
+            records: List[IndexRecord] = []
+            stale: List[str] = []
+            offset = 0
+            while len(records) <= query.limit:
+                batch = self._client.zrangebyscore(
+                    zset, low, "+inf", start=offset, num=_QUERY_BATCH
+                )
+                if not batch:
+                    break
+                offset += len(batch)
+                raw_records = self._client.hmget(records_key, batch)
+                for key, raw in zip(batch, raw_records, strict=True):
+                    record = (
+                        IndexRecord.from_dict(key, json.loads(raw))
+                        if raw is not None
+                        else None
+                    )
+                    if record is None or rank_value(record, query.by) is None:
+                        stale.append(key)
+                        continue
+                    if after is not None and rank_order(record, query.by) <= after:
+                        continue
+                    if query.matches(record):
+                        records.append(record)
+                if len(batch) < _QUERY_BATCH:
+                    break
+            if stale:
+                self._client.zrem(zset, *stale)
+
+            page = records[: query.limit]
+            result = fetch_page(
+                page,
+                next_rank_cursor(page, len(records) > query.limit, query.by),
+                lambda keys: self.read_many(session_id, keys),
+            )
+            span.set_attribute("query.results", len(result))
+            return result
+
+    @staticmethod
+    def _log_key(session_id: str, stream: str) -> str:
+        return f"log:{session_id}:{stream}"
+
+    @staticmethod
+    def _stream_id(entry_id: str) -> Tuple[int, int]:
+        ms, _, seq = entry_id.partition("-")
+        return int(ms), int(seq or 0)
+
+    def append(
+        self,
+        session_id: str,
+        stream: str,
+        values: Sequence[Any],
+        max_len: Optional[int] = None,
+    ) -> List[LogEntry]:
+        """
+        Append values to a log stream of the session with one pipelined
+        XADD per value.
+
+        Args:
+            session_id: Session identifier
+            stream: Stream name
+            values: JSON-serializable values to append, in order
+            max_len: Keep only the newest ``max_len`` entries (None = all)
+
+        Returns:
+            The appended entries
+        """
+        with self._tracer.start_as_current_span("RedisSessionStore.append") as span:
+            span.set_attribute("session.id", session_id)
+            span.set_attribute("log.stream", stream)
+            span.set_attribute("memory.count", len(values))
+
+            log_key = self._log_key(session_id, stream)
+            streams_key = self._index_key(session_id, "streams")
+            pipe = self._client.pipeline(transaction=True)
+            for value in values:
+                pipe.xadd(
+                    log_key, {"v": json.dumps(value)}, maxlen=max_len,
+                    approximate=False,
+                )
+            pipe.sadd(streams_key, stream)
+            self._queue_expire(pipe, [log_key, streams_key])
+            ids = pipe.execute()[: len(values)]
+            return [
+                LogEntry(entry_id, self._stream_id(entry_id)[0] / 1000.0, value)
+                for entry_id, value in zip(ids, values, strict=True)
+            ]
+
+    def read_log(self, session_id: str, query: LogQuery) -> LogPage:
+        """
+        Read one page of a log stream of the session with one XRANGE (or
+        XREVRANGE) between the time and cursor bounds.
+
+        Args:
+            session_id: Session identifier
+            query: Stream, time range, direction and pagination
+
+        Returns:
+            One page of entries, in read order
+        """
+        with self._tracer.start_as_current_span("RedisSessionStore.read_log") as span:
+            span.set_attribute("session.id", session_id)
+            span.set_attribute("log.stream", query.stream)
+
+            # Ids without a sequence part span their whole millisecond
+            low, high = query.bounds(self.ttl_seconds, time.time())
+            start = str(math.ceil(low * 1000)) if low is not None else "-"
+            end = str(math.ceil(high * 1000) - 1) if high is not None else "+"
+            after = query.after()
+            if after is not None:
+                position = self._stream_id(after[1])
+                if query.reverse:
+                    if end == "+" or position <= (int(end), 2**64):
+                        end = f"({after[1]}"
+                elif start == "-" or position >= (int(start), 0):
+                    start = f"({after[1]}"
+
+            log_key = self._log_key(session_id, query.stream)
+            if query.reverse:
+                raw = self._client.xrevrange(
+                    log_key, max=end, min=start, count=query.limit + 1
+                )
+            else:
+                raw = self._client.xrange(
+                    log_key, min=start, max=end, count=query.limit + 1
+                )
+            entries = [
+                LogEntry(
+                    entry_id,
+                    self._stream_id(entry_id)[0] / 1000.0,
+                    json.loads(fields["v"]),
+                )
+                for entry_id, fields in raw[: query.limit]
+            ]
+            span.set_attribute("query.results", len(entries))
+            return LogPage(entries, next_log_cursor(entries, len(raw) > query.limit))
+
     def cleanup_expired(self, session_id: Optional[str] = None) -> int:
         """
         No-op for Redis as it handles TTL natively.
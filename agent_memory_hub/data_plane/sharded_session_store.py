@@ -0,0 +1,751 @@
+"""
+Sharding of sessions across several backend instances by consistent
+hashing, with online rebalancing when shards are added or removed.
+"""
+import bisect
+import hashlib
+import heapq
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, replace
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
+
+from agent_memory_hub.control_plane.region_guard import RegionGuard
+from agent_memory_hub.data_plane.adk_session_store import SessionStore, StoredEntry
+from agent_memory_hub.data_plane.patch import MemoryPatch
+from agent_memory_hub.indexing.episode_log import LogEntry, LogPage, LogQuery
+from agent_memory_hub.indexing.query import (
+    MAX_LIMIT,
+    MemoryQuery,
+    QueryPage,
+    RankQuery,
+    TriplePattern,
+)
+from agent_memory_hub.utils.telemetry import get_tracer
+
+# Points per shard on the hash ring
+DEFAULT_VNODES = 128
+# Shards called in parallel by fan-out operations and sessions moved in
+# parallel by a rebalance
+SHARD_WORKERS = 8
+# Locks striping the sessions being moved by a rebalance
+LOCK_STRIPES = 256
+
+
+def _hash(value: str) -> int:
+    """Stable 64-bit position of ``value`` on the ring."""
+    digest = hashlib.blake2b(value.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big")
+
+
+class HashRing:
+    """
+    Consistent hash ring mapping session ids to shard names. Each shard is
+    placed at ``vnodes`` points, so sessions spread evenly and adding or
+    removing a shard moves only about 1/N of them.
+    """
+
+    def __init__(self, names: Sequence[str] = (), vnodes: int = DEFAULT_VNODES):
+        if vnodes < 1:
+            raise ValueError("vnodes must be at least 1")
+        self.vnodes = vnodes
+        self._points: List[Tuple[int, str]] = []
+        for name in names:
+            self.add(name)
+
+    @property
+    def names(self) -> List[str]:
+        """Shard names on the ring, sorted."""
+        return sorted({name for _, name in self._points})
+
+    def add(self, name: str) -> None:
+        if name in self.names:
+            raise ValueError(f"Shard {name!r} is already on the ring")
+        for i in range(self.vnodes):
+            bisect.insort(self._points, (_hash(f"{name}#{i}"), name))
+
+    def remove(self, name: str) -> None:
+        if name not in self.names:
+            raise ValueError(f"Shard {name!r} is not on the ring")
+        self._points = [point for point in self._points if point[1] != name]
+
+    def copy(self) -> "HashRing":
+        ring = HashRing(vnodes=self.vnodes)
+        ring._points = list(self._points)
+        return ring
+
+    def owner(self, session_id: str) -> str:
+        """
+        Shard owning a session: the first point clockwise from its hash.
+
+        Raises:
+            ValueError: If the ring is empty
+        """
+        if not self._points:
+            raise ValueError("The hash ring has no shards")
+        i = bisect.bisect(self._points, (_hash(session_id), ""))
+        return self._points[i % len(self._points)][1]
+
+
+class ShardedSessionStore(SessionStore):
+    """
+    Session store spreading sessions over several stores (shards), e.g.
+    multiple Redis nodes or AlloyDB instances of one region. Every session
+    lives on one shard, chosen by a consistent hash ring with virtual
+    nodes, so all per-session operations (including atomic writes, version
+    tokens, cursors and episode logs) run on a single backend unchanged.
+
+    Operations spanning sessions fan out to the shards in parallel:
+    ``read_many_sessions``, ``write_many_sessions`` and
+    ``cleanup_expired``. ``iter_sessions`` merges the shards' sorted
+    listings.
+
+    With a ``region``, a ``RegionGuard`` checks every shard's region when
+    it is added and again on each call routed to it, so no shard outside
+    the region is ever read or written.
+
+    ``add_shard`` and ``remove_shard`` return a ``ShardRebalancer`` moving
+    the affected sessions while the store keeps serving them (see there).
+    """
+
+    def __init__(
+        self,
+        shards: Mapping[str, SessionStore],
+        region: Optional[str] = None,
+        regions: Optional[Mapping[str, str]] = None,
+        vnodes: int = DEFAULT_VNODES,
+        workers: int = SHARD_WORKERS,
+    ):
+        """
+        Initialize the sharded store.
+
+        Args:
+            shards: Shard name to store; names place the shards on the
+                ring, so keep them stable across restarts
+            region: Region every shard must be in (None = no check)
+            regions: Shard name to region, for stores without a
+                ``region`` attribute of their own
+            vnodes: Points per shard on the hash ring
+            workers: Shards called in parallel by fan-out operations
+
+        Raises:
+            RuntimeError: If a shard is outside ``region``
+        """
+        if not shards:
+            raise ValueError("A sharded store needs at least one shard")
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        self.region_guard = RegionGuard(region) if region is not None else None
+        self.workers = workers
+        self._shards: Dict[str, SessionStore] = {}
+        self._regions: Dict[str, Optional[str]] = {}
+        for name, store in shards.items():
+            self._register(name, store, (regions or {}).get(name))
+        self._ring = HashRing(list(shards), vnodes=vnodes)
+        ttls = {getattr(store, "ttl_seconds", None) for store in shards.values()}
+        self.ttl_seconds = ttls.pop() if len(ttls) == 1 else None
+        self._tracer = get_tracer()
+
+        # Rebalance state, guarded by _state: the ring before the change,
+        # the sessions to move (None while they are being listed), sessions
+        # routed by the old ring while listing, and sessions moved
+        self._state = threading.Condition()
+        self._previous: Optional[HashRing] = None
+        self._pending: Optional[Set[str]] = None
+        self._touched: Set[str] = set()
+        self._moved: Set[str] = set()
+        self._removing: Optional[str] = None
+        # Calls routed without a lock, waited for when a rebalance starts
+        self._unlocked_calls = 0
+        self._locks = [threading.Lock() for _ in range(LOCK_STRIPES)]
+
+    @property
+    def shards(self) -> Dict[str, SessionStore]:
+        """Shard name to store, including a shard being removed."""
+        return dict(self._shards)
+
+    @property
+    def ring(self) -> HashRing:
+        """The current hash ring (after any rebalance in progress)."""
+        return self._ring
+
+    @property
+    def rebalancing(self) -> bool:
+        return self._previous is not None
+
+    @property
+    def atomic_writes(self) -> bool:
+        return all(store.atomic_writes for store in self._shards.values())
+
+    def _register(self, name: str, store: SessionStore, region: Optional[str]) -> None:
+        region = region or getattr(store, "region", None)
+        if self.region_guard is not None:
+            self.region_guard.check_residency(region)
+        self._shards[name] = store
+        self._regions[name] = region
+
+    def shard_for(self, session_id: str) -> str:
+        """Name of the shard currently serving a session."""
+        with self._state:
+            return self._route(session_id)
+
+    def _route(self, session_id: str) -> str:
+        """Shard serving a session; call with ``_state`` held."""
+        name = self._ring.owner(session_id)
+        if self._previous is None:
+            return name
+        old = self._previous.owner(session_id)
+        if old == name or session_id in self._moved:
+            return name
+        if self._pending is None:
+            # Still listing: a session created now must be moved too
+            self._touched.add(session_id)
+            return old
+        return old if session_id in self._pending else name
+
+    def _call(self, session_id: str, fn: Callable[[SessionStore], Any]) -> Any:
+        """Run a per-session operation on the shard serving the session."""
+        with self._state:
+            unlocked = self._previous is None
+            if unlocked:
+                name = self._ring.owner(session_id)
+                self._unlocked_calls += 1
+        if unlocked:
+            try:
+                return fn(self._checked(name))
+            finally:
+                with self._state:
+                    self._unlocked_calls -= 1
+                    self._state.notify_all()
+        # During a rebalance the session's lock keeps it from moving
+        # between routing and the end of the call
+        with self._lock(session_id):
+            with self._state:
+                name = self._route(session_id)
+            return fn(self._checked(name))
+
+    def _checked(self, name: str) -> SessionStore:
+        if self.region_guard is not None:
+            self.region_guard.check_residency(self._regions[name])
+        return self._shards[name]
+
+    def _lock(self, session_id: str) -> threading.Lock:
+        return self._locks[_hash(session_id) % LOCK_STRIPES]
+
+    def _fan_out(self, fn: Callable[[SessionStore], Any]) -> List[Any]:
+        """Run ``fn`` on every shard in parallel, in shard name order."""
+        stores = [self._checked(name) for name in sorted(self._shards)]
+        if len(stores) == 1:
+            return [fn(stores[0])]
+        with ThreadPoolExecutor(max_workers=min(self.workers, len(stores))) as pool:
+            return list(pool.map(fn, stores))
+
+    def write(self, session_id: str, key: str, value: Any) -> None:
+        with self._tracer.start_as_current_span("ShardedSessionStore.write") as span:
+            span.set_attribute("session.id", session_id)
+            span.set_attribute("memory.key", key)
+
+            self._call(session_id, lambda s: s.write(session_id, key, value))
+
+    def write_many(self, session_id: str, items: Dict[str, Any]) -> None:
+        with self._tracer.start_as_current_span(
+            "ShardedSessionStore.write_many"
+        ) as span:
+            span.set_attribute("session.id", session_id)
+            span.set_attribute("memory.count", len(items))
+
+            self._call(session_id, lambda s: s.write_many(session_id, items))
+
+    def write_atomic(self, session_id: str, items: Dict[str, Any]) -> None:
+        self._call(session_id, lambda s: s.write_atomic(session_id, items))
+
+    def read(self, session_id: str, key: str) -> Optional[Any]:
+        with self._tracer.start_as_current_span("ShardedSessionStore.read") as span:
+            span.set_attribute("session.id", session_id)
+            span.set_attribute("memory.key", key)
+
+            return self._call(session_id, lambda s: s.read(session_id, key))
+
+    def read_many(self, session_id: str, keys: Sequence[str]) -> List[Optional[Any]]:
+        with self._tracer.start_as_current_span(
+            "ShardedSessionStore.read_many"
+        ) as span:
+            span.set_attribute("session.id", session_id)
+            span.set_attribute("memory.count", len(keys))
+
+            return self._call(session_id, lambda s: s.read_many(session_id, keys))
+
+    def read_session(self, session_id: str, prefix: str = "") -> Dict[str, Any]:
+        return self._call(session_id, lambda s: s.read_session(session_id, prefix))
+
+    def read_many_sessions(
+        self, keys: Mapping[str, Sequence[str]]
+    ) -> Dict[str, List[Optional[Any]]]:
+        """
+        Read keys of several sessions, with one ``read_many`` per session
+        and the shards read in parallel.
+
+        Args:
+            keys: Session id to the keys to read in it
+
+        Returns:
+            Session id to values aligned with its keys (None if not found)
+        """
+        with self._tracer.start_as_current_span(
+            "ShardedSessionStore.read_many_sessions"
+        ) as span:
+            span.set_attribute("memory.count", sum(map(len, keys.values())))
+
+            results = self._per_session(
+                list(keys), lambda session_id: self.read_many(
+                    session_id, keys[session_id]
+                )
+            )
+            return dict(zip(keys, results, strict=True))
+
+    def write_many_sessions(self, items: Mapping[str, Dict[str, Any]]) -> None:
+        """
+        Write keys of several sessions, with one ``write_many`` per session
+        and the shards written in parallel.
+
+        Args:
+            items: Session id to the keys and values to write in it
+        """
+        with self._tracer.start_as_current_span(
+            "ShardedSessionStore.write_many_sessions"
+        ) as span:
+            span.set_attribute("memory.count", sum(map(len, items.values())))
+
+            self._per_session(
+                list(items),
+                lambda session_id: self.write_many(session_id, items[session_id]),
+            )
+
+    def _per_session(
+        self, session_ids: List[str], fn: Callable[[str], Any]
+    ) -> List[Any]:
+        """
+        Run ``fn`` for each session, the sessions of one shard in turn on
+        one thread and the shards in parallel; results in input order.
+        """
+        groups: Dict[str, List[int]] = {}
+        for i, session_id in enumerate(session_ids):
+            groups.setdefault(self.shard_for(session_id), []).append(i)
+        results: List[Any] = [None] * len(session_ids)
+
+        def run(indexes: List[int]) -> None:
+            for i in indexes:
+                results[i] = fn(session_ids[i])
+
+        if len(groups) <= 1:
+            for indexes in groups.values():
+                run(indexes)
+            return results
+        with ThreadPoolExecutor(max_workers=min(self.workers, len(groups))) as pool:
+            list(pool.map(run, groups.values()))
+        return results
+
+    def read_versioned(self, session_id: str, key: str) -> Tuple[Optional[Any], str]:
+        return self._call(session_id, lambda s: s.read_versioned(session_id, key))
+
+    def write_versioned(
+        self, session_id: str, key: str, value: Any, if_version: str
+    ) -> str:
+        return self._call(
+            session_id, lambda s: s.write_versioned(session_id, key, value, if_version)
+        )
+
+    def patch(self, session_id: str, key: str, patch: MemoryPatch) -> Any:
+        return self._call(session_id, lambda s: s.patch(session_id, key, patch))
+
+    def delete(self, session_id: str, key: str) -> bool:
+        return self._call(session_id, lambda s: s.delete(session_id, key))
+
+    def delete_session(self, session_id: str) -> int:
+        return self._call(session_id, lambda s: s.delete_session(session_id))
+
+    def delete_prefix(self, session_id: str, prefix: str) -> int:
+        return self._call(session_id, lambda s: s.delete_prefix(session_id, prefix))
+
+    def delete_log(self, session_id: str, stream: str) -> None:
+        self._call(session_id, lambda s: s.delete_log(session_id, stream))
+
+    def iter_keys(self, session_id: str, prefix: str = "") -> Iterator[str]:
+        # Listed up front, so a rebalance cannot move the session mid-way
+        keys = self._call(session_id, lambda s: list(s.iter_keys(session_id, prefix)))
+        return iter(keys)
+
+    def iter_streams(self, session_id: str) -> Iterator[str]:
+        streams = self._call(session_id, lambda s: list(s.iter_streams(session_id)))
+        return iter(streams)
+
+    def iter_sessions(self) -> Iterator[str]:
+        """
+        Stream the ids of sessions holding keys, merged from every shard's
+        sorted listing.
+
+        Yields:
+            Session ids in lexicographic order, each once (also while a
+            rebalance holds a session on two shards)
+        """
+        return self._merged(lambda s: s.iter_sessions())
+
+    def iter_log_sessions(self) -> Iterator[str]:
+        """
+        Stream the ids of sessions holding log streams, merged from every
+        shard's sorted listing.
+
+        Yields:
+            Session ids in lexicographic order, each once
+        """
+        return self._merged(lambda s: s.iter_log_sessions())
+
+    def _merged(
+        self, listing: Callable[[SessionStore], Iterator[str]]
+    ) -> Iterator[str]:
+        listings = [listing(self._checked(name)) for name in sorted(self._shards)]
+        last = None
+        for session_id in heapq.merge(*listings):
+            if session_id != last:
+                yield session_id
+                last = session_id
+
+    def read_entries(
+        self, session_id: str, keys: Sequence[str]
+    ) -> List[Optional[StoredEntry]]:
+        return self._call(session_id, lambda s: s.read_entries(session_id, keys))
+
+    def write_entries(self, session_id: str, entries: Dict[str, StoredEntry]) -> None:
+        self._call(session_id, lambda s: s.write_entries(session_id, entries))
+
+    def query(self, session_id: str, query: MemoryQuery) -> QueryPage:
+        return self._call(session_id, lambda s: s.query(session_id, query))
+
+    def match_triples(self, session_id: str, pattern: TriplePattern) -> QueryPage:
+        return self._call(session_id, lambda s: s.match_triples(session_id, pattern))
+
+    def rank(self, session_id: str, query: RankQuery) -> QueryPage:
+        return self._call(session_id, lambda s: s.rank(session_id, query))
+
+    def append(
+        self,
+        session_id: str,
+        stream: str,
+        values: Sequence[Any],
+        max_len: Optional[int] = None,
+    ) -> List[LogEntry]:
+        return self._call(
+            session_id, lambda s: s.append(session_id, stream, values, max_len)
+        )
+
+    def read_log(self, session_id: str, query: LogQuery) -> LogPage:
+        return self._call(session_id, lambda s: s.read_log(session_id, query))
+
+    def cleanup_expired(self, session_id: Optional[str] = None) -> int:
+        """
+        Cleanup expired entries, on every shard in parallel (or on the
+        session's shard).
+
+        Returns:
+            Number of entries deleted
+        """
+        def cleanup(store: SessionStore) -> int:
+            fn = getattr(store, "cleanup_expired", None)
+            return fn(session_id) if fn is not None else 0
+
+        if session_id is not None:
+            return self._call(session_id, cleanup)
+        return sum(self._fan_out(cleanup))
+
+    def add_shard(
+        self,
+        name: str,
+        store: SessionStore,
+        region: Optional[str] = None,
+        rate_limit: Optional[float] = None,
+        start: bool = True,
+    ) -> "ShardRebalancer":
+        """
+        Add a shard and move the sessions it now owns to it (about 1/N of
+        all sessions), online.
+
+        Args:
+            name: Shard name
+            store: Shard store
+            region: Shard region, if ``store`` has no ``region`` attribute
+            rate_limit: Keys moved per second at most (None = unlimited)
+            start: Start moving on a background thread right away
+
+        Returns:
+            The rebalance job; ``join()`` waits for it
+
+        Raises:
+            RuntimeError: If the shard is outside the store's region, or
+                another rebalance is in progress
+            ValueError: If a shard of that name exists
+        """
+        if name in self._shards:
+            raise ValueError(f"Shard {name!r} already exists")
+        ring = self._ring.copy()
+        ring.add(name)
+        with self._state:
+            self._check_idle()
+            self._register(name, store, region)
+        return self._rebalance(ring, rate_limit, start)
+
+    def remove_shard(
+        self, name: str, rate_limit: Optional[float] = None, start: bool = True
+    ) -> "ShardRebalancer":
+        """
+        Move a shard's sessions to the remaining shards, online, then drop
+        it from the store (the backend itself is left as it is).
+
+        Args:
+            name: Shard name
+            rate_limit: Keys moved per second at most (None = unlimited)
+            start: Start moving on a background thread right away
+
+        Returns:
+            The rebalance job; ``join()`` waits for it
+
+        Raises:
+            RuntimeError: If another rebalance is in progress
+            ValueError: If the shard is unknown or the last one
+        """
+        if name not in self._shards:
+            raise ValueError(f"Unknown shard {name!r}")
+        if len(self._shards) == 1:
+            raise ValueError("Cannot remove the last shard")
+        ring = self._ring.copy()
+        ring.remove(name)
+        with self._state:
+            self._check_idle()
+            self._removing = name
+        return self._rebalance(ring, rate_limit, start)
+
+    def _check_idle(self) -> None:
+        if self._previous is not None:
+            raise RuntimeError("Another shard rebalance is in progress")
+
+    def _rebalance(
+        self, ring: HashRing, rate_limit: Optional[float], start: bool
+    ) -> "ShardRebalancer":
+        with self._state:
+            self._previous, self._ring = self._ring, ring
+            self._pending = None
+            self._touched, self._moved = set(), set()
+            # Calls routed by the old ring without a lock finish first
+            self._state.wait_for(lambda: self._unlocked_calls == 0)
+        job = ShardRebalancer(self, rate_limit=rate_limit)
+        return job.start() if start else job
+
+    def _finish_rebalance(self) -> None:
+        with self._state:
+            if self._removing is not None:
+                del self._shards[self._removing]
+                del self._regions[self._removing]
+            self._previous = self._pending = self._removing = None
+            self._touched, self._moved = set(), set()
+
+
+@dataclass
+class RebalanceProgress:
+    """
+    Progress of a ``ShardRebalancer``.
+
+    Attributes:
+        sessions: Sessions to move (known once listing is done)
+        moved: Sessions moved
+        keys: Keys moved
+        log_entries: Episode log entries moved
+        done: Whether every session was moved and the rebalance ended
+        error: What stopped the job early, if anything
+    """
+    sessions: int = 0
+    moved: int = 0
+    keys: int = 0
+    log_entries: int = 0
+    done: bool = False
+    error: Optional[BaseException] = None
+
+
+class ShardRebalancer:
+    """
+    Moves the sessions whose shard changed with a ring change, while the
+    sharded store keeps serving them:
+
+    1. Every shard of the old ring lists its sessions (those holding keys
+       and those holding only log streams) in parallel. Until
+       the listing is complete, sessions that change shard are served by
+       their old shard, and those first seen in that time are added.
+    2. Sessions are moved on ``workers`` threads. A move holds the
+       session's lock, so calls for it wait instead of seeing it half
+       moved; other sessions are served throughout. Keys move in batches
+       with their TTL envelopes (``read_entries``/``write_entries``),
+       then every log stream (``iter_streams``; entries get new ids and
+       times) in place of whatever an interrupted move of the session
+       left on the new shard, then the session is deleted from the old
+       shard.
+    3. Moved sessions are served by their new shard; when all are, the
+       old ring is dropped.
+
+    Stopping the job leaves the store consistent, serving every session
+    from where it is; ``run()`` or ``start()`` again resumes the moves.
+    Version tokens and cursors obtained before a session moved do not
+    carry over to its new shard.
+    """
+
+    def __init__(
+        self,
+        store: ShardedSessionStore,
+        rate_limit: Optional[float] = None,
+        batch_size: int = SessionStore.KEY_BATCH,
+    ):
+        if rate_limit is not None and rate_limit <= 0:
+            raise ValueError("rate_limit must be positive")
+        self.store = store
+        self.rate_limit = rate_limit
+        self.batch_size = batch_size
+        self.progress = RebalanceProgress()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._mutex = threading.Lock()
+        self._next_at = 0.0
+        self._tracer = get_tracer()
+
+    def start(self) -> "ShardRebalancer":
+        """Run the job on a daemon thread."""
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run_quietly, name="ShardRebalancer", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Ask the job to stop after the sessions being moved."""
+        self._stop.set()
+
+    def join(self, timeout: Optional[float] = None) -> RebalanceProgress:
+        """Wait for a started job and return its progress."""
+        if self._thread is not None:
+            self._thread.join(timeout)
+        return self.progress
+
+    def _run_quietly(self) -> None:
+        try:
+            self.run()
+        except Exception as exc:  # kept in progress.error for the caller
+            self.progress.error = exc
+
+    def run(self) -> RebalanceProgress:
+        """
+        Move every affected session, blocking until done or stopped.
+
+        Returns:
+            The job's progress
+        """
+        store = self.store
+        with self._tracer.start_as_current_span("ShardRebalancer.run") as span:
+            if store._previous is None:
+                self.progress.done = True
+                return self.progress
+            if store._pending is None:
+                self._list()
+            with store._state:
+                todo = sorted(store._pending - store._moved)
+            with ThreadPoolExecutor(max_workers=store.workers) as pool:
+                list(pool.map(self._move, todo))
+            if self._stop.is_set():
+                return self.progress
+            store._finish_rebalance()
+            self.progress.done = True
+            span.set_attribute("memory.count", self.progress.keys)
+            return self.progress
+
+    def _list(self) -> None:
+        """Collect the sessions to move from the shards of the old ring."""
+        store = self.store
+        previous, ring = store._previous, store._ring
+
+        def moving(name: str) -> List[str]:
+            shard = store._checked(name)
+            sessions = set(shard.iter_sessions()) | set(shard.iter_log_sessions())
+            return [s for s in sorted(sessions) if ring.owner(s) != name]
+
+        names = previous.names
+        with ThreadPoolExecutor(max_workers=min(store.workers, len(names))) as pool:
+            listed = [s for sessions in pool.map(moving, names) for s in sessions]
+        with store._state:
+            store._pending = set(listed) | {
+                s for s in store._touched if ring.owner(s) != previous.owner(s)
+            }
+            self.progress.sessions = len(store._pending)
+
+    def _move(self, session_id: str) -> None:
+        if self._stop.is_set():
+            return
+        store = self.store
+        source = store._checked(store._previous.owner(session_id))
+        target = store._checked(store._ring.owner(session_id))
+        with store._lock(session_id):
+            keys = list(source.iter_keys(session_id))
+            for i in range(0, len(keys), self.batch_size):
+                batch = keys[i:i + self.batch_size]
+                entries = source.read_entries(session_id, batch)
+                target.write_entries(session_id, {
+                    key: entry
+                    for key, entry in zip(batch, entries, strict=True)
+                    if entry is not None
+                })
+            logged = 0
+            for stream in list(source.iter_streams(session_id)):
+                logged += self._move_log(source, target, session_id, stream)
+            source.delete_session(session_id)
+            with store._state:
+                store._moved.add(session_id)
+        with self._mutex:
+            self.progress.moved += 1
+            self.progress.keys += len(keys)
+            self.progress.log_entries += logged
+        self._throttle(len(keys))
+
+    @staticmethod
+    def _move_log(
+        source: SessionStore, target: SessionStore, session_id: str, stream: str
+    ) -> int:
+        # Entries an interrupted move appended would otherwise be doubled
+        target.delete_log(session_id, stream)
+        query = LogQuery(stream=stream, limit=MAX_LIMIT)
+        count = 0
+        while True:
+            page = source.read_log(session_id, query)
+            if page.entries:
+                target.append(session_id, stream, [e.value for e in page.entries])
+                count += len(page.entries)
+            if page.next_cursor is None:
+                return count
+            query = replace(query, cursor=page.next_cursor)
+
+    def _throttle(self, count: int) -> None:
+        """Wait until ``count`` more keys fit the rate, or the job stops."""
+        if self.rate_limit is None:
+            return
+        with self._mutex:
+            now = time.monotonic()
+            start = max(self._next_at, now)
+            self._next_at = start + count / self.rate_limit
+        if start > now:
+            self._stop.wait(start - now)
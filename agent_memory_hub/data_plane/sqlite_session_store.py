@@ -0,0 +1,1295 @@
+"""
+SQLite session store implementation for single-node deployments.
+"""
+import contextlib
+import json
+import sqlite3
+import threading
+import time
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+from agent_memory_hub.config.sqlite_config import SQLiteConfig
+from agent_memory_hub.data_plane.adk_session_store import (
+    MISSING_VERSION,
+    SessionStore,
+    StoredEntry,
+    VersionConflictError,
+    entry_version,
+)
+from agent_memory_hub.data_plane.patch import MemoryPatch
+from agent_memory_hub.indexing.episode_log import (
+    LogEntry,
+    LogPage,
+    LogQuery,
+    next_log_cursor,
+)
+from agent_memory_hub.indexing.query import (
+    RANK_ORDERS,
+    IndexRecord,
+    MemoryQuery,
+    QueryPage,
+    RankQuery,
+    TriplePattern,
+    fetch_page,
+    index_record,
+    next_cursor,
+    next_rank_cursor,
+    next_triple_cursor,
+    rank_order,
+    rank_value,
+    ranked_record,
+)
+from agent_memory_hub.utils.telemetry import get_tracer
+
+# Statements are constant strings so each connection's statement cache
+# prepares them once and reuses them.
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS memory_entries (
+        session_id TEXT NOT NULL,
+        key TEXT NOT NULL,
+        value TEXT NOT NULL,
+        created_at REAL NOT NULL,
+        expires_at REAL,
+        PRIMARY KEY (session_id, key)
+    ) WITHOUT ROWID
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS idx_memory_entries_expires_at
+    ON memory_entries (expires_at) WHERE expires_at IS NOT NULL
+    """,
+    # Secondary index over memory models (see query())
+    """
+    CREATE TABLE IF NOT EXISTS memory_index (
+        session_id TEXT NOT NULL,
+        key TEXT NOT NULL,
+        memory_type TEXT NOT NULL,
+        scope TEXT,
+        created_ts REAL NOT NULL,
+        PRIMARY KEY (session_id, key)
+    ) WITHOUT ROWID
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS idx_memory_index_created
+    ON memory_index (session_id, created_ts, key)
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS idx_memory_index_type
+    ON memory_index (session_id, memory_type, created_ts, key)
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS idx_memory_index_scope
+    ON memory_index (session_id, scope, created_ts, key)
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS memory_index_tags (
+        session_id TEXT NOT NULL,
+        key TEXT NOT NULL,
+        tag TEXT NOT NULL,
+        PRIMARY KEY (session_id, key, tag)
+    ) WITHOUT ROWID
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS idx_memory_index_tags_tag
+    ON memory_index_tags (session_id, tag, key)
+    """,
+    # Semantic triples (see match_triples()); each pattern's bound terms are
+    # a prefix of one of the SPO/POS/OSP indexes
+    """
+    CREATE TABLE IF NOT EXISTS memory_triples (
+        session_id TEXT NOT NULL,
+        key TEXT NOT NULL,
+        subject TEXT NOT NULL,
+        predicate TEXT NOT NULL,
+        object TEXT NOT NULL,
+        truth_score REAL NOT NULL,
+        PRIMARY KEY (session_id, key)
+    ) WITHOUT ROWID
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS idx_memory_triples_spo
+    ON memory_triples (session_id, subject, predicate, object)
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS idx_memory_triples_pos
+    ON memory_triples (session_id, predicate, object, subject)
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS idx_memory_triples_osp
+    ON memory_triples (session_id, object, subject, predicate)
+    """,
+    # Importance and recency orders (see rank()); one row per order, scored
+    # by the negated value so each index is read forward from the cursor
+    """
+    CREATE TABLE IF NOT EXISTS memory_ranks (
+        session_id TEXT NOT NULL,
+        rank_by TEXT NOT NULL,
+        key TEXT NOT NULL,
+        memory_type TEXT NOT NULL,
+        scope TEXT,
+        score REAL NOT NULL,
+        PRIMARY KEY (session_id, rank_by, key)
+    ) WITHOUT ROWID
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS idx_memory_ranks_all
+    ON memory_ranks (session_id, rank_by, score, key)
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS idx_memory_ranks_type
+    ON memory_ranks (session_id, rank_by, memory_type, score, key)
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS idx_memory_ranks_scope
+    ON memory_ranks (session_id, rank_by, scope, score, key)
+    """,
+    # Append-only log streams (see append()); append times never decrease
+    # along seq, so (ts, seq) orders a stream and serves time ranges
+    """
+    CREATE TABLE IF NOT EXISTS memory_log (
+        session_id TEXT NOT NULL,
+        stream TEXT NOT NULL,
+        seq INTEGER NOT NULL,
+        ts REAL NOT NULL,
+        value TEXT NOT NULL,
+        PRIMARY KEY (session_id, stream, seq)
+    ) WITHOUT ROWID
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS idx_memory_log_ts
+    ON memory_log (session_id, stream, ts, seq)
+    """,
+)
+_UPSERT = """
+    INSERT INTO memory_entries (session_id, key, value, created_at, expires_at)
+    VALUES (?, ?, ?, ?, ?)
+    ON CONFLICT (session_id, key) DO UPDATE SET
+        value = excluded.value,
+        created_at = excluded.created_at,
+        expires_at = excluded.expires_at
+"""
+_SELECT = """
+    SELECT value, expires_at FROM memory_entries
+    WHERE session_id = ? AND key = ?
+"""
+_SELECT_VERSIONED = """
+    SELECT value, created_at, expires_at FROM memory_entries
+    WHERE session_id = ? AND key = ?
+"""
+# Keys are bound as one JSON array so the statement stays constant
+_SELECT_MANY = """
+    SELECT key, value, expires_at FROM memory_entries
+    WHERE session_id = ? AND key IN (SELECT value FROM json_each(?))
+"""
+_SELECT_ENTRIES = """
+    SELECT key, value, created_at, expires_at FROM memory_entries
+    WHERE session_id = ? AND key IN (SELECT value FROM json_each(?))
+"""
+# One primary key seek per session
+_NEXT_SESSION = """
+    SELECT session_id FROM memory_entries WHERE session_id > ?
+    ORDER BY session_id LIMIT 1
+"""
+_SELECT_SESSION = """
+    SELECT key, value, expires_at FROM memory_entries
+    WHERE session_id = ? AND substr(key, 1, ?) = ?
+"""
+# Keyset pages of a session's live keys; the first page includes the prefix
+_SELECT_KEYS = """
+    SELECT key FROM memory_entries
+    WHERE session_id = ? AND key {} ? AND substr(key, 1, ?) = ?
+    AND (expires_at IS NULL OR expires_at > ?)
+    ORDER BY key LIMIT ?
+"""
+_SELECT_KEYS_FROM = _SELECT_KEYS.format(">=")
+_SELECT_KEYS_AFTER = _SELECT_KEYS.format(">")
+_COUNT_SESSION = """
+    SELECT count(*) FROM memory_entries
+    WHERE session_id = ? AND (expires_at IS NULL OR expires_at > ?)
+"""
+_COUNT_PREFIX = """
+    SELECT count(*) FROM memory_entries
+    WHERE session_id = ? AND substr(key, 1, ?) = ?
+    AND (expires_at IS NULL OR expires_at > ?)
+"""
+_DELETE = "DELETE FROM memory_entries WHERE session_id = ? AND key = ?"
+_DELETE_PREFIX = (
+    "DELETE FROM memory_ranks WHERE session_id = ? AND substr(key, 1, ?) = ?",
+    "DELETE FROM memory_triples WHERE session_id = ? AND substr(key, 1, ?) = ?",
+    "DELETE FROM memory_index_tags WHERE session_id = ? AND substr(key, 1, ?) = ?",
+    "DELETE FROM memory_index WHERE session_id = ? AND substr(key, 1, ?) = ?",
+    "DELETE FROM memory_entries WHERE session_id = ? AND substr(key, 1, ?) = ?",
+)
+_DELETE_LOG = "DELETE FROM memory_log WHERE session_id = ? AND stream = ?"
+_SELECT_STREAMS = """
+    SELECT DISTINCT stream FROM memory_log WHERE session_id = ? ORDER BY stream
+"""
+_NEXT_LOG_SESSION = """
+    SELECT session_id FROM memory_log WHERE session_id > ?
+    ORDER BY session_id LIMIT 1
+"""
+_DELETE_SESSION = (
+    "DELETE FROM memory_ranks WHERE session_id = ?",
+    "DELETE FROM memory_triples WHERE session_id = ?",
+    "DELETE FROM memory_index_tags WHERE session_id = ?",
+    "DELETE FROM memory_index WHERE session_id = ?",
+    "DELETE FROM memory_log WHERE session_id = ?",
+    "DELETE FROM memory_entries WHERE session_id = ?",
+)
+_UNINDEX = "DELETE FROM memory_index WHERE session_id = ? AND key = ?"
+_UNINDEX_TAGS = "DELETE FROM memory_index_tags WHERE session_id = ? AND key = ?"
+_UNINDEX_TRIPLE = "DELETE FROM memory_triples WHERE session_id = ? AND key = ?"
+_UNINDEX_RANKS = "DELETE FROM memory_ranks WHERE session_id = ? AND key = ?"
+_INDEX = """
+    INSERT INTO memory_index (session_id, key, memory_type, scope, created_ts)
+    VALUES (?, ?, ?, ?, ?)
+"""
+_INDEX_TAG = """
+    INSERT OR IGNORE INTO memory_index_tags (session_id, key, tag) VALUES (?, ?, ?)
+"""
+_INDEX_TRIPLE = """
+    INSERT INTO memory_triples
+        (session_id, key, subject, predicate, object, truth_score)
+    VALUES (?, ?, ?, ?, ?, ?)
+"""
+_INDEX_RANK = """
+    INSERT INTO memory_ranks (session_id, rank_by, key, memory_type, scope, score)
+    VALUES (?, ?, ?, ?, ?, ?)
+"""
+_LOG_HEAD = """
+    SELECT seq, ts FROM memory_log WHERE session_id = ? AND stream = ?
+    ORDER BY seq DESC LIMIT 1
+"""
+_LOG_APPEND = """
+    INSERT INTO memory_log (session_id, stream, seq, ts, value) VALUES (?, ?, ?, ?, ?)
+"""
+_LOG_TRIM = "DELETE FROM memory_log WHERE session_id = ? AND stream = ? AND seq <= ?"
+_DELETE_EXPIRED_LOG = """
+    DELETE FROM memory_log WHERE ts < :cutoff AND (:sid IS NULL OR session_id = :sid)
+"""
+_DELETE_EXPIRED = (
+    """
+    DELETE FROM memory_ranks WHERE (session_id, key) IN (
+        SELECT session_id, key FROM memory_entries
+        WHERE expires_at IS NOT NULL AND expires_at <= :now
+        AND (:sid IS NULL OR session_id = :sid)
+    )
+    """,
+    """
+    DELETE FROM memory_triples WHERE (session_id, key) IN (
+        SELECT session_id, key FROM memory_entries
+        WHERE expires_at IS NOT NULL AND expires_at <= :now
+        AND (:sid IS NULL OR session_id = :sid)
+    )
+    """,
+    """
+    DELETE FROM memory_index_tags WHERE (session_id, key) IN (
+        SELECT session_id, key FROM memory_entries
+        WHERE expires_at IS NOT NULL AND expires_at <= :now
+        AND (:sid IS NULL OR session_id = :sid)
+    )
+    """,
+    """
+    DELETE FROM memory_index WHERE (session_id, key) IN (
+        SELECT session_id, key FROM memory_entries
+        WHERE expires_at IS NOT NULL AND expires_at <= :now
+        AND (:sid IS NULL OR session_id = :sid)
+    )
+    """,
+    """
+    DELETE FROM memory_entries
+    WHERE expires_at IS NOT NULL AND expires_at <= :now
+    AND (:sid IS NULL OR session_id = :sid)
+    """,
+)
+
+
+class SQLiteSessionStore(SessionStore):
+    """
+    SQLite-based session store using one row per (session, key).
+
+    The database runs in WAL mode so readers never block the writer. Each
+    thread gets its own connection (SQLite connections are not meant to be
+    shared); ``:memory:`` databases use a single connection guarded by a lock
+    instead, since every connection would otherwise see its own database.
+    ``write_many`` writes a batch of keys in one transaction.
+    """
+
+    atomic_writes = True
+
+    def __init__(
+        self,
+        config: Optional[SQLiteConfig] = None,
+        ttl_seconds: Optional[int] = None,
+    ):
+        """
+        Initialize the SQLite session store.
+
+        Args:
+            config: Database configuration (defaults if omitted)
+            ttl_seconds: Default TTL for entries (None = no expiry)
+        """
+        self.config = config or SQLiteConfig()
+        self.ttl_seconds = ttl_seconds
+        self._tracer = get_tracer()
+        self._local = threading.local()
+        self._shared: Optional[sqlite3.Connection] = None
+        self._lock: Any = contextlib.nullcontext()
+        if self.config.path == ":memory:":
+            self._shared = self._connect()
+            self._lock = threading.RLock()
+        self._init_schema()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            self.config.path,
+            timeout=self.config.busy_timeout_ms / 1000.0,
+            isolation_level=None,  # explicit BEGIN/COMMIT below
+            check_same_thread=self.config.path != ":memory:",
+            cached_statements=128,
+        )
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(f"PRAGMA synchronous={self.config.synchronous}")
+        conn.execute(f"PRAGMA busy_timeout={int(self.config.busy_timeout_ms)}")
+        conn.execute(f"PRAGMA cache_size=-{int(self.config.cache_size_kib)}")
+        return conn
+
+    def _conn(self) -> sqlite3.Connection:
+        if self._shared is not None:
+            return self._shared
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = self._connect()
+        return conn
+
+    def _init_schema(self) -> None:
+        with self._lock:
+            conn = self._conn()
+            for statement in _SCHEMA:
+                conn.execute(statement)
+
+    def _expires_at(self, now: float) -> Optional[float]:
+        if self.ttl_seconds is None:
+            return None
+        return now + self.ttl_seconds
+
+    def _execute_write(
+        self,
+        statements: Union[
+            List[Tuple[str, list]],
+            Callable[[sqlite3.Connection], List[Tuple[str, list]]],
+        ],
+        check: Optional[Callable[[sqlite3.Connection], None]] = None,
+    ) -> List[int]:
+        """
+        Run ``(sql, rows)`` batches in one transaction; returns rowcounts.
+        ``check`` runs first inside the transaction and may raise to abort.
+        ``statements`` may be a callable building the batches from what
+        the transaction reads.
+        """
+        conn = self._conn()
+        with self._lock:
+            # IMMEDIATE takes the write lock up front instead of upgrading
+            # mid-transaction, which avoids SQLITE_BUSY deadlocks.
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                if check is not None:
+                    check(conn)
+                if callable(statements):
+                    statements = statements(conn)
+                counts = [
+                    conn.executemany(sql, rows).rowcount for sql, rows in statements
+                ]
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+            return counts
+
+    @staticmethod
+    def _write_statements(
+        session_id: str, rows: List[tuple], values: Dict[str, Any]
+    ) -> List[Tuple[str, list]]:
+        """Upsert rows plus the matching secondary index maintenance."""
+        keys = [(session_id, key) for key in values]
+        index_rows, tag_rows, triple_rows, rank_rows = [], [], [], []
+        for key, value in values.items():
+            record = index_record(key, value)
+            if record is None:
+                continue
+            index_rows.append(
+                (session_id, key, record.memory_type, record.scope, record.created_ts)
+            )
+            tag_rows.extend((session_id, key, tag) for tag in record.tags)
+            if record.is_triple:
+                triple_rows.append((
+                    session_id, key, record.subject, record.predicate,
+                    record.object, record.truth_score,
+                ))
+            rank_rows.extend(
+                (
+                    session_id, by, key, record.memory_type, record.scope,
+                    rank_order(record, by)[0],
+                )
+                for by in RANK_ORDERS
+                if rank_value(record, by) is not None
+            )
+        return [
+            (_UPSERT, rows),
+            (_UNINDEX, keys),
+            (_UNINDEX_TAGS, keys),
+            (_UNINDEX_TRIPLE, keys),
+            (_UNINDEX_RANKS, keys),
+            (_INDEX, index_rows),
+            (_INDEX_TAG, tag_rows),
+            (_INDEX_TRIPLE, triple_rows),
+            (_INDEX_RANK, rank_rows),
+        ]
+
+    def write(self, session_id: str, key: str, value: Any) -> None:
+        """
+        Write a value to SQLite.
+
+        Args:
+            session_id: Session identifier
+            key: Memory key
+            value: JSON-serializable value to store
+        """
+        with self._tracer.start_as_current_span("SQLiteSessionStore.write") as span:
+            span.set_attribute("session.id", session_id)
+            span.set_attribute("memory.key", key)
+
+            now = time.time()
+            row = (session_id, key, json.dumps(value), now, self._expires_at(now))
+            self._execute_write(
+                self._write_statements(session_id, [row], {key: value})
+            )
+
+    def write_many(self, session_id: str, items: Dict[str, Any]) -> None:
+        """
+        Write several keys of one session in a single transaction.
+
+        Args:
+            session_id: Session identifier
+            items: Mapping of memory key to value
+        """
+        with self._tracer.start_as_current_span(
+            "SQLiteSessionStore.write_many"
+        ) as span:
+            span.set_attribute("session.id", session_id)
+            span.set_attribute("memory.count", len(items))
+
+            now = time.time()
+            expires_at = self._expires_at(now)
+            rows = [
+                (session_id, key, json.dumps(value), now, expires_at)
+                for key, value in items.items()
+            ]
+            if rows:
+                self._execute_write(self._write_statements(session_id, rows, items))
+
+    @staticmethod
+    def _version(row: Optional[tuple], now: float) -> str:
+        """Version token of a ``(value, created_at, expires_at)`` row."""
+        if row is None or (row[2] is not None and now >= row[2]):
+            return MISSING_VERSION
+        return entry_version(f"{row[1]!r}:{row[0]}")
+
+    def read_versioned(self, session_id: str, key: str) -> Tuple[Optional[Any], str]:
+        """
+        Read a value with its version token (a digest of the stored row).
+
+        Args:
+            session_id: Session identifier
+            key: Memory key
+
+        Returns:
+            The value (None if not found or expired) and its version token
+        """
+        with self._tracer.start_as_current_span(
+            "SQLiteSessionStore.read_versioned"
+        ) as span:
+            span.set_attribute("session.id", session_id)
+            span.set_attribute("memory.key", key)
+
+            conn = self._conn()
+            with self._lock:
+                row = conn.execute(_SELECT_VERSIONED, (session_id, key)).fetchone()
+            version = self._version(row, time.time())
+            if version == MISSING_VERSION:
+                return None, version
+            return json.loads(row[0]), version
+
+    def write_versioned(
+        self, session_id: str, key: str, value: Any, if_version: str
+    ) -> str:
+        """
+        Write a value if the key is still at ``if_version``, checked inside
+        the write transaction.
+
+        Args:
+            session_id: Session identifier
+            key: Memory key
+            value: JSON-serializable value to store
+            if_version: Expected version token
+
+        Returns:
+            The new version token
+
+        Raises:
+            VersionConflictError: If the key is at another version
+        """
+        with self._tracer.start_as_current_span(
+            "SQLiteSessionStore.write_versioned"
+        ) as span:
+            span.set_attribute("session.id", session_id)
+            span.set_attribute("memory.key", key)
+
+            now = time.time()
+            row = (session_id, key, json.dumps(value), now, self._expires_at(now))
+
+            def check(conn: sqlite3.Connection) -> None:
+                current = self._version(
+                    conn.execute(_SELECT_VERSIONED, (session_id, key)).fetchone(), now
+                )
+                if current != if_version:
+                    raise VersionConflictError(key, if_version, current)
+
+            self._execute_write(
+                self._write_statements(session_id, [row], {key: value}), check
+            )
+            return self._version(row[2:], now)
+
+    def patch(self, session_id: str, key: str, patch: MemoryPatch) -> Any:
+        """
+        Apply a partial update to a stored dict value inside one write
+        transaction.
+
+        Args:
+            session_id: Session identifier
+            key: Memory key
+            patch: Fields to set and increment
+
+        Returns:
+            The patched value
+
+        Raises:
+            KeyError: If the key does not exist
+            TypeError: If the patch does not fit the stored value
+        """
+        with self._tracer.start_as_current_span("SQLiteSessionStore.patch") as span:
+            span.set_attribute("session.id", session_id)
+            span.set_attribute("memory.key", key)
+
+            now = time.time()
+            patched = {}
+
+            def statements(conn: sqlite3.Connection) -> List[Tuple[str, list]]:
+                row = conn.execute(_SELECT_VERSIONED, (session_id, key)).fetchone()
+                if self._version(row, now) == MISSING_VERSION:
+                    raise KeyError(key)
+                patched[key] = patch.apply(json.loads(row[0]))
+                new_row = (
+                    session_id, key, json.dumps(patched[key]), now,
+                    self._expires_at(now),
+                )
+                return self._write_statements(session_id, [new_row], patched)
+
+            self._execute_write(statements)
+            return patched[key]
+
+    def read(self, session_id: str, key: str) -> Optional[Any]:
+        """
+        Read a value from SQLite.
+
+        Args:
+            session_id: Session identifier
+            key: Memory key
+
+        Returns:
+            Stored value or None if not found or expired
+        """
+        with self._tracer.start_as_current_span("SQLiteSessionStore.read") as span:
+            span.set_attribute("session.id", session_id)
+            span.set_attribute("memory.key", key)
+
+            conn = self._conn()
+            with self._lock:
+                row = conn.execute(_SELECT, (session_id, key)).fetchone()
+            if row is None:
+                return None
+            serialized, expires_at = row
+            if expires_at is not None and time.time() >= expires_at:
+                # Expired rows are removed by cleanup_expired()
+                span.set_attribute("memory.expired", True)
+                return None
+            return json.loads(serialized)
+
+    def read_many(self, session_id: str, keys: Sequence[str]) -> List[Optional[Any]]:
+        """
+        Read several values of one session with a single SELECT.
+
+        Args:
+            session_id: Session identifier
+            keys: Memory keys
+
+        Returns:
+            Stored values aligned with ``keys`` (None if not found or expired)
+        """
+        if not keys:
+            return []
+        with self._tracer.start_as_current_span(
+            "SQLiteSessionStore.read_many"
+        ) as span:
+            span.set_attribute("session.id", session_id)
+            span.set_attribute("memory.count", len(keys))
+
+            conn = self._conn()
+            with self._lock:
+                rows = conn.execute(
+                    _SELECT_MANY, (session_id, json.dumps(list(keys)))
+                ).fetchall()
+            now = time.time()
+            found = {
+                key: serialized
+                for key, serialized, expires_at in rows
+                if expires_at is None or now < expires_at
+            }
+            return [
+                json.loads(found[key]) if key in found else None for key in keys
+            ]
+
+    def read_entries(
+        self, session_id: str, keys: Sequence[str]
+    ) -> List[Optional[StoredEntry]]:
+        """
+        Read several values of one session with their write and expiry
+        times in a single SELECT.
+
+        Args:
+            session_id: Session identifier
+            keys: Memory keys
+
+        Returns:
+            Entries aligned with ``keys`` (None if not found or expired)
+        """
+        if not keys:
+            return []
+        with self._tracer.start_as_current_span(
+            "SQLiteSessionStore.read_entries"
+        ) as span:
+            span.set_attribute("session.id", session_id)
+            span.set_attribute("memory.count", len(keys))
+
+            conn = self._conn()
+            with self._lock:
+                rows = conn.execute(
+                    _SELECT_ENTRIES, (session_id, json.dumps(list(keys)))
+                ).fetchall()
+            now = time.time()
+            found = {
+                key: StoredEntry(json.loads(serialized), created_at, expires_at)
+                for key, serialized, created_at, expires_at in rows
+                if expires_at is None or now < expires_at
+            }
+            return [found.get(key) for key in keys]
+
+    def write_entries(self, session_id: str, entries: Dict[str, StoredEntry]) -> None:
+        """
+        Write several keys of one session in a single transaction, keeping
+        each entry's write and expiry times.
+
+        Args:
+            session_id: Session identifier
+            entries: Mapping of memory key to entry
+        """
+        with self._tracer.start_as_current_span(
+            "SQLiteSessionStore.write_entries"
+        ) as span:
+            span.set_attribute("session.id", session_id)
+            span.set_attribute("memory.count", len(entries))
+
+            now = time.time()
+            rows = [
+                (
+                    session_id, key, json.dumps(entry.value),
+                    entry.created_at if entry.created_at is not None else now,
+                    entry.expires_at,
+                )
+                for key, entry in entries.items()
+            ]
+            if rows:
+                values = {key: entry.value for key, entry in entries.items()}
+                self._execute_write(self._write_statements(session_id, rows, values))
+
+    def iter_sessions(self) -> Iterator[str]:
+        """
+        Stream the ids of sessions holding keys with one primary key seek
+        per session, ``KEY_BATCH`` seeks per lock hold.
+
+        Yields:
+            Session ids in lexicographic order
+        """
+        conn = self._conn()
+        after = ""
+        while True:
+            batch = []
+            with self._lock:
+                while len(batch) < self.KEY_BATCH:
+                    row = conn.execute(_NEXT_SESSION, (after,)).fetchone()
+                    if row is None:
+                        break
+                    after = row[0]
+                    batch.append(after)
+            yield from batch
+            if len(batch) < self.KEY_BATCH:
+                return
+
+    def read_session(self, session_id: str, prefix: str = "") -> Dict[str, Any]:
+        """
+        Read every key of a session starting with ``prefix`` with a single
+        SELECT over the primary key range of the session.
+
+        Args:
+            session_id: Session identifier
+            prefix: Key prefix (empty = all keys)
+
+        Returns:
+            Mapping of key to value of the live entries
+        """
+        with self._tracer.start_as_current_span(
+            "SQLiteSessionStore.read_session"
+        ) as span:
+            span.set_attribute("session.id", session_id)
+
+            conn = self._conn()
+            with self._lock:
+                rows = conn.execute(
+                    _SELECT_SESSION, (session_id, len(prefix), prefix)
+                ).fetchall()
+            now = time.time()
+            values = {
+                key: json.loads(serialized)
+                for key, serialized, expires_at in rows
+                if expires_at is None or now < expires_at
+            }
+            span.set_attribute("memory.count", len(values))
+            return values
+
+    def delete(self, session_id: str, key: str) -> bool:
+        """
+        Delete a key and its secondary index rows in one transaction.
+
+        Args:
+            session_id: Session identifier
+            key: Memory key
+
+        Returns:
+            Whether a live key was deleted
+        """
+        with self._tracer.start_as_current_span("SQLiteSessionStore.delete") as span:
+            span.set_attribute("session.id", session_id)
+            span.set_attribute("memory.key", key)
+
+            now = time.time()
+            keys = [(session_id, key)]
+            live = []
+
+            def statements(conn: sqlite3.Connection) -> List[Tuple[str, list]]:
+                row = conn.execute(_SELECT, keys[0]).fetchone()
+                live.append(row is not None and (row[1] is None or now < row[1]))
+                return [
+                    (sql, keys)
+                    for sql in (
+                        _DELETE, _UNINDEX, _UNINDEX_TAGS, _UNINDEX_TRIPLE,
+                        _UNINDEX_RANKS,
+                    )
+                ]
+
+            self._execute_write(statements)
+            return live[0]
+
+    def delete_session(self, session_id: str) -> int:
+        """
+        Delete every row of a session, from the entries, index and log
+        tables, in one transaction.
+
+        Args:
+            session_id: Session identifier
+
+        Returns:
+            Number of live keys deleted
+        """
+        with self._tracer.start_as_current_span(
+            "SQLiteSessionStore.delete_session"
+        ) as span:
+            span.set_attribute("session.id", session_id)
+
+            now = time.time()
+            live = []
+
+            def statements(conn: sqlite3.Connection) -> List[Tuple[str, list]]:
+                live.append(
+                    conn.execute(_COUNT_SESSION, (session_id, now)).fetchone()[0]
+                )
+                return [(sql, [(session_id,)]) for sql in _DELETE_SESSION]
+
+            self._execute_write(statements)
+            span.set_attribute("deleted_count", live[0])
+            return live[0]
+
+    def delete_prefix(self, session_id: str, prefix: str) -> int:
+        """
+        Delete every key of a session starting with ``prefix`` with one
+        set-based DELETE per entries and index table, in one transaction.
+
+        Args:
+            session_id: Session identifier
+            prefix: Key prefix
+
+        Returns:
+            Number of live keys deleted
+        """
+        with self._tracer.start_as_current_span(
+            "SQLiteSessionStore.delete_prefix"
+        ) as span:
+            span.set_attribute("session.id", session_id)
+
+            now = time.time()
+            params = [(session_id, len(prefix), prefix)]
+            live = []
+
+            def statements(conn: sqlite3.Connection) -> List[Tuple[str, list]]:
+                live.append(
+                    conn.execute(_COUNT_PREFIX, (*params[0], now)).fetchone()[0]
+                )
+                return [(sql, params) for sql in _DELETE_PREFIX]
+
+            self._execute_write(statements)
+            span.set_attribute("deleted_count", live[0])
+            return live[0]
+
+    def delete_log(self, session_id: str, stream: str) -> None:
+        """
+        Delete a log stream of a session with one DELETE.
+
+        Args:
+            session_id: Session identifier
+            stream: Stream name
+        """
+        with self._tracer.start_as_current_span(
+            "SQLiteSessionStore.delete_log"
+        ) as span:
+            span.set_attribute("session.id", session_id)
+            span.set_attribute("log.stream", stream)
+
+            self._execute_write([(_DELETE_LOG, [(session_id, stream)])])
+
+    def iter_streams(self, session_id: str) -> Iterator[str]:
+        """
+        List the log streams of a session with one SELECT over the primary
+        key of ``memory_log``.
+
+        Args:
+            session_id: Session identifier
+
+        Yields:
+            Stream names in lexicographic order
+        """
+        conn = self._conn()
+        with self._lock:
+            rows = conn.execute(_SELECT_STREAMS, (session_id,)).fetchall()
+        for (stream,) in rows:
+            yield stream
+
+    def iter_log_sessions(self) -> Iterator[str]:
+        """
+        Stream the ids of sessions holding log streams with one primary key
+        seek of ``memory_log`` per session, ``KEY_BATCH`` seeks per lock
+        hold.
+
+        Yields:
+            Session ids in lexicographic order
+        """
+        conn = self._conn()
+        after = ""
+        while True:
+            batch = []
+            with self._lock:
+                while len(batch) < self.KEY_BATCH:
+                    row = conn.execute(_NEXT_LOG_SESSION, (after,)).fetchone()
+                    if row is None:
+                        break
+                    after = row[0]
+                    batch.append(after)
+            yield from batch
+            if len(batch) < self.KEY_BATCH:
+                return
+
+    def iter_keys(self, session_id: str, prefix: str = "") -> Iterator[str]:
+        """
+        Stream the live keys of a session starting with ``prefix`` in
+        keyset-paginated SELECTs over the primary key.
+
+        Args:
+            session_id: Session identifier
+            prefix: Key prefix (empty = all keys)
+
+        Yields:
+            Keys in lexicographic order
+        """
+        conn = self._conn()
+        sql, after = _SELECT_KEYS_FROM, prefix
+        while True:
+            with self._lock:
+                rows = conn.execute(
+                    sql,
+                    (
+                        session_id, after, len(prefix), prefix, time.time(),
+                        self.KEY_BATCH,
+                    ),
+                ).fetchall()
+            for (key,) in rows:
+                yield key
+            if len(rows) < self.KEY_BATCH:
+                return
+            sql, after = _SELECT_KEYS_AFTER, rows[-1][0]
+
+    def query(self, session_id: str, query: MemoryQuery) -> QueryPage:
+        """
+        List the memory models of a session matching ``query`` using the
+        ``memory_index`` tables and keyset pagination.
+
+        Args:
+            session_id: Session identifier
+            query: Filter and pagination
+
+        Returns:
+            One page of matching memories, oldest first
+        """
+        with self._tracer.start_as_current_span("SQLiteSessionStore.query") as span:
+            span.set_attribute("session.id", session_id)
+
+            # Only constant fragments are concatenated; values are bound.
+            sql = [
+                "SELECT i.key, i.memory_type, i.scope, i.created_ts",
+                "FROM memory_index i WHERE i.session_id = ?",
+            ]
+            params: List[Any] = [session_id]
+            if query.memory_type is not None:
+                sql.append("AND i.memory_type = ?")
+                params.append(query.memory_type)
+            if query.scope is not None:
+                sql.append("AND i.scope = ?")
+                params.append(query.scope)
+            if query.key_prefix:
+                sql.append("AND substr(i.key, 1, ?) = ?")
+                params += [len(query.key_prefix), query.key_prefix]
+            if query.since is not None:
+                sql.append("AND i.created_ts >= ?")
+                params.append(query.since_ts)
+            if query.until is not None:
+                sql.append("AND i.created_ts < ?")
+                params.append(query.until_ts)
+            after = query.after()
+            if after is not None:
+                sql.append("AND (i.created_ts, i.key) > (?, ?)")
+                params += list(after)
+            for tag in query.tags:
+                sql.append(
+                    "AND EXISTS (SELECT 1 FROM memory_index_tags t WHERE "
+                    "t.session_id = i.session_id AND t.key = i.key AND t.tag = ?)"
+                )
+                params.append(tag)
+            if query.any_tags:
+                sql.append(
+                    "AND EXISTS (SELECT 1 FROM memory_index_tags t WHERE "
+                    "t.session_id = i.session_id AND t.key = i.key "
+                    "AND t.tag IN (SELECT value FROM json_each(?)))"
+                )
+                params.append(json.dumps(list(query.any_tags)))
+            sql.append("ORDER BY i.created_ts, i.key LIMIT ?")
+            params.append(query.limit + 1)
+
+            conn = self._conn()
+            with self._lock:
+                rows = conn.execute(" ".join(sql), params).fetchall()
+            records = [
+                IndexRecord(key, memory_type, scope, (), created_ts)
+                for key, memory_type, scope, created_ts in rows
+            ]
+            page = records[: query.limit]
+            result = fetch_page(
+                page,
+                next_cursor(page, len(records) > query.limit),
+                lambda keys: self.read_many(session_id, keys),
+            )
+            span.set_attribute("query.results", len(result))
+            return result
+
+    def match_triples(self, session_id: str, pattern: TriplePattern) -> QueryPage:
+        """
+        List the SemanticMemory models of a session matching ``pattern``
+        using the ``memory_triples`` SPO/POS/OSP indexes and keyset
+        pagination.
+
+        Args:
+            session_id: Session identifier
+            pattern: Triple pattern and pagination
+
+        Returns:
+            One page of matching memories, highest truth_score first
+        """
+        with self._tracer.start_as_current_span(
+            "SQLiteSessionStore.match_triples"
+        ) as span:
+            span.set_attribute("session.id", session_id)
+
+            # Only constant fragments are concatenated; values are bound.
+            sql = [
+                "SELECT t.key, t.subject, t.predicate, t.object, t.truth_score",
+                "FROM memory_triples t WHERE t.session_id = ?",
+            ]
+            params: List[Any] = [session_id]
+            for fragment, term in (
+                ("AND t.subject = ?", pattern.subject),
+                ("AND t.predicate = ?", pattern.predicate),
+                ("AND t.object = ?", pattern.object),
+            ):
+                if term is not None:
+                    sql.append(fragment)
+                    params.append(term)
+            if pattern.key_prefix:
+                sql.append("AND substr(t.key, 1, ?) = ?")
+                params += [len(pattern.key_prefix), pattern.key_prefix]
+            after = pattern.after()
+            if after is not None:
+                sql.append("AND (-t.truth_score, t.key) > (?, ?)")
+                params += list(after)
+            sql.append("ORDER BY t.truth_score DESC, t.key LIMIT ?")
+            params.append(pattern.limit + 1)
+
+            conn = self._conn()
+            with self._lock:
+                rows = conn.execute(" ".join(sql), params).fetchall()
+            records = [
+                IndexRecord(
+                    key, "SemanticMemory", None, (), 0.0,
+                    subject, predicate, obj, truth_score,
+                )
+                for key, subject, predicate, obj, truth_score in rows
+            ]
+            page = records[: pattern.limit]
+            result = fetch_page(
+                page,
+                next_triple_cursor(page, len(records) > pattern.limit),
+                lambda keys: self.read_many(session_id, keys),
+            )
+            span.set_attribute("query.results", len(result))
+            return result
+
+    def rank(self, session_id: str, query: RankQuery) -> QueryPage:
+        """
+        List the top memory models of a session by importance or recency
+        with one ordered range read of a ``memory_ranks`` index.
+
+        Args:
+            session_id: Session identifier
+            query: Order, filters and pagination
+
+        Returns:
+            One page of memories, highest value first
+        """
+        with self._tracer.start_as_current_span("SQLiteSessionStore.rank") as span:
+            span.set_attribute("session.id", session_id)
+
+            # Only constant fragments are concatenated; values are bound.
+            sql = [
+                "SELECT r.key, r.memory_type, r.scope, r.score",
+                "FROM memory_ranks r WHERE r.session_id = ? AND r.rank_by = ?",
+            ]
+            params: List[Any] = [session_id, query.by]
+            if query.memory_type is not None:
+                sql.append("AND r.memory_type = ?")
+                params.append(query.memory_type)
+            if query.scope is not None:
+                sql.append("AND r.scope = ?")
+                params.append(query.scope)
+            if query.key_prefix:
+                sql.append("AND substr(r.key, 1, ?) = ?")
+                params += [len(query.key_prefix), query.key_prefix]
+            after = query.after()
+            if after is not None:
+                sql.append("AND (r.score, r.key) > (?, ?)")
+                params += list(after)
+            sql.append("ORDER BY r.score, r.key LIMIT ?")
+            params.append(query.limit + 1)
+
+            conn = self._conn()
+            with self._lock:
+                rows = conn.execute(" ".join(sql), params).fetchall()
+            records = [
+                ranked_record(key, memory_type, scope, query.by, score)
+                for key, memory_type, scope, score in rows
+            ]
+            page = records[: query.limit]
+            result = fetch_page(
+                page,
+                next_rank_cursor(page, len(records) > query.limit, query.by),
+                lambda keys: self.read_many(session_id, keys),
+            )
+            span.set_attribute("query.results", len(result))
+            return result
+
+    def append(
+        self,
+        session_id: str,
+        stream: str,
+        values: Sequence[Any],
+        max_len: Optional[int] = None,
+    ) -> List[LogEntry]:
+        """
+        Append values to a log stream of the session in one transaction.
+
+        Args:
+            session_id: Session identifier
+            stream: Stream name
+            values: JSON-serializable values to append, in order
+            max_len: Keep only the newest ``max_len`` entries (None = all)
+
+        Returns:
+            The appended entries
+        """
+        with self._tracer.start_as_current_span("SQLiteSessionStore.append") as span:
+            span.set_attribute("session.id", session_id)
+            span.set_attribute("log.stream", stream)
+            span.set_attribute("memory.count", len(values))
+
+            serialized = [json.dumps(value) for value in values]
+            conn = self._conn()
+            with self._lock:
+                conn.execute("BEGIN IMMEDIATE")
+                try:
+                    head = conn.execute(_LOG_HEAD, (session_id, stream)).fetchone()
+                    last_seq, last_ts = head if head is not None else (0, 0.0)
+                    ts = max(time.time(), last_ts)
+                    rows = [
+                        (session_id, stream, last_seq + i, ts, data)
+                        for i, data in enumerate(serialized, start=1)
+                    ]
+                    conn.executemany(_LOG_APPEND, rows)
+                    if max_len is not None:
+                        conn.execute(
+                            _LOG_TRIM,
+                            (session_id, stream, last_seq + len(rows) - max_len),
+                        )
+                except BaseException:
+                    conn.execute("ROLLBACK")
+                    raise
+                conn.execute("COMMIT")
+            return [
+                LogEntry(str(row[2]), ts, value)
+                for row, value in zip(rows, values, strict=True)
+            ]
+
+    def read_log(self, session_id: str, query: LogQuery) -> LogPage:
+        """
+        Read one page of a log stream of the session with a keyset range
+        read of the ``(ts, seq)`` index.
+
+        Args:
+            session_id: Session identifier
+            query: Stream, time range, direction and pagination
+
+        Returns:
+            One page of entries, in read order
+        """
+        with self._tracer.start_as_current_span("SQLiteSessionStore.read_log") as span:
+            span.set_attribute("session.id", session_id)
+            span.set_attribute("log.stream", query.stream)
+
+            # Only constant fragments are concatenated; values are bound.
+            sql = [
+                "SELECT seq, ts, value FROM memory_log",
+                "WHERE session_id = ? AND stream = ?",
+            ]
+            params: List[Any] = [session_id, query.stream]
+            low, high = query.bounds(self.ttl_seconds, time.time())
+            if low is not None:
+                sql.append("AND ts >= ?")
+                params.append(low)
+            if high is not None:
+                sql.append("AND ts < ?")
+                params.append(high)
+            after = query.after()
+            if after is not None:
+                sql.append(
+                    "AND (ts, seq) < (?, ?)" if query.reverse
+                    else "AND (ts, seq) > (?, ?)"
+                )
+                params += [after[0], int(after[1])]
+            sql.append(
+                "ORDER BY ts DESC, seq DESC LIMIT ?" if query.reverse
+                else "ORDER BY ts, seq LIMIT ?"
+            )
+            params.append(query.limit + 1)
+
+            conn = self._conn()
+            with self._lock:
+                rows = conn.execute(" ".join(sql), params).fetchall()
+            entries = [
+                LogEntry(str(seq), ts, json.loads(value))
+                for seq, ts, value in rows[: query.limit]
+            ]
+            span.set_attribute("query.results", len(entries))
+            return LogPage(
+                entries, next_log_cursor(entries, len(rows) > query.limit)
+            )
+
+    def cleanup_expired(self, session_id: Optional[str] = None) -> int:
+        """
+        Delete expired rows using the ``expires_at`` index.
+
+        Log entries appended more than ``ttl_seconds`` ago are deleted too.
+
+        Args:
+            session_id: Only clean up this session (None = all sessions)
+
+        Returns:
+            Number of rows deleted
+        """
+        with self._tracer.start_as_current_span(
+            "SQLiteSessionStore.cleanup_expired"
+        ) as span:
+            now = time.time()
+            params = [{"now": now, "sid": session_id}]
+            statements = [(sql, params) for sql in _DELETE_EXPIRED]
+            if self.ttl_seconds is not None:
+                log_params = [{"cutoff": now - self.ttl_seconds, "sid": session_id}]
+                statements.append((_DELETE_EXPIRED_LOG, log_params))
+            counts = self._execute_write(statements)
+            deleted = sum(counts[len(_DELETE_EXPIRED) - 1:])
+            span.set_attribute("deleted_count", deleted)
+            return deleted
+
+    def close(self) -> None:
+        """Close the calling thread's connection (or the shared one)."""
+        if self._shared is not None:
+            self._shared.close()
+            self._shared = None
+            return
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
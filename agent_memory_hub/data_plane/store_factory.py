@@ -1,11 +1,16 @@
 """
 Factory for creating session stores.
 """
-from typing import TYPE_CHECKING, Optional
+import dataclasses
+from typing import TYPE_CHECKING, Any, Dict, Mapping, Optional
 
 if TYPE_CHECKING:
     from agent_memory_hub.config.alloydb_config import AlloyDBConfig
+    from agent_memory_hub.config.emulator_config import EmulatorConfig
+    from agent_memory_hub.config.lmdb_config import LmdbConfig
+    from agent_memory_hub.config.memory_config import MemoryStoreConfig
     from agent_memory_hub.config.redis_config import RedisConfig
+    from agent_memory_hub.config.sqlite_config import SQLiteConfig
 
 from agent_memory_hub.data_plane.adk_session_store import AdkSessionStore, SessionStore
 
@@ -22,12 +27,21 @@ class StoreFactory:
         ttl_seconds: Optional[int] = None,
         alloydb_config: Optional["AlloyDBConfig"] = None,
         redis_config: Optional["RedisConfig"] = None,
+        dedup_threshold_bytes: Optional[int] = None,
+        emulator_config: Optional["EmulatorConfig"] = None,
+        memory_config: Optional["MemoryStoreConfig"] = None,
+        sqlite_config: Optional["SQLiteConfig"] = None,
+        lmdb_config: Optional["LmdbConfig"] = None,
+        migrate_from: Optional[str] = None,
+        migration_phase: str = "dual_write",
+        shards: Optional[Mapping[str, Dict[str, Any]]] = None,
     ) -> SessionStore:
         """
         Returns a session store instance.
         
         Args:
-            backend: Backend type ("adk" or "alloydb")
+            backend: Backend type ("adk", "alloydb", "redis", "firestore",
+                     "memory", "sqlite" or "lmdb")
             region: GCP region
             bucket_prefix: Prefix for GCS bucket names (adk backend only)
             environment: Environment for GCS bucket names (e.g., "prod", "dev")
@@ -35,16 +49,151 @@ class StoreFactory:
             alloydb_config: AlloyDB configuration (required for alloydb backend)
             redis_config: Redis configuration (optional for redis backend, 
                           else from env)
+            dedup_threshold_bytes: If set, wrap the store in a content-addressed
+                                   layer deduplicating values at least this
+                                   large (None = disabled)
+            emulator_config: If set, connect the backend to an in-process
+                             emulator instead of the real service
+            memory_config: In-memory store configuration (optional for memory
+                           backend, else from env)
+            sqlite_config: SQLite configuration (optional for sqlite backend,
+                           else from env)
+            lmdb_config: LMDB configuration (optional for lmdb backend,
+                         else from env)
+            migrate_from: If set, the backend being migrated from; returns a
+                          store dual-writing it and ``backend`` (None =
+                          no migration)
+            migration_phase: Initial migration phase ("dual_write",
+                             "shadow_read" or "cutover")
+            shards: If set, shard name to the arguments of that shard's
+                    store (e.g. its ``redis_config``), overriding the ones
+                    above; returns a store spreading sessions over them by
+                    consistent hashing. A shard's ``region`` must equal
+                    ``region`` (None = one unsharded store)
         """
+        if migrate_from is not None:
+            from agent_memory_hub.data_plane.migrating_session_store import (
+                MigratingSessionStore,
+            )
+
+            if migrate_from == backend:
+                raise ValueError("migrate_from must differ from backend")
+            params = dict(
+                region=region,
+                bucket_prefix=bucket_prefix,
+                environment=environment,
+                ttl_seconds=ttl_seconds,
+                alloydb_config=alloydb_config,
+                redis_config=redis_config,
+                dedup_threshold_bytes=dedup_threshold_bytes,
+                emulator_config=emulator_config,
+                memory_config=memory_config,
+                sqlite_config=sqlite_config,
+                lmdb_config=lmdb_config,
+            )
+            return MigratingSessionStore(
+                source=StoreFactory.get_store(backend=migrate_from, **params),
+                target=StoreFactory.get_store(
+                    backend=backend, shards=shards, **params
+                ),
+                phase=migration_phase,
+            )
+
+        if shards is not None:
+            from agent_memory_hub.data_plane.sharded_session_store import (
+                ShardedSessionStore,
+            )
+
+            params = dict(
+                backend=backend,
+                region=region,
+                bucket_prefix=bucket_prefix,
+                environment=environment,
+                ttl_seconds=ttl_seconds,
+                alloydb_config=alloydb_config,
+                redis_config=redis_config,
+                dedup_threshold_bytes=dedup_threshold_bytes,
+                emulator_config=emulator_config,
+                memory_config=memory_config,
+                sqlite_config=sqlite_config,
+                lmdb_config=lmdb_config,
+            )
+            return ShardedSessionStore(
+                shards={
+                    name: StoreFactory.get_store(**{**params, **overrides})
+                    for name, overrides in shards.items()
+                },
+                region=region,
+                regions={
+                    name: overrides.get("region", region)
+                    for name, overrides in shards.items()
+                },
+            )
+
+        if dedup_threshold_bytes is not None:
+            from agent_memory_hub.data_plane.content_addressed_store import (
+                ContentAddressedStore,
+            )
+
+            params = dict(
+                backend=backend,
+                region=region,
+                bucket_prefix=bucket_prefix,
+                environment=environment,
+                alloydb_config=alloydb_config,
+                redis_config=redis_config,
+                emulator_config=emulator_config,
+                sqlite_config=sqlite_config,
+                lmdb_config=lmdb_config,
+            )
+            blob_memory_config = memory_config
+            if memory_config is not None and memory_config.snapshot_path:
+                # Separate in-memory stores must not share a snapshot file
+                blob_memory_config = dataclasses.replace(
+                    memory_config, snapshot_path=memory_config.snapshot_path + ".cas"
+                )
+            # Blobs outlive any single reference; GC owns their lifetime.
+            return ContentAddressedStore(
+                inner=StoreFactory.get_store(
+                    ttl_seconds=ttl_seconds, memory_config=memory_config, **params
+                ),
+                blob_store=StoreFactory.get_store(
+                    ttl_seconds=None, memory_config=blob_memory_config, **params
+                ),
+                threshold_bytes=dedup_threshold_bytes,
+            )
+
         if backend == "adk":
             # Convention: memory-hub-{region}-prod or similar. 
             # Simplified for this example.
             bucket_name = f"{bucket_prefix}-{region}-{environment}"
+            client = None
+            if emulator_config is not None:
+                from agent_memory_hub import emulators
+
+                client = emulators.storage_client(emulator_config)
             return AdkSessionStore(
-                bucket_name=bucket_name, region=region, ttl_seconds=ttl_seconds
+                bucket_name=bucket_name,
+                region=region,
+                ttl_seconds=ttl_seconds,
+                client=client,
             )
         
         if backend == "alloydb":
+            from agent_memory_hub.config.alloydb_config import AlloyDBConfig
+
+            engine = None
+            if emulator_config is not None:
+                from agent_memory_hub import emulators
+
+                engine = emulators.sqlite_engine(emulator_config)
+                alloydb_config = alloydb_config or AlloyDBConfig(
+                    instance_connection_name="emulator",
+                    database=emulator_config.namespace,
+                    user="",
+                    password="",
+                    region=region,
+                )
             if alloydb_config is None:
                 raise ValueError("alloydb_config is required for alloydb backend")
             
@@ -52,7 +201,9 @@ class StoreFactory:
                 AlloyDBSessionStore,
             )
             
-            return AlloyDBSessionStore(config=alloydb_config, ttl_seconds=ttl_seconds)
+            return AlloyDBSessionStore(
+                config=alloydb_config, ttl_seconds=ttl_seconds, engine=engine
+            )
 
         if backend == "redis":
             from agent_memory_hub.config.redis_config import RedisConfig
@@ -60,6 +211,15 @@ class StoreFactory:
                 RedisSessionStore,
             )
 
+            if emulator_config is not None:
+                from agent_memory_hub import emulators
+
+                return RedisSessionStore(
+                    config=redis_config or RedisConfig(host="emulator"),
+                    ttl_seconds=ttl_seconds,
+                    client=emulators.redis_client(emulator_config),
+                )
+
             # Use provided config or fall back to env
             config = redis_config or RedisConfig.from_env()
             return RedisSessionStore(config=config, ttl_seconds=ttl_seconds)
@@ -69,8 +229,46 @@ class StoreFactory:
                 FirestoreSessionStore,
             )
             
+            client = None
+            if emulator_config is not None:
+                from agent_memory_hub import emulators
+
+                client = emulators.firestore_client(emulator_config)
             # Firestore client automatically picks up project/creds from env
-            return FirestoreSessionStore(ttl_seconds=ttl_seconds)
+            return FirestoreSessionStore(ttl_seconds=ttl_seconds, client=client)
         
+        if backend == "memory":
+            from agent_memory_hub.config.memory_config import MemoryStoreConfig
+            from agent_memory_hub.data_plane.memory_session_store import (
+                InMemorySessionStore,
+            )
+
+            return InMemorySessionStore(
+                config=memory_config or MemoryStoreConfig.from_env(),
+                ttl_seconds=ttl_seconds,
+            )
+
+        if backend == "sqlite":
+            from agent_memory_hub.config.sqlite_config import SQLiteConfig
+            from agent_memory_hub.data_plane.sqlite_session_store import (
+                SQLiteSessionStore,
+            )
+
+            return SQLiteSessionStore(
+                config=sqlite_config or SQLiteConfig.from_env(),
+                ttl_seconds=ttl_seconds,
+            )
+
+        if backend == "lmdb":
+            from agent_memory_hub.config.lmdb_config import LmdbConfig
+            from agent_memory_hub.data_plane.lmdb_session_store import (
+                LmdbSessionStore,
+            )
+
+            return LmdbSessionStore(
+                config=lmdb_config or LmdbConfig.from_env(),
+                ttl_seconds=ttl_seconds,
+            )
+
         raise ValueError(f"Unknown backend: {backend}")
 
@@ -0,0 +1,116 @@
+"""
+Deterministic in-process emulators for every storage backend.
+
+Stores created with the same ``EmulatorConfig.namespace`` talk to the same
+emulated server (shared data, latency model and rate limit), mirroring how
+several clients share one real bucket, database or Redis instance.
+"""
+import os
+import tempfile
+import threading
+from typing import Any, Callable, Dict, Tuple
+
+from agent_memory_hub.config.emulator_config import EmulatorConfig
+from agent_memory_hub.emulators.latency import (
+    EmulatorError,
+    EmulatorThrottledError,
+    EmulatorUnavailableError,
+    LatencyModel,
+)
+
+__all__ = [
+    "EmulatorError",
+    "EmulatorThrottledError",
+    "EmulatorUnavailableError",
+    "LatencyModel",
+    "storage_client",
+    "firestore_client",
+    "redis_client",
+    "sqlite_engine",
+    "reset_emulators",
+]
+
+_servers: Dict[Tuple[str, str], Tuple[Any, LatencyModel]] = {}
+_lock = threading.Lock()
+
+
+def _server(
+    config: EmulatorConfig, backend: str, make_state: Callable[[], Any]
+) -> Tuple[Any, LatencyModel]:
+    with _lock:
+        key = (config.namespace, backend)
+        if key not in _servers:
+            _servers[key] = (make_state(), LatencyModel(config))
+        return _servers[key]
+
+
+def storage_client(config: EmulatorConfig):
+    """Emulated ``google.cloud.storage.Client``."""
+    from agent_memory_hub.emulators.gcs import FakeStorageClient, _GcsState
+
+    state, latency = _server(config, "gcs", _GcsState)
+    return FakeStorageClient(latency=latency, state=state)
+
+
+def firestore_client(config: EmulatorConfig):
+    """Emulated ``google.cloud.firestore.Client``."""
+    from agent_memory_hub.emulators.firestore import (
+        FakeFirestoreClient,
+        _FirestoreState,
+    )
+
+    state, latency = _server(config, "firestore", _FirestoreState)
+    return FakeFirestoreClient(latency=latency, state=state)
+
+
+def redis_client(config: EmulatorConfig):
+    """Emulated ``redis.Redis(decode_responses=True)``."""
+    from agent_memory_hub.emulators.redis import FakeRedis, _RedisState
+
+    state, latency = _server(config, "redis", _RedisState)
+    return FakeRedis(latency=latency, state=state)
+
+
+def sqlite_engine(config: EmulatorConfig):
+    """
+    SQLAlchemy engine on SQLite standing in for AlloyDB. Every executed
+    statement passes through the namespace's latency model.
+
+    Requires the ``alloydb`` extra (SQLAlchemy).
+    """
+    from sqlalchemy import create_engine, event
+
+    def make_engine():
+        path = config.sqlite_path or os.path.join(
+            tempfile.mkdtemp(prefix="amh-emulator-"), f"{config.namespace}.db"
+        )
+        engine = create_engine(
+            f"sqlite:///{path}",
+            connect_args={"timeout": 30, "check_same_thread": False},
+        )
+
+        @event.listens_for(engine, "connect")
+        def _pragmas(dbapi_conn, _record):
+            dbapi_conn.execute("PRAGMA journal_mode=WAL")
+
+        return engine
+
+    engine, latency = _server(config, "alloydb", make_engine)
+
+    if not getattr(engine, "_amh_latency_hooked", False):
+        @event.listens_for(engine, "before_cursor_execute")
+        def _latency(conn, cursor, statement, parameters, context, executemany):
+            latency("sql.execute")
+
+        engine._amh_latency_hooked = True
+    return engine
+
+
+def reset_emulators() -> None:
+    """Drop all emulated servers and their data."""
+    with _lock:
+        for state, _ in _servers.values():
+            dispose = getattr(state, "dispose", None)
+            if dispose is not None:
+                dispose()
+        _servers.clear()
@@ -0,0 +1,371 @@
+"""
+In-process emulator of the Firestore document API subset used by
+FirestoreSessionStore.
+"""
+import copy
+import operator
+import threading
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from google.api_core.exceptions import AlreadyExists, FailedPrecondition, NotFound
+
+from agent_memory_hub.data_plane.firestore_session_store import DELETE_FIELD
+from agent_memory_hub.emulators.latency import LatencyModel
+
+
+class _FirestoreState:
+    """
+    Documents of every collection: {(collection, doc_id): fields}, and the
+    logical time each was last written (its ``update_time``).
+    """
+
+    def __init__(self):
+        self.documents: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self.update_times: Dict[Tuple[str, str], int] = {}
+        self.clock = 0
+        self.lock = threading.Lock()
+
+    def touch(self, key: Tuple[str, str]) -> None:
+        # Caller holds the lock
+        if key in self.documents:
+            self.clock += 1
+            self.update_times[key] = self.clock
+        else:
+            self.update_times.pop(key, None)
+
+    def check(self, key: Tuple[str, str], option: Optional["FakeWriteOption"]) -> None:
+        # Caller holds the lock
+        if option is not None and self.update_times.get(key) != option.last_update_time:
+            raise FailedPrecondition(f"Document was updated since {option!r}")
+
+
+class FakeWriteOption:
+    """``last_update_time`` precondition from ``client.write_option()``."""
+
+    def __init__(self, last_update_time: Optional[int]):
+        self.last_update_time = last_update_time
+
+    def __repr__(self) -> str:
+        return f"FakeWriteOption(last_update_time={self.last_update_time})"
+
+
+class FakeDocumentSnapshot:
+    def __init__(
+        self,
+        reference: "FakeDocumentReference",
+        data: Optional[Dict[str, Any]],
+        update_time: Optional[int] = None,
+    ):
+        self.reference = reference
+        self.id = reference.id
+        self.update_time = update_time
+        self._data = data
+
+    @property
+    def exists(self) -> bool:
+        return self._data is not None
+
+    def to_dict(self) -> Optional[Dict[str, Any]]:
+        return copy.deepcopy(self._data) if self._data is not None else None
+
+
+class FakeDocumentReference:
+    def __init__(self, collection: "FakeCollectionReference", document_id: str):
+        self._collection = collection
+        self.id = document_id
+
+    @property
+    def _key(self) -> Tuple[str, str]:
+        return self._collection.id, self.id
+
+    @property
+    def _state(self) -> _FirestoreState:
+        return self._collection._client._state
+
+    def get(self) -> FakeDocumentSnapshot:
+        self._collection._client._latency("firestore.get")
+        with self._state.lock:
+            data = self._state.documents.get(self._key)
+            # Updates replace top-level fields, so a shallow copy is a stable
+            # snapshot; to_dict() deep-copies outside the lock.
+            data = dict(data) if data is not None else None
+            update_time = self._state.update_times.get(self._key)
+        return FakeDocumentSnapshot(self, data, update_time)
+
+    def set(self, document_data: Dict[str, Any], merge: bool = False) -> None:
+        self._collection._client._latency("firestore.set")
+        data = _copy(document_data)
+        with self._state.lock:
+            if merge and self._key in self._state.documents:
+                current = self._state.documents[self._key]
+                _apply(current, data)
+            else:
+                self._state.documents[self._key] = {
+                    k: v for k, v in data.items() if v is not DELETE_FIELD
+                }
+            self._state.touch(self._key)
+
+    def create(self, document_data: Dict[str, Any]) -> None:
+        self._collection._client._latency("firestore.create")
+        data = _copy(document_data)
+        with self._state.lock:
+            if self._key in self._state.documents:
+                raise AlreadyExists(f"Document already exists: {self.id}")
+            self._state.documents[self._key] = data
+            self._state.touch(self._key)
+
+    def update(
+        self,
+        field_updates: Dict[str, Any],
+        option: Optional[FakeWriteOption] = None,
+    ) -> None:
+        self._collection._client._latency("firestore.update")
+        with self._state.lock:
+            current = self._state.documents.get(self._key)
+            if current is None:
+                raise NotFound(f"No document to update: {self.id}")
+            self._state.check(self._key, option)
+            _apply(current, _copy(field_updates))
+            self._state.touch(self._key)
+
+    def delete(self) -> None:
+        self._collection._client._latency("firestore.delete")
+        with self._state.lock:
+            self._state.documents.pop(self._key, None)
+            self._state.touch(self._key)
+
+
+_OPERATORS: Dict[str, Callable[[Any, Any], bool]] = {
+    "==": operator.eq,
+    "!=": operator.ne,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+    "in": lambda field, values: field in values,
+    "array_contains": lambda field, value: isinstance(field, list) and value in field,
+    "array_contains_any": lambda field, values: (
+        isinstance(field, list) and any(value in field for value in values)
+    ),
+}
+
+
+class FakeQuery:
+    """
+    Immutable query over one collection: ``where`` (FieldFilter), ascending
+    ``order_by``, ``start_after`` (dict of the order fields) and ``limit``.
+    """
+
+    def __init__(
+        self,
+        collection: "FakeCollectionReference",
+        filters: Tuple[Any, ...] = (),
+        orders: Tuple[str, ...] = (),
+        cursor: Optional[Tuple[Any, ...]] = None,
+        limit_count: Optional[int] = None,
+    ):
+        self._collection = collection
+        self._filters = filters
+        self._orders = orders
+        self._cursor = cursor
+        self._limit = limit_count
+
+    def _replace(self, **changes) -> "FakeQuery":
+        fields = {
+            "filters": self._filters,
+            "orders": self._orders,
+            "cursor": self._cursor,
+            "limit_count": self._limit,
+        }
+        fields.update(changes)
+        return FakeQuery(self._collection, **fields)
+
+    def where(self, *, filter) -> "FakeQuery":
+        if filter.op_string not in _OPERATORS:
+            raise ValueError(f"Unsupported operator: {filter.op_string}")
+        return self._replace(filters=self._filters + (filter,))
+
+    def order_by(self, field_path: str, direction: str = "ASCENDING") -> "FakeQuery":
+        if direction != "ASCENDING":
+            raise ValueError("Only ascending order is emulated")
+        return self._replace(orders=self._orders + (field_path,))
+
+    def start_after(self, document_fields: Dict[str, Any]) -> "FakeQuery":
+        return self._replace(
+            cursor=tuple(document_fields[field] for field in self._orders)
+        )
+
+    def limit(self, count: int) -> "FakeQuery":
+        return self._replace(limit_count=count)
+
+    def _matches(self, data: Dict[str, Any]) -> bool:
+        for f in self._filters:
+            if f.field_path not in data:
+                return False
+            if not _OPERATORS[f.op_string](data[f.field_path], f.value):
+                return False
+        # Like Firestore, documents missing an order field are excluded.
+        return all(field in data for field in self._orders)
+
+    def stream(self) -> Iterator[FakeDocumentSnapshot]:
+        collection = self._collection
+        collection._client._latency("firestore.query")
+        with collection._client._state.lock:
+            docs: List[Tuple[Tuple[Any, ...], str, Dict[str, Any]]] = [
+                (tuple(data[field] for field in self._orders), doc_id, dict(data))
+                for (name, doc_id), data in collection._client._state.documents.items()
+                if name == collection.id and self._matches(data)
+            ]
+        docs.sort(key=lambda doc: (doc[0], doc[1]))
+        if self._cursor is not None:
+            docs = [doc for doc in docs if doc[0] > self._cursor]
+        if self._limit is not None:
+            docs = docs[: self._limit]
+        for _, doc_id, data in docs:
+            yield FakeDocumentSnapshot(collection.document(doc_id), data)
+
+
+class FakeWriteBatch:
+    """
+    Buffers create/set/update/delete calls and applies them atomically on
+    commit.
+    """
+
+    def __init__(self, client: "FakeFirestoreClient"):
+        self._client = client
+        self._writes: List[Tuple[str, FakeDocumentReference, Any, Any]] = []
+
+    def set(
+        self,
+        reference: FakeDocumentReference,
+        document_data: Dict[str, Any],
+        merge: bool = False,
+    ) -> None:
+        self._writes.append(("set", reference, _copy(document_data), merge))
+
+    def create(
+        self, reference: FakeDocumentReference, document_data: Dict[str, Any]
+    ) -> None:
+        self._writes.append(("create", reference, _copy(document_data), False))
+
+    def update(
+        self,
+        reference: FakeDocumentReference,
+        field_updates: Dict[str, Any],
+        option: Optional[FakeWriteOption] = None,
+    ) -> None:
+        # The last element is merge for sets and the precondition for updates
+        self._writes.append(("update", reference, _copy(field_updates), option))
+
+    def delete(self, reference: FakeDocumentReference) -> None:
+        self._writes.append(("delete", reference, None, False))
+
+    def commit(self) -> None:
+        self._client._latency("firestore.commit")
+        state = self._client._state
+        with state.lock:
+            # Stage every write first so a failing one applies nothing.
+            staged: Dict[Tuple[str, str], Optional[Dict[str, Any]]] = {}
+            for op, reference, data, merge in self._writes:
+                key = reference._key
+                current = staged[key] if key in staged else state.documents.get(key)
+                if op == "delete":
+                    staged[key] = None
+                elif op == "create" and current is not None:
+                    raise AlreadyExists(f"Document already exists: {reference.id}")
+                elif op == "update" and current is None:
+                    raise NotFound(f"No document to update: {reference.id}")
+                elif op == "update" or (merge and current is not None):
+                    if op == "update":
+                        state.check(key, merge)
+                    current = dict(current)
+                    _apply(current, data)
+                    staged[key] = current
+                else:
+                    staged[key] = {
+                        k: v for k, v in data.items() if v is not DELETE_FIELD
+                    }
+            for key, document in staged.items():
+                if document is None:
+                    state.documents.pop(key, None)
+                else:
+                    state.documents[key] = document
+                state.touch(key)
+        self._writes = []
+
+
+class FakeCollectionReference:
+    def __init__(self, client: "FakeFirestoreClient", collection_id: str):
+        self._client = client
+        self.id = collection_id
+
+    def document(self, document_id: str) -> FakeDocumentReference:
+        return FakeDocumentReference(self, document_id)
+
+    def where(self, *, filter) -> FakeQuery:
+        return FakeQuery(self).where(filter=filter)
+
+    def order_by(self, field_path: str, direction: str = "ASCENDING") -> FakeQuery:
+        return FakeQuery(self).order_by(field_path, direction)
+
+    def limit(self, count: int) -> FakeQuery:
+        return FakeQuery(self).limit(count)
+
+    def list_documents(
+        self, page_size: Optional[int] = None
+    ) -> Iterator[FakeDocumentReference]:
+        self._client._latency("firestore.list_documents")
+        with self._client._state.lock:
+            doc_ids = sorted(
+                doc_id
+                for collection, doc_id in self._client._state.documents
+                if collection == self.id
+            )
+        for doc_id in doc_ids:
+            yield self.document(doc_id)
+
+    def stream(self) -> Iterator[FakeDocumentSnapshot]:
+        self._client._latency("firestore.stream")
+        with self._client._state.lock:
+            docs = sorted(
+                (doc_id, dict(data))
+                for (collection, doc_id), data in self._client._state.documents.items()
+                if collection == self.id
+            )
+        for doc_id, data in docs:
+            yield FakeDocumentSnapshot(self.document(doc_id), data)
+
+
+class FakeFirestoreClient:
+    """Stand-in for ``google.cloud.firestore.Client``."""
+
+    def __init__(
+        self,
+        latency: Optional[LatencyModel] = None,
+        state: Optional[_FirestoreState] = None,
+    ):
+        self._latency = latency or LatencyModel()
+        self._state = state or _FirestoreState()
+
+    def collection(self, collection_id: str) -> FakeCollectionReference:
+        return FakeCollectionReference(self, collection_id)
+
+    def batch(self) -> FakeWriteBatch:
+        return FakeWriteBatch(self)
+
+    def write_option(self, last_update_time: Optional[int] = None) -> FakeWriteOption:
+        return FakeWriteOption(last_update_time)
+
+
+def _copy(value: Any) -> Any:
+    # Deep copy emulating serialization, keeping sentinels identical.
+    return copy.deepcopy(value, {id(DELETE_FIELD): DELETE_FIELD})
+
+
+def _apply(document: Dict[str, Any], updates: Dict[str, Any]) -> None:
+    # Field names are treated literally (no dotted-path expansion).
+    for field_name, value in updates.items():
+        if value is DELETE_FIELD:
+            document.pop(field_name, None)
+        else:
+            document[field_name] = value
@@ -0,0 +1,154 @@
+"""
+In-process emulator of the Google Cloud Storage bucket/blob API subset used
+by AdkSessionStore.
+"""
+import threading
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+from google.api_core.exceptions import NotFound, PreconditionFailed
+
+from agent_memory_hub.emulators.latency import LatencyModel
+
+
+class _GcsState:
+    """Objects of every bucket: {(bucket, path): (data, content_type, generation)}."""
+
+    def __init__(self):
+        self.objects: Dict[Tuple[str, str], Tuple[bytes, str, int]] = {}
+        self.generation = 0
+        self.lock = threading.Lock()
+
+
+class FakeBlob:
+    def __init__(self, bucket: "FakeBucket", name: str):
+        self.bucket = bucket
+        self.name = name
+        self.generation: Optional[int] = None
+
+    @property
+    def _key(self) -> Tuple[str, str]:
+        return self.bucket.name, self.name
+
+    def _check_generation(self, if_generation_match: Optional[int]) -> None:
+        # Caller holds the state lock; generation 0 means "must not exist".
+        if if_generation_match is None:
+            return
+        entry = self.bucket._state.objects.get(self._key)
+        current = entry[2] if entry is not None else 0
+        if current != if_generation_match:
+            raise PreconditionFailed(
+                f"Generation mismatch for {self.bucket.name}/{self.name}: "
+                f"{current} != {if_generation_match}"
+            )
+
+    def upload_from_string(
+        self,
+        data,
+        content_type: str = "application/octet-stream",
+        if_generation_match: Optional[int] = None,
+    ) -> None:
+        self.bucket._latency("gcs.upload")
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        state = self.bucket._state
+        with state.lock:
+            self._check_generation(if_generation_match)
+            state.generation += 1
+            state.objects[self._key] = (bytes(data), content_type, state.generation)
+            self.generation = state.generation
+
+    def download_as_bytes(self, if_generation_match: Optional[int] = None) -> bytes:
+        self.bucket._latency("gcs.download")
+        with self.bucket._state.lock:
+            entry = self.bucket._state.objects.get(self._key)
+            if entry is not None:
+                self._check_generation(if_generation_match)
+        if entry is None:
+            raise NotFound(f"No such object: {self.bucket.name}/{self.name}")
+        self.generation = entry[2]
+        return entry[0]
+
+    def download_as_text(self, encoding: str = "utf-8") -> str:
+        return self.download_as_bytes().decode(encoding)
+
+    def exists(self) -> bool:
+        self.bucket._latency("gcs.exists")
+        with self.bucket._state.lock:
+            return self._key in self.bucket._state.objects
+
+    def delete(self) -> None:
+        self.bucket._latency("gcs.delete")
+        with self.bucket._state.lock:
+            if self.bucket._state.objects.pop(self._key, None) is None:
+                raise NotFound(f"No such object: {self.bucket.name}/{self.name}")
+
+
+class FakeBucket:
+    def __init__(self, name: str, state: _GcsState, latency: LatencyModel):
+        self.name = name
+        self._state = state
+        self._latency = latency
+
+    def blob(self, blob_name: str) -> FakeBlob:
+        return FakeBlob(self, blob_name)
+
+    def get_blob(self, blob_name: str) -> Optional[FakeBlob]:
+        self._latency("gcs.get")
+        with self._state.lock:
+            entry = self._state.objects.get((self.name, blob_name))
+        if entry is None:
+            return None
+        blob = FakeBlob(self, blob_name)
+        blob.generation = entry[2]
+        return blob
+
+    def list_blobs(
+        self, prefix: str = "", delimiter: Optional[str] = None
+    ) -> "FakeBlobIterator":
+        self._latency("gcs.list")
+        with self._state.lock:
+            names = sorted(
+                path
+                for bucket, path in self._state.objects
+                if bucket == self.name and path.startswith(prefix)
+            )
+        return FakeBlobIterator(self, names, prefix, delimiter)
+
+
+class FakeBlobIterator:
+    """
+    Listing of ``list_blobs``: the objects, and with a delimiter the
+    ``prefixes`` ("directories") below ``prefix`` instead of their objects.
+    """
+
+    def __init__(
+        self,
+        bucket: FakeBucket,
+        names: List[str],
+        prefix: str,
+        delimiter: Optional[str],
+    ):
+        self.prefixes: Set[str] = set()
+        self._blobs = []
+        for name in names:
+            cut = name.find(delimiter, len(prefix)) if delimiter else -1
+            if cut == -1:
+                self._blobs.append(FakeBlob(bucket, name))
+            else:
+                self.prefixes.add(name[: cut + len(delimiter)])
+
+    def __iter__(self) -> Iterator[FakeBlob]:
+        return iter(self._blobs)
+
+
+class FakeStorageClient:
+    """Stand-in for ``google.cloud.storage.Client``."""
+
+    def __init__(
+        self, latency: Optional[LatencyModel] = None, state: Optional[_GcsState] = None
+    ):
+        self._latency = latency or LatencyModel()
+        self._state = state or _GcsState()
+
+    def bucket(self, bucket_name: str) -> FakeBucket:
+        return FakeBucket(bucket_name, self._state, self._latency)
@@ -0,0 +1,112 @@
+"""
+Latency, throttling and fault injection shared by all emulators.
+"""
+import random
+import threading
+import time
+from typing import Callable, Optional
+
+from agent_memory_hub.config.emulator_config import EmulatorConfig
+
+
+class EmulatorError(ConnectionError):
+    """Base class for failures injected by an emulator."""
+
+
+class EmulatorUnavailableError(EmulatorError):
+    """Injected transient failure (e.g. 503 / connection reset)."""
+
+
+class EmulatorThrottledError(EmulatorError):
+    """Injected rate-limit rejection (e.g. 429 / RESOURCE_EXHAUSTED)."""
+
+
+class LatencyModel:
+    """
+    Applies the latency, throttling and error behaviour of an EmulatorConfig
+    to every emulated API call.
+
+    Sampling uses a single seeded generator, so a given sequence of calls
+    always sees the same delays and failures. ``clock`` and ``sleep`` can be
+    replaced to run without real waiting.
+    """
+
+    def __init__(
+        self,
+        config: Optional[EmulatorConfig] = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.config = config or EmulatorConfig()
+        self._clock = clock
+        self._sleep = sleep
+        self._rng = random.Random(self.config.seed)  # noqa: S311  # nosec
+        self._lock = threading.Lock()
+        self._tokens = float(self.config.throttle_burst)
+        self._last_refill = clock()
+        self.calls = 0
+        self.injected_errors = 0
+        self.throttled = 0
+
+    def __call__(self, operation: str) -> None:
+        """
+        Account for one API call: wait for throttling, sleep for the sampled
+        latency and raise if a fault is injected.
+        """
+        with self._lock:
+            self.calls += 1
+            wait = self._take_token(operation)
+            delay = self._sample_latency(operation)
+            fail = (
+                self.config.error_rate > 0
+                and self._rng.random() < self.config.error_rate
+            )
+            if fail:
+                self.injected_errors += 1
+
+        if wait + delay > 0:
+            self._sleep(wait + delay)
+        if fail:
+            raise EmulatorUnavailableError(f"Injected failure in {operation}")
+
+    def _take_token(self, operation: str) -> float:
+        rate = self.config.throttle_ops_per_second
+        if not rate:
+            return 0.0
+
+        now = self._clock()
+        burst = float(self.config.throttle_burst)
+        self._tokens = min(burst, self._tokens + (now - self._last_refill) * rate)
+        self._last_refill = now
+        if self._tokens >= 1.0:
+            self._tokens -= 1.0
+            return 0.0
+
+        self.throttled += 1
+        if self.config.throttle_mode == "reject":
+            raise EmulatorThrottledError(f"Rate limit exceeded in {operation}")
+        # Borrow the token; the caller waits until it would have been refilled.
+        wait = (1.0 - self._tokens) / rate
+        self._tokens -= 1.0
+        return wait
+
+    def _sample_latency(self, operation: str) -> float:
+        cfg = self.config
+        mean_ms = cfg.operation_latency_ms.get(operation, cfg.latency_ms)
+        if mean_ms > 0:
+            if cfg.distribution == "uniform":
+                ms = self._rng.uniform(0.0, 2 * mean_ms)
+            elif cfg.distribution == "normal":
+                ms = self._rng.gauss(mean_ms, cfg.sigma * mean_ms)
+            elif cfg.distribution == "lognormal":
+                # Parameterized so the median equals mean_ms; long right tail
+                ms = mean_ms * self._rng.lognormvariate(0.0, cfg.sigma)
+            elif cfg.distribution == "exponential":
+                ms = self._rng.expovariate(1.0 / mean_ms)
+            else:
+                ms = mean_ms
+        else:
+            ms = 0.0
+        if cfg.jitter_ms > 0:
+            ms += self._rng.uniform(0.0, cfg.jitter_ms)
+        return max(0.0, ms) / 1000.0
@@ -0,0 +1,535 @@
+"""
+In-process emulator of the Redis command subset used by RedisSessionStore.
+
+Behaves like ``redis.Redis(decode_responses=True)``: values are stored and
+returned as ``str``.
+"""
+import bisect
+import copy
+import fnmatch
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from agent_memory_hub.data_plane.redis_session_store import WatchError
+from agent_memory_hub.emulators.latency import LatencyModel
+
+
+class _RedisState:
+    """Keyspace of one emulated server: {key: (value, expires_at or None)}."""
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        self.data: Dict[str, Tuple[Any, Optional[float]]] = {}
+        self.clock = clock
+        self.lock = threading.RLock()
+
+    def get_live(self, key: str) -> Optional[Any]:
+        entry = self.data.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at is not None and self.clock() >= expires_at:
+            del self.data[key]
+            return None
+        return value
+
+
+class _Stream:
+    """Entries of one stream, ordered by ``(milliseconds, sequence)`` id."""
+
+    __slots__ = ("ids", "fields", "last_id")
+
+    def __init__(self):
+        self.ids: List[Tuple[int, int]] = []
+        self.fields: List[Dict[str, str]] = []
+        self.last_id = (0, 0)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+
+class FakeRedis:
+    """Stand-in for ``redis.Redis``."""
+
+    def __init__(
+        self,
+        latency: Optional[LatencyModel] = None,
+        state: Optional[_RedisState] = None,
+    ):
+        self._latency = latency or LatencyModel()
+        self._state = state or _RedisState()
+
+    # -- strings -----------------------------------------------------------
+
+    def get(self, name: str) -> Optional[str]:
+        self._latency("redis.get")
+        return self._get(name)
+
+    def set(
+        self, name: str, value: Any, ex: Optional[int] = None, nx: bool = False
+    ) -> Optional[bool]:
+        self._latency("redis.set")
+        return self._set(name, value, ex, nx)
+
+    def setex(self, name: str, time: int, value: Any) -> bool:
+        self._latency("redis.setex")
+        return bool(self._set(name, value, time, False))
+
+    def mget(self, keys: List[str], *args: str) -> List[Optional[str]]:
+        self._latency("redis.mget")
+        names = list(keys) + list(args) if isinstance(keys, list) else [keys, *args]
+        with self._state.lock:
+            return [self._get(n) for n in names]
+
+    # -- keyspace ----------------------------------------------------------
+
+    def delete(self, *names: str) -> int:
+        self._latency("redis.delete")
+        return self._delete(names)
+
+    def unlink(self, *names: str) -> int:
+        self._latency("redis.unlink")
+        return self._delete(names)
+
+    def exists(self, *names: str) -> int:
+        self._latency("redis.exists")
+        with self._state.lock:
+            return sum(1 for n in names if self._state.get_live(n) is not None)
+
+    def expire(self, name: str, time: int) -> bool:
+        self._latency("redis.expire")
+        with self._state.lock:
+            value = self._state.get_live(name)
+            if value is None:
+                return False
+            self._state.data[name] = (value, self._state.clock() + time)
+            return True
+
+    def persist(self, name: str) -> bool:
+        self._latency("redis.persist")
+        with self._state.lock:
+            value = self._state.get_live(name)
+            if value is None or self._state.data[name][1] is None:
+                return False
+            self._state.data[name] = (value, None)
+            return True
+
+    def ttl(self, name: str) -> int:
+        self._latency("redis.ttl")
+        with self._state.lock:
+            if self._state.get_live(name) is None:
+                return -2
+            expires_at = self._state.data[name][1]
+            if expires_at is None:
+                return -1
+            return max(0, int(round(expires_at - self._state.clock())))
+
+    def scan_iter(self, match: Optional[str] = None, count: int = 100) -> Iterator[str]:
+        self._latency("redis.scan")
+        with self._state.lock:
+            keys = sorted(
+                k for k in list(self._state.data)
+                if self._state.get_live(k) is not None
+            )
+        for key in keys:
+            if match is None or fnmatch.fnmatchcase(key, match):
+                yield key
+
+    # -- hashes ------------------------------------------------------------
+
+    def hset(
+        self,
+        name: str,
+        key: Optional[str] = None,
+        value: Any = None,
+        mapping: Optional[Dict[str, Any]] = None,
+    ) -> int:
+        self._latency("redis.hset")
+        items = dict(mapping or {})
+        if key is not None:
+            items[key] = value
+        with self._state.lock:
+            current = self._container(name, dict)
+            added = sum(1 for k in items if k not in current)
+            current.update({k: _encode(v) for k, v in items.items()})
+            return added
+
+    def hget(self, name: str, key: str) -> Optional[str]:
+        self._latency("redis.hget")
+        with self._state.lock:
+            return (self._state.get_live(name) or {}).get(key)
+
+    def hmget(self, name: str, keys: List[str], *args: str) -> List[Optional[str]]:
+        self._latency("redis.hmget")
+        fields = list(keys) + list(args) if isinstance(keys, list) else [keys, *args]
+        with self._state.lock:
+            current = self._state.get_live(name) or {}
+            return [current.get(f) for f in fields]
+
+    def hdel(self, name: str, *keys: str) -> int:
+        self._latency("redis.hdel")
+        with self._state.lock:
+            current = self._state.get_live(name) or {}
+            removed = sum(1 for k in keys if current.pop(k, None) is not None)
+            self._drop_if_empty(name)
+            return removed
+
+    def hgetall(self, name: str) -> Dict[str, str]:
+        self._latency("redis.hgetall")
+        with self._state.lock:
+            return dict(self._state.get_live(name) or {})
+
+    # -- sets --------------------------------------------------------------
+
+    def sadd(self, name: str, *values: Any) -> int:
+        self._latency("redis.sadd")
+        with self._state.lock:
+            current = self._container(name, set)
+            new = {_encode(v) for v in values} - current
+            current.update(new)
+            return len(new)
+
+    def srem(self, name: str, *values: Any) -> int:
+        self._latency("redis.srem")
+        with self._state.lock:
+            current = self._state.get_live(name) or set()
+            removed = {_encode(v) for v in values} & current
+            current -= removed
+            self._drop_if_empty(name)
+            return len(removed)
+
+    def smembers(self, name: str) -> set:
+        self._latency("redis.smembers")
+        with self._state.lock:
+            return set(self._state.get_live(name) or ())
+
+    def sscan_iter(
+        self, name: str, match: Optional[str] = None, count: Optional[int] = None
+    ) -> Iterator[str]:
+        self._latency("redis.sscan")
+        with self._state.lock:
+            members = sorted(self._state.get_live(name) or ())
+        for member in members:
+            if match is None or fnmatch.fnmatchcase(member, match):
+                yield member
+
+    def sinter(self, keys: List[str], *args: str) -> set:
+        self._latency("redis.sinter")
+        names = list(keys) + list(args) if isinstance(keys, list) else [keys, *args]
+        with self._state.lock:
+            sets = [self._state.get_live(n) or set() for n in names]
+        return set.intersection(*map(set, sets)) if sets else set()
+
+    def sunion(self, keys: List[str], *args: str) -> set:
+        self._latency("redis.sunion")
+        names = list(keys) + list(args) if isinstance(keys, list) else [keys, *args]
+        with self._state.lock:
+            sets = [self._state.get_live(n) or set() for n in names]
+        return set().union(*sets)
+
+    def sort(
+        self,
+        name: str,
+        by: Optional[str] = None,
+        get: Optional[List[str]] = None,
+        groups: bool = False,
+    ) -> List[Any]:
+        self._latency("redis.sort")
+        if by is None or "*" in by:
+            raise ValueError("Only SORT ... BY nosort is emulated")
+        patterns = get or ["#"]
+        with self._state.lock:
+            # Real servers return set members in hash order; sorted here
+            rows = [
+                [self._sort_lookup(member, pattern) for pattern in patterns]
+                for member in sorted(self._state.get_live(name) or ())
+            ]
+        if groups:
+            return [tuple(row) for row in rows]
+        return [value for row in rows for value in row]
+
+    # -- sorted sets -------------------------------------------------------
+
+    def zadd(self, name: str, mapping: Dict[str, float]) -> int:
+        self._latency("redis.zadd")
+        with self._state.lock:
+            current = self._container(name, dict)
+            added = sum(1 for m in mapping if _encode(m) not in current)
+            current.update({_encode(m): float(s) for m, s in mapping.items()})
+            return added
+
+    def zrem(self, name: str, *values: Any) -> int:
+        self._latency("redis.zrem")
+        with self._state.lock:
+            current = self._state.get_live(name) or {}
+            removed = sum(
+                1 for v in values if current.pop(_encode(v), None) is not None
+            )
+            self._drop_if_empty(name)
+            return removed
+
+    def zrangebyscore(
+        self,
+        name: str,
+        min: Any,
+        max: Any,
+        start: Optional[int] = None,
+        num: Optional[int] = None,
+        withscores: bool = False,
+    ) -> List[Any]:
+        self._latency("redis.zrangebyscore")
+        low, low_open = _score_bound(min)
+        high, high_open = _score_bound(max)
+        with self._state.lock:
+            current = self._state.get_live(name) or {}
+            members = sorted((s, m) for m, s in current.items())
+        selected = [
+            (m, s)
+            for s, m in members
+            if (s > low if low_open else s >= low)
+            and (s < high if high_open else s <= high)
+        ]
+        if start is not None and num is not None:
+            selected = selected[start:start + num]
+        return selected if withscores else [m for m, _ in selected]
+
+    # -- streams -----------------------------------------------------------
+
+    def xadd(
+        self,
+        name: str,
+        fields: Dict[str, Any],
+        id: str = "*",
+        maxlen: Optional[int] = None,
+        approximate: bool = True,
+    ) -> str:
+        self._latency("redis.xadd")
+        if id != "*":
+            raise ValueError("Only auto-generated stream ids are emulated")
+        with self._state.lock:
+            stream = self._container(name, _Stream)
+            ms = int(time.time() * 1000)
+            last_ms, last_seq = stream.last_id
+            entry_id = (ms, 0) if ms > last_ms else (last_ms, last_seq + 1)
+            stream.ids.append(entry_id)
+            stream.fields.append({k: _encode(v) for k, v in fields.items()})
+            stream.last_id = entry_id
+            # Trimming is always exact here, which "~" permits
+            excess = len(stream) - maxlen if maxlen is not None else 0
+            if excess > 0:
+                del stream.ids[:excess]
+                del stream.fields[:excess]
+            return _format_stream_id(entry_id)
+
+    def xlen(self, name: str) -> int:
+        self._latency("redis.xlen")
+        with self._state.lock:
+            return len(self._state.get_live(name) or ())
+
+    def xrange(
+        self, name: str, min: str = "-", max: str = "+", count: Optional[int] = None
+    ) -> List[Tuple[str, Dict[str, str]]]:
+        self._latency("redis.xrange")
+        return self._stream_range(name, min, max, count, reverse=False)
+
+    def xrevrange(
+        self, name: str, max: str = "+", min: str = "-", count: Optional[int] = None
+    ) -> List[Tuple[str, Dict[str, str]]]:
+        self._latency("redis.xrevrange")
+        return self._stream_range(name, min, max, count, reverse=True)
+
+    def flushdb(self) -> bool:
+        self._latency("redis.flushdb")
+        with self._state.lock:
+            self._state.data.clear()
+        return True
+
+    def pipeline(self, transaction: bool = True) -> "FakePipeline":
+        return FakePipeline(self, transaction)
+
+    # -- internals (no latency) --------------------------------------------
+
+    def _get(self, name: str) -> Optional[Any]:
+        with self._state.lock:
+            return self._state.get_live(name)
+
+    def _set(
+        self, name: str, value: Any, ex: Optional[int], nx: bool
+    ) -> Optional[bool]:
+        with self._state.lock:
+            if nx and self._state.get_live(name) is not None:
+                return None
+            expires_at = self._state.clock() + ex if ex else None
+            self._state.data[name] = (_encode(value), expires_at)
+            return True
+
+    def _sort_lookup(self, member: str, pattern: str) -> Optional[str]:
+        if pattern == "#":
+            return member
+        value = self._state.get_live(pattern.replace("*", member, 1))
+        return value if isinstance(value, str) else None
+
+    def _container(self, name: str, kind: type) -> Any:
+        current = self._state.get_live(name)
+        if current is None:
+            current = kind()
+            self._state.data[name] = (current, None)
+        elif not isinstance(current, kind):
+            raise TypeError(
+                "WRONGTYPE Operation against a key holding the wrong kind of value"
+            )
+        return current
+
+    def _stream_range(
+        self, name: str, min: str, max: str, count: Optional[int], reverse: bool
+    ) -> List[Tuple[str, Dict[str, str]]]:
+        with self._state.lock:
+            stream = self._state.get_live(name)
+            if stream is None:
+                return []
+            if not isinstance(stream, _Stream):
+                raise TypeError(
+                    "WRONGTYPE Operation against a key holding the wrong kind of value"
+                )
+            low, low_open = _stream_bound(min, upper=False)
+            high, high_open = _stream_bound(max, upper=True)
+            begin = (bisect.bisect_right if low_open else bisect.bisect_left)(
+                stream.ids, low
+            )
+            end = (bisect.bisect_left if high_open else bisect.bisect_right)(
+                stream.ids, high
+            )
+            positions = range(end - 1, begin - 1, -1) if reverse else range(begin, end)
+            if count is not None:
+                positions = positions[:count]
+            return [
+                (_format_stream_id(stream.ids[i]), dict(stream.fields[i]))
+                for i in positions
+            ]
+
+    def _drop_if_empty(self, name: str) -> None:
+        current = self._state.get_live(name)
+        if current is not None and not isinstance(current, str) and not current:
+            del self._state.data[name]
+
+    def _delete(self, names) -> int:
+        with self._state.lock:
+            removed = 0
+            for name in names:
+                if self._state.get_live(name) is not None:
+                    removed += 1
+                self._state.data.pop(name, None)
+            return removed
+
+
+class FakePipeline:
+    """
+    Buffers commands and executes them in one emulated round trip. With
+    ``transaction=True`` the batch is applied atomically (MULTI/EXEC).
+
+    After ``watch()`` commands run immediately until ``multi()``, and
+    ``execute()`` raises WatchError if a watched key's value changed in
+    between (values are compared, so rewriting the same value goes
+    unnoticed, unlike a real server).
+    """
+
+    def __init__(self, client: FakeRedis, transaction: bool = True):
+        self._client = client
+        self._transaction = transaction
+        self._commands: List[Tuple[str, tuple, dict]] = []
+        self._watched: Dict[str, Any] = {}
+        self._immediate = False
+
+    def __enter__(self) -> "FakePipeline":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.reset()
+
+    def __getattr__(self, name: str):
+        if name.startswith("_") or not hasattr(FakeRedis, name):
+            raise AttributeError(name)
+
+        if self._immediate:
+            return getattr(self._client, name)
+
+        def queue(*args, **kwargs) -> "FakePipeline":
+            self._commands.append((name, args, kwargs))
+            return self
+
+        return queue
+
+    def watch(self, *names: str) -> None:
+        self._client._latency("redis.watch")
+        state = self._client._state
+        with state.lock:
+            for name in names:
+                self._watched[name] = copy.deepcopy(state.get_live(name))
+        self._immediate = True
+
+    def multi(self) -> None:
+        self._immediate = False
+
+    def unwatch(self) -> None:
+        self._watched = {}
+        self._immediate = False
+
+    def execute(self) -> List[Any]:
+        self._client._latency("redis.pipeline")
+        # Replay without per-command latency: the whole batch is one round trip.
+        replay = FakeRedis(LatencyModel(), self._client._state)
+        with self._client._state.lock:
+            state = self._client._state
+            if any(
+                state.get_live(name) != value for name, value in self._watched.items()
+            ):
+                self.reset()
+                raise WatchError("Watched variable changed.")
+            results = [
+                getattr(replay, name)(*args, **kwargs)
+                for name, args, kwargs in self._commands
+            ]
+        self.reset()
+        return results
+
+    def reset(self) -> None:
+        self._commands = []
+        self.unwatch()
+
+
+def _score_bound(bound: Any) -> Tuple[float, bool]:
+    """Parse a ZRANGEBYSCORE bound ("-inf", "+inf", "(1.5", 2) -> (score, open)."""
+    if isinstance(bound, str):
+        if bound.startswith("("):
+            return float(bound[1:]), True
+        return float(bound.replace("+inf", "inf")), False
+    return float(bound), False
+
+
+def _format_stream_id(entry_id: Tuple[int, int]) -> str:
+    return f"{entry_id[0]}-{entry_id[1]}"
+
+
+def _stream_bound(bound: str, upper: bool) -> Tuple[Tuple[int, int], bool]:
+    """
+    Parse an XRANGE bound ("-", "+", "(1-0", "1526985054069") -> (id, open).
+    An id without a sequence part covers the whole millisecond.
+    """
+    if bound == "-":
+        return (0, 0), False
+    if bound == "+":
+        return (2**64, 0), False
+    is_open = bound.startswith("(")
+    ms, _, seq = bound.lstrip("(").partition("-")
+    if seq:
+        return (int(ms), int(seq)), is_open
+    return (int(ms), 2**64 if upper else 0), is_open
+
+
+def _encode(value: Any) -> Any:
+    # decode_responses=True semantics for scalar values
+    if isinstance(value, bytes):
+        return value.decode("utf-8")
+    if isinstance(value, (int, float)):
+        return str(value)
+    return value
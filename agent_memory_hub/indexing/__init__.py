@@ -0,0 +1,80 @@
+"""
+Secondary indexes over stored memory models.
+"""
+from agent_memory_hub.indexing.bitmap import Bitmap, TagIndex
+from agent_memory_hub.indexing.embeddings import (
+    CallableEmbedder,
+    Embedder,
+    HashingEmbedder,
+)
+from agent_memory_hub.indexing.episode_log import (
+    EpisodeLog,
+    LogEntry,
+    LogPage,
+    LogQuery,
+)
+from agent_memory_hub.indexing.graph import GraphNode
+from agent_memory_hub.indexing.inverted_index import (
+    InvertedIndex,
+    KeywordIndex,
+    tokenize,
+)
+from agent_memory_hub.indexing.memory_index import (
+    RankIndex,
+    SessionIndex,
+    TripleIndex,
+)
+from agent_memory_hub.indexing.ownership import Ownership, OwnershipIndex
+from agent_memory_hub.indexing.query import (
+    IndexRecord,
+    MemoryQuery,
+    QueryPage,
+    RankQuery,
+    TriplePattern,
+    decode_cursor,
+    encode_cursor,
+    index_record,
+)
+from agent_memory_hub.indexing.ranking import Candidates, RankingEngine
+from agent_memory_hub.indexing.scoped_index import (
+    ScopedIndex,
+    SearchResult,
+    reciprocal_rank_fusion,
+)
+from agent_memory_hub.indexing.vector_index import EmbeddingIndex, VectorIndex
+
+__all__ = [
+    "Bitmap",
+    "CallableEmbedder",
+    "Candidates",
+    "Embedder",
+    "EmbeddingIndex",
+    "EpisodeLog",
+    "GraphNode",
+    "HashingEmbedder",
+    "IndexRecord",
+    "InvertedIndex",
+    "KeywordIndex",
+    "LogEntry",
+    "LogPage",
+    "LogQuery",
+    "MemoryQuery",
+    "Ownership",
+    "OwnershipIndex",
+    "QueryPage",
+    "RankIndex",
+    "RankQuery",
+    "RankingEngine",
+    "ScopedIndex",
+    "SearchResult",
+    "SessionIndex",
+    "TagIndex",
+    "TripleIndex",
+    "TriplePattern",
+    "VectorIndex",
+    "decode_cursor",
+    "encode_cursor",
+    "index_record",
+    "reciprocal_rank_fusion",
+    "tokenize",
+]
@@ -0,0 +1,401 @@
+"""
+Compressed (roaring-style) bitmaps of memory ordinals and the tag index
+built on them.
+"""
+import heapq
+import struct
+import sys
+import threading
+from array import array
+from bisect import bisect_left
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+# Containers holding more values than this are stored as a 2**16-bit mask
+# (8 KiB) instead of a sorted uint16 array (2 bytes per value)
+ARRAY_MAX = 4096
+_CONTAINER_BITS = 1 << 16
+_MASK_BYTES = _CONTAINER_BITS // 8
+
+_HEADER = struct.Struct("<I")
+_CONTAINER_HEADER = struct.Struct("<HBI")
+_ARRAY, _MASK = 0, 1
+
+# Set bit positions of every byte value, for iterating masks bytewise
+_BYTE_BITS = tuple(tuple(i for i in range(8) if b >> i & 1) for b in range(256))
+
+Container = Union[array, int]
+
+
+def _to_mask(values: Iterable[int]) -> int:
+    mask = bytearray(_MASK_BYTES)
+    for low in values:
+        mask[low >> 3] |= 1 << (low & 7)
+    return int.from_bytes(mask, "little")
+
+
+def _mask_values(mask: int) -> Iterator[int]:
+    data = mask.to_bytes(_MASK_BYTES, "little")
+    for offset, byte in enumerate(data):
+        if byte:
+            base = offset << 3
+            for bit in _BYTE_BITS[byte]:
+                yield base + bit
+
+
+def _filter(values: array, mask: int, keep: bool) -> array:
+    # Probes a bytes copy: shifting the 8 KiB int per value would be O(n * 8K)
+    data = mask.to_bytes(_MASK_BYTES, "little")
+    return array(
+        "H", (v for v in values if bool(data[v >> 3] >> (v & 7) & 1) is keep)
+    )
+
+
+def _normalize(container: Container) -> Optional[Container]:
+    """Smallest representation of a container; None if empty."""
+    if isinstance(container, int):
+        count = container.bit_count()
+        if count == 0:
+            return None
+        if count <= ARRAY_MAX:
+            return array("H", _mask_values(container))
+        return container
+    return container if len(container) else None
+
+
+def _cardinality(container: Container) -> int:
+    if isinstance(container, int):
+        return container.bit_count()
+    return len(container)
+
+
+def _and(a: Container, b: Container) -> Optional[Container]:
+    if isinstance(a, int) and isinstance(b, int):
+        return _normalize(a & b)
+    if isinstance(a, int):
+        a, b = b, a
+    if isinstance(b, int):
+        return _normalize(_filter(a, b, keep=True))
+    small, large = (a, b) if len(a) <= len(b) else (b, a)
+    return _normalize(array("H", sorted(set(small).intersection(large))))
+
+
+def _or(a: Container, b: Container) -> Container:
+    if isinstance(a, int) or isinstance(b, int):
+        a = a if isinstance(a, int) else _to_mask(a)
+        b = b if isinstance(b, int) else _to_mask(b)
+        return a | b
+    merged = set(a).union(b)
+    if len(merged) > ARRAY_MAX:
+        return _to_mask(merged)
+    return array("H", sorted(merged))
+
+
+def _and_not(a: Container, b: Container) -> Optional[Container]:
+    if isinstance(a, int):
+        b = b if isinstance(b, int) else _to_mask(b)
+        return _normalize(a & ~b)
+    if isinstance(b, int):
+        return _normalize(_filter(a, b, keep=False))
+    return _normalize(array("H", sorted(set(a).difference(b))))
+
+
+class Bitmap:
+    """
+    Compressed set of non-negative integers below 2**32.
+
+    Values are split by their high 16 bits into containers, each a sorted
+    uint16 array while sparse and a 65536-bit mask once it holds more than
+    ``ARRAY_MAX`` values, so sparse and dense sets both stay compact and
+    intersections of dense sets are a handful of word-wide ANDs.
+    """
+
+    __slots__ = ("_containers",)
+
+    def __init__(self, values: Iterable[int] = ()):
+        self._containers: Dict[int, Container] = {}
+        for value in values:
+            self.add(value)
+
+    @classmethod
+    def _of(cls, containers: Dict[int, Container]) -> "Bitmap":
+        bitmap = cls()
+        bitmap._containers = containers
+        return bitmap
+
+    def add(self, value: int) -> None:
+        high, low = divmod(value, _CONTAINER_BITS)
+        container = self._containers.get(high)
+        if container is None:
+            self._containers[high] = array("H", [low])
+        elif isinstance(container, int):
+            self._containers[high] = container | (1 << low)
+        else:
+            i = bisect_left(container, low)
+            if i < len(container) and container[i] == low:
+                return
+            container.insert(i, low)
+            if len(container) > ARRAY_MAX:
+                self._containers[high] = _to_mask(container)
+
+    def discard(self, value: int) -> None:
+        high, low = divmod(value, _CONTAINER_BITS)
+        container = self._containers.get(high)
+        if container is None:
+            return
+        if isinstance(container, int):
+            updated = _normalize(container & ~(1 << low))
+        else:
+            i = bisect_left(container, low)
+            if i < len(container) and container[i] == low:
+                del container[i]
+            updated = _normalize(container)
+        if updated is None:
+            del self._containers[high]
+        else:
+            self._containers[high] = updated
+
+    def __contains__(self, value: int) -> bool:
+        high, low = divmod(value, _CONTAINER_BITS)
+        container = self._containers.get(high)
+        if container is None:
+            return False
+        if isinstance(container, int):
+            return bool(container >> low & 1)
+        i = bisect_left(container, low)
+        return i < len(container) and container[i] == low
+
+    def __len__(self) -> int:
+        return sum(_cardinality(c) for c in self._containers.values())
+
+    def __bool__(self) -> bool:
+        return bool(self._containers)
+
+    def __iter__(self) -> Iterator[int]:
+        for high in sorted(self._containers):
+            container = self._containers[high]
+            base = high * _CONTAINER_BITS
+            values = (
+                _mask_values(container) if isinstance(container, int) else container
+            )
+            for low in values:
+                yield base + low
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Bitmap):
+            return NotImplemented
+        return self._containers == other._containers
+
+    def __repr__(self) -> str:
+        return f"Bitmap(<{len(self)} values>)"
+
+    def copy(self) -> "Bitmap":
+        return Bitmap._of(
+            {
+                high: c if isinstance(c, int) else array("H", c)
+                for high, c in self._containers.items()
+            }
+        )
+
+    def __and__(self, other: "Bitmap") -> "Bitmap":
+        containers = {}
+        for high in self._containers.keys() & other._containers.keys():
+            c = _and(self._containers[high], other._containers[high])
+            if c is not None:
+                containers[high] = c
+        return Bitmap._of(containers)
+
+    def __or__(self, other: "Bitmap") -> "Bitmap":
+        containers = self.copy()._containers
+        for high, c in other._containers.items():
+            mine = containers.get(high)
+            containers[high] = (
+                (c if isinstance(c, int) else array("H", c))
+                if mine is None
+                else _or(mine, c)
+            )
+        return Bitmap._of(containers)
+
+    def __sub__(self, other: "Bitmap") -> "Bitmap":
+        containers = {}
+        for high, c in self._containers.items():
+            theirs = other._containers.get(high)
+            c = c if theirs is None else _and_not(c, theirs)
+            if c is not None:
+                containers[high] = c if isinstance(c, int) else array("H", c)
+        return Bitmap._of(containers)
+
+    @classmethod
+    def intersection(cls, bitmaps: Sequence["Bitmap"]) -> "Bitmap":
+        """Intersect smallest first, stopping as soon as the result is empty."""
+        if not bitmaps:
+            return cls()
+        ordered = sorted(bitmaps, key=len)
+        result = ordered[0].copy()
+        for bitmap in ordered[1:]:
+            if not result:
+                break
+            result = result & bitmap
+        return result
+
+    @classmethod
+    def union(cls, bitmaps: Sequence["Bitmap"]) -> "Bitmap":
+        result = cls()
+        for bitmap in bitmaps:
+            result = result | bitmap
+        return result
+
+    def to_bytes(self) -> bytes:
+        """Portable little-endian serialization (see ``from_bytes``)."""
+        parts = [_HEADER.pack(len(self._containers))]
+        for high in sorted(self._containers):
+            container = self._containers[high]
+            if isinstance(container, int):
+                parts.append(_CONTAINER_HEADER.pack(high, _MASK, container.bit_count()))
+                parts.append(container.to_bytes(_MASK_BYTES, "little"))
+            else:
+                parts.append(_CONTAINER_HEADER.pack(high, _ARRAY, len(container)))
+                if sys.byteorder == "big":
+                    container = array("H", container)
+                    container.byteswap()
+                parts.append(container.tobytes())
+        return b"".join(parts)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "Bitmap":
+        """
+        Decode a bitmap from ``to_bytes``.
+
+        Raises:
+            ValueError: If the data is malformed
+        """
+        try:
+            (count,) = _HEADER.unpack_from(data)
+            offset = _HEADER.size
+            containers: Dict[int, Container] = {}
+            for _ in range(count):
+                high, kind, size = _CONTAINER_HEADER.unpack_from(data, offset)
+                offset += _CONTAINER_HEADER.size
+                if kind == _MASK:
+                    chunk = data[offset:offset + _MASK_BYTES]
+                    containers[high] = int.from_bytes(chunk, "little")
+                    offset += _MASK_BYTES
+                else:
+                    container = array("H")
+                    container.frombytes(data[offset:offset + 2 * size])
+                    if sys.byteorder == "big":
+                        container.byteswap()
+                    containers[high] = container
+                    offset += 2 * size
+        except struct.error as e:
+            raise ValueError("Malformed bitmap") from e
+        if offset != len(data):
+            raise ValueError("Malformed bitmap")
+        return cls._of(containers)
+
+
+class TagIndex:
+    """
+    ``tag -> Bitmap`` of memory ordinals for one session or scope.
+
+    Each indexed key gets a small integer ordinal (reusing those of removed
+    keys, lowest first, so the bitmaps stay dense) and every tag keeps the
+    bitmap of the ordinals carrying it. Updates touch only the tags that
+    changed; AND/OR filters over any number of memories are bitmap
+    operations whose cost depends on the number of containers, not keys.
+    """
+
+    def __init__(self):
+        self._ordinals: Dict[str, int] = {}
+        self._keys: List[Optional[str]] = []
+        self._free: List[int] = []
+        self._tags: Dict[str, Tuple[str, ...]] = {}
+        self._bitmaps: Dict[str, Bitmap] = {}
+        self._live = Bitmap()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._ordinals)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._ordinals
+
+    def update(self, key: str, tags: Iterable[str]) -> None:
+        """Index ``key`` with exactly ``tags`` (replacing its previous tags)."""
+        tags = tuple(dict.fromkeys(tags))
+        with self._lock:
+            ordinal = self._ordinals.get(key)
+            if ordinal is None:
+                if self._free:
+                    ordinal = heapq.heappop(self._free)
+                    self._keys[ordinal] = key
+                else:
+                    ordinal = len(self._keys)
+                    self._keys.append(key)
+                self._ordinals[key] = ordinal
+                self._live.add(ordinal)
+                previous: Tuple[str, ...] = ()
+            else:
+                previous = self._tags.get(key, ())
+            for tag in set(previous).difference(tags):
+                self._discard(tag, ordinal)
+            for tag in set(tags).difference(previous):
+                self._bitmaps.setdefault(tag, Bitmap()).add(ordinal)
+            if tags:
+                self._tags[key] = tags
+            else:
+                self._tags.pop(key, None)
+
+    def remove(self, key: str) -> None:
+        """Drop ``key`` if indexed."""
+        with self._lock:
+            ordinal = self._ordinals.pop(key, None)
+            if ordinal is None:
+                return
+            for tag in self._tags.pop(key, ()):
+                self._discard(tag, ordinal)
+            self._live.discard(ordinal)
+            self._keys[ordinal] = None
+            heapq.heappush(self._free, ordinal)
+
+    def _discard(self, tag: str, ordinal: int) -> None:
+        bitmap = self._bitmaps[tag]
+        bitmap.discard(ordinal)
+        if not bitmap:
+            del self._bitmaps[tag]
+
+    def bitmap(self, tag: str) -> Bitmap:
+        """Ordinals carrying ``tag`` (a copy)."""
+        with self._lock:
+            bitmap = self._bitmaps.get(tag)
+            return bitmap.copy() if bitmap is not None else Bitmap()
+
+    def match(
+        self, all_of: Sequence[str] = (), any_of: Sequence[str] = ()
+    ) -> Bitmap:
+        """
+        Ordinals of the keys carrying every tag of ``all_of`` and at least
+        one of ``any_of`` (an empty list places no constraint).
+        """
+        with self._lock:
+            if all_of:
+                bitmaps = [self._bitmaps.get(tag) for tag in set(all_of)]
+                if any(b is None for b in bitmaps):
+                    return Bitmap()
+                result = Bitmap.intersection(bitmaps)
+            else:
+                result = self._live.copy()
+            if any_of and result:
+                present = [self._bitmaps[t] for t in set(any_of) if t in self._bitmaps]
+                result = result & Bitmap.union(present)
+            return result
+
+    def keys(self, bitmap: Bitmap) -> List[str]:
+        """Keys of the ordinals in ``bitmap`` (skipping ordinals no longer in use)."""
+        with self._lock:
+            found = (self._keys[o] for o in bitmap if o < len(self._keys))
+            return [key for key in found if key is not None]
+
+    def contains(self, bitmap: Bitmap, key: str) -> bool:
+        """Whether ``key`` is one of the ordinals in ``bitmap``."""
+        ordinal = self._ordinals.get(key)
+        return ordinal is not None and ordinal in bitmap
@@ -0,0 +1,122 @@
+"""
+Pluggable text embedders for memory search.
+"""
+import abc
+import hashlib
+import re
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+
+def _require_numpy() -> None:
+    if not NUMPY_AVAILABLE:
+        raise ImportError(
+            "numpy is required for memory search. "
+            "Install with: pip install agent-memory-hub[vector]"
+        )
+
+
+class Embedder(abc.ABC):
+    """Maps texts to fixed-size vectors."""
+
+    #: Length of every vector returned by ``embed``
+    dimension: int
+
+    @abc.abstractmethod
+    def embed(self, texts: Sequence[str]) -> "np.ndarray":
+        """
+        Embed a batch of texts.
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            float32 array of shape ``(len(texts), dimension)``
+        """
+
+
+class HashingEmbedder(Embedder):
+    """
+    Deterministic, dependency-free embedder hashing word unigrams and
+    bigrams into signed buckets.
+
+    It captures lexical overlap, not meaning, which makes it suitable for
+    tests, demos and keyword-heavy memories; plug in a model-backed
+    ``Embedder`` for semantic recall.
+    """
+
+    def __init__(self, dimension: int = 256):
+        """
+        Args:
+            dimension: Number of hash buckets (vector length)
+        """
+        _require_numpy()
+        if dimension < 1:
+            raise ValueError("dimension must be at least 1")
+        self.dimension = dimension
+
+    def _features(self, text: str) -> List[str]:
+        tokens = _TOKEN.findall(text.lower())
+        bigrams = [f"{a} {b}" for a, b in zip(tokens, tokens[1:], strict=False)]
+        return tokens + bigrams
+
+    def embed(self, texts: Sequence[str]) -> "np.ndarray":
+        vectors = np.zeros((len(texts), self.dimension), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for feature in self._features(text):
+                digest = hashlib.blake2b(feature.encode("utf-8"), digest_size=8)
+                h = int.from_bytes(digest.digest(), "little")
+                vectors[row, h % self.dimension] += 1.0 if h >> 63 else -1.0
+        return vectors
+
+
+class CallableEmbedder(Embedder):
+    """
+    Adapts any batch embedding function (e.g. a hosted embedding model
+    client) to the ``Embedder`` interface.
+    """
+
+    def __init__(
+        self, fn: Callable[[List[str]], Sequence[Sequence[float]]], dimension: int
+    ):
+        """
+        Args:
+            fn: Returns one vector per input text
+            dimension: Length of the vectors ``fn`` returns
+        """
+        _require_numpy()
+        self._fn = fn
+        self.dimension = dimension
+
+    def embed(self, texts: Sequence[str]) -> "np.ndarray":
+        vectors = np.asarray(self._fn(list(texts)), dtype=np.float32)
+        if vectors.shape != (len(texts), self.dimension):
+            raise ValueError(
+                f"Embedding function returned shape {vectors.shape}, "
+                f"expected {(len(texts), self.dimension)}"
+            )
+        return vectors
+
+
+def memory_text(value: Dict[str, Any]) -> Optional[str]:
+    """
+    Text to embed for a stored memory model dict.
+
+    Returns:
+        The content of an EpisodicMemory, "subject predicate object" of a
+        SemanticMemory, or None for other values
+    """
+    memory_type = value.get("memory_type") if isinstance(value, dict) else None
+    if memory_type == "EpisodicMemory":
+        return value.get("content") or None
+    if memory_type == "SemanticMemory":
+        parts = (value.get("subject"), value.get("predicate"), value.get("object"))
+        return " ".join(str(p) for p in parts if p) or None
+    return None
@@ -0,0 +1,226 @@
+"""
+Append-only episode logs: per-session streams of entries in append order,
+read from either end, by time range or from a cursor, one page at a time.
+"""
+import bisect
+from array import array
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, List, Optional, Sequence, Tuple
+
+from agent_memory_hub.indexing.query import (
+    DEFAULT_LIMIT,
+    MAX_LIMIT,
+    decode_cursor,
+    encode_cursor,
+    to_timestamp,
+)
+
+DEFAULT_TAIL = 20
+
+
+@dataclass(frozen=True)
+class LogEntry:
+    """
+    One appended entry.
+
+    Attributes:
+        id: Entry id, increasing within the stream (a sequence number, or
+            a stream id such as "1700000000000-0" on Redis)
+        ts: Append time as UTC epoch seconds (never decreases along a stream)
+        value: Appended value
+    """
+    id: str
+    ts: float
+    value: Any
+
+
+@dataclass(frozen=True)
+class LogQuery:
+    """
+    Range of one log stream, oldest first (or newest first with
+    ``reverse``). ``since``/``until`` bound the append time (inclusive /
+    exclusive).
+
+    Attributes:
+        stream: Stream name within the session (e.g. the agent id)
+        since: Earliest append time (inclusive)
+        until: Latest append time (exclusive)
+        reverse: Newest entries first
+        limit: Maximum entries per page
+        cursor: Opaque cursor from a previous page's ``next_cursor``
+    """
+    stream: str
+    since: Optional[datetime] = None
+    until: Optional[datetime] = None
+    reverse: bool = False
+    limit: int = DEFAULT_LIMIT
+    cursor: Optional[str] = None
+
+    def __post_init__(self):
+        if not 1 <= self.limit <= MAX_LIMIT:
+            raise ValueError(f"limit must be between 1 and {MAX_LIMIT}")
+
+    def after(self) -> Optional[Tuple[float, str]]:
+        """Position ``(ts, id)`` the page continues from, in read direction."""
+        return decode_cursor(self.cursor) if self.cursor else None
+
+    def bounds(
+        self, ttl_seconds: Optional[int], now: float
+    ) -> Tuple[Optional[float], Optional[float]]:
+        """
+        Append time range ``[low, high)`` to read, excluding entries older
+        than ``ttl_seconds`` (None = unbounded).
+        """
+        low = to_timestamp(self.since) if self.since is not None else None
+        if ttl_seconds is not None:
+            cutoff = now - ttl_seconds
+            low = cutoff if low is None else max(low, cutoff)
+        high = to_timestamp(self.until) if self.until is not None else None
+        return low, high
+
+
+@dataclass
+class LogPage:
+    """
+    One page of log entries.
+
+    Attributes:
+        entries: Entries of the page, in read order
+        next_cursor: Cursor for the following page (None = last page)
+    """
+    entries: List[LogEntry]
+    next_cursor: Optional[str] = None
+
+    def __iter__(self):
+        return (entry.value for entry in self.entries)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+
+def next_log_cursor(entries: List[LogEntry], has_more: bool) -> Optional[str]:
+    """Cursor after the last entry of a page if more entries follow."""
+    if not has_more or not entries:
+        return None
+    return encode_cursor(entries[-1].ts, entries[-1].id)
+
+
+class EpisodeLog:
+    """
+    In-process log stream: append times in a contiguous ``array('d')`` and
+    values in a list, both indexed by ``seq - first_seq``.
+
+    Append times never decrease, so a time range is two binary searches
+    and a cursor is an offset; reads copy only the requested page. Capping
+    and expiry drop entries from the front, compacting the arrays once
+    half of them are dead.
+    """
+
+    def __init__(self):
+        self._ts = array("d")
+        self._values: List[Any] = []
+        self._start = 0  # offset of the oldest live entry
+        self.first_seq = 1  # sequence number of the oldest live entry
+
+    def __len__(self) -> int:
+        return len(self._values) - self._start
+
+    @property
+    def next_seq(self) -> int:
+        return self.first_seq + len(self)
+
+    @property
+    def last_ts(self) -> float:
+        return self._ts[-1] if len(self) else 0.0
+
+    def append(
+        self, values: Sequence[Any], now: float, max_len: Optional[int] = None
+    ) -> List[LogEntry]:
+        """
+        Append values stamped ``now`` (or the last append time if later).
+
+        Args:
+            values: Values to append, in order
+            now: Current time as epoch seconds
+            max_len: Keep only the newest ``max_len`` entries (None = all)
+
+        Returns:
+            The appended entries
+        """
+        ts = max(now, self.last_ts)
+        seq = self.next_seq
+        entries = [LogEntry(str(seq + i), ts, value) for i, value in enumerate(values)]
+        self._ts.extend([ts] * len(values))
+        self._values.extend(values)
+        if max_len is not None:
+            self._drop(len(self) - max_len)
+        return entries
+
+    def dump(self) -> List[Any]:
+        """``[first_seq, [[ts, value], ...]]`` of the live entries."""
+        live = range(self._start, len(self._values))
+        return [self.first_seq, [[self._ts[i], self._values[i]] for i in live]]
+
+    @classmethod
+    def load(cls, data: Sequence[Any]) -> "EpisodeLog":
+        """Rebuild a log from ``dump()`` output."""
+        first_seq, entries = data
+        log = cls()
+        log.first_seq = int(first_seq)
+        log._ts.extend(float(ts) for ts, _ in entries)
+        log._values.extend(value for _, value in entries)
+        return log
+
+    def expire(self, before_ts: float) -> int:
+        """Drop entries appended before ``before_ts``; returns how many."""
+        end = bisect.bisect_left(self._ts, before_ts, self._start)
+        return self._drop(end - self._start)
+
+    def _drop(self, count: int) -> int:
+        if count <= 0:
+            return 0
+        self._start += count
+        self.first_seq += count
+        if self._start * 2 >= len(self._values):
+            del self._ts[: self._start]
+            del self._values[: self._start]
+            self._start = 0
+        return count
+
+    def read(
+        self, query: LogQuery, ttl_seconds: Optional[int], now: float
+    ) -> Tuple[List[LogEntry], bool]:
+        """
+        Read one page of ``query``.
+
+        Returns:
+            The page's entries and whether more entries follow
+        """
+        low, high = query.bounds(ttl_seconds, now)
+        begin = self._start
+        if low is not None:
+            begin = bisect.bisect_left(self._ts, low, begin)
+        end = len(self._values)
+        if high is not None:
+            end = bisect.bisect_left(self._ts, high, begin)
+        after = query.after()
+        if after is not None:
+            offset = int(after[1]) - self.first_seq + self._start
+            if query.reverse:
+                end = min(end, offset)
+            else:
+                begin = max(begin, offset + 1)
+
+        if query.reverse:
+            stop = max(begin, end - query.limit - 1)
+            positions = range(end - 1, stop - 1, -1)
+        else:
+            positions = range(begin, min(end, begin + query.limit + 1))
+        entries = [
+            LogEntry(
+                str(self.first_seq + i - self._start), self._ts[i], self._values[i]
+            )
+            for i in positions
+        ]
+        return entries[: query.limit], len(entries) > query.limit
@@ -0,0 +1,136 @@
+"""
+Typed edges between memories, kept as adjacency lists next to them in the
+store, and batched breadth-first expansion over those edges.
+"""
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+DIRECTIONS = ("out", "in", "both")
+DEFAULT_MAX_NODES = 1000
+
+# Reads the values of a list of keys in one call (None for missing ones)
+ReadMany = Callable[[List[str]], List[Optional[Any]]]
+
+
+@dataclass
+class GraphNode:
+    """
+    One memory reached by ``expand``.
+
+    Attributes:
+        key: Memory key (as passed to ``MemoryClient.recall``)
+        depth: Hops from the nearest start key (0 for start keys)
+        value: Stored memory model dict
+        relation: Relation of the edge it was reached by (None at depth 0)
+        parent: Key it was reached from (None at depth 0)
+    """
+    key: str
+    depth: int
+    value: Any
+    relation: Optional[str] = None
+    parent: Optional[str] = None
+
+
+def adjacency_key(key: str, direction: str) -> str:
+    """Store key of a memory's forward ("out") or reverse ("in") edge list."""
+    return f"edges/{direction}/{key}"
+
+
+def edges_of(adjacency: Any) -> Dict[str, List[str]]:
+    """Relation -> neighbour keys of a stored edge list (empty if none)."""
+    if isinstance(adjacency, dict) and isinstance(adjacency.get("edges"), dict):
+        return adjacency["edges"]
+    return {}
+
+
+def with_edge(adjacency: Any, relation: str, key: str) -> Dict[str, Any]:
+    """Copy of a stored edge list with the edge to ``key`` added."""
+    edges = {r: list(keys) for r, keys in edges_of(adjacency).items()}
+    neighbours = edges.setdefault(relation, [])
+    if key not in neighbours:
+        neighbours.append(key)
+    return {"edges": edges}
+
+
+def without_edge(adjacency: Any, relation: str, key: str) -> Dict[str, Any]:
+    """Copy of a stored edge list with the edge to ``key`` removed."""
+    edges = {}
+    for r, keys in edges_of(adjacency).items():
+        kept = [k for k in keys if r != relation or k != key]
+        if kept:
+            edges[r] = kept
+    return {"edges": edges}
+
+
+def expand(
+    start: Sequence[str],
+    read_many: ReadMany,
+    depth: int = 1,
+    relations: Optional[Sequence[str]] = None,
+    direction: str = "out",
+    max_nodes: int = DEFAULT_MAX_NODES,
+) -> List[GraphNode]:
+    """
+    Breadth-first expansion from ``start`` up to ``depth`` hops.
+
+    Each level costs one ``read_many`` call, fetching the values and the
+    edge lists of the whole frontier together, so a k-hop expansion takes
+    k + 1 round trips however many memories it reaches. Edges to memories
+    that no longer exist are skipped.
+
+    Args:
+        start: Keys to expand from
+        read_many: Batched reader of store keys
+        depth: Maximum hops from a start key
+        relations: Only follow these relations (None = all)
+        direction: Follow edges "out" (source -> target), "in" (reverse)
+            or "both"
+        max_nodes: Stop discovering memories after this many
+
+    Returns:
+        Reached memories in breadth-first order
+    """
+    if direction not in DIRECTIONS:
+        raise ValueError(f"direction must be one of {DIRECTIONS}")
+    if depth < 0:
+        raise ValueError("depth must not be negative")
+    sides = ("out", "in") if direction == "both" else (direction,)
+    allowed = None if relations is None else set(relations)
+
+    # key -> (relation, parent) of the edge that first reached it
+    seen: Dict[str, Tuple[Optional[str], Optional[str]]] = {}
+    frontier: List[str] = []
+    for key in start:
+        if key not in seen and len(seen) < max_nodes:
+            seen[key] = (None, None)
+            frontier.append(key)
+
+    nodes: List[GraphNode] = []
+    for level in range(depth + 1):
+        if not frontier:
+            break
+        follow = level < depth
+        keys = list(frontier)
+        if follow:
+            keys += [adjacency_key(key, side) for key in frontier for side in sides]
+        values = read_many(keys)
+        adjacency = iter(values[len(frontier):])
+
+        next_frontier: List[str] = []
+        for key, value in zip(frontier, values[: len(frontier)], strict=True):
+            edge_lists = [next(adjacency) for _ in sides] if follow else []
+            if value is None:
+                continue
+            relation, parent = seen[key]
+            nodes.append(GraphNode(key, level, value, relation, parent))
+            for edge_list in edge_lists:
+                for rel, neighbours in edges_of(edge_list).items():
+                    if allowed is not None and rel not in allowed:
+                        continue
+                    for neighbour in neighbours:
+                        if neighbour in seen or len(seen) >= max_nodes:
+                            continue
+                        seen[neighbour] = (rel, key)
+                        next_frontier.append(neighbour)
+        frontier = next_frontier
+    return nodes
@@ -0,0 +1,308 @@
+"""
+BM25 inverted index over memory text, for exact-term (keyword) search.
+"""
+import math
+import re
+import threading
+from array import array
+from collections import Counter
+from typing import Callable, Dict, List, Optional, Tuple
+
+from agent_memory_hub.indexing.embeddings import NUMPY_AVAILABLE, _require_numpy
+from agent_memory_hub.indexing.scoped_index import ScopedIndex
+
+if NUMPY_AVAILABLE:
+    import numpy as np
+
+# Words, keeping identifiers such as "ord-1234" or "e_conn.reset" whole
+_TOKEN = re.compile(r"\w+(?:[-.:/#]\w+)*", re.UNICODE)
+_PART = re.compile(r"[^\W_]+", re.UNICODE)
+# Narrowest array typecodes first; a postings list widens when needed
+_WIDTHS = tuple(
+    (code, (1 << (8 * array(code).itemsize)) - 1) for code in ("B", "H", "I")
+)
+_LIMITS = dict(_WIDTHS)
+_INITIAL_CAPACITY = 1024
+# Score sparsely when matched postings are this many times fewer than documents
+_SPARSE_RATIO = 16
+# Compact once this many documents are deleted and they outnumber live ones
+_COMPACT_MIN_DEAD = 1024
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Lowercased terms of ``text``. Compound identifiers are kept whole and
+    also split into their parts, so "ORD-1234" matches both "ord-1234" and
+    "1234".
+    """
+    tokens = []
+    for match in _TOKEN.finditer(text.lower()):
+        token = match.group()
+        tokens.append(token)
+        parts = _PART.findall(token)
+        if len(parts) > 1:
+            tokens.extend(parts)
+    return tokens
+
+
+def _widen(values: array, value: int) -> array:
+    """Return ``values`` re-typed to the narrowest typecode holding ``value``."""
+    for code, limit in _WIDTHS:
+        if value <= limit:
+            if array(code).itemsize > values.itemsize:
+                return array(code, values)
+            return values
+    raise OverflowError(f"Posting value too large: {value}")
+
+
+class _Postings:
+    """
+    Documents containing one term, as ascending doc-id deltas and term
+    frequencies in the narrowest array typecode that fits (usually 1 byte
+    each).
+    """
+
+    __slots__ = ("deltas", "tfs", "last_doc")
+
+    def __init__(self):
+        self.deltas = array("B")
+        self.tfs = array("B")
+        self.last_doc = 0
+
+    def append(self, doc: int, tf: int) -> None:
+        delta = doc - self.last_doc
+        if delta > _LIMITS[self.deltas.typecode]:
+            self.deltas = _widen(self.deltas, delta)
+        self.deltas.append(delta)
+        if tf > _LIMITS[self.tfs.typecode]:
+            self.tfs = _widen(self.tfs, tf)
+        self.tfs.append(tf)
+        self.last_doc = doc
+
+    def decode(self) -> Tuple["np.ndarray", "np.ndarray"]:
+        docs = np.cumsum(np.frombuffer(self.deltas, dtype=self.deltas.typecode))
+        tfs = np.frombuffer(self.tfs, dtype=self.tfs.typecode).astype(np.float32)
+        return docs, tfs
+
+    @classmethod
+    def encode(cls, docs: "np.ndarray", tfs: "np.ndarray") -> "_Postings":
+        postings = cls()
+        deltas = np.diff(docs, prepend=0)
+        postings.deltas = _widen(postings.deltas, int(deltas.max()))
+        postings.deltas.frombytes(deltas.astype(postings.deltas.typecode).tobytes())
+        postings.tfs = _widen(postings.tfs, int(tfs.max()))
+        postings.tfs.frombytes(tfs.astype(postings.tfs.typecode).tobytes())
+        postings.last_doc = int(docs[-1])
+        return postings
+
+
+class InvertedIndex:
+    """
+    Incrementally maintained inverted index with Okapi BM25 scoring.
+
+    Documents get increasing ids, so new postings are appended as deltas.
+    Removing or replacing a document only marks its id dead; dead ids are
+    skipped when scoring (IDF counts live documents only) and dropped by
+    a compaction once they outnumber live ones.
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        """
+        Args:
+            k1: Term frequency saturation
+            b: Document length normalization (0 = none, 1 = full)
+        """
+        _require_numpy()
+        self.k1 = k1
+        self.b = b
+        self._postings: Dict[str, _Postings] = {}
+        self._doc_keys: List[Optional[str]] = []
+        self._doc_ids: Dict[str, int] = {}
+        self._lengths = np.zeros(_INITIAL_CAPACITY, dtype=np.float32)
+        self._live = np.zeros(_INITIAL_CAPACITY, dtype=bool)
+        self._live_tokens = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._doc_ids)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._doc_ids
+
+    @property
+    def posting_bytes(self) -> int:
+        """Memory held by postings arrays."""
+        return sum(
+            len(p.deltas) * p.deltas.itemsize + len(p.tfs) * p.tfs.itemsize
+            for p in self._postings.values()
+        )
+
+    def add(self, key: str, tokens: List[str]) -> None:
+        """Insert or replace the document of ``key``."""
+        with self._lock:
+            self._remove(key)
+            doc = len(self._doc_keys)
+            if doc == len(self._live):
+                self._grow()
+            self._doc_keys.append(key)
+            self._doc_ids[key] = doc
+            self._lengths[doc] = len(tokens)
+            self._live[doc] = True
+            self._live_tokens += len(tokens)
+            for term, tf in Counter(tokens).items():
+                postings = self._postings.get(term)
+                if postings is None:
+                    postings = self._postings[term] = _Postings()
+                postings.append(doc, tf)
+            self._maybe_compact()
+
+    def remove(self, key: str) -> bool:
+        """Remove ``key``; returns False if it was not indexed."""
+        with self._lock:
+            removed = self._remove(key)
+            self._maybe_compact()
+            return removed
+
+    def search(
+        self,
+        tokens: List[str],
+        k: int,
+        allowed: Optional[Callable[[str], bool]] = None,
+    ) -> List[Tuple[str, float]]:
+        """
+        Top-k documents by BM25 score.
+
+        Args:
+            tokens: Query terms (see ``tokenize``)
+            k: Maximum results
+            allowed: Only return keys for which this returns True
+
+        Returns:
+            ``(key, score)`` pairs, best first
+        """
+        with self._lock:
+            n = len(self._doc_ids)
+            if n == 0 or k < 1 or not tokens:
+                return []
+            avgdl = max(self._live_tokens / n, 1e-9)
+            hits, total = [], 0
+            for term, qtf in Counter(tokens).items():
+                postings = self._postings.get(term)
+                if postings is None:
+                    continue
+                docs, tfs = postings.decode()
+                live = self._live[docs]
+                docs, tfs = docs[live], tfs[live]
+                df = len(docs)
+                if df == 0:
+                    continue
+                idf = math.log(1.0 + (n - df + 0.5) / (df + 0.5))
+                norm = self.k1 * (1.0 - self.b + self.b * self._lengths[docs] / avgdl)
+                hits.append((docs, qtf * idf * tfs * (self.k1 + 1.0) / (tfs + norm)))
+                total += df
+            if not hits:
+                return []
+
+            if total * _SPARSE_RATIO < len(self._doc_keys):
+                # Rare terms: sum per matched document without touching
+                # every document id
+                matched, inverse = np.unique(
+                    np.concatenate([docs for docs, _ in hits]), return_inverse=True
+                )
+                scores = np.bincount(
+                    inverse, weights=np.concatenate([s for _, s in hits])
+                )
+            else:
+                dense = np.zeros(len(self._doc_keys), dtype=np.float32)
+                for docs, term_scores in hits:
+                    dense[docs] += term_scores
+                matched = np.flatnonzero(dense)
+                scores = dense[matched]
+
+            if allowed is None:
+                top = min(k, len(matched))
+                best = np.argpartition(-scores, top - 1)[:top]
+                best = best[np.argsort(-scores[best], kind="stable")]
+                return [
+                    (self._doc_keys[matched[i]], float(scores[i])) for i in best
+                ]
+
+            results = []
+            for i in np.argsort(-scores, kind="stable"):
+                key = self._doc_keys[matched[i]]
+                if allowed(key):
+                    results.append((key, float(scores[i])))
+                    if len(results) == k:
+                        break
+            return results
+
+    def _remove(self, key: str) -> bool:
+        doc = self._doc_ids.pop(key, None)
+        if doc is None:
+            return False
+        self._doc_keys[doc] = None
+        self._live[doc] = False
+        self._live_tokens -= int(self._lengths[doc])
+        return True
+
+    def _grow(self) -> None:
+        capacity = len(self._live) * 2
+        for name in ("_lengths", "_live"):
+            old = getattr(self, name)
+            grown = np.zeros(capacity, dtype=old.dtype)
+            grown[: len(old)] = old
+            setattr(self, name, grown)
+
+    def _maybe_compact(self) -> None:
+        dead = len(self._doc_keys) - len(self._doc_ids)
+        if dead >= _COMPACT_MIN_DEAD and dead > len(self._doc_ids):
+            self._compact()
+
+    def _compact(self) -> None:
+        """Renumber live documents densely and drop dead postings."""
+        total = len(self._doc_keys)
+        live = self._live[:total]
+        new_ids = np.cumsum(live) - 1
+        for term, postings in list(self._postings.items()):
+            docs, tfs = postings.decode()
+            keep = live[docs]
+            if keep.any():
+                self._postings[term] = _Postings.encode(new_ids[docs[keep]], tfs[keep])
+            else:
+                del self._postings[term]
+        survivors = np.flatnonzero(live)
+        self._doc_keys = [self._doc_keys[d] for d in survivors]
+        self._doc_ids = {key: i for i, key in enumerate(self._doc_keys)}
+        lengths = self._lengths[survivors]
+        capacity = max(_INITIAL_CAPACITY, len(survivors) * 2)
+        self._lengths = np.zeros(capacity, dtype=np.float32)
+        self._lengths[: len(survivors)] = lengths
+        self._live = np.zeros(capacity, dtype=bool)
+        self._live[: len(survivors)] = True
+
+
+class KeywordIndex(ScopedIndex):
+    """
+    BM25 index over the text of EpisodicMemory and SemanticMemory dicts,
+    one ``InvertedIndex`` per memory scope.
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        """
+        Args:
+            k1: BM25 term frequency saturation
+            b: BM25 document length normalization
+        """
+        _require_numpy()
+        super().__init__()
+        self.k1 = k1
+        self.b = b
+
+    def _new_scope(self) -> InvertedIndex:
+        return InvertedIndex(self.k1, self.b)
+
+    def _prepare(self, texts: List[str]) -> List[List[str]]:
+        return [tokenize(text) for text in texts]
+
+    def _prepare_query(self, text: str) -> List[str]:
+        return tokenize(text)
@@ -0,0 +1,275 @@
+"""
+In-process secondary index for stores without a native one.
+"""
+import threading
+from bisect import bisect_left, bisect_right, insort
+from typing import Dict, List, Optional, Set, Tuple
+
+from agent_memory_hub.indexing.bitmap import TagIndex
+from agent_memory_hub.indexing.query import (
+    RANK_ORDERS,
+    IndexRecord,
+    MemoryQuery,
+    RankQuery,
+    TriplePattern,
+    next_rank_cursor,
+    paginate,
+    paginate_triples,
+    rank_order,
+    rank_value,
+)
+
+# Term order of each permutation index, as positions in (s, p, o)
+_PERMUTATIONS = {"spo": (0, 1, 2), "pos": (1, 2, 0), "osp": (2, 0, 1)}
+
+
+def _terms(record: IndexRecord) -> Tuple[str, str, str]:
+    return (record.subject, record.predicate, record.object)
+
+
+def _collect(node, keys: Set[str], depth: int) -> None:
+    if depth == 0:
+        keys.update(node)
+        return
+    for child in node.values():
+        _collect(child, keys, depth - 1)
+
+
+class TripleIndex:
+    """
+    SPO, POS and OSP permutation indexes over the triples of one session,
+    each a ``{term: {term: {term: {key}}}}`` tree.
+
+    The bound terms of any pattern form a prefix of one permutation
+    (``(X, ?, ?)`` and ``(X, Y, ?)`` of SPO, ``(?, Y, ?)`` and ``(?, Y, Z)``
+    of POS, ``(?, ?, Z)`` and ``(X, ?, Z)`` of OSP), so a match descends a
+    single tree.
+    """
+
+    def __init__(self):
+        self._records: Dict[str, IndexRecord] = {}
+        self._trees: Dict[str, dict] = {name: {} for name in _PERMUTATIONS}
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def add(self, record: IndexRecord) -> None:
+        """Index a triple record, replacing any previous one of its key."""
+        self.remove(record.key)
+        self._records[record.key] = record
+        terms = _terms(record)
+        for name, order in _PERMUTATIONS.items():
+            node = self._trees[name]
+            for position in order[:-1]:
+                node = node.setdefault(terms[position], {})
+            node.setdefault(terms[order[-1]], set()).add(record.key)
+
+    def remove(self, key: str) -> None:
+        """Drop the triple of ``key`` if indexed."""
+        record = self._records.pop(key, None)
+        if record is None:
+            return
+        terms = _terms(record)
+        for name, order in _PERMUTATIONS.items():
+            path = [self._trees[name]]
+            for position in order[:-1]:
+                path.append(path[-1][terms[position]])
+            leaf_term = terms[order[-1]]
+            path[-1][leaf_term].discard(key)
+            if not path[-1][leaf_term]:
+                del path[-1][leaf_term]
+            # Prune branches left empty
+            for depth in range(len(path) - 1, 0, -1):
+                if path[depth]:
+                    break
+                del path[depth - 1][terms[order[depth - 1]]]
+
+    def match(self, pattern: TriplePattern) -> List[IndexRecord]:
+        """Records whose triple matches the bound terms of ``pattern``."""
+        bound = (pattern.subject, pattern.predicate, pattern.object)
+        count = sum(term is not None for term in bound)
+        if count == 0:
+            return list(self._records.values())
+        for name, order in _PERMUTATIONS.items():
+            prefix = [bound[position] for position in order][:count]
+            if None not in prefix:
+                node = self._trees[name]
+                break
+        for term in prefix:
+            node = node.get(term)
+            if node is None:
+                return []
+        keys: Set[str] = set()
+        _collect(node, keys, 3 - count)
+        return [self._records[key] for key in keys]
+
+
+class RankIndex:
+    """
+    Sorted ``(-value, key)`` lists over the records of one session, one per
+    rank order (importance, recency) for all records, each scope and each
+    memory type.
+
+    A top-k query bisects to its cursor in the list of its most selective
+    filter and reads forward, so it costs O(log n + k) however many records
+    the session holds. An update bisects in O(log n) too, but inserting
+    into or deleting from a Python list shifts the entries after it, so
+    it costs O(n) (one contiguous memmove, cheap in practice).
+    """
+
+    def __init__(self):
+        self._records: Dict[str, IndexRecord] = {}
+        self._lists: Dict[Tuple[str, str, Optional[str]], List[Tuple[float, str]]] = {}
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    @staticmethod
+    def _dimensions(record: IndexRecord) -> List[Tuple[str, Optional[str]]]:
+        return [("all", None), ("scope", record.scope), ("type", record.memory_type)]
+
+    def add(self, record: IndexRecord) -> None:
+        """Index a record, replacing any previous one of its key."""
+        self.remove(record.key)
+        self._records[record.key] = record
+        for by in RANK_ORDERS:
+            if rank_value(record, by) is None:
+                continue
+            entry = rank_order(record, by)
+            for dimension in self._dimensions(record):
+                insort(self._lists.setdefault((by, *dimension), []), entry)
+
+    def remove(self, key: str) -> None:
+        """Drop the record of ``key`` if indexed."""
+        record = self._records.pop(key, None)
+        if record is None:
+            return
+        for by in RANK_ORDERS:
+            if rank_value(record, by) is None:
+                continue
+            entry = rank_order(record, by)
+            for dimension in self._dimensions(record):
+                name = (by, *dimension)
+                entries = self._lists[name]
+                i = bisect_left(entries, entry)
+                if i < len(entries) and entries[i] == entry:
+                    del entries[i]
+                if not entries:
+                    del self._lists[name]
+
+    def top(self, query: RankQuery) -> Tuple[List[IndexRecord], Optional[str]]:
+        """The page of records ``query`` selects and the next cursor."""
+        if query.memory_type is not None:
+            dimension = ("type", query.memory_type)
+        elif query.scope is not None:
+            dimension = ("scope", query.scope)
+        else:
+            dimension = ("all", None)
+        entries = self._lists.get((query.by, *dimension), [])
+        after = query.after()
+        start = bisect_right(entries, after) if after is not None else 0
+        records: List[IndexRecord] = []
+        for i in range(start, len(entries)):
+            record = self._records[entries[i][1]]
+            if query.matches(record):
+                records.append(record)
+                if len(records) > query.limit:
+                    break
+        page = records[: query.limit]
+        return page, next_rank_cursor(page, len(records) > query.limit, query.by)
+
+
+class SessionIndex:
+    """
+    Thread-safe ``{session_id: {key: IndexRecord}}`` map with the same
+    pagination semantics as the backend-native indexes, plus a
+    ``TripleIndex`` per session for SemanticMemory pattern queries and a
+    ``TagIndex`` per session that narrows tag-filtered queries to the
+    matching records before they are paged, and a ``RankIndex`` per session
+    for top-k queries by importance or recency.
+    """
+
+    def __init__(self):
+        self._sessions: Dict[str, Dict[str, IndexRecord]] = {}
+        self._triples: Dict[str, TripleIndex] = {}
+        self._tags: Dict[str, TagIndex] = {}
+        self._ranks: Dict[str, RankIndex] = {}
+        self._lock = threading.Lock()
+
+    def update(
+        self, session_id: str, key: str, record: Optional[IndexRecord]
+    ) -> None:
+        """
+        Index ``record`` under ``key`` (None removes the key).
+
+        Callers must serialize updates of the same key (stores do so under
+        their per-key lock), which makes the unlocked fast path below safe.
+        """
+        if record is None and session_id not in self._sessions:
+            return  # common case: plain values in sessions without models
+        with self._lock:
+            records = self._sessions.get(session_id)
+            previous = records.get(key) if records is not None else None
+            if previous is not None and previous.is_triple:
+                triples = self._triples[session_id]
+                triples.remove(key)
+                if not len(triples):
+                    del self._triples[session_id]
+            if record is not None and record.tags:
+                tag_index = self._tags.setdefault(session_id, TagIndex())
+                tag_index.update(key, record.tags)
+            elif previous is not None and previous.tags:
+                tag_index = self._tags[session_id]
+                tag_index.remove(key)
+                if not len(tag_index):
+                    del self._tags[session_id]
+            if record is not None:
+                self._sessions.setdefault(session_id, {})[key] = record
+                if record.is_triple:
+                    self._triples.setdefault(session_id, TripleIndex()).add(record)
+                self._ranks.setdefault(session_id, RankIndex()).add(record)
+                return
+            if records is not None:
+                records.pop(key, None)
+                if not records:
+                    del self._sessions[session_id]
+            ranks = self._ranks.get(session_id)
+            if ranks is not None:
+                ranks.remove(key)
+                if not len(ranks):
+                    del self._ranks[session_id]
+
+    def query(
+        self, session_id: str, query: MemoryQuery
+    ) -> Tuple[List[IndexRecord], Optional[str]]:
+        """Matching records of one session page and the next cursor."""
+        with self._lock:
+            session = self._sessions.get(session_id, {})
+            if query.filters_tags:
+                tag_index = self._tags.get(session_id)
+                if tag_index is None:
+                    return [], None
+                tagged = tag_index.match(all_of=query.tags, any_of=query.any_tags)
+                records = [session[key] for key in tag_index.keys(tagged)]
+            else:
+                records = list(session.values())
+        return paginate(records, query)
+
+    def match_triples(
+        self, session_id: str, pattern: TriplePattern
+    ) -> Tuple[List[IndexRecord], Optional[str]]:
+        """Triple records of one session matching ``pattern``, paged."""
+        with self._lock:
+            triples = self._triples.get(session_id)
+            records = triples.match(pattern) if triples is not None else []
+        return paginate_triples(records, pattern)
+
+    def rank(
+        self, session_id: str, query: RankQuery
+    ) -> Tuple[List[IndexRecord], Optional[str]]:
+        """Top records of one session by ``query.by``, paged."""
+        with self._lock:
+            ranks = self._ranks.get(session_id)
+            if ranks is None:
+                return [], None
+            return ranks.top(query)
@@ -0,0 +1,109 @@
+"""
+Ownership index: which sessions each user and agent wrote memories to, kept
+in the store itself so erasure requests can find them without scanning
+every session.
+"""
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, Optional
+from urllib.parse import quote, unquote
+
+from agent_memory_hub.data_plane.adk_session_store import StoredEntry
+
+# Reserved session holding the ownership records
+OWNERS_SESSION = "__owners__"
+
+
+@dataclass(frozen=True)
+class Ownership:
+    """
+    One (session, agent) pair a user or agent owns memories in.
+
+    Attributes:
+        session_id: Session identifier
+        agent_id: Agent whose keys (``"{agent_id}/..."``) and episode log
+            hold the memories
+        user_id: User the agent served in the session (None if not set)
+    """
+    session_id: str
+    agent_id: str
+    user_id: Optional[str] = None
+
+
+def _part(value: Optional[str]) -> str:
+    # Identifiers may contain "/", which separates the key parts
+    return quote(value or "", safe="")
+
+
+class OwnershipIndex:
+    """
+    Records of ``user → (session, agent)`` and ``agent → (session, user)``
+    in the ``__owners__`` session of a store, one key each::
+
+        user/{user_id}/{session_id}/{agent_id}
+        agent/{agent_id}/{session_id}/{user_id}
+
+    Lookups list keys by prefix (``iter_keys``), so they read only the
+    records of the requested user or agent, in batches. Records never
+    expire, whatever the store's TTL: a client registers once, and its
+    memories outlive the first write's TTL as long as it keeps writing.
+    """
+
+    def __init__(self, store: Any):
+        """
+        Args:
+            store: SessionStore or MemoryRouter the records are kept in
+        """
+        self.store = store
+
+    @staticmethod
+    def _keys(ownership: Ownership) -> Dict[str, Dict[str, Any]]:
+        record = {
+            "session_id": ownership.session_id,
+            "agent_id": ownership.agent_id,
+            "user_id": ownership.user_id,
+        }
+        session, agent = _part(ownership.session_id), _part(ownership.agent_id)
+        user = _part(ownership.user_id)
+        keys = {f"agent/{agent}/{session}/{user}": record}
+        if ownership.user_id is not None:
+            keys[f"user/{user}/{session}/{agent}"] = record
+        return keys
+
+    def register(self, ownership: Ownership) -> None:
+        """Record that ``ownership.agent_id`` wrote to the session."""
+        now = time.time()
+        self.store.write_entries(OWNERS_SESSION, {
+            key: StoredEntry(record, created_at=now, expires_at=None)
+            for key, record in self._keys(ownership).items()
+        })
+
+    def unregister(self, ownership: Ownership) -> None:
+        """Drop the records of an erased (session, agent) pair."""
+        for key in self._keys(ownership):
+            self.store.delete(OWNERS_SESSION, key)
+
+    def owned(
+        self, user_id: Optional[str] = None, agent_id: Optional[str] = None
+    ) -> Iterator[Ownership]:
+        """
+        Stream the (session, agent) pairs of a user, an agent, or an agent
+        serving a user.
+
+        Raises:
+            ValueError: If neither ``user_id`` nor ``agent_id`` is given
+        """
+        if user_id is not None:
+            prefix = f"user/{_part(user_id)}/"
+        elif agent_id is not None:
+            prefix = f"agent/{_part(agent_id)}/"
+        else:
+            raise ValueError("user_id or agent_id is required")
+        for key in self.store.iter_keys(OWNERS_SESSION, prefix):
+            first, second = (unquote(part) for part in key[len(prefix):].split("/"))
+            if user_id is not None:
+                ownership = Ownership(first, second, user_id)
+            else:
+                ownership = Ownership(first, agent_id, second or None)
+            if agent_id is None or ownership.agent_id == agent_id:
+                yield ownership
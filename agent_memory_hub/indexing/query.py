@@ -0,0 +1,483 @@
+"""
+Query model and helpers shared by the secondary indexes of every backend.
+"""
+import base64
+import heapq
+import json
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 1000
+# Orders maintained by the ranked indexes (see RankQuery)
+RANK_ORDERS = ("importance", "recency")
+
+
+@dataclass(frozen=True)
+class IndexRecord:
+    """
+    Indexed attributes of one stored memory model.
+
+    Attributes:
+        key: Store key of the memory (e.g. "agent/semanticmemory/<id>")
+        memory_type: Model class name (e.g. "SemanticMemory")
+        scope: Memory scope value (e.g. "session")
+        tags: Tags of the memory
+        created_ts: Creation time as UTC epoch seconds
+        subject: Triple subject (SemanticMemory only)
+        predicate: Triple predicate (SemanticMemory only)
+        object: Triple object (SemanticMemory only)
+        truth_score: Truth score of the triple (SemanticMemory only)
+        importance: The memory's ``importance``
+        recency_ts: Last activity as UTC epoch seconds (``timestamp`` of
+            episodes, ``updated_at`` of other models)
+    """
+    key: str
+    memory_type: str
+    scope: Optional[str]
+    tags: Tuple[str, ...]
+    created_ts: float
+    subject: Optional[str] = None
+    predicate: Optional[str] = None
+    object: Optional[str] = None
+    truth_score: Optional[float] = None
+    importance: Optional[float] = None
+    recency_ts: Optional[float] = None
+
+    @property
+    def is_triple(self) -> bool:
+        return self.subject is not None
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = {
+            "memory_type": self.memory_type,
+            "scope": self.scope,
+            "tags": list(self.tags),
+            "created_ts": self.created_ts,
+        }
+        if self.is_triple:
+            data.update(
+                subject=self.subject,
+                predicate=self.predicate,
+                object=self.object,
+                truth_score=self.truth_score,
+            )
+        if self.importance is not None:
+            data["importance"] = self.importance
+        if self.recency_ts is not None:
+            data["recency_ts"] = self.recency_ts
+        return data
+
+    @classmethod
+    def from_dict(cls, key: str, data: Dict[str, Any]) -> "IndexRecord":
+        truth_score = data.get("truth_score")
+        importance = data.get("importance")
+        recency_ts = data.get("recency_ts")
+        return cls(
+            key=key,
+            memory_type=data["memory_type"],
+            scope=data.get("scope"),
+            tags=tuple(data.get("tags") or ()),
+            created_ts=float(data["created_ts"]),
+            subject=data.get("subject"),
+            predicate=data.get("predicate"),
+            object=data.get("object"),
+            truth_score=float(truth_score) if truth_score is not None else None,
+            importance=float(importance) if importance is not None else None,
+            recency_ts=float(recency_ts) if recency_ts is not None else None,
+        )
+
+
+@dataclass
+class MemoryQuery:
+    """
+    Filter over the memory models of one session.
+
+    All given criteria must match: ``tags`` requires every listed tag,
+    ``any_tags`` at least one of its tags, and ``since``/``until`` bound the
+    memory's ``created_at`` (inclusive / exclusive). Results are ordered by
+    ``created_at``, then key.
+
+    Attributes:
+        memory_type: Model class name (e.g. "SemanticMemory")
+        scope: Memory scope (e.g. "session", "global")
+        tags: Tags that must all be present
+        any_tags: Tags of which at least one must be present
+        since: Earliest creation time (inclusive)
+        until: Latest creation time (exclusive)
+        key_prefix: Only keys starting with this prefix (e.g. "agent/")
+        limit: Maximum results per page
+        cursor: Opaque cursor from a previous page's ``next_cursor``
+    """
+    memory_type: Optional[str] = None
+    scope: Optional[str] = None
+    tags: Sequence[str] = field(default_factory=tuple)
+    since: Optional[datetime] = None
+    until: Optional[datetime] = None
+    key_prefix: str = ""
+    limit: int = DEFAULT_LIMIT
+    cursor: Optional[str] = None
+    any_tags: Sequence[str] = field(default_factory=tuple)
+
+    def __post_init__(self):
+        if not 1 <= self.limit <= MAX_LIMIT:
+            raise ValueError(f"limit must be between 1 and {MAX_LIMIT}")
+        self.tags = tuple(self.tags)
+        self.any_tags = tuple(self.any_tags)
+
+    @property
+    def filters_tags(self) -> bool:
+        return bool(self.tags or self.any_tags)
+
+    @property
+    def since_ts(self) -> Optional[float]:
+        return to_timestamp(self.since) if self.since is not None else None
+
+    @property
+    def until_ts(self) -> Optional[float]:
+        return to_timestamp(self.until) if self.until is not None else None
+
+    def after(self) -> Optional[Tuple[float, str]]:
+        """Position ``(created_ts, key)`` the page starts after, from the cursor."""
+        return decode_cursor(self.cursor) if self.cursor else None
+
+    def matches(self, record: IndexRecord) -> bool:
+        """Check a record against every criterion except pagination."""
+        if not record.key.startswith(self.key_prefix):
+            return False
+        if self.memory_type is not None and record.memory_type != self.memory_type:
+            return False
+        if self.scope is not None and record.scope != self.scope:
+            return False
+        if self.tags and not set(self.tags).issubset(record.tags):
+            return False
+        if self.any_tags and set(self.any_tags).isdisjoint(record.tags):
+            return False
+        if self.since is not None and record.created_ts < self.since_ts:
+            return False
+        if self.until is not None and record.created_ts >= self.until_ts:
+            return False
+        return True
+
+
+@dataclass
+class TriplePattern:
+    """
+    ``(subject, predicate, object)`` pattern over the SemanticMemory models
+    of one session, where None is a wildcard: ``TriplePattern(subject="X")``
+    is ``(X, ?, ?)``. Results are ordered by ``truth_score`` (highest
+    first), then key.
+
+    Attributes:
+        subject: Required subject (None = any)
+        predicate: Required predicate (None = any)
+        object: Required object (None = any)
+        key_prefix: Only keys starting with this prefix (e.g. "agent/")
+        limit: Maximum results per page
+        cursor: Opaque cursor from a previous page's ``next_cursor``
+    """
+    subject: Optional[str] = None
+    predicate: Optional[str] = None
+    object: Optional[str] = None
+    key_prefix: str = ""
+    limit: int = DEFAULT_LIMIT
+    cursor: Optional[str] = None
+
+    def __post_init__(self):
+        if not 1 <= self.limit <= MAX_LIMIT:
+            raise ValueError(f"limit must be between 1 and {MAX_LIMIT}")
+
+    def after(self) -> Optional[Tuple[float, str]]:
+        """Position ``(-truth_score, key)`` the page starts after."""
+        return decode_cursor(self.cursor) if self.cursor else None
+
+    def matches(self, record: IndexRecord) -> bool:
+        """Check a record against the pattern (not pagination)."""
+        return (
+            record.is_triple
+            and record.key.startswith(self.key_prefix)
+            and self.subject in (None, record.subject)
+            and self.predicate in (None, record.predicate)
+            and self.object in (None, record.object)
+        )
+
+
+@dataclass
+class RankQuery:
+    """
+    Top-k over the memory models of one session by ``importance`` or by
+    recency (``timestamp`` of episodes, ``updated_at`` of other models),
+    highest first, then key. Later pages continue down the same order, so
+    paging through a ranked query walks a range of it.
+
+    Attributes:
+        by: "importance" or "recency"
+        memory_type: Model class name (e.g. "EpisodicMemory")
+        scope: Memory scope (e.g. "user")
+        key_prefix: Only keys starting with this prefix (e.g. "agent/")
+        limit: Maximum results per page
+        cursor: Opaque cursor from a previous page's ``next_cursor``
+    """
+    by: str = "importance"
+    memory_type: Optional[str] = None
+    scope: Optional[str] = None
+    key_prefix: str = ""
+    limit: int = DEFAULT_LIMIT
+    cursor: Optional[str] = None
+
+    def __post_init__(self):
+        if self.by not in RANK_ORDERS:
+            raise ValueError(f"by must be one of {RANK_ORDERS}")
+        if not 1 <= self.limit <= MAX_LIMIT:
+            raise ValueError(f"limit must be between 1 and {MAX_LIMIT}")
+
+    def after(self) -> Optional[Tuple[float, str]]:
+        """Position ``(-value, key)`` the page starts after."""
+        return decode_cursor(self.cursor) if self.cursor else None
+
+    def matches(self, record: IndexRecord) -> bool:
+        """Check a record against the filters (not pagination)."""
+        return (
+            rank_value(record, self.by) is not None
+            and record.key.startswith(self.key_prefix)
+            and self.memory_type in (None, record.memory_type)
+            and self.scope in (None, record.scope)
+        )
+
+
+@dataclass
+class QueryPage:
+    """
+    One page of query results.
+
+    Attributes:
+        keys: Store keys of the matching memories, in result order
+        items: Stored values (model dicts), aligned with ``keys``
+        next_cursor: Cursor for the following page (None = last page)
+    """
+    keys: List[str]
+    items: List[Any]
+    next_cursor: Optional[str] = None
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+
+def to_timestamp(value: datetime) -> float:
+    """UTC epoch seconds of a datetime; naive datetimes are taken as UTC."""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+def index_record(key: str, value: Any) -> Optional[IndexRecord]:
+    """
+    Extract the indexed attributes of a stored value.
+
+    Args:
+        key: Store key
+        value: Stored value
+
+    Returns:
+        IndexRecord for memory model dicts (as produced by
+        ``BaseMemory.to_dict``), None for any other value
+    """
+    if not isinstance(value, dict) or not isinstance(value.get("memory_type"), str):
+        return None
+    created_at = value.get("created_at")
+    try:
+        created_ts = to_timestamp(datetime.fromisoformat(created_at))
+    except (TypeError, ValueError):
+        return None
+    tags = value.get("tags") or ()
+    importance = value.get("importance")
+    if isinstance(importance, bool) or not isinstance(importance, (int, float)):
+        importance = None
+    recency_ts = created_ts
+    for field_name in ("timestamp", "updated_at"):
+        if field_name in value:
+            try:
+                recency_ts = to_timestamp(datetime.fromisoformat(value[field_name]))
+            except (TypeError, ValueError):
+                pass
+            break
+    triple = {}
+    if value["memory_type"] == "SemanticMemory":
+        terms = (value.get("subject"), value.get("predicate"), value.get("object"))
+        if all(isinstance(term, str) for term in terms):
+            truth_score = value.get("truth_score")
+            triple = dict(
+                zip(("subject", "predicate", "object"), terms, strict=True),
+                truth_score=float(1.0 if truth_score is None else truth_score),
+            )
+    return IndexRecord(
+        key=key,
+        memory_type=value["memory_type"],
+        scope=value.get("scope"),
+        tags=tuple(t for t in tags if isinstance(t, str)),
+        created_ts=created_ts,
+        importance=float(importance) if importance is not None else None,
+        recency_ts=recency_ts,
+        **triple,
+    )
+
+
+def encode_cursor(created_ts: float, key: str) -> str:
+    """Opaque cursor for the position after ``(created_ts, key)``."""
+    raw = json.dumps([created_ts, key], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> Tuple[float, str]:
+    """
+    Decode a cursor from ``encode_cursor``.
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        created_ts, key = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        return float(created_ts), str(key)
+    except Exception as e:
+        raise ValueError(f"Invalid query cursor: {cursor!r}") from e
+
+
+def paginate(
+    records: Iterable[IndexRecord], query: MemoryQuery
+) -> Tuple[List[IndexRecord], Optional[str]]:
+    """
+    Filter, order and page records in process (for backends whose index is
+    a single document or manifest).
+
+    Returns:
+        The page's records and the cursor of the next page (or None)
+    """
+    after = query.after()
+    matching = sorted(
+        (r for r in records if query.matches(r)),
+        key=lambda r: (r.created_ts, r.key),
+    )
+    if after is not None:
+        matching = [r for r in matching if (r.created_ts, r.key) > after]
+    page = matching[: query.limit]
+    return page, next_cursor(page, len(matching) > query.limit)
+
+
+def next_cursor(page: List[IndexRecord], has_more: bool) -> Optional[str]:
+    """Cursor after the last record of ``page`` if more results follow."""
+    if not has_more or not page:
+        return None
+    return encode_cursor(page[-1].created_ts, page[-1].key)
+
+
+def triple_order(record: IndexRecord) -> Tuple[float, str]:
+    """Sort key of triple pattern results: highest truth_score first."""
+    return (-record.truth_score, record.key)
+
+
+def paginate_triples(
+    records: Iterable[IndexRecord], pattern: TriplePattern
+) -> Tuple[List[IndexRecord], Optional[str]]:
+    """
+    Filter, order and page triple records in process.
+
+    Returns:
+        The page's records and the cursor of the next page (or None)
+    """
+    after = pattern.after()
+    matching = sorted((r for r in records if pattern.matches(r)), key=triple_order)
+    if after is not None:
+        matching = [r for r in matching if triple_order(r) > after]
+    page = matching[: pattern.limit]
+    return page, next_triple_cursor(page, len(matching) > pattern.limit)
+
+
+def next_triple_cursor(page: List[IndexRecord], has_more: bool) -> Optional[str]:
+    """Cursor after the last triple record of ``page`` if more results follow."""
+    if not has_more or not page:
+        return None
+    return encode_cursor(*triple_order(page[-1]))
+
+
+def rank_value(record: IndexRecord, by: str) -> Optional[float]:
+    """The value a ranked index orders ``record`` by (None = not ranked)."""
+    return record.importance if by == "importance" else record.recency_ts
+
+
+def rank_order(record: IndexRecord, by: str) -> Tuple[float, str]:
+    """Sort key of ranked results: highest value first, then key."""
+    return (-rank_value(record, by), record.key)
+
+
+def ranked_record(
+    key: str, memory_type: str, scope: Optional[str], by: str, score: float
+) -> IndexRecord:
+    """Record of a ranked index entry scored ``-value`` (enough for paging)."""
+    field_name = "importance" if by == "importance" else "recency_ts"
+    return IndexRecord(key, memory_type, scope, (), 0.0, **{field_name: -float(score)})
+
+
+def paginate_ranked(
+    records: Iterable[IndexRecord], query: RankQuery
+) -> Tuple[List[IndexRecord], Optional[str]]:
+    """
+    Filter, order and page records by rank in process.
+
+    Returns:
+        The page's records and the cursor of the next page (or None)
+    """
+    after = query.after()
+    matching = (r for r in records if query.matches(r))
+    if after is not None:
+        matching = (r for r in matching if rank_order(r, query.by) > after)
+    # Selecting limit + 1 keeps this O(n log k) instead of a full sort
+    best = heapq.nsmallest(
+        query.limit + 1, matching, key=lambda r: rank_order(r, query.by)
+    )
+    page = best[: query.limit]
+    return page, next_rank_cursor(page, len(best) > query.limit, query.by)
+
+
+def next_rank_cursor(
+    page: List[IndexRecord], has_more: bool, by: str
+) -> Optional[str]:
+    """Cursor after the last ranked record of ``page`` if more results follow."""
+    if not has_more or not page:
+        return None
+    return encode_cursor(*rank_order(page[-1], by))
+
+
+def fetch_page(
+    records: List[IndexRecord],
+    cursor: Optional[str],
+    read: Callable[[List[str]], List[Any]],
+) -> QueryPage:
+    """
+    Load the values of a page of records.
+
+    Index entries can briefly outlive their values (e.g. expired entries not
+    yet cleaned up, or a model overwritten by a plain value); those are
+    dropped, so a page may hold fewer than ``limit`` items while
+    ``next_cursor`` is still set.
+
+    Args:
+        records: Records of the page, in order
+        cursor: Cursor of the next page
+        read: Reads the values of a list of keys (None for missing ones)
+    """
+    keys = [r.key for r in records]
+    values = read(keys) if keys else []
+    found = [
+        (k, v)
+        for k, v in zip(keys, values, strict=True)
+        if index_record(k, v) is not None
+    ]
+    return QueryPage(
+        keys=[k for k, _ in found],
+        items=[v for _, v in found],
+        next_cursor=cursor,
+    )
@@ -0,0 +1,190 @@
+"""
+Vectorized ranking of retrieved memories by relevance, recency, importance,
+confidence and access frequency.
+"""
+import math
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, List, Mapping, Optional, Sequence, Tuple
+
+from agent_memory_hub.config.ranking_config import RankingConfig
+from agent_memory_hub.indexing.embeddings import NUMPY_AVAILABLE, _require_numpy
+from agent_memory_hub.indexing.query import to_timestamp
+
+if NUMPY_AVAILABLE:
+    import numpy as np
+
+_MAX_HALVINGS = 64.0
+
+
+@dataclass
+class Candidates:
+    """
+    Ranking attributes of candidate memories, one array element per key.
+
+    Attributes:
+        keys: Memory keys
+        relevance: Search scores (any scale; higher is better)
+        updated_ts: Last update, as POSIX timestamps (float64; ``-inf`` if
+            unknown)
+        importance: ``importance`` of each memory (0..1)
+        confidence: ``confidence`` times ``truth_score`` (0..1)
+        access_count: Times each memory was returned before
+    """
+    keys: List[str]
+    relevance: "np.ndarray"
+    updated_ts: "np.ndarray"
+    importance: "np.ndarray"
+    confidence: "np.ndarray"
+    access_count: "np.ndarray"
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    @classmethod
+    def from_values(
+        cls,
+        keys: Sequence[str],
+        values: Sequence[Mapping[str, Any]],
+        relevance: Optional[Sequence[float]] = None,
+        access_counts: Optional[Mapping[str, int]] = None,
+    ) -> "Candidates":
+        """
+        Gather the attributes of stored memory model dicts.
+
+        Args:
+            keys: Memory keys
+            values: Memory model dicts (``BaseMemory.to_dict()``)
+            relevance: Search score per key (None = all equal)
+            access_counts: Times each key was returned before (missing = 0)
+        """
+        _require_numpy()
+        n = len(keys)
+        updated_ts = np.empty(n, dtype=np.float64)
+        importance = np.empty(n, dtype=np.float32)
+        confidence = np.empty(n, dtype=np.float32)
+        for i, value in enumerate(values):
+            updated = value.get("updated_at") or value.get("created_at")
+            updated_ts[i] = _timestamp(updated)
+            importance[i] = value.get("importance", 0.5)
+            confidence[i] = value.get("confidence", 1.0) * value.get("truth_score", 1.0)
+        counts = access_counts or {}
+        return cls(
+            keys=list(keys),
+            relevance=(
+                np.ones(n, dtype=np.float32)
+                if relevance is None
+                else np.asarray(relevance, dtype=np.float32)
+            ),
+            updated_ts=updated_ts,
+            importance=importance,
+            confidence=confidence,
+            access_count=np.fromiter(
+                (counts.get(key, 0) for key in keys), dtype=np.float32, count=n
+            ),
+        )
+
+
+def _timestamp(value: Any) -> float:
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    if isinstance(value, datetime):
+        return to_timestamp(value)
+    return -math.inf  # unknown age: no recency credit
+
+
+class RankingEngine:
+    """
+    Scores candidates as a weighted sum of signals scaled to [0, 1]:
+
+    - relevance: search score divided by the best candidate's
+    - recency: ``0.5 ** (age / half_life_seconds)``
+    - importance and confidence, clipped to [0, 1]
+    - frequency: ``log1p(count) / log1p(max count)``
+
+    All candidates are scored in one NumPy pass and the top k selected
+    with ``argpartition``, so ranking costs O(n) rather than O(n log n).
+    """
+
+    def __init__(self, config: Optional[RankingConfig] = None):
+        """
+        Args:
+            config: Signal weights (defaults to ``RankingConfig()``)
+        """
+        _require_numpy()
+        self.config = config or RankingConfig()
+
+    def scores(
+        self, candidates: Candidates, now: Optional[float] = None
+    ) -> "np.ndarray":
+        """
+        Weighted score of every candidate.
+
+        Args:
+            candidates: Candidate attributes
+            now: Reference POSIX time for recency (default: current time)
+        """
+        config = self.config
+        now = time.time() if now is None else now
+        n = len(candidates)
+        scores = np.zeros(n, dtype=np.float32)
+        if n == 0:
+            return scores
+        # One scratch buffer and in-place ufuncs: large temporaries would
+        # each cost fresh pages
+        signal = np.empty(n, dtype=np.float32)
+
+        if config.relevance:
+            np.maximum(candidates.relevance, 0.0, out=signal)
+            best = float(signal.max())
+            if best > 0:
+                signal *= config.relevance / best
+                scores += signal
+        if config.recency:
+            # Half-lives elapsed, in float32 (timestamps need float64). The
+            # cap avoids slow subnormal results; 2**-64 is zero in practice.
+            np.subtract(now, candidates.updated_ts, out=signal, casting="unsafe")
+            signal *= -1.0 / config.half_life_seconds
+            np.clip(signal, -_MAX_HALVINGS, 0.0, out=signal)
+            np.exp2(signal, out=signal)
+            signal *= config.recency
+            scores += signal
+        for weight, values in (
+            (config.importance, candidates.importance),
+            (config.confidence, candidates.confidence),
+        ):
+            if weight:
+                np.clip(values, 0.0, 1.0, out=signal)
+                signal *= weight
+                scores += signal
+        if config.frequency:
+            most = float(candidates.access_count.max())
+            if most > 0:
+                np.log1p(candidates.access_count, out=signal)
+                signal *= config.frequency / math.log1p(most)
+                scores += signal
+        return scores
+
+    def rank(
+        self, candidates: Candidates, k: int, now: Optional[float] = None
+    ) -> List[Tuple[str, float]]:
+        """
+        Top-k candidates by weighted score.
+
+        Args:
+            candidates: Candidate attributes
+            k: Maximum results
+            now: Reference POSIX time for recency (default: current time)
+
+        Returns:
+            ``(key, score)`` pairs, best first
+        """
+        top = min(k, len(candidates))
+        if top < 1:
+            return []
+        negated = self.scores(candidates, now)
+        np.negative(negated, out=negated)
+        best = np.argpartition(negated, top - 1)[:top]
+        best = best[np.argsort(negated[best], kind="stable")]
+        return [(candidates.keys[i], -float(negated[i])) for i in best]
@@ -0,0 +1,214 @@
+"""
+Shared bookkeeping of the per-scope memory search indexes.
+"""
+import abc
+import heapq
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from agent_memory_hub.indexing.bitmap import TagIndex
+from agent_memory_hub.indexing.embeddings import memory_text
+
+SEARCH_MODES = ("hybrid", "vector", "keyword")
+
+
+@dataclass
+class SearchResult:
+    """
+    One search hit.
+
+    Attributes:
+        key: Memory key (as passed to ``MemoryClient.recall``)
+        score: Similarity to the query (higher is closer; cosine for vector
+            search, BM25 for keyword search, fused rank score for hybrid)
+        value: Stored memory model dict
+    """
+    key: str
+    score: float
+    value: Any = None
+
+
+@dataclass(frozen=True)
+class _Entry:
+    scope: Optional[str]
+    memory_type: str
+    tags: Tuple[str, ...]
+
+
+class ScopedIndex(abc.ABC):
+    """
+    Indexes the text of EpisodicMemory and SemanticMemory dicts in one
+    sub-index per memory scope, keeping type for filtering and a tag bitmap
+    index that pre-filters searches by tag.
+
+    Sub-indexes implement ``add(key, item)``, ``remove(key)`` and
+    ``search(query, k, allowed) -> [(key, score)]``.
+    """
+
+    def __init__(self):
+        self._scopes: Dict[Optional[str], Any] = {}
+        self._entries: Dict[str, _Entry] = {}
+        self._tags = TagIndex()
+        self._lock = threading.Lock()
+
+    @abc.abstractmethod
+    def _new_scope(self) -> Any:
+        """Create the sub-index of a new scope."""
+
+    @abc.abstractmethod
+    def _prepare(self, texts: List[str]) -> Sequence[Any]:
+        """Turn memory texts into sub-index items (e.g. embeddings)."""
+
+    @abc.abstractmethod
+    def _prepare_query(self, text: str) -> Any:
+        """Turn query text into a sub-index query."""
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def add(self, key: str, value: Any) -> bool:
+        """
+        Index a memory model dict; other values un-index ``key``.
+
+        Returns:
+            True if the value was indexed
+        """
+        return self.add_many([(key, value)]) == 1
+
+    def add_many(self, items: Sequence[Tuple[str, Any]]) -> int:
+        """
+        Index several memory model dicts in one batch.
+
+        Returns:
+            Number of values indexed
+        """
+        texts, indexed = [], []
+        for key, value in items:
+            text = memory_text(value)
+            if text is None:
+                self.remove(key)
+            else:
+                texts.append(text)
+                indexed.append((key, value))
+        if not texts:
+            return 0
+
+        prepared = self._prepare(texts)
+        with self._lock:
+            for (key, value), item in zip(indexed, prepared, strict=True):
+                entry = _Entry(
+                    scope=value.get("scope"),
+                    memory_type=value["memory_type"],
+                    tags=tuple(value.get("tags") or ()),
+                )
+                previous = self._entries.get(key)
+                if previous is not None and previous.scope != entry.scope:
+                    self._scopes[previous.scope].remove(key)
+                index = self._scopes.get(entry.scope)
+                if index is None:
+                    index = self._scopes[entry.scope] = self._new_scope()
+                index.add(key, item)
+                self._entries[key] = entry
+                self._tags.update(key, entry.tags)
+        return len(indexed)
+
+    def remove(self, key: str) -> bool:
+        """Drop ``key`` from the index; returns False if it was not indexed."""
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is None:
+                return False
+            self._scopes[entry.scope].remove(key)
+            self._tags.remove(key)
+            return True
+
+    def clear(self) -> None:
+        """Drop every key from the index."""
+        with self._lock:
+            self._scopes = {}
+            self._entries = {}
+            self._tags = TagIndex()
+
+    def search(
+        self,
+        text: str,
+        k: int = 10,
+        memory_type: Optional[str] = None,
+        scope: Optional[str] = None,
+        tags: Sequence[str] = (),
+        any_tags: Sequence[str] = (),
+    ) -> List[SearchResult]:
+        """
+        Top-k memories for ``text``.
+
+        Tag filters are resolved against the tag bitmaps before the
+        sub-indexes are searched, so candidates are checked with a bitmap
+        probe and a filter matching nothing returns without scoring.
+
+        Args:
+            text: Query text
+            k: Maximum results
+            memory_type: Only this model class name
+            scope: Only this memory scope (searches one sub-index)
+            tags: Only memories carrying all of these tags
+            any_tags: Only memories carrying at least one of these tags
+
+        Returns:
+            Results without values, best first
+        """
+        tagged = None
+        if tags or any_tags:
+            tagged = self._tags.match(all_of=tags, any_of=any_tags)
+            if not tagged:
+                return []
+        query = self._prepare_query(text)
+
+        def allowed(key: str) -> bool:
+            if tagged is not None and not self._tags.contains(tagged, key):
+                return False
+            if memory_type is None:
+                return True
+            entry = self._entries.get(key)
+            return entry is not None and entry.memory_type == memory_type
+
+        check = allowed if memory_type is not None or tagged is not None else None
+        with self._lock:
+            if scope is not None:
+                indexes = [self._scopes[scope]] if scope in self._scopes else []
+            else:
+                indexes = list(self._scopes.values())
+        hits = [hit for index in indexes for hit in index.search(query, k, check)]
+        best = heapq.nlargest(k, hits, key=lambda hit: hit[1])
+        return [SearchResult(key=key, score=score) for key, score in best]
+
+
+def reciprocal_rank_fusion(
+    rankings: Sequence[List[SearchResult]],
+    k: int = 10,
+    weights: Optional[Sequence[float]] = None,
+    constant: int = 60,
+) -> List[SearchResult]:
+    """
+    Merge ranked result lists by reciprocal rank fusion: each key scores
+    ``sum(weight / (constant + rank))`` over the lists it appears in.
+    Scores of different scales (cosine, BM25) never need normalizing.
+
+    Args:
+        rankings: Result lists, best first
+        k: Maximum results
+        weights: Per-list weights (default 1.0 each)
+        constant: Damping of top ranks (60 is the usual choice)
+
+    Returns:
+        Fused results, best first
+    """
+    weights = weights or [1.0] * len(rankings)
+    scores: Dict[str, float] = {}
+    for ranking, weight in zip(rankings, weights, strict=True):
+        for rank, result in enumerate(ranking, start=1):
+            scores[result.key] = scores.get(result.key, 0.0) + weight / (
+                constant + rank
+            )
+    best = heapq.nlargest(k, scores.items(), key=lambda item: item[1])
+    return [SearchResult(key=key, score=score) for key, score in best]
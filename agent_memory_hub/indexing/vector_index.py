@@ -0,0 +1,232 @@
+"""
+In-process embedding index with exact and IVF top-k search.
+"""
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+
+from agent_memory_hub.config.vector_config import VectorIndexConfig
+from agent_memory_hub.indexing.embeddings import (
+    NUMPY_AVAILABLE,
+    Embedder,
+    _require_numpy,
+)
+from agent_memory_hub.indexing.scoped_index import ScopedIndex
+
+if NUMPY_AVAILABLE:
+    import numpy as np
+
+_INITIAL_CAPACITY = 64
+_KMEANS_ITERATIONS = 10
+_KMEANS_SAMPLE_PER_LIST = 64
+# Rows scored per matrix product when assigning vectors to centroids
+_CHUNK_ROWS = 65_536
+
+
+def _normalize(vectors: "np.ndarray") -> "np.ndarray":
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+class VectorIndex:
+    """
+    Unit vectors stored row-wise in one contiguous float32 matrix.
+
+    Exact search scores every row with a single matrix-vector product. With
+    ``config.ann="ivf"`` and at least ``config.ann_threshold`` rows, rows are
+    also assigned to k-means centroids and a query only scores the rows of
+    its ``nprobe`` nearest centroids. Centroids are retrained when the index
+    has doubled since the last training.
+    """
+
+    def __init__(self, dimension: int, config: Optional[VectorIndexConfig] = None):
+        _require_numpy()
+        self.dimension = dimension
+        self.config = config or VectorIndexConfig()
+        self._matrix = np.empty((_INITIAL_CAPACITY, dimension), dtype=np.float32)
+        self._keys: List[str] = []
+        self._rows: Dict[str, int] = {}
+        self._centroids: Optional["np.ndarray"] = None
+        self._assignments = np.empty(_INITIAL_CAPACITY, dtype=np.int32)
+        self._trained_size = 0
+        # Rows grouped by centroid and each group's start offset, rebuilt
+        # lazily after writes
+        self._lists: Optional[Tuple["np.ndarray", "np.ndarray"]] = None
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._rows
+
+    @property
+    def matrix(self) -> "np.ndarray":
+        """Read-only view of the stored unit vectors, one row per key."""
+        view = self._matrix[: len(self._keys)]
+        view.flags.writeable = False
+        return view
+
+    def add(self, key: str, vector: "np.ndarray") -> None:
+        """Insert or replace the vector of ``key``."""
+        vector = _normalize(np.asarray(vector, dtype=np.float32).reshape(-1))
+        if vector.shape[0] != self.dimension:
+            raise ValueError(
+                f"Vector has dimension {vector.shape[0]}, expected {self.dimension}"
+            )
+        with self._lock:
+            row = self._rows.get(key)
+            if row is None:
+                row = len(self._keys)
+                if row == self._matrix.shape[0]:
+                    self._grow()
+                self._keys.append(key)
+                self._rows[key] = row
+            self._matrix[row] = vector
+            if self._centroids is not None:
+                self._assignments[row] = int(np.argmax(self._centroids @ vector))
+                self._lists = None
+            self._maybe_train()
+
+    def remove(self, key: str) -> bool:
+        """Remove ``key``; returns False if it was not indexed."""
+        with self._lock:
+            row = self._rows.pop(key, None)
+            if row is None:
+                return False
+            # Move the last row into the hole to keep the matrix contiguous
+            last = len(self._keys) - 1
+            if row != last:
+                moved = self._keys[last]
+                self._matrix[row] = self._matrix[last]
+                self._assignments[row] = self._assignments[last]
+                self._keys[row] = moved
+                self._rows[moved] = row
+            self._keys.pop()
+            self._lists = None
+            return True
+
+    def search(
+        self,
+        vector: "np.ndarray",
+        k: int,
+        allowed: Optional[Callable[[str], bool]] = None,
+    ) -> List[Tuple[str, float]]:
+        """
+        Top-k keys by cosine similarity.
+
+        Args:
+            vector: Query vector (need not be normalized)
+            k: Maximum results
+            allowed: Only return keys for which this returns True
+
+        Returns:
+            ``(key, score)`` pairs, best first
+        """
+        query = _normalize(np.asarray(vector, dtype=np.float32).reshape(-1))
+        with self._lock:
+            n = len(self._keys)
+            if n == 0 or k < 1:
+                return []
+            rows = self._candidate_rows(query, n)
+            if rows is None:
+                rows = np.arange(n)
+                scores = self._matrix[:n] @ query
+            else:
+                scores = self._matrix[rows] @ query
+
+            if allowed is None:
+                top = min(k, len(rows))
+                best = np.argpartition(-scores, top - 1)[:top]
+                best = best[np.argsort(-scores[best], kind="stable")]
+                return [(self._keys[rows[i]], float(scores[i])) for i in best]
+
+            results = []
+            for i in np.argsort(-scores, kind="stable"):
+                key = self._keys[rows[i]]
+                if allowed(key):
+                    results.append((key, float(scores[i])))
+                    if len(results) == k:
+                        break
+            return results
+
+    def _candidate_rows(self, query: "np.ndarray", n: int) -> Optional["np.ndarray"]:
+        if self._centroids is None:
+            return None
+        if self._lists is None:
+            order = np.argsort(self._assignments[:n], kind="stable")
+            offsets = np.searchsorted(
+                self._assignments[:n][order], np.arange(len(self._centroids) + 1)
+            )
+            self._lists = (order, offsets)
+        order, offsets = self._lists
+        nprobe = min(self.config.nprobe, len(self._centroids))
+        probes = np.argpartition(-(self._centroids @ query), nprobe - 1)[:nprobe]
+        return np.concatenate([order[offsets[c] : offsets[c + 1]] for c in probes])
+
+    def _grow(self) -> None:
+        capacity = self._matrix.shape[0] * 2
+        matrix = np.empty((capacity, self.dimension), dtype=np.float32)
+        matrix[: self._matrix.shape[0]] = self._matrix
+        assignments = np.empty(capacity, dtype=np.int32)
+        assignments[: self._assignments.shape[0]] = self._assignments
+        self._matrix, self._assignments = matrix, assignments
+
+    def _maybe_train(self) -> None:
+        n = len(self._keys)
+        if self.config.ann != "ivf" or n < self.config.ann_threshold:
+            return
+        if self._centroids is not None and n < 2 * self._trained_size:
+            return
+        nlist = self.config.nlist or max(1, int(np.sqrt(n)))
+        self._centroids = self._kmeans(self._matrix[:n], nlist)
+        for start in range(0, n, _CHUNK_ROWS):
+            chunk = self._matrix[start : min(start + _CHUNK_ROWS, n)]
+            self._assignments[start : start + len(chunk)] = np.argmax(
+                chunk @ self._centroids.T, axis=1
+            )
+        self._trained_size = n
+        self._lists = None
+
+    @staticmethod
+    def _kmeans(vectors: "np.ndarray", nlist: int) -> "np.ndarray":
+        """Spherical k-means on a sample, seeded for reproducibility."""
+        rng = np.random.default_rng(0)
+        nlist = min(nlist, len(vectors))
+        sample_size = min(len(vectors), nlist * _KMEANS_SAMPLE_PER_LIST)
+        sample = vectors[rng.choice(len(vectors), sample_size, replace=False)]
+        centroids = sample[rng.choice(sample_size, nlist, replace=False)].copy()
+        for _ in range(_KMEANS_ITERATIONS):
+            labels = np.argmax(sample @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, labels, sample)
+            empty = ~np.bincount(labels, minlength=nlist).astype(bool)
+            sums[empty] = centroids[empty]  # keep centroids that lost all rows
+            centroids = _normalize(sums)
+        return centroids
+
+
+class EmbeddingIndex(ScopedIndex):
+    """
+    Embeddings of EpisodicMemory and SemanticMemory dicts, kept in one
+    ``VectorIndex`` per memory scope.
+    """
+
+    def __init__(self, embedder: Embedder, config: Optional[VectorIndexConfig] = None):
+        """
+        Args:
+            embedder: Embeds memory texts and search queries
+            config: Exact / approximate search configuration
+        """
+        _require_numpy()
+        super().__init__()
+        self.embedder = embedder
+        self.config = config or VectorIndexConfig()
+
+    def _new_scope(self) -> VectorIndex:
+        return VectorIndex(self.embedder.dimension, self.config)
+
+    def _prepare(self, texts: List[str]) -> "np.ndarray":
+        return self.embedder.embed(texts)
+
+    def _prepare_query(self, text: str) -> "np.ndarray":
+        return self.embedder.embed([text])[0]
@@ -1,4 +1,4 @@
-from agent_memory_hub.models.base import BaseMemory, MemoryScope
+from agent_memory_hub.models.base import BaseMemory, MemoryScope, Relation
 from agent_memory_hub.models.types import (
     EntityMemory,
     EpisodicMemory,
@@ -9,6 +9,7 @@ from agent_memory_hub.models.types import (
 __all__ = [
     "BaseMemory",
     "MemoryScope",
+    "Relation",
     "EpisodicMemory",
     "SemanticMemory",
     "EntityMemory",
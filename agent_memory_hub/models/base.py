@@ -20,6 +20,16 @@ class MemoryScope(str, Enum):
     GLOBAL = "global"   # System-wide knowledge
 
 
+class Relation(str, Enum):
+    """
+    Types of directed edges between memories (source -> target).
+    """
+    PARENT_OF = "parent_of"    # Target is a child of source
+    SUPERSEDES = "supersedes"  # Source replaces the outdated target
+    RELATED_TO = "related_to"  # Loose association
+    DEPENDS_ON = "depends_on"  # Source only holds if target does
+
+
 class BaseMemory(BaseModel):
     """
     Base class for all memory types.
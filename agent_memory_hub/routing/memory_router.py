@@ -2,15 +2,37 @@
 Routes memory requests to the appropriate data plane based on configuration.
 """
 
-from typing import TYPE_CHECKING, Any, Optional
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+)
 
 if TYPE_CHECKING:
     from agent_memory_hub.config.alloydb_config import AlloyDBConfig
+    from agent_memory_hub.config.emulator_config import EmulatorConfig
+    from agent_memory_hub.config.lmdb_config import LmdbConfig
+    from agent_memory_hub.config.memory_config import MemoryStoreConfig
     from agent_memory_hub.config.redis_config import RedisConfig
+    from agent_memory_hub.config.sqlite_config import SQLiteConfig
 
 from agent_memory_hub.control_plane.region_guard import RegionGuard
-from agent_memory_hub.data_plane.adk_session_store import SessionStore
+from agent_memory_hub.data_plane.adk_session_store import SessionStore, StoredEntry
+from agent_memory_hub.data_plane.patch import MemoryPatch
 from agent_memory_hub.data_plane.store_factory import StoreFactory
+from agent_memory_hub.indexing.episode_log import LogEntry, LogPage, LogQuery
+from agent_memory_hub.indexing.query import (
+    MemoryQuery,
+    QueryPage,
+    RankQuery,
+    TriplePattern,
+)
 
 
 class MemoryRouter:
@@ -25,6 +47,14 @@ class MemoryRouter:
         alloydb_config: Optional["AlloyDBConfig"] = None,
         redis_config: Optional["RedisConfig"] = None,
         environment: str = "prod",
+        dedup_threshold_bytes: Optional[int] = None,
+        emulator_config: Optional["EmulatorConfig"] = None,
+        memory_config: Optional["MemoryStoreConfig"] = None,
+        sqlite_config: Optional["SQLiteConfig"] = None,
+        lmdb_config: Optional["LmdbConfig"] = None,
+        migrate_from: Optional[str] = None,
+        migration_phase: str = "dual_write",
+        shards: Optional[Mapping[str, Dict[str, Any]]] = None,
     ):
         self.region_guard = region_guard
         self.backend = backend
@@ -40,6 +70,14 @@ class MemoryRouter:
             ttl_seconds=ttl_seconds,
             alloydb_config=alloydb_config,
             redis_config=redis_config,
+            dedup_threshold_bytes=dedup_threshold_bytes,
+            emulator_config=emulator_config,
+            memory_config=memory_config,
+            sqlite_config=sqlite_config,
+            lmdb_config=lmdb_config,
+            migrate_from=migrate_from,
+            migration_phase=migration_phase,
+            shards=shards,
         )
 
     def write(self, session_id: str, key: str, value: Any) -> None:
@@ -50,6 +88,41 @@ class MemoryRouter:
         self.region_guard.check_residency(self.region_guard.current_region)
         self.store.write(session_id, key, value)
 
+    def write_many(self, session_id: str, items: Dict[str, Any]) -> None:
+        """
+        Writes several keys in one batched backend call.
+        """
+        self.region_guard.check_residency(self.region_guard.current_region)
+        self.store.write_many(session_id, items)
+
+    def write_atomic(self, session_id: str, items: Dict[str, Any]) -> None:
+        """
+        Writes several keys all-or-nothing.
+        """
+        self.region_guard.check_residency(self.region_guard.current_region)
+        self.store.write_atomic(session_id, items)
+
+    @property
+    def atomic_writes(self) -> bool:
+        """Whether the backend commits batched writes all-or-nothing."""
+        return self.store.atomic_writes
+
+    def write_versioned(
+        self, session_id: str, key: str, value: Any, if_version: str
+    ) -> str:
+        """
+        Writes a key if it is still at the expected version.
+        """
+        self.region_guard.check_residency(self.region_guard.current_region)
+        return self.store.write_versioned(session_id, key, value, if_version)
+
+    def patch(self, session_id: str, key: str, patch: MemoryPatch) -> Any:
+        """
+        Applies a partial update in the backend.
+        """
+        self.region_guard.check_residency(self.region_guard.current_region)
+        return self.store.patch(session_id, key, patch)
+
     def read(self, session_id: str, key: str) -> Optional[Any]:
         """
         Reads data.
@@ -57,3 +130,136 @@ class MemoryRouter:
         self.region_guard.check_residency(self.region_guard.current_region)
         return self.store.read(session_id, key)
 
+    def read_versioned(self, session_id: str, key: str) -> Tuple[Optional[Any], str]:
+        """
+        Reads data with its version token.
+        """
+        self.region_guard.check_residency(self.region_guard.current_region)
+        return self.store.read_versioned(session_id, key)
+
+    def read_many(self, session_id: str, keys: Sequence[str]) -> List[Optional[Any]]:
+        """
+        Reads several keys in one batched backend call.
+        """
+        self.region_guard.check_residency(self.region_guard.current_region)
+        return self.store.read_many(session_id, keys)
+
+    def read_session(self, session_id: str, prefix: str = "") -> Dict[str, Any]:
+        """
+        Reads every key of a session (under a prefix) in one backend call.
+        """
+        self.region_guard.check_residency(self.region_guard.current_region)
+        return self.store.read_session(session_id, prefix)
+
+    def delete(self, session_id: str, key: str) -> bool:
+        """
+        Deletes a key and its index entries.
+        """
+        self.region_guard.check_residency(self.region_guard.current_region)
+        return self.store.delete(session_id, key)
+
+    def delete_session(self, session_id: str) -> int:
+        """
+        Deletes every key, index entry and log stream of a session.
+        """
+        self.region_guard.check_residency(self.region_guard.current_region)
+        return self.store.delete_session(session_id)
+
+    def iter_keys(self, session_id: str, prefix: str = "") -> Iterator[str]:
+        """
+        Streams the live keys of a session (under a prefix).
+        """
+        self.region_guard.check_residency(self.region_guard.current_region)
+        return self.store.iter_keys(session_id, prefix)
+
+    def iter_sessions(self) -> Iterator[str]:
+        """
+        Streams the ids of the sessions holding keys.
+        """
+        self.region_guard.check_residency(self.region_guard.current_region)
+        return self.store.iter_sessions()
+
+    def read_entries(
+        self, session_id: str, keys: Sequence[str]
+    ) -> List[Optional[StoredEntry]]:
+        """
+        Reads several keys of one session with their TTL envelopes.
+        """
+        self.region_guard.check_residency(self.region_guard.current_region)
+        return self.store.read_entries(session_id, keys)
+
+    def write_entries(self, session_id: str, entries: Dict[str, StoredEntry]) -> None:
+        """
+        Writes several keys of one session keeping their TTL envelopes.
+        """
+        self.region_guard.check_residency(self.region_guard.current_region)
+        self.store.write_entries(session_id, entries)
+
+    def delete_prefix(self, session_id: str, prefix: str) -> int:
+        """
+        Deletes every key of a session under a prefix.
+        """
+        self.region_guard.check_residency(self.region_guard.current_region)
+        return self.store.delete_prefix(session_id, prefix)
+
+    def delete_log(self, session_id: str, stream: str) -> None:
+        """
+        Deletes a log stream of a session.
+        """
+        self.region_guard.check_residency(self.region_guard.current_region)
+        self.store.delete_log(session_id, stream)
+
+    def iter_streams(self, session_id: str) -> Iterator[str]:
+        """
+        Streams the names of the log streams of a session.
+        """
+        self.region_guard.check_residency(self.region_guard.current_region)
+        return self.store.iter_streams(session_id)
+
+    def iter_log_sessions(self) -> Iterator[str]:
+        """
+        Streams the ids of the sessions holding log streams.
+        """
+        self.region_guard.check_residency(self.region_guard.current_region)
+        return self.store.iter_log_sessions()
+
+    def query(self, session_id: str, query: MemoryQuery) -> QueryPage:
+        """
+        Lists memory models matching a query.
+        """
+        self.region_guard.check_residency(self.region_guard.current_region)
+        return self.store.query(session_id, query)
+
+    def match_triples(self, session_id: str, pattern: TriplePattern) -> QueryPage:
+        """
+        Lists SemanticMemory models matching a triple pattern.
+        """
+        self.region_guard.check_residency(self.region_guard.current_region)
+        return self.store.match_triples(session_id, pattern)
+
+    def rank(self, session_id: str, query: RankQuery) -> QueryPage:
+        """
+        Lists the top memory models by importance or recency.
+        """
+        self.region_guard.check_residency(self.region_guard.current_region)
+        return self.store.rank(session_id, query)
+
+    def append(
+        self,
+        session_id: str,
+        stream: str,
+        values: Sequence[Any],
+        max_len: Optional[int] = None,
+    ) -> List[LogEntry]:
+        """
+        Appends values to a log stream.
+        """
+        self.region_guard.check_residency(self.region_guard.current_region)
+        return self.store.append(session_id, stream, values, max_len)
+
+    def read_log(self, session_id: str, query: LogQuery) -> LogPage:
+        """
+        Reads one page of a log stream.
+        """
+        self.region_guard.check_residency(self.region_guard.current_region)
+        return self.store.read_log(session_id, query)
@@ -41,3 +41,4 @@ def is_expired(created_at: datetime, ttl_seconds: Optional[int]) -> bool:
 def get_current_timestamp() -> datetime:
     """Get current UTC timestamp."""
     return datetime.now(timezone.utc)
+
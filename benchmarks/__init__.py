@@ -0,0 +1,5 @@
+"""
+Benchmark suite for Agent Memory Hub session stores.
+
+Run ``python -m benchmarks --help`` for the load-generating harness.
+"""
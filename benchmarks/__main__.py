@@ -0,0 +1,192 @@
+"""
+Command line entry point: ``python -m benchmarks``.
+"""
+import argparse
+import os
+import sys
+from typing import List, Optional
+
+from agent_memory_hub.config.alloydb_config import AlloyDBConfig
+from agent_memory_hub.config.emulator_config import (
+    LATENCY_DISTRIBUTIONS,
+    EmulatorConfig,
+)
+from agent_memory_hub.config.redis_config import RedisConfig
+from benchmarks.harness import MODES, BenchmarkConfig, run_benchmark
+from benchmarks.report import (
+    compare,
+    format_summary,
+    load_json,
+    write_csv,
+    write_json,
+)
+from benchmarks.stores import BACKENDS, LOCAL_BACKENDS, build_store
+from benchmarks.workload import DISTRIBUTIONS, Workload
+
+
+def _parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks",
+        description="Concurrent latency/throughput benchmark for memory backends",
+    )
+    parser.add_argument(
+        "--backend", choices=BACKENDS, action="append",
+        help="Backend to test (repeatable; default: local)",
+    )
+    parser.add_argument("--region", default="us-central1", help="GCP Region")
+    parser.add_argument("--env", default="dev", help="Environment (e.g., dev, prod)")
+
+    load = parser.add_argument_group("load")
+    load.add_argument("--mode", choices=MODES, default="threads")
+    load.add_argument("--concurrency", type=int, default=4)
+    load.add_argument("--warmup", type=float, default=1.0, help="Warmup seconds")
+    load.add_argument("--duration", type=float, default=10.0, help="Measured seconds")
+    load.add_argument("--read-ratio", type=float, default=0.9)
+    load.add_argument("--keys", type=int, default=1000, help="Key space size")
+    load.add_argument("--sessions", type=int, default=1)
+    load.add_argument("--value-size", type=int, default=1024, help="Bytes per value")
+    load.add_argument("--distribution", choices=DISTRIBUTIONS, default="uniform")
+    load.add_argument("--zipf-theta", type=float, default=0.99)
+    load.add_argument("--seed", type=int, default=42)
+    load.add_argument("--no-preload", action="store_true")
+
+    emulation = parser.add_argument_group(
+        "emulation", "Run remote backends against in-process emulators"
+    )
+    emulation.add_argument("--emulate", action="store_true")
+    emulation.add_argument("--latency-ms", type=float, default=0.0)
+    emulation.add_argument(
+        "--latency-distribution", choices=LATENCY_DISTRIBUTIONS, default="constant"
+    )
+    emulation.add_argument("--jitter-ms", type=float, default=0.0)
+    emulation.add_argument("--error-rate", type=float, default=0.0)
+    emulation.add_argument("--throttle-ops", type=float, help="Rate limit (ops/s)")
+
+    output = parser.add_argument_group("output")
+    output.add_argument("--json", help="Write run summaries to this JSON file")
+    output.add_argument("--csv", help="Write run summaries to this CSV file")
+    output.add_argument("--compare", help="Baseline JSON file to compare against")
+
+    # AlloyDB specific args
+    parser.add_argument("--db-user", help="AlloyDB User")
+    parser.add_argument("--db-pass", help="AlloyDB Password")
+    parser.add_argument("--db-name", help="AlloyDB Database Name")
+    parser.add_argument("--db-conn", help="AlloyDB Instance Connection Name")
+    parser.add_argument(
+        "--db-url", help="AlloyDB Connection String (overrides other args)"
+    )
+
+    # SQLite specific args
+    parser.add_argument(
+        "--sqlite-path", help="SQLite database file (default: temporary file)"
+    )
+
+    # LMDB specific args
+    parser.add_argument(
+        "--lmdb-path", help="LMDB environment directory (default: temporary)"
+    )
+
+    # Redis specific args
+    parser.add_argument("--redis-host", help="Redis Host")
+    parser.add_argument("--redis-port", default="6379", help="Redis Port")
+    return parser
+
+
+def _alloydb_config(args: argparse.Namespace) -> AlloyDBConfig:
+    has_details = all([args.db_user, args.db_pass, args.db_name, args.db_conn])
+    if not (args.db_url or has_details):
+        raise SystemExit(
+            "Error: AlloyDB backend requires either --db-url OR "
+            "(--db-user, --db-pass, --db-name, and --db-conn)"
+        )
+    return AlloyDBConfig(
+        user=args.db_user or "",
+        password=args.db_pass or "",
+        database=args.db_name or "",
+        instance_connection_name=args.db_conn or "",
+        region=args.region,
+        db_url=args.db_url,
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = _parser().parse_args(argv)
+    backends = args.backend or ["local"]
+
+    workload = Workload(
+        read_ratio=args.read_ratio,
+        key_space=args.keys,
+        sessions=args.sessions,
+        value_size_bytes=args.value_size,
+        distribution=args.distribution,
+        zipf_theta=args.zipf_theta,
+    )
+
+    emulator_config = None
+    if args.emulate:
+        emulator_config = EmulatorConfig(
+            latency_ms=args.latency_ms,
+            distribution=args.latency_distribution,
+            jitter_ms=args.jitter_ms,
+            error_rate=args.error_rate,
+            throttle_ops_per_second=args.throttle_ops,
+            throttle_burst=max(1, args.concurrency),
+            seed=args.seed,
+        )
+
+    summaries = []
+    for backend in backends:
+        store = build_store(
+            backend,
+            region=args.region,
+            environment=args.env,
+            alloydb_config=(
+                _alloydb_config(args)
+                if backend == "alloydb" and not args.emulate
+                else None
+            ),
+            redis_config=(
+                RedisConfig(
+                    host=args.redis_host or os.environ.get("REDIS_HOST", "localhost"),
+                    port=int(args.redis_port),
+                )
+                if backend == "redis" and not args.emulate
+                else None
+            ),
+            emulator_config=emulator_config,
+            sqlite_path=args.sqlite_path,
+            lmdb_path=args.lmdb_path,
+        )
+        emulated = args.emulate and backend not in LOCAL_BACKENDS
+        config = BenchmarkConfig(
+            backend=f"{backend}-emulated" if emulated else backend,
+            concurrency=args.concurrency,
+            mode=args.mode,
+            warmup_seconds=args.warmup,
+            duration_seconds=args.duration,
+            preload=not args.no_preload,
+            seed=args.seed,
+            workload=workload,
+        )
+        summary = run_benchmark(store, config).summary()
+        summaries.append(summary)
+        print(format_summary(summary))
+
+    if args.json:
+        write_json(summaries, args.json)
+    if args.csv:
+        write_csv(summaries, args.csv)
+    if args.compare:
+        print(f"\n--- Compared to {args.compare} ---")
+        for backend, op, metric, old, new, change in compare(
+            load_json(args.compare), summaries
+        ):
+            print(
+                f"{backend:<10} {op:<6} {metric:<15} "
+                f"{old:>12.1f} -> {new:>12.1f} ({change:+.1f}%)"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
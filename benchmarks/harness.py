@@ -0,0 +1,217 @@
+"""
+Concurrent, fixed-duration load generator for session stores.
+"""
+import asyncio
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List
+
+from agent_memory_hub.data_plane.adk_session_store import SessionStore
+from benchmarks.histogram import LatencyHistogram
+from benchmarks.workload import Workload
+
+MODES = ("threads", "asyncio")
+OPERATIONS = ("read", "write")
+PERCENTILES = {"p50": 50.0, "p95": 95.0, "p99": 99.0, "p999": 99.9}
+
+
+@dataclass
+class BenchmarkConfig:
+    """
+    Parameters of a single benchmark run.
+
+    Attributes:
+        backend: Label of the store under test (used in reports)
+        concurrency: Number of concurrent workers
+        mode: "threads" (one OS thread per worker) or "asyncio"
+            (coroutines dispatching blocking calls to a thread pool)
+        warmup_seconds: Duration of the discarded warmup phase
+        duration_seconds: Duration of the measured phase
+        preload: Write every key once before starting so reads hit
+        seed: Base seed; worker ``i`` uses ``seed + i``
+        workload: Operation mix and key distribution
+    """
+    backend: str = "local"
+    concurrency: int = 4
+    mode: str = "threads"
+    warmup_seconds: float = 1.0
+    duration_seconds: float = 10.0
+    preload: bool = True
+    seed: int = 42
+    workload: Workload = field(default_factory=Workload)
+
+    def __post_init__(self):
+        if self.mode not in MODES:
+            raise ValueError(f"Unknown mode: {self.mode}. Supported: {MODES}")
+        if self.concurrency < 1:
+            raise ValueError("concurrency must be positive")
+
+
+@dataclass
+class OperationStats:
+    """Latency and error statistics for one operation type."""
+    histogram: LatencyHistogram = field(default_factory=LatencyHistogram)
+    errors: int = 0
+
+    def merge(self, other: "OperationStats") -> None:
+        self.histogram.merge(other.histogram)
+        self.errors += other.errors
+
+
+@dataclass
+class BenchmarkResult:
+    """Outcome of a benchmark run; latencies are kept in nanoseconds."""
+    config: BenchmarkConfig
+    elapsed_seconds: float
+    operations: Dict[str, OperationStats]
+
+    def summary(self) -> Dict[str, Any]:
+        """Flatten into a JSON-serializable dict (latencies in microseconds)."""
+        ops: Dict[str, Any] = {}
+        for name, stats in self.operations.items():
+            hist = stats.histogram
+            entry = {
+                "count": hist.count,
+                "errors": stats.errors,
+                "throughput_ops": (
+                    hist.count / self.elapsed_seconds if self.elapsed_seconds else 0.0
+                ),
+                "mean_us": hist.mean / 1000,
+                "min_us": hist.min / 1000,
+                "max_us": hist.max / 1000,
+            }
+            for label, p in PERCENTILES.items():
+                entry[f"{label}_us"] = hist.percentile(p) / 1000
+            ops[name] = entry
+
+        total = sum(stats.histogram.count for stats in self.operations.values())
+        elapsed = self.elapsed_seconds
+        return {
+            "config": asdict(self.config),
+            "elapsed_seconds": elapsed,
+            "throughput_ops": total / elapsed if elapsed else 0.0,
+            "operations": ops,
+        }
+
+
+class _Worker:
+    """Per-worker state; histograms are merged only after the run."""
+
+    def __init__(self, store: SessionStore, config: BenchmarkConfig, index: int):
+        self.store = store
+        self.workload = config.workload
+        self.rng = random.Random(config.seed + index)  # noqa: S311  # nosec
+        self.sample_key = self.workload.key_sampler(self.rng)
+        self.value = self.workload.payload(self.rng)
+        self.stats = {op: OperationStats() for op in OPERATIONS}
+
+    def next_operation(self):
+        session_id, key = self.workload.location(self.sample_key())
+        if self.rng.random() < self.workload.read_ratio:
+            return "read", lambda: self.store.read(session_id, key)
+        return "write", lambda: self.store.write(session_id, key, self.value)
+
+    def observe(self, op: str, started_ns: int, ok: bool, measure_from_ns: int):
+        if started_ns < measure_from_ns:
+            return
+        if ok:
+            self.stats[op].histogram.record(time.perf_counter_ns() - started_ns)
+        else:
+            self.stats[op].errors += 1
+
+
+def preload(
+    store: SessionStore, workload: Workload, seed: int = 42, attempts: int = 3
+) -> None:
+    """Write every key of the workload once, retrying transient failures."""
+    value = workload.payload(random.Random(seed))  # noqa: S311  # nosec
+    for index in range(workload.key_space):
+        session_id, key = workload.location(index)
+        for attempt in range(attempts):
+            try:
+                store.write(session_id, key, value)
+                break
+            except Exception:
+                if attempt == attempts - 1:
+                    raise
+
+
+def run_benchmark(store: SessionStore, config: BenchmarkConfig) -> BenchmarkResult:
+    """
+    Drive ``store`` with ``config.concurrency`` workers for the configured
+    warmup and measurement windows and collect per-operation histograms.
+
+    All timing uses ``time.perf_counter_ns`` (monotonic).
+    """
+    if config.preload:
+        preload(store, config.workload, config.seed)
+
+    workers = [_Worker(store, config, i) for i in range(config.concurrency)]
+    start_ns = time.perf_counter_ns()
+    measure_from_ns = start_ns + int(config.warmup_seconds * 1e9)
+    end_ns = measure_from_ns + int(config.duration_seconds * 1e9)
+
+    if config.mode == "threads":
+        _run_threads(workers, measure_from_ns, end_ns)
+    else:
+        asyncio.run(_run_asyncio(workers, measure_from_ns, end_ns))
+
+    elapsed = (time.perf_counter_ns() - measure_from_ns) / 1e9
+    operations = {op: OperationStats() for op in OPERATIONS}
+    for worker in workers:
+        for op, stats in worker.stats.items():
+            operations[op].merge(stats)
+    return BenchmarkResult(
+        config=config,
+        elapsed_seconds=elapsed,
+        operations=operations,
+    )
+
+
+def _run_threads(workers: List[_Worker], measure_from_ns: int, end_ns: int) -> None:
+    def loop(worker: _Worker) -> None:
+        while True:
+            started = time.perf_counter_ns()
+            if started >= end_ns:
+                return
+            op, call = worker.next_operation()
+            try:
+                call()
+                ok = True
+            except Exception:
+                ok = False
+            worker.observe(op, started, ok, measure_from_ns)
+
+    threads = [threading.Thread(target=loop, args=(w,), daemon=True) for w in workers]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+async def _run_asyncio(
+    workers: List[_Worker], measure_from_ns: int, end_ns: int
+) -> None:
+    loop = asyncio.get_running_loop()
+    executor = ThreadPoolExecutor(max_workers=len(workers))
+
+    async def run(worker: _Worker) -> None:
+        while True:
+            started = time.perf_counter_ns()
+            if started >= end_ns:
+                return
+            op, call = worker.next_operation()
+            try:
+                await loop.run_in_executor(executor, call)
+                ok = True
+            except Exception:
+                ok = False
+            worker.observe(op, started, ok, measure_from_ns)
+
+    try:
+        await asyncio.gather(*(run(w) for w in workers))
+    finally:
+        executor.shutdown(wait=True)
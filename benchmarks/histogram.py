@@ -0,0 +1,87 @@
+"""
+HDR-style latency histogram with bounded relative error.
+"""
+import math
+from typing import Dict, Iterator, Tuple
+
+
+class LatencyHistogram:
+    """
+    Log-linear histogram of non-negative integer values (nanoseconds).
+
+    Values are bucketed by their highest set bit and a fixed number of
+    mantissa bits, so every recorded value is reproduced to within
+    ``significant_figures`` decimal digits regardless of magnitude, while
+    memory stays proportional to the number of distinct buckets touched.
+    """
+
+    def __init__(self, significant_figures: int = 3):
+        if not 1 <= significant_figures <= 5:
+            raise ValueError("significant_figures must be between 1 and 5")
+        self.significant_figures = significant_figures
+        # Enough mantissa bits that one bucket spans < 10^-sig of its value
+        self._sub_bits = (2 * 10**significant_figures - 1).bit_length()
+        self._counts: Dict[Tuple[int, int], int] = {}
+        self.count = 0
+        self.total = 0
+        self.min = 0
+        self.max = 0
+
+    def record(self, value: int, count: int = 1) -> None:
+        """Record a value (e.g. a latency in nanoseconds)."""
+        if value < 0:
+            raise ValueError("value must be non-negative")
+        bucket = self._bucket(value)
+        self._counts[bucket] = self._counts.get(bucket, 0) + count
+        if self.count == 0 or value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        self.count += count
+        self.total += value * count
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        """Add all samples of another histogram into this one."""
+        if other.significant_figures != self.significant_figures:
+            raise ValueError("cannot merge histograms of different precision")
+        if other.count == 0:
+            return
+        for bucket, count in other._counts.items():
+            self._counts[bucket] = self._counts.get(bucket, 0) + count
+        self.min = other.min if self.count == 0 else min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.count += other.count
+        self.total += other.total
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, p: float) -> int:
+        """
+        Value at or below which ``p`` percent of samples fall.
+
+        Returns the highest value equivalent to the matching bucket, capped
+        at the recorded maximum, so reported tails never under-state latency.
+        """
+        if not 0 <= p <= 100:
+            raise ValueError("percentile must be between 0 and 100")
+        if self.count == 0:
+            return 0
+        target = max(1, math.ceil(p / 100 * self.count))
+        seen = 0
+        for _lower, upper, count in self._iter_buckets():
+            seen += count
+            if seen >= target:
+                return min(upper, self.max)
+        return self.max
+
+    def _bucket(self, value: int) -> Tuple[int, int]:
+        shift = max(0, value.bit_length() - self._sub_bits)
+        return shift, value >> shift
+
+    def _iter_buckets(self) -> Iterator[Tuple[int, int, int]]:
+        for shift, mantissa in sorted(self._counts, key=lambda b: b[1] << b[0]):
+            lower = mantissa << shift
+            upper = ((mantissa + 1) << shift) - 1
+            yield lower, upper, self._counts[(shift, mantissa)]
@@ -0,0 +1,325 @@
+"""
+In-process microbenchmarks of the client-side hot path with regression gating.
+
+Usage:
+    python -m benchmarks.micro             # run and print results
+    python -m benchmarks.micro --check     # exit 1 on regression vs baseline
+    python -m benchmarks.micro --update    # rewrite the stored baseline
+
+Per-operation time is reported both in nanoseconds and relative to a fixed
+pure-Python reference workload measured in the same process. The gate
+compares the relative figure, which keeps baselines usable across machines
+of different speed. Allocation cost is the peak traced memory (tracemalloc)
+a single operation adds.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from datetime import timedelta
+from typing import Any, Callable, Dict, List, Optional
+
+from agent_memory_hub.client.memory_client import MemoryClient
+from agent_memory_hub.indexing.embeddings import NUMPY_AVAILABLE
+from agent_memory_hub.models import EpisodicMemory
+from agent_memory_hub.utils.telemetry import get_tracer
+from agent_memory_hub.utils.ttl_manager import (
+    get_current_timestamp,
+    get_expiry_timestamp,
+    is_expired,
+)
+from benchmarks.stores import LocalSessionStore
+
+Operation = Callable[[], Any]
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baselines", "micro.json")
+JSON_SIZES = {"1KB": 1024, "10KB": 10 * 1024, "100KB": 100 * 1024, "1MB": 1024 * 1024}
+RANKING_SIZES = {"10k": 10_000, "100k": 100_000}
+
+
+@dataclass
+class MicroResult:
+    """Measured cost of one microbenchmark case."""
+    name: str
+    ns_per_op: float
+    relative: float
+    peak_bytes: int
+
+
+def _reference() -> Dict[str, int]:
+    # Dict/str churn representative of the interpreter work on the hot path
+    data = {}
+    for i in range(100):
+        data[str(i)] = i
+    return data
+
+
+def _client() -> MemoryClient:
+    client = MemoryClient(
+        agent_id="micro-agent", session_id="micro-session", region_restricted=False
+    )
+    client._router.store = LocalSessionStore()
+    return client
+
+
+def _payload(size: int) -> Dict[str, str]:
+    return {"content": "x" * size}
+
+
+def _cases() -> Dict[str, Callable[[], Operation]]:
+    """Case name -> factory doing untimed setup and returning the operation."""
+
+    def client_write() -> Operation:
+        client, value = _client(), _payload(1024)
+        return lambda: client.write(value, key="micro")
+
+    def client_recall() -> Operation:
+        client = _client()
+        client.write(_payload(1024), key="micro")
+        return lambda: client.recall(key="micro")
+
+    def client_write_model() -> Operation:
+        client = _client()
+        memory = EpisodicMemory(agent_id="micro-agent", content="x" * 1024)
+        return lambda: client.write_model(memory)
+
+    def model_to_dict() -> Operation:
+        memory = EpisodicMemory(
+            agent_id="micro-agent", content="x" * 1024, tags=["a", "b"]
+        )
+        return memory.to_dict
+
+    def ttl_is_expired() -> Operation:
+        created_at = get_current_timestamp() - timedelta(seconds=30)
+        return lambda: is_expired(created_at, 3600)
+
+    def ttl_expiry() -> Operation:
+        return lambda: get_expiry_timestamp(3600)
+
+    def telemetry_span() -> Operation:
+        tracer = get_tracer()
+
+        def op():
+            with tracer.start_as_current_span("micro") as span:
+                span.set_attribute("memory.key", "micro")
+
+        return op
+
+    cases: Dict[str, Callable[[], Operation]] = {
+        "client.write/1KB": client_write,
+        "client.recall/1KB": client_recall,
+        "client.write_model": client_write_model,
+        "model.to_dict": model_to_dict,
+        "ttl.is_expired": ttl_is_expired,
+        "ttl.get_expiry_timestamp": ttl_expiry,
+        "telemetry.span": telemetry_span,
+    }
+    for label, size in JSON_SIZES.items():
+        def encode(size: int = size) -> Operation:
+            value = _payload(size)
+            return lambda: json.dumps(value)
+
+        def decode(size: int = size) -> Operation:
+            encoded = json.dumps(_payload(size))
+            return lambda: json.loads(encoded)
+
+        cases[f"json.encode/{label}"] = encode
+        cases[f"json.decode/{label}"] = decode
+    if NUMPY_AVAILABLE:  # optional "vector" extra
+        for label, size in RANKING_SIZES.items():
+            cases[f"ranking.top10/{label}"] = lambda size=size: _ranking_case(size)
+    return cases
+
+
+def _ranking_case(size: int) -> Operation:
+    import numpy as np
+
+    from agent_memory_hub.indexing.ranking import Candidates, RankingEngine
+
+    rng = np.random.default_rng(0)
+    now = time.time()
+    candidates = Candidates(
+        keys=[f"episodicmemory/{i}" for i in range(size)],
+        relevance=rng.random(size, dtype=np.float32),
+        updated_ts=now - rng.exponential(30 * 24 * 3600, size),
+        importance=rng.random(size, dtype=np.float32),
+        confidence=rng.random(size, dtype=np.float32),
+        access_count=rng.poisson(2.0, size).astype(np.float32),
+    )
+    engine = RankingEngine()
+    return lambda: engine.rank(candidates, 10, now=now)
+
+
+CASES = _cases()
+
+
+def measure_time(op: Operation, min_time: float = 0.1, repeat: int = 5) -> float:
+    """
+    Best-of-``repeat`` nanoseconds per call, each repeat running the call
+    enough times to take at least ``min_time`` seconds.
+    """
+    number = 1
+    while True:
+        start = time.perf_counter_ns()
+        for _ in range(number):
+            op()
+        elapsed = time.perf_counter_ns() - start
+        if elapsed >= min_time * 1e9 or number >= 1 << 24:
+            break
+        number *= 2
+
+    best = elapsed / number
+    for _ in range(repeat - 1):
+        start = time.perf_counter_ns()
+        for _ in range(number):
+            op()
+        best = min(best, (time.perf_counter_ns() - start) / number)
+    return best
+
+
+def measure_peak_bytes(op: Operation, samples: int = 3) -> int:
+    """Smallest peak of additional traced memory a single call needs."""
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start()
+    try:
+        op()  # warm caches so one-off allocations are not counted
+        peaks = []
+        for _ in range(samples):
+            tracemalloc.reset_peak()
+            current, _ = tracemalloc.get_traced_memory()
+            op()
+            peaks.append(tracemalloc.get_traced_memory()[1] - current)
+        return max(0, min(peaks))
+    finally:
+        if not was_tracing:
+            tracemalloc.stop()
+
+
+def run(
+    names: Optional[List[str]] = None, min_time: float = 0.1, repeat: int = 5
+) -> List[MicroResult]:
+    """Run the selected cases (all by default)."""
+    results = []
+    for name in names or list(CASES):
+        op = CASES[name]()
+        # Re-measure the reference next to each case so frequency scaling and
+        # background load affect both sides of the ratio alike.
+        reference_ns = measure_time(_reference, min_time, repeat)
+        ns = measure_time(op, min_time, repeat)
+        results.append(
+            MicroResult(
+                name=name,
+                ns_per_op=ns,
+                relative=ns / reference_ns,
+                peak_bytes=measure_peak_bytes(op),
+            )
+        )
+    return results
+
+
+def load_baseline(path: str = DEFAULT_BASELINE) -> Dict[str, Dict[str, Any]]:
+    if not os.path.exists(path):
+        return {}
+    with open(path) as fh:
+        return json.load(fh)["cases"]
+
+
+def save_baseline(results: List[MicroResult], path: str = DEFAULT_BASELINE) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as fh:
+        cases = {r.name: asdict(r) for r in results}
+        json.dump({"cases": cases}, fh, indent=2, sort_keys=True)
+        fh.write("\n")
+
+
+def find_regressions(
+    results: List[MicroResult],
+    baseline: Dict[str, Dict[str, Any]],
+    time_threshold: float = 0.5,
+    alloc_threshold: float = 0.1,
+    alloc_slack_bytes: int = 256,
+) -> List[str]:
+    """
+    Compare results to a baseline.
+
+    Args:
+        time_threshold: Allowed relative slowdown of the normalized time
+        alloc_threshold: Allowed relative growth of peak bytes per operation
+        alloc_slack_bytes: Absolute growth ignored for tiny allocations
+
+    Returns:
+        Human readable descriptions of every regression found
+    """
+    regressions = []
+    for result in results:
+        base = baseline.get(result.name)
+        if base is None:
+            continue
+        limit = base["relative"] * (1 + time_threshold)
+        if result.relative > limit:
+            regressions.append(
+                f"{result.name}: time {result.relative:.2f}x reference "
+                f"> {limit:.2f}x allowed (baseline {base['relative']:.2f}x)"
+            )
+        limit = base["peak_bytes"] * (1 + alloc_threshold) + alloc_slack_bytes
+        if result.peak_bytes > limit:
+            regressions.append(
+                f"{result.name}: peak {result.peak_bytes} B "
+                f"> {int(limit)} B allowed (baseline {base['peak_bytes']} B)"
+            )
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.micro",
+        description="Client-side hot path microbenchmarks",
+    )
+    parser.add_argument("--filter", help="Only run cases containing this text")
+    parser.add_argument("--min-time", type=float, default=0.1)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--check", action="store_true", help="Fail on regression")
+    parser.add_argument("--update", action="store_true", help="Rewrite baseline")
+    parser.add_argument("--time-threshold", type=float, default=0.5)
+    parser.add_argument("--alloc-threshold", type=float, default=0.1)
+    args = parser.parse_args(argv)
+
+    names = [n for n in CASES if not args.filter or args.filter in n]
+    results = run(names, min_time=args.min_time, repeat=args.repeat)
+    baseline = load_baseline(args.baseline)
+
+    print(f"{'case':<26} {'ns/op':>12} {'x ref':>8} {'peak B':>10} {'base x':>8}")
+    for r in results:
+        base = baseline.get(r.name, {}).get("relative")
+        base_str = f"{base:>8.2f}" if base is not None else f"{'-':>8}"
+        print(
+            f"{r.name:<26} {r.ns_per_op:>12.0f} {r.relative:>8.2f} "
+            f"{r.peak_bytes:>10} {base_str}"
+        )
+
+    if args.update:
+        merged = {**baseline, **{r.name: asdict(r) for r in results}}
+        save_baseline([MicroResult(**v) for v in merged.values()], args.baseline)
+        print(f"\nBaseline written to {args.baseline}")
+        return 0
+
+    if args.check:
+        regressions = find_regressions(
+            results, baseline, args.time_threshold, args.alloc_threshold
+        )
+        if regressions:
+            print("\nREGRESSIONS:")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print("\nNo regressions.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,93 @@
+"""
+JSON/CSV reporting and run-to-run comparison.
+"""
+import csv
+import json
+from typing import Any, Dict, List, Tuple
+
+CSV_FIELDS = (
+    "backend", "mode", "concurrency", "distribution", "read_ratio",
+    "value_size_bytes", "operation", "count", "errors", "throughput_ops",
+    "mean_us", "p50_us", "p95_us", "p99_us", "p999_us", "max_us",
+)
+COMPARED_METRICS = ("throughput_ops", "p50_us", "p99_us", "p999_us")
+
+
+def write_json(summaries: List[Dict[str, Any]], path: str) -> None:
+    with open(path, "w") as fh:
+        json.dump({"runs": summaries}, fh, indent=2)
+
+
+def load_json(path: str) -> List[Dict[str, Any]]:
+    with open(path) as fh:
+        return json.load(fh)["runs"]
+
+
+def csv_rows(summaries: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """One row per (run, operation)."""
+    rows = []
+    for summary in summaries:
+        config = summary["config"]
+        workload = config["workload"]
+        for op, stats in summary["operations"].items():
+            row = {
+                "backend": config["backend"],
+                "mode": config["mode"],
+                "concurrency": config["concurrency"],
+                "distribution": workload["distribution"],
+                "read_ratio": workload["read_ratio"],
+                "value_size_bytes": workload["value_size_bytes"],
+                "operation": op,
+            }
+            row.update({k: stats[k] for k in CSV_FIELDS if k in stats})
+            rows.append(row)
+    return rows
+
+
+def write_csv(summaries: List[Dict[str, Any]], path: str) -> None:
+    with open(path, "w", newline="") as fh:
+        writer = csv.DictWriter(fh, fieldnames=CSV_FIELDS)
+        writer.writeheader()
+        writer.writerows(csv_rows(summaries))
+
+
+def compare(
+    baseline: List[Dict[str, Any]], candidate: List[Dict[str, Any]]
+) -> List[Tuple[str, str, str, float, float, float]]:
+    """
+    Match runs by (backend, operation) and report relative change per metric.
+
+    Returns:
+        Rows of (backend, operation, metric, baseline, candidate, change_pct)
+    """
+    def index(summaries):
+        return {
+            (row["backend"], row["operation"]): row for row in csv_rows(summaries)
+        }
+
+    base, cand = index(baseline), index(candidate)
+    rows = []
+    for key in sorted(base.keys() & cand.keys()):
+        for metric in COMPARED_METRICS:
+            old, new = base[key][metric], cand[key][metric]
+            change = (new - old) / old * 100 if old else 0.0
+            rows.append((key[0], key[1], metric, old, new, change))
+    return rows
+
+
+def format_summary(summary: Dict[str, Any]) -> str:
+    config = summary["config"]
+    lines = [
+        f"--- {config['backend'].upper()} | {config['mode']} x"
+        f"{config['concurrency']} | {config['workload']['distribution']} | "
+        f"{summary['throughput_ops']:.1f} ops/s ---",
+        f"{'op':<6} {'count':>9} {'err':>5} {'p50':>10} {'p95':>10} "
+        f"{'p99':>10} {'p999':>10} {'max':>10}  (us)",
+    ]
+    for op, s in summary["operations"].items():
+        lines.append(
+            f"{op:<6} {s['count']:>9} {s['errors']:>5} {s['p50_us']:>10.1f} "
+            f"{s['p95_us']:>10.1f} {s['p99_us']:>10.1f} {s['p999_us']:>10.1f} "
+            f"{s['max_us']:>10.1f}"
+        )
+    return "\n".join(lines)
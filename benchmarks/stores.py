@@ -0,0 +1,98 @@
+"""
+Construction of the stores under test.
+"""
+import json
+import os
+import tempfile
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+from agent_memory_hub.config.alloydb_config import AlloyDBConfig
+from agent_memory_hub.config.emulator_config import EmulatorConfig
+from agent_memory_hub.config.lmdb_config import LmdbConfig
+from agent_memory_hub.config.memory_config import MemoryStoreConfig
+from agent_memory_hub.config.redis_config import RedisConfig
+from agent_memory_hub.config.sqlite_config import SQLiteConfig
+from agent_memory_hub.data_plane.adk_session_store import SessionStore
+from agent_memory_hub.data_plane.store_factory import StoreFactory
+from agent_memory_hub.utils.ttl_manager import get_current_timestamp
+
+BACKENDS = (
+    "local", "memory", "sqlite", "lmdb", "adk", "alloydb", "redis", "firestore"
+)
+# Backends running in-process; emulation does not apply to them.
+LOCAL_BACKENDS = ("local", "memory", "sqlite", "lmdb")
+
+
+class LocalSessionStore(SessionStore):
+    """
+    Thread-safe dict-backed stand-in used to measure harness overhead and
+    to exercise the suite without network access. Values are stored as
+    serialized envelopes, like the remote backends, so encode/decode cost
+    is part of every operation.
+    """
+
+    def __init__(self, ttl_seconds: Optional[int] = None):
+        self.ttl_seconds = ttl_seconds
+        self._data: Dict[Tuple[str, str], str] = {}
+        self._lock = threading.Lock()
+
+    def write(self, session_id: str, key: str, value: Any) -> None:
+        serialized = json.dumps({
+            "value": value,
+            "created_at": get_current_timestamp().isoformat(),
+            "ttl_seconds": self.ttl_seconds,
+        })
+        with self._lock:
+            self._data[(session_id, key)] = serialized
+
+    def read(self, session_id: str, key: str) -> Optional[Any]:
+        with self._lock:
+            serialized = self._data.get((session_id, key))
+        if serialized is None:
+            return None
+        return json.loads(serialized).get("value")
+
+
+def build_store(
+    backend: str,
+    region: str = "us-central1",
+    environment: str = "dev",
+    alloydb_config: Optional[AlloyDBConfig] = None,
+    redis_config: Optional[RedisConfig] = None,
+    emulator_config: Optional[EmulatorConfig] = None,
+    sqlite_path: Optional[str] = None,
+    lmdb_path: Optional[str] = None,
+) -> SessionStore:
+    """
+    Create the store for ``backend`` via ``StoreFactory`` (or the stand-in).
+    With ``emulator_config`` the backend runs against its in-process emulator.
+    The sqlite and lmdb backends use ``sqlite_path`` / ``lmdb_path`` (default:
+    a fresh temporary location).
+    """
+    if backend == "local":
+        return LocalSessionStore()
+    if backend == "memory":
+        return StoreFactory.get_store(
+            backend="memory", memory_config=MemoryStoreConfig()
+        )
+    if backend == "sqlite":
+        path = sqlite_path or os.path.join(
+            tempfile.mkdtemp(prefix="amh-bench-"), "memory.db"
+        )
+        return StoreFactory.get_store(
+            backend="sqlite", sqlite_config=SQLiteConfig(path=path)
+        )
+    if backend == "lmdb":
+        path = lmdb_path or tempfile.mkdtemp(prefix="amh-bench-lmdb-")
+        return StoreFactory.get_store(
+            backend="lmdb", lmdb_config=LmdbConfig(path=path)
+        )
+    return StoreFactory.get_store(
+        backend=backend,
+        region=region,
+        environment=environment,
+        alloydb_config=alloydb_config,
+        redis_config=redis_config,
+        emulator_config=emulator_config,
+    )
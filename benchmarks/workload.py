@@ -0,0 +1,91 @@
+"""
+Workload generation: key popularity distributions and payloads.
+"""
+import functools
+import random
+import string
+from dataclasses import dataclass
+from typing import Callable, Dict, Tuple
+
+KeySampler = Callable[[], int]
+
+DISTRIBUTIONS = ("uniform", "zipfian")
+
+
+@dataclass
+class Workload:
+    """
+    Shape of the operations issued by benchmark workers.
+
+    Attributes:
+        read_ratio: Fraction of operations that are reads (0.0 - 1.0)
+        key_space: Number of distinct keys
+        sessions: Number of sessions the keys are spread across
+        value_size_bytes: Approximate size of each written value
+        distribution: Key popularity ("uniform" or "zipfian")
+        zipf_theta: Skew of the zipfian distribution (0 < theta < 1)
+    """
+    read_ratio: float = 0.9
+    key_space: int = 1000
+    sessions: int = 1
+    value_size_bytes: int = 1024
+    distribution: str = "uniform"
+    zipf_theta: float = 0.99
+
+    def __post_init__(self):
+        if not 0.0 <= self.read_ratio <= 1.0:
+            raise ValueError("read_ratio must be between 0 and 1")
+        if self.key_space < 1 or self.sessions < 1:
+            raise ValueError("key_space and sessions must be positive")
+        if self.distribution not in DISTRIBUTIONS:
+            raise ValueError(
+                f"Unknown distribution: {self.distribution}. "
+                f"Supported: {DISTRIBUTIONS}"
+            )
+
+    def location(self, index: int) -> Tuple[str, str]:
+        """Map a key index to its (session_id, key)."""
+        return f"bench-session-{index % self.sessions}", f"bench-key-{index}"
+
+    def key_sampler(self, rng: random.Random) -> KeySampler:
+        """Build a key index sampler drawing from ``rng``."""
+        if self.distribution == "zipfian":
+            return zipfian_sampler(self.key_space, self.zipf_theta, rng)
+        n = self.key_space
+        return lambda: rng.randrange(n)
+
+    def payload(self, rng: random.Random) -> Dict[str, str]:
+        """Generate a value of roughly ``value_size_bytes`` bytes."""
+        alphabet = string.ascii_letters + string.digits
+        return {"payload": "".join(rng.choices(alphabet, k=self.value_size_bytes))}
+
+
+@functools.lru_cache(maxsize=16)
+def _zeta(n: int, theta: float) -> float:
+    return sum(1.0 / (i**theta) for i in range(1, n + 1))
+
+
+def zipfian_sampler(n: int, theta: float, rng: random.Random) -> KeySampler:
+    """
+    Zipfian key sampler (Gray et al., as used by YCSB).
+
+    Index 0 is the most popular key. Sampling is O(1); the normalisation
+    constant is computed once per (n, theta) and cached.
+    """
+    if not 0.0 < theta < 1.0:
+        raise ValueError("zipf_theta must be in (0, 1)")
+    zetan = _zeta(n, theta)
+    zeta2 = 1.0 + 0.5**theta
+    alpha = 1.0 / (1.0 - theta)
+    eta = (1.0 - (2.0 / n) ** (1.0 - theta)) / (1.0 - zeta2 / zetan) if n > 2 else 0.0
+
+    def sample() -> int:
+        u = rng.random()
+        uz = u * zetan
+        if uz < 1.0:
+            return 0
+        if uz < zeta2 or n <= 2:
+            return min(1, n - 1)
+        return min(n - 1, int(n * (eta * u - eta + 1.0) ** alpha))
+
+    return sample
@@ -1,6 +1,8 @@
 import time
 
 from agent_memory_hub import MemoryClient
+from agent_memory_hub.indexing import HashingEmbedder
+from agent_memory_hub.models import EpisodicMemory
 
 # removed unused typing import
 
@@ -36,10 +38,13 @@ class MockRAGSystem:
 def run_rag_with_memory():
     # 1. Setup Persistent Memory for the RAG Agent
     # This memory persists across different query sessions for the same user
+    # The embedder enables similarity search over stored episodes; swap in a
+    # model-backed Embedder for semantic (not just lexical) matching.
     memory = MemoryClient(
         agent_id="rag_assistant_01",
         session_id=f"chat_{int(time.time())}",
-        region="us-central1"
+        region="us-central1",
+        embedder=HashingEmbedder(),
     )
 
     rag = MockRAGSystem()
@@ -57,16 +62,10 @@ def run_rag_with_memory():
         print(f"Process Query {i+1}: '{query}'")
         
         # Step A: Check Memory first (Cache / Short-term memory)
-        # We look if we have answered something similar recently 
-        # (naive check for this demo)
-        previous_memories = memory.recall(limit=5)
-        # found_in_memory = False  # Unused variable removed
-        
-        # Very naive semantic check mock
-        for mem in previous_memories:
-            if "Redis" in query and "Redis" in mem['content']:
-                print(f"  -> Found relevant info in memory: {mem['content']}")
-                # found_in_memory = True # In a real system, we might skip retrieval
+        # We look if we have answered something similar recently
+        for hit in memory.search(query, k=3):
+            if hit.score > 0.5:
+                print(f"  -> Found relevant info in memory: {hit.value['content']}")
         
         # Step B: Retrieve from Documents
         retrieved_context = rag.retrieve(query)
@@ -74,24 +73,27 @@ def run_rag_with_memory():
 
         # Step C: Update Memory with the Retrieval (for citation or future context)
         # We store what we found so the agent 'statelessly' remembers what it read
-        memory.write(
-            f"Retrieved for '{query}': {retrieved_context}",
-            metadata={"source": "knowledge_base", "query": query}
-        )
+        memory.write_model(EpisodicMemory(
+            agent_id="rag_assistant_01",
+            content=f"Retrieved for '{query}': {retrieved_context}",
+            source="knowledge_base",
+            metadata={"type": "retrieval", "query": query},
+        ))
 
         # Step D: Generate Answer
         answer = rag.generate(query, retrieved_context)
         print(f"  -> Agent Answer: {answer}")
         
         # Step E: Store the Interaction
-        memory.write(
-            f"User asked '{query}'. Answered: {answer}",
-            metadata={"type": "conversation_history"}
-        )
+        memory.write_model(EpisodicMemory(
+            agent_id="rag_assistant_01",
+            content=f"User asked '{query}'. Answered: {answer}",
+            metadata={"type": "conversation_history"},
+        ))
         print("  -> Memory updated.\n")
 
     print("Session Complete. Memory Trace:")
-    for mem in memory.recall(limit=10):
+    for mem in memory.query(memory_type=EpisodicMemory, limit=10):
         print(
             f"- [{mem.get('metadata', {}).get('type', 'unknown')}] "
             f"{mem['content'][:50]}..."
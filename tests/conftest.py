@@ -0,0 +1,67 @@
+"""Shared fixtures: isolated emulators and clients for every backend."""
+import pytest
+
+from agent_memory_hub import MemoryClient
+from agent_memory_hub.config.emulator_config import EmulatorConfig
+from agent_memory_hub.config.lmdb_config import LmdbConfig
+from agent_memory_hub.config.sqlite_config import SQLiteConfig
+from agent_memory_hub.data_plane.lmdb_session_store import LMDB_AVAILABLE
+from agent_memory_hub.emulators import reset_emulators
+
+BACKENDS = ["memory", "sqlite", "lmdb", "redis", "alloydb", "firestore", "adk"]
+
+
+@pytest.fixture(autouse=True)
+def _isolated_emulators():
+    reset_emulators()
+    yield
+    reset_emulators()
+
+
+@pytest.fixture(params=BACKENDS)
+def backend(request):
+    return request.param
+
+
+@pytest.fixture
+def backend_kwargs(tmp_path):
+    """
+    Store arguments for a backend: a file under ``tmp_path`` for SQLite and
+    LMDB, an emulator namespace for the cloud backends. Stores of different
+    ``name`` are separate; skips the test if LMDB is not installed.
+    """
+
+    def make(backend, name="t"):
+        if backend == "sqlite":
+            return {"sqlite_config": SQLiteConfig(path=str(tmp_path / f"{name}.db"))}
+        if backend == "lmdb":
+            if not LMDB_AVAILABLE:
+                pytest.skip("lmdb not installed")
+            return {"lmdb_config": LmdbConfig(path=str(tmp_path / f"{name}.lmdb"))}
+        if backend == "memory":
+            return {}
+        return {"emulator_config": EmulatorConfig(namespace=f"{name}-{backend}")}
+
+    return make
+
+
+@pytest.fixture
+def make_client(backend_kwargs):
+    """Build a MemoryClient on a backend (see ``backend_kwargs``)."""
+
+    def make(backend, session_id="s1", agent_id="agent", name="t", **extra):
+        return MemoryClient(
+            agent_id=agent_id,
+            session_id=session_id,
+            region_restricted=False,
+            backend=backend,
+            **backend_kwargs(backend, name),
+            **extra,
+        )
+
+    return make
+
+
+@pytest.fixture
+def client(backend, make_client):
+    return make_client(backend)
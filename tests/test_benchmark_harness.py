@@ -0,0 +1,109 @@
+"""Tests for the benchmark harness, histogram and workload generators."""
+import json
+import random
+
+import pytest
+
+from benchmarks.harness import BenchmarkConfig, run_benchmark
+from benchmarks.histogram import LatencyHistogram
+from benchmarks.report import compare, csv_rows, load_json, write_json
+from benchmarks.stores import LocalSessionStore
+from benchmarks.workload import Workload, zipfian_sampler
+
+
+class TestLatencyHistogram:
+    def test_percentiles_within_precision(self):
+        hist = LatencyHistogram(significant_figures=3)
+        for value in range(1, 100_001):
+            hist.record(value * 1000)
+
+        for p, expected in ((50, 50_000_000), (99, 99_000_000), (99.9, 99_900_000)):
+            assert abs(hist.percentile(p) - expected) / expected < 1e-3
+        assert hist.percentile(100) == hist.max == 100_000_000
+        assert hist.min == 1000
+
+    def test_small_values_are_exact(self):
+        hist = LatencyHistogram()
+        for value in (1, 2, 3, 4):
+            hist.record(value)
+        assert hist.percentile(50) == 2
+
+    def test_merge(self):
+        a, b = LatencyHistogram(), LatencyHistogram()
+        a.record(10)
+        b.record(1_000_000)
+        a.merge(b)
+        assert a.count == 2
+        assert a.min == 10
+        assert a.max == 1_000_000
+
+    def test_empty(self):
+        assert LatencyHistogram().percentile(99) == 0
+
+
+class TestWorkload:
+    def test_zipfian_is_skewed_and_in_range(self):
+        sample = zipfian_sampler(1000, 0.99, random.Random(1))  # noqa: S311
+        draws = [sample() for _ in range(20_000)]
+
+        assert all(0 <= d < 1000 for d in draws)
+        # The hottest key dominates the median key by orders of magnitude
+        assert draws.count(0) > 50 * max(1, draws.count(500))
+
+    def test_invalid_distribution(self):
+        with pytest.raises(ValueError, match="Unknown distribution"):
+            Workload(distribution="pareto")
+
+    def test_location_spreads_sessions(self):
+        workload = Workload(key_space=10, sessions=3)
+        assert workload.location(4) == ("bench-session-1", "bench-key-4")
+
+
+@pytest.mark.parametrize("mode", ["threads", "asyncio"])
+def test_run_benchmark_collects_both_operations(mode):
+    config = BenchmarkConfig(
+        concurrency=2,
+        mode=mode,
+        warmup_seconds=0.05,
+        duration_seconds=0.2,
+        workload=Workload(read_ratio=0.5, key_space=50, value_size_bytes=32),
+    )
+    summary = run_benchmark(LocalSessionStore(), config).summary()
+
+    for op in ("read", "write"):
+        stats = summary["operations"][op]
+        assert stats["count"] > 0
+        assert stats["errors"] == 0
+        assert stats["p50_us"] <= stats["p99_us"] <= stats["max_us"]
+    assert summary["throughput_ops"] > 0
+    json.dumps(summary)
+
+
+def test_errors_are_counted_not_timed():
+    class FailingStore(LocalSessionStore):
+        def read(self, session_id, key):
+            raise ConnectionError("boom")
+
+    config = BenchmarkConfig(
+        concurrency=1, warmup_seconds=0, duration_seconds=0.1,
+        workload=Workload(read_ratio=1.0, key_space=5),
+    )
+    summary = run_benchmark(FailingStore(), config).summary()
+
+    assert summary["operations"]["read"]["errors"] > 0
+    assert summary["operations"]["read"]["count"] == 0
+
+
+def test_report_round_trip_and_compare(tmp_path):
+    config = BenchmarkConfig(
+        concurrency=1, warmup_seconds=0, duration_seconds=0.05,
+        workload=Workload(key_space=5),
+    )
+    summary = run_benchmark(LocalSessionStore(), config).summary()
+    path = tmp_path / "run.json"
+    write_json([summary], str(path))
+
+    runs = load_json(str(path))
+    assert len(csv_rows(runs)) == 2
+    rows = compare(runs, runs)
+    assert rows and all(change == 0.0 for *_, change in rows)
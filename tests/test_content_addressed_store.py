@@ -0,0 +1,224 @@
+"""Tests for the content-addressed deduplication layer."""
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+import pytest
+
+from agent_memory_hub.data_plane.adk_session_store import SessionStore, StoredEntry
+from agent_memory_hub.data_plane.content_addressed_store import (
+    BLOB_SESSION,
+    REF_FIELD,
+    ContentAddressedStore,
+)
+from agent_memory_hub.data_plane.memory_session_store import InMemorySessionStore
+from agent_memory_hub.data_plane.store_factory import StoreFactory
+
+
+class DictStore(SessionStore):
+    """Minimal in-process store recording write traffic."""
+
+    def __init__(self, ttl_seconds: Optional[int] = None):
+        self.ttl_seconds = ttl_seconds
+        self.data: Dict[Tuple[str, str], Any] = {}
+        self.expiry: Dict[Tuple[str, str], Optional[float]] = {}
+        self.bytes_written = 0
+
+    def write(self, session_id: str, key: str, value: Any) -> None:
+        self.bytes_written += len(repr(value))
+        self.data[(session_id, key)] = value
+
+    def read(self, session_id: str, key: str) -> Optional[Any]:
+        expires_at = self.expiry.get((session_id, key))
+        if expires_at is not None and expires_at <= time.time():
+            return None
+        return self.data.get((session_id, key))
+
+    def write_entries(self, session_id: str, entries: Dict[str, StoredEntry]) -> None:
+        for key, entry in entries.items():
+            self.write(session_id, key, entry.value)
+            self.expiry[(session_id, key)] = entry.expires_at
+
+    def iter_keys(self, session_id: str, prefix: str = ""):
+        return iter(sorted(
+            k for (s, k) in self.data if s == session_id and k.startswith(prefix)
+        ))
+
+    def delete(self, session_id: str, key: str) -> bool:
+        return self.data.pop((session_id, key), None) is not None
+
+
+@pytest.fixture
+def stores():
+    inner = DictStore(ttl_seconds=3600)
+    blobs = DictStore()
+    cas = ContentAddressedStore(inner=inner, blob_store=blobs, threshold_bytes=64)
+    return cas, inner, blobs
+
+
+def test_small_values_pass_through(stores):
+    cas, inner, blobs = stores
+    cas.write("s1", "k", "small")
+
+    assert inner.read("s1", "k") == "small"
+    assert blobs.data == {}
+    assert cas.read("s1", "k") == "small"
+
+
+def test_large_values_stored_once(stores):
+    cas, inner, blobs = stores
+    doc = {"content": "x" * 1024}
+
+    for i in range(10):
+        cas.write(f"s{i}", "doc", doc)
+
+    blob_keys = [k for (s, k) in blobs.data if k.startswith("blobs/")]
+    assert len(blob_keys) == 1
+    assert REF_FIELD in inner.read("s3", "doc")
+    assert cas.read("s3", "doc") == doc
+    # Ten references but only one copy of the payload
+    assert blobs.bytes_written < 10 * 1024
+
+
+def test_read_uses_blob_cache(stores):
+    cas, inner, blobs = stores
+    doc = {"content": "y" * 256}
+    cas.write("s1", "doc", doc)
+
+    blobs.data.pop((BLOB_SESSION, next(
+        k for (_, k) in blobs.data if k.startswith("blobs/")
+    )))
+    assert cas.read("s1", "doc") == doc
+
+
+def test_gc_keeps_referenced_blobs(stores):
+    cas, inner, blobs = stores
+    cas.write("s1", "doc", {"content": "z" * 256})
+
+    assert cas.collect_garbage() == 0
+    assert cas.read("s1", "doc") == {"content": "z" * 256}
+
+
+def test_gc_sweeps_overwritten_references(stores):
+    cas, inner, blobs = stores
+    cas.write("s1", "doc", {"content": "a" * 256})
+    cas.write("s1", "doc", "replaced")
+
+    # Within the grace period the reference may belong to a write in flight
+    assert cas.collect_garbage() == 0
+    cas.grace_seconds = 0
+    assert cas.collect_garbage() == 1
+    assert blobs.data == {}
+    assert cas.read("s1", "doc") == "replaced"
+
+
+def test_gc_sweeps_expired_references(stores):
+    cas, inner, blobs = stores
+    cas.write("s1", "doc", {"content": "b" * 256})
+
+    # Age the reference marker past its TTL
+    marker = next(k for (_, k) in blobs.data if k.startswith("refs/"))
+    blobs.expiry[(BLOB_SESSION, marker)] = time.time() - 1
+
+    assert cas.collect_garbage() == 1
+
+
+def test_gc_keeps_one_marker_per_reference(stores):
+    cas, inner, blobs = stores
+    doc = {"content": "d" * 256}
+    for _ in range(3):
+        cas.write("s1", "doc", doc)
+    cas.write("s2", "doc", doc)
+
+    def markers():
+        return [k for (_, k) in blobs.data if k.startswith("refs/")]
+
+    assert len(markers()) == 4
+    assert cas.collect_garbage() == 0
+    assert len(markers()) == 2
+    assert cas.read("s1", "doc") == doc
+
+
+def test_gc_spares_references_being_written():
+    store = ContentAddressedStore(InMemorySessionStore(), threshold_bytes=64)
+    doc = {"content": "e" * 256}
+    write = store.inner.write
+
+    def collecting(session_id, key, value):
+        # The collector runs between the blob write and the session key write
+        assert store.collect_garbage() == 0
+        write(session_id, key, value)
+
+    store.inner.write = collecting
+    store.write("s1", "doc", doc)
+    store.inner.write = write
+    store._cache.clear()
+    assert store.read("s1", "doc") == doc
+
+
+def test_gc_restores_blobs_referenced_while_deleting():
+    store = ContentAddressedStore(
+        InMemorySessionStore(), threshold_bytes=64, grace_seconds=0
+    )
+    doc = {"content": "f" * 256}
+    store.write("s1", "doc", doc)
+    store.write("s1", "doc", "replaced")
+    delete = store.blob_store.delete
+
+    def racing(session_id, key):
+        # Another process writes the same value while the blob is deleted
+        if key.startswith("blobs/"):
+            store.grace_seconds = 60
+            store.write("s2", "doc", doc)
+        return delete(session_id, key)
+
+    store.blob_store.delete = racing
+    assert store.collect_garbage() == 0
+    store.blob_store.delete = delete
+    store._cache.clear()
+    assert store.read("s2", "doc") == doc
+
+
+def test_concurrent_writers_and_collector_lose_no_blob():
+    store = ContentAddressedStore(InMemorySessionStore(), threshold_bytes=64)
+    docs = [{"content": str(i) * 256} for i in range(4)]
+    done = threading.Event()
+
+    def collect():
+        while not done.is_set():
+            store.collect_garbage()
+
+    collector = threading.Thread(target=collect)
+    collector.start()
+    try:
+        for round_ in range(20):
+            for i, doc in enumerate(docs):
+                store.write(f"s{i}", "doc", doc if round_ % 2 else "small")
+    finally:
+        done.set()
+        collector.join()
+    store._cache.clear()
+    assert [store.read(f"s{i}", "doc") for i in range(4)] == docs
+
+
+def test_blob_refreshed_when_blob_store_has_ttl():
+    inner = DictStore(ttl_seconds=3600)
+    cas = ContentAddressedStore(inner=inner, threshold_bytes=64)
+    doc = {"content": "c" * 256}
+
+    cas.write("s1", "doc", doc)
+    cas.write("s2", "doc", doc)
+
+    meta_key = next(k for (_, k) in inner.data if k.startswith("meta/"))
+    assert inner.data[(BLOB_SESSION, meta_key)]["blob_expires_at"] > time.time()
+    assert cas.read("s2", "doc") == doc
+
+
+def test_factory_wraps_store_when_dedup_enabled():
+    store = StoreFactory.get_store(
+        backend="adk", region="us-central1", dedup_threshold_bytes=1024
+    )
+
+    assert isinstance(store, ContentAddressedStore)
+    assert store.threshold_bytes == 1024
+    assert store.blob_store.ttl_seconds is None
@@ -0,0 +1,151 @@
+"""Tests for delete, delete_session, iter_keys and iter_streams across backends."""
+import pytest
+
+from agent_memory_hub.data_plane.adk_session_store import SessionStore
+from agent_memory_hub.data_plane.content_addressed_store import (
+    ContentAddressedStore,
+)
+from agent_memory_hub.data_plane.memory_session_store import InMemorySessionStore
+from agent_memory_hub.models import EpisodicMemory, SemanticMemory
+
+
+def _fact(obj="tea"):
+    return SemanticMemory(
+        id=obj, agent_id="agent", subject="user", predicate="likes", object=obj
+    )
+
+
+def test_delete_removes_value_and_indexes(client):
+    tea, coffee = _fact("tea"), _fact("coffee")
+    client.write_model(tea)
+    client.write_model(coffee)
+    client.write("note", key="notes")
+
+    assert client.delete(tea)
+    assert not client.delete(tea)
+    assert client.delete("notes")
+    assert not client.delete("missing")
+
+    assert client.recall("semanticmemory/tea") is None
+    assert client.recall("notes") is None
+    assert [m["object"] for m in client.query(memory_type=SemanticMemory)] == [
+        "coffee"
+    ]
+    assert [m["object"] for m in client.match_triples(subject="user")] == ["coffee"]
+    assert [m["object"] for m in client.rank(by="recency")] == ["coffee"]
+
+    # A deleted key can be written again
+    client.write_model(tea)
+    assert client.recall("semanticmemory/tea")["object"] == "tea"
+
+
+def test_iter_keys_streams_agent_keys(client):
+    client.write_many({f"episodicmemory/{i:03d}": i for i in range(7)})
+    client.write("note", key="notes")
+    client.write_model(_fact())
+    client._router.store.KEY_BATCH = 3
+
+    assert sorted(client.iter_keys()) == [
+        *(f"episodicmemory/{i:03d}" for i in range(7)),
+        "notes",
+        "semanticmemory/tea",
+    ]
+    assert sorted(client.iter_keys("episodicmemory/00")) == [
+        f"episodicmemory/{i:03d}" for i in range(7)
+    ]
+    assert list(client.iter_keys("semantic")) == ["semanticmemory/tea"]
+    assert list(client.iter_keys("none")) == []
+
+
+def test_iter_streams_lists_log_streams(client):
+    store = client._router.store
+    for stream in ("agent", "team/b", "episodes"):
+        store.append("s1", stream, [stream])
+    store.append("s2", "other", ["x"])
+
+    assert list(store.iter_streams("s1")) == ["agent", "episodes", "team/b"]
+    assert list(store.iter_log_sessions()) == ["s1", "s2"]
+    store.delete_log("s1", "episodes")
+    assert list(store.iter_streams("s1")) == ["agent", "team/b"]
+    assert list(store.iter_streams("s3")) == []
+
+
+def test_delete_session_removes_every_agent_and_log(client, make_client):
+    # In-process stores and LMDB environments are opened once; share them
+    shared = client.backend in ("memory", "lmdb")
+    backend = "memory" if shared else client.backend
+    other = make_client(backend, agent_id="other")
+    neighbour = make_client(backend, session_id="s2")
+    if shared:
+        other._router = neighbour._router = client._router
+    client.write_model(_fact())
+    client.write("note", key="notes")
+    other.write("theirs", key="notes")
+    neighbour.write("kept", key="notes")
+    client.append_episodes(["one", "two"])
+
+    assert client.delete_session() == 3
+    assert client.recall("notes") is None
+    assert other.recall("notes") is None
+    assert list(client.iter_keys()) == []
+    assert client.query().items == []
+    assert client.match_triples(subject="user").items == []
+    assert client.tail() == []
+    assert client.delete_session() == 0
+
+    # Other sessions are untouched and the session can be reused
+    assert neighbour.recall("notes") == "kept"
+    client.append_episodes(["three"])
+    assert [e["content"] for e in client.tail()] == ["three"]
+
+
+def test_delete_updates_loaded_session_and_search(make_client):
+    client = make_client("memory", keyword_search=True)
+    episode = EpisodicMemory(agent_id="agent", content="deploy the service")
+    client.write_model(episode)
+    client.write("note", key="notes")
+    client.load_session()
+
+    assert client.search("deploy")
+    client.delete(episode)
+    assert client.search("deploy") == []
+    assert client.recall(f"episodicmemory/{episode.id}") is None
+
+    client.write_model(episode)
+    client.delete_session()
+    assert client.search("deploy") == []
+    assert client.recall("notes") is None
+
+
+def test_content_addressed_store_frees_deleted_blobs():
+    store = ContentAddressedStore(
+        InMemorySessionStore(), threshold_bytes=16, grace_seconds=0
+    )
+    big = {"text": "x" * 64}
+    store.write("s1", "a", big)
+    store.write("s2", "b", big)
+    assert store.delete("s1", "a")
+    assert store.collect_garbage() == 0  # still referenced by s2
+    assert store.delete_session("s2") == 1
+    assert list(store.iter_keys("s2")) == []
+    assert store.collect_garbage() == 1
+
+
+def test_session_store_deletes_are_optional():
+    class Minimal(SessionStore):
+        def write(self, session_id, key, value):
+            pass
+
+        def read(self, session_id, key):
+            return None
+
+    with pytest.raises(NotImplementedError):
+        Minimal().delete("s1", "a")
+    with pytest.raises(NotImplementedError):
+        list(Minimal().iter_keys("s1"))
+    with pytest.raises(NotImplementedError):
+        list(Minimal().iter_streams("s1"))
+    with pytest.raises(NotImplementedError):
+        list(Minimal().iter_log_sessions())
+    with pytest.raises(NotImplementedError):
+        Minimal().delete_session("s1")
@@ -0,0 +1,138 @@
+"""Tests for the in-process backend emulators."""
+import pytest
+
+from agent_memory_hub import MemoryClient
+from agent_memory_hub.config.emulator_config import EmulatorConfig
+from agent_memory_hub.data_plane.store_factory import StoreFactory
+from agent_memory_hub.emulators import (
+    EmulatorThrottledError,
+    EmulatorUnavailableError,
+    LatencyModel,
+)
+from agent_memory_hub.emulators.redis import FakeRedis, _RedisState
+
+BACKENDS = ["adk", "firestore", "redis", "alloydb"]
+
+
+class FakeTime:
+    """Controllable clock/sleep pair; sleeping advances the clock."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.slept = []
+
+    def clock(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+class TestLatencyModel:
+    def test_same_seed_same_delays(self):
+        cfg = EmulatorConfig(latency_ms=5, distribution="lognormal", jitter_ms=1)
+        runs = []
+        for _ in range(2):
+            t = FakeTime()
+            model = LatencyModel(cfg, clock=t.clock, sleep=t.sleep)
+            for _ in range(20):
+                model("redis.get")
+            runs.append(t.slept)
+        assert runs[0] == runs[1]
+        assert len(set(runs[0])) > 1
+
+    def test_operation_override(self):
+        t = FakeTime()
+        cfg = EmulatorConfig(latency_ms=1, operation_latency_ms={"gcs.upload": 40})
+        model = LatencyModel(cfg, clock=t.clock, sleep=t.sleep)
+        model("gcs.download")
+        model("gcs.upload")
+        assert t.slept == pytest.approx([0.001, 0.040])
+
+    def test_error_injection(self):
+        model = LatencyModel(EmulatorConfig(error_rate=1.0), sleep=lambda s: None)
+        with pytest.raises(EmulatorUnavailableError):
+            model("redis.get")
+        assert model.injected_errors == 1
+
+    def test_throttle_delay(self):
+        t = FakeTime()
+        cfg = EmulatorConfig(throttle_ops_per_second=10, throttle_burst=2)
+        model = LatencyModel(cfg, clock=t.clock, sleep=t.sleep)
+        for _ in range(4):
+            model("redis.set")
+        # Burst of two is free, then one call per 100ms
+        assert t.slept == pytest.approx([0.1, 0.1])
+        assert model.throttled == 2
+
+    def test_throttle_reject(self):
+        t = FakeTime()
+        cfg = EmulatorConfig(
+            throttle_ops_per_second=1, throttle_burst=1, throttle_mode="reject"
+        )
+        model = LatencyModel(cfg, clock=t.clock, sleep=t.sleep)
+        model("redis.set")
+        with pytest.raises(EmulatorThrottledError):
+            model("redis.set")
+        t.now += 1.0
+        model("redis.set")
+
+    def test_invalid_distribution(self):
+        with pytest.raises(ValueError, match="Unknown latency distribution"):
+            EmulatorConfig(distribution="bimodal")
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_client_round_trip(backend):
+    client = MemoryClient(
+        "agent", "sess", backend=backend, emulator_config=EmulatorConfig()
+    )
+    client.write({"answer": 42}, "facts/life")
+
+    assert client.recall("facts/life") == {"answer": 42}
+    assert client.recall("missing") is None
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_namespaces_share_and_isolate(backend):
+    def store(namespace):
+        return StoreFactory.get_store(
+            backend=backend, emulator_config=EmulatorConfig(namespace=namespace)
+        )
+
+    store("a").write("s", "k", "v")
+    assert store("a").read("s", "k") == "v"
+    assert store("b").read("s", "k") is None
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_injected_errors_reach_caller(backend):
+    store = StoreFactory.get_store(
+        backend=backend,
+        emulator_config=EmulatorConfig(namespace="faulty"),
+    )
+    # Turn faults on after setup (schema creation, client construction)
+    from agent_memory_hub import emulators
+
+    for (namespace, _), (_, latency) in emulators._servers.items():
+        if namespace == "faulty":
+            latency.config = EmulatorConfig(error_rate=1.0)
+    with pytest.raises(EmulatorUnavailableError):
+        store.write("s", "k", "v")
+
+
+def test_fake_redis_expiry_and_pipeline():
+    t = FakeTime()
+    redis = FakeRedis(state=_RedisState(clock=t.clock))
+    redis.setex("a", 10, "1")
+    redis.set("b", "2")
+
+    pipe = redis.pipeline()
+    pipe.get("a").get("b").delete("b")
+    assert pipe.execute() == ["1", "2", 1]
+
+    t.now += 11
+    assert redis.get("a") is None
+    assert redis.ttl("a") == -2
+    assert list(redis.scan_iter(match="*")) == []
@@ -0,0 +1,191 @@
+"""Tests for append-only episode logs across backends."""
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from agent_memory_hub import MemoryClient
+from agent_memory_hub.config.emulator_config import EmulatorConfig
+from agent_memory_hub.data_plane.adk_session_store import (
+    AdkSessionStore,
+    SessionStore,
+)
+from agent_memory_hub.data_plane.memory_session_store import InMemorySessionStore
+from agent_memory_hub.emulators import reset_emulators
+from agent_memory_hub.emulators.redis import FakeRedis
+from agent_memory_hub.indexing import EpisodeLog, LogQuery
+from agent_memory_hub.models import EpisodicMemory
+
+
+def _contents(values):
+    return [value["content"] for value in values]
+
+
+def _pages(client, **kwargs):
+    pages, cursor = [], None
+    while True:
+        page = client.episodes(cursor=cursor, **kwargs)
+        pages.append(_contents(page))
+        cursor = page.next_cursor
+        if cursor is None:
+            return pages
+
+
+def test_append_and_tail(client):
+    entry = client.append_episode("first")
+    assert entry.value["content"] == "first"
+    assert entry.value["agent_id"] == "agent"
+    entries = client.append_episodes(
+        [EpisodicMemory(agent_id="agent", content=f"e{i}") for i in range(5)]
+    )
+    assert [e.ts for e in entries] == sorted(e.ts for e in entries)
+    assert entries[0].ts >= entry.ts
+    assert client.append_episodes([]) == []
+
+    assert _contents(client.tail(3)) == ["e2", "e3", "e4"]
+    assert _contents(client.tail(100)) == ["first", "e0", "e1", "e2", "e3", "e4"]
+    # Episode logs are separate from key-value data
+    assert client.recall("first") is None
+
+
+def test_paging_forward_and_reverse(client):
+    client.append_episodes([f"e{i}" for i in range(7)])
+    client.append_episode("e7")
+    assert _pages(client, limit=3) == [
+        ["e0", "e1", "e2"], ["e3", "e4", "e5"], ["e6", "e7"],
+    ]
+    assert _pages(client, limit=3, reverse=True) == [
+        ["e7", "e6", "e5"], ["e4", "e3", "e2"], ["e1", "e0"],
+    ]
+    assert _contents(client.iter_episodes(batch_size=2)) == [
+        f"e{i}" for i in range(8)
+    ]
+    assert _pages(client, limit=8) == [[f"e{i}" for i in range(8)]]
+
+
+def test_time_range(client):
+    client.append_episodes(["old", "older"])
+    now = datetime.now(timezone.utc)
+    assert _pages(client, until=now - timedelta(hours=1)) == [[]]
+    assert _pages(client, since=now + timedelta(hours=1)) == [[]]
+    window = {
+        "since": now - timedelta(hours=1),
+        "until": now + timedelta(hours=1),
+    }
+    assert _pages(client, limit=1, **window) == [["old"], ["older"]]
+    assert _contents(client.iter_episodes(reverse=True, **window)) == [
+        "older", "old",
+    ]
+
+
+def test_max_len_caps_the_log(client):
+    for i in range(6):
+        client.append_episode(f"e{i}", max_len=4)
+    assert _contents(client.tail(10)) == ["e2", "e3", "e4", "e5"]
+    client.append_episodes(["a", "b", "c"], max_len=2)
+    assert _contents(client.iter_episodes()) == ["b", "c"]
+    with pytest.raises(ValueError):
+        client.append_episode("x", max_len=0)
+
+
+def test_streams_are_per_agent(client):
+    store = client._router.store
+    client.append_episode("mine")
+    store.append("s1", "other", [{"content": "theirs"}])
+    store.append("s2", "agent", [{"content": "elsewhere"}])
+    assert _contents(client.tail()) == ["mine"]
+    page = store.read_log("s1", LogQuery(stream="other"))
+    assert _contents(page) == ["theirs"]
+
+
+def test_gcs_log_spans_segments():
+    reset_emulators()
+    client = MemoryClient(
+        agent_id="agent",
+        session_id="s1",
+        region_restricted=False,
+        backend="adk",
+        emulator_config=EmulatorConfig(namespace="log-segments"),
+    )
+    store = client._router.store
+    assert isinstance(store, AdkSessionStore)
+    store.LOG_SEGMENT_SIZE = 4
+    client.append_episodes([f"e{i}" for i in range(10)])
+    for i in range(10, 15):
+        client.append_episode(f"e{i}")
+    want = [f"e{i}" for i in range(15)]
+    assert _contents(client.iter_episodes(batch_size=3)) == want
+    assert _contents(client.iter_episodes(reverse=True, batch_size=5)) == want[::-1]
+
+    client.append_episode("e15", max_len=6)
+    head = store._load_log_head("s1", "agent")[0]
+    assert head["first_seq"] == 11
+    assert [segment[0] for segment in head["segments"]] == [9, 13]
+    assert _contents(client.iter_episodes(batch_size=4)) == want[10:] + ["e15"]
+
+
+def test_episode_log_unit():
+    log = EpisodeLog()
+    log.append(["a", "b"], now=10.0)
+    # Append times never go backwards
+    entries = log.append(["c"], now=5.0)
+    assert entries[0].ts == 10.0 and entries[0].id == "3"
+    log.append(["d"], now=20.0, max_len=3)
+    assert len(log) == 3 and log.first_seq == 2
+
+    page, more = log.read(LogQuery(stream="s", limit=2), None, now=20.0)
+    assert [e.value for e in page] == ["b", "c"] and more
+    page, more = log.read(LogQuery(stream="s", reverse=True), None, now=20.0)
+    assert [e.value for e in page] == ["d", "c", "b"] and not more
+    # Entries older than the TTL are skipped
+    page, _ = log.read(LogQuery(stream="s"), ttl_seconds=5, now=21.0)
+    assert [e.value for e in page] == ["d"]
+
+    restored = EpisodeLog.load(log.dump())
+    assert restored.first_seq == 2 and restored.next_seq == 5
+    assert restored.expire(15.0) == 2
+    assert [e.value for e in restored.read(LogQuery(stream="s"), None, 30.0)[0]] == [
+        "d"
+    ]
+
+
+def test_memory_snapshot_keeps_logs(tmp_path):
+    store = InMemorySessionStore()
+    store.append("s1", "agent", [{"n": 1}, {"n": 2}])
+    path = str(tmp_path / "snapshot.json")
+    store.snapshot(path)
+
+    restored = InMemorySessionStore()
+    restored.load_snapshot(path)
+    page = restored.read_log("s1", LogQuery(stream="agent"))
+    assert list(page) == [{"n": 1}, {"n": 2}]
+    assert restored.append("s1", "agent", [{"n": 3}])[0].id == "3"
+
+
+def test_redis_emulator_stream_ranges():
+    redis = FakeRedis()
+    ids = [redis.xadd("log", {"v": str(i)}) for i in range(4)]
+    assert ids == sorted(ids, key=lambda i: tuple(map(int, i.split("-"))))
+    assert [i for i, _ in redis.xrange("log")] == ids
+    assert [i for i, _ in redis.xrange("log", min=f"({ids[0]}", count=2)] == ids[1:3]
+    assert [i for i, _ in redis.xrange("log", min=ids[1], max=ids[2])] == ids[1:3]
+    assert [i for i, _ in redis.xrevrange("log", count=2)] == ids[:1:-1]
+    assert redis.xrange("log", min="+", max="-") == []
+    redis.xadd("log", {"v": "4"}, maxlen=2, approximate=False)
+    assert redis.xlen("log") == 2
+    assert redis.xrange("log")[-1][1] == {"v": "4"}
+
+
+def test_session_store_log_is_optional():
+    class Minimal(SessionStore):
+        def write(self, session_id, key, value):
+            pass
+
+        def read(self, session_id, key):
+            return None
+
+    with pytest.raises(NotImplementedError):
+        Minimal().append("s1", "agent", ["x"])
+    with pytest.raises(NotImplementedError):
+        Minimal().read_log("s1", LogQuery(stream="agent"))
+    with pytest.raises(ValueError):
+        LogQuery(stream="agent", limit=0)
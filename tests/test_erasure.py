@@ -0,0 +1,267 @@
+"""Tests for bulk erasure by user, agent, type or time range across backends."""
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from agent_memory_hub.control_plane.erasure import ErasureRequest, MemoryEraser
+from agent_memory_hub.data_plane.adk_session_store import SessionStore
+from agent_memory_hub.data_plane.memory_session_store import InMemorySessionStore
+from agent_memory_hub.indexing.ownership import Ownership, OwnershipIndex
+from agent_memory_hub.models import EpisodicMemory, SemanticMemory
+
+
+@pytest.fixture
+def tenant(backend, make_client):
+    """Agent "a" serving user "u1" in s1 and s2 and "u2" in s3; agent "b"
+    serving "u1" in s1."""
+    first = make_client(backend, "s1", "a", user_id="u1")
+    # In-process stores and LMDB environments are opened once; share them
+    shared = backend in ("memory", "lmdb")
+    clients = {("s1", "a"): first}
+    for session_id, agent_id, user_id in [
+        ("s2", "a", "u1"), ("s1", "b", "u1"), ("s3", "a", "u2"),
+    ]:
+        client = make_client(
+            "memory" if shared else backend, session_id, agent_id, user_id=user_id
+        )
+        if shared:
+            client._router = first._router
+        clients[(session_id, agent_id)] = client
+    for client in clients.values():
+        client.write_model(_fact(client.agent_id))
+        client.write("note", key="notes")
+        client.append_episodes(["hello"])
+    return clients
+
+
+def _fact(agent_id, obj="tea", created_at=None):
+    fact = SemanticMemory(
+        id=obj, agent_id=agent_id, subject="user", predicate="likes", object=obj
+    )
+    if created_at is not None:
+        fact.created_at = created_at
+    return fact
+
+
+def _erased(client):
+    return (
+        client.recall("notes") is None
+        and list(client.iter_keys()) == []
+        and client.query().items == []
+        and client.tail() == []
+    )
+
+
+def test_erase_user_across_sessions_and_agents(tenant):
+    eraser = tenant[("s1", "a")].eraser(workers=2)
+    report = eraser.erase(user_id="u1")
+
+    assert sorted(report.units) == [("s1", "a"), ("s1", "b"), ("s2", "a")]
+    assert report.deleted == 6
+    assert report.remaining == []
+    for unit in report.units:
+        assert _erased(tenant[unit])
+    kept = tenant[("s3", "a")]
+    assert kept.recall("notes") == "note"
+    assert [e["content"] for e in kept.tail()] == ["hello"]
+
+    # Nothing is left to find
+    assert eraser.erase(user_id="u1").units == []
+    assert [o.session_id for o in eraser.owners.owned(agent_id="a")] == ["s3"]
+
+
+def test_erase_agent_in_every_session(tenant):
+    report = tenant[("s1", "b")].eraser().erase(agent_id="a")
+
+    assert sorted(report.units) == [("s1", "a"), ("s2", "a"), ("s3", "a")]
+    assert report.remaining == []
+    assert all(_erased(tenant[unit]) for unit in report.units)
+    assert tenant[("s1", "b")].recall("notes") == "note"
+
+
+def test_erase_by_type_and_time_range(tenant):
+    client = tenant[("s1", "a")]
+    old = datetime.now(timezone.utc) - timedelta(days=30)
+    client.write_model(_fact("a", "coffee", created_at=old))
+    client.write_model(EpisodicMemory(id="e1", agent_id="a", content="deploy"))
+    eraser = client.eraser()
+
+    report = eraser.erase(
+        user_id="u1", memory_type=SemanticMemory, until=old + timedelta(days=1)
+    )
+    assert report.deleted == 1
+    assert report.remaining == []
+    assert [m["object"] for m in client.query(memory_type=SemanticMemory)] == ["tea"]
+
+    report = eraser.erase(user_id="u1", memory_type="SemanticMemory")
+    assert report.deleted == 3  # tea of s1/a, s2/a and s1/b
+    assert client.recall("notes") == "note"
+    assert [m["id"] for m in client.query()] == ["e1"]
+    assert [e["content"] for e in client.tail()] == ["hello"]
+
+    # Filtered erasures keep the ownership records
+    assert len(eraser.erase(user_id="u1").units) == 3
+    assert _erased(client)
+
+
+def test_verify_reports_what_is_left(tenant):
+    client = tenant[("s1", "a")]
+    eraser = client.eraser()
+    report = eraser.erase(agent_id="a", verify=False)
+    client._router.write("s2", "a/late", 1)
+    client._router.append("s3", "a", ["late"])
+    assert eraser.verify(report) == [("s2", "a/late"), ("s3", "log:a")]
+
+
+def test_verify_does_not_trust_the_index(tenant):
+    client = tenant[("s1", "a")]
+    eraser = client.eraser()
+    # Records lost: the pair's memories are no longer found by the erasure
+    eraser.owners.unregister(Ownership("s2", "a", "u1"))
+    report = eraser.erase(user_id="u1", verify="full")
+
+    assert ("s2", "a") not in report.units
+    assert ("s2", "a/notes") in report.remaining
+    assert ("s2", "log:a") in report.remaining
+    # s3 is recorded for another user, so its memories are not reported
+    assert not [pair for pair in report.remaining if pair[0] != "s2"]
+    # By default only the indexed pairs are checked, without a full scan
+    assert eraser.verify(report) == []
+    with pytest.raises(ValueError):
+        eraser.erase(user_id="u1", verify="everything")
+
+
+@pytest.fixture
+def advance(monkeypatch):
+    """Move every clock the stores and emulators read forward by seconds."""
+    from agent_memory_hub import emulators
+    from agent_memory_hub.emulators.redis import _RedisState
+    from agent_memory_hub.utils import ttl_manager
+
+    offset = 0.0
+    real_time = time.time
+
+    class ShiftedDatetime(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return datetime.now(tz) + timedelta(seconds=offset)
+
+    monkeypatch.setattr(time, "time", lambda: real_time() + offset)
+    monkeypatch.setattr(ttl_manager, "datetime", ShiftedDatetime)
+
+    def move(seconds):
+        nonlocal offset
+        offset += seconds
+        for state, _ in emulators._servers.values():
+            if isinstance(state, _RedisState):
+                state.clock = lambda clock=time.monotonic: clock() + offset
+
+    return move
+
+
+def test_ownership_outlives_the_store_ttl(backend, make_client, advance):
+    client = make_client(backend, user_id="u1", ttl_seconds=60)
+    client.write("first", key="notes")
+    advance(120)
+    assert list(client.eraser().owners.owned(user_id="u1")) == [
+        Ownership("s1", "agent", "u1")
+    ]
+    client.write("second", key="notes")
+
+    report = client.eraser().erase(user_id="u1")
+    assert report.units == [("s1", "agent")]
+    assert report.deleted == 1 and report.remaining == []
+    assert client.recall("notes") is None
+
+
+def test_checkpoint_resumes_interrupted_erasure(tmp_path):
+    store = InMemorySessionStore()
+    owners = OwnershipIndex(store)
+    for session_id in ("s1", "s2", "s3"):
+        owners.register(Ownership(session_id, "a", "u1"))
+        store.write_many(session_id, {"a/x": 1, "a/y": 2})
+    checkpoint = str(tmp_path / "erase.ndjson")
+
+    eraser = MemoryEraser(store, workers=1)
+    erase_unit = eraser._erase_unit
+    calls = []
+
+    def flaky(request, unit, ownerships):
+        calls.append(unit)
+        if len(calls) == 2:
+            raise ConnectionError("backend went away")
+        return erase_unit(request, unit, ownerships)
+
+    eraser._erase_unit = flaky
+    with pytest.raises(ConnectionError):
+        eraser.erase(user_id="u1", checkpoint=checkpoint)
+
+    # Only the failed pair is erased again
+    failed = calls[1]
+    calls.clear()
+
+    def recorded(request, unit, ownerships):
+        calls.append(unit)
+        return erase_unit(request, unit, ownerships)
+
+    eraser._erase_unit = recorded
+    report = eraser.erase(user_id="u1", checkpoint=checkpoint)
+    assert calls == [failed]
+    assert report.resumed == 2
+    assert sorted(report.units) == [("s1", "a"), ("s2", "a"), ("s3", "a")]
+    assert report.deleted == 6
+    assert report.remaining == []
+    assert all(list(store.iter_keys(s)) == [] for s in ("s1", "s2", "s3"))
+
+    with pytest.raises(ValueError):
+        eraser.erase(agent_id="a", checkpoint=checkpoint)
+
+
+def test_ownership_index_quotes_identifiers():
+    owners = OwnershipIndex(InMemorySessionStore())
+    owners.register(Ownership("s/1", "team/a", "user/1"))
+    owners.register(Ownership("s/2", "team/a"))
+    assert list(owners.owned(user_id="user/1")) == [
+        Ownership("s/1", "team/a", "user/1")
+    ]
+    assert list(owners.owned(agent_id="team/a")) == [
+        Ownership("s/1", "team/a", "user/1"),
+        Ownership("s/2", "team/a"),
+    ]
+    assert list(owners.owned(user_id="user/1", agent_id="other")) == []
+    owners.unregister(Ownership("s/1", "team/a", "user/1"))
+    assert list(owners.owned(user_id="user/1")) == []
+    with pytest.raises(ValueError):
+        list(owners.owned())
+
+
+def test_erasure_needs_a_subject():
+    with pytest.raises(ValueError):
+        ErasureRequest()
+    with pytest.raises(ValueError):
+        MemoryEraser(InMemorySessionStore(), workers=0)
+
+
+def test_session_store_delete_prefix_falls_back_to_deletes():
+    class Minimal(SessionStore):
+        def __init__(self):
+            self.data = {"a/x": 1, "a/y": 2, "b/x": 3}
+
+        def write(self, session_id, key, value):
+            self.data[key] = value
+
+        def read(self, session_id, key):
+            return self.data.get(key)
+
+        def delete(self, session_id, key):
+            return self.data.pop(key, None) is not None
+
+        def iter_keys(self, session_id, prefix=""):
+            return iter(sorted(k for k in self.data if k.startswith(prefix)))
+
+    store = Minimal()
+    assert store.delete_prefix("s1", "a/") == 2
+    assert store.data == {"b/x": 3}
+    with pytest.raises(NotImplementedError):
+        store.delete_log("s1", "a")
@@ -0,0 +1,125 @@
+"""Tests for BM25 keyword search and hybrid ranking."""
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from agent_memory_hub import MemoryClient  # noqa: E402
+from agent_memory_hub.indexing import (  # noqa: E402
+    HashingEmbedder,
+    InvertedIndex,
+    KeywordIndex,
+    SearchResult,
+    reciprocal_rank_fusion,
+    tokenize,
+)
+from agent_memory_hub.models import EpisodicMemory, SemanticMemory  # noqa: E402
+
+
+def _episode(content, **kwargs):
+    return {"memory_type": "EpisodicMemory", "content": content, **kwargs}
+
+
+def test_tokenize_keeps_identifiers_whole():
+    assert tokenize("Refund ORD-12345 failed: E_CONN.reset") == [
+        "refund", "ord-12345", "ord", "12345", "failed", "e_conn.reset",
+        "e", "conn", "reset",
+    ]
+
+
+def test_bm25_ranks_rare_terms_and_short_documents_higher():
+    index = InvertedIndex()
+    index.add("short", tokenize("invoice overdue"))
+    index.add("long", tokenize("invoice overdue " + "filler words " * 20))
+    for i in range(20):
+        index.add(f"noise{i}", tokenize("invoice sent to customer"))
+
+    results = index.search(tokenize("overdue invoice"), 5)
+    assert [key for key, _ in results[:2]] == ["short", "long"]
+    assert results[0][1] > results[1][1] > results[2][1]
+    assert index.search(tokenize("unknown"), 5) == []
+    odd = index.search(tokenize("invoice"), 3, allowed=lambda k: k.endswith("1"))
+    assert {key for key, _ in odd} <= {"noise1", "noise11"}
+
+
+def test_postings_are_delta_encoded_and_widen_on_demand():
+    index = InvertedIndex()
+    for i in range(300):
+        index.add(f"k{i}", ["common"] + (["rare"] if i in (0, 299) else []))
+    common = index._postings["common"]
+    rare = index._postings["rare"]
+    assert common.deltas.typecode == "B" and len(common.deltas) == 300
+    assert rare.deltas.typecode == "H" and list(rare.deltas) == [0, 299]
+    assert index.posting_bytes == 2 * 300 + 2 * 2 + 2
+
+
+def test_remove_replace_and_compaction():
+    index = InvertedIndex()
+    for i in range(3000):
+        index.add(f"k{i}", ["even" if i % 2 == 0 else "odd", f"id{i}"])
+    index.add("k2001", ["even"])  # replace moves k2001 to the other term
+    for i in range(2000):
+        index.remove(f"k{i}")
+
+    # Dead ids outnumbered live ones at some point, so ids were renumbered
+    assert len(index) == 1000
+    assert len(index._doc_keys) < 2000
+    assert {key for key, _ in index.search(["even"], 1000)} == {
+        f"k{i}" for i in range(2000, 3000, 2)
+    } | {"k2001"}
+    assert index.search(["id2001"], 1) == []
+    assert index.search(["id2999"], 1)[0][0] == "k2999"
+    assert not index.remove("k0")
+
+
+def test_keyword_index_scopes_filters_and_triples():
+    index = KeywordIndex()
+    index.add("a", _episode("Error E1042 on checkout", scope="user", tags=["ops"]))
+    index.add("b", _episode("Error E2000 on login", scope="session"))
+    index.add("c", {"memory_type": "SemanticMemory", "subject": "E1042",
+                    "predicate": "means", "object": "card declined"})
+
+    assert {r.key for r in index.search("e1042")} == {"a", "c"}
+    assert [r.key for r in index.search("error", scope="session")] == ["b"]
+    assert [r.key for r in index.search("e1042", tags=["ops"])] == ["a"]
+    assert [r.key for r in index.search("declined",
+                                        memory_type="SemanticMemory")] == ["c"]
+
+
+def test_reciprocal_rank_fusion():
+    vector = [SearchResult("a", 0.9), SearchResult("b", 0.8), SearchResult("c", 0.1)]
+    keyword = [SearchResult("b", 12.0), SearchResult("c", 3.0)]
+    fused = reciprocal_rank_fusion([vector, keyword], k=2)
+    assert [r.key for r in fused] == ["b", "c"]
+    assert fused[0].score == pytest.approx(1 / 62 + 1 / 61)
+    weighted = reciprocal_rank_fusion([vector, keyword], k=1, weights=[1.0, 0.0])
+    assert weighted[0].key == "a"
+
+
+def test_client_hybrid_search_finds_exact_identifiers():
+    client = MemoryClient(agent_id="agent", session_id="s1", region_restricted=False,
+                          backend="memory", embedder=HashingEmbedder(dimension=32))
+    for i in range(200):
+        client.write_model(EpisodicMemory(
+            agent_id="agent", content=f"Customer asked about order ORD-{10000 + i}"
+        ))
+    client.write_model(SemanticMemory(agent_id="agent", subject="ORD-10042",
+                                      predicate="status", object="refunded"))
+
+    keyword = client.search("was ORD-10042 refunded", k=2, mode="keyword")
+    assert [r.value.get("subject") for r in keyword] == ["ORD-10042", None]
+    assert keyword[1].value["content"] == "Customer asked about order ORD-10042"
+    # The hashed embedding scores every "order ORD-..." memory alike; fusing
+    # in BM25 puts the exact identifier first
+    hybrid = client.search("which customer asked about order ORD-10042", k=3)
+    assert hybrid[0].value["content"] == "Customer asked about order ORD-10042"
+    with pytest.raises(ValueError):
+        client.search("x", mode="fuzzy")
+
+
+def test_keyword_only_client():
+    client = MemoryClient(agent_id="a", session_id="s", region_restricted=False,
+                          backend="memory", keyword_search=True)
+    client.write_model(EpisodicMemory(agent_id="a", content="Ticket INC-7 closed"))
+    assert client.search("inc-7")[0].value["content"] == "Ticket INC-7 closed"
+    with pytest.raises(ValueError):
+        client.search("inc-7", mode="hybrid")
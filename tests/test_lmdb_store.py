@@ -0,0 +1,98 @@
+import multiprocessing
+from unittest.mock import patch
+
+import pytest
+
+from agent_memory_hub import MemoryClient
+from agent_memory_hub.config.lmdb_config import LmdbConfig
+from agent_memory_hub.data_plane.lmdb_session_store import (
+    LMDB_AVAILABLE,
+    LazyValue,
+    LmdbSessionStore,
+)
+from agent_memory_hub.data_plane.store_factory import StoreFactory
+
+pytestmark = pytest.mark.skipif(not LMDB_AVAILABLE, reason="lmdb not installed")
+
+
+@pytest.fixture
+def config(tmp_path):
+    return LmdbConfig(path=str(tmp_path / "env"), map_size=1 << 20)
+
+
+def _write_from_child(path, value):
+    LmdbSessionStore(LmdbConfig(path=path)).write("shared", "k", value)
+
+
+def test_round_trip(config):
+    store = LmdbSessionStore(config)
+    store.write("s1", "k", {"skills": ["a", "b"]})
+
+    assert store.read("s1", "k") == {"skills": ["a", "b"]}
+    assert store.read("s1", "missing") is None
+    assert store.read("s", "1\x00k") is None
+
+
+def test_view_is_zero_copy_payload(config):
+    store = LmdbSessionStore(config)
+    store.write("s1", "k", "x" * 100)
+
+    with store.view("s1", "k") as payload:
+        assert isinstance(payload, memoryview)
+        assert payload.tobytes() == b'"' + b"x" * 100 + b'"'
+    with store.view("s1", "missing") as payload:
+        assert payload is None
+
+
+def test_read_lazy_decodes_on_demand(config):
+    store = LmdbSessionStore(config)
+    store.write("s1", "k", [1, 2, 3])
+
+    lazy = store.read_lazy("s1", "k")
+    assert isinstance(lazy, LazyValue)
+    assert lazy.raw == b"[1, 2, 3]"
+    assert len(lazy) == 9
+    assert lazy.value == [1, 2, 3]
+    assert store.read_lazy("s1", "missing") is None
+
+
+def test_ttl_expiry_and_cleanup(config):
+    store = LmdbSessionStore(config, ttl_seconds=10)
+    with patch("time.time", return_value=1000.0):
+        store.write_many("s1", {"a": 1, "b": 2})
+        store.write("s2", "c", 3)
+    with patch("time.time", return_value=1005.0):
+        assert store.read("s1", "a") == 1
+    with patch("time.time", return_value=1011.0):
+        assert store.read("s1", "a") is None
+        assert store.cleanup_expired(session_id="s1") == 2
+        assert store.cleanup_expired() == 1
+
+
+def test_map_grows_when_full(config):
+    store = LmdbSessionStore(config)
+    blob = "x" * 256 * 1024
+    for i in range(8):
+        store.write("s1", f"k{i}", blob)
+    assert store.read("s1", "k7") == blob
+
+
+def test_processes_share_environment(config):
+    store = LmdbSessionStore(config)
+    ctx = multiprocessing.get_context("spawn")
+    child = ctx.Process(target=_write_from_child, args=(config.path, "from child"))
+    child.start()
+    child.join(30)
+
+    assert child.exitcode == 0
+    assert store.read("shared", "k") == "from child"
+
+
+def test_factory_and_client(config):
+    store = StoreFactory.get_store(backend="lmdb", lmdb_config=config)
+    assert isinstance(store, LmdbSessionStore)
+    store.close()
+
+    client = MemoryClient("agent", "sess", backend="lmdb", lmdb_config=config)
+    client.write("hello", "greeting")
+    assert client.recall("greeting") == "hello"
@@ -0,0 +1,134 @@
+"""Tests for batched reads and the memory relationship graph."""
+import threading
+
+import pytest
+
+from agent_memory_hub.indexing.graph import expand
+from agent_memory_hub.models import EpisodicMemory, Relation, SemanticMemory
+
+
+def _fact(obj):
+    return SemanticMemory(
+        agent_id="agent", subject="user", predicate="likes", object=obj
+    )
+
+
+def _count_batches(client):
+    calls = []
+    read_many = client._router.store.read_many
+
+    def counting(session_id, keys):
+        calls.append(list(keys))
+        return read_many(session_id, keys)
+
+    client._router.store.read_many = counting
+    return calls
+
+
+def test_read_many_aligns_with_keys(client):
+    client.write({"a": 1}, key="k1")
+    client.write([1, 2], key="k2")
+    client.write("text", key="k3")
+
+    assert client.recall_many(["k3", "missing", "k1", "k2", "k1"]) == [
+        "text", None, {"a": 1}, [1, 2], {"a": 1},
+    ]
+    assert client.recall_many([]) == []
+
+
+def test_link_stores_forward_and_reverse_edges(client):
+    old, new, detail = _fact("tea"), _fact("coffee"), _fact("espresso")
+    for memory in (old, new, detail):
+        client.write_model(memory)
+    client.link(new, Relation.SUPERSEDES, old)
+    client.link(new, "parent_of", detail)
+    client.link(new, Relation.SUPERSEDES, old)  # idempotent
+
+    new_key = f"semanticmemory/{new.id}"
+    old_key = f"semanticmemory/{old.id}"
+    assert client.edges(new) == {
+        "supersedes": [old_key],
+        "parent_of": [f"semanticmemory/{detail.id}"],
+    }
+    assert client.edges(old_key, direction="in") == {"supersedes": [new_key]}
+
+    client.unlink(new, Relation.SUPERSEDES, old)
+    assert client.edges(old, direction="in") == {}
+    assert list(client.edges(new)) == ["parent_of"]
+    with pytest.raises(ValueError):
+        client.link(new, "likes", old)
+
+
+def test_concurrent_links_are_all_kept(client):
+    hub = _fact("hub")
+    client.write_model(hub)
+    spokes = [[f"semanticmemory/t{t}-{i}" for i in range(5)] for t in range(4)]
+
+    def link_all(keys):
+        for key in keys:
+            client.link(hub, Relation.RELATED_TO, key)
+
+    threads = [threading.Thread(target=link_all, args=(keys,)) for keys in spokes]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    linked = client.edges(hub)["related_to"]
+    assert sorted(linked) == sorted(key for keys in spokes for key in keys)
+
+
+def test_expand_fetches_each_level_in_one_batch(client):
+    # root -> a0..a2 -> b0..b2, plus a related_to edge the filter excludes
+    root = _fact("root")
+    level1 = [_fact(f"a{i}") for i in range(3)]
+    level2 = [_fact(f"b{i}") for i in range(3)]
+    unrelated = EpisodicMemory(agent_id="agent", content="aside")
+    for memory in (root, *level1, *level2, unrelated):
+        client.write_model(memory)
+    for a, b in zip(level1, level2, strict=True):
+        client.link(root, Relation.PARENT_OF, a)
+        client.link(a, Relation.DEPENDS_ON, b)
+    client.link(root, Relation.RELATED_TO, unrelated)
+
+    calls = _count_batches(client)
+    nodes = client.expand(root, depth=2, relations=["parent_of", "depends_on"])
+
+    assert len(calls) == 3  # one batched read per level
+    assert [n.value["object"] for n in nodes] == [
+        "root", "a0", "a1", "a2", "b0", "b1", "b2",
+    ]
+    assert [n.depth for n in nodes] == [0, 1, 1, 1, 2, 2, 2]
+    assert nodes[4].relation == "depends_on"
+    assert nodes[4].parent == f"semanticmemory/{level1[0].id}"
+
+    everything = client.expand(root, depth=1)
+    assert {n.key for n in everything} == {
+        f"semanticmemory/{m.id}" for m in (root, *level1)
+    } | {f"episodicmemory/{unrelated.id}"}
+
+    reverse = client.expand(level2[1], depth=2, direction="in")
+    assert [n.value["object"] for n in reverse] == ["b1", "a1", "root"]
+
+
+def test_expand_bounds_and_dangling_edges(client):
+    hub = _fact("hub")
+    spokes = [_fact(f"s{i}") for i in range(5)]
+    for memory in (hub, *spokes):
+        client.write_model(memory)
+    for spoke in spokes:
+        client.link(hub, Relation.RELATED_TO, spoke)
+        client.link(spoke, Relation.RELATED_TO, hub)  # cycles are visited once
+    client.link(hub, Relation.RELATED_TO, "semanticmemory/deleted")
+
+    assert len(client.expand(hub, depth=3)) == 6
+    assert len(client.expand(hub, depth=3, max_nodes=3)) == 3
+    assert len(client.expand(hub, depth=0)) == 1
+    both = client.expand(spokes[0], depth=1, direction="both")
+    assert [n.value["object"] for n in both] == ["s0", "hub"]
+
+
+def test_expand_validates_arguments():
+    with pytest.raises(ValueError):
+        expand(["a"], lambda keys: [None] * len(keys), direction="sideways")
+    with pytest.raises(ValueError):
+        expand(["a"], lambda keys: [None] * len(keys), depth=-1)
@@ -0,0 +1,172 @@
+"""Tests for the secondary-index memory query API across backends."""
+import copy
+from datetime import datetime, timedelta
+
+import pytest
+
+from agent_memory_hub import MemoryClient
+from agent_memory_hub.config.emulator_config import EmulatorConfig
+from agent_memory_hub.data_plane.adk_session_store import SessionStore
+from agent_memory_hub.indexing import (
+    MemoryQuery,
+    decode_cursor,
+    encode_cursor,
+    index_record,
+)
+from agent_memory_hub.models import EpisodicMemory, MemoryScope, SemanticMemory
+
+BASE = datetime(2025, 1, 1, 12, 0, 0)
+
+
+def _semantic(i, **kwargs):
+    return SemanticMemory(
+        agent_id="agent",
+        subject="user",
+        predicate="likes",
+        object=f"thing-{i}",
+        created_at=BASE + timedelta(minutes=i),
+        **kwargs,
+    )
+
+
+def test_filters_by_type_scope_tags_and_time(client):
+    for i in range(6):
+        client.write_model(
+            _semantic(
+                i,
+                scope=MemoryScope.USER if i % 2 else MemoryScope.SESSION,
+                tags=["food", "pref"] if i < 3 else ["food"],
+            )
+        )
+    client.write_model(
+        EpisodicMemory(
+            agent_id="agent", event_type="chat", content="hi", created_at=BASE
+        )
+    )
+    client.write("not a model", key="plain")
+
+    assert len(client.query()) == 7
+    assert len(client.query(memory_type=SemanticMemory)) == 6
+    assert len(client.query(memory_type="EpisodicMemory")) == 1
+
+    user = client.query(scope=MemoryScope.USER)
+    assert [m["object"] for m in user] == ["thing-1", "thing-3", "thing-5"]
+
+    tagged = client.query(tags=["pref", "food"])
+    assert [m["object"] for m in tagged] == ["thing-0", "thing-1", "thing-2"]
+
+    window = client.query(
+        memory_type=SemanticMemory,
+        since=BASE + timedelta(minutes=2),
+        until=BASE + timedelta(minutes=4),
+    )
+    assert [m["object"] for m in window] == ["thing-2", "thing-3"]
+    assert client.recall(window.keys[0])["object"] == "thing-2"
+
+
+def test_cursor_pagination(client):
+    for i in range(7):
+        client.write_model(_semantic(i))
+
+    seen, cursor = [], None
+    while True:
+        page = client.query(memory_type=SemanticMemory, limit=3, cursor=cursor)
+        seen.extend(m["object"] for m in page)
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+    assert seen == [f"thing-{i}" for i in range(7)]
+
+
+def test_overwrite_updates_index(client):
+    memory = _semantic(0, tags=["old"])
+    client.write_model(memory)
+    memory.tags = ["new"]
+    client.write_model(memory)
+
+    assert len(client.query(tags=["old"])) == 0
+    assert [m["tags"] for m in client.query(tags=["new"])] == [["new"]]
+
+    key = client.query().keys[0]
+    client.write("replaced", key=key)
+    assert len(client.query()) == 0
+
+
+def test_gcs_pages_are_fetched_in_one_batch():
+    client = MemoryClient(
+        agent_id="agent",
+        session_id="s1",
+        region_restricted=False,
+        backend="adk",
+        emulator_config=EmulatorConfig(namespace="query-batch"),
+    )
+    for i in range(5):
+        client.write_model(_semantic(i))
+    store = client._router.store
+    batches = []
+    read_many = store.read_many
+
+    def recorded(session_id, keys):
+        batches.append(list(keys))
+        return read_many(session_id, keys)
+
+    store.read = None  # a per-key read would fail
+    store.read_many = recorded
+    assert len(client.query(memory_type=SemanticMemory)) == 5
+    assert len(client.rank(by="importance", limit=3)) == 3
+    assert [len(keys) for keys in batches] == [5, 3]
+
+
+def test_queries_are_scoped_to_agent(client):
+    client.write_model(_semantic(0))
+    other = copy.copy(client)
+    other.agent_id = "other"
+    other.write_model(_semantic(1))
+
+    assert [m["object"] for m in client.query()] == ["thing-0"]
+    assert [m["object"] for m in other.query()] == ["thing-1"]
+
+
+def test_invalid_cursor_and_limit():
+    with pytest.raises(ValueError):
+        MemoryQuery(cursor="not-a-cursor").after()
+    with pytest.raises(ValueError):
+        MemoryQuery(limit=0)
+    assert decode_cursor(encode_cursor(1.5, "a/b")) == (1.5, "a/b")
+
+
+def test_index_record_only_for_models():
+    value = _semantic(0, tags=["t"]).to_dict()
+    record = index_record("agent/semanticmemory/1", value)
+    assert record.memory_type == "SemanticMemory"
+    assert record.tags == ("t",)
+    assert index_record("k", {"memory_type": "X"}) is None
+    assert index_record("k", "text") is None
+
+
+def test_deduplicated_models_are_queryable():
+    client = MemoryClient(
+        agent_id="agent",
+        session_id="s1",
+        region_restricted=False,
+        backend="memory",
+        dedup_threshold_bytes=256,
+    )
+    client.write_model(_semantic(0, tags=["big"], metadata={"blob": "x" * 1024}))
+    client.write_model(_semantic(1))
+
+    page = client.query(tags=["big"])
+    assert [m["metadata"]["blob"] for m in page] == ["x" * 1024]
+    assert len(client.query()) == 2
+
+
+def test_stores_without_index_raise():
+    class PlainStore(SessionStore):
+        def write(self, session_id, key, value):
+            pass
+
+        def read(self, session_id, key):
+            return None
+
+    with pytest.raises(NotImplementedError):
+        PlainStore().query("s1", MemoryQuery())
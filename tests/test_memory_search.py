@@ -0,0 +1,167 @@
+"""Tests for embedding-based memory search."""
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from agent_memory_hub import MemoryClient  # noqa: E402
+from agent_memory_hub.config.sqlite_config import SQLiteConfig  # noqa: E402
+from agent_memory_hub.config.vector_config import VectorIndexConfig  # noqa: E402
+from agent_memory_hub.indexing import (  # noqa: E402
+    CallableEmbedder,
+    EmbeddingIndex,
+    HashingEmbedder,
+    VectorIndex,
+)
+from agent_memory_hub.models import (  # noqa: E402
+    EpisodicMemory,
+    MemoryScope,
+    SemanticMemory,
+)
+
+
+def _client(**kwargs):
+    kwargs.setdefault("backend", "memory")
+    return MemoryClient(
+        agent_id="agent",
+        session_id="s1",
+        region_restricted=False,
+        embedder=HashingEmbedder(dimension=512),
+        **kwargs,
+    )
+
+
+def test_hashing_embedder_is_deterministic():
+    a = HashingEmbedder(64).embed(["Dark mode please", "dark MODE please"])
+    b = HashingEmbedder(64).embed(["dark mode please"])
+    assert a.dtype == np.float32 and a.shape == (2, 64)
+    assert np.array_equal(a[0], a[1]) and np.array_equal(a[0], b[0])
+
+
+def test_callable_embedder_checks_shape():
+    embedder = CallableEmbedder(lambda texts: [[1.0, 0.0] for _ in texts], 3)
+    with pytest.raises(ValueError):
+        embedder.embed(["x"])
+
+
+def test_exact_search_matches_brute_force():
+    rng = np.random.default_rng(7)
+    vectors = rng.standard_normal((300, 16)).astype(np.float32)
+    index = VectorIndex(16)
+    for i, v in enumerate(vectors):
+        index.add(f"k{i}", v)
+    for i in range(0, 300, 3):
+        index.remove(f"k{i}")  # exercises swap-remove
+
+    query = rng.standard_normal(16).astype(np.float32)
+    unit = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    scores = unit @ (query / np.linalg.norm(query))
+    expected = [f"k{i}" for i in np.argsort(-scores) if i % 3][:5]
+
+    assert len(index) == 200
+    assert index.matrix.flags.c_contiguous
+    assert [key for key, _ in index.search(query, 5)] == expected
+    odd = index.search(query, 5, allowed=lambda key: int(key[1:]) % 2 == 1)
+    assert all(int(key[1:]) % 2 for key, _ in odd) and len(odd) == 5
+
+
+def test_ivf_recall_close_to_exact():
+    rng = np.random.default_rng(3)
+    centers = rng.standard_normal((40, 32))
+    vectors = centers[rng.integers(0, 40, 4000)] + 0.3 * rng.standard_normal(
+        (4000, 32)
+    )
+    exact = VectorIndex(32)
+    ivf = VectorIndex(32, VectorIndexConfig(ann="ivf", ann_threshold=1000, nprobe=4))
+    for i, v in enumerate(vectors):
+        exact.add(str(i), v)
+        ivf.add(str(i), v)
+
+    hits = 0
+    for v in vectors[:100]:
+        truth = {key for key, _ in exact.search(v, 10)}
+        hits += len(truth & {key for key, _ in ivf.search(v, 10)})
+    assert hits / 1000 >= 0.9
+
+
+def test_embedding_index_scopes_and_filters():
+    index = EmbeddingIndex(HashingEmbedder(256))
+    index.add("a", {"memory_type": "EpisodicMemory", "content": "paris trip",
+                    "scope": "user", "tags": ["travel"]})
+    index.add("b", {"memory_type": "EpisodicMemory", "content": "paris trip",
+                    "scope": "session", "tags": []})
+    index.add("c", {"memory_type": "EntityMemory", "entity_id": "x"})
+
+    assert len(index) == 2
+    assert {r.key for r in index.search("paris")} == {"a", "b"}
+    assert [r.key for r in index.search("paris", scope="user")] == ["a"]
+    assert [r.key for r in index.search("paris", tags=["travel"])] == ["a"]
+
+    index.add("a", "no longer a model")
+    assert [r.key for r in index.search("paris")] == ["b"]
+
+
+def test_client_search_with_filters():
+    client = _client()
+    client.write_model(
+        SemanticMemory(agent_id="agent", subject="user", predicate="prefers",
+                       object="dark mode", scope=MemoryScope.USER, tags=["ui"])
+    )
+    client.write_model(
+        EpisodicMemory(agent_id="agent", content="User booked a flight to Paris")
+    )
+    client.write_model(
+        EpisodicMemory(agent_id="agent", content="User asked about dark roast coffee")
+    )
+
+    results = client.search("which mode does the user prefer", k=2)
+    assert results[0].value["object"] == "dark mode"
+    assert results[0].score > results[1].score
+
+    flights = client.search("flight to paris", k=1,
+                            filters={"memory_type": EpisodicMemory})
+    assert flights[0].value["content"] == "User booked a flight to Paris"
+    assert client.recall(flights[0].key) == flights[0].value
+
+    assert client.search("dark", filters={"tags": ["missing"]}) == []
+    with pytest.raises(ValueError):
+        client.search("dark", filters={"colour": "red"})
+
+
+def test_rebuild_search_index_from_store(tmp_path):
+    config = SQLiteConfig(path=str(tmp_path / "s.db"))
+    writer = _client(backend="sqlite", sqlite_config=config)
+    for topic in ("gardening", "chess openings", "sourdough baking"):
+        writer.write_model(EpisodicMemory(agent_id="agent", content=topic))
+
+    reader = _client(backend="sqlite", sqlite_config=config)
+    assert reader.search("chess") == []
+    assert reader.rebuild_search_index(batch_size=2) == 3
+    assert reader.search("chess", k=1)[0].value["content"] == "chess openings"
+
+
+def test_search_fetches_results_in_one_batch(tmp_path):
+    config = SQLiteConfig(path=str(tmp_path / "s.db"))
+    writer = _client(backend="sqlite", sqlite_config=config)
+    for topic in ("gardening", "chess openings", "sourdough baking"):
+        writer.write_model(EpisodicMemory(agent_id="agent", content=topic))
+
+    reader = _client(backend="sqlite", sqlite_config=config)
+    reader.rebuild_search_index()
+    batches = []
+    read_many = reader._router.read_many
+    reader._router.read = None
+
+    def counting(session_id, keys):
+        batches.append(len(keys))
+        return read_many(session_id, keys)
+
+    reader._router.read_many = counting
+    assert len(reader.search("chess", k=3)) == 3
+    assert batches == [3]
+
+
+def test_search_requires_embedder():
+    client = MemoryClient(agent_id="a", session_id="s", region_restricted=False,
+                          backend="memory")
+    with pytest.raises(ValueError):
+        client.search("anything")
@@ -0,0 +1,148 @@
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from agent_memory_hub import MemoryClient
+from agent_memory_hub.config.memory_config import MemoryStoreConfig
+from agent_memory_hub.data_plane.adk_session_store import StoredEntry
+from agent_memory_hub.data_plane.memory_session_store import InMemorySessionStore
+from agent_memory_hub.data_plane.store_factory import StoreFactory
+
+
+def test_round_trip_returns_copies():
+    store = InMemorySessionStore()
+    value = {"facts": [1, 2]}
+    store.write("s1", "k", value)
+    value["facts"].append(3)
+
+    read = store.read("s1", "k")
+    assert read == {"facts": [1, 2]}
+    read["facts"].clear()
+    assert store.read("s1", "k") == {"facts": [1, 2]}
+    assert store.read("s1", "missing") is None
+    assert store.read("s2", "k") is None
+
+
+def test_ttl_expiry_and_cleanup():
+    store = InMemorySessionStore(ttl_seconds=10)
+    with patch("time.time", return_value=1000.0):
+        store.write("s1", "a", 1)
+        store.write("s2", "b", 2)
+    with patch("time.time", return_value=1005.0):
+        assert store.read("s1", "a") == 1
+    with patch("time.time", return_value=1011.0):
+        assert store.cleanup_expired(session_id="s1") == 1
+        assert store.read("s2", "b") is None  # lazily dropped
+        assert len(store) == 0
+
+
+class _NoScan(dict):
+    """Shard entries that fail the test if scanned."""
+
+    def __iter__(self):
+        raise AssertionError("scanned every entry of a shard")
+
+    def items(self):
+        raise AssertionError("scanned every entry of a shard")
+
+
+def test_session_reads_visit_only_the_session():
+    store = InMemorySessionStore(MemoryStoreConfig(shards=4), ttl_seconds=10)
+    with patch("time.time", return_value=1000.0):
+        for i in range(50):
+            store.write_many(f"s{i}", {"a/x": i, "a/y": i, "b/z": i})
+        store.write_entries("s1", {"a/kept": StoredEntry(1, expires_at=None)})
+    for shard in store._shards:
+        shard.entries = _NoScan(shard.entries)
+
+    with patch("time.time", return_value=1005.0):
+        assert store.read_session("s1") == {"a/x": 1, "a/y": 1, "b/z": 1, "a/kept": 1}
+        assert store.read_session("s2", "a/") == {"a/x": 2, "a/y": 2}
+        assert store.delete("s1", "a/y")
+    with patch("time.time", return_value=1011.0):
+        assert store.read_session("s1") == {"a/kept": 1}
+        assert store.read_session("s2") == {}
+    # Expired and deleted keys leave the session's key set
+    assert store._keys["s1"] == {"a/kept"} and "s2" not in store._keys
+    assert store.read_session("missing") == {}
+
+
+def test_session_operations_visit_only_the_session():
+    store = InMemorySessionStore(MemoryStoreConfig(shards=4), ttl_seconds=10)
+    with patch("time.time", return_value=1000.0):
+        for i in range(50):
+            store.write_many(f"s{i}", {"a/x": i, "a/y": i, "b/z": i})
+        store.write_entries("s3", {"a/kept": StoredEntry(1, expires_at=None)})
+    for shard in store._shards:
+        shard.entries = _NoScan(shard.entries)
+
+    with patch("time.time", return_value=1005.0):
+        assert list(store.iter_keys("s1")) == ["a/x", "a/y", "b/z"]
+        assert list(store.iter_keys("s1", "a/")) == ["a/x", "a/y"]
+        assert store.delete_prefix("s1", "a/") == 2
+        assert store.delete_session("s2") == 3
+        assert store.read_session("s2") == {}
+        assert list(store.iter_sessions())[:3] == ["s0", "s1", "s10"]
+    with patch("time.time", return_value=1011.0):
+        assert store.cleanup_expired(session_id="s3") == 3
+        assert list(store.iter_keys("s3")) == ["a/kept"]
+        assert list(store.iter_keys("s4")) == []
+        assert store.delete_session("s5") == 0
+    assert "s2" not in list(store.iter_sessions())
+
+
+def test_write_many_is_all_or_nothing():
+    store = InMemorySessionStore(MemoryStoreConfig(shards=4))
+    store.write_many("s1", {"a": 1, "b": 2})
+    assert store.read("s1", "b") == 2
+
+    with pytest.raises(TypeError):
+        store.write_many("s1", {"c": 3, "d": object()})
+    assert store.read("s1", "c") is None
+
+
+def test_concurrent_writers():
+    store = InMemorySessionStore(MemoryStoreConfig(shards=8))
+
+    def writer(n):
+        for i in range(200):
+            store.write(f"s{n}", f"k{i}", i)
+
+    threads = [threading.Thread(target=writer, args=(n,)) for n in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(store) == 1600
+    assert store.read("s7", "k199") == 199
+
+
+def test_snapshot_survives_restart(tmp_path):
+    path = str(tmp_path / "memory.json")
+    config = MemoryStoreConfig(snapshot_path=path)
+    store = InMemorySessionStore(config, ttl_seconds=60)
+    store.write("s1", "k", {"v": 1})
+    with patch("time.time", return_value=0.0):
+        store.write("s1", "old", "expired long ago")
+    store.close()
+
+    restored = InMemorySessionStore(config)
+    assert restored.read("s1", "k") == {"v": 1}
+    assert restored.read("s1", "old") is None
+    assert len(restored) == 1
+
+
+def test_factory_and_client():
+    store = StoreFactory.get_store(backend="memory", ttl_seconds=5)
+    assert isinstance(store, InMemorySessionStore)
+    assert store.ttl_seconds == 5
+
+    client = MemoryClient("agent", "sess", backend="memory")
+    client.write("hello", "greeting")
+    assert client.recall("greeting") == "hello"
+
+
+def test_invalid_shards():
+    with pytest.raises(ValueError):
+        MemoryStoreConfig(shards=0)
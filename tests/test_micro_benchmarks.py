@@ -0,0 +1,43 @@
+"""Tests for the client-side microbenchmark suite and its regression gate."""
+from benchmarks.micro import (
+    CASES,
+    MicroResult,
+    find_regressions,
+    load_baseline,
+    measure_peak_bytes,
+    run,
+)
+
+
+def test_stored_baseline_covers_every_case():
+    assert set(load_baseline()) == set(CASES)
+
+
+def test_run_selected_cases():
+    results = run(["ttl.is_expired", "json.decode/1KB"], min_time=0.001, repeat=1)
+
+    assert [r.name for r in results] == ["ttl.is_expired", "json.decode/1KB"]
+    assert all(r.ns_per_op > 0 and r.relative > 0 for r in results)
+
+
+def test_peak_bytes_scales_with_payload():
+    small = measure_peak_bytes(lambda: bytearray(1024))
+    large = measure_peak_bytes(lambda: bytearray(1024 * 1024))
+
+    assert large > 1024 * 1024 > small
+
+
+def test_find_regressions_flags_time_and_allocations():
+    baseline = {"case": {"relative": 1.0, "peak_bytes": 10_000}}
+    ok = MicroResult("case", ns_per_op=100, relative=1.2, peak_bytes=10_500)
+    slow = MicroResult("case", ns_per_op=100, relative=2.0, peak_bytes=10_000)
+    fat = MicroResult("case", ns_per_op=100, relative=1.0, peak_bytes=20_000)
+
+    assert find_regressions([ok], baseline) == []
+    assert "time" in find_regressions([slow], baseline)[0]
+    assert "peak" in find_regressions([fat], baseline)[0]
+
+
+def test_find_regressions_ignores_new_cases():
+    result = MicroResult("new", ns_per_op=1, relative=100.0, peak_bytes=1 << 20)
+    assert find_regressions([result], {}) == []
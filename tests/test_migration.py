@@ -0,0 +1,367 @@
+"""Tests for online backend migration: dual writes, shadow reads, backfill."""
+import time
+
+import pytest
+
+from agent_memory_hub import MemoryClient
+from agent_memory_hub.config.emulator_config import EmulatorConfig
+from agent_memory_hub.config.lmdb_config import LmdbConfig
+from agent_memory_hub.config.sqlite_config import SQLiteConfig
+from agent_memory_hub.data_plane.adk_session_store import StoredEntry
+from agent_memory_hub.data_plane.lmdb_session_store import LMDB_AVAILABLE
+from agent_memory_hub.data_plane.memory_session_store import InMemorySessionStore
+from agent_memory_hub.data_plane.migrating_session_store import (
+    CUTOVER,
+    DUAL_WRITE,
+    SHADOW_READ,
+    MigratingSessionStore,
+)
+from agent_memory_hub.data_plane.patch import MemoryPatch
+from agent_memory_hub.data_plane.store_factory import StoreFactory
+from agent_memory_hub.indexing.episode_log import LogQuery
+
+MIGRATIONS = [
+    ("adk", "redis"),
+    ("adk", "alloydb"),
+    ("firestore", "sqlite"),
+    ("memory", "lmdb"),
+    ("sqlite", "adk"),
+]
+
+
+def _store(source, target, tmp_path, **kwargs):
+    if "lmdb" in (source, target) and not LMDB_AVAILABLE:
+        pytest.skip("lmdb not installed")
+    return StoreFactory.get_store(
+        backend=target,
+        migrate_from=source,
+        emulator_config=EmulatorConfig(namespace="migration"),
+        sqlite_config=SQLiteConfig(path=str(tmp_path / "m.db")),
+        lmdb_config=LmdbConfig(path=str(tmp_path / "m.lmdb")),
+        **kwargs,
+    )
+
+
+@pytest.fixture(params=MIGRATIONS, ids=["->".join(m) for m in MIGRATIONS])
+def store(request, tmp_path):
+    store = _store(*request.param, tmp_path)
+    yield store
+    store.close()
+
+
+def _pair():
+    return MigratingSessionStore(InMemorySessionStore(), InMemorySessionStore())
+
+
+def test_dual_write_reaches_both_stores(store):
+    assert isinstance(store, MigratingSessionStore)
+    store.write("s1", "a/k", {"n": 1})
+    store.write_many("s1", {"a/x": 1, "a/y": 2})
+    if store.atomic_writes:
+        store.write_atomic("s2", {"a/z": 3})
+    else:
+        store.write_many("s2", {"a/z": 3})
+    store.append("s1", "a", ["hello", "world"])
+    for backend in (store.source, store.target):
+        assert backend.read_session("s1") == {"a/k": {"n": 1}, "a/x": 1, "a/y": 2}
+        assert backend.read("s2", "a/z") == 3
+        page = backend.read_log("s1", LogQuery(stream="a"))
+        assert [e.value for e in page.entries] == ["hello", "world"]
+
+    assert store.delete("s1", "a/x")
+    assert store.delete_prefix("s1", "a/k") == 1
+    assert store.delete_session("s2") == 1
+    for backend in (store.source, store.target):
+        assert backend.read_session("s1") == {"a/y": 2}
+        assert backend.read_session("s2") == {}
+
+
+def test_reads_follow_the_phase(store):
+    store.source.write("s1", "k", "old")
+    store.target.write("s1", "k", "new")
+    assert store.read("s1", "k") == "old"
+    assert store.read_session("s1") == {"k": "old"}
+
+    store.set_phase(SHADOW_READ)
+    assert store.read_many("s1", ["k"]) == ["old"]
+
+    store.set_phase(CUTOVER)
+    assert store.read("s1", "k") == "new"
+    assert list(store.iter_keys("s1")) == ["k"]
+    # After cutover the source keeps receiving writes, for a rollback
+    store.write("s1", "k", "newer")
+    assert store.source.read("s1", "k") == "newer"
+
+
+def test_shadow_reads_record_mismatches_and_latency(store):
+    store.write_many("s1", {"same": 1, "diff": 2})
+    store.target.write("s1", "diff", 3)
+    store.set_phase(SHADOW_READ)
+
+    assert store.read("s1", "same") == 1
+    assert store.read("s1", "diff") == 2
+    assert store.read_many("s1", ["same", "diff"]) == [1, 2]
+    assert store.read_session("s1") == {"same": 1, "diff": 2}
+    assert store.drain(timeout=10)
+
+    metrics = store.metrics.snapshot()
+    assert metrics["shadow_reads"] == 4
+    assert metrics["mismatches"] == 3
+    assert metrics["mismatch_rate"] == pytest.approx(0.75)
+    assert ("read", "s1", "diff") in metrics["recent_mismatches"]
+    assert ("read", "s1", "same") not in metrics["recent_mismatches"]
+    for name in ("source", "target"):
+        assert metrics[f"{name}_p50_ms"] <= metrics[f"{name}_p99_ms"]
+
+
+def test_shadow_reads_are_sampled_and_bounded():
+    store = MigratingSessionStore(
+        InMemorySessionStore(), InMemorySessionStore(),
+        phase=SHADOW_READ, shadow_sample_rate=0.0,
+    )
+    store.write("s1", "k", 1)
+    store.read("s1", "k")
+    store.drain()
+    assert store.metrics.snapshot()["shadow_reads"] == 0
+
+    store = MigratingSessionStore(
+        InMemorySessionStore(), InMemorySessionStore(),
+        phase=SHADOW_READ, max_pending_shadow=0,
+    )
+    assert store.read("s1", "k") is None
+    assert store.metrics.snapshot()["shadow_dropped"] == 1
+
+
+def test_shadow_read_errors_do_not_reach_the_caller():
+    class Broken(InMemorySessionStore):
+        def read(self, session_id, key):
+            raise ConnectionError("target down")
+
+    store = MigratingSessionStore(InMemorySessionStore(), Broken(), phase=SHADOW_READ)
+    store.write("s1", "k", 1)
+    assert store.read("s1", "k") == 1
+    store.drain()
+    assert store.metrics.snapshot()["shadow_errors"] == 1
+
+
+def test_secondary_failures_are_counted_not_raised():
+    class Broken(InMemorySessionStore):
+        def write(self, session_id, key, value):
+            raise ConnectionError("down")
+
+    store = MigratingSessionStore(InMemorySessionStore(), Broken())
+    store.write("s1", "k", 1)
+    assert store.read("s1", "k") == 1
+    metrics = store.metrics.snapshot()
+    assert metrics["secondary_errors"] == 1
+    assert metrics["recent_failures"][0][:2] == ("write", "s1")
+
+    # The primary's errors still fail the request
+    store.set_phase(CUTOVER)
+    with pytest.raises(ConnectionError):
+        store.write("s1", "k", 2)
+
+
+def test_versioned_writes_and_patches_are_mirrored():
+    store = _pair()
+    store.write("s1", "k", {"n": 1})
+    value, version = store.read_versioned("s1", "k")
+    store.write_versioned("s1", "k", {"n": 2}, version)
+    assert store.target.read("s1", "k") == {"n": 2}
+    assert store.patch("s1", "k", MemoryPatch(increment={"n": 3})) == {"n": 5}
+    assert store.target.read("s1", "k") == {"n": 5}
+
+
+def test_backfill_copies_existing_entries(store):
+    now = time.time()
+    store.source.write_many("s1", {f"k{i:02d}": i for i in range(12)})
+    store.source.write_entries("s2", {
+        "lease": StoredEntry("v", created_at=now - 10, expires_at=now + 3600),
+    })
+    # Written during the migration: newer than the source's copy
+    store.write("s1", "k00", "dual-written")
+
+    progress = store.backfill(batch_size=5).run()
+    assert progress.done and progress.error is None
+    assert (progress.sessions, progress.copied, progress.skipped) == (2, 12, 1)
+    assert store.target.read_session("s1") == store.source.read_session("s1")
+    [lease] = store.target.read_entries("s2", ["lease"])
+    assert lease.expires_at == pytest.approx(now + 3600, abs=1)
+
+    # Idempotent: a second run finds everything in place
+    again = store.backfill().run()
+    assert (again.copied, again.skipped) == (0, 13)
+
+
+def test_backfill_copies_episode_logs(store):
+    store.source.write("s1", "k", 1)
+    store.source.append("s1", "a", ["one", "two"])
+    store.source.append("logs-only", "a", ["three"])
+    # Appended during the migration: the target holds only this entry
+    store.append("s1", "a", ["four"])
+
+    progress = store.backfill().run()
+    assert progress.done and progress.sessions == 2
+    assert progress.log_entries == 4
+    store.set_phase(CUTOVER)
+    page = store.read_log("s1", LogQuery(stream="a"))
+    assert [e.value for e in page.entries] == ["one", "two", "four"]
+    page = store.read_log("logs-only", LogQuery(stream="a"))
+    assert [e.value for e in page.entries] == ["three"]
+
+    # Idempotent: matching streams are left alone
+    assert store.backfill().run().log_entries == 0
+
+
+def test_backfill_copies_long_logs_in_pages():
+    store = _pair()
+    store.source.append("s1", "a", list(range(2500)))
+    store.target.append("s1", "a", [*range(2499), "stale"])
+    appended = []
+    append = store.target.append
+
+    def recorded(session_id, stream, values, max_len=None):
+        appended.append(len(values))
+        return append(session_id, stream, values, max_len)
+
+    store.target.append = recorded
+    progress = store.backfill().run()
+    assert progress.done and progress.log_entries == 2500
+    assert appended == [1000, 1000, 500]
+    page = store.target.read_log("s1", LogQuery(stream="a", reverse=True, limit=1))
+    assert [e.value for e in page.entries] == [2499]
+
+
+def test_backfill_repairs_keys_changed_while_copying():
+    store = _pair()
+    store.source.write_many("s1", {"changed": 1, "deleted": 2, "kept": 3})
+    write_entries = store.target.write_entries
+
+    def racing(session_id, entries):
+        # Dual writes landing between the backfill's read and its write
+        write_entries(session_id, entries)
+        store.write("s1", "changed", 10)
+        store.delete("s1", "deleted")
+        write_entries(session_id, entries)
+
+    store.target.write_entries = racing
+    progress = store.backfill().run()
+    store.target.write_entries = write_entries
+    assert progress.repaired == 2
+    assert store.target.read_session("s1") == {"changed": 10, "kept": 3}
+    assert store.target.read_session("s1") == store.source.read_session("s1")
+
+
+class _Flaky(InMemorySessionStore):
+    """A store whose next ``fail`` writes and deletes raise."""
+
+    fail = 0
+
+    def _check(self):
+        if self.fail:
+            self.fail -= 1
+            raise ConnectionError("down")
+
+    def write(self, session_id, key, value):
+        self._check()
+        super().write(session_id, key, value)
+
+    def delete(self, session_id, key):
+        self._check()
+        return super().delete(session_id, key)
+
+    def delete_log(self, session_id, stream):
+        self._check()
+        super().delete_log(session_id, stream)
+
+
+def test_backfill_repairs_failed_mirrored_writes():
+    store = MigratingSessionStore(InMemorySessionStore(), _Flaky())
+    store.write("s1", "k", 1)
+    store.write("s1", "gone", 1)
+    store.append("s1", "a", ["old"])
+    store.target.fail = 3
+    store.write("s1", "k", 2)
+    store.delete("s1", "gone")
+    store.delete_log("s1", "a")
+    assert store.target.read_session("s1") == {"k": 1, "gone": 1}
+    assert store.take_unsynced() == ["s1"]
+    store._mark_unsynced(["s1"])
+
+    progress = store.backfill().run()
+    assert progress.done and (progress.copied, progress.repaired) == (1, 2)
+    assert store.take_unsynced() == []
+    store.set_phase(CUTOVER)
+    assert store.read("s1", "k") == 2
+    assert store.read_session("s1") == {"k": 2}
+    assert list(store.iter_streams("s1")) == []
+
+    # Failures writing the source after cutover are not the backfill's
+    store.source = _Flaky()
+    store.source.fail = 1
+    store.write("s1", "k", 3)
+    assert store.take_unsynced() == []
+
+
+def test_backfill_is_rate_limited_and_stoppable():
+    store = _pair()
+    store.source.write_many("s1", {f"k{i}": i for i in range(20)})
+    start = time.monotonic()
+    progress = store.backfill(rate_limit=100, batch_size=10).run()
+    assert progress.copied == 20
+    # The first batch starts at once, the second 0.1s later
+    assert time.monotonic() - start >= 0.09
+
+    store = _pair()
+    store.source.write_many("s1", {f"k{i}": i for i in range(20)})
+    job = store.backfill(rate_limit=1, batch_size=10).start()
+    time.sleep(0.05)
+    job.stop()
+    progress = job.join(timeout=5)
+    assert not progress.done and progress.copied == 10
+
+
+def test_backfill_reports_errors_of_background_runs():
+    class Broken(InMemorySessionStore):
+        def write_entries(self, session_id, entries):
+            raise ConnectionError("down")
+
+    store = MigratingSessionStore(InMemorySessionStore(), Broken())
+    store.source.write("s1", "k", 1)
+    progress = store.backfill().start().join(timeout=5)
+    assert isinstance(progress.error, ConnectionError) and not progress.done
+
+
+def test_client_migration():
+    client = MemoryClient(
+        agent_id="a",
+        session_id="s1",
+        region_restricted=False,
+        backend="redis",
+        migrate_from="adk",
+        emulator_config=EmulatorConfig(namespace="client"),
+    )
+    client.write("hello", key="note")
+    migration = client.migration
+    assert migration.phase == DUAL_WRITE
+    assert migration.target.read("s1", "a/note") == migration.source.read(
+        "s1", "a/note"
+    )
+    migration.set_phase(CUTOVER)
+    assert client.recall("note") == "hello"
+
+    plain = MemoryClient(agent_id="a", session_id="s1", backend="memory")
+    assert plain.migration is None
+
+
+def test_migration_validates_arguments():
+    with pytest.raises(ValueError):
+        _pair().set_phase("done")
+    with pytest.raises(ValueError):
+        MigratingSessionStore(
+            InMemorySessionStore(), InMemorySessionStore(), shadow_sample_rate=2
+        )
+    with pytest.raises(ValueError):
+        StoreFactory.get_store(backend="memory", migrate_from="memory")
+    with pytest.raises(ValueError):
+        _pair().backfill(rate_limit=0)
@@ -0,0 +1,135 @@
+"""Tests for server-side partial updates and counters across backends."""
+import threading
+
+import pytest
+
+from agent_memory_hub.data_plane.adk_session_store import SessionStore
+from agent_memory_hub.data_plane.content_addressed_store import (
+    ContentAddressedStore,
+)
+from agent_memory_hub.data_plane.memory_session_store import InMemorySessionStore
+from agent_memory_hub.data_plane.patch import MemoryPatch
+from agent_memory_hub.models import EntityMemory, ProceduralMemory
+
+
+def _procedure():
+    return ProceduralMemory(
+        id="deploy",
+        agent_id="agent",
+        skill_name="deploy",
+        steps=["build", "ship"],
+        tags=["ops"],
+    )
+
+
+def test_patch_sets_and_increments_fields(client):
+    procedure = _procedure()
+    client.write_model(procedure)
+    value = client.patch(
+        procedure, increment={"execution_count": 1}, set={"success_rate": 0.5}
+    )
+    assert value["execution_count"] == 1
+    assert value["success_rate"] == 0.5
+    assert value["steps"] == ["build", "ship"]
+    assert client.increment(procedure, "execution_count", by=2) == 3
+    assert client.recall("proceduralmemory/deploy") == {
+        **value,
+        "execution_count": 3,
+    }
+    # Still indexed as before
+    assert [m["id"] for m in client.query(tags=["ops"])] == ["deploy"]
+
+
+def test_patch_nested_attributes(client):
+    client.write_model(
+        EntityMemory(
+            id="user-1",
+            agent_id="agent",
+            entity_id="user-1",
+            entity_type="user",
+            attributes={"name": "Ada", "visits": 1},
+        )
+    )
+    value = client.patch(
+        "entitymemory/user-1",
+        set={"attributes.plan": "pro", "attributes.address.city": "London"},
+        increment={"attributes.visits": 1, "attributes.logins": 1},
+    )
+    assert value["attributes"] == {
+        "name": "Ada",
+        "visits": 2,
+        "logins": 1,
+        "plan": "pro",
+        "address": {"city": "London"},
+    }
+    assert client.recall("entitymemory/user-1")["attributes"] == value["attributes"]
+
+
+def test_patch_errors(client):
+    with pytest.raises(KeyError):
+        client.patch("missing", increment={"n": 1})
+    client.write({"n": "text", "items": [1]}, key="k")
+    with pytest.raises(TypeError):
+        client.patch("k", increment={"n": 1})
+    with pytest.raises(TypeError):
+        client.patch("k", set={"items.first": 1})
+    client.write([1, 2], key="list")
+    with pytest.raises(TypeError):
+        client.patch("list", set={"a": 1})
+    assert client.recall("k") == {"n": "text", "items": [1]}
+
+
+def test_concurrent_increments_lose_no_update(client):
+    client.write({"n": 0}, key="counter")
+
+    def increment():
+        for _ in range(5):
+            client.increment("counter", "n")
+
+    threads = [threading.Thread(target=increment) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert client.recall("counter") == {"n": 20}
+
+
+def test_patch_updates_loaded_session(client):
+    client.write({"n": 1}, key="counter")
+    client.load_session()
+    client.increment("counter", "n")
+    assert client.recall("counter") == {"n": 2}
+
+
+def test_memory_patch_validation():
+    with pytest.raises(ValueError):
+        MemoryPatch()
+    with pytest.raises(ValueError):
+        MemoryPatch(set={"a..b": 1})
+    with pytest.raises(ValueError):
+        MemoryPatch(set={"a": {}}, increment={"a.b": 1})
+    with pytest.raises(TypeError):
+        MemoryPatch(increment={"a": True})
+    original = {"a": {"b": 1}}
+    assert MemoryPatch(increment={"a.b": 0.5}).apply(original) == {"a": {"b": 1.5}}
+    assert original == {"a": {"b": 1}}
+
+
+def test_content_addressed_store_patches_resolved_values():
+    store = ContentAddressedStore(InMemorySessionStore(), threshold_bytes=16)
+    store.write("s1", "k", {"text": "x" * 64, "n": 1})
+    value = store.patch("s1", "k", MemoryPatch(increment={"n": 1}))
+    assert value == {"text": "x" * 64, "n": 2}
+    assert store.read("s1", "k") == value
+
+
+def test_session_store_patch_needs_versioned_writes():
+    class Minimal(SessionStore):
+        def write(self, session_id, key, value):
+            pass
+
+        def read(self, session_id, key):
+            return None
+
+    with pytest.raises(NotImplementedError):
+        Minimal().patch("s1", "k", MemoryPatch(set={"a": 1}))
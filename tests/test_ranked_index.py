@@ -0,0 +1,136 @@
+"""Tests for the top-k importance and recency indexes across backends."""
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+from agent_memory_hub.data_plane.adk_session_store import SessionStore
+from agent_memory_hub.indexing import RankIndex, RankQuery, index_record
+from agent_memory_hub.models import EpisodicMemory, MemoryScope, SemanticMemory
+
+EPOCH = datetime(2026, 1, 1)
+
+
+def _episode(content, importance, minutes, scope=MemoryScope.SESSION):
+    return EpisodicMemory(
+        agent_id="agent",
+        content=content,
+        importance=importance,
+        scope=scope,
+        timestamp=EPOCH + timedelta(minutes=minutes),
+    )
+
+
+def _record(key, importance):
+    return index_record(
+        key,
+        {
+            "memory_type": "EpisodicMemory",
+            "created_at": EPOCH.isoformat(),
+            "importance": importance,
+        },
+    )
+
+
+def _all_pages(client, **kwargs):
+    keys, cursor = [], None
+    while True:
+        page = client.rank(cursor=cursor, **kwargs)
+        keys.extend(page.keys)
+        cursor = page.next_cursor
+        if cursor is None:
+            return keys
+
+
+def test_rank_matches_brute_force(client):
+    rng = random.Random(5)  # noqa: S311
+    scopes = [MemoryScope.SESSION, MemoryScope.USER]
+    memories = []
+    for i in range(30):
+        # Ties on importance are broken by key
+        memory = _episode(
+            f"m{i}", rng.choice([0.1, 0.5, 0.9, 2.0]), rng.randrange(500),
+            rng.choice(scopes),
+        )
+        client.write_model(memory)
+        memories.append(memory)
+    fact = SemanticMemory(
+        agent_id="agent", subject="user", predicate="likes", object="tea",
+        importance=0.7,
+    )
+    client.write_model(fact)
+    client.write({"importance": 10}, key="plain")
+
+    def key_of(m):
+        return f"{type(m).__name__.lower()}/{m.id}"
+
+    everything = [*memories, fact]
+    by_importance = sorted(everything, key=lambda m: (-m.importance, key_of(m)))
+    assert _all_pages(client, limit=4) == [key_of(m) for m in by_importance]
+
+    user = [m for m in memories if m.scope == MemoryScope.USER]
+    want = sorted(user, key=lambda m: (-m.timestamp.timestamp(), key_of(m)))
+    assert _all_pages(client, by="recency", scope="user", limit=3) == [
+        key_of(m) for m in want
+    ]
+
+    page = client.rank(memory_type=SemanticMemory)
+    assert page.keys == [key_of(fact)]
+    assert page.items[0]["object"] == "tea"
+    top = client.rank(memory_type=EpisodicMemory, limit=3)
+    assert top.keys == [key_of(m) for m in by_importance if m is not fact][:3]
+
+
+def test_overwrite_moves_rank(client):
+    low = _episode("low", 0.1, 1)
+    high = _episode("high", 0.9, 2)
+    client.write_model(low)
+    client.write_model(high)
+    assert [m["content"] for m in client.rank()] == ["high", "low"]
+
+    low.importance = 5.0
+    client.write_model(low)
+    assert [m["content"] for m in client.rank()] == ["low", "high"]
+    assert [m["content"] for m in client.rank(by="recency")] == ["high", "low"]
+
+    client.write("replaced", key=f"episodicmemory/{low.id}")
+    assert [m["content"] for m in client.rank()] == ["high"]
+
+
+def test_rank_index_top_k():
+    index = RankIndex()
+    for i, importance in enumerate([0.3, 0.8, 0.8, 0.1]):
+        index.add(_record(f"k{i}", importance))
+    top, cursor = index.top(RankQuery(limit=2))
+    assert [r.key for r in top] == ["k1", "k2"]
+    rest, cursor = index.top(RankQuery(limit=2, cursor=cursor))
+    assert [r.key for r in rest] == ["k0", "k3"]
+    assert cursor is None
+
+    index.remove("k1")
+    top, _ = index.top(RankQuery(limit=1))
+    assert [r.key for r in top] == ["k2"]
+
+
+def test_rank_query_validation():
+    with pytest.raises(ValueError):
+        RankQuery(by="size")
+    with pytest.raises(ValueError):
+        RankQuery(limit=0)
+    # Booleans are not importance scores
+    assert _record("k", True).importance is None
+    # Without a timestamp or updated_at, recency falls back to created_at
+    record = _record("k", 0.25)
+    assert record.recency_ts == record.created_ts
+
+
+def test_session_store_rank_is_optional():
+    class Minimal(SessionStore):
+        def write(self, session_id, key, value):
+            pass
+
+        def read(self, session_id, key):
+            return None
+
+    with pytest.raises(NotImplementedError):
+        Minimal().rank("s1", RankQuery())
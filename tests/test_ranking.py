@@ -0,0 +1,121 @@
+"""Tests for recency/importance/confidence ranking of memories."""
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from agent_memory_hub import MemoryClient  # noqa: E402
+from agent_memory_hub.config.ranking_config import RankingConfig  # noqa: E402
+from agent_memory_hub.indexing import (  # noqa: E402
+    Candidates,
+    HashingEmbedder,
+    RankingEngine,
+)
+from agent_memory_hub.models import EpisodicMemory, SemanticMemory  # noqa: E402
+
+NOW = datetime(2026, 1, 31, 12, 0, 0)  # naive, like stored model timestamps
+NOW_TS = NOW.replace(tzinfo=timezone.utc).timestamp()
+DAY = 24 * 3600.0
+
+
+def _memory(key, age_days=0.0, **fields):
+    updated = (NOW - timedelta(days=age_days)).isoformat()
+    return key, {"memory_type": "EpisodicMemory", "updated_at": updated, **fields}
+
+
+def _candidates(*memories, relevance=None, access_counts=None):
+    keys = [key for key, _ in memories]
+    values = [value for _, value in memories]
+    return Candidates.from_values(keys, values, relevance, access_counts)
+
+
+def test_from_values_gathers_attributes():
+    candidates = _candidates(
+        _memory("a", 1.0, importance=0.9, confidence=0.5),
+        ("b", {"memory_type": "SemanticMemory", "truth_score": 0.5}),
+        access_counts={"b": 3},
+    )
+    assert candidates.importance.tolist() == pytest.approx([0.9, 0.5])
+    assert candidates.confidence.tolist() == pytest.approx([0.5, 0.5])
+    assert candidates.access_count.tolist() == [0.0, 3.0]
+    assert candidates.relevance.tolist() == [1.0, 1.0]
+    assert candidates.updated_ts[1] == -np.inf
+
+
+def test_recency_decays_by_half_life():
+    engine = RankingEngine(RankingConfig(
+        relevance=0, recency=1, importance=0, confidence=0, frequency=0,
+        half_life_seconds=DAY,
+    ))
+    candidates = _candidates(_memory("new"), _memory("day", 1.0),
+                             _memory("week", 7.0), ("unknown", {}))
+    scores = engine.scores(candidates, now=NOW_TS)
+    assert scores.tolist() == pytest.approx([1.0, 0.5, 2 ** -7, 0.0], rel=1e-3)
+    # Ages far beyond the half-life bottom out instead of underflowing
+    old = _candidates(_memory("ancient", 10_000.0))
+    assert engine.scores(old, now=NOW_TS)[0] == pytest.approx(0.0, abs=1e-18)
+
+
+def test_weights_trade_relevance_against_importance():
+    memories = (_memory("relevant", importance=0.0),
+                _memory("important", importance=1.0))
+    candidates = _candidates(*memories, relevance=[10.0, 6.0])
+
+    by_relevance = RankingEngine(RankingConfig(importance=0.2))
+    assert [k for k, _ in by_relevance.rank(candidates, 2, now=NOW_TS)] == [
+        "relevant", "important",
+    ]
+    by_importance = RankingEngine(RankingConfig(importance=1.0))
+    ranked = by_importance.rank(candidates, 1, now=NOW_TS)
+    assert ranked[0][0] == "important"
+    # relevance 6/10 + importance 1.0 + recency 0.2 + confidence 0.1
+    assert ranked[0][1] == pytest.approx(0.6 + 1.0 + 0.2 + 0.1, rel=1e-4)
+
+
+def test_frequency_and_top_k_selection():
+    rng = np.random.default_rng(1)
+    n = 5000
+    memories = [_memory(f"k{i}", float(rng.uniform(0, 30)),
+                        importance=float(rng.random())) for i in range(n)]
+    counts = {f"k{i}": int(c) for i, c in enumerate(rng.poisson(3.0, n))}
+    candidates = _candidates(*memories, relevance=rng.random(n).tolist(),
+                             access_counts=counts)
+    engine = RankingEngine(RankingConfig(frequency=0.5))
+
+    scores = engine.scores(candidates, now=NOW_TS)
+    expected = [f"k{i}" for i in np.argsort(-scores, kind="stable")[:20]]
+    assert [k for k, _ in engine.rank(candidates, 20, now=NOW_TS)] == expected
+    assert engine.rank(candidates, 0) == []
+
+
+def test_config_validation_and_env(monkeypatch):
+    with pytest.raises(ValueError):
+        RankingConfig(recency=-1)
+    with pytest.raises(ValueError):
+        RankingConfig(half_life_seconds=0)
+    monkeypatch.setenv("RANKING_RECENCY_WEIGHT", "0.7")
+    monkeypatch.setenv("RANKING_CANDIDATES", "25")
+    config = RankingConfig.from_env()
+    assert config.recency == 0.7 and config.candidates == 25
+
+
+def test_client_search_reranks_with_agent_weights():
+    def client(**weights):
+        c = MemoryClient(
+            agent_id="agent", session_id="s1", region_restricted=False,
+            backend="memory", embedder=HashingEmbedder(dimension=256),
+            ranking_config=RankingConfig(**weights),
+        )
+        c.write_model(EpisodicMemory(agent_id="agent", importance=0.0,
+                                     content="user prefers window seats on flights"))
+        c.write_model(SemanticMemory(agent_id="agent", importance=1.0,
+                                     subject="user", predicate="prefers",
+                                     object="aisle seats"))
+        return c
+
+    relevance_first = client(importance=0.0).search("window seats on flights", k=2)
+    assert relevance_first[0].value["memory_type"] == "EpisodicMemory"
+    importance_first = client(importance=5.0).search("window seats on flights", k=2)
+    assert importance_first[0].value["memory_type"] == "SemanticMemory"
+    assert importance_first[0].score > importance_first[1].score
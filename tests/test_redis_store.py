@@ -1,8 +1,14 @@
 
 import json
+import time
 import unittest
 from unittest.mock import MagicMock, patch
 
+from agent_memory_hub.data_plane.adk_session_store import StoredEntry
+from agent_memory_hub.emulators.redis import FakeRedis, _RedisState
+from agent_memory_hub.indexing.query import MemoryQuery
+from agent_memory_hub.models import SemanticMemory
+
 # Import assuming agent_memory_hub is in path
 try:
     from agent_memory_hub.data_plane.redis_session_store import (
@@ -59,5 +65,46 @@ class TestRedisSessionStore(unittest.TestCase):
         result = self.store.read("sess-1", "missing")
         self.assertIsNone(result)
 
+class TestRedisEntryTtls(unittest.TestCase):
+    """Index keys of entries written with their own TTLs (write_entries)."""
+
+    def setUp(self):
+        self.now = 0.0
+        client = FakeRedis(state=_RedisState(clock=lambda: self.now))
+        self.store = RedisSessionStore(
+            RedisConfig(host="localhost"), ttl_seconds=60, client=client
+        )
+
+    def test_index_outlives_the_store_ttl(self):
+        now = time.time()
+        fact = SemanticMemory(
+            id="tea", agent_id="a", subject="user", predicate="likes", object="tea"
+        )
+        self.store.write_entries("s1", {
+            "a/note": StoredEntry("kept", created_at=now, expires_at=None),
+            "a/fact": StoredEntry(fact.to_dict(), created_at=now, expires_at=None),
+        })
+        self.store.write_entries("s2", {
+            "a/lease": StoredEntry("v", created_at=now, expires_at=now + 300),
+        })
+        # A later expiring entry leaves the session's index persistent
+        self.store.write_entries("s1", {
+            "a/lease": StoredEntry("v", created_at=now, expires_at=now + 30),
+        })
+
+        self.now += 120
+        self.assertEqual(list(self.store.iter_sessions()), ["s1", "s2"])
+        self.assertEqual(
+            self.store.read_session("s1"), {"a/note": "kept", "a/fact": fact.to_dict()}
+        )
+        page = self.store.query("s1", MemoryQuery(memory_type="SemanticMemory"))
+        self.assertEqual(page.keys, ["a/fact"])
+        self.assertEqual(list(self.store.iter_keys("s2")), ["a/lease"])
+
+        # Once every entry of a session expired, so does its index
+        self.now += 300
+        self.assertEqual(list(self.store.iter_sessions()), ["s1"])
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,142 @@
+"""Tests for whole-session loads and key prefetch across backends."""
+import pytest
+
+from agent_memory_hub import MemoryClient
+from agent_memory_hub.config.emulator_config import EmulatorConfig
+from agent_memory_hub.data_plane.adk_session_store import SessionStore
+from agent_memory_hub.data_plane.store_factory import StoreFactory
+from agent_memory_hub.emulators import reset_emulators
+from agent_memory_hub.emulators.redis import FakeRedis
+from agent_memory_hub.models import SemanticMemory
+
+
+@pytest.fixture
+def make_client(backend, make_client, monkeypatch):
+    """Clients of one test share a store, as processes share a backend."""
+    stores = []
+    get_store = StoreFactory.get_store
+
+    def shared_store(*args, **options):
+        if not stores:
+            stores.append(get_store(*args, **options))
+        return stores[0]
+
+    monkeypatch.setattr(StoreFactory, "get_store", staticmethod(shared_store))
+    base = make_client
+
+    def make(agent_id="agent", **extra):
+        return base(backend, agent_id=agent_id, **extra)
+
+    return make
+
+
+def _offline(monkeypatch, client):
+    """Make any further backend read fail."""
+
+    def boom(*args, **kwargs):
+        raise AssertionError("unexpected backend read")
+
+    for name in ("read", "read_many", "read_session"):
+        monkeypatch.setattr(client._router.store, name, boom)
+
+
+def test_load_session_serves_recalls_locally(make_client, monkeypatch):
+    client = make_client()
+    fact = SemanticMemory(
+        agent_id="agent", subject="user", predicate="likes", object="tea"
+    )
+    client.write_model(fact)
+    client.write({"step": 1}, key="plan")
+    client.write("hello", key="notes/greeting")
+    make_client("other").write("not mine", key="plan")
+
+    loaded = client.load_session()
+    key = f"semanticmemory/{fact.id}"
+    assert sorted(loaded) == sorted(["plan", "notes/greeting", key])
+    assert loaded["plan"] == {"step": 1}
+    assert loaded[key]["object"] == "tea"
+
+    _offline(monkeypatch, client)
+    assert client.recall("plan") == {"step": 1}
+    assert client.recall("missing") is None
+    assert client.recall_many(["notes/greeting", "missing"]) == ["hello", None]
+    # Returned values are copies of the loaded ones
+    client.recall("plan")["step"] = 99
+    assert client.recall("plan") == {"step": 1}
+
+    monkeypatch.setattr(client._router.store, "write", lambda *args: None)
+    client.write({"step": 2}, key="plan")
+    client.write("new", key="added")
+    assert client.recall("plan") == {"step": 2}
+    assert client.recall("added") == "new"
+
+
+def test_unload_session_reads_the_backend_again(make_client):
+    client = make_client()
+    client.write("v1", key="k")
+    client.load_session()
+    make_client().write("v2", key="k")
+    assert client.recall("k") == "v1"  # stale until unloaded
+    client.unload_session()
+    assert client.recall("k") == "v2"
+
+
+def test_prefetch_at_construction(make_client, monkeypatch):
+    writer = make_client()
+    writer.write("a", key="a")
+    writer.write("b", key="b")
+    writer.write("c", key="c")
+
+    client = make_client(prefetch=["a", "b", "missing"])
+    calls = []
+    read_many = client._router.store.read_many
+    monkeypatch.setattr(
+        client._router.store,
+        "read_many",
+        lambda session_id, keys: calls.append(keys) or read_many(session_id, keys),
+    )
+    assert client.recall("a") == "a"
+    assert client.recall("missing") is None
+    assert client.recall_many(["b", "c", "a"]) == ["b", "c", "a"]
+    assert calls == [["agent/c"]]  # only the key that was not prefetched
+
+
+def test_load_session_of_agent_without_keys(make_client):
+    make_client().write("kept", key="k")
+    client = make_client("nobody")
+    assert client.load_session() == {}
+    assert client.recall("k") is None
+
+
+def test_redis_sort_get_and_pattern_fallback():
+    reset_emulators()
+    client = MemoryClient(
+        agent_id="agent",
+        session_id="weird*id",
+        region_restricted=False,
+        backend="redis",
+        emulator_config=EmulatorConfig(namespace="load-pattern"),
+    )
+    client.write("x", key="k")
+    assert client.load_session() == {"k": "x"}
+
+    redis = FakeRedis()
+    redis.sadd("members", "a", "b")
+    redis.set("val:a", "1")
+    assert redis.sort("members", by="nosort", get=["#", "val:*"], groups=True) == [
+        ("a", "1"),
+        ("b", None),
+    ]
+    assert redis.sort("members", by="nosort", get=["val:*"]) == ["1", None]
+
+
+def test_session_store_read_session_is_optional():
+    class Minimal(SessionStore):
+        def write(self, session_id, key, value):
+            pass
+
+        def read(self, session_id, key):
+            return None
+
+    with pytest.raises(NotImplementedError):
+        Minimal().read_session("s1")
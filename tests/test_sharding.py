@@ -0,0 +1,288 @@
+"""Tests for consistent-hash sharding of sessions and online rebalancing."""
+import threading
+import time
+from collections import Counter
+
+import pytest
+
+from agent_memory_hub import MemoryClient
+from agent_memory_hub.config.emulator_config import EmulatorConfig
+from agent_memory_hub.data_plane.adk_session_store import StoredEntry
+from agent_memory_hub.data_plane.memory_session_store import InMemorySessionStore
+from agent_memory_hub.data_plane.sharded_session_store import (
+    HashRing,
+    ShardedSessionStore,
+    ShardRebalancer,
+)
+from agent_memory_hub.data_plane.store_factory import StoreFactory
+from agent_memory_hub.indexing.episode_log import LogQuery
+from agent_memory_hub.indexing.query import MemoryQuery
+from agent_memory_hub.models import SemanticMemory
+
+SESSIONS = [f"s{i:02d}" for i in range(40)]
+
+
+@pytest.fixture
+def store(backend, backend_kwargs):
+    return StoreFactory.get_store(
+        backend=backend,
+        shards={name: backend_kwargs(backend, name) for name in "ab"},
+    )
+
+
+def _fill(store):
+    for session_id in SESSIONS:
+        store.write_many(session_id, {"agent/note": session_id, "agent/n": 1})
+        store.append(session_id, "agent", [f"{session_id}-1", f"{session_id}-2"])
+    fact = SemanticMemory(
+        id="tea", agent_id="agent", subject="user", predicate="likes", object="tea"
+    )
+    store.write("s00", "agent/fact", fact.to_dict())
+
+
+def _check(store):
+    for session_id in SESSIONS:
+        assert store.read(session_id, "agent/note") == session_id
+        owner = store.shards[store.ring.owner(session_id)]
+        assert owner.read(session_id, "agent/note") == session_id
+        for shard in store.shards.values():
+            if shard is not owner:
+                assert shard.read_session(session_id) == {}
+        page = store.read_log(session_id, LogQuery("agent"))
+        assert [e.value for e in page.entries] == [
+            f"{session_id}-1", f"{session_id}-2"
+        ]
+    assert list(store.iter_sessions()) == SESSIONS
+    page = store.query("s00", MemoryQuery(memory_type="SemanticMemory"))
+    assert page.keys == ["agent/fact"]
+
+
+def test_ring_spreads_sessions_and_moves_few_on_change():
+    ring = HashRing(["a", "b", "c", "d"])
+    sessions = [f"session-{i}" for i in range(4000)]
+    owners = {s: ring.owner(s) for s in sessions}
+    counts = Counter(owners.values())
+    assert set(counts) == {"a", "b", "c", "d"}
+    assert max(counts.values()) < 1.4 * min(counts.values())
+    # Deterministic across instances (and processes: no salted hash)
+    shuffled = HashRing(["d", "c", "b", "a"])
+    assert all(shuffled.owner(s) == owners[s] for s in sessions)
+
+    bigger = ring.copy()
+    bigger.add("e")
+    moved = [s for s in sessions if bigger.owner(s) != owners[s]]
+    assert {bigger.owner(s) for s in moved} == {"e"}
+    assert 0.1 < len(moved) / len(sessions) < 0.3
+    assert ring.names == ["a", "b", "c", "d"]
+
+
+def test_sessions_live_on_their_shard(store):
+    _fill(store)
+    _check(store)
+    on_a = [s for s in SESSIONS if store.ring.owner(s) == "a"]
+    assert 0 < len(on_a) < len(SESSIONS)
+    assert list(store.shards["a"].iter_sessions()) == on_a
+
+
+def test_batches_fan_out_to_shards(store):
+    store.write_many_sessions({s: {"k": i} for i, s in enumerate(SESSIONS)})
+    result = store.read_many_sessions({s: ["k", "missing"] for s in SESSIONS})
+    assert list(result) == SESSIONS
+    assert all(result[s] == [i, None] for i, s in enumerate(SESSIONS))
+    store.cleanup_expired()
+
+
+def test_add_shard_rebalances(store, backend, backend_kwargs):
+    now = time.time()
+    _fill(store)
+    store.write_entries("s01", {
+        "agent/lease": StoredEntry("v", created_at=now - 5, expires_at=now + 3600),
+    })
+    new = StoreFactory.get_store(backend=backend, **backend_kwargs(backend, "c"))
+    job = store.add_shard("c", new, start=False)
+    assert store.rebalancing
+    # Served from the old shards until moved
+    _check_reads(store)
+
+    progress = job.run()
+    assert progress.done and not store.rebalancing
+    moving = [s for s in SESSIONS if store.ring.owner(s) == "c"]
+    assert progress.sessions == progress.moved == len(moving) > 0
+    assert progress.log_entries == 2 * len(moving)
+    _check(store)
+    [lease] = store.read_entries("s01", ["agent/lease"])
+    assert lease.expires_at == pytest.approx(now + 3600, abs=1)
+
+
+def test_rebalance_moves_every_log_stream(store, backend, backend_kwargs):
+    _fill(store)
+    log_only = [f"log{i:02d}" for i in range(20)]
+    for session_id in SESSIONS:
+        store.append(session_id, "episodes", [f"{session_id}-episode"])
+    for session_id in log_only:
+        store.append(session_id, "agent", [session_id])
+
+    new = StoreFactory.get_store(backend=backend, **backend_kwargs(backend, "c"))
+    progress = store.add_shard("c", new, start=False).run()
+    assert progress.done
+    _check(store)
+    for session_id in SESSIONS:
+        page = store.read_log(session_id, LogQuery("episodes"))
+        assert [e.value for e in page.entries] == [f"{session_id}-episode"]
+    for session_id in log_only:
+        page = store.read_log(session_id, LogQuery("agent"))
+        assert [e.value for e in page.entries] == [session_id]
+    moved = [s for s in log_only if store.ring.owner(s) == "c"]
+    assert moved and list(new.iter_log_sessions()) == sorted(
+        moved + [s for s in SESSIONS if store.ring.owner(s) == "c"]
+    )
+
+
+def test_rebalance_retry_does_not_duplicate_log_entries():
+    store = ShardedSessionStore({"a": InMemorySessionStore()})
+    _fill(store)
+    for session_id in SESSIONS:
+        store.append(session_id, "later", [f"{session_id}-later"])
+
+    class Flaky(InMemorySessionStore):
+        fail = True
+
+        def append(self, session_id, stream, values, max_len=None):
+            # The second stream of the first move fails, after the first
+            if self.fail and stream == "later":
+                self.fail = False
+                raise ConnectionError("shard went away")
+            return super().append(session_id, stream, values, max_len)
+
+    job = store.add_shard("b", Flaky(), start=False)
+    with pytest.raises(ConnectionError):
+        job.run()
+    assert job.run().done
+    _check(store)
+    for session_id in SESSIONS:
+        page = store.read_log(session_id, LogQuery("later"))
+        assert [e.value for e in page.entries] == [f"{session_id}-later"]
+
+
+def _check_reads(store):
+    for session_id in SESSIONS:
+        assert store.read(session_id, "agent/note") == session_id
+
+
+def test_remove_shard_moves_its_sessions(store):
+    _fill(store)
+    removed = store.shards["b"]
+    store.remove_shard("b").join(timeout=30)
+    assert list(store.shards) == ["a"]
+    assert list(removed.iter_sessions()) == []
+    _check(store)
+
+
+def test_rebalance_serves_writes_while_moving():
+    store = ShardedSessionStore({"a": InMemorySessionStore()})
+    for session_id in SESSIONS:
+        store.write(session_id, "n", 0)
+    done = threading.Event()
+    written = {}
+    errors = []
+
+    def writer():
+        i = 0
+        try:
+            while not done.is_set():
+                i += 1
+                for session_id in SESSIONS:
+                    store.write(session_id, "n", i)
+                    written[session_id] = i
+                    assert store.read(session_id, "n") == i
+        except Exception as exc:  # reported below
+            errors.append(exc)
+
+    thread = threading.Thread(target=writer)
+    thread.start()
+    try:
+        for name in "bcd":
+            store.add_shard(name, InMemorySessionStore()).join(timeout=30)
+    finally:
+        done.set()
+        thread.join()
+    assert not errors
+    assert {s: store.read(s, "n") for s in SESSIONS} == written
+    assert {store.ring.owner(s) for s in SESSIONS} == set("abcd")
+
+
+def test_stopped_rebalance_resumes():
+    store = ShardedSessionStore({"a": InMemorySessionStore()})
+    _fill(store)
+    job = store.add_shard("b", InMemorySessionStore(), rate_limit=1)
+    time.sleep(0.05)
+    job.stop()
+    progress = job.join(timeout=5)
+    assert not progress.done and store.rebalancing
+    _check_reads(store)
+    with pytest.raises(RuntimeError):
+        store.add_shard("c", InMemorySessionStore())
+
+    job = ShardRebalancer(store)
+    assert job.run().done and not store.rebalancing
+    _check(store)
+
+
+def test_region_guard_holds_for_every_shard():
+    with pytest.raises(RuntimeError, match="Region violation"):
+        StoreFactory.get_store(
+            backend="memory",
+            region="us-central1",
+            shards={"a": {}, "b": {"region": "europe-west1"}},
+        )
+    store = ShardedSessionStore(
+        {"a": InMemorySessionStore()}, region="us-central1",
+        regions={"a": "us-central1"},
+    )
+    with pytest.raises(RuntimeError):
+        store.add_shard("b", InMemorySessionStore(), region="asia-south1")
+    assert list(store.shards) == ["a"]
+
+    # A store's own region attribute counts as well
+    eu = InMemorySessionStore()
+    eu.region = "europe-west1"
+    with pytest.raises(RuntimeError):
+        ShardedSessionStore({"a": eu}, region="us-central1")
+
+
+def test_client_sharding():
+    client = MemoryClient(
+        agent_id="agent",
+        session_id="s1",
+        region_restricted=False,
+        backend="redis",
+        shards={
+            name: {"emulator_config": EmulatorConfig(namespace=name)}
+            for name in ("r1", "r2")
+        },
+    )
+    client.write("hello", key="note")
+    assert client.recall("note") == "hello"
+    sharding = client.sharding
+    assert sorted(sharding.shards) == ["r1", "r2"]
+    owner = sharding.shards[sharding.shard_for("s1")]
+    assert owner.read("s1", "agent/note") == "hello"
+
+    plain = MemoryClient(agent_id="a", session_id="s1", backend="memory")
+    assert plain.sharding is None
+
+
+def test_sharding_validates_arguments():
+    with pytest.raises(ValueError):
+        ShardedSessionStore({})
+    store = ShardedSessionStore({"a": InMemorySessionStore()})
+    with pytest.raises(ValueError):
+        store.add_shard("a", InMemorySessionStore())
+    with pytest.raises(ValueError):
+        store.remove_shard("a")
+    with pytest.raises(ValueError):
+        store.remove_shard("z")
+    with pytest.raises(ValueError):
+        HashRing(vnodes=0)
+    with pytest.raises(ValueError):
+        HashRing().owner("s1")
@@ -0,0 +1,96 @@
+import sqlite3
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from agent_memory_hub import MemoryClient
+from agent_memory_hub.config.sqlite_config import SQLiteConfig
+from agent_memory_hub.data_plane.sqlite_session_store import SQLiteSessionStore
+from agent_memory_hub.data_plane.store_factory import StoreFactory
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / "memory.db")
+
+
+def test_round_trip_and_wal_mode(db_path):
+    store = SQLiteSessionStore(SQLiteConfig(path=db_path))
+    store.write("s1", "k", {"a": [1, 2]})
+    store.write("s1", "k", {"a": [3]})
+
+    assert store.read("s1", "k") == {"a": [3]}
+    assert store.read("s1", "missing") is None
+
+    conn = sqlite3.connect(db_path)
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    rows = conn.execute("SELECT session_id, key FROM memory_entries").fetchall()
+    assert rows == [("s1", "k")]
+    indexes = {r[1] for r in conn.execute("PRAGMA index_list(memory_entries)")}
+    assert "idx_memory_entries_expires_at" in indexes
+
+
+def test_ttl_expiry_and_cleanup(db_path):
+    store = SQLiteSessionStore(SQLiteConfig(path=db_path), ttl_seconds=10)
+    with patch("time.time", return_value=1000.0):
+        store.write("s1", "a", 1)
+        store.write("s2", "b", 2)
+    with patch("time.time", return_value=1011.0):
+        assert store.read("s1", "a") is None
+        assert store.cleanup_expired(session_id="s1") == 1
+        assert store.cleanup_expired() == 1
+
+
+def test_write_many_single_transaction(db_path):
+    store = SQLiteSessionStore(SQLiteConfig(path=db_path))
+    store.write_many("s1", {f"k{i}": i for i in range(100)})
+    assert store.read("s1", "k99") == 99
+
+    with pytest.raises(TypeError):
+        store.write_many("s1", {"x": 1, "y": object()})
+    assert store.read("s1", "x") is None
+
+
+def test_concurrent_threads_share_file(db_path):
+    store = SQLiteSessionStore(SQLiteConfig(path=db_path))
+    errors = []
+
+    def worker(n):
+        try:
+            for i in range(50):
+                store.write(f"s{n}", f"k{i}", i)
+                assert store.read(f"s{n}", f"k{i}") == i
+        except Exception as e:  # pragma: no cover - reported below
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert errors == []
+    assert store.read("s3", "k49") == 49
+
+
+def test_in_memory_database_shared_across_threads():
+    store = SQLiteSessionStore(SQLiteConfig(path=":memory:"))
+    thread = threading.Thread(target=store.write, args=("s1", "k", "v"))
+    thread.start()
+    thread.join()
+    assert store.read("s1", "k") == "v"
+
+
+def test_factory_and_client(db_path):
+    config = SQLiteConfig(path=db_path)
+    store = StoreFactory.get_store(backend="sqlite", sqlite_config=config)
+    assert isinstance(store, SQLiteSessionStore)
+
+    client = MemoryClient("agent", "sess", backend="sqlite", sqlite_config=config)
+    client.write("hello", "greeting")
+    assert client.recall("greeting") == "hello"
+
+
+def test_invalid_synchronous_mode():
+    with pytest.raises(ValueError):
+        SQLiteConfig(synchronous="sometimes")
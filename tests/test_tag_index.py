@@ -0,0 +1,152 @@
+"""Tests for the tag bitmap index and multi-tag filtering across backends."""
+import itertools
+import random
+from array import array
+
+import pytest
+
+from agent_memory_hub import MemoryClient
+from agent_memory_hub.indexing import Bitmap, MemoryQuery, TagIndex
+from agent_memory_hub.indexing.bitmap import ARRAY_MAX
+from agent_memory_hub.models import EpisodicMemory
+
+
+def _episode(content, tags):
+    return EpisodicMemory(agent_id="agent", content=content, tags=list(tags))
+
+
+def test_bitmap_matches_set_semantics():
+    rng = random.Random(3)  # noqa: S311
+    # Sparse, dense (mask) and multi-container sets
+    sets = [
+        set(rng.sample(range(200_000), 50)),
+        set(rng.sample(range(65_536), 6000)),
+        set(range(60_000, 140_000, 3)),
+        set(),
+    ]
+    bitmaps = [Bitmap(values) for values in sets]
+    pairs = list(zip(sets, bitmaps, strict=True))
+    for (a, ba), (b, bb) in itertools.product(pairs, repeat=2):
+        assert list(ba & bb) == sorted(a & b)
+        assert list(ba | bb) == sorted(a | b)
+        assert list(ba - bb) == sorted(a - b)
+    for values, bitmap in zip(sets, bitmaps, strict=True):
+        assert len(bitmap) == len(values)
+        assert Bitmap.from_bytes(bitmap.to_bytes()) == bitmap
+        probe = rng.randrange(200_000)
+        assert (probe in bitmap) == (probe in values)
+
+
+def test_bitmap_switches_container_representation():
+    bitmap = Bitmap(range(ARRAY_MAX))
+    assert isinstance(bitmap._containers[0], array)
+    bitmap.add(ARRAY_MAX)
+    assert isinstance(bitmap._containers[0], int)
+    bitmap.discard(0)
+    assert not isinstance(bitmap._containers[0], int)
+    assert list(bitmap) == list(range(1, ARRAY_MAX + 1))
+    for value in range(1, ARRAY_MAX + 1):
+        bitmap.discard(value)
+    assert not bitmap
+    with pytest.raises(ValueError):
+        Bitmap.from_bytes(b"\x01\x00")
+
+
+def test_tag_index_updates_incrementally():
+    index = TagIndex()
+    index.update("a", ["red", "round"])
+    index.update("b", ["red"])
+    index.update("c", ["blue", "round"])
+
+    def keys(**terms):
+        return sorted(index.keys(index.match(**terms)))
+
+    assert keys(all_of=["red"]) == ["a", "b"]
+    assert keys(all_of=["red", "round"]) == ["a"]
+    assert keys(any_of=["blue", "red"]) == ["a", "b", "c"]
+    assert keys(all_of=["round"], any_of=["blue", "green"]) == ["c"]
+    assert keys(all_of=["green"]) == []
+
+    index.update("a", ["blue"])
+    assert keys(all_of=["red"]) == ["b"]
+    assert keys(all_of=["blue"]) == ["a", "c"]
+    index.remove("b")
+    assert keys(any_of=["red"]) == []
+    index.update("d", ["red"])  # reuses the ordinal of "b"
+    assert keys(all_of=["red"]) == ["d"]
+    assert len(index) == 3
+
+
+def test_tag_filters_match_brute_force(client):
+    rng = random.Random(11)  # noqa: S311
+    palette = ["red", "green", "blue", "urgent"]
+    expected = {}
+    for i in range(40):
+        tags = rng.sample(palette, rng.randint(0, 3))
+        memory = _episode(f"m{i}", tags)
+        client.write_model(memory)
+        expected[f"episodicmemory/{memory.id}"] = set(tags)
+    client.write("plain", key="plain")
+
+    for all_of, any_of in [
+        (["red"], []),
+        (["red", "urgent"], []),
+        ([], ["green", "blue"]),
+        (["urgent"], ["red", "blue"]),
+        (["missing"], []),
+        ([], ["missing"]),
+    ]:
+        want = sorted(
+            key
+            for key, tags in expected.items()
+            if set(all_of) <= tags and (not any_of or tags & set(any_of))
+        )
+        got, cursor = [], None
+        while True:
+            page = client.query(tags=all_of, any_tags=any_of, limit=7, cursor=cursor)
+            got.extend(page.keys)
+            cursor = page.next_cursor
+            if cursor is None:
+                break
+        assert sorted(got) == want
+
+
+def test_retagging_moves_memory_between_tags(client):
+    memory = _episode("note", ["draft"])
+    client.write_model(memory)
+    memory.tags = ["final", "shared"]
+    client.write_model(memory)
+
+    assert len(client.query(tags=["draft"])) == 0
+    assert len(client.query(any_tags=["final"])) == 1
+    client.write("replaced", key=f"episodicmemory/{memory.id}")
+    assert len(client.query(any_tags=["final", "shared"])) == 0
+
+
+def test_memory_query_any_tags():
+    query = MemoryQuery(tags=["a"], any_tags=["b", "c"])
+    assert query.filters_tags
+    assert not MemoryQuery().filters_tags
+
+
+def test_search_prefilters_by_tag_bitmap():
+    pytest.importorskip("numpy")
+    client = MemoryClient(
+        agent_id="agent",
+        session_id="s1",
+        region_restricted=False,
+        backend="memory",
+        keyword_search=True,
+    )
+    client.write_model(_episode("deploy failed on staging", ["ops", "staging"]))
+    client.write_model(_episode("deploy failed on prod", ["ops", "prod"]))
+    client.write_model(_episode("deploy notes", ["docs"]))
+
+    hits = client.search("deploy", filters={"any_tags": ["prod", "docs"]})
+    assert sorted(h.value["content"] for h in hits) == [
+        "deploy failed on prod",
+        "deploy notes",
+    ]
+    hits = client.search("deploy", filters={"tags": ["ops"], "any_tags": ["staging"]})
+    assert [h.value["content"] for h in hits] == ["deploy failed on staging"]
+    assert client.search("deploy", filters={"tags": ["missing"]}) == []
@@ -0,0 +1,134 @@
+"""Tests for atomic multi-key transactions across backends."""
+import pytest
+
+from agent_memory_hub.data_plane.adk_session_store import SessionStore
+from agent_memory_hub.data_plane.content_addressed_store import (
+    ContentAddressedStore,
+)
+from agent_memory_hub.data_plane.memory_session_store import InMemorySessionStore
+from agent_memory_hub.models import EntityMemory, EpisodicMemory
+
+ATOMIC_BACKENDS = ["memory", "sqlite", "lmdb", "redis", "alloydb", "firestore"]
+
+
+@pytest.fixture(params=ATOMIC_BACKENDS)
+def backend(request):
+    return request.param
+
+
+def _profile(name="Ada"):
+    return EntityMemory(
+        id="user-1",
+        agent_id="agent",
+        entity_id="user-1",
+        entity_type="user",
+        attributes={"name": name},
+    )
+
+
+def test_transaction_commits_in_one_atomic_write(client, monkeypatch):
+    store = client._router.store
+    calls = []
+    write_atomic = store.write_atomic
+
+    def recording(session_id, items):
+        calls.append(sorted(items))
+        write_atomic(session_id, items)
+
+    monkeypatch.setattr(store, "write_atomic", recording)
+    episode = EpisodicMemory(agent_id="agent", content="renamed the user")
+    with client.transaction() as tx:
+        assert tx.atomic
+        tx.write_model(_profile())
+        tx.write_model(episode)
+        assert tx.recall("entitymemory/user-1")["attributes"]["name"] == "Ada"
+
+    assert calls == [
+        sorted(["agent/entitymemory/user-1", f"agent/episodicmemory/{episode.id}"])
+    ]
+    assert client.recall("entitymemory/user-1")["attributes"]["name"] == "Ada"
+    assert [m["content"] for m in client.query(memory_type=EpisodicMemory)] == [
+        "renamed the user"
+    ]
+
+
+def test_transaction_rolls_back_on_error(client):
+    client.write_model(_profile())
+    with pytest.raises(RuntimeError):
+        with client.transaction() as tx:
+            tx.write_model(_profile("Grace"))
+            tx.write("lost", key="notes")
+            raise RuntimeError("abort")
+    assert client.recall("entitymemory/user-1")["attributes"]["name"] == "Ada"
+    assert client.recall("notes") is None
+
+    with client.transaction() as tx:
+        tx.write(1, key="x")
+        tx.rollback()
+        tx.write(2, key="y")
+        assert tx.commit() == 1
+    assert client.recall_many(["x", "y"]) == [None, 2]
+
+
+def test_failed_commit_writes_nothing(client):
+    if client.backend == "firestore":
+        pytest.skip("the Firestore emulator stores values without encoding")
+    client.write("kept", key="a")
+    with pytest.raises(TypeError):
+        with client.transaction() as tx:
+            tx.write("changed", key="a")
+            tx.write(object(), key="b")  # not JSON-serializable
+    assert client.recall("a") == "kept"
+    assert client.recall("b") is None
+
+
+def test_gcs_requires_best_effort(make_client):
+    client = make_client("adk")
+    with pytest.raises(NotImplementedError):
+        client.transaction()
+    with pytest.raises(NotImplementedError):
+        client.write_many({"a": 1}, atomic=True)
+
+    with client.transaction(best_effort=True) as tx:
+        assert not tx.atomic
+        tx.write_model(_profile())
+        tx.write("note", key="notes")
+    assert client.recall("entitymemory/user-1")["attributes"]["name"] == "Ada"
+    assert client.recall("notes") == "note"
+
+
+def test_firestore_atomic_write_respects_batch_limit(make_client):
+    client = make_client("firestore")
+    episodes = {
+        f"episodicmemory/{i}": EpisodicMemory(
+            id=str(i), agent_id="agent", content=str(i)
+        ).to_dict()
+        for i in range(500)
+    }
+    with pytest.raises(ValueError):
+        client.write_many(episodes, atomic=True)
+    assert client.recall("episodicmemory/0") is None
+    # Non-atomic batches are split instead
+    client.write_many(episodes)
+    assert client.recall("episodicmemory/499")["content"] == "499"
+
+
+def test_content_addressed_store_follows_inner():
+    store = ContentAddressedStore(InMemorySessionStore(), threshold_bytes=16)
+    assert store.atomic_writes
+    big = {"text": "x" * 64}
+    store.write_atomic("s1", {"a": big, "b": "small"})
+    assert store.read_many("s1", ["a", "b"]) == [big, "small"]
+
+
+def test_session_store_write_atomic_is_optional():
+    class Minimal(SessionStore):
+        def write(self, session_id, key, value):
+            pass
+
+        def read(self, session_id, key):
+            return None
+
+    assert not Minimal.atomic_writes
+    with pytest.raises(NotImplementedError):
+        Minimal().write_atomic("s1", {"a": 1})
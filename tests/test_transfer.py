@@ -0,0 +1,289 @@
+"""Tests for streaming export and import of store entries across backends."""
+import gzip
+import json
+import time
+
+import pytest
+
+from agent_memory_hub.control_plane.transfer import (
+    FORMAT,
+    MSGPACK_AVAILABLE,
+    MemoryTransfer,
+)
+from agent_memory_hub.data_plane.adk_session_store import SessionStore, StoredEntry
+from agent_memory_hub.data_plane.content_addressed_store import (
+    BLOB_SESSION,
+    ContentAddressedStore,
+)
+from agent_memory_hub.data_plane.memory_session_store import InMemorySessionStore
+from agent_memory_hub.indexing.query import MemoryQuery
+from agent_memory_hub.models import SemanticMemory
+
+
+def _fill(store):
+    now = time.time()
+    store.write_many("s1", {"a/note": "hello", "a/n": 1})
+    store.write_many("s2", {
+        f"a/k{i:03d}": {"i": i, "text": "ü" * i} for i in range(25)
+    })
+    store.write_entries("s3", {
+        "a/lease": StoredEntry("short", created_at=now - 60, expires_at=now + 3600),
+        "a/gone": StoredEntry("old", created_at=now - 60, expires_at=now - 1),
+    })
+    fact = SemanticMemory(
+        id="tea", agent_id="a", subject="user", predicate="likes", object="tea"
+    )
+    store.write("s3", "a/fact", fact.to_dict())
+
+
+def _contents(store):
+    return {
+        session_id: store.read_session(session_id)
+        for session_id in store.iter_sessions()
+    }
+
+
+@pytest.fixture
+def source(backend, make_client):
+    store = make_client(backend, name="src")._router
+    _fill(store)
+    return store
+
+
+@pytest.mark.parametrize("encoding,compression", [
+    ("ndjson", None), ("ndjson", "gzip"), ("msgpack", None), ("msgpack", "gzip"),
+])
+def test_round_trip_between_backends(source, tmp_path, encoding, compression):
+    if encoding == "msgpack" and not MSGPACK_AVAILABLE:
+        pytest.skip("msgpack not installed")
+    path = str(tmp_path / "export.bin")
+    report = MemoryTransfer(source, batch_size=10, workers=3).export_to(
+        path, encoding=encoding, compression=compression
+    )
+    assert (report.sessions, report.records) == (3, 29)
+
+    # Into a store with a TTL of its own: imported entries keep theirs
+    target = ContentAddressedStore(InMemorySessionStore(ttl_seconds=5))
+    loaded = MemoryTransfer(target, batch_size=7).import_from(path)
+    assert (loaded.sessions, loaded.records, loaded.expired) == (3, 29, 0)
+    assert _contents(target) == _contents(source)
+    page = target.query("s3", MemoryQuery(memory_type="SemanticMemory"))
+    assert page.keys == ["a/fact"]
+
+    [lease] = target.read_entries("s3", ["a/lease"])
+    [original] = source.read_entries("s3", ["a/lease"])
+    assert lease.expires_at == pytest.approx(original.expires_at, abs=1)
+    assert target.read_entries("s1", ["a/note"])[0].expires_at is None
+
+
+def test_import_into_each_backend(backend, make_client, tmp_path):
+    source = InMemorySessionStore()
+    _fill(source)
+    path = str(tmp_path / "export.ndjson")
+    MemoryTransfer(source).export_to(path)
+
+    target = make_client(backend, name="dst", ttl_seconds=5)._router
+    report = MemoryTransfer(target, batch_size=4).import_from(path)
+    assert (report.records, report.expired) == (29, 0)
+    assert _contents(target) == _contents(source)
+    [lease] = target.read_entries("s3", ["a/lease"])
+    [note] = target.read_entries("s1", ["a/note"])
+    assert lease.expires_at == pytest.approx(time.time() + 3600, abs=5)
+    assert note.expires_at is None
+
+
+def test_export_format_is_versioned_ndjson(tmp_path):
+    store = InMemorySessionStore()
+    _fill(store)
+    path = tmp_path / "export.ndjson.gz"
+    MemoryTransfer(store).export_to(str(path), compression="gzip")
+
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        header, *records = [json.loads(line) for line in f]
+    assert header["format"] == FORMAT and header["version"] == 1
+    assert [r["session_id"] for r in records] == ["s1"] * 2 + ["s2"] * 25 + ["s3"] * 2
+    lease = next(r for r in records if r["key"] == "a/lease")
+    assert set(lease) == {"session_id", "key", "value", "created_at", "expires_at"}
+    assert lease["value"] == "short" and lease["expires_at"] > time.time()
+
+
+def test_import_skips_entries_expired_since_export(tmp_path):
+    path = tmp_path / "export.ndjson"
+    now = time.time()
+    records = [
+        {"format": FORMAT, "version": 1},
+        {"session_id": "s1", "key": "live", "value": 1, "created_at": now,
+         "expires_at": now + 60},
+        {"session_id": "s1", "key": "dead", "value": 2, "created_at": now - 60,
+         "expires_at": now - 1},
+    ]
+    path.write_text("".join(json.dumps(r) + "\n" for r in records))
+    store = InMemorySessionStore()
+    report = MemoryTransfer(store).import_from(str(path))
+    assert (report.records, report.expired) == (1, 1)
+    assert store.read_session("s1") == {"live": 1}
+
+
+def test_export_resumes_from_checkpoint(tmp_path):
+    store = InMemorySessionStore()
+    for i in range(6):
+        store.write_many(f"s{i}", {f"k{j}": j for j in range(3)})
+    path = str(tmp_path / "export.ndjson.gz")
+    checkpoint = str(tmp_path / "export.checkpoint")
+
+    transfer = MemoryTransfer(store, batch_size=2, workers=1)
+    read_batch = transfer._read_batch
+
+    def flaky(task):
+        if task[0] == "s4":
+            raise ConnectionError("backend went away")
+        return read_batch(task)
+
+    transfer._read_batch = flaky
+    with pytest.raises(ConnectionError):
+        transfer.export_to(path, compression="gzip", checkpoint=checkpoint)
+
+    read = []
+
+    def recorded(task):
+        read.append(task[0])
+        return read_batch(task)
+
+    transfer._read_batch = recorded
+    report = transfer.export_to(path, compression="gzip", checkpoint=checkpoint)
+    assert report.resumed
+    assert "s0" not in read and read[-1] == "s5"
+    assert (report.sessions, report.records) == (6, 18)
+
+    target = InMemorySessionStore()
+    assert MemoryTransfer(target).import_from(path).records == 18
+    assert _contents(target) == _contents(store)
+
+    with pytest.raises(ValueError):
+        transfer.export_to(path, encoding="msgpack", checkpoint=checkpoint)
+
+
+def test_import_resumes_from_checkpoint(tmp_path):
+    source = InMemorySessionStore()
+    for i in range(4):
+        source.write_many(f"s{i}", {f"k{j}": j for j in range(5)})
+    path = str(tmp_path / "export.ndjson")
+    MemoryTransfer(source).export_to(path)
+    checkpoint = str(tmp_path / "import.checkpoint")
+
+    class Flaky(InMemorySessionStore):
+        fail = True
+        written = []
+
+        def write_entries(self, session_id, entries):
+            if self.fail and session_id == "s2":
+                raise ConnectionError("backend went away")
+            self.written.append(session_id)
+            super().write_entries(session_id, entries)
+
+    target = Flaky()
+    transfer = MemoryTransfer(target, batch_size=5, workers=1)
+    with pytest.raises(ConnectionError):
+        transfer.import_from(path, checkpoint=checkpoint)
+    assert target.written[:2] == ["s0", "s1"]
+
+    # Batches after the failed one may have landed; they are written again
+    target.fail = False
+    target.written = []
+    report = transfer.import_from(path, checkpoint=checkpoint)
+    assert report.resumed
+    assert target.written == ["s2", "s3"]
+    assert (report.sessions, report.records) == (4, 20)
+    assert _contents(target) == _contents(source)
+
+
+def test_import_resumes_within_a_session(tmp_path):
+    source = InMemorySessionStore()
+    source.write_many("s1", {f"k{j}": j for j in range(10)})
+    path = str(tmp_path / "export.ndjson")
+    MemoryTransfer(source).export_to(path)
+    checkpoint = str(tmp_path / "import.checkpoint")
+
+    class Flaky(InMemorySessionStore):
+        calls = 0
+
+        def write_entries(self, session_id, entries):
+            self.calls += 1
+            if self.calls == 2:
+                raise ConnectionError("backend went away")
+            super().write_entries(session_id, entries)
+
+    target = Flaky()
+    transfer = MemoryTransfer(target, batch_size=3, workers=1)
+    with pytest.raises(ConnectionError):
+        transfer.import_from(path, checkpoint=checkpoint)
+    # Checkpointed within the session, after its first batch
+    with open(checkpoint) as f:
+        assert json.load(f)["consumed"] == 3
+
+    report = transfer.import_from(path, checkpoint=checkpoint)
+    assert report.resumed
+    assert (report.sessions, report.records) == (1, 10)
+    assert _contents(target) == _contents(source)
+
+
+def test_import_rejects_unknown_format_versions(tmp_path):
+    path = tmp_path / "export.ndjson"
+    transfer = MemoryTransfer(InMemorySessionStore())
+    path.write_text(json.dumps({"format": FORMAT, "version": 2}) + "\n")
+    with pytest.raises(ValueError, match="version 2"):
+        transfer.import_from(str(path))
+    path.write_text(json.dumps({"session_id": "s1"}) + "\n")
+    with pytest.raises(ValueError):
+        transfer.import_from(str(path))
+
+
+def test_transfer_validates_arguments(tmp_path):
+    transfer = MemoryTransfer(InMemorySessionStore())
+    with pytest.raises(ValueError):
+        transfer.export_to(str(tmp_path / "x"), encoding="csv")
+    with pytest.raises(ValueError):
+        transfer.export_to(str(tmp_path / "x"), compression="zip")
+    with pytest.raises(ValueError):
+        MemoryTransfer(InMemorySessionStore(), batch_size=0)
+
+
+def test_content_addressed_store_exports_values_not_references(tmp_path):
+    store = ContentAddressedStore(InMemorySessionStore(), threshold_bytes=64)
+    big = {"text": "x" * 500}
+    store.write_many("s1", {"big": big, "small": 1})
+    assert list(store.iter_sessions()) == ["s1"]
+    assert BLOB_SESSION in list(store.inner.iter_sessions())
+
+    path = str(tmp_path / "export.ndjson")
+    MemoryTransfer(store).export_to(path)
+    target = InMemorySessionStore()
+    MemoryTransfer(target).import_from(path)
+    assert target.read_session("s1") == {"big": big, "small": 1}
+
+
+def test_client_transfer_round_trip(make_client, tmp_path):
+    client = make_client("sqlite", name="c")
+    client.write("hello", key="note")
+    path = str(tmp_path / "export.ndjson")
+    client.transfer().export_to(path)
+    other = make_client("memory")
+    other.transfer().import_from(path)
+    assert other.recall("note") == "hello"
+
+
+def test_session_store_export_is_optional():
+    class Minimal(SessionStore):
+        def write(self, session_id, key, value):
+            pass
+
+        def read(self, session_id, key):
+            return None
+
+    store = Minimal()
+    with pytest.raises(NotImplementedError):
+        list(store.iter_sessions())
+    with pytest.raises(NotImplementedError):
+        store.read_entries("s1", ["k"])
+    with pytest.raises(NotImplementedError):
+        store.write_entries("s1", {"k": StoredEntry(1)})
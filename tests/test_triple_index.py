@@ -0,0 +1,145 @@
+"""Tests for SPO/POS/OSP triple pattern queries across backends."""
+import copy
+import itertools
+import random
+
+import pytest
+
+from agent_memory_hub import MemoryClient
+from agent_memory_hub.data_plane.adk_session_store import SessionStore
+from agent_memory_hub.indexing import IndexRecord, TripleIndex, TriplePattern
+from agent_memory_hub.models import EpisodicMemory, SemanticMemory
+
+
+def _fact(subject, predicate, obj, truth_score=1.0, agent_id="agent"):
+    return SemanticMemory(
+        agent_id=agent_id,
+        subject=subject,
+        predicate=predicate,
+        object=obj,
+        truth_score=truth_score,
+    )
+
+
+def _all_pages(client, **pattern):
+    facts, cursor = [], None
+    while True:
+        page = client.match_triples(limit=3, cursor=cursor, **pattern)
+        facts.extend((m["subject"], m["predicate"], m["object"]) for m in page)
+        cursor = page.next_cursor
+        if cursor is None:
+            return facts
+
+
+def test_patterns_match_brute_force(client):
+    rng = random.Random(7)  # noqa: S311
+    facts = {}
+    for _ in range(30):
+        fact = (
+            rng.choice(["alice", "bob", "carol"]),
+            rng.choice(["likes", "knows"]),
+            rng.choice(["tea", "bob", "jazz"]),
+        )
+        memory = _fact(*fact, truth_score=round(rng.random(), 1))
+        client.write_model(memory)
+        facts[memory.id] = (fact, memory.truth_score)
+    client.write_model(EpisodicMemory(agent_id="agent", content="alice likes tea"))
+    client.write("alice likes tea", key="plain")
+
+    for subject, predicate, obj in itertools.product(
+        [None, "alice"], [None, "likes"], [None, "bob"]
+    ):
+        expected = sorted(
+            (-score, memory_id, fact)
+            for memory_id, (fact, score) in facts.items()
+            if subject in (None, fact[0])
+            and predicate in (None, fact[1])
+            and obj in (None, fact[2])
+        )
+        got = _all_pages(client, subject=subject, predicate=predicate, object=obj)
+        assert got == [fact for _, _, fact in expected]
+
+
+def test_results_ordered_by_truth_score(client):
+    for score in (0.2, 0.9, 0.5):
+        client.write_model(_fact("user", "likes", f"thing-{score}", score))
+
+    page = client.match_triples(predicate="likes")
+    assert [m["truth_score"] for m in page] == [0.9, 0.5, 0.2]
+    assert client.recall(page.keys[0])["object"] == "thing-0.9"
+
+
+def test_overwrite_moves_triple(client):
+    memory = _fact("user", "likes", "tea")
+    client.write_model(memory)
+    memory.object = "coffee"
+    client.write_model(memory)
+
+    assert len(client.match_triples(object="tea")) == 0
+    assert [m["object"] for m in client.match_triples(subject="user")] == ["coffee"]
+
+    key = client.match_triples().keys[0]
+    client.write("replaced", key=key)
+    assert len(client.match_triples(subject="user")) == 0
+
+
+def test_patterns_are_scoped_to_agent(client):
+    client.write_model(_fact("user", "likes", "tea"))
+    other = copy.copy(client)
+    other.agent_id = "other"
+    other.write_model(_fact("user", "likes", "jazz", agent_id="other"))
+
+    assert [m["object"] for m in client.match_triples(subject="user")] == ["tea"]
+    assert [m["object"] for m in other.match_triples(subject="user")] == ["jazz"]
+
+
+def test_triple_index_picks_bound_permutation():
+    index = TripleIndex()
+    records = [
+        IndexRecord(f"k{i}", "SemanticMemory", None, (), 0.0, s, p, o, 1.0)
+        for i, (s, p, o) in enumerate(
+            [("a", "likes", "x"), ("a", "knows", "b"), ("b", "likes", "x")]
+        )
+    ]
+    for record in records:
+        index.add(record)
+
+    def keys(**terms):
+        return sorted(r.key for r in index.match(TriplePattern(**terms)))
+
+    assert keys(subject="a") == ["k0", "k1"]
+    assert keys(predicate="likes", object="x") == ["k0", "k2"]
+    assert keys(subject="b", object="x") == ["k2"]
+    assert keys() == ["k0", "k1", "k2"]
+    index.remove("k0")
+    assert keys(object="x") == ["k2"]
+
+
+def test_stores_without_triple_index_raise():
+    class PlainStore(SessionStore):
+        def write(self, session_id, key, value):
+            pass
+
+        def read(self, session_id, key):
+            return None
+
+    with pytest.raises(NotImplementedError):
+        PlainStore().match_triples("s1", TriplePattern(subject="x"))
+
+
+def test_deduplicated_triples_are_matched():
+    client = MemoryClient(
+        agent_id="agent",
+        session_id="s1",
+        region_restricted=False,
+        backend="memory",
+        dedup_threshold_bytes=256,
+    )
+    memory = _fact("user", "likes", "tea", truth_score=0.4)
+    memory.metadata = {"blob": "x" * 1024}
+    client.write_model(memory)
+    client.write_model(_fact("user", "likes", "jazz", truth_score=0.8))
+
+    page = client.match_triples(subject="user")
+    assert [m["object"] for m in page] == ["jazz", "tea"]
+    assert page.items[1]["metadata"]["blob"] == "x" * 1024
@@ -0,0 +1,177 @@
+"""Tests for unit-of-work sessions and batched writes across backends."""
+import asyncio
+
+import pytest
+
+from agent_memory_hub import MemoryClient
+from agent_memory_hub.data_plane.adk_session_store import SessionStore
+from agent_memory_hub.models import EpisodicMemory, SemanticMemory
+
+
+def _record_calls(monkeypatch, client):
+    """Record store calls; fail on per-key writes."""
+    store = client._router.store
+    calls = []
+    write_many = store.write_many
+
+    def recording(session_id, items):
+        calls.append(sorted(items))
+        write_many(session_id, items)
+
+    def boom(*args, **kwargs):
+        raise AssertionError("unexpected per-key write")
+
+    monkeypatch.setattr(store, "write_many", recording)
+    monkeypatch.setattr(store, "write", boom)
+    return calls
+
+
+def test_session_flushes_once_on_exit(client, monkeypatch):
+    client.write({"step": 1}, key="plan")
+    calls = _record_calls(monkeypatch, client)
+    fact = SemanticMemory(
+        agent_id="agent", subject="user", predicate="likes", object="tea"
+    )
+    with client.session() as s:
+        plan = s.recall("plan")
+        s.write({**plan, "step": 2}, key="plan")
+        # Read-your-writes inside the block
+        assert s.recall("plan") == {"step": 2}
+        s.write("draft", key="notes")
+        s.write("final", key="notes")  # coalesced
+        s.write_model(fact)
+        assert sorted(s.pending) == sorted(
+            ["plan", "notes", f"semanticmemory/{fact.id}"]
+        )
+        assert client.recall("notes") is None  # nothing sent yet
+
+    assert calls == [
+        sorted(["agent/plan", "agent/notes", f"agent/semanticmemory/{fact.id}"])
+    ]
+    assert client.recall("plan") == {"step": 2}
+    assert client.recall("notes") == "final"
+    page = client.query(memory_type=SemanticMemory)
+    assert [m["object"] for m in page] == ["tea"]
+
+
+def test_session_discards_writes_on_error(client, monkeypatch):
+    client.write("kept", key="k")
+    calls = _record_calls(monkeypatch, client)
+    with pytest.raises(RuntimeError):
+        with client.session() as s:
+            s.write("lost", key="k")
+            s.write("lost", key="other")
+            raise RuntimeError("abort")
+    assert calls == []
+    assert client.recall("k") == "kept"
+    assert client.recall("other") is None
+
+
+def test_working_set_reads_each_key_once(client, monkeypatch):
+    client.write_many({"a": 1, "b": 2})
+    router = client._router
+    reads = []
+    read, read_many = router.read, router.read_many
+    monkeypatch.setattr(
+        router, "read", lambda sid, key: reads.append([key]) or read(sid, key)
+    )
+    monkeypatch.setattr(
+        router,
+        "read_many",
+        lambda sid, keys: reads.append(list(keys)) or read_many(sid, keys),
+    )
+    with client.session() as s:
+        assert s.recall("a") == 1
+        assert s.recall_many(["a", "b", "missing"]) == [1, 2, None]
+        assert s.recall("missing") is None
+        value = s.recall("a")
+        assert s.recall_many(["b", "a"]) == [2, value]
+    assert reads == [["agent/a"], ["agent/b", "agent/missing"]]
+
+
+def test_explicit_flush_and_empty_session(client, monkeypatch):
+    calls = _record_calls(monkeypatch, client)
+    with client.session() as s:
+        pass
+    assert calls == []
+
+    with client.session() as s:
+        s.write(1, key="x")
+        assert s.flush() == 1
+        assert s.pending == []
+        s.write(2, key="x")
+    assert calls == [["agent/x"], ["agent/x"]]
+    assert client.recall("x") == 2
+
+
+def test_async_session(client):
+    async def run():
+        async with client.session() as s:
+            s.write({"n": 1}, key="counter")
+            s.write_model(EpisodicMemory(agent_id="agent", content="hello"))
+        with pytest.raises(ValueError):
+            async with client.session() as s:
+                s.write({"n": 99}, key="counter")
+                raise ValueError("abort")
+
+    asyncio.run(run())
+    assert client.recall("counter") == {"n": 1}
+    assert [m["content"] for m in client.query()] == ["hello"]
+
+
+def test_write_many_overwrites_models(client):
+    first = EpisodicMemory(agent_id="agent", content="first", tags=["a"])
+    client.write_model(first)
+    key = f"episodicmemory/{first.id}"
+    replaced = {**first.to_dict(), "content": "second", "tags": ["b"]}
+    client.write_many({key: replaced, "plain": [1, 2]})
+    assert client.recall(key)["content"] == "second"
+    assert client.recall("plain") == [1, 2]
+    assert [m["content"] for m in client.query(tags=["b"])] == ["second"]
+    assert list(client.query(tags=["a"])) == []
+
+
+def test_session_updates_loaded_session(client, monkeypatch):
+    client.write("v1", key="k")
+    client.load_session()
+    with client.session() as s:
+        s.write("v2", key="k")
+        s.write("new", key="added")
+    monkeypatch.setattr(client._router.store, "read", None)
+    assert client.recall("k") == "v2"
+    assert client.recall("added") == "new"
+
+
+def test_write_many_deduplicates_large_values():
+    client = MemoryClient(
+        agent_id="agent",
+        session_id="s1",
+        region_restricted=False,
+        backend="memory",
+        dedup_threshold_bytes=64,
+    )
+    big = {"text": "x" * 200}
+    with client.session() as s:
+        s.write(big, key="a")
+        s.write(big, key="b")
+        s.write("small", key="c")
+    assert client.recall_many(["a", "b", "c"]) == [big, big, "small"]
+    inner = client._router.store.inner
+    stored = inner.read_many("s1", ["agent/a", "agent/b"])
+    assert stored[0] == stored[1] and stored[0] != big
+
+
+def test_session_store_write_many_falls_back_to_write():
+    class Minimal(SessionStore):
+        def __init__(self):
+            self.data = {}
+
+        def write(self, session_id, key, value):
+            self.data[(session_id, key)] = value
+
+        def read(self, session_id, key):
+            return self.data.get((session_id, key))
+
+    store = Minimal()
+    store.write_many("s1", {"a": 1, "b": 2})
+    assert store.read_many("s1", ["a", "b", "c"]) == [1, 2, None]
@@ -0,0 +1,143 @@
+"""Tests for compare-and-set writes with version tokens across backends."""
+import threading
+
+import pytest
+
+from agent_memory_hub.data_plane.adk_session_store import (
+    MISSING_VERSION,
+    SessionStore,
+    VersionConflictError,
+)
+from agent_memory_hub.data_plane.content_addressed_store import (
+    ContentAddressedStore,
+)
+from agent_memory_hub.data_plane.memory_session_store import InMemorySessionStore
+from agent_memory_hub.data_plane.redis_session_store import WatchError
+from agent_memory_hub.emulators.redis import FakeRedis
+from agent_memory_hub.models import SemanticMemory
+
+
+def test_create_only_and_stale_versions(client):
+    assert client.recall_with_version("k") == (None, MISSING_VERSION)
+    v1 = client.write({"n": 1}, key="k", if_version=MISSING_VERSION)
+    assert v1 and v1 != MISSING_VERSION
+    assert client.recall_with_version("k") == ({"n": 1}, v1)
+
+    with pytest.raises(VersionConflictError) as excinfo:
+        client.write({"n": 9}, key="k", if_version=MISSING_VERSION)
+    assert excinfo.value.key == "agent/k"
+
+    v2 = client.write({"n": 2}, key="k", if_version=v1)
+    assert v2 != v1
+    with pytest.raises(VersionConflictError):
+        client.write({"n": 9}, key="k", if_version=v1)
+    with pytest.raises(VersionConflictError):
+        client.write({"n": 9}, key="k", if_version="not-a-version")
+    assert client.recall_with_version("k") == ({"n": 2}, v2)
+
+    # Unconditional writes move the version on too
+    assert client.write({"n": 3}, key="k") is None
+    with pytest.raises(VersionConflictError):
+        client.write({"n": 9}, key="k", if_version=v2)
+    assert client.recall("k") == {"n": 3}
+
+
+def test_other_keys_do_not_conflict(client):
+    _, version = client.recall_with_version("a")
+    client.write("b", key="b")
+    client.write("a", key="a", if_version=version)
+    _, version = client.recall_with_version("a")
+    client.write("b2", key="b")
+    client.write("a2", key="a", if_version=version)
+    assert client.recall_many(["a", "b"]) == ["a2", "b2"]
+
+
+def test_concurrent_increments_lose_no_update(client):
+    client.write(0, key="counter")
+
+    def increment():
+        for _ in range(5):
+            while True:
+                value, version = client.recall_with_version("counter")
+                try:
+                    client.write(value + 1, key="counter", if_version=version)
+                    break
+                except VersionConflictError:
+                    continue
+
+    threads = [threading.Thread(target=increment) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert client.recall("counter") == 20
+
+
+def test_versioned_model_writes_keep_indexes(client):
+    fact = SemanticMemory(
+        agent_id="agent", subject="user", predicate="likes", object="tea"
+    )
+    key = f"semanticmemory/{fact.id}"
+    version = client.write_model(fact, if_version=MISSING_VERSION)
+    fact.object = "coffee"
+    client.write_model(fact, if_version=version)
+    with pytest.raises(VersionConflictError):
+        client.write_model(fact, if_version=version)
+    assert client.recall(key)["object"] == "coffee"
+    assert [m["object"] for m in client.query(memory_type=SemanticMemory)] == [
+        "coffee"
+    ]
+
+
+def test_versioned_write_updates_loaded_session(client):
+    client.write("v1", key="k")
+    client.load_session()
+    _, version = client.recall_with_version("k")
+    client.write("v2", key="k", if_version=version)
+    assert client.recall("k") == "v2"
+
+
+def test_content_addressed_store_versions_references():
+    store = ContentAddressedStore(InMemorySessionStore(), threshold_bytes=16)
+    big = {"text": "x" * 64}
+    version = store.write_versioned("s1", "a", big, MISSING_VERSION)
+    assert store.read_versioned("s1", "a") == (big, version)
+    with pytest.raises(VersionConflictError):
+        store.write_versioned("s1", "a", "small", MISSING_VERSION)
+    store.write_versioned("s1", "a", "small", version)
+    assert store.read("s1", "a") == "small"
+
+
+def test_redis_emulator_watch():
+    redis = FakeRedis()
+    redis.set("k", "1")
+    with redis.pipeline() as pipe:
+        pipe.watch("k")
+        assert pipe.get("k") == "1"  # immediate while watching
+        pipe.multi()
+        pipe.set("k", "2")
+        redis.set("k", "changed")
+        with pytest.raises(WatchError):
+            pipe.execute()
+    assert redis.get("k") == "changed"
+
+    with redis.pipeline() as pipe:
+        pipe.watch("k")
+        pipe.multi()
+        pipe.set("k", "3")
+        assert pipe.execute() == [True]
+    assert redis.get("k") == "3"
+
+
+def test_session_store_versioned_writes_are_optional():
+    class Minimal(SessionStore):
+        def write(self, session_id, key, value):
+            pass
+
+        def read(self, session_id, key):
+            return None
+
+    with pytest.raises(NotImplementedError):
+        Minimal().read_versioned("s1", "a")
+    with pytest.raises(NotImplementedError):
+        Minimal().write_versioned("s1", "a", 1, MISSING_VERSION)